@@ -25,9 +25,11 @@ Usage:
     from potato.flask_server import create_app
     app = create_app()
     app.run()
-"""
 
-from .flask_server import create_app
+Importing the package is cheap: ``create_app`` and the other heavy entry
+points load on first attribute access, so CLI subcommands that never start
+the server do not pay for Flask, pandas and the route tree.
+"""
 
 __version__ = "2.8.0"
 __author__ = "Potato Annotation Platform Team"
@@ -35,7 +37,10 @@ __description__ = "A flexible, web-based platform for text annotation tasks"
 
 
 def __getattr__(name):
-    """Lazy imports for optional heavy dependencies."""
+    """Lazy imports for the server and optional heavy dependencies."""
+    if name == "create_app":
+        from .flask_server import create_app
+        return create_app
     if name == "load_as_dataset":
         from .datasets_integration import load_as_dataset
         return load_as_dataset
@@ -1,3 +1,3 @@
-from potato.flask_server import main
+from potato.cli import main
 
 main()
@@ -23,6 +23,10 @@ The workflow:
 5. Final dataset CLI merges unanimous + adjudicated decisions
 """
 
+import atexit
+import bisect
+import heapq
+import itertools
 import json
 import logging
 import math
@@ -40,6 +44,17 @@ logger = logging.getLogger(__name__)
 # Singleton instance
 _ADJUDICATION_MANAGER = None
 _ADJUDICATION_LOCK = threading.Lock()
+_EXIT_HOOK_REGISTERED = False
+
+# Decisions are appended to DECISION_LOG_FILE as they are submitted and folded
+# into DECISIONS_FILE (the documented export format) every
+# DECISION_LOG_COMPACT_EVERY decisions and at shutdown.
+DECISIONS_FILE = "decisions.json"
+DECISION_LOG_FILE = "decisions.log.jsonl"
+DECISION_LOG_COMPACT_EVERY = 500
+
+# Queue order: pending, then in progress, then every other status.
+_STATUS_RANK = {"pending": 0, "in_progress": 1}
 
 
 @dataclass
@@ -162,6 +177,122 @@ class AdjudicationDecision:
         )
 
 
+class AdjudicationQueue(dict):
+    """
+    The adjudication queue (``instance_id -> AdjudicationItem``) with a
+    priority index.
+
+    The index keeps items in the order ``get_queue`` presents them -- pending
+    first, then in progress, then everything else, each by ascending agreement
+    and then by when the item joined the queue -- so the next item to
+    adjudicate is found without sorting the queue. Assigning or deleting
+    entries keeps the index current; a status change on an item already in
+    the queue goes through ``set_status``.
+    """
+
+    def __init__(self, items: Optional[Dict[str, AdjudicationItem]] = None):
+        super().__init__()
+        self._seq = itertools.count()
+        self._arrival: Dict[str, int] = {}  # instance_id -> order of first insertion
+        self._entries: Dict[str, tuple] = {}  # instance_id -> (status, index entry)
+        self._index: Dict[str, List[tuple]] = {}  # status -> sorted (agreement, arrival, id)
+        if items:
+            self.update(items)
+
+    def __setitem__(self, instance_id: str, item: AdjudicationItem) -> None:
+        super().__setitem__(instance_id, item)
+        if instance_id not in self._arrival:
+            self._arrival[instance_id] = next(self._seq)
+        self.reindex(instance_id)
+
+    def __delitem__(self, instance_id: str) -> None:
+        super().__delitem__(instance_id)
+        self._unindex(instance_id)
+        self._arrival.pop(instance_id, None)
+
+    def pop(self, instance_id: str, *default):
+        if instance_id not in self:
+            return super().pop(instance_id, *default)
+        item = self[instance_id]
+        del self[instance_id]
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._arrival.clear()
+        self._entries.clear()
+        self._index.clear()
+
+    def update(self, *args, **kwargs) -> None:
+        for instance_id, item in dict(*args, **kwargs).items():
+            self[instance_id] = item
+
+    def setdefault(self, instance_id: str, item: AdjudicationItem = None):
+        if instance_id not in self:
+            self[instance_id] = item
+        return self[instance_id]
+
+    def set_status(self, instance_id: str, status: str) -> None:
+        """Change an item's status and move it to its new place in the order."""
+        self[instance_id].status = status
+        self.reindex(instance_id)
+
+    def reindex(self, instance_id: str) -> None:
+        """Re-file ``instance_id`` after its status or agreement changed."""
+        self._unindex(instance_id)
+        item = self.get(instance_id)
+        if item is None:
+            return
+        entry = (item.overall_agreement, self._arrival[instance_id], instance_id)
+        bisect.insort(self._index.setdefault(item.status, []), entry)
+        self._entries[instance_id] = (item.status, entry)
+
+    def _unindex(self, instance_id: str) -> None:
+        filed = self._entries.pop(instance_id, None)
+        if filed is None:
+            return
+        status, entry = filed
+        entries = self._index.get(status, [])
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    def _is_current(self, status: str, entry: tuple) -> bool:
+        item = self.get(entry[2])
+        return (item is not None and item.status == status
+                and item.overall_agreement == entry[0])
+
+    def _reindex_all(self) -> None:
+        """Rebuild the index from the items (after a change made behind its back)."""
+        self._entries.clear()
+        self._index.clear()
+        for instance_id in list(self):
+            self.reindex(instance_id)
+
+    def first(self, status: str) -> Optional[AdjudicationItem]:
+        """The highest-priority item with ``status``, or None."""
+        entries = self._index.get(status)
+        if entries and not self._is_current(status, entries[0]):
+            self._reindex_all()
+            entries = self._index.get(status)
+        return self[entries[0][2]] if entries else None
+
+    def ordered(self, status: Optional[str] = None) -> List[AdjudicationItem]:
+        """Items in queue order, optionally only those with ``status``."""
+        for _ in range(2):
+            if status is not None:
+                filed = [(status, e) for e in self._index.get(status, [])]
+            else:
+                others = [[(s, e) for e in entries]
+                          for s, entries in self._index.items() if s not in _STATUS_RANK]
+                filed = [(s, e) for s in _STATUS_RANK for e in self._index.get(s, [])]
+                filed.extend(heapq.merge(*others, key=lambda f: f[1]))
+            if all(self._is_current(s, e) for s, e in filed):
+                break
+            self._reindex_all()
+        return [self[e[2]] for _, e in filed]
+
+
 class AdjudicationManager:
     """
     Manages the adjudication workflow including queue building, agreement
@@ -185,9 +316,16 @@ class AdjudicationManager:
         self.adj_config = self._parse_config(config)
 
         # Queue and decisions
-        self.queue: Dict[str, AdjudicationItem] = {}  # instance_id -> AdjudicationItem
+        self.queue = AdjudicationQueue()  # instance_id -> AdjudicationItem
         self.decisions: Dict[str, AdjudicationDecision] = {}  # instance_id -> decision
         self._queue_built = False
+        self._logged_decisions = 0  # decisions appended since the last compaction
+
+        # Resolved once: the shared config is repointed when another project
+        # initializes, and the exit compaction may run from any directory.
+        self._adj_dir = os.path.abspath(os.path.join(
+            config.get("output_annotation_dir", "annotation_output"),
+            self.adj_config.output_subdir))
 
         # Load any previously saved decisions
         self._load_decisions()
@@ -206,6 +344,14 @@ class AdjudicationManager:
             f"adjudicators={self.adj_config.adjudicator_users}"
         )
 
+    @property
+    def queue(self) -> AdjudicationQueue:
+        return self._queue
+
+    @queue.setter
+    def queue(self, items: Dict[str, AdjudicationItem]) -> None:
+        self._queue = items if isinstance(items, AdjudicationQueue) else AdjudicationQueue(items)
+
     def _parse_config(self, config: Dict[str, Any]) -> AdjudicationConfig:
         """Parse adjudication configuration from the main config."""
         adj = AdjudicationConfig()
@@ -253,7 +399,9 @@ class AdjudicationManager:
         Scan all user annotations and build the adjudication queue.
 
         Items become eligible when they have enough annotations and
-        agreement is below the threshold.
+        agreement is below the threshold. This full scan runs once, on first
+        use; afterwards ``try_enqueue_item`` keeps the queue current as
+        annotations are saved.
 
         Returns:
             List of AdjudicationItem objects
@@ -278,101 +426,12 @@ class AdjudicationManager:
                     if instance_id_str not in self.queue:
                         continue
                     # Mark as completed if decision exists
-                    self.queue[instance_id_str].status = "completed"
-                    continue
-
-                # Get all annotators for this item
-                annotators = ism.instance_annotators.get(instance_id, set())
-                # Filter out adjudicators from annotator list
-                annotators = {
-                    u for u in annotators
-                    if u not in self.adj_config.adjudicator_users
-                }
-
-                if len(annotators) < self.adj_config.min_annotations:
-                    continue
-
-                # Check if we require fully annotated items
-                if self.adj_config.require_fully_annotated:
-                    max_per_item = ism.max_annotations_per_item
-                    if max_per_item > 0 and len(annotators) < max_per_item:
-                        continue
-
-                # Collect annotations from all annotators
-                item_annotations = {}
-                item_spans = {}
-                item_behavioral = {}
-
-                for user_id in annotators:
-                    user_state = usm.get_user_state(user_id)
-                    if not user_state:
-                        continue
-
-                    # Get label annotations
-                    label_annots = user_state.instance_id_to_label_to_value.get(
-                        instance_id_str, {}
-                    )
-                    if label_annots:
-                        item_annotations[user_id] = self._serialize_labels(label_annots)
-
-                    # Get span annotations
-                    span_annots = user_state.instance_id_to_span_to_value.get(
-                        instance_id_str, {}
-                    )
-                    if span_annots:
-                        item_spans[user_id] = self._serialize_spans(span_annots)
-
-                    # Get behavioral data
-                    bd = user_state.instance_id_to_behavioral_data.get(
-                        instance_id_str, {}
-                    )
-                    if bd:
-                        item_behavioral[user_id] = self._serialize_behavioral(bd)
-
-                if not item_annotations and not item_spans:
+                    self.queue.set_status(instance_id_str, "completed")
                     continue
 
-                # Compute agreement scores
-                agreement_scores = self._compute_agreement(
-                    item_annotations, scheme_names
-                )
-                overall = self._compute_overall_agreement(agreement_scores)
-
-                # Filter by agreement threshold
-                if not self.adj_config.show_all_items:
-                    if overall >= self.adj_config.agreement_threshold:
-                        continue
-
-                # Preserve existing status if already in queue
-                existing = self.queue.get(instance_id_str)
-                status = existing.status if existing else "pending"
-                assigned = existing.assigned_adjudicator if existing else None
-
-                # Enrich with MACE predictions if available
-                mace_preds = {}
-                try:
-                    from potato.mace_manager import get_mace_manager
-                    mace_mgr = get_mace_manager()
-                    if mace_mgr and mace_mgr.results:
-                        for sname in scheme_names:
-                            pred = mace_mgr.get_prediction(instance_id_str, sname)
-                            if pred is not None:
-                                mace_preds[sname] = pred
-                except Exception:
-                    pass  # MACE is optional
-
-                self.queue[instance_id_str] = AdjudicationItem(
-                    instance_id=instance_id_str,
-                    annotations=item_annotations,
-                    span_annotations=item_spans,
-                    behavioral_data=item_behavioral,
-                    agreement_scores=agreement_scores,
-                    overall_agreement=overall,
-                    num_annotators=len(annotators),
-                    status=status,
-                    assigned_adjudicator=assigned,
-                    mace_predictions=mace_preds,
-                )
+                queue_item = self._evaluate_item(instance_id, usm, ism, scheme_names)
+                if queue_item is not None:
+                    self.queue[instance_id_str] = queue_item
 
             self._queue_built = True
             return list(self.queue.values())
@@ -381,10 +440,12 @@ class AdjudicationManager:
         """
         Evaluate a single item and, if it qualifies, add it to the queue.
 
-        Called when an overlap-sample item saturates so that low-agreement
-        items show up in the adjudication queue without needing a full
-        ``build_queue()`` rescan. Returns True if the item ended up in the
-        queue, False otherwise.
+        The item state manager calls this whenever an annotation is saved, so
+        the queue follows annotation activity without a ``build_queue()``
+        rescan: only the touched item's agreement is recomputed. An item
+        already in the queue is refreshed with the latest annotations and
+        keeps its status. Returns True if the item is in the queue afterwards,
+        False otherwise.
         """
         if not self.adj_config.enabled:
             return False
@@ -401,62 +462,125 @@ class AdjudicationManager:
             instance_id_str = str(instance_id)
             if instance_id_str in self.decisions:
                 return False
-            item = ism.find_item(instance_id)
-            if item is None:
-                return False
-
-            annotators = {
-                u for u in ism.instance_annotators.get(instance_id, set())
-                if u not in self.adj_config.adjudicator_users
-            }
-            if len(annotators) < self.adj_config.min_annotations:
+            if ism.find_item(instance_id) is None:
                 return False
 
             scheme_names = [s.get("name", "") for s in self.config.get("annotation_schemes", [])]
-            item_annotations: Dict[str, Any] = {}
-            item_spans: Dict[str, Any] = {}
-            item_behavioral: Dict[str, Any] = {}
-            for user_id in annotators:
-                ustate = usm.get_user_state(user_id)
-                if not ustate:
-                    continue
-                la = ustate.instance_id_to_label_to_value.get(instance_id_str, {})
-                if la:
-                    item_annotations[user_id] = self._serialize_labels(la)
-                sa = ustate.instance_id_to_span_to_value.get(instance_id_str, {})
-                if sa:
-                    item_spans[user_id] = self._serialize_spans(sa)
-                bd = ustate.instance_id_to_behavioral_data.get(instance_id_str, {})
-                if bd:
-                    item_behavioral[user_id] = self._serialize_behavioral(bd)
-
-            if not item_annotations and not item_spans:
-                return False
+            queue_item = self._evaluate_item(instance_id, usm, ism, scheme_names)
+            if queue_item is None:
+                return instance_id_str in self.queue
+
+            is_new = instance_id_str not in self.queue
+            self.queue[instance_id_str] = queue_item
+            if is_new:
+                self.logger.info(
+                    "Auto-routed item %s into adjudication queue (overall agreement=%.3f, "
+                    "threshold=%.3f, annotators=%d)",
+                    instance_id_str, queue_item.overall_agreement,
+                    self.adj_config.agreement_threshold, queue_item.num_annotators,
+                )
+            return True
+
+    def _evaluate_item(self, instance_id, usm, ism,
+                       scheme_names: List[str]) -> Optional[AdjudicationItem]:
+        """
+        Build the queue entry for one item, or None if it doesn't qualify.
+
+        An item qualifies with at least ``min_annotations`` non-adjudicator
+        annotators (all of them, with ``require_fully_annotated``) and, unless
+        ``show_all_items`` is set, agreement below the threshold. An existing
+        entry's status and assignment carry over.
+        """
+        instance_id_str = str(instance_id)
+
+        # Get all annotators for this item, leaving out adjudicators
+        annotators = {
+            u for u in ism.instance_annotators.get(instance_id, set())
+            if u not in self.adj_config.adjudicator_users
+        }
+        if len(annotators) < self.adj_config.min_annotations:
+            return None
 
-            agreement_scores = self._compute_agreement(item_annotations, scheme_names)
-            overall = self._compute_overall_agreement(agreement_scores)
-            if not self.adj_config.show_all_items:
-                if overall >= self.adj_config.agreement_threshold:
-                    return False
-
-            existing = self.queue.get(instance_id_str)
-            self.queue[instance_id_str] = AdjudicationItem(
-                instance_id=instance_id_str,
-                annotations=item_annotations,
-                span_annotations=item_spans,
-                behavioral_data=item_behavioral,
-                agreement_scores=agreement_scores,
-                overall_agreement=overall,
-                num_annotators=len(annotators),
-                status=existing.status if existing else "pending",
-                assigned_adjudicator=existing.assigned_adjudicator if existing else None,
+        # Check if we require fully annotated items
+        if self.adj_config.require_fully_annotated:
+            max_per_item = ism.max_annotations_per_item
+            if max_per_item > 0 and len(annotators) < max_per_item:
+                return None
+
+        # Collect annotations from all annotators
+        item_annotations = {}
+        item_spans = {}
+        item_behavioral = {}
+
+        for user_id in annotators:
+            user_state = usm.get_user_state(user_id)
+            if not user_state:
+                continue
+
+            # Get label annotations
+            label_annots = user_state.instance_id_to_label_to_value.get(
+                instance_id_str, {}
             )
-            self.logger.info(
-                "Auto-routed item %s into adjudication queue (overall agreement=%.3f, "
-                "threshold=%.3f, annotators=%d)",
-                instance_id_str, overall, self.adj_config.agreement_threshold, len(annotators),
+            if label_annots:
+                item_annotations[user_id] = self._serialize_labels(label_annots)
+
+            # Get span annotations
+            span_annots = user_state.instance_id_to_span_to_value.get(
+                instance_id_str, {}
             )
-            return True
+            if span_annots:
+                item_spans[user_id] = self._serialize_spans(span_annots)
+
+            # Get behavioral data
+            bd = user_state.instance_id_to_behavioral_data.get(
+                instance_id_str, {}
+            )
+            if bd:
+                item_behavioral[user_id] = self._serialize_behavioral(
+                    bd, user_id, instance_id_str)
+
+        if not item_annotations and not item_spans:
+            return None
+
+        # Compute agreement scores
+        agreement_scores = self._compute_agreement(item_annotations, scheme_names)
+        overall = self._compute_overall_agreement(agreement_scores)
+
+        # Filter by agreement threshold
+        if not self.adj_config.show_all_items:
+            if overall >= self.adj_config.agreement_threshold:
+                return None
+
+        # Preserve existing status if already in queue
+        existing = self.queue.get(instance_id_str)
+        status = existing.status if existing else "pending"
+        assigned = existing.assigned_adjudicator if existing else None
+
+        # Enrich with MACE predictions if available
+        mace_preds = {}
+        try:
+            from potato.mace_manager import get_mace_manager
+            mace_mgr = get_mace_manager()
+            if mace_mgr and mace_mgr.results:
+                for sname in scheme_names:
+                    pred = mace_mgr.get_prediction(instance_id_str, sname)
+                    if pred is not None:
+                        mace_preds[sname] = pred
+        except Exception:
+            pass  # MACE is optional
+
+        return AdjudicationItem(
+            instance_id=instance_id_str,
+            annotations=item_annotations,
+            span_annotations=item_spans,
+            behavioral_data=item_behavioral,
+            agreement_scores=agreement_scores,
+            overall_agreement=overall,
+            num_annotators=len(annotators),
+            status=status,
+            assigned_adjudicator=assigned,
+            mace_predictions=mace_preds,
+        )
 
     def _serialize_labels(self, label_data: Dict) -> Dict[str, Any]:
         """Convert label annotation data to serializable dict.
@@ -485,13 +609,32 @@ class AdjudicationManager:
                 spans.append(value)
         return spans
 
-    def _serialize_behavioral(self, bd) -> Dict:
-        """Convert behavioral data to serializable dict."""
+    def _serialize_behavioral(self, bd, user_id: Optional[str] = None,
+                              instance_id: Optional[str] = None) -> Dict:
+        """Convert behavioral data to serializable dict.
+
+        With the behavioral event store enabled, the annotator's interactions
+        and annotation changes on the item are read back from it, so the
+        change-count flag sees the same trail it did when they lived in the
+        user state.
+        """
         if hasattr(bd, 'to_dict'):
-            return bd.to_dict()
+            data = bd.to_dict()
         elif isinstance(bd, dict):
-            return bd
-        return {}
+            data = bd
+        else:
+            return {}
+        if user_id is None or instance_id is None:
+            return data
+        try:
+            from potato import behavioral_event_store
+            store = behavioral_event_store.enabled_store(getattr(self, "config", None) or {})
+            if store is not None:
+                data = behavioral_event_store.merge_stored_events(
+                    data, *store, user_id, instance_id)
+        except Exception as e:
+            logger.warning(f"Could not read stored behavioral events: {e}")
+        return data
 
     def _compute_agreement(
         self, item_annotations: Dict[str, Dict], scheme_names: List[str]
@@ -628,18 +771,9 @@ class AdjudicationManager:
             if not self._queue_built:
                 self.build_queue()
 
-            items = list(self.queue.values())
-
-            if filter_status:
-                items = [i for i in items if i.status == filter_status]
-
-            # Sort: pending first, then by agreement (lowest first)
-            items.sort(key=lambda x: (
-                0 if x.status == "pending" else 1 if x.status == "in_progress" else 2,
-                x.overall_agreement,
-            ))
-
-            return items
+            # Pending first, then by agreement (lowest first); the queue's
+            # priority index already holds items in this order.
+            return self.queue.ordered(filter_status or None)
 
     def get_item(self, instance_id: str) -> Optional[AdjudicationItem]:
         """
@@ -686,17 +820,16 @@ class AdjudicationManager:
 
     def get_next_item(self, adjudicator_id: str) -> Optional[AdjudicationItem]:
         """Get the next pending item for an adjudicator."""
-        items = self.get_queue(filter_status="pending")
-        if items:
-            return items[0]
-        return None
+        with self._lock:
+            if not self._queue_built:
+                self.build_queue()
+            return self.queue.first("pending")
 
     def skip_item(self, instance_id: str, adjudicator_id: str) -> bool:
         """Mark an item as skipped."""
         with self._lock:
-            item = self.queue.get(str(instance_id))
-            if item:
-                item.status = "skipped"
+            if str(instance_id) in self.queue:
+                self.queue.set_status(str(instance_id), "skipped")
                 return True
             return False
 
@@ -716,11 +849,11 @@ class AdjudicationManager:
 
             # Update queue status
             if instance_id in self.queue:
-                self.queue[instance_id].status = "completed"
                 self.queue[instance_id].assigned_adjudicator = decision.adjudicator_id
+                self.queue.set_status(instance_id, "completed")
 
             # Persist to disk
-            self._save_decisions()
+            self._append_decision(decision)
 
             self.logger.info(
                 f"Adjudication decision saved for {instance_id} "
@@ -1111,48 +1244,114 @@ class AdjudicationManager:
 
     def _get_output_dir(self) -> str:
         """Get the adjudication output directory."""
-        output_dir = self.config.get("output_annotation_dir", "annotation_output")
-        adj_dir = os.path.join(output_dir, self.adj_config.output_subdir)
-        os.makedirs(adj_dir, exist_ok=True)
-        return adj_dir
+        os.makedirs(self._adj_dir, exist_ok=True)
+        return self._adj_dir
+
+    def _append_decision(self, decision: AdjudicationDecision) -> None:
+        """
+        Persist one decision by appending it to the decision log.
+
+        Rewriting ``decisions.json`` on every submit grows with the number of
+        decisions; appending a line doesn't. The log is folded into
+        ``decisions.json`` every ``DECISION_LOG_COMPACT_EVERY`` decisions.
+        """
+        try:
+            log_file = os.path.join(self._get_output_dir(), DECISION_LOG_FILE)
+            with open(log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(decision.to_dict()) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            self.logger.error(f"Failed to save adjudication decision: {e}")
+            return
+
+        self._logged_decisions += 1
+        if self._logged_decisions >= DECISION_LOG_COMPACT_EVERY:
+            self.compact_decisions()
+
+    def compact_decisions(self) -> None:
+        """
+        Write every decision to ``decisions.json`` and empty the decision log.
+
+        ``decisions.json`` is written to a temporary file and renamed into
+        place, so readers see either the old or the new file. A crash between
+        the rename and truncating the log only means the log is replayed over
+        decisions it already matches.
+        """
+        with self._lock:
+            self._save_decisions()
+            log_file = os.path.join(self._get_output_dir(), DECISION_LOG_FILE)
+            try:
+                if os.path.exists(log_file):
+                    open(log_file, "w", encoding="utf-8").close()
+            except Exception as e:
+                self.logger.error(f"Failed to truncate adjudication decision log: {e}")
+            self._logged_decisions = 0
 
     def _save_decisions(self) -> None:
         """Persist all decisions to disk."""
         try:
             adj_dir = self._get_output_dir()
-            decisions_file = os.path.join(adj_dir, "decisions.json")
+            decisions_file = os.path.join(adj_dir, DECISIONS_FILE)
 
             data = {
                 "decisions": [d.to_dict() for d in self.decisions.values()],
                 "last_updated": datetime.now().isoformat(),
             }
 
-            with open(decisions_file, "w", encoding="utf-8") as f:
+            tmp_file = decisions_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2)
+            os.replace(tmp_file, decisions_file)
 
         except Exception as e:
             self.logger.error(f"Failed to save adjudication decisions: {e}")
 
     def _load_decisions(self) -> None:
-        """Load previously saved decisions from disk."""
+        """Load saved decisions: ``decisions.json``, then the log written since."""
         try:
-            output_dir = self.config.get("output_annotation_dir", "annotation_output")
-            adj_dir = os.path.join(output_dir, self.adj_config.output_subdir)
-            decisions_file = os.path.join(adj_dir, "decisions.json")
-
-            if not os.path.exists(decisions_file):
-                return
-
-            with open(decisions_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            for d in data.get("decisions", []):
-                decision = AdjudicationDecision.from_dict(d)
-                self.decisions[decision.instance_id] = decision
+            decisions_file = os.path.join(self._adj_dir, DECISIONS_FILE)
+            log_file = os.path.join(self._adj_dir, DECISION_LOG_FILE)
+
+            if os.path.exists(decisions_file):
+                with open(decisions_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+
+                for d in data.get("decisions", []):
+                    decision = AdjudicationDecision.from_dict(d)
+                    self.decisions[decision.instance_id] = decision
+
+            if os.path.exists(log_file):
+                with open(log_file, "rb") as f:
+                    data = f.read()
+                end = data.rfind(b"\n") + 1
+                if end < len(data):
+                    # A line cut short by a crash mid-append. Cut it off, or
+                    # the next append would be glued onto it and lost too.
+                    self.logger.warning(
+                        f"Dropping {len(data) - end} bytes of a partial line "
+                        f"at the end of {log_file}"
+                    )
+                    with open(log_file, "r+b") as f:
+                        f.truncate(end)
+                lines = data[:end].decode("utf-8", errors="replace").splitlines()
+                for line_no, line in enumerate(lines, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        decision = AdjudicationDecision.from_dict(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        self.logger.warning(
+                            f"Skipping unreadable line {line_no} of {log_file}"
+                        )
+                        continue
+                    self.decisions[decision.instance_id] = decision
+                    self._logged_decisions += 1
 
-            self.logger.info(
-                f"Loaded {len(self.decisions)} previous adjudication decisions"
-            )
+            if self.decisions:
+                self.logger.info(
+                    f"Loaded {len(self.decisions)} previous adjudication decisions"
+                )
 
         except Exception as e:
             self.logger.warning(f"Failed to load adjudication decisions: {e}")
@@ -1252,15 +1451,25 @@ class AdjudicationManager:
 
 def init_adjudication_manager(config: Dict[str, Any]) -> Optional[AdjudicationManager]:
     """Initialize the singleton AdjudicationManager."""
-    global _ADJUDICATION_MANAGER
+    global _ADJUDICATION_MANAGER, _EXIT_HOOK_REGISTERED
 
     with _ADJUDICATION_LOCK:
         if _ADJUDICATION_MANAGER is None:
             _ADJUDICATION_MANAGER = AdjudicationManager(config)
+        if not _EXIT_HOOK_REGISTERED:
+            atexit.register(_compact_decisions_at_exit)
+            _EXIT_HOOK_REGISTERED = True
 
     return _ADJUDICATION_MANAGER
 
 
+def _compact_decisions_at_exit() -> None:
+    """Fold the decision log of whichever manager is current at shutdown."""
+    manager = _ADJUDICATION_MANAGER
+    if manager is not None and manager._logged_decisions:
+        manager.compact_decisions()
+
+
 def get_adjudication_manager() -> Optional[AdjudicationManager]:
     """Get the singleton AdjudicationManager instance."""
     return _ADJUDICATION_MANAGER
@@ -53,6 +53,7 @@ from potato.flask_server import (
 )
 from potato.annotation_history import AnnotationHistoryManager, AnnotationAction
 from potato.quality_control import get_quality_control_manager
+from potato.server_utils.instance_stats import InstanceStatsTable
 
 @dataclass
 class AnnotatorTimingData:
@@ -140,6 +141,11 @@ class AdminDashboard:
     def __init__(self):
         """Initialize the admin dashboard."""
         self.logger = logging.getLogger(__name__)
+        # Rows behind the Instances tab, kept current between requests.
+        self._instance_stats = InstanceStatsTable(
+            self._instance_contributions, self._instance_contribution,
+            self._label_stats_from_names,
+        )
 
     def check_admin_access(self) -> bool:
         """
@@ -432,77 +438,33 @@ class AdminDashboard:
 
         try:
             ism = get_item_state_manager()
-            items = ism.items()
-
-            # One pass over annotators for every statistic below. Asking the
-            # single-instance helpers for each item instead would re-walk every
-            # annotator per item, and the label helper would rebuild each
-            # annotator's whole annotation set on every one of those walks.
-            aggregates = self._build_instance_aggregates()
             max_annotations = config.get("max_annotations_per_item", -1)
 
-            # Convert items to InstanceData objects
-            instances_data = []
-            for item in items:
-                item_id = item.get_id()
-                annotators = ism.get_annotators_for_item(item_id)
-                annotation_count = len(annotators) if annotators else 0
-
-                # Calculate completion percentage
-                if max_annotations > 0:
-                    completion_percentage = min(100, (annotation_count / max_annotations) * 100)
-                else:
-                    completion_percentage = 100 if annotation_count > 0 else 0
-
-                stats = aggregates.get(item_id)
-                if stats is None:
-                    most_frequent_label, disagreement = None, 0.0
-                    avg_time = None
-                    ai_count = 0
-                else:
-                    most_frequent_label, disagreement = self._label_stats_from_names(stats["labels"])
-                    timed = stats["timed_count"]
-                    avg_time = stats["total_seconds"] / timed if timed else None
-                    ai_count = stats["ai_count"]
+            # The statistics, sort order and summary come from the materialized
+            # table; only the rows on this page are turned into InstanceData.
+            rows, total_instances, summary = self._instance_stats.page(
+                get_user_state_manager(), ism, max_annotations,
+                page, page_size, sort_by, sort_order, filter_completion,
+            )
+            start_idx = (page - 1) * page_size
+            end_idx = start_idx + page_size
 
-                instance_data = InstanceData(
-                    id=item_id,
+            paginated_instances = []
+            for row in rows:
+                item = ism.get_item(row.instance_id)
+                annotators = ism.get_annotators_for_item(row.instance_id)
+                paginated_instances.append(InstanceData(
+                    id=row.instance_id,
                     text=item.get_text(),
                     displayed_text=item.get_displayed_text(),
-                    annotation_count=annotation_count,
-                    completion_percentage=completion_percentage,
-                    most_frequent_label=most_frequent_label,
-                    label_disagreement=disagreement,
+                    annotation_count=row.annotation_count,
+                    completion_percentage=row.completion_percentage,
+                    most_frequent_label=row.most_frequent_label,
+                    label_disagreement=row.label_disagreement,
                     annotators=list(annotators) if annotators else [],
-                    average_time_per_annotation=avg_time,
-                    num_ai_instance=ai_count
-                )
-                instances_data.append(instance_data)
-
-            # Apply filters
-            if filter_completion == "completed":
-                instances_data = [i for i in instances_data if i.completion_percentage >= 100]
-            elif filter_completion == "incomplete":
-                instances_data = [i for i in instances_data if i.completion_percentage < 100]
-
-            # Apply sorting
-            reverse = sort_order.lower() == "desc"
-            if sort_by == "annotation_count":
-                instances_data.sort(key=lambda x: x.annotation_count, reverse=reverse)
-            elif sort_by == "completion_percentage":
-                instances_data.sort(key=lambda x: x.completion_percentage, reverse=reverse)
-            elif sort_by == "disagreement":
-                instances_data.sort(key=lambda x: x.label_disagreement, reverse=reverse)
-            elif sort_by == "id":
-                instances_data.sort(key=lambda x: x.id, reverse=reverse)
-            elif sort_by == "average_time":
-                instances_data.sort(key=lambda x: x.average_time_per_annotation or 0, reverse=reverse)
-
-            # Apply pagination
-            total_instances = len(instances_data)
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            paginated_instances = instances_data[start_idx:end_idx]
+                    average_time_per_annotation=row.average_time_per_annotation,
+                    num_ai_instance=row.num_ai_instance
+                ))
 
             # Convert to serializable format
             serialized_instances = []
@@ -530,12 +492,7 @@ class AdminDashboard:
                     "has_next": end_idx < total_instances,
                     "has_prev": page > 1
                 },
-                "summary": {
-                    "completed_instances": len([i for i in instances_data if i.completion_percentage >= 100]),
-                    "incomplete_instances": len([i for i in instances_data if i.completion_percentage < 100]),
-                    "average_annotations_per_instance": round(sum(i.annotation_count for i in instances_data) / len(instances_data), 1) if instances_data else 0,
-                    "average_disagreement": round(sum(i.label_disagreement for i in instances_data) / len(instances_data), 2) if instances_data else 0
-                }
+                "summary": summary
             }
 
         except Exception as e:
@@ -2028,6 +1985,31 @@ class AdminDashboard:
             return payload.get(field_name, default)
         return getattr(payload, field_name, default)
 
+    def _stored_behavioral_counts(self) -> Dict[Tuple[str, str], Dict[str, Counter]]:
+        """Per-(user, instance) counts from the behavioral event store.
+
+        ``{(user_id, instance_id): {"interaction": Counter(event_type),
+        "annotation_change": Counter(source)}}``, or empty when the store is
+        off. Counted in SQL, so the analytics never load the events themselves.
+        """
+        from potato import behavioral_event_store
+        store = behavioral_event_store.enabled_store(config)
+        if store is None:
+            return {}
+        counts: Dict[Tuple[str, str], Dict[str, Counter]] = defaultdict(
+            lambda: {behavioral_event_store.INTERACTION: Counter(),
+                     behavioral_event_store.ANNOTATION_CHANGE: Counter()})
+        try:
+            rows = behavioral_event_store.instance_counts(*store)
+        except Exception as e:
+            self.logger.warning(f"Could not read behavioral events: {e}")
+            return {}
+        for row in rows:
+            key = row["event_type"] if row["stream"] == behavioral_event_store.INTERACTION \
+                else (row["source"] or "user")
+            counts[(row["user_id"], row["instance_id"])][row["stream"]][key] += row["n"]
+        return counts
+
     def get_behavioral_analytics_data(self) -> Dict[str, Any]:
         """
         Get comprehensive behavioral analytics data for all annotators.
@@ -2057,6 +2039,8 @@ class AdminDashboard:
             users_with_fast_annotations = 0
             users_with_low_interaction = 0
             users_with_no_changes = 0
+            stored_counts = self._stored_behavioral_counts()
+            empty_counts = {'interaction': Counter(), 'annotation_change': Counter()}
 
             for user_id in users:
                 user_state = usm.get_user_state(user_id)
@@ -2086,29 +2070,37 @@ class AdminDashboard:
                     if time_sec < 5:
                         user_fast_count += 1
 
+                    # Events in the behavioral event store are counted alongside
+                    # any recorded in the user state before it was enabled.
+                    stored = stored_counts.get((user_id, str(instance_id)), empty_counts)
+
                     interactions = self._behavioral_sequence(self._behavioral_field(bd, 'interactions', []))
-                    user_interactions += len(interactions)
-                    total_interactions += len(interactions)
-                    if len(interactions) < 3:
+                    n_interactions = len(interactions) + sum(stored['interaction'].values())
+                    user_interactions += n_interactions
+                    total_interactions += n_interactions
+                    if n_interactions < 3:
                         user_low_interaction_count += 1
 
                     for event in interactions:
                         event_type = self._behavioral_field(event, 'event_type', 'unknown')
                         interaction_counts[event_type] += 1
+                    interaction_counts.update(stored['interaction'])
 
                     scroll = self._behavioral_field(bd, 'scroll_depth_max', 0) or 0
                     if scroll < 25:
                         user_no_scroll_count += 1
 
                     changes = self._behavioral_sequence(self._behavioral_field(bd, 'annotation_changes', []))
-                    user_changes += len(changes)
-                    total_changes += len(changes)
-                    if len(changes) == 0:
+                    n_changes = len(changes) + sum(stored['annotation_change'].values())
+                    user_changes += n_changes
+                    total_changes += n_changes
+                    if n_changes == 0:
                         user_no_change_count += 1
 
                     for change in changes:
                         source = self._behavioral_field(change, 'source', 'user')
                         change_sources[source] += 1
+                    change_sources.update(stored['annotation_change'])
 
                     ai_events = self._behavioral_sequence(self._behavioral_field(bd, 'ai_usage', []))
                     for ai in ai_events:
@@ -2696,6 +2688,11 @@ class AdminDashboard:
         stand-in for an answer with no label identity.
         """
         for label, value in labels.items():
+            if isinstance(label, str) and isinstance(value, dict):
+                # A database-backed state nests get_all_annotations() labels
+                # by schema: {schema: {label_name: value}}.
+                out.extend(str(name) for name in value)
+                continue
             name = None
             if hasattr(label, 'get_name'):
                 name = label.get_name()
@@ -2753,41 +2750,85 @@ class AdminDashboard:
         usm = get_user_state_manager()
         aggregates: Dict[str, Dict[str, Any]] = {}
 
-        def bucket(instance_id: str) -> Dict[str, Any]:
-            entry = aggregates.get(instance_id)
-            if entry is None:
-                entry = {"labels": [], "total_seconds": 0.0, "timed_count": 0, "ai_count": 0}
-                aggregates[instance_id] = entry
-            return entry
-
         for username in get_users():
             user_state = usm.get_user_state(username)
             if not user_state:
                 continue
+            for instance_id, (labels, seconds, ai_count) in self._instance_contributions(user_state).items():
+                entry = aggregates.get(instance_id)
+                if entry is None:
+                    entry = {"labels": [], "total_seconds": 0.0, "timed_count": 0, "ai_count": 0}
+                    aggregates[instance_id] = entry
+                entry["labels"].extend(labels)
+                entry["ai_count"] += ai_count
+                if seconds is not None:
+                    entry["total_seconds"] += seconds
+                    entry["timed_count"] += 1
 
-            try:
-                annotations = user_state.get_all_annotations() or {}
-            except Exception as e:
-                self.logger.error(f"Error reading annotations for {username}: {e}")
-                annotations = {}
+        return aggregates
 
-            for instance_id, entry in annotations.items():
-                labels = entry.get("labels") if isinstance(entry, dict) else None
-                if labels:
-                    self._collect_label_names(labels, bucket(instance_id)["labels"])
+    def _instance_contributions(self, user_state) -> Dict[str, Tuple[List[str], Optional[float], int]]:
+        """One annotator's share of the per-instance aggregates.
 
-            behavioral = getattr(user_state, "instance_id_to_behavioral_data", None) or {}
-            for instance_id, behavioral_data in behavioral.items():
-                if not behavioral_data:
-                    continue
-                target = bucket(instance_id)
-                target["ai_count"] += self._extract_behavioral_ai_count(behavioral_data)
-                seconds = self._extract_behavioral_total_seconds(behavioral_data, user_state)
-                if seconds is not None:
-                    target["total_seconds"] += seconds
-                    target["timed_count"] += 1
+        Returns ``{instance_id: (label_names, seconds_or_None, ai_count)}`` for
+        every instance the annotator labeled or has behavioral data for. Both
+        _build_instance_aggregates and the Instances-tab table are built from
+        this, so they cannot disagree on what an annotation contributes.
+        """
+        contributions: Dict[str, Tuple[List[str], Optional[float], int]] = {}
+        username = user_state.get_user_id()
 
-        return aggregates
+        try:
+            annotations = user_state.get_all_annotations() or {}
+        except Exception as e:
+            self.logger.error(f"Error reading annotations for {username}: {e}")
+            annotations = {}
+
+        for instance_id, entry in annotations.items():
+            labels = entry.get("labels") if isinstance(entry, dict) else None
+            if labels:
+                names: List[str] = []
+                self._collect_label_names(labels, names)
+                contributions[instance_id] = (names, None, 0)
+
+        behavioral = getattr(user_state, "instance_id_to_behavioral_data", None) or {}
+        for instance_id, behavioral_data in behavioral.items():
+            if not behavioral_data:
+                continue
+            names = contributions.get(instance_id, ([], None, 0))[0]
+            contributions[instance_id] = (
+                names,
+                self._extract_behavioral_total_seconds(behavioral_data, user_state),
+                self._extract_behavioral_ai_count(behavioral_data),
+            )
+        return contributions
+
+    def _instance_contribution(self, user_state, instance_id: str) -> Optional[Tuple[List[str], Optional[float], int]]:
+        """One annotator's share of one instance, or None if there is none.
+
+        The entry _instance_contributions() would hold for ``instance_id``,
+        read without touching the annotator's other instances, so a save can
+        update the Instances-tab table in time independent of how much the
+        annotator has done.
+        """
+        names: List[str] = []
+        try:
+            labels = user_state.get_label_annotations(instance_id) or {}
+        except Exception as e:
+            self.logger.error(f"Error reading annotations for {user_state.get_user_id()}: {e}")
+            labels = {}
+        if labels:
+            self._collect_label_names(labels, names)
+
+        behavioral = getattr(user_state, "instance_id_to_behavioral_data", None) or {}
+        behavioral_data = behavioral.get(instance_id)
+        if behavioral_data:
+            return (
+                names,
+                self._extract_behavioral_total_seconds(behavioral_data, user_state),
+                self._extract_behavioral_ai_count(behavioral_data),
+            )
+        return (names, None, 0) if names else None
 
 
 # Global instance
@@ -190,6 +190,8 @@ class ICLLabeler:
         self.trigger_threshold = llm_config.get('trigger_threshold', 5)
         self.confidence_threshold = llm_config.get('confidence_threshold', 0.7)
         self.batch_interval = llm_config.get('batch_interval_seconds', 600)
+        # Instances packed into one LLM request (1 = one request per instance)
+        self.prompt_batch_size = max(1, int(llm_config.get('prompt_batch_size', 1) or 1))
 
         # Limits to prevent labeling entire dataset at once
         # This allows iterative improvement - verify accuracy before labeling more
@@ -491,48 +493,133 @@ class ICLLabeler:
             else:
                 response_data = response
 
-            predicted_label = response_data.get('label', '')
-            confidence = float(response_data.get('confidence', 0.5))
-            reasoning = response_data.get('reasoning', '')
-
-            # Validate label against schema
-            valid_labels = self._get_valid_labels(schema_info)
-            if valid_labels and predicted_label not in valid_labels:
-                # Try fuzzy matching
-                predicted_label = self._fuzzy_match_label(predicted_label, valid_labels)
-                if predicted_label is None:
-                    logger.warning(f"LLM returned invalid label for {instance_id}")
-                    return None
-
-            # Create prediction
-            prediction = ICLPrediction(
-                instance_id=instance_id,
-                schema_name=schema_name,
-                predicted_label=predicted_label,
-                confidence_score=min(1.0, max(0.0, confidence)),
-                example_instance_ids=[e.instance_id for e in examples],
-                model_name=endpoint.model if hasattr(endpoint, 'model') else '',
-                reasoning=reasoning
+            return self._record_prediction(
+                instance_id, schema_name, schema_info, response_data, examples, endpoint
             )
 
-            # Store prediction
-            with self._lock:
-                if instance_id not in self.predictions:
-                    self.predictions[instance_id] = {}
-                self.predictions[instance_id][schema_name] = prediction
-                self.labeled_instance_ids.add(instance_id)
-
-                # Maybe add to verification queue
-                if self.verification_enabled and random.random() < self.verification_sample_rate:
-                    self.verification_queue.append((instance_id, schema_name))
-
-            logger.debug(f"Labeled {instance_id} with {predicted_label} (confidence: {confidence:.2f})")
-            return prediction
-
         except Exception as e:
             logger.error(f"Error labeling instance {instance_id}: {e}")
             return None
 
+    def label_instances(
+        self,
+        items: List[Tuple[str, str]],
+        schema_name: str,
+    ) -> List[Optional[ICLPrediction]]:
+        """
+        Label several ``(instance_id, text)`` items, ``prompt_batch_size`` per request.
+
+        The schema description and examples are sent once per request rather
+        than once per instance. Items the batched response leaves out, or
+        answers with an invalid label, are re-labeled alone with label_instance().
+
+        Returns:
+            One ICLPrediction (or None) per item, in order
+        """
+        from potato.ai.icl_prompt_builder import ICLPromptBuilder
+        from potato.ai.prompt_batching import (
+            batch_response_model, chunked, parse_batch_response,
+        )
+
+        if self.prompt_batch_size <= 1:
+            return [self.label_instance(iid, schema_name, text) for iid, text in items]
+
+        examples = self.get_examples_for_schema(schema_name)
+        schemas = self._get_annotation_schemes()
+        schema_info = next((s for s in schemas if s.get('name') == schema_name), None)
+        endpoint = self._get_ai_endpoint() if examples and schema_info else None
+        if endpoint is None:
+            return [self.label_instance(iid, schema_name, text) for iid, text in items]
+
+        from pydantic import BaseModel
+
+        class ICLResponse(BaseModel):
+            label: str
+            confidence: float
+            reasoning: str = ""
+
+        prompt_builder = ICLPromptBuilder()
+        results: List[Optional[ICLPrediction]] = []
+        for chunk in chunked(items, self.prompt_batch_size):
+            answers = {}
+            if len(chunk) > 1:
+                try:
+                    prompt = prompt_builder.build_batch_prompt(
+                        schema=schema_info,
+                        examples=examples,
+                        target_texts=[text for _, text in chunk],
+                    )
+                    response = endpoint.query(prompt, batch_response_model(ICLResponse))
+                    answers = parse_batch_response(
+                        response, len(chunk), getattr(endpoint, "parseStringToJson", None))
+                except Exception as e:
+                    logger.warning(
+                        f"Batched ICL request failed, labeling {len(chunk)} "
+                        f"instances one at a time: {e}"
+                    )
+            for number, (instance_id, text) in enumerate(chunk, 1):
+                prediction = None
+                if number in answers:
+                    try:
+                        prediction = self._record_prediction(
+                            instance_id, schema_name, schema_info, answers[number],
+                            examples, endpoint,
+                        )
+                    except Exception as e:
+                        logger.debug(f"Could not use batched answer for {instance_id}: {e}")
+                if prediction is None:
+                    prediction = self.label_instance(instance_id, schema_name, text)
+                results.append(prediction)
+        return results
+
+    def _record_prediction(
+        self,
+        instance_id: str,
+        schema_name: str,
+        schema_info: Dict[str, Any],
+        response_data: Dict[str, Any],
+        examples: List[HighConfidenceExample],
+        endpoint: Any,
+    ) -> Optional[ICLPrediction]:
+        """Validate one parsed answer and store it as a prediction."""
+        predicted_label = response_data.get('label', '')
+        confidence = float(response_data.get('confidence', 0.5))
+        reasoning = response_data.get('reasoning', '')
+
+        # Validate label against schema
+        valid_labels = self._get_valid_labels(schema_info)
+        if valid_labels and predicted_label not in valid_labels:
+            # Try fuzzy matching
+            predicted_label = self._fuzzy_match_label(predicted_label, valid_labels)
+            if predicted_label is None:
+                logger.warning(f"LLM returned invalid label for {instance_id}")
+                return None
+
+        # Create prediction
+        prediction = ICLPrediction(
+            instance_id=instance_id,
+            schema_name=schema_name,
+            predicted_label=predicted_label,
+            confidence_score=min(1.0, max(0.0, confidence)),
+            example_instance_ids=[e.instance_id for e in examples],
+            model_name=endpoint.model if hasattr(endpoint, 'model') else '',
+            reasoning=reasoning
+        )
+
+        # Store prediction
+        with self._lock:
+            if instance_id not in self.predictions:
+                self.predictions[instance_id] = {}
+            self.predictions[instance_id][schema_name] = prediction
+            self.labeled_instance_ids.add(instance_id)
+
+            # Maybe add to verification queue
+            if self.verification_enabled and random.random() < self.verification_sample_rate:
+                self.verification_queue.append((instance_id, schema_name))
+
+        logger.debug(f"Labeled {instance_id} with {predicted_label} (confidence: {confidence:.2f})")
+        return prediction
+
     def _get_valid_labels(self, schema_info: Dict[str, Any]) -> List[str]:
         """Extract valid labels from schema info."""
         labels = schema_info.get('labels', [])
@@ -689,6 +776,7 @@ class ICLLabeler:
                 break
 
         # Label instances
+        to_label = []
         for instance_id in unlabeled_ids:
             item = ism.get_item(instance_id)
             instance_data = item.get_data() if item else None
@@ -698,8 +786,9 @@ class ICLLabeler:
             text = instance_data.get(text_key, '')
             if not text:
                 continue
+            to_label.append((instance_id, text))
 
-            prediction = self.label_instance(instance_id, schema_name, text)
+        for prediction in self.label_instances(to_label, schema_name):
             if prediction and prediction.confidence_score >= self.confidence_threshold:
                 predictions.append(prediction)
 
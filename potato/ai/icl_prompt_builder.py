@@ -79,6 +79,46 @@ class ICLPromptBuilder:
 
         return "\n".join(parts)
 
+    def build_batch_prompt(
+        self,
+        schema: Dict[str, Any],
+        examples: List['HighConfidenceExample'],
+        target_texts: List[str]
+    ) -> str:
+        """
+        Build one ICL prompt that labels several texts.
+
+        Same instructions and examples as build_prompt(), sent once; the
+        targets are numbered and the model answers with one JSON entry each.
+
+        Args:
+            schema: Annotation schema dictionary with name, description, labels
+            examples: List of high-confidence examples
+            target_texts: The texts to be labeled, in order
+
+        Returns:
+            Complete prompt string
+        """
+        from potato.ai.prompt_batching import format_numbered_items
+
+        parts = [self._build_system_prompt(schema)]
+
+        if examples:
+            parts.append("\n## Examples\n")
+            parts.append("Here are examples of correctly labeled texts:\n")
+            for i, example in enumerate(examples, 1):
+                parts.append(self._format_example(example, i))
+
+        parts.append("\n## Your Task\n")
+        parts.append("Now label each of the following numbered texts independently:\n")
+        parts.append(format_numbered_items([
+            f'Text: "{self._truncate_text(text, self.max_target_length)}"'
+            for text in target_texts
+        ]) + "\n")
+
+        parts.append(self._build_batch_output_instructions(schema))
+        return "\n".join(parts)
+
     def _build_system_prompt(self, schema: Dict[str, Any]) -> str:
         """Build the system/instruction portion of the prompt."""
         schema_name = schema.get('name', 'unknown')
@@ -155,6 +195,27 @@ Example response (the confidence value here is illustrative only — yours shoul
 {{"label": "example_label", "confidence": 0.72, "reasoning": "The text shows clear indicators of..."}}
 ```
 
+Now provide your response as JSON:
+"""
+
+    def _build_batch_output_instructions(self, schema: Dict[str, Any]) -> str:
+        """Output format for a batched prompt: one entry per numbered text."""
+        labels_json = json.dumps(self._get_labels_from_schema(schema))
+
+        return f"""
+## Output Format
+
+Respond with a JSON object with an `items` list holding one entry per text. Each entry contains:
+- `id`: The text's number
+- `label`: Your chosen label (must be one of: {labels_json})
+- `confidence`: Your confidence score from 0.0 to 1.0 (use the full range; reflect your actual certainty)
+- `reasoning`: Brief explanation for your choice (1-2 sentences)
+
+Example response (values are illustrative only):
+```json
+{{"items": [{{"id": 1, "label": "example_label", "confidence": 0.72, "reasoning": "..."}}, {{"id": 2, "label": "other_label", "confidence": 0.45, "reasoning": "..."}}]}}
+```
+
 Now provide your response as JSON:
 """
 
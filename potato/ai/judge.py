@@ -23,7 +23,7 @@ import hashlib
 import json
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +106,11 @@ class JudgeService:
     def __init__(self, config: Dict[str, Any]):
         self.config = config or {}
         self.judge_config = self.config.get("judge_alignment", {}) or {}
+        # Instances packed into one judge request (1 = one request each).
+        try:
+            self.batch_size = max(1, int(self.judge_config.get("batch_size", 1) or 1))
+        except (TypeError, ValueError):
+            self.batch_size = 1
         self._endpoint = None
         self._endpoint_initialized = False
 
@@ -173,6 +178,39 @@ class JudgeService:
         )
         return "\n".join(p for p in parts if p != "")
 
+    def build_batch_prompt(
+        self,
+        schema_info: Dict[str, Any],
+        instance_texts: List[str],
+        few_shot_examples: Optional[List[Dict[str, str]]] = None,
+    ) -> str:
+        """Compose one judge prompt for several items, numbered [1]..[N]."""
+        from potato.ai.prompt_batching import format_numbered_items
+
+        labels = extract_labels(schema_info)
+        rubric = self.get_rubric(schema_info)
+        parts = [
+            "You are an expert evaluator acting as an impartial judge.",
+            "Assign exactly one label to each numbered item below, following the rubric. "
+            "Judge every item independently.",
+            "",
+            f"Task: {schema_info.get('description', '')}".rstrip(),
+            f"Rubric: {rubric}".rstrip(),
+            "Allowed labels: " + ", ".join(labels) if labels else "",
+        ]
+        if few_shot_examples:
+            parts.append("\nExamples (item → correct label):")
+            for ex in few_shot_examples:
+                parts.append(f"- {_truncate(ex.get('text', ''))} → {ex.get('label', '')}")
+        parts.append("\nItems to judge:")
+        parts.append(format_numbered_items([_truncate(t, 4000) for t in instance_texts]))
+        parts.append(
+            '\nRespond as JSON: {"items": [{"id": <item number>, '
+            '"label": <one of the allowed labels>, "confidence": <0.0-1.0>, '
+            '"reasoning": <one sentence>}, ...]} with one entry per item.'
+        )
+        return "\n".join(p for p in parts if p != "")
+
     # ----- judging --------------------------------------------------------
 
     def judge_instance(
@@ -232,6 +270,105 @@ class JudgeService:
             logger.error(f"Judge: query/parse failed for {instance_id}/{schema_name}: {e}")
             return None
 
+        return self._prediction_from_verdict(
+            instance_id, schema_name, valid_labels, data, endpoint,
+            prompt_version, few_shot_examples,
+        )
+
+    def judge_instances(
+        self,
+        items: List[Tuple[str, str]],
+        schema_info: Dict[str, Any],
+        few_shot_examples: Optional[List[Dict[str, str]]] = None,
+        prompt_version: Optional[str] = None,
+    ) -> List[Optional[JudgePrediction]]:
+        """Judge several ``(instance_id, text)`` items, ``batch_size`` per request.
+
+        ``few_shot_examples`` is the full example pool: examples whose ``id``
+        is in the request being judged are left out of it. Items the batched
+        response misses, or answers with an invalid label, are re-judged on
+        their own with judge_instance(). Returns one prediction (or None) per
+        item, in order.
+        """
+        from potato.ai.prompt_batching import chunked
+
+        examples = few_shot_examples or []
+        results: List[Optional[JudgePrediction]] = []
+        for chunk in chunked(items, self.batch_size):
+            ids = {iid for iid, _ in chunk}
+            shots = [e for e in examples if e.get("id") not in ids] or None
+            verdicts = self._judge_chunk(chunk, schema_info, shots, prompt_version) \
+                if len(chunk) > 1 else {}
+            for iid, text in chunk:
+                pred = verdicts.get(iid)
+                if pred is None:
+                    own_shots = [e for e in examples if e.get("id") != iid] or None
+                    pred = self.judge_instance(iid, schema_info, text,
+                                               few_shot_examples=own_shots,
+                                               prompt_version=prompt_version)
+                results.append(pred)
+        return results
+
+    def _judge_chunk(
+        self,
+        chunk: List[Tuple[str, str]],
+        schema_info: Dict[str, Any],
+        few_shot_examples: Optional[List[Dict[str, str]]],
+        prompt_version: Optional[str],
+    ) -> Dict[str, JudgePrediction]:
+        """One batched judge request; returns the usable verdicts by instance id."""
+        endpoint = self._get_endpoint()
+        if endpoint is None:
+            return {}
+
+        schema_name = schema_info.get("name", "")
+        valid_labels = extract_labels(schema_info)
+        if prompt_version is None:
+            prompt_version = compute_prompt_version(
+                self.get_rubric(schema_info), schema_name, bool(few_shot_examples)
+            )
+        prompt = self.build_batch_prompt(schema_info, [t for _, t in chunk], few_shot_examples)
+
+        try:
+            from pydantic import BaseModel
+            from potato.ai.prompt_batching import batch_response_model, parse_batch_response
+
+            class JudgeVerdict(BaseModel):
+                label: str
+                confidence: float = 0.5
+                reasoning: str = ""
+
+            response = endpoint.query(prompt, batch_response_model(JudgeVerdict))
+            answers = parse_batch_response(
+                response, len(chunk), getattr(endpoint, "parseStringToJson", None))
+        except Exception as e:
+            logger.warning(f"Judge: batched query failed for {len(chunk)} items "
+                           f"of {schema_name}, judging one at a time: {e}")
+            return {}
+
+        verdicts = {}
+        for number, (iid, _) in enumerate(chunk, 1):
+            if number not in answers:
+                continue
+            pred = self._prediction_from_verdict(
+                iid, schema_name, valid_labels, answers[number], endpoint,
+                prompt_version, few_shot_examples,
+            )
+            if pred is not None:
+                verdicts[iid] = pred
+        return verdicts
+
+    def _prediction_from_verdict(
+        self,
+        instance_id: str,
+        schema_name: str,
+        valid_labels: List[str],
+        data: Dict[str, Any],
+        endpoint: Any,
+        prompt_version: str,
+        few_shot_examples: Optional[List[Dict[str, str]]],
+    ) -> Optional[JudgePrediction]:
+        """Validate one parsed verdict. Returns None for an unusable label."""
         predicted = str(data.get("label", "")).strip()
         try:
             confidence = float(data.get("confidence", 0.5))
@@ -0,0 +1,95 @@
+"""
+Multi-item prompt batching.
+
+Labeling and judging prompts repeat the same instructions, label set and
+few-shot examples for every instance. In batched mode a caller packs several
+instances into one request, numbered ``[1]`` .. ``[N]``, and asks for a JSON
+object ``{"items": [{"id": n, ...}, ...]}``. ``parse_batch_response`` maps
+the answers back by number; callers re-query any item that is missing or
+malformed on its own, so a bad batch response costs extra requests but never
+loses an item.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+
+
+def chunked(items: Sequence[Any], size: int) -> Iterator[List[Any]]:
+    """Yield consecutive lists of at most ``size`` items."""
+    size = max(1, int(size))
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
+
+
+def format_numbered_items(texts: Sequence[str]) -> str:
+    """Render texts as ``[1]\\n<text>`` blocks separated by blank lines."""
+    return "\n\n".join(f"[{n}]\n{text}" for n, text in enumerate(texts, 1))
+
+
+def batch_response_model(item_model: Any) -> Any:
+    """
+    Pydantic model for ``{"items": [<item_model fields> + id]}``.
+
+    Endpoints that support structured output get a schema for the whole
+    batch; the rest just see it in the prompt.
+    """
+    from pydantic import create_model
+
+    numbered = create_model(f"{item_model.__name__}Item", __base__=item_model, id=(int, ...))
+    return create_model(f"{item_model.__name__}Batch", items=(List[numbered], ...))
+
+
+def parse_batch_response(response: Any, count: int,
+                         parser: Optional[Callable[[str], Any]] = None) -> Dict[int, Dict[str, Any]]:
+    """
+    Map a batched response to ``{item number: answer dict}``.
+
+    Accepts a JSON string (optionally fenced), a pydantic object, a dict
+    with an ``items`` list, or a bare list. Entries without a usable ``id``
+    fall back to their position; ids outside ``1..count`` and repeats are
+    dropped. Returns ``{}`` when nothing can be parsed.
+    """
+    data = response
+    if isinstance(response, str):
+        data = None
+        if parser is not None:
+            try:
+                data = parser(response)
+            except Exception:
+                data = None
+        if not isinstance(data, (dict, list)):
+            content = response.strip()
+            match = _FENCE_RE.search(content)
+            if match:
+                content = match.group(1).strip()
+            try:
+                data = json.loads(content)
+            except (json.JSONDecodeError, TypeError):
+                return {}
+    elif hasattr(response, "model_dump"):
+        data = response.model_dump()
+
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list):
+        return {}
+
+    answers: Dict[int, Dict[str, Any]] = {}
+    for position, entry in enumerate(data, 1):
+        if not isinstance(entry, dict):
+            continue
+        try:
+            number = int(entry.get("id", position))
+        except (TypeError, ValueError):
+            number = position
+        if 1 <= number <= count and number not in answers:
+            answers[number] = entry
+    if len(answers) < count:
+        logger.debug(f"Batched response answered {len(answers)} of {count} items")
+    return answers
@@ -0,0 +1,157 @@
+"""
+Request throttling for AI endpoints.
+
+Bulk callers (Solo Mode pre-labeling, judges) send many requests to the same
+backend from several threads. EndpointThrottle keeps them within what the
+backend will serve: a token bucket caps the request rate, and an adaptive
+backoff spaces requests out after failures (rate-limit responses, timeouts,
+an overloaded local server) and relaxes again as requests succeed.
+
+Throttles are shared per endpoint -- endpoint class, model and base URL -- so
+every component talking to the same backend draws from one budget.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Classic token bucket: ``rate`` tokens per second, holding at most ``burst``.
+
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class EndpointThrottle:
+    """
+    Rate limit plus adaptive backoff for one endpoint.
+
+    Each failure doubles the pause imposed before the next request (from
+    ``backoff_initial`` up to ``backoff_max``); each success halves it, so a
+    backend that recovers is back at full speed after a few requests.
+    """
+
+    def __init__(self, requests_per_second: float = 0.0, burst: int = 1,
+                 backoff_initial: float = 1.0, backoff_max: float = 60.0):
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._backoff = 0.0
+        self._resume_at = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.throttled_seconds = 0.0
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        with self._lock:
+            pause = self._resume_at - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+        waited = self.bucket.acquire() + max(0.0, pause)
+        with self._lock:
+            self.requests += 1
+            self.throttled_seconds += waited
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._backoff:
+                self._backoff = self._backoff / 2 if self._backoff / 2 >= self.backoff_initial else 0.0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._backoff = min(self.backoff_max,
+                                self._backoff * 2 if self._backoff else self.backoff_initial)
+            self._resume_at = time.monotonic() + self._backoff
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Send one request through the throttle, recording how it went."""
+        self.acquire()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    @property
+    def current_backoff(self) -> float:
+        with self._lock:
+            return self._backoff
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "current_backoff": self._backoff,
+                "requests_per_second": self.bucket.rate,
+            }
+
+
+_throttles: Dict[str, EndpointThrottle] = {}
+_throttles_lock = threading.Lock()
+
+
+def endpoint_key(endpoint: Any) -> str:
+    """Identify the backend an endpoint talks to."""
+    ai_config = getattr(endpoint, "ai_config", None) or {}
+    base_url = ai_config.get("base_url", "") if isinstance(ai_config, dict) else ""
+    return f"{type(endpoint).__name__}:{getattr(endpoint, 'model', '')}@{base_url}"
+
+
+def get_endpoint_throttle(endpoint: Any, requests_per_second: float = 0.0,
+                          burst: int = 1) -> EndpointThrottle:
+    """
+    Return the shared throttle for ``endpoint``'s backend, creating it if needed.
+
+    The first caller's rate settings win; a later caller asking for a different
+    rate gets the existing throttle and a debug log line.
+    """
+    key = endpoint_key(endpoint)
+    with _throttles_lock:
+        throttle = _throttles.get(key)
+        if throttle is None:
+            throttle = EndpointThrottle(requests_per_second, burst)
+            _throttles[key] = throttle
+        elif throttle.bucket.rate != float(requests_per_second):
+            logger.debug(f"Throttle for {key} already exists at {throttle.bucket.rate} req/s")
+        return throttle
+
+
+def reset_throttles() -> None:
+    """Forget every shared throttle (for tests)."""
+    with _throttles_lock:
+        _throttles.clear()
@@ -31,6 +31,8 @@ import time
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List, Union
 
+from potato.user_registry import UserRegistryLog
+
 logger = logging.getLogger(__name__)
 
 # Global singleton instance of the user authenticator with thread-safe lock
@@ -469,41 +471,32 @@ class UserAuthenticator:
         self.users_loaded_from_file = 0
         self.user_file_parse_errors = 0
 
+        # The user file is an append-only log: registrations and password
+        # changes add one line each (see potato.user_registry).
+        self._registry = UserRegistryLog(self.user_config_path)
+
         # Load users from config file if it exists
         if os.path.isfile(self.user_config_path):
             logger.info(f"Loading users from {self.user_config_path}")
             before = len(self.users)
-            with open(self.user_config_path, "rt", encoding="utf-8") as f:
-                for lineno, line in enumerate(f.readlines(), start=1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    # Tolerate a malformed line instead of aborting the whole
-                    # load (and crashing server boot) on one bad row.
-                    try:
-                        single_user = json.loads(line)
-                    except (ValueError, TypeError) as e:
-                        self.user_file_parse_errors += 1
-                        logger.error(
-                            f"User file {self.user_config_path} line {lineno}: "
-                            f"not valid JSON ({e}); skipping. Expected JSONL — "
-                            f'one object per line, e.g. {{"username": "alice", "password": "x"}}'
-                        )
-                        continue
-                    # Detect salt$hash format in password field
-                    password_val = single_user.get("password", "") if isinstance(single_user, dict) else ""
-                    if password_val and _is_salted_hash(password_val):
-                        self._add_user_prehashed(single_user)
-                    else:
-                        self.add_single_user(single_user)
+            for single_user in self._registry.load():
+                # Detect salt$hash format in password field
+                password_val = single_user.get("password", "") if isinstance(single_user, dict) else ""
+                if password_val and _is_salted_hash(password_val):
+                    self._add_user_prehashed(single_user)
+                else:
+                    self.add_single_user(single_user)
+            self.user_file_parse_errors = self._registry.parse_errors
             self.users_loaded_from_file = len(self.users) - before
             # Users provisioned through the user file are the roster an admin
             # explicitly wrote down, so they are authorized by definition. Without
             # this, `allow_all_users: false` plus a user_config_path but no
             # `user_config.users` list would lock out the very people it provisions.
+            authorized = set(self.authorized_users)
             for username in self.users:
-                if username not in self.authorized_users:
+                if username not in authorized:
                     self.authorized_users.append(username)
+                    authorized.add(username)
 
     def _initialize_backend(self, auth_method: str, auth_config: dict = None) -> AuthBackend:
         if auth_method == "in_memory":
@@ -698,40 +691,64 @@ class UserAuthenticator:
                     if hasattr(self.auth_backend, 'users') else _hash_password_with_salt(new_password)
         return result
 
-    def save_user_config(self):
-        """Save user config to file.
+    def _persists_user_file(self) -> bool:
+        """Whether registrations are written to ``user_config_path``.
 
-        Saves when:
+        They are when:
         - auth_method is in_memory AND user_config_path was explicitly configured
         - auth_method is not in_memory and not database (other file-based methods)
 
-        Skips when:
+        They are not when:
         - auth_method is database (DB handles its own persistence)
         - auth_method is in_memory with auto-generated default path (preserve old behavior)
         """
         if self.auth_method == "database":
             logger.debug("User config not saved - using database authentication (DB handles persistence)")
-            return
+            return False
 
         if self.auth_method == "in_memory" and not self.user_config_path_explicit:
             logger.debug("User config not saved - using in_memory with default path")
-            return
-
-        if self.user_config_path:
-            with open(self.user_config_path, "wt", encoding="utf-8") as f:
-                for k in self.userlist:
-                    user_data = self.users.get(k, {})
-                    if isinstance(user_data, dict):
-                        # Ensure password field contains the hashed value
-                        output = dict(user_data)
-                        if hasattr(self.auth_backend, 'users') and k in self.auth_backend.users:
-                            output["password"] = self.auth_backend.users[k]
-                        f.write(json.dumps(output) + "\n")
-                    else:
-                        f.write(json.dumps({"username": k}) + "\n")
-            logger.info(f"User info file saved at: {self.user_config_path}")
-        else:
+            return False
+
+        if not self.user_config_path:
             logger.warning("WARNING: user_config_path not specified, user registration info are not saved")
+            return False
+        return True
+
+    def _user_record(self, username: str) -> dict:
+        """The line written to the user file for one user."""
+        user_data = self.users.get(username, {})
+        if not isinstance(user_data, dict):
+            return {"username": username}
+        # Ensure password field contains the hashed value
+        output = dict(user_data)
+        if hasattr(self.auth_backend, 'users') and username in self.auth_backend.users:
+            output["password"] = self.auth_backend.users[username]
+        return output
+
+    def persist_user(self, username: str):
+        """Append one user's current record to the user file.
+
+        Call after a registration or password change. O(1) regardless of how
+        many users exist; the log compacts itself as superseded records pile up.
+        """
+        if self._persists_user_file():
+            self._registry.append(self._user_record(username))
+
+    def save_user_config(self):
+        """Rewrite the whole user file from memory, one line per user.
+
+        Same persistence rules as :meth:`persist_user`. Prefer that after a
+        single change; this is O(total users).
+        """
+        if self._persists_user_file():
+            self._registry.write_snapshot(self._user_record(k) for k in list(self.userlist))
+            logger.info(f"User info file saved at: {self.user_config_path}")
+
+    def export_user_config(self, path: str):
+        """Write every user to ``path`` in the user-file format: a compacted copy of the log."""
+        self._registry.write_snapshot((self._user_record(k) for k in list(self.userlist)), path)
+        logger.info(f"Exported {len(self.userlist)} users to {path}")
 
     # --- Token-based password reset ---
 
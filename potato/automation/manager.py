@@ -17,6 +17,7 @@ from potato.automation.config import AutomationConfig
 from potato.automation.rules import AutomationRule
 from potato.automation.storage import OutcomeStore
 from potato.automation.worker import AutomationWorker
+from potato.server_utils.conditions import required_fields
 
 logger = logging.getLogger("potato.automation")
 
@@ -30,17 +31,52 @@ class AutomationManager:
         self.store = OutcomeStore()
         self.worker = AutomationWorker(on_outcome=self.store.record_outcome)
         self.worker.start()
+        self._index_rules()
         logger.info("AutomationManager initialized with %d rule(s)", len(self.rules))
 
+    def _index_rules(self) -> None:
+        """Index rules by a top-level field their conditions require.
+
+        A rule that needs ``status`` can't fire for an item without a
+        ``status`` key, so process_item only evaluates the rules keyed by the
+        item's own fields, plus the ones that need no field at all.
+        """
+        self._unkeyed: List[int] = []
+        self._by_field: Dict[str, List[int]] = {}
+        for i, rule in enumerate(self.rules):
+            rule.matches({})  # compile the predicate now rather than per item
+            needed = required_fields(rule.when)
+            if needed:
+                # Any one required field is enough to rule the item out.
+                self._by_field.setdefault(min(needed), []).append(i)
+            else:
+                self._unkeyed.append(i)
+        self._indexed = (id(self.rules), len(self.rules))
+
+    def _candidate_rules(self, item_data: Dict[str, Any]) -> List[AutomationRule]:
+        if self._indexed != (id(self.rules), len(self.rules)):
+            self._index_rules()
+        if not self._by_field or not isinstance(item_data, dict):
+            return [self.rules[i] for i in self._unkeyed]
+        picked = list(self._unkeyed)
+        for key in self._by_field.keys() & item_data.keys():
+            picked.extend(self._by_field[key])
+        if len(picked) > 1:
+            picked.sort()  # keep the configured rule order
+        return [self.rules[i] for i in picked]
+
     def process_item(self, item_id: str, item_data: Dict[str, Any]) -> int:
-        """Evaluate all rules against an item. Returns the number of rules fired.
+        """Evaluate the rules against an item. Returns the number of rules fired.
 
-        Never raises into the caller (ingestion must not break).
+        Only rules whose required fields the item carries are evaluated (see
+        ``_index_rules``). Never raises into the caller (ingestion must not
+        break).
         """
         fired = 0
         try:
-            for rule in self.rules:
-                if not rule.fires_for(str(item_id), item_data or {}):
+            item_data = item_data or {}
+            for rule in self._candidate_rules(item_data):
+                if not rule.fires_for(str(item_id), item_data):
                     continue
                 fired += 1
                 ctx = {"item_id": str(item_id), "item_data": item_data, "rule": rule.name}
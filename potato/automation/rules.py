@@ -26,9 +26,9 @@ from __future__ import annotations
 
 import hashlib
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Union
 
-from potato.server_utils.conditions import matches_all
+from potato.server_utils.conditions import compile_conditions
 
 
 def deterministic_sample(item_id: str, salt: str) -> float:
@@ -44,6 +44,9 @@ class AutomationRule:
     sample_rate: float = 1.0
     actions: List[Dict[str, Any]] = field(default_factory=list)
     enabled: bool = True
+    _predicate: Callable[[Dict[str, Any]], bool] = field(
+        default=None, init=False, repr=False, compare=False)
+    _compiled_when: Any = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "AutomationRule":
@@ -56,7 +59,11 @@ class AutomationRule:
         )
 
     def matches(self, item_data: Dict[str, Any]) -> bool:
-        return matches_all(self.when, item_data)
+        # Compiled on first use and again only if ``when`` is reassigned.
+        if self._predicate is None or self._compiled_when is not self.when:
+            self._predicate = compile_conditions(self.when)
+            self._compiled_when = self.when
+        return self._predicate(item_data)
 
     def sampled(self, item_id: str) -> bool:
         if self.sample_rate >= 1.0:
@@ -0,0 +1,374 @@
+"""
+Behavioral event storage.
+
+SQLite-backed persistence for the two unbounded streams of
+:class:`~potato.interaction_tracking.BehavioralData` — interaction events and
+annotation changes — via the universal persistence layer
+(``<task_dir>/project.sqlite``). Opt in with::
+
+    behavioral_event_store:
+      enabled: true
+      retention_days: 90          # optional; drop raw events older than this
+      max_events_per_user: 50000  # optional; keep only each user's newest N
+
+Why not ``user_state.json``: that file is fully re-serialized and atomically
+rewritten on every annotation save (``user_state_management.py``). Clicks, focus
+changes and label toggles accumulate for as long as an annotator works, so a
+long session made every save slower and every file larger, with no bound. With
+the store enabled, ``/api/track_interactions`` and
+``/api/track_annotation_change`` append here instead, and the user state keeps
+only what is bounded per instance: timing, focus, scroll depth, AI usage and the
+typing/telemetry sketches. Save size then depends on how much was annotated, not
+on how long it took.
+
+Why one row per event, unlike :mod:`potato.typing_store`: these streams are
+read selectively — one annotator's trail on one item for adjudication, counts by
+event type and change source for the admin dashboard — rather than wholesale, so
+a row per event is what makes those reads SQL aggregates instead of scans.
+
+Events recorded before the store was enabled stay in ``user_state.json``. The
+readers (:func:`merge_stored_events`, the admin analytics) add the stored events
+to whatever the file holds, so switching the store on needs no migration.
+
+Retention is per project and covers the raw typing and drawing streams as well:
+:func:`apply_retention` deletes old rows here and drops the packed event blobs
+from :mod:`potato.typing_store` and :mod:`potato.annotation_telemetry_store`,
+keeping their summaries.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from potato.interaction_tracking import AnnotationChange, InteractionEvent
+from potato.persistence import Migration, get_db, register_migration
+
+logger = logging.getLogger(__name__)
+
+#: ``stream`` values.
+INTERACTION = "interaction"
+ANNOTATION_CHANGE = "annotation_change"
+
+#: How often the write path re-applies the retention policy, per process.
+RETENTION_INTERVAL_S = 3600
+
+
+_BEHAVIORAL_MIGRATION = Migration(
+    name="0001_behavioral_events",
+    sql="""
+    CREATE TABLE IF NOT EXISTS behavioral_events (
+        id               INTEGER PRIMARY KEY,
+        project          TEXT NOT NULL,
+        user_id          TEXT NOT NULL,
+        instance_id      TEXT NOT NULL,
+        stream           TEXT NOT NULL,   -- 'interaction' | 'annotation_change'
+        recorded_at      REAL NOT NULL,   -- server clock; what retention keys on
+        timestamp        REAL,            -- the event's own timestamp
+
+        -- An interaction's event_type/target, or a change's action/schema_name:
+        -- the columns the admin dashboard groups by.
+        event_type       TEXT NOT NULL,
+        target           TEXT,
+        label_name       TEXT,
+        source           TEXT,
+        phase            TEXT,
+        page             TEXT,
+
+        payload          TEXT             -- remaining fields as JSON
+    );
+    CREATE INDEX IF NOT EXISTS idx_behavioral_instance
+        ON behavioral_events (project, user_id, instance_id);
+    CREATE INDEX IF NOT EXISTS idx_behavioral_recorded
+        ON behavioral_events (project, recorded_at);
+    """,
+)
+
+# Registered at import so the table exists on the first get_db() call.
+register_migration(_BEHAVIORAL_MIGRATION)
+
+
+def _db(task_dir: str):
+    """Connection for the behavioral store, guaranteeing the migration is registered.
+
+    register_migration is idempotent, so this is a no-op in normal operation. It
+    makes the store robust when a test helper (clear_migrations) has wiped the
+    process-global registry before the first get_db() for this task_dir.
+    """
+    register_migration(_BEHAVIORAL_MIGRATION)
+    return get_db(task_dir)
+
+
+def enabled_store(config_data: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """``(task_dir, project)`` when the store is enabled for this config, else None."""
+    from potato.server_utils.config_module import get_behavioral_event_store_config
+    if not get_behavioral_event_store_config(config_data)["enabled"]:
+        return None
+    return (config_data.get("task_dir") or ".",
+            config_data.get("annotation_task_name") or "potato")
+
+
+def _event_row(event) -> Tuple[Any, ...]:
+    """``(stream, timestamp, event_type, target, label_name, source, phase, page, payload)``."""
+    if isinstance(event, AnnotationChange):
+        payload = {"old_label": event.old_label, "old_value": event.old_value,
+                   "new_value": event.new_value}
+        return (ANNOTATION_CHANGE, event.timestamp, event.action, event.schema_name,
+                event.label_name, event.source, event.phase, event.page,
+                json.dumps(payload))
+    payload = {"client_timestamp": event.client_timestamp,
+               "metadata": event.metadata or {}}
+    return (INTERACTION, event.timestamp, event.event_type, event.target,
+            None, None, None, None, json.dumps(payload))
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    """A stored row in the shape of the event's ``to_dict()``, plus ``stream``."""
+    payload = json.loads(row["payload"]) if row["payload"] else {}
+    if row["stream"] == ANNOTATION_CHANGE:
+        d = AnnotationChange(
+            timestamp=row["timestamp"], schema_name=row["target"] or "",
+            label_name=row["label_name"], old_label=payload.get("old_label"),
+            action=row["event_type"], old_value=payload.get("old_value"),
+            new_value=payload.get("new_value"), source=row["source"] or "user",
+            phase=row["phase"], page=row["page"],
+        ).to_dict()
+    else:
+        d = InteractionEvent(
+            event_type=row["event_type"], timestamp=row["timestamp"],
+            target=row["target"] or "", instance_id=row["instance_id"],
+            client_timestamp=payload.get("client_timestamp"),
+            metadata=payload.get("metadata") or {},
+        ).to_dict()
+    d["stream"] = row["stream"]
+    return d
+
+
+def record_events(
+    task_dir: str,
+    *,
+    project: str,
+    user_id: str,
+    instance_id: str,
+    events: Iterable[Any],
+) -> int:
+    """Append ``InteractionEvent``/``AnnotationChange`` objects; return how many.
+
+    One transaction per call, so a flushed batch of interactions costs one
+    commit rather than one per event.
+    """
+    now = time.time()
+    rows = [(project, user_id, instance_id, now, *_event_row(e)) for e in events]
+    if not rows:
+        return 0
+    conn = _db(task_dir)
+    conn.executemany(
+        """INSERT INTO behavioral_events
+               (project, user_id, instance_id, recorded_at, stream, timestamp,
+                event_type, target, label_name, source, phase, page, payload)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        rows,
+    )
+    conn.commit()
+    return len(rows)
+
+
+def events_for_instance(
+    task_dir: str, project: str, user_id: str, instance_id: str,
+    stream: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """One annotator's events on one instance, oldest first."""
+    sql = ("SELECT * FROM behavioral_events "
+           "WHERE project = ? AND user_id = ? AND instance_id = ?")
+    params: List[Any] = [project, user_id, instance_id]
+    if stream is not None:
+        sql += " AND stream = ?"
+        params.append(stream)
+    sql += " ORDER BY timestamp ASC, id ASC"
+    return [_row_to_dict(r) for r in _db(task_dir).execute(sql, params).fetchall()]
+
+
+def events_for_user(
+    task_dir: str, project: str, user_id: str,
+    stream: Optional[str] = None, limit: int = 10000,
+) -> List[Dict[str, Any]]:
+    """A user's events across instances, newest first."""
+    sql = "SELECT * FROM behavioral_events WHERE project = ? AND user_id = ?"
+    params: List[Any] = [project, user_id]
+    if stream is not None:
+        sql += " AND stream = ?"
+        params.append(stream)
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    return [_row_to_dict(r) for r in _db(task_dir).execute(sql, params).fetchall()]
+
+
+def merge_stored_events(
+    bd: Dict[str, Any], task_dir: str, project: str, user_id: str, instance_id: str,
+) -> Dict[str, Any]:
+    """A copy of a ``BehavioralData.to_dict()`` with the stored events added.
+
+    Anything already in the dict — events recorded before the store was
+    enabled — is kept; the stored ones are appended and each list re-sorted by
+    timestamp.
+    """
+    merged = dict(bd)
+    by_stream: Dict[str, List[Dict[str, Any]]] = {}
+    for event in events_for_instance(task_dir, project, user_id, instance_id):
+        by_stream.setdefault(event.pop("stream"), []).append(event)
+    for key, stream in (("interactions", INTERACTION),
+                        ("annotation_changes", ANNOTATION_CHANGE)):
+        extra = by_stream.get(stream)
+        if not extra:
+            continue
+        combined = list(merged.get(key) or []) + extra
+        combined.sort(key=lambda e: (e.get("timestamp") or 0)
+                      if isinstance(e, dict) else 0)
+        merged[key] = combined
+    return merged
+
+
+def instance_counts(
+    task_dir: str, project: str, user_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Event counts per user, instance, stream, event type and change source.
+
+    The admin analytics need only counts — events per instance, interactions
+    by type, changes by source — so this answers them without loading a single
+    event.
+    """
+    sql = ("SELECT user_id, instance_id, stream, event_type, source, "
+           "COUNT(*) AS n FROM behavioral_events WHERE project = ?")
+    params: List[Any] = [project]
+    if user_id is not None:
+        sql += " AND user_id = ?"
+        params.append(user_id)
+    sql += " GROUP BY user_id, instance_id, stream, event_type, source"
+    return [dict(r) for r in _db(task_dir).execute(sql, params).fetchall()]
+
+
+def aggregate_by_user(task_dir: str, project: str) -> List[Dict[str, Any]]:
+    """Per-annotator event totals, most events first."""
+    rows = _db(task_dir).execute(
+        f"""SELECT
+              user_id,
+              COUNT(DISTINCT instance_id)                     AS instances,
+              SUM(stream = '{INTERACTION}')                   AS interactions,
+              SUM(stream = '{ANNOTATION_CHANGE}')             AS annotation_changes,
+              MIN(recorded_at)                                AS first_recorded_at,
+              MAX(recorded_at)                                AS last_recorded_at
+            FROM behavioral_events
+            WHERE project = ?
+            GROUP BY user_id
+            ORDER BY COUNT(*) DESC""",
+        (project,),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def count_events(task_dir: str, project: str, stream: Optional[str] = None) -> int:
+    sql = "SELECT COUNT(*) AS n FROM behavioral_events WHERE project = ?"
+    params: List[Any] = [project]
+    if stream is not None:
+        sql += " AND stream = ?"
+        params.append(stream)
+    row = _db(task_dir).execute(sql, params).fetchone()
+    return int(row["n"]) if row else 0
+
+
+def delete_for_user(task_dir: str, project: str, user_id: str) -> int:
+    """Remove a user's events. Supports data-deletion requests."""
+    conn = _db(task_dir)
+    cur = conn.execute(
+        "DELETE FROM behavioral_events WHERE project = ? AND user_id = ?",
+        (project, user_id),
+    )
+    conn.commit()
+    return cur.rowcount
+
+
+# --------------------------------------------------------------------------
+# Retention
+# --------------------------------------------------------------------------
+
+
+def apply_retention(
+    task_dir: str,
+    project: str,
+    retention_days: Optional[float] = None,
+    max_events_per_user: Optional[int] = None,
+    now: Optional[float] = None,
+) -> Dict[str, int]:
+    """Enforce the project's retention policy; return what was removed.
+
+    ``retention_days`` deletes behavioral events recorded before the cutoff and
+    drops the raw typing and drawing streams of sessions that ended before it
+    (their summaries, which the detectors and exports read, are kept).
+    ``max_events_per_user`` then trims each annotator to their newest events.
+    """
+    from potato import annotation_telemetry_store, typing_store
+
+    removed = {"events": 0, "typing_streams": 0, "telemetry_streams": 0}
+    conn = _db(task_dir)
+    if retention_days is not None:
+        cutoff = (now if now is not None else time.time()) - retention_days * 86400
+        cur = conn.execute(
+            "DELETE FROM behavioral_events WHERE project = ? AND recorded_at < ?",
+            (project, cutoff),
+        )
+        conn.commit()
+        removed["events"] += cur.rowcount
+        removed["typing_streams"] = typing_store.drop_events_before(
+            task_dir, project, cutoff)
+        removed["telemetry_streams"] = annotation_telemetry_store.drop_events_before(
+            task_dir, project, cutoff)
+
+    if max_events_per_user is not None:
+        over = conn.execute(
+            """SELECT user_id FROM behavioral_events WHERE project = ?
+               GROUP BY user_id HAVING COUNT(*) > ?""",
+            (project, max_events_per_user),
+        ).fetchall()
+        for row in over:
+            cur = conn.execute(
+                """DELETE FROM behavioral_events WHERE id IN (
+                       SELECT id FROM behavioral_events
+                       WHERE project = ? AND user_id = ?
+                       ORDER BY id DESC LIMIT -1 OFFSET ?)""",
+                (project, row["user_id"], max_events_per_user),
+            )
+            removed["events"] += cur.rowcount
+        conn.commit()
+    return removed
+
+
+_last_retention: Dict[Tuple[str, str], float] = {}
+_retention_lock = threading.Lock()
+
+
+def maybe_apply_retention(task_dir: str, project: str, settings: Dict[str, Any]) -> None:
+    """Apply retention at most once per ``RETENTION_INTERVAL_S`` per project.
+
+    Called from the write path, so a long-running server enforces the policy
+    without a scheduler; the first write after start-up applies it.
+    """
+    if settings.get("retention_days") is None and settings.get("max_events_per_user") is None:
+        return
+    key = (task_dir, project)
+    now = time.time()
+    with _retention_lock:
+        if now - _last_retention.get(key, 0.0) < RETENTION_INTERVAL_S:
+            return
+        _last_retention[key] = now
+    try:
+        removed = apply_retention(task_dir, project,
+                                  retention_days=settings.get("retention_days"),
+                                  max_events_per_user=settings.get("max_events_per_user"),
+                                  now=now)
+        if any(removed.values()):
+            logger.info("Behavioral retention for %s removed %s", project, removed)
+    except Exception as e:
+        logger.warning("Could not apply behavioral retention: %s", e)
@@ -6,18 +6,143 @@ The main CLI entry point for running the Potato annotation server.
 It serves as a bridge between the command line and the Flask server application.
 
 The CLI can be invoked directly or through the potato command after installation.
+
+Only ``start`` needs the server. Every other subcommand is dispatched from
+here, and each imports only the module that implements it, so ``potato
+validate`` or ``potato migrate`` starts without loading Flask, pandas and
+the route tree. ``tests/performance/test_import_budget.py`` holds each
+subcommand to an import-time and module-count budget; keep heavy imports out
+of this module and out of the subcommand modules' top level.
 """
 
-from potato.flask_server import main
-from potato import *
+import sys
+
+from potato.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _transcripts(argv):
+    from potato.transcript_cli import main as transcripts_main
+    return transcripts_main(argv)
+
+
+def _convokit(argv):
+    from potato.convokit.cli import main as convokit_main
+    return convokit_main(argv)
+
+
+def _import(argv):
+    from potato.importers.cli import main as import_main
+    return import_main(argv)
+
+
+def _download_models(argv):
+    from potato.models_cli import main as models_main
+    return models_main(argv)
+
+
+def _deploy(argv):
+    from potato.deploy.cli import main as deploy_main
+    return deploy_main(argv)
+
+
+def _share(argv):
+    from potato.deploy.share_cli import main as share_main
+    return share_main(argv)
+
+
+def _validate(argv):
+    from potato.validate_cli import main as validate_main
+    return validate_main(argv)
+
+
+def _export(argv):
+    from potato.export.cli import main as export_main
+    return export_main(argv)
+
+
+#: Subcommands dispatched before the server's own argument parsing. Each takes
+#: input paths, a corpus or a model name rather than a config file, or has its
+#: own subcommands and flags, so routing it through the server parser would
+#: mean bending both.
+SUBCOMMANDS = {
+    "transcripts": _transcripts,
+    "convokit": _convokit,
+    "import": _import,
+    "download-models": _download_models,
+    "deploy": _deploy,
+    "share": _share,
+    "validate": _validate,
+    "export": _export,
+}
+
+
+def main(argv=None, run_server=None):
+    """
+    Dispatch a ``potato`` command line.
+
+    Args:
+        argv: Arguments after the program name; defaults to ``sys.argv[1:]``.
+        run_server: What ``start`` runs. ``flask_server.main`` passes its own
+            ``run_server`` so a server launched as a script keeps running in
+            that module; by default it is imported from ``potato.flask_server``.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv and argv[0] in SUBCOMMANDS:
+        sys.exit(SUBCOMMANDS[argv[0]](argv[1:]))
+
+    # Parse command line arguments
+    from potato.server_utils.arg_utils import arguments
+    args = arguments(argv)
+
+    if args.mode == 'start':
+        logger.info("Starting server mode")
+        if run_server is None:
+            from potato.flask_server import run_server
+        run_server(args)
+    elif args.mode == 'reset-password':
+        logger.info("Starting password reset")
+        from potato.password_reset import cli_reset_password
+        cli_reset_password(args)
+        return
+    elif args.mode == 'migrate':
+        logger.info("Starting config migration")
+        from potato.migrate_cli import main as migrate_main
+        # Pass arguments to migrate CLI
+        migrate_args = [args.config_file]
+        if args.to_v2:
+            migrate_args.append("--to-v2")
+        if args.output_file:
+            migrate_args.extend(["--output", args.output_file])
+        if args.in_place:
+            migrate_args.append("--in-place")
+        if args.dry_run:
+            migrate_args.append("--dry-run")
+        if args.quiet:
+            migrate_args.append("--quiet")
+        sys.exit(migrate_main(migrate_args))
+    elif args.mode == 'codebook':
+        logger.info("Starting codebook initialization")
+        from potato.codebook_cli import main as codebook_main
+        sys.exit(codebook_main([args.config_file]))
+    elif args.mode == 'repair-annotations':
+        logger.info("Starting single-select annotation repair")
+        from potato.repair_cli import run_repair
+        sys.exit(run_repair(args))
+
+    logger.info("Annotation platform shutdown complete")
+
 
 def potato():
     """
     Main CLI entry point for the Potato annotation platform.
 
     This function serves as the primary interface for starting the annotation server
-    from the command line. It delegates to the main() function in flask_server.py
-    which handles argument parsing, configuration loading, and server startup.
+    from the command line. It delegates to main(), which handles argument parsing
+    and dispatches to the server or to a subcommand.
 
     Side Effects:
         - Initializes the Flask application
@@ -30,4 +155,4 @@ def potato():
 
 if __name__ == '__main__':
     # Direct script execution - start the Potato annotation server
-    potato()
\ No newline at end of file
+    potato()
@@ -42,6 +42,7 @@ from .reader import (
     resolve_corpus_dir,
 )
 from .schema import CorpusIndex
+from .stream import CorpusStream, open_corpus_stream
 
 __all__ = [
     "BIN_DELIM_L",
@@ -51,8 +52,10 @@ __all__ = [
     "Corpus",
     "ConvoKitReadError",
     "CorpusIndex",
+    "CorpusStream",
     "Utterance",
     "iter_utterance_lines",
+    "open_corpus_stream",
     "read_corpus",
     "resolve_corpus_dir",
 ]
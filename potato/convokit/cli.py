@@ -10,6 +10,11 @@ A corpus can be named (downloaded and cached where ConvoKit itself caches, so an
 existing install shares the cache), or given as a directory or ``.zip`` already on
 disk. A path that exists always wins over a manifest name.
 
+``--stream`` is for corpora too large to hold in memory: utterances are spilled
+to a scratch SQLite index (``--index-dir``) and items are built and written one
+conversation at a time. The output is the same, except that ``--sample`` draws
+a different (still seeded) selection.
+
 ``--dry-run`` reports what was read — conversation and utterance counts, whether
 the corpus uses the legacy key names, which metadata was dropped or skipped, and
 how many reply-to links dangled or cycled — without writing anything. It is the
@@ -29,7 +34,8 @@ import logging
 import os
 import random
 import sys
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import textwrap
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from .config_gen import SuggestOptions, generate_config
 from .download import (
@@ -40,8 +46,9 @@ from .download import (
     list_corpora,
     resolve,
 )
-from .items import ItemBuildError, ItemOptions, build_items
+from .items import ItemBuildError, ItemOptions, build_items, iter_items
 from .reader import ConvoKitReadError, DEFAULT_DROPPED_META, read_corpus
+from .stream import open_corpus_stream
 
 logger = logging.getLogger(__name__)
 
@@ -168,6 +175,21 @@ def build_parser() -> argparse.ArgumentParser:
         help="Repeatable. KEY is convo.<field> or utt.<field>",
     )
 
+    scale = parser.add_argument_group("large corpora")
+    scale.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Keep the corpus on disk and write items conversation by conversation, "
+            "so memory stays flat however large the corpus is"
+        ),
+    )
+    scale.add_argument(
+        "--index-dir",
+        metavar="DIR",
+        help="--stream: where to put the scratch index (default: the temp directory)",
+    )
+
     meta = parser.add_argument_group("metadata")
     meta.add_argument(
         "--keep-meta", default="", metavar="A,B", help="Keep these normally-dropped fields"
@@ -262,36 +284,40 @@ def _apply_filters(corpus, filters, split: Optional[str]) -> Tuple[int, int]:
     if split:
         convo_filters.append(("split", split))
 
-    dropped_convos = 0
-    if convo_filters:
-        for convo_id in list(corpus.conversations):
-            meta = corpus.conversations[convo_id].meta
-            if not all(_matches(meta.get(n), v) for n, v in convo_filters):
-                for uid in corpus.conversations[convo_id].utterance_ids:
-                    corpus.utterances.pop(uid, None)
-                del corpus.conversations[convo_id]
-                dropped_convos += 1
-
-    dropped_utts = 0
-    if utt_filters:
-        for uid in list(corpus.utterances):
-            meta = corpus.utterances[uid].meta
-            if not all(_matches(meta.get(n), v) for n, v in utt_filters):
-                convo = corpus.conversations.get(corpus.utterances[uid].conversation_id)
-                if convo and uid in convo.utterance_ids:
-                    convo.utterance_ids.remove(uid)
-                del corpus.utterances[uid]
-                dropped_utts += 1
-
-    return dropped_convos, dropped_utts
-
-
-def _report(corpus, items: List[Dict[str, Any]], opts: ItemOptions) -> str:
-    dangling = sum(i.get("_convokit", {}).get("dangling_reply_to", 0) for i in items)
-    cycles = sum(i.get("_convokit", {}).get("broken_cycles", 0) for i in items)
-    turns = sum(len(i.get(opts.field_name, ())) for i in items)
-    depths = [t.get("depth", 0) for i in items for t in i.get(opts.field_name, ())]
+    def predicate(pairs):
+        if not pairs:
+            return None
+        return lambda meta: all(_matches(meta.get(n), v) for n, v in pairs)
+
+    return corpus.filter(
+        conversation=predicate(convo_filters), utterance=predicate(utt_filters)
+    )
+
 
+class _ItemStats:
+    """What the report says about the items, counted as they go by."""
+
+    def __init__(self, opts: ItemOptions):
+        self._field = opts.field_name
+        self.items = 0
+        self.turns = 0
+        self.max_depth = 0
+        self.dangling = 0
+        self.cycles = 0
+
+    def observe(self, items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for item in items:
+            provenance = item.get("_convokit", {})
+            turns = item.get(self._field, ())
+            self.items += 1
+            self.turns += len(turns)
+            self.max_depth = max([self.max_depth] + [t.get("depth", 0) for t in turns])
+            self.dangling += provenance.get("dangling_reply_to", 0)
+            self.cycles += provenance.get("broken_cycles", 0)
+            yield item
+
+
+def _report(corpus, stats: _ItemStats, opts: ItemOptions) -> str:
     lines = [
         f"corpus:         {corpus.name}"
         + (f" (version {corpus.version})" if corpus.version is not None else ""),
@@ -299,17 +325,17 @@ def _report(corpus, items: List[Dict[str, Any]], opts: ItemOptions) -> str:
         f"key format:     {'LEGACY (user/root/users.json)' if corpus.legacy else 'modern'}",
         f"read:           {len(corpus.utterances)} utterances, "
         f"{len(corpus.conversations)} conversations, {len(corpus.speakers)} speakers",
-        f"items:          {len(items)} ({opts.unit} unit), {turns} turns total",
-        f"max reply depth: {max(depths) if depths else 0}",
+        f"items:          {stats.items} ({opts.unit} unit), {stats.turns} turns total",
+        f"max reply depth: {stats.max_depth}",
     ]
     if corpus.dropped_meta_fields:
         lines.append(f"dropped meta:   {', '.join(sorted(corpus.dropped_meta_fields))}")
     if corpus.skipped_binary_fields:
         lines.append(f"skipped binary: {', '.join(sorted(corpus.skipped_binary_fields))}")
-    if dangling:
-        lines.append(f"dangling reply-to: {dangling} (treated as thread roots)")
-    if cycles:
-        lines.append(f"reply cycles:   {cycles} (broken by re-rooting)")
+    if stats.dangling:
+        lines.append(f"dangling reply-to: {stats.dangling} (treated as thread roots)")
+    if stats.cycles:
+        lines.append(f"reply cycles:   {stats.cycles} (broken by re-rooting)")
     if corpus.warnings:
         lines.append("warnings:")
         for warning in corpus.warnings[:10]:
@@ -319,19 +345,38 @@ def _report(corpus, items: List[Dict[str, Any]], opts: ItemOptions) -> str:
     return "\n".join(lines)
 
 
-def _write_items(path: str, items: List[Dict[str, Any]], fmt: str) -> None:
+def _write_items(path: str, items: Iterable[Dict[str, Any]], fmt: str) -> None:
+    """Write items as they arrive. The json form matches ``json.dump(indent=1)``."""
     parent = os.path.dirname(os.path.abspath(path))
     if parent:
         os.makedirs(parent, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
         if fmt == "json":
-            json.dump(items, f, indent=1, ensure_ascii=False)
-            f.write("\n")
+            separator = "[\n"
+            for item in items:
+                f.write(separator)
+                f.write(textwrap.indent(json.dumps(item, indent=1, ensure_ascii=False), " "))
+                separator = ",\n"
+            f.write("[]\n" if separator == "[\n" else "\n]\n")
         else:
             for item in items:
                 f.write(json.dumps(item, ensure_ascii=False) + "\n")
 
 
+def _reservoir(items: Iterable[Dict[str, Any]], size: int, seed: int) -> List[Dict[str, Any]]:
+    """A seeded uniform sample of ``size`` items, holding only ``size`` at a time."""
+    rng = random.Random(seed)
+    sample: List[Dict[str, Any]] = []
+    for seen, item in enumerate(items):
+        if seen < size:
+            sample.append(item)
+        else:
+            slot = rng.randrange(seen + 1)
+            if slot < size:
+                sample[slot] = item
+    return sample
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
@@ -392,15 +437,20 @@ def _convert(args) -> int:
     )
 
     drop_meta = _csv(args.drop_meta) or list(DEFAULT_DROPPED_META)
-    corpus = read_corpus(
-        corpus_dir,
+    read_options = dict(
         load_binary_meta=args.load_binary_meta,
         drop_meta=drop_meta,
         keep_meta=_csv(args.keep_meta),
         info_fields=args.load_info or None,
         max_conversations=args.max_conversations,
     )
+    if args.stream:
+        with open_corpus_stream(corpus_dir, index_dir=args.index_dir, **read_options) as corpus:
+            return _emit(args, corpus)
+    return _emit(args, read_corpus(corpus_dir, **read_options))
+
 
+def _emit(args, corpus) -> int:
     filters = _parse_filters(args.filter)
     dropped_convos, dropped_utts = _apply_filters(corpus, filters, args.split)
     if dropped_convos or dropped_utts:
@@ -426,22 +476,31 @@ def _convert(args) -> int:
         include_turn_meta=not args.no_turn_meta,
     )
 
-    items = build_items(corpus, opts, limit=args.max_items)
+    if args.stream:
+        items: Iterable[Dict[str, Any]] = iter_items(corpus, opts, limit=args.max_items)
+        if args.sample is not None:
+            items = _reservoir(items, args.sample, args.seed)
+    else:
+        items = build_items(corpus, opts, limit=args.max_items)
+        if args.sample is not None and args.sample < len(items):
+            rng = random.Random(args.seed)
+            items = rng.sample(items, args.sample)
 
-    if args.sample is not None and args.sample < len(items):
-        rng = random.Random(args.seed)
-        items = rng.sample(items, args.sample)
+    stats = _ItemStats(opts)
+    items = stats.observe(items)
 
     if args.dry_run:
-        print(_report(corpus, items, opts))
+        for _ in items:
+            pass
+        print(_report(corpus, stats, opts))
         print("\n(dry run — nothing written)")
         return 0
 
     if args.output:
         _write_items(args.output, items, args.format)
         if not args.quiet:
-            print(_report(corpus, items, opts))
-            print(f"\nwrote {len(items)} items to {args.output}")
+            print(_report(corpus, stats, opts))
+            print(f"\nwrote {stats.items} items to {args.output}")
 
     if args.emit_config or args.print_config:
         data_ref = (
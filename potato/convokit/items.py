@@ -47,7 +47,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from .reader import Conversation, Corpus, Utterance
 
@@ -59,6 +59,7 @@ __all__ = [
     "ItemOptions",
     "build_items",
     "concatenate_turns",
+    "iter_items",
     "ordered_turns",
 ]
 
@@ -366,17 +367,18 @@ def _detect_context_mode(corpus: Corpus) -> str:
     threaded corpora (Wikipedia, Reddit) need real ancestor walks.
     """
     checked = 0
-    for convo in corpus.conversations.values():
-        ids = [uid for uid in convo.utterance_ids if uid in corpus.utterances]
-        for position, uid in enumerate(ids):
-            parent = corpus.utterances[uid].reply_to
-            if parent is None:
-                continue
-            checked += 1
-            if position == 0 or parent != ids[position - 1]:
-                return "ancestors"
-        if checked >= 500:
-            break
+    for shard in corpus.iter_shards():
+        for convo in shard.conversations.values():
+            ids = [uid for uid in convo.utterance_ids if uid in shard.utterances]
+            for position, uid in enumerate(ids):
+                parent = shard.utterances[uid].reply_to
+                if parent is None:
+                    continue
+                checked += 1
+                if position == 0 or parent != ids[position - 1]:
+                    return "ancestors"
+            if checked >= 500:
+                return "linear"
     return "linear" if checked else "ancestors"
 
 
@@ -498,12 +500,9 @@ def _conversation_items(corpus: Corpus, opts: ItemOptions) -> Iterable[Dict[str,
         yield item
 
 
-def _utterance_items(corpus: Corpus, opts: ItemOptions) -> Iterable[Dict[str, Any]]:
-    mode = opts.context_mode
-    if mode == "auto":
-        mode = _detect_context_mode(corpus)
-        logger.info("Context mode auto-detected as '%s'", mode)
-
+def _utterance_items(
+    corpus: Corpus, opts: ItemOptions, mode: str
+) -> Iterable[Dict[str, Any]]:
     for convo in corpus.conversations.values():
         thread = _build_thread(corpus, convo, "thread")
         positions = {uid: i for i, uid in enumerate(thread.order)}
@@ -561,6 +560,48 @@ def _utterance_items(corpus: Corpus, opts: ItemOptions) -> Iterable[Dict[str, An
             yield item
 
 
+def iter_items(
+    corpus: Corpus,
+    opts: Optional[ItemOptions] = None,
+    *,
+    limit: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield Potato items one at a time, walking ``corpus`` shard by shard.
+
+    Takes the same arguments as :func:`build_items` and yields the same items
+    in the same order. With a :class:`potato.convokit.stream.CorpusStream`,
+    only one shard of conversations is in memory at a time, so a caller that
+    writes each item as it arrives never holds the corpus or its items.
+    """
+    opts = opts or ItemOptions()
+    opts.validate()
+
+    mode = opts.context_mode
+    if opts.unit == "utterance" and mode == "auto":
+        mode = _detect_context_mode(corpus)
+        logger.info("Context mode auto-detected as '%s'", mode)
+    return _iter_items(corpus, opts, mode, limit)
+
+
+def _iter_items(
+    corpus: Corpus, opts: ItemOptions, mode: str, limit: Optional[int]
+) -> Iterator[Dict[str, Any]]:
+    emitted = 0
+    if limit is not None and limit <= 0:
+        return
+    for shard in corpus.iter_shards():
+        source = (
+            _conversation_items(shard, opts)
+            if opts.unit == "conversation"
+            else _utterance_items(shard, opts, mode)
+        )
+        for item in source:
+            yield item
+            emitted += 1
+            if limit is not None and emitted >= limit:
+                return
+
+
 def build_items(
     corpus: Corpus,
     opts: Optional[ItemOptions] = None,
@@ -579,18 +620,4 @@ def build_items(
         :data:`PROVENANCE_KEY` block recording where it came from, which the
         ConvoKit exporter needs to map annotations back onto the corpus.
     """
-    opts = opts or ItemOptions()
-    opts.validate()
-
-    source = (
-        _conversation_items(corpus, opts)
-        if opts.unit == "conversation"
-        else _utterance_items(corpus, opts)
-    )
-
-    items: List[Dict[str, Any]] = []
-    for item in source:
-        items.append(item)
-        if limit is not None and len(items) >= limit:
-            break
-    return items
+    return list(iter_items(corpus, opts, limit=limit))
@@ -56,7 +56,7 @@ import os
 import pickle
 import zipfile
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 from .schema import CorpusIndex
 
@@ -157,6 +157,63 @@ class Corpus:
             return []
         return [self.utterances[uid] for uid in convo.utterance_ids if uid in self.utterances]
 
+    def iter_shards(self) -> Iterator["Corpus"]:
+        """Whole conversations in corpus order, a bounded number at a time.
+
+        An in-memory corpus is its own single shard. A corpus too large for
+        memory (:class:`potato.convokit.stream.CorpusStream`) yields small
+        ``Corpus`` objects instead; the item builder walks shards either way.
+        """
+        return iter([self])
+
+    def filter(
+        self,
+        *,
+        conversation: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        utterance: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Tuple[int, int]:
+        """Drop conversations, then utterances, whose metadata fails a predicate.
+
+        Conversations go first, taking their utterances with them; an utterance
+        dropped on its own leaves its (possibly now empty) conversation behind.
+        Returns ``(conversations dropped, utterances dropped)``.
+        """
+        dropped_convos = 0
+        if conversation is not None:
+            for convo_id in list(self.conversations):
+                convo = self.conversations[convo_id]
+                if not conversation(convo.meta):
+                    for uid in convo.utterance_ids:
+                        self.utterances.pop(uid, None)
+                    del self.conversations[convo_id]
+                    dropped_convos += 1
+
+        dropped_utts = 0
+        if utterance is not None:
+            for uid in list(self.utterances):
+                utt = self.utterances[uid]
+                if not utterance(utt.meta):
+                    convo = self.conversations.get(utt.conversation_id)
+                    if convo and uid in convo.utterance_ids:
+                        convo.utterance_ids.remove(uid)
+                    del self.utterances[uid]
+                    dropped_utts += 1
+
+        return dropped_convos, dropped_utts
+
+    def assign_meta(self, obj_type: str, obj_id: str, field_name: str, value: Any) -> bool:
+        """Set one metadata field on an object. False if there is no such object."""
+        if obj_type == "utterance" and obj_id in self.utterances:
+            self.utterances[obj_id].meta[field_name] = value
+            return True
+        if obj_type == "conversation" and obj_id in self.conversations:
+            self.conversations[obj_id].meta[field_name] = value
+            return True
+        if obj_type == "speaker" and obj_id in self.speakers:
+            self.speakers[obj_id][field_name] = value
+            return True
+        return False
+
     def warn(self, message: str) -> None:
         """Record a warning once. Duplicates are common (per-utterance issues)."""
         if message not in self.warnings:
@@ -556,7 +613,7 @@ def _load_info_files(
                 if target is None:
                     unmatched += 1
                     continue
-                if _assign_info(corpus, target, obj_id, field_name, value):
+                if corpus.assign_meta(target, obj_id, field_name, value):
                     assigned[target] += 1
                 else:
                     unmatched += 1
@@ -583,21 +640,6 @@ def _resolve_info_target(corpus: Corpus, obj_id: str) -> Optional[str]:
     return None
 
 
-def _assign_info(
-    corpus: Corpus, obj_type: str, obj_id: str, field_name: str, value: Any
-) -> bool:
-    if obj_type == "utterance" and obj_id in corpus.utterances:
-        corpus.utterances[obj_id].meta[field_name] = value
-        return True
-    if obj_type == "conversation" and obj_id in corpus.conversations:
-        corpus.conversations[obj_id].meta[field_name] = value
-        return True
-    if obj_type == "speaker" and obj_id in corpus.speakers:
-        corpus.speakers[obj_id][field_name] = value
-        return True
-    return False
-
-
 # --------------------------------------------------------------------------- #
 # The reader
 # --------------------------------------------------------------------------- #
@@ -618,6 +660,121 @@ def _read_json_map(corpus_dir: str, *names: str) -> Tuple[Dict[str, Any], Option
     return {}, None
 
 
+class _RowReader:
+    """The per-row rules of :func:`read_corpus`.
+
+    Shared with the streaming reader (:mod:`potato.convokit.stream`), which
+    applies the same rules but keeps the rows on disk, so the two cannot drift:
+    key detection, id defaults, metadata cleaning and the warnings they raise
+    all live here.
+    """
+
+    def __init__(
+        self,
+        corpus: Corpus,
+        *,
+        load_binary_meta: bool,
+        drop_meta: Sequence[str],
+        keep_meta: Sequence[str],
+    ):
+        self.corpus = corpus
+        self.drop = set(drop_meta)
+        self.keep = set(keep_meta)
+        self.bin_resolver = _BinResolver(corpus.path, load_binary_meta, corpus)
+        self.speaker_key: Optional[str] = None
+        self.convo_key: Optional[str] = None
+
+    def clean(self, raw: Any, obj_type: str) -> Dict[str, Any]:
+        return _clean_meta(
+            raw,
+            obj_type=obj_type,
+            corpus=self.corpus,
+            drop=self.drop,
+            keep=self.keep,
+            bin_resolver=self.bin_resolver,
+        )
+
+    def row_ids(self, row: dict) -> Optional[Tuple[str, str]]:
+        """``(utterance id, conversation id)`` of a row, or ``None`` to skip it."""
+        corpus = self.corpus
+        if self.speaker_key is None:
+            # Upstream's rule, applied to the first row only.
+            self.speaker_key = "speaker" if "speaker" in row else "user"
+            self.convo_key = "conversation_id" if "conversation_id" in row else "root"
+            corpus.legacy = self.speaker_key == "user" or self.convo_key == "root"
+            if corpus.legacy:
+                corpus.warn(
+                    f"Corpus '{corpus.name}' uses the legacy key names "
+                    f"('{self.speaker_key}'/'{self.convo_key}'); reading it as such."
+                )
+
+        utt_id = row.get("id")
+        if utt_id is None:
+            corpus.warn("Utterance without an 'id'; skipped.")
+            return None
+        utt_id = str(utt_id)
+
+        convo_id = row.get(self.convo_key)
+        if convo_id is None:
+            # A corpus with no conversation grouping is legal; treat each
+            # utterance as its own single-turn conversation rather than dropping
+            # it (this is what wikipedia-politeness-corpus effectively is).
+            convo_id = utt_id
+        return utt_id, str(convo_id)
+
+    def utterance(self, row: dict, utt_id: str, convo_id: str, file_index: int) -> Utterance:
+        # The dump writes "reply-to"; the loader prefers "reply_to". Both exist.
+        reply_to = row.get("reply_to", row.get("reply-to"))
+        if reply_to in ("", None):
+            reply_to = None
+        else:
+            reply_to = str(reply_to)
+
+        speaker_id = row.get(self.speaker_key)
+        speaker_id = "" if speaker_id is None else str(speaker_id)
+
+        return Utterance(
+            id=utt_id,
+            conversation_id=convo_id,
+            speaker=speaker_id,
+            text=row.get("text") or "",
+            reply_to=reply_to,
+            timestamp=_coerce_timestamp(row.get("timestamp")),
+            meta=self.clean(row.get("meta"), "utterance"),
+            file_index=file_index,
+        )
+
+    def speaker_meta(self, speaker_id: str, raw: Any) -> Dict[str, Any]:
+        if raw is None:
+            self.corpus.warn(
+                f"No metadata for speaker '{speaker_id}'; using an empty dict."
+            )
+            return {}
+        return self.clean(_unwrap_meta(raw), "speaker")
+
+    def conversation_meta(self, raw: Any) -> Dict[str, Any]:
+        return self.clean(_unwrap_meta(raw), "conversation")
+
+    def finish(self, legacy_speaker_file: bool, info_fields: Optional[Sequence[str]]) -> None:
+        corpus = self.corpus
+        if legacy_speaker_file and not corpus.legacy:
+            corpus.warn(
+                "Corpus has users.json but modern utterance keys; reading both forms."
+            )
+        if info_fields:
+            _load_info_files(corpus, corpus.path, info_fields)
+
+
+def _new_corpus(corpus_dir: str, name: Optional[str]) -> Corpus:
+    corpus = Corpus(
+        name=name or os.path.basename(os.path.normpath(corpus_dir)),
+        path=corpus_dir,
+    )
+    corpus.index = CorpusIndex.from_file(corpus_dir)
+    corpus.version = corpus.index.version
+    return corpus
+
+
 def read_corpus(
     source: str,
     *,
@@ -646,104 +803,39 @@ def read_corpus(
 
     Returns:
         A :class:`Corpus`. Check ``.warnings``, ``.skipped_binary_fields``, and
-        ``.dropped_meta_fields`` before treating it as a faithful copy.
+        ``.dropped_meta_fields`` before treating it as a faithful copy. The
+        whole corpus is held in memory; for corpora that do not fit, see
+        :func:`potato.convokit.stream.open_corpus_stream`.
     """
     corpus_dir = resolve_corpus_dir(source)
-    corpus = Corpus(
-        name=name or os.path.basename(os.path.normpath(corpus_dir)),
-        path=corpus_dir,
+    corpus = _new_corpus(corpus_dir, name)
+    reader = _RowReader(
+        corpus,
+        load_binary_meta=load_binary_meta,
+        drop_meta=drop_meta,
+        keep_meta=keep_meta,
     )
-    corpus.index = CorpusIndex.from_file(corpus_dir)
-    corpus.version = corpus.index.version
-
-    drop = set(drop_meta)
-    keep = set(keep_meta)
-    bin_resolver = _BinResolver(corpus_dir, load_binary_meta, corpus)
 
-    # --- speakers ---------------------------------------------------------- #
     speakers_raw, speakers_file = _read_json_map(corpus_dir, "speakers.json", "users.json")
-    legacy_speaker_file = speakers_file == "users.json"
-
-    # --- conversations ----------------------------------------------------- #
     convos_raw, _ = _read_json_map(corpus_dir, "conversations.json")
-
-    # --- corpus meta ------------------------------------------------------- #
-    corpus_meta_raw, _ = _read_json_map(corpus_dir, "corpus.json")
-    corpus.meta = _clean_meta(
-        corpus_meta_raw,
-        obj_type="corpus",
-        corpus=corpus,
-        drop=drop,
-        keep=keep,
-        bin_resolver=bin_resolver,
-    )
+    corpus.meta = reader.clean(_read_json_map(corpus_dir, "corpus.json")[0], "corpus")
 
     # --- utterances -------------------------------------------------------- #
     utterance_path = _utterance_file(corpus_dir)
-    speaker_key: Optional[str] = None
-    convo_key: Optional[str] = None
-    seen_conversations: List[str] = []
     seen_conversation_set: Set[str] = set()
 
     for file_index, row in enumerate(iter_utterance_lines(utterance_path)):
-        if speaker_key is None:
-            # Upstream's rule, applied to the first row only.
-            speaker_key = "speaker" if "speaker" in row else "user"
-            convo_key = "conversation_id" if "conversation_id" in row else "root"
-            corpus.legacy = speaker_key == "user" or convo_key == "root"
-            if corpus.legacy:
-                corpus.warn(
-                    f"Corpus '{corpus.name}' uses the legacy key names "
-                    f"('{speaker_key}'/'{convo_key}'); reading it as such."
-                )
-
-        utt_id = row.get("id")
-        if utt_id is None:
-            corpus.warn("Utterance without an 'id'; skipped.")
+        ids = reader.row_ids(row)
+        if ids is None:
             continue
-        utt_id = str(utt_id)
-
-        convo_id = row.get(convo_key)
-        if convo_id is None:
-            # A corpus with no conversation grouping is legal; treat each
-            # utterance as its own single-turn conversation rather than dropping
-            # it (this is what wikipedia-politeness-corpus effectively is).
-            convo_id = utt_id
-        convo_id = str(convo_id)
+        utt_id, convo_id = ids
 
         if convo_id not in seen_conversation_set:
             if max_conversations is not None and len(seen_conversation_set) >= max_conversations:
                 break
             seen_conversation_set.add(convo_id)
-            seen_conversations.append(convo_id)
 
-        # The dump writes "reply-to"; the loader prefers "reply_to". Both exist.
-        reply_to = row.get("reply_to", row.get("reply-to"))
-        if reply_to in ("", None):
-            reply_to = None
-        else:
-            reply_to = str(reply_to)
-
-        speaker_id = row.get(speaker_key)
-        speaker_id = "" if speaker_id is None else str(speaker_id)
-
-        utterance = Utterance(
-            id=utt_id,
-            conversation_id=convo_id,
-            speaker=speaker_id,
-            text=row.get("text") or "",
-            reply_to=reply_to,
-            timestamp=_coerce_timestamp(row.get("timestamp")),
-            meta=_clean_meta(
-                row.get("meta"),
-                obj_type="utterance",
-                corpus=corpus,
-                drop=drop,
-                keep=keep,
-                bin_resolver=bin_resolver,
-            ),
-            file_index=file_index,
-        )
+        utterance = reader.utterance(row, utt_id, convo_id, file_index)
 
         if utt_id in corpus.utterances:
             corpus.warn(f"Duplicate utterance id '{utt_id}'; keeping the first.")
@@ -761,43 +853,16 @@ def read_corpus(
 
     # --- attach speaker / conversation metadata ---------------------------- #
     for speaker_id in {u.speaker for u in corpus.utterances.values()}:
-        raw = speakers_raw.get(speaker_id)
-        if raw is None:
-            corpus.warn(
-                f"No metadata for speaker '{speaker_id}'; using an empty dict."
-            )
-            corpus.speakers[speaker_id] = {}
-            continue
-        corpus.speakers[speaker_id] = _clean_meta(
-            _unwrap_meta(raw),
-            obj_type="speaker",
-            corpus=corpus,
-            drop=drop,
-            keep=keep,
-            bin_resolver=bin_resolver,
+        corpus.speakers[speaker_id] = reader.speaker_meta(
+            speaker_id, speakers_raw.get(speaker_id)
         )
 
     for convo_id, convo in corpus.conversations.items():
         raw = convos_raw.get(convo_id)
-        if raw is None:
-            continue
-        convo.meta = _clean_meta(
-            _unwrap_meta(raw),
-            obj_type="conversation",
-            corpus=corpus,
-            drop=drop,
-            keep=keep,
-            bin_resolver=bin_resolver,
-        )
-
-    if legacy_speaker_file and not corpus.legacy:
-        corpus.warn(
-            "Corpus has users.json but modern utterance keys; reading both forms."
-        )
-
-    if info_fields:
-        _load_info_files(corpus, corpus_dir, info_fields)
+        if raw is not None:
+            convo.meta = reader.conversation_meta(raw)
 
+    reader.finish(speakers_file == "users.json", info_fields)
     return corpus
 
 
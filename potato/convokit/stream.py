@@ -0,0 +1,667 @@
+"""
+Reading a ConvoKit corpus that does not fit in memory.
+
+:func:`~potato.convokit.reader.read_corpus` streams ``utterances.jsonl`` but
+keeps every utterance, conversation and speaker in dicts, so its peak memory is
+the size of the corpus — fine for the curated corpora, not for a Reddit dump or
+``wikiconv``. :func:`open_corpus_stream` reads the same files with the same rules
+(the per-row logic is shared, see ``reader._RowReader``) but spills them into a
+scratch SQLite file as it goes:
+
+* ``utterances.jsonl`` is read line by line and each utterance written straight
+  to disk, keyed by its position in the file and indexed by conversation. That
+  index is what groups a conversation whose utterances are scattered across the
+  file without holding any of them.
+* ``speakers.json`` and ``conversations.json`` are single JSON objects; they are
+  parsed entry by entry (:func:`iter_json_object`) rather than with ``json.load``,
+  so a million-speaker file costs one entry of memory, not a million.
+
+The result is a :class:`CorpusStream`. It is a :class:`Corpus` whose
+``utterances`` / ``conversations`` / ``speakers`` are read-only views over the
+scratch file, and whose :meth:`~CorpusStream.iter_shards` yields ordinary
+in-memory ``Corpus`` objects a few thousand utterances at a time, always whole
+conversations. :func:`potato.convokit.items.iter_items` walks those shards, so
+items come out conversation by conversation with memory bounded by the largest
+shard — not by the corpus. ``potato convokit --stream`` uses it end to end.
+
+The scratch file is deleted by :meth:`CorpusStream.close` (or on leaving a
+``with`` block, or when the stream is garbage collected).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import weakref
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .reader import (
+    DEFAULT_DROPPED_META,
+    Conversation,
+    ConvoKitReadError,
+    Corpus,
+    Utterance,
+    _RowReader,
+    _new_corpus,
+    _read_json_map,
+    _utterance_file,
+    iter_utterance_lines,
+    resolve_corpus_dir,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CorpusStream", "iter_json_object", "open_corpus_stream"]
+
+#: Utterances per shard. A shard is only ever split between conversations, so a
+#: single conversation longer than this still arrives whole.
+DEFAULT_SHARD_UTTERANCES = 5000
+
+#: Rows fetched or written per round trip to the scratch file.
+_BATCH = 1000
+
+#: SQLite's default cap on host parameters is 999 on older builds.
+_IN_CHUNK = 500
+
+_WHITESPACE = re.compile(r"\s*")
+
+_SCHEMA = """
+CREATE TABLE raw_speakers (id TEXT PRIMARY KEY, raw TEXT) WITHOUT ROWID;
+CREATE TABLE raw_conversations (id TEXT PRIMARY KEY, raw TEXT) WITHOUT ROWID;
+CREATE TABLE conversations (seq INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, meta TEXT);
+CREATE TABLE utterances (
+    file_index INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    convo_id TEXT NOT NULL,
+    convo_seq INTEGER,
+    speaker TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE speakers (id TEXT PRIMARY KEY, meta TEXT) WITHOUT ROWID;
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+# --------------------------------------------------------------------------- #
+# Incremental parsing of a top-level JSON object
+# --------------------------------------------------------------------------- #
+
+class _ObjectReader:
+    """Pulls ``key: value`` pairs off a text file holding one JSON object."""
+
+    def __init__(self, path: str, f, chunk_size: int):
+        self._path = path
+        self._f = f
+        self._chunk = chunk_size
+        self._decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _more(self, size: int) -> bool:
+        if self.eof:
+            return False
+        data = self._f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _fail(self, what: str) -> ConvoKitReadError:
+        return ConvoKitReadError(f"Could not read {self._path}: {what}")
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or ``""`` at end of file."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more(self._chunk):
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise self._fail(f"expected one of {chars!r} at offset {self.pos}")
+        self.pos += 1
+        return char
+
+    def value(self, raw: bool = False) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except ValueError as exc:
+                error: Optional[ValueError] = exc
+            else:
+                # A number cut off by the chunk boundary decodes "successfully"
+                # as its prefix, so a value ending the buffer is not trusted yet.
+                if end < len(self.buf) or self.eof:
+                    start, self.pos = self.pos, end
+                    return self.buf[start:end] if raw else value
+                error = None
+            # Grow geometrically, so a huge value costs linear time, not quadratic.
+            if not self._more(max(self._chunk, len(self.buf) - self.pos)):
+                if error is None:
+                    continue
+                raise self._fail(str(error)) from error
+
+
+def iter_json_object(
+    path: str, *, chunk_size: int = 1 << 16, raw: bool = False
+) -> Iterator[Tuple[str, Any]]:
+    """Yield the ``(key, value)`` pairs of a file holding one JSON object.
+
+    Reads ``chunk_size`` characters at a time, so memory is bounded by the
+    largest single value rather than the file. A repeated key is yielded twice;
+    as with ``json.load``, a caller that keeps the last one agrees with upstream.
+    With ``raw``, each value is its (validated) JSON text rather than decoded.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _ObjectReader(path, f, chunk_size)
+        if reader.peek() != "{":
+            raise ConvoKitReadError(f"{path} is not a JSON object")
+        reader.pos += 1
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                key = reader.value()
+                if not isinstance(key, str):
+                    raise reader._fail(f"object key is not a string at offset {reader.pos}")
+                reader.expect(":")
+                yield key, reader.value(raw)
+                if reader.expect(",}") == "}":
+                    break
+        if reader.peek():
+            raise reader._fail(f"extra data after the object at offset {reader.pos}")
+
+
+# --------------------------------------------------------------------------- #
+# Read-only views over the scratch file
+# --------------------------------------------------------------------------- #
+
+def _utterance_from_row(uid: str, convo_id: str, file_index: int, body: str) -> Utterance:
+    speaker, text, reply_to, timestamp, meta = json.loads(body)
+    return Utterance(
+        id=uid,
+        conversation_id=convo_id,
+        speaker=speaker,
+        text=text,
+        reply_to=reply_to,
+        timestamp=timestamp,
+        meta=meta,
+        file_index=file_index,
+    )
+
+
+class _View:
+    """Dict-like, read-only access to one table. Every read is a fresh copy."""
+
+    _table = ""
+    _order = ""
+
+    def __init__(self, stream: "CorpusStream"):
+        self._stream = stream
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        return self._stream._db
+
+    def __len__(self) -> int:
+        return self._db.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def __contains__(self, key: object) -> bool:
+        return self._db.execute(
+            f"SELECT 1 FROM {self._table} WHERE id = ?", (key,)
+        ).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (row[1] for row in _paged(
+            self._db, f"SELECT {self._order}, id FROM {self._table}", self._order
+        ))
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return self._pairs()
+
+    def values(self) -> Iterator[Any]:
+        return (value for _, value in self._pairs())
+
+    def _pairs(self) -> Iterator[Tuple[str, Any]]:
+        raise NotImplementedError
+
+    def __getitem__(self, key: str) -> Any:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {len(self)}>"
+
+
+class _UtteranceView(_View):
+    _table = "utterances"
+    _order = "file_index"
+
+    _SELECT = "SELECT file_index, id, convo_id, body FROM utterances"
+
+    def __getitem__(self, uid: str) -> Utterance:
+        row = self._db.execute(self._SELECT + " WHERE id = ?", (uid,)).fetchone()
+        if row is None:
+            raise KeyError(uid)
+        return _utterance_from_row(row[1], row[2], row[0], row[3])
+
+    def _pairs(self) -> Iterator[Tuple[str, Utterance]]:
+        for file_index, uid, convo_id, body in _paged(self._db, self._SELECT, "file_index"):
+            yield uid, _utterance_from_row(uid, convo_id, file_index, body)
+
+
+class _ConversationView(_View):
+    _table = "conversations"
+    _order = "seq"
+
+    def __getitem__(self, convo_id: str) -> Conversation:
+        row = self._db.execute(
+            "SELECT seq, meta FROM conversations WHERE id = ?", (convo_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(convo_id)
+        ids = [r[0] for r in self._db.execute(
+            "SELECT id FROM utterances WHERE convo_seq = ? ORDER BY file_index", (row[0],)
+        )]
+        return Conversation(id=convo_id, meta=json.loads(row[1] or "{}"), utterance_ids=ids)
+
+    def _pairs(self) -> Iterator[Tuple[str, Conversation]]:
+        for convo, _ in self._stream._iter_rows():
+            yield convo.id, convo
+
+
+class _SpeakerView(_View):
+    _table = "speakers"
+    _order = "id"
+
+    def __getitem__(self, speaker_id: str) -> Dict[str, Any]:
+        row = self._db.execute(
+            "SELECT meta FROM speakers WHERE id = ?", (speaker_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(speaker_id)
+        return json.loads(row[0])
+
+    def _pairs(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for _, speaker_id, meta in _paged(self._db, "SELECT id, id, meta FROM speakers", "id"):
+            yield speaker_id, json.loads(meta)
+
+
+def _pages(db: sqlite3.Connection, select: str, key: str) -> Iterator[List[tuple]]:
+    """Pages of ``select`` in ``key`` order, fetched by keyset pagination.
+
+    The first column must be ``key``. Each page is its own statement, so the
+    caller may write to the database between pages without disturbing the scan.
+    """
+    where = " AND " if " WHERE " in select else " WHERE "
+    rows = db.execute(f"{select} ORDER BY {key} LIMIT {_BATCH}").fetchall()
+    while rows:
+        yield rows
+        if len(rows) < _BATCH:
+            return
+        rows = db.execute(
+            f"{select}{where}{key} > ? ORDER BY {key} LIMIT {_BATCH}", (rows[-1][0],)
+        ).fetchall()
+
+
+def _paged(db: sqlite3.Connection, select: str, key: str) -> Iterator[tuple]:
+    for page in _pages(db, select, key):
+        yield from page
+
+
+# --------------------------------------------------------------------------- #
+# The stream
+# --------------------------------------------------------------------------- #
+
+def _discard(db: sqlite3.Connection, path: str) -> None:
+    db.close()
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class CorpusStream(Corpus):
+    """A :class:`Corpus` whose utterances live in a scratch SQLite file.
+
+    ``utterances``, ``conversations`` and ``speakers`` are read-only views:
+    lookups, ``in``, ``len`` and ordered iteration work, but every read is a
+    fresh copy, so change data through :meth:`filter` and :meth:`assign_meta`.
+    Build items with :func:`potato.convokit.items.iter_items`, which walks
+    :meth:`iter_shards` rather than the views.
+    """
+
+    def __init__(self, name: str, path: str, *, index_dir: Optional[str] = None):
+        super().__init__(name=name, path=path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        fd, self.index_path = tempfile.mkstemp(
+            prefix="convokit-", suffix=".sqlite", dir=index_dir
+        )
+        os.close(fd)
+        self._db = sqlite3.connect(self.index_path)
+        self._finalizer = weakref.finalize(self, _discard, self._db, self.index_path)
+        # Scratch data: nothing here needs to survive a crash.
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute("PRAGMA cache_size=-16384")
+        self._db.executescript(_SCHEMA)
+        self.utterances = _UtteranceView(self)
+        self.conversations = _ConversationView(self)
+        self.speakers = _SpeakerView(self)
+
+    def close(self) -> None:
+        """Delete the scratch file. The stream is unusable afterwards."""
+        self._finalizer()
+
+    def __enter__(self) -> "CorpusStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _iter_rows(self) -> Iterator[Tuple[Conversation, List[Tuple[str, int, str]]]]:
+        """``(conversation, [(utterance id, file index, body), ...])`` in order."""
+        for page in _pages(self._db, "SELECT seq, id, meta FROM conversations", "seq"):
+            cursor = self._db.execute(
+                "SELECT convo_seq, id, file_index, body FROM utterances "
+                "WHERE convo_seq BETWEEN ? AND ? ORDER BY convo_seq, file_index",
+                (page[0][0], page[-1][0]),
+            )
+            pending = next(cursor, None)
+            for seq, convo_id, meta in page:
+                convo = Conversation(id=convo_id, meta=json.loads(meta or "{}"))
+                rows: List[Tuple[str, int, str]] = []
+                while pending is not None and pending[0] <= seq:
+                    if pending[0] == seq:
+                        convo.utterance_ids.append(pending[1])
+                        rows.append(pending[1:])
+                    pending = next(cursor, None)
+                yield convo, rows
+
+    def iter_shards(self, max_utterances: int = DEFAULT_SHARD_UTTERANCES) -> Iterator[Corpus]:
+        """In-memory corpora of whole conversations, about ``max_utterances`` each.
+
+        Each shard carries the speakers its utterances mention and shares this
+        stream's name, version, legacy flag and warning lists, so provenance
+        built from a shard is the same as from the whole corpus.
+        """
+        shard: Optional[Corpus] = None
+        for convo, rows in self._iter_rows():
+            if shard is not None and len(shard.utterances) >= max_utterances:
+                yield self._fill_speakers(shard)
+                shard = None
+            if shard is None:
+                shard = self._empty_shard()
+            shard.conversations[convo.id] = convo
+            for uid, file_index, body in rows:
+                shard.utterances[uid] = _utterance_from_row(uid, convo.id, file_index, body)
+        if shard is not None:
+            yield self._fill_speakers(shard)
+
+    def _empty_shard(self) -> Corpus:
+        return Corpus(
+            name=self.name,
+            path=self.path,
+            meta=self.meta,
+            index=self.index,
+            version=self.version,
+            legacy=self.legacy,
+            warnings=self.warnings,
+            skipped_binary_fields=self.skipped_binary_fields,
+            dropped_meta_fields=self.dropped_meta_fields,
+        )
+
+    def _fill_speakers(self, shard: Corpus) -> Corpus:
+        wanted = sorted({u.speaker for u in shard.utterances.values()})
+        for start in range(0, len(wanted), _IN_CHUNK):
+            chunk = wanted[start: start + _IN_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for speaker_id, meta in self._db.execute(
+                f"SELECT id, meta FROM speakers WHERE id IN ({marks})", chunk
+            ):
+                shard.speakers[speaker_id] = json.loads(meta)
+        return shard
+
+    def filter(
+        self,
+        *,
+        conversation: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        utterance: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Tuple[int, int]:
+        """:meth:`Corpus.filter`, applied to the scratch file a page at a time."""
+        db = self._db
+        dropped_convos = 0
+        if conversation is not None:
+            for seq, meta in _paged(db, "SELECT seq, meta FROM conversations", "seq"):
+                if not conversation(json.loads(meta or "{}")):
+                    db.execute("DELETE FROM utterances WHERE convo_seq = ?", (seq,))
+                    db.execute("DELETE FROM conversations WHERE seq = ?", (seq,))
+                    dropped_convos += 1
+
+        dropped_utts = 0
+        if utterance is not None:
+            for file_index, body in _paged(db, "SELECT file_index, body FROM utterances",
+                                           "file_index"):
+                if not utterance(json.loads(body)[4]):
+                    db.execute("DELETE FROM utterances WHERE file_index = ?", (file_index,))
+                    dropped_utts += 1
+
+        db.commit()
+        return dropped_convos, dropped_utts
+
+    def assign_meta(self, obj_type: str, obj_id: str, field_name: str, value: Any) -> bool:
+        db = self._db
+        if obj_type == "utterance":
+            row = db.execute("SELECT body FROM utterances WHERE id = ?", (obj_id,)).fetchone()
+            if row is None:
+                return False
+            body = json.loads(row[0])
+            body[4][field_name] = value
+            db.execute("UPDATE utterances SET body = ? WHERE id = ?", (_dumps(body), obj_id))
+            return True
+        table = {"conversation": "conversations", "speaker": "speakers"}.get(obj_type)
+        if table is None:
+            return False
+        row = db.execute(f"SELECT meta FROM {table} WHERE id = ?", (obj_id,)).fetchone()
+        if row is None:
+            return False
+        meta = json.loads(row[0] or "{}")
+        meta[field_name] = value
+        db.execute(f"UPDATE {table} SET meta = ? WHERE id = ?", (_dumps(meta), obj_id))
+        return True
+
+
+# --------------------------------------------------------------------------- #
+# Loading
+# --------------------------------------------------------------------------- #
+
+def _spill_object(db: sqlite3.Connection, table: str, path: Optional[str]) -> None:
+    """Copy a ``{id: value}`` file into ``table`` without parsing it whole."""
+    if path is None:
+        return
+    insert = f"INSERT OR REPLACE INTO {table} (id, raw) VALUES (?, ?)"
+    batch: List[Tuple[str, str]] = []
+    for key, value in iter_json_object(path, raw=True):
+        batch.append((key, value))
+        if len(batch) >= _BATCH:
+            db.executemany(insert, batch)
+            batch = []
+    db.executemany(insert, batch)
+
+
+def _first_file(corpus_dir: str, *names: str) -> Tuple[Optional[str], Optional[str]]:
+    for name in names:
+        path = os.path.join(corpus_dir, name)
+        if os.path.isfile(path):
+            return path, name
+    return None, None
+
+
+def _insert_utterances(corpus: CorpusStream, batch: List[Tuple[int, str, str, str, str]]) -> None:
+    """Write a batch; the first of several rows with one id wins, as in read_corpus."""
+    db = corpus._db
+    before = db.total_changes
+    db.executemany(
+        "INSERT OR IGNORE INTO utterances (file_index, id, convo_id, speaker, body) "
+        "VALUES (?, ?, ?, ?, ?)",
+        batch,
+    )
+    if db.total_changes - before == len(batch):
+        return
+    for file_index, utt_id, *_ in batch:
+        kept = db.execute("SELECT file_index FROM utterances WHERE id = ?", (utt_id,)).fetchone()
+        if kept[0] != file_index:
+            corpus.warn(f"Duplicate utterance id '{utt_id}'; keeping the first.")
+
+
+def open_corpus_stream(
+    source: str,
+    *,
+    load_binary_meta: bool = False,
+    drop_meta: Sequence[str] = tuple(DEFAULT_DROPPED_META),
+    keep_meta: Sequence[str] = (),
+    info_fields: Optional[Sequence[str]] = None,
+    max_conversations: Optional[int] = None,
+    name: Optional[str] = None,
+    index_dir: Optional[str] = None,
+) -> CorpusStream:
+    """Read a ConvoKit corpus into a disk-backed :class:`CorpusStream`.
+
+    Takes the same arguments as :func:`~potato.convokit.reader.read_corpus`
+    and applies the same rules — the two produce the same items — plus:
+
+    Args:
+        index_dir: Where to put the scratch SQLite file (default: the system
+            temp directory). It grows to roughly the size of the corpus minus
+            the dropped metadata, and is deleted when the stream is closed.
+    """
+    corpus_dir = resolve_corpus_dir(source)
+    template = _new_corpus(corpus_dir, name)
+    corpus = CorpusStream(template.name, corpus_dir, index_dir=index_dir)
+    corpus.index = template.index
+    corpus.version = template.version
+    try:
+        _load(corpus, corpus_dir, load_binary_meta, drop_meta, keep_meta,
+              info_fields, max_conversations)
+    except BaseException:
+        corpus.close()
+        raise
+    return corpus
+
+
+def _load(
+    corpus: CorpusStream,
+    corpus_dir: str,
+    load_binary_meta: bool,
+    drop_meta: Sequence[str],
+    keep_meta: Sequence[str],
+    info_fields: Optional[Sequence[str]],
+    max_conversations: Optional[int],
+) -> None:
+    db = corpus._db
+    reader = _RowReader(
+        corpus,
+        load_binary_meta=load_binary_meta,
+        drop_meta=drop_meta,
+        keep_meta=keep_meta,
+    )
+
+    speakers_path, speakers_file = _first_file(corpus_dir, "speakers.json", "users.json")
+    _spill_object(db, "raw_speakers", speakers_path)
+    _spill_object(db, "raw_conversations", _first_file(corpus_dir, "conversations.json")[0])
+    corpus.meta = reader.clean(_read_json_map(corpus_dir, "corpus.json")[0], "corpus")
+
+    # --- utterances -------------------------------------------------------- #
+    utterance_path = _utterance_file(corpus_dir)
+    # Only a cap needs the set of conversations seen so far, and it bounds it.
+    seen_conversations: Set[str] = set()
+    batch: List[Tuple[int, str, str, str, str]] = []
+
+    for file_index, row in enumerate(iter_utterance_lines(utterance_path)):
+        ids = reader.row_ids(row)
+        if ids is None:
+            continue
+        utt_id, convo_id = ids
+
+        if max_conversations is not None and convo_id not in seen_conversations:
+            if len(seen_conversations) >= max_conversations:
+                break
+            seen_conversations.add(convo_id)
+
+        utt = reader.utterance(row, utt_id, convo_id, file_index)
+        batch.append((file_index, utt_id, convo_id, utt.speaker,
+                      _dumps([utt.speaker, utt.text, utt.reply_to, utt.timestamp, utt.meta])))
+        if len(batch) >= _BATCH:
+            _insert_utterances(corpus, batch)
+            batch = []
+    _insert_utterances(corpus, batch)
+
+    if db.execute("SELECT 1 FROM utterances LIMIT 1").fetchone() is None:
+        corpus.warn(f"No utterances read from {utterance_path}")
+
+    # A conversation's place is where its first kept utterance is, as in
+    # read_corpus. Numbering them once here beats a lookup per row.
+    db.execute(
+        "INSERT INTO conversations (id) SELECT convo_id FROM utterances "
+        "GROUP BY convo_id ORDER BY MIN(file_index)"
+    )
+    db.execute(
+        "UPDATE utterances SET convo_seq = "
+        "(SELECT seq FROM conversations c WHERE c.id = utterances.convo_id)"
+    )
+    db.execute("CREATE INDEX utterances_by_conversation ON utterances (convo_seq, file_index)")
+
+    # --- attach speaker / conversation metadata ---------------------------- #
+    db.execute("INSERT INTO speakers (id) SELECT DISTINCT speaker FROM utterances")
+    pending: List[Tuple[str, str]] = []
+    for speaker_id, raw in _paged(
+        db, "SELECT s.id, r.raw FROM speakers s LEFT JOIN raw_speakers r ON r.id = s.id", "s.id"
+    ):
+        meta = reader.speaker_meta(speaker_id, None if raw is None else json.loads(raw))
+        pending.append((_dumps(meta), speaker_id))
+        if len(pending) >= _BATCH:
+            db.executemany("UPDATE speakers SET meta = ? WHERE id = ?", pending)
+            pending = []
+    db.executemany("UPDATE speakers SET meta = ? WHERE id = ?", pending)
+
+    updates: List[Tuple[str, int]] = []
+    for seq, raw in _paged(
+        db,
+        "SELECT c.seq, r.raw FROM conversations c JOIN raw_conversations r ON r.id = c.id",
+        "c.seq",
+    ):
+        updates.append((_dumps(reader.conversation_meta(json.loads(raw))), seq))
+        if len(updates) >= _BATCH:
+            db.executemany("UPDATE conversations SET meta = ? WHERE seq = ?", updates)
+            updates = []
+    db.executemany("UPDATE conversations SET meta = ? WHERE seq = ?", updates)
+
+    db.execute("DROP TABLE raw_speakers")
+    db.execute("DROP TABLE raw_conversations")
+    db.commit()
+
+    reader.finish(speakers_file == "users.json", info_fields)
+    db.commit()
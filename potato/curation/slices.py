@@ -16,7 +16,7 @@ import threading
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
-from potato.server_utils.conditions import matches_all
+from potato.server_utils.conditions import compile_conditions
 
 
 @dataclass
@@ -112,5 +112,6 @@ def resolve_slice(slc: Slice, index, embedder, metadata_for: Any) -> List[str]:
 
     # 2. metadata filter
     if slc.metadata_filter:
-        ids = [i for i in ids if matches_all(slc.metadata_filter, metadata_for(i) or {})]
+        keep = compile_conditions(slc.metadata_filter)
+        ids = [i for i in ids if keep(metadata_for(i) or {})]
     return ids
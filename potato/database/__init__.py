@@ -2,10 +2,12 @@
 Database module for Potato annotation platform.
 
 Database connectivity and management for user state persistence, over either
-MySQL or file-based storage.
+MySQL, SQLite, or file-based storage.
 """
 
 from .connection import DatabaseManager
+from .sqlite_connection import SqliteDatabaseManager
 from .mysql_user_state import MysqlUserState
+from .cached_user_state import CachedMysqlUserState
 
-__all__ = ['DatabaseManager', 'MysqlUserState']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'SqliteDatabaseManager', 'MysqlUserState', 'CachedMysqlUserState']
\ No newline at end of file
@@ -0,0 +1,646 @@
+"""
+Read-through, write-back cache over MysqlUserState.
+
+MysqlUserState issues one pooled query per getter, so rendering a single
+annotate page (phase, cursor, ordering, labels, spans, has_annotated for the
+navigation bar, hints...) costs dozens of round trips, and every label change
+is its own committed transaction.
+
+CachedMysqlUserState keeps one user's rows in memory:
+
+- **Read-through**: each table is loaded with one query the first time any
+  getter needs it and served from memory afterwards.
+- **Write-back**: writes update the cache immediately and are queued; ``flush()``
+  writes everything queued in one transaction using ``executemany``.
+  UserStateManager.save_user_state() calls ``save()``, and a teardown hook
+  (``flush_user_state_writes`` in flask_server.py) flushes whatever a request
+  queued without saving -- navigation, assignment -- so there is one flush per
+  request that changes state. ``on_write_queued`` tells the manager which users
+  that hook has to visit.
+- **Versioned invalidation**: ``user_states.cache_version`` is bumped by every
+  flush. At most once per ``revalidate_interval`` seconds a read checks it, and
+  if another process has written for this user the cache is dropped and
+  reloaded.
+
+Rarely used mutations (quality-control insertion, unassignment, clearing) flush
+first and then fall through to the uncached MysqlUserState implementation.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from potato.phase import UserPhase
+from potato.item_state_management import Item, Label, SpanAnnotation
+from .mysql_user_state import MysqlUserState
+
+logger = logging.getLogger(__name__)
+
+
+class CachedMysqlUserState(MysqlUserState):
+    """
+    MysqlUserState with a per-user read-through, write-back cache.
+
+    Works against both DatabaseManager (MySQL) and SqliteDatabaseManager.
+    """
+
+    def __init__(self, user_id: str, db_manager, max_assignments: int = -1,
+                 revalidate_interval: float = 1.0, max_pending_writes: int = 500):
+        """
+        Initialize the cached user state.
+
+        Args:
+            user_id: Unique identifier for the user
+            db_manager: DatabaseManager or SqliteDatabaseManager instance
+            max_assignments: Maximum number of assignments for this user
+            revalidate_interval: Seconds between cache_version checks; 0 checks
+                on every read
+            max_pending_writes: Queued rows that force a flush without waiting
+                for save()
+        """
+        self.revalidate_interval = revalidate_interval
+        self.max_pending_writes = max_pending_writes
+        # Told the user id whenever a write is left queued, so the owner can
+        # flush just the users with pending writes (UserStateManager sets it).
+        self.on_write_queued: Optional[Callable[[str], None]] = None
+        self._drop_caches()
+        self._clear_pending()
+        self._version: Optional[int] = None
+        self._validated_at = 0.0
+        self._sync_depth = 0
+        super().__init__(user_id, db_manager, max_assignments)
+        # Reentrant: flush() and the loaders run inside the public methods'
+        # critical sections.
+        self._cache_lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Cache bookkeeping
+    # ------------------------------------------------------------------
+
+    def _drop_caches(self) -> None:
+        self._state_row: Optional[List[Any]] = None  # [phase, page, index]
+        self._ordering: Optional[List[str]] = None
+        self._assigned: Optional[Set[str]] = None
+        self._labels: Optional[Dict[str, Dict[Label, str]]] = None
+        self._spans: Optional[Dict[str, Dict[SpanAnnotation, bool]]] = None
+        self._hints: Optional[Dict[str, str]] = None
+
+    def _clear_pending(self) -> None:
+        self._state_dirty = False
+        self._pending_assignments: List[Tuple[str, int]] = []
+        self._dirty_label_keys: Set[Tuple[str, str]] = set()
+        self._dirty_span_keys: Set[Tuple[str, str]] = set()
+        self._pending_phase_rows: Dict[Tuple[str, str, str, str], str] = {}
+        self._pending_hints: Dict[str, str] = {}
+
+    def _pending_count(self) -> int:
+        return (int(self._state_dirty) + len(self._pending_assignments)
+                + len(self._dirty_label_keys) + len(self._dirty_span_keys)
+                + len(self._pending_phase_rows) + len(self._pending_hints))
+
+    def has_pending_writes(self) -> bool:
+        """Whether any change is queued and not yet written to the database."""
+        return self._pending_count() > 0
+
+    def _invalidate_cache(self):
+        """Drop every cached table (thread-safe).
+
+        MysqlUserState calls this after each of its own writes; the inherited
+        slow paths only run after flush(), so nothing queued is lost.
+        """
+        with self._cache_lock:
+            self._drop_caches()
+            self._instance_ordering_cache = None
+            self._current_phase_cache = None
+            self._current_page_cache = None
+            self._current_instance_index_cache = None
+
+    @contextmanager
+    def _synced(self):
+        """Hold the cache lock, revalidating the cache on the outermost entry.
+
+        Revalidating only once per public call means a method never sees the
+        cache dropped between two of its own loads.
+        """
+        with self._cache_lock:
+            self._sync_depth += 1
+            try:
+                if self._sync_depth == 1:
+                    self._revalidate()
+                yield
+            finally:
+                self._sync_depth -= 1
+
+    def _after_write(self) -> None:
+        """Flush when the queue is large, so a long request cannot grow it unbounded.
+
+        Callers hold self._cache_lock.
+        """
+        if self._pending_count() >= self.max_pending_writes:
+            self.flush()
+        elif self.on_write_queued is not None and self.has_pending_writes():
+            self.on_write_queued(self.user_id)
+
+    def _revalidate(self) -> None:
+        """Drop the cache if another process has written rows for this user.
+
+        Callers hold self._cache_lock.
+        """
+        now = time.monotonic()
+        if self._version is not None and now - self._validated_at < self.revalidate_interval:
+            return
+        if self.has_pending_writes():
+            # flush() compares versions itself.
+            self.flush()
+            return
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT cache_version FROM user_states WHERE user_id = %s
+            """, (self.user_id,))
+            result = cursor.fetchone()
+        version = result[0] if result else 0
+        if version != self._version:
+            if self._version is not None:
+                logger.debug(f"User state for {self.user_id} changed externally; reloading")
+            self._drop_caches()
+            self._version = version
+        self._validated_at = now
+
+    def _load_state_row(self) -> List[Any]:
+        # Callers hold self._cache_lock.
+        if self._state_row is not None:
+            return self._state_row
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT current_phase, current_page, current_instance_index
+                FROM user_states WHERE user_id = %s
+            """, (self.user_id,))
+            result = cursor.fetchone()
+        if result:
+            row = [UserPhase.fromstr(result[0]), result[1], result[2]]
+        else:
+            row = [UserPhase.LOGIN, None, -1]
+        self._state_row = row
+        return row
+
+    def _load_ordering(self) -> List[str]:
+        # Callers hold self._cache_lock.
+        if self._ordering is not None:
+            return self._ordering
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT instance_id FROM user_instance_assignments
+                WHERE user_id = %s ORDER BY assignment_order
+            """, (self.user_id,))
+            ordering = [row[0] for row in cursor.fetchall()]
+        self._ordering = ordering
+        self._assigned = set(ordering)
+        return ordering
+
+    def _load_labels(self) -> Dict[str, Dict[Label, str]]:
+        # Callers hold self._cache_lock.
+        if self._labels is not None:
+            return self._labels
+        labels: Dict[str, Dict[Label, str]] = {}
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT instance_id, schema_name, label_name, label_value
+                FROM label_annotations
+                WHERE user_id = %s
+            """, (self.user_id,))
+            for instance_id, schema_name, label_name, label_value in cursor.fetchall():
+                labels.setdefault(instance_id, {})[Label(schema_name, label_name)] = label_value
+        self._labels = labels
+        return labels
+
+    def _load_spans(self) -> Dict[str, Dict[SpanAnnotation, bool]]:
+        # Callers hold self._cache_lock.
+        if self._spans is not None:
+            return self._spans
+        spans: Dict[str, Dict[SpanAnnotation, bool]] = {}
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT instance_id, schema_name, span_name, span_title, start_pos, end_pos,
+                       kb_id, kb_source, kb_label
+                FROM span_annotations
+                WHERE user_id = %s
+            """, (self.user_id,))
+            for instance_id, schema_name, span_name, span_title, start_pos, end_pos, \
+                    kb_id, kb_source, kb_label in cursor.fetchall():
+                span = SpanAnnotation(
+                    schema_name, span_name, span_title, start_pos, end_pos,
+                    kb_id=kb_id, kb_source=kb_source, kb_label=kb_label,
+                )
+                spans.setdefault(instance_id, {})[span] = True
+        self._spans = spans
+        return spans
+
+    def _load_hints(self) -> Dict[str, str]:
+        # Callers hold self._cache_lock.
+        if self._hints is not None:
+            return self._hints
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT instance_id, hint_text FROM ai_hints WHERE user_id = %s
+            """, (self.user_id,))
+            hints = {instance_id: hint_text for instance_id, hint_text in cursor.fetchall()}
+        self._hints = hints
+        return hints
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Write every queued change in one transaction (thread-safe).
+
+        Labels and spans are written per dirty (instance, schema) pair: the
+        pair's rows are deleted and the cached rows re-inserted, so a cleared
+        schema, a changed radio answer and a removed span all reduce to the
+        same two executemany calls.
+        """
+        with self._cache_lock:
+            if not self.has_pending_writes():
+                return
+            state_row = list(self._state_row) if self._state_dirty and self._state_row else None
+            assignments = list(self._pending_assignments)
+            label_keys = sorted(self._dirty_label_keys)
+            span_keys = sorted(self._dirty_span_keys)
+            label_rows = [
+                (self.user_id, instance_id, label.get_schema(), label.get_name(), value)
+                for instance_id, schema_name in label_keys
+                for label, value in (self._labels or {}).get(instance_id, {}).items()
+                if label.get_schema() == schema_name
+            ]
+            span_rows = [
+                (self.user_id, instance_id, span.get_schema(), span.get_name(),
+                 span.get_title(), span.get_start(), span.get_end(),
+                 getattr(span, 'kb_id', None), getattr(span, 'kb_source', None),
+                 getattr(span, 'kb_label', None))
+                for instance_id, schema_name in span_keys
+                for span in (self._spans or {}).get(instance_id, {})
+                if span.get_schema() == schema_name
+            ]
+            phase_rows = [
+                (self.user_id, phase, page, schema_name, label_name, value)
+                for (phase, page, schema_name, label_name), value
+                in self._pending_phase_rows.items()
+            ]
+            hint_rows = [(self.user_id, instance_id, hint)
+                         for instance_id, hint in self._pending_hints.items()]
+
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                if state_row is not None:
+                    phase, page, index = state_row
+                    cursor.execute("""
+                        UPDATE user_states
+                        SET current_phase = %s, current_page = %s, current_instance_index = %s
+                        WHERE user_id = %s
+                    """, (str(phase), page, index, self.user_id))
+                if assignments:
+                    cursor.executemany("""
+                        INSERT INTO user_instance_assignments (user_id, instance_id, assignment_order)
+                        VALUES (%s, %s, %s)
+                    """, [(self.user_id, instance_id, order) for instance_id, order in assignments])
+                if label_keys:
+                    cursor.executemany("""
+                        DELETE FROM label_annotations
+                        WHERE user_id = %s AND instance_id = %s AND schema_name = %s
+                    """, [(self.user_id, instance_id, schema_name)
+                          for instance_id, schema_name in label_keys])
+                if label_rows:
+                    cursor.executemany("""
+                        INSERT INTO label_annotations
+                        (user_id, instance_id, schema_name, label_name, label_value)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON DUPLICATE KEY UPDATE label_value = VALUES(label_value)
+                    """, label_rows)
+                if span_keys:
+                    cursor.executemany("""
+                        DELETE FROM span_annotations
+                        WHERE user_id = %s AND instance_id = %s AND schema_name = %s
+                    """, [(self.user_id, instance_id, schema_name)
+                          for instance_id, schema_name in span_keys])
+                if span_rows:
+                    cursor.executemany("""
+                        INSERT INTO span_annotations
+                        (user_id, instance_id, schema_name, span_name, span_title, start_pos,
+                         end_pos, kb_id, kb_source, kb_label)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """, span_rows)
+                if phase_rows:
+                    cursor.executemany("""
+                        INSERT INTO phase_annotations
+                        (user_id, phase_name, page_name, schema_name, label_name, label_value)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        ON DUPLICATE KEY UPDATE label_value = VALUES(label_value)
+                    """, phase_rows)
+                if hint_rows:
+                    cursor.executemany("""
+                        INSERT INTO ai_hints (user_id, instance_id, hint_text)
+                        VALUES (%s, %s, %s)
+                        ON DUPLICATE KEY UPDATE hint_text = VALUES(hint_text)
+                    """, hint_rows)
+                version = self._bump_version(cursor)
+                conn.commit()
+
+            # Only now: a failed flush leaves everything queued for the next one.
+            self._clear_pending()
+            self._note_version(version)
+
+    def _bump_version(self, cursor) -> int:
+        cursor.execute("""
+            UPDATE user_states SET cache_version = cache_version + 1 WHERE user_id = %s
+        """, (self.user_id,))
+        cursor.execute("""
+            SELECT cache_version FROM user_states WHERE user_id = %s
+        """, (self.user_id,))
+        result = cursor.fetchone()
+        return result[0] if result else 0
+
+    def _note_version(self, version: int) -> None:
+        """Record the version a flush produced; a gap means someone else wrote too."""
+        with self._cache_lock:
+            if self._version is not None and version != self._version + 1:
+                self._drop_caches()
+            self._version = version
+            self._validated_at = time.monotonic()
+
+    def _write_through(self, method, *args):
+        """Flush, run an uncached MysqlUserState write, and record its version bump."""
+        with self._cache_lock:
+            self.flush()
+            result = method(*args)
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                version = self._bump_version(cursor)
+                conn.commit()
+            self._invalidate_cache()
+            self._note_version(version)
+            return result
+
+    def save(self, user_dir: str) -> None:
+        """Persist queued changes. The database is the store, so user_dir is unused."""
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Phase and navigation
+    # ------------------------------------------------------------------
+
+    def advance_to_phase(self, phase: UserPhase, page: str) -> None:
+        """Advance the user to a new phase and page."""
+        with self._synced():
+            row = self._load_state_row()
+            row[0], row[1] = phase, page
+            self._state_dirty = True
+            self._after_write()
+
+    def get_current_phase_and_page(self) -> Tuple[UserPhase, Optional[str]]:
+        """Get the current phase and page."""
+        with self._synced():
+            row = self._load_state_row()
+            return row[0], row[1]
+
+    def get_current_instance_index(self) -> int:
+        """Get the current instance index."""
+        with self._synced():
+            return self._load_state_row()[2]
+
+    def _set_current_index(self, index: int) -> None:
+        # Callers hold self._cache_lock.
+        row = self._load_state_row()
+        row[2] = index
+        self._state_dirty = True
+        self._after_write()
+
+    def goto_prev_instance(self) -> bool:
+        """Move to the previous instance."""
+        with self._synced():
+            current_index = self.get_current_instance_index()
+            if current_index > 0:
+                self._set_current_index(current_index - 1)
+                return True
+            return False
+
+    def goto_next_instance(self) -> bool:
+        """Move to the next instance."""
+        with self._synced():
+            current_index = self.get_current_instance_index()
+            if current_index < len(self._load_ordering()) - 1:
+                self._set_current_index(current_index + 1)
+                return True
+            return False
+
+    def go_to_index(self, instance_index: int) -> None:
+        """Move to a specific instance index."""
+        with self._synced():
+            if 0 <= instance_index < len(self._load_ordering()):
+                self._set_current_index(instance_index)
+
+    # ------------------------------------------------------------------
+    # Assignments
+    # ------------------------------------------------------------------
+
+    def _get_instance_ordering(self) -> List[str]:
+        """Get the ordered list of assigned instance IDs."""
+        with self._synced():
+            return list(self._load_ordering())
+
+    def assign_instance(self, item: Item) -> None:
+        """Assign an instance to the user for annotation."""
+        instance_id = item.get_id()
+        with self._synced():
+            ordering = self._load_ordering()
+            if instance_id in self._assigned:
+                return
+            row = self._load_state_row()
+            # Orders stay contiguous (inserts and removals shift their
+            # neighbours), so the next order is the current length.
+            self._pending_assignments.append((instance_id, len(ordering)))
+            ordering.append(instance_id)
+            self._assigned.add(instance_id)
+            if row[2] == -1:
+                row[2] = 0
+                self._state_dirty = True
+            self._after_write()
+
+    def assign_instance_at_index(self, item: Item, index: int) -> bool:
+        """Insert ``item`` at ``index`` in the user's assignment ordering."""
+        return self._write_through(super().assign_instance_at_index, item, index)
+
+    def unassign_instance(self, instance_id: str) -> bool:
+        """Remove an instance assignment from the user."""
+        with self._synced():
+            self._load_ordering()
+            if instance_id not in self._assigned:
+                return False
+            return self._write_through(super().unassign_instance, instance_id)
+
+    def get_assigned_instance_count(self) -> int:
+        """Get the number of assigned instances."""
+        with self._synced():
+            return len(self._load_ordering())
+
+    def get_assigned_instance_ids(self) -> Set[str]:
+        """Get the set of assigned instance IDs."""
+        with self._synced():
+            self._load_ordering()
+            return set(self._assigned)
+
+    # ------------------------------------------------------------------
+    # Annotations
+    # ------------------------------------------------------------------
+
+    def get_all_annotations(self) -> Dict[str, Dict[str, Any]]:
+        """Get all annotations for this user."""
+        annotations: Dict[str, Dict[str, Any]] = {}
+        with self._synced():
+            for instance_id, label_values in self._load_labels().items():
+                for label, value in label_values.items():
+                    entry = annotations.setdefault(instance_id, {"labels": {}, "spans": {}})
+                    entry["labels"].setdefault(label.get_schema(), {})[label.get_name()] = value
+            for instance_id, span_values in self._load_spans().items():
+                for span in span_values:
+                    entry = annotations.setdefault(instance_id, {"labels": {}, "spans": {}})
+                    entry["spans"].setdefault(span.get_schema(), {})[span.get_name()] = {
+                        "title": span.get_title(),
+                        "start": span.get_start(),
+                        "end": span.get_end(),
+                    }
+        return annotations
+
+    def get_label_annotations(self, instance_id: str) -> Dict[Label, Any]:
+        """Get label annotations for a specific instance."""
+        with self._synced():
+            return dict(self._load_labels().get(instance_id, {}))
+
+    def get_span_annotations(self, instance_id: str) -> Dict[SpanAnnotation, Any]:
+        """Get span annotations for a specific instance."""
+        with self._synced():
+            return dict(self._load_spans().get(instance_id, {}))
+
+    def get_annotated_instance_ids(self) -> Set[str]:
+        """Get the set of annotated instance IDs."""
+        with self._synced():
+            return ({iid for iid, values in self._load_labels().items() if values}
+                    | {iid for iid, values in self._load_spans().items() if values})
+
+    def get_annotation_count(self) -> int:
+        """Get the number of annotated instances."""
+        return len(self.get_annotated_instance_ids())
+
+    def has_annotated(self, instance_id: str) -> bool:
+        """Check if the user has annotated a specific instance."""
+        with self._synced():
+            return (bool(self._load_labels().get(instance_id))
+                    or bool(self._load_spans().get(instance_id)))
+
+    def clear_schema_labels(self, instance_id: str, schema_name: str) -> int:
+        """Remove every stored label for a schema. See UserState.clear_schema_labels."""
+        from potato.server_utils.schema_exclusivity import is_exempt_label
+
+        with self._synced():
+            phase, _page = self.get_current_phase_and_page()
+            if phase != UserPhase.ANNOTATION:
+                # Phase pages hold no cached rows; delete in the database directly.
+                return self._write_through(super().clear_schema_labels, instance_id, schema_name)
+
+            values = self._load_labels().get(instance_id, {})
+            doomed = [label for label in values
+                      if label.get_schema() == schema_name and not is_exempt_label(label.get_name())]
+            for label in doomed:
+                del values[label]
+            if doomed:
+                self._dirty_label_keys.add((instance_id, schema_name))
+                self._after_write()
+            return len(doomed)
+
+    def add_label_annotation(self, instance_id: str, label: Label, value: Any) -> None:
+        """Add a label annotation."""
+        schema_name = label.get_schema()
+        with self._synced():
+            phase, page = self.get_current_phase_and_page()
+
+            # Single-select invariant (GH #167); see MysqlUserState.add_label_annotation.
+            _is_selection = value is not None and value is not False and value != ""
+            if _is_selection and schema_name in getattr(self, '_single_select_schemas', frozenset()):
+                from potato.server_utils.schema_exclusivity import is_exempt_label
+                if not is_exempt_label(label.get_name()):
+                    self.clear_schema_labels(instance_id, schema_name)
+
+            if phase == UserPhase.ANNOTATION:
+                # Stored as text, exactly as a round trip through the table returns it.
+                self._load_labels().setdefault(instance_id, {})[
+                    Label(schema_name, label.get_name())] = str(value)
+                self._dirty_label_keys.add((instance_id, schema_name))
+            else:
+                self._pending_phase_rows[(str(phase), page, schema_name, label.get_name())] = \
+                    str(value)
+            self._after_write()
+
+    def add_span_annotation(self, instance_id: str, span: SpanAnnotation, value: Any) -> None:
+        """Add a span annotation."""
+        with self._synced():
+            phase, page = self.get_current_phase_and_page()
+
+            if phase == UserPhase.ANNOTATION:
+                # Keep only the columns the table stores, so cached and reloaded
+                # spans compare equal.
+                stored = SpanAnnotation(
+                    span.get_schema(), span.get_name(), span.get_title(),
+                    span.get_start(), span.get_end(),
+                    kb_id=getattr(span, 'kb_id', None),
+                    kb_source=getattr(span, 'kb_source', None),
+                    kb_label=getattr(span, 'kb_label', None),
+                )
+                self._load_spans().setdefault(instance_id, {})[stored] = True
+                self._dirty_span_keys.add((instance_id, span.get_schema()))
+            else:
+                # Non-annotation phases store spans in phase_annotations as JSON.
+                span_data = {
+                    "title": span.get_title(),
+                    "start": span.get_start(),
+                    "end": span.get_end()
+                }
+                self._pending_phase_rows[(str(phase), page, span.get_schema(), span.get_name())] = \
+                    json.dumps(span_data)
+            self._after_write()
+
+    def clear_all_annotations(self) -> None:
+        """Clear all annotations for this user."""
+        self._write_through(super().clear_all_annotations)
+
+    def clear_instance_annotations(self, instance_id: str) -> None:
+        """Clear all annotations for one instance."""
+        self._write_through(super().clear_instance_annotations, instance_id)
+
+    # ------------------------------------------------------------------
+    # Hints
+    # ------------------------------------------------------------------
+
+    def hint_exists(self, instance_id: str) -> bool:
+        """Check if a hint exists for an instance."""
+        with self._synced():
+            return instance_id in self._load_hints()
+
+    def get_hint(self, instance_id: str) -> Optional[str]:
+        """Get the hint for an instance."""
+        with self._synced():
+            return self._load_hints().get(instance_id)
+
+    def cache_hint(self, instance_id: str, hint: str) -> None:
+        """Cache a hint for an instance."""
+        with self._synced():
+            self._load_hints()[instance_id] = hint
+            self._pending_hints[instance_id] = hint
+            self._after_write()
@@ -4,12 +4,17 @@ Database connection management for Potato annotation platform.
 Connection pooling and management for MySQL database operations.
 """
 
-import mysql.connector
-from mysql.connector import pooling
 import logging
 from contextlib import contextmanager
 from typing import Optional, Dict, Any
 
+try:
+    import mysql.connector
+    from mysql.connector import pooling
+except ImportError:  # SQLite deployments need no driver
+    mysql = None
+    pooling = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +39,11 @@ class DatabaseManager:
 
     def _create_connection_pool(self):
         """Create the MySQL connection pool."""
+        if mysql is None:
+            raise ImportError(
+                "mysql-connector-python is required for database type 'mysql'. "
+                "Install it, or use type 'sqlite'."
+            )
         db_config = self.config.get('database', {})
 
         # Validate required database configuration
@@ -121,6 +131,7 @@ class DatabaseManager:
                     current_page VARCHAR(255),
                     current_instance_index INT DEFAULT -1,
                     max_assignments INT DEFAULT -1,
+                    cache_version INT NOT NULL DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                     INDEX idx_user_id (user_id)
@@ -222,6 +233,20 @@ class DatabaseManager:
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             """)
 
+            # Tables created before the read-through cache existed lack the
+            # version counter it uses to detect writes from other processes.
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_states'
+                  AND COLUMN_NAME = 'cache_version'
+            """)
+            result = cursor.fetchone()
+            if result is not None and result[0] == 0:
+                cursor.execute("""
+                    ALTER TABLE user_states
+                    ADD COLUMN cache_version INT NOT NULL DEFAULT 0
+                """)
+
             conn.commit()
             logger.info("Database tables created successfully")
 
@@ -76,6 +76,14 @@ class MysqlUserState(UserState):
             """, (self.user_id, 'LOGIN', None, -1, self.max_assignments))
             conn.commit()
 
+    def save(self, user_dir: str) -> None:
+        """Persist the user's state.
+
+        Every write above commits immediately and the database is the store, so
+        there is nothing to do; the inherited JSON save expects attributes only
+        InMemoryUserState has.
+        """
+
     def _invalidate_cache(self):
         """Invalidate cached data (thread-safe)."""
         with self._cache_lock:
@@ -0,0 +1,325 @@
+"""
+SQLite connection management for Potato annotation platform.
+
+A drop-in replacement for DatabaseManager that stores the MySQL user-state
+schema in a single SQLite file. MysqlUserState and CachedMysqlUserState run
+unchanged on top of it: the connections handed out translate the handful of
+MySQL-only constructs those classes use (``%s`` placeholders, ``INSERT IGNORE``,
+``ON DUPLICATE KEY UPDATE``) into their SQLite equivalents.
+
+This makes the database backend usable for single-host deployments and lets
+it be exercised and benchmarked without a MySQL server.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+# Conflict targets for ``ON DUPLICATE KEY UPDATE``, i.e. each table's UNIQUE key
+# in the MySQL schema. A table absent from this map has no unique key besides its
+# auto-increment id, so MySQL never takes the update branch and a plain INSERT is
+# the faithful translation.
+_UPSERT_TARGETS = {
+    "label_annotations": "user_id, instance_id, schema_name, label_name",
+    "phase_annotations": "user_id, phase_name, page_name, schema_name, label_name",
+    "ai_hints": "user_id, instance_id",
+    "user_instance_assignments": "user_id, instance_id",
+    "user_states": "user_id",
+}
+
+_INSERT_TABLE_RE = re.compile(r"INSERT\s+(?:IGNORE\s+)?INTO\s+(\w+)", re.IGNORECASE)
+_ON_DUPLICATE_RE = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.IGNORECASE)
+_VALUES_REF_RE = re.compile(r"VALUES\((\w+)\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def translate_mysql(sql: str) -> str:
+    """Rewrite a MySQL statement used by the user-state classes for SQLite.
+
+    Only the constructs the user-state code actually emits are handled; this
+    is not a general-purpose dialect converter.
+    """
+    sql = sql.replace("%s", "?")
+    sql = re.sub(r"INSERT\s+IGNORE\s+INTO", "INSERT OR IGNORE INTO", sql, flags=re.IGNORECASE)
+
+    match = _ON_DUPLICATE_RE.search(sql)
+    if match:
+        head, assignments = sql[:match.start()], sql[match.end():]
+        table_match = _INSERT_TABLE_RE.search(head)
+        target = _UPSERT_TARGETS.get(table_match.group(1)) if table_match else None
+        if target is None:
+            sql = head
+        else:
+            assignments = _VALUES_REF_RE.sub(r"excluded.\1", assignments)
+            sql = f"{head}ON CONFLICT({target}) DO UPDATE SET{assignments}"
+    return sql
+
+
+class _SqliteCursor:
+    """Cursor wrapper that accepts MySQL-flavoured SQL."""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+
+    def execute(self, sql: str, params: Sequence[Any] = ()):
+        self._cursor.execute(translate_mysql(sql), tuple(params))
+        return self
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]):
+        self._cursor.executemany(translate_mysql(sql), seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class _SqliteConnection:
+    """Connection wrapper mirroring the subset of the mysql.connector API in use.
+
+    ``close()`` is a no-op: connections are per-thread and live as long as the
+    manager, the way pooled MySQL connections outlive each checkout.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def cursor(self) -> _SqliteCursor:
+        return _SqliteCursor(self._connection.cursor())
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def rollback(self) -> None:
+        self._connection.rollback()
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteDatabaseManager:
+    """
+    Manages a SQLite user-state database with the DatabaseManager interface.
+
+    Each thread gets its own connection (SQLite connections must not be shared
+    across threads mid-transaction); WAL mode lets readers proceed while a
+    writer commits.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the SQLite database manager with configuration.
+
+        Args:
+            config: Configuration dictionary. ``database.path`` names the file;
+                it defaults to ``user_state.sqlite`` in output_annotation_dir.
+        """
+        self.config = config
+        db_config = config.get('database', {})
+        path = db_config.get('path')
+        if not path:
+            base_dir = config.get('output_annotation_dir') or config.get('task_dir') or '.'
+            path = os.path.join(base_dir, 'user_state.sqlite')
+        self.path = path
+        self.busy_timeout_ms = int(db_config.get('busy_timeout_ms', 5000))
+
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        logger.info(f"Using SQLite user-state database at {self.path}")
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # check_same_thread is off only so close() can run from any thread;
+            # each connection is otherwise used solely by the thread that made it.
+            connection = sqlite3.connect(
+                self.path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Get this thread's database connection.
+
+        Yields:
+            _SqliteConnection: Connection accepting MySQL-flavoured SQL
+
+        Raises:
+            sqlite3.Error: If a statement fails
+
+        Any exception rolls back the open transaction: the connection outlives
+        this checkout, so uncommitted writes would otherwise leak into the next.
+        """
+        connection = _SqliteConnection(self._thread_connection())
+        try:
+            yield connection
+        except Exception as e:
+            if isinstance(e, sqlite3.Error):
+                logger.error(f"Database connection error: {e}")
+            connection.rollback()
+            raise
+
+    def test_connection(self) -> bool:
+        """
+        Test the database connection.
+
+        Returns:
+            bool: True if connection is successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                result = cursor.fetchone()
+                return result[0] == 1
+        except Exception as e:
+            logger.error(f"Database connection test failed: {e}")
+            return False
+
+    def create_tables(self):
+        """Create all required database tables if they don't exist."""
+        connection = self._thread_connection()
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS user_states (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL UNIQUE,
+                current_phase TEXT NOT NULL,
+                current_page TEXT,
+                current_instance_index INTEGER DEFAULT -1,
+                max_assignments INTEGER DEFAULT -1,
+                cache_version INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+
+            CREATE TABLE IF NOT EXISTS user_instance_assignments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL REFERENCES user_states(user_id) ON DELETE CASCADE,
+                instance_id TEXT NOT NULL,
+                assignment_order INTEGER NOT NULL,
+                assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (user_id, instance_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_assignments_user_order
+                ON user_instance_assignments (user_id, assignment_order);
+
+            CREATE TABLE IF NOT EXISTS label_annotations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL REFERENCES user_states(user_id) ON DELETE CASCADE,
+                instance_id TEXT NOT NULL,
+                schema_name TEXT NOT NULL,
+                label_name TEXT NOT NULL,
+                label_value TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (user_id, instance_id, schema_name, label_name)
+            );
+            CREATE INDEX IF NOT EXISTS idx_labels_user_instance
+                ON label_annotations (user_id, instance_id);
+
+            CREATE TABLE IF NOT EXISTS span_annotations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL REFERENCES user_states(user_id) ON DELETE CASCADE,
+                instance_id TEXT NOT NULL,
+                schema_name TEXT NOT NULL,
+                span_name TEXT NOT NULL,
+                span_title TEXT,
+                start_pos INTEGER NOT NULL,
+                end_pos INTEGER NOT NULL,
+                kb_id TEXT DEFAULT NULL,
+                kb_source TEXT DEFAULT NULL,
+                kb_label TEXT DEFAULT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX IF NOT EXISTS idx_spans_user_instance
+                ON span_annotations (user_id, instance_id);
+
+            CREATE TABLE IF NOT EXISTS phase_annotations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL REFERENCES user_states(user_id) ON DELETE CASCADE,
+                phase_name TEXT NOT NULL,
+                page_name TEXT NOT NULL,
+                schema_name TEXT NOT NULL,
+                label_name TEXT NOT NULL,
+                label_value TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (user_id, phase_name, page_name, schema_name, label_name)
+            );
+
+            CREATE TABLE IF NOT EXISTS behavioral_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL REFERENCES user_states(user_id) ON DELETE CASCADE,
+                instance_id TEXT NOT NULL,
+                data_key TEXT NOT NULL,
+                data_value TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX IF NOT EXISTS idx_behavioral_user_instance
+                ON behavioral_data (user_id, instance_id);
+
+            CREATE TABLE IF NOT EXISTS ai_hints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL REFERENCES user_states(user_id) ON DELETE CASCADE,
+                instance_id TEXT NOT NULL,
+                hint_text TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (user_id, instance_id)
+            );
+        """)
+        connection.commit()
+        logger.info("Database tables created successfully")
+
+    def drop_tables(self):
+        """Drop all database tables (for testing)."""
+        connection = self._thread_connection()
+        for table in ('ai_hints', 'behavioral_data', 'phase_annotations',
+                      'span_annotations', 'label_annotations',
+                      'user_instance_assignments', 'user_states'):
+            connection.execute(f"DROP TABLE IF EXISTS {table}")
+        connection.commit()
+        logger.info("Database tables dropped successfully")
+
+    def close(self):
+        """Close every thread's connection."""
+        with self._connections_lock:
+            for connection in self._connections:
+                try:
+                    connection.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Error closing connection: {e}")
+            self._connections = []
+        self._local = threading.local()
+        logger.info("SQLite user-state database closed")
@@ -1,6 +1,6 @@
 """``potato deploy`` — build, inspect, provision, and tear down a hosted task.
 
-Dispatched before argparse in ``flask_server.main`` because ``deploy`` has its
+Dispatched before argparse in ``potato.cli.main`` because ``deploy`` has its
 own flag set and does not fit the ``mode`` + ``config_file`` positional shape of
 ``server_utils/arg_utils.py``. That follows the pattern already used by
 ``transcripts``, ``convokit``, ``import`` and ``download-models``.
@@ -7,6 +7,7 @@ Usage:
     python -m potato.export --config config.yaml --format coco --output ./out/
     python -m potato.export --config config.yaml --format conll_2003 --output ./out/
     python -m potato.export --list-formats
+    potato export config.yaml --format coco
 """
 
 import argparse
@@ -434,10 +435,14 @@ def build_export_context(config_path: str) -> ExportContext:
     )
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Export Potato annotations to standard formats"
     )
+    parser.add_argument(
+        "config_file", nargs="?", default=None,
+        help="Path to Potato YAML config file (same as --config)",
+    )
     parser.add_argument(
         "--config", "-c",
         help="Path to Potato YAML config file",
@@ -468,7 +473,8 @@ def main():
         help="Enable verbose logging",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    args.config = args.config or args.config_file
 
     logging.basicConfig(
         level=logging.DEBUG if args.verbose else logging.INFO,
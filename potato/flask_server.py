@@ -94,6 +94,7 @@ from potato.qda_mode import init_qda_mode_manager
 
 from potato.create_task_cli import create_task_cli
 from potato.server_utils.arg_utils import arguments
+from potato.instrumentation.metrics import timed
 from potato.server_utils.config_module import init_config, config
 from potato.server_utils.schemas.span import render_span_annotations
 from potato.server_utils.prolific_apis import ProlificStudy
@@ -1551,6 +1552,8 @@ def load_highlights_data(config: dict) -> None:
     # that imported keyword_highlight_patterns see the updated contents
     patterns_list.clear()
 
+    from potato.server_utils.keyword_matcher import compile_keyword_pattern, get_keyword_matcher
+
     try:
         with open(keyword_highlights_file, 'r', encoding='utf-8') as f:
             import csv
@@ -1564,25 +1567,8 @@ def load_highlights_data(config: dict) -> None:
                 if not word:
                     continue
 
-                # Convert wildcard pattern to regex
-                # Escape special regex characters except *
-                escaped = re.escape(word).replace(r'\*', r'\w*')
-
-                # Add word boundary markers for exact matching
-                # If pattern starts with wildcard, don't require word boundary at start
-                # If pattern ends with wildcard, don't require word boundary at end
-                if word.startswith('*'):
-                    pattern = escaped
-                else:
-                    pattern = r'\b' + escaped
-
-                if word.endswith('*'):
-                    pattern = pattern
-                else:
-                    pattern = pattern + r'\b'
-
                 try:
-                    compiled_regex = re.compile(pattern, re.IGNORECASE)
+                    compiled_regex = compile_keyword_pattern(word)
                     patterns_list.append({
                         'pattern': word,
                         'regex': compiled_regex,
@@ -1599,6 +1585,9 @@ def load_highlights_data(config: dict) -> None:
 
         logger.info(f"Loaded {len(patterns_list)} keyword highlight patterns")
 
+        # Compile the lexicon now rather than on the first page view.
+        get_keyword_matcher(patterns_list)
+
     except Exception as e:
         logger.error(f"Error loading keyword highlights file: {e}")
         patterns_list.clear()
@@ -2173,6 +2162,23 @@ def before_request():
         session.clear()  # Clear the session
         return redirect(url_for('home'))  # Redirect to home page (login/register)
 
+def flush_user_state_writes(exc=None):
+    """
+    Commit user-state changes a request queued without saving.
+
+    With the cached database backend, navigation and instance assignment update
+    the cache but never call save_user_state(), so without this they would live
+    only in this worker's memory. Registered on the app by configure_app().
+    """
+    try:
+        usm = get_user_state_manager()
+    except Exception:
+        return  # not initialised yet (startup, static files in tests)
+    try:
+        usm.flush_pending_writes()
+    except Exception as e:
+        logger.error(f"Flushing queued user-state writes failed: {e}")
+
 def get_users():
     """
     Returns the list of users that have logged in.
@@ -2528,6 +2534,7 @@ def _annotator_dashboard_enabled() -> bool:
     return False
 
 
+@timed("render")
 def render_page_with_annotations(username: str):
     '''
     When annotating, shows the current instance to the user with any annotations
@@ -2868,6 +2875,7 @@ def render_page_with_annotations(username: str):
             display_template_vars = display_renderer.get_template_variables(item.get_data())
             display_html = display_template_vars.get("display_html", "")
             logger.debug(f"Instance display rendered: {len(display_html)} chars")
+            _queue_format_prefetch(user_state, display_renderer)
         except Exception as e:
             logger.error(f"Error rendering instance display: {e}")
             has_instance_display = False  # Fall back to legacy mode
@@ -3586,13 +3594,14 @@ def map_user_id_to_digit(user_id_str):
 def get_total_annotations():
     """
     Returns the total number of unique annotations done across all users.
-    """
-    total = 0
-    for username in get_users():
-        user_state = get_user_state(username)
-        total += user_state.get_annotation_count()
 
-    return total
+    Read from the user manager's running progress counters, so the cost is
+    the number of users changed since the last call rather than all users.
+    """
+    usm = get_user_state_manager()
+    usm.refresh_progress_counters()
+    total_annotations, _ = usm.progress_counters.snapshot()
+    return total_annotations
 
 def update_annotation_state(username, form):
     """
@@ -3812,6 +3821,10 @@ def configure_app(flask_app):
     from potato.server_utils.session_config import configure_session
     configure_session(app, config)
 
+    # Write back cached user-state changes at the end of every request.
+    if flush_user_state_writes not in flask_app.teardown_request_funcs.get(None, []):
+        flask_app.teardown_request(flush_user_state_writes)
+
     # Configure routes from the routes module
     from routes import configure_routes
     configure_routes(app, config)
@@ -3961,6 +3974,22 @@ def _register_web_agent_blueprints_if_needed(flask_app, config):
         atexit.register(lambda: (get_automation_manager() and get_automation_manager().shutdown()))
         logger.info("Registered automation-rules blueprint")
 
+    # Request instrumentation: per-route and hot-path latency histograms, and
+    # the opt-in sampling profiler. Nothing is hooked in when it is off.
+    if config.get("instrumentation", {}).get("enabled", False):
+        from potato.instrumentation import init_metrics_registry, get_metrics_registry
+        from potato.instrumentation.hooks import install_request_hooks
+        from potato.instrumentation.routes import instrumentation_bp
+        if get_metrics_registry() is None:
+            init_metrics_registry(config)
+            import atexit
+            from potato.instrumentation import clear_metrics_registry
+            atexit.register(clear_metrics_registry)
+        install_request_hooks(flask_app)
+        if "instrumentation" not in flask_app.blueprints:
+            flask_app.register_blueprint(instrumentation_bp)
+        logger.info("Registered request-instrumentation blueprint")
+
     # Semantic curation (Catalog): embedding index + similarity search + slices.
     if config.get("curation", {}).get("enabled", False):
         from potato.curation import init_curation_manager, get_curation_manager
@@ -4306,6 +4335,9 @@ def _initialize_from_config(config_file):
     # Initialize WaveformService for audio annotation
     _init_waveform_service(config)
 
+    # Initialize the extraction cache for PDF/document display fields
+    _init_extraction_cache(config)
+
     # Initialize webhook emitter if configured
     if config.get("webhooks", {}).get("enabled", False):
         from potato.webhooks import init_webhook_emitter
@@ -4448,6 +4480,7 @@ def _init_waveform_service(config: dict) -> None:
     look_ahead = audio_config.get('waveform_look_ahead', 5)
     cache_max_size = audio_config.get('waveform_cache_max_size', 100)
     client_fallback_max_duration = audio_config.get('client_fallback_max_duration', 1800)
+    workers = audio_config.get('waveform_workers', 2)
 
     try:
         from potato.server_utils.waveform_service import init_waveform_service, get_waveform_service
@@ -4456,14 +4489,15 @@ def _init_waveform_service(config: dict) -> None:
             cache_dir=cache_dir,
             look_ahead=look_ahead,
             cache_max_size=cache_max_size,
-            client_fallback_max_duration=client_fallback_max_duration
+            client_fallback_max_duration=client_fallback_max_duration,
+            workers=workers
         )
 
-        if waveform_service.is_available:
+        if waveform_service.audiowaveform_available:
             logger.info(f"WaveformService initialized with audiowaveform tool (cache: {cache_dir})")
         else:
-            logger.warning("WaveformService initialized but audiowaveform tool not available. "
-                          "Client-side waveform generation will be used as fallback.")
+            logger.info("WaveformService initialized without audiowaveform tool; waveforms are "
+                        f"generated natively (cache: {cache_dir}, workers: {workers}).")
 
         # Register cleanup handler
         import atexit
@@ -4479,6 +4513,68 @@ def _init_waveform_service(config: dict) -> None:
         logger.warning("Audio annotation will use client-side waveform generation only")
 
 
+def _init_extraction_cache(config: dict) -> None:
+    """
+    Initialize the ExtractionCache if any instance_display field is rendered
+    through a format handler (pdf, document, spreadsheet, code).
+
+    Args:
+        config: The application configuration dictionary
+    """
+    fields = (config.get('instance_display') or {}).get('fields') or []
+    if not any(f.get('type') in ('pdf', 'document', 'spreadsheet', 'code') for f in fields):
+        logger.debug("No format display fields found, skipping ExtractionCache initialization")
+        return
+
+    extraction_config = config.get('format_extraction', {})
+    if not extraction_config.get('cache', True):
+        return
+    task_dir = config.get('task_dir', '.')
+
+    cache_dir = extraction_config.get('cache_dir')
+    if not cache_dir:
+        cache_dir = os.path.join(config.get('output_annotation_dir') or task_dir,
+                                 '.extraction_cache')
+    if not os.path.isabs(cache_dir):
+        cache_dir = os.path.join(task_dir, cache_dir)
+
+    try:
+        from potato.format_handlers.extraction_cache import (
+            ExtractionCache, init_extraction_cache, clear_extraction_cache,
+        )
+        cache = init_extraction_cache(
+            cache_dir,
+            look_ahead=extraction_config.get('look_ahead', ExtractionCache.DEFAULT_LOOK_AHEAD),
+            workers=extraction_config.get('workers', ExtractionCache.DEFAULT_WORKERS),
+        )
+        logger.info(f"ExtractionCache initialized (cache: {cache_dir}, "
+                    f"look_ahead: {cache.look_ahead}, workers: {cache.workers})")
+
+        import atexit
+        atexit.register(clear_extraction_cache)
+    except Exception as e:
+        logger.error(f"Failed to initialize ExtractionCache: {e}")
+        logger.warning("Format display fields will be extracted on every page view")
+
+
+def _queue_format_prefetch(user_state, display_renderer) -> None:
+    """Queue the format fields of the annotator's next instances for extraction."""
+    from potato.format_handlers.extraction_cache import get_extraction_cache
+    cache = get_extraction_cache()
+    if cache is None or cache.look_ahead <= 0:
+        return
+    try:
+        index = user_state.get_current_instance_index()
+        upcoming = user_state.instance_id_ordering[index + 1:index + 1 + cache.look_ahead]
+        ism = get_item_state_manager()
+        items = (ism.find_item(instance_id) for instance_id in upcoming)
+        instances = [item.get_data() for item in items if item is not None]
+        display_renderer.queue_prefetch(instances)
+    except Exception as e:
+        # Look-ahead is an optimization; never let it break the page view.
+        logger.debug(f"Format pre-extraction skipped: {e}")
+
+
 def run_server(args):
     """
     Run the Flask server with the given arguments.
@@ -4842,6 +4938,9 @@ def run_server(args):
     # Initialize WaveformService for audio annotation if configured
     _init_waveform_service(config)
 
+    # Initialize the extraction cache for PDF/document display fields
+    _init_extraction_cache(config)
+
     # Log password requirement status
     logger.info(f"Password authentication required: {config.get('require_password', True)}")
 
@@ -4880,82 +4979,12 @@ def main():
     """
     Main entry point for the Flask server
 
-    This function initializes the application, loads data, and runs the server.
+    Argument parsing and subcommand dispatch live in :mod:`potato.cli`, which
+    the ``potato`` command runs without importing this module. Running this
+    file as a script still starts the server from this module.
     """
-    # ``transcripts`` is dispatched before the server's own argument parsing.
-    # It takes input paths rather than a config file and has its own flags, so
-    # routing it through the server parser would mean bending both.
-    if len(sys.argv) > 1 and sys.argv[1] == 'transcripts':
-        from potato.transcript_cli import main as transcripts_main
-        sys.exit(transcripts_main(sys.argv[2:]))
-
-    # ``convokit`` is dispatched the same way and for the same reason: it takes a
-    # corpus name or path rather than a config file.
-    if len(sys.argv) > 1 and sys.argv[1] == 'convokit':
-        from potato.convokit.cli import main as convokit_main
-        sys.exit(convokit_main(sys.argv[2:]))
-
-    # ``import`` generates a project from an existing annotation file (COCO,
-    # ...), so it takes input paths rather than a config file.
-    if len(sys.argv) > 1 and sys.argv[1] == 'import':
-        from potato.importers.cli import main as import_main
-        sys.exit(import_main(sys.argv[2:]))
-
-    # ``download-models`` fetches segmentation weights. Dispatched here for the
-    # same reason as the others: it takes a model name, not a config file.
-    if len(sys.argv) > 1 and sys.argv[1] == 'download-models':
-        from potato.models_cli import main as models_main
-        sys.exit(models_main(sys.argv[2:]))
-
-    # ``deploy`` puts a task on a host and takes it down again. It has its own
-    # subcommands and flag set, so it does not fit the mode + config_file
-    # positional shape the server parser uses.
-    if len(sys.argv) > 1 and sys.argv[1] == 'deploy':
-        from potato.deploy.cli import main as deploy_main
-        sys.exit(deploy_main(sys.argv[2:]))
-
-    # ``share`` serves a task on a temporary public URL through a tunnel.
-    if len(sys.argv) > 1 and sys.argv[1] == 'share':
-        from potato.deploy.share_cli import main as share_main
-        sys.exit(share_main(sys.argv[2:]))
-
-    # Parse command line arguments
-    args = arguments()
-
-    if args.mode == 'start':
-        logger.info("Starting server mode")
-        run_server(args)
-    elif args.mode == 'reset-password':
-        logger.info("Starting password reset")
-        from potato.password_reset import cli_reset_password
-        cli_reset_password(args)
-        return
-    elif args.mode == 'migrate':
-        logger.info("Starting config migration")
-        from potato.migrate_cli import main as migrate_main
-        # Pass arguments to migrate CLI
-        migrate_args = [args.config_file]
-        if args.to_v2:
-            migrate_args.append("--to-v2")
-        if args.output_file:
-            migrate_args.extend(["--output", args.output_file])
-        if args.in_place:
-            migrate_args.append("--in-place")
-        if args.dry_run:
-            migrate_args.append("--dry-run")
-        if args.quiet:
-            migrate_args.append("--quiet")
-        sys.exit(migrate_main(migrate_args))
-    elif args.mode == 'codebook':
-        logger.info("Starting codebook initialization")
-        from potato.codebook_cli import main as codebook_main
-        sys.exit(codebook_main([args.config_file]))
-    elif args.mode == 'repair-annotations':
-        logger.info("Starting single-select annotation repair")
-        from potato.repair_cli import run_repair
-        sys.exit(run_repair(args))
-
-    logger.info("Annotation platform shutdown complete")
+    from potato.cli import main as cli_main
+    cli_main(run_server=run_server)
 
 
 # Main entry point
@@ -91,12 +91,15 @@ class BaseFormatHandler(ABC):
         supported_extensions: List of file extensions this handler supports
         description: Human-readable description of this format handler
         requires_dependencies: List of optional dependencies needed
+        parallel_pages: True if ``extract`` accepts an ``executor`` keyword
+            and spreads per-page work (e.g. OCR) across it
     """
 
     format_name: str = ""
     supported_extensions: List[str] = []
     description: str = ""
     requires_dependencies: List[str] = []
+    parallel_pages: bool = False
 
     @abstractmethod
     def extract(self, file_path: str, options: Optional[Dict[str, Any]] = None) -> FormatOutput:
@@ -0,0 +1,411 @@
+"""
+Extraction Cache
+
+Keeps format handler output on disk so a document is extracted once, not on
+every page view. Entries are content-addressed: the key is the SHA-256 of the
+file plus the handler, the output kind and the options, so an edited file or
+a changed option is a miss and two copies of one file share an entry.
+
+Two kinds of output are cached:
+- "extract": a FormatOutput from format_handler_registry.extract() -- text,
+  rendered HTML, metadata and the coordinate map. The map's
+  ``get_coords_for_range`` lookup is rebuilt from the stored mappings.
+- "ocr_words": PDFHandler.extract_words_by_page() output, the per-page words
+  behind the client text layer of scanned PDFs in link mode.
+
+Features:
+- Background look-ahead: the server queues the format fields of an
+  annotator's next instances, and a worker thread extracts them before they
+  are opened
+- Per-page OCR across a process pool (handlers with ``parallel_pages``)
+- A request for an entry the worker is producing waits for it instead of
+  extracting the same file twice
+
+Usage:
+    from potato.format_handlers.extraction_cache import init_extraction_cache
+
+    cache = init_extraction_cache("/path/to/output/.extraction_cache")
+    output = cache.extract("document.pdf", {"ocr": "auto"})
+    pages = cache.words_by_page("scan.pdf", {"ocr": True})
+    cache.queue_prefetch([("extract", "next.docx", {})])
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import FormatOutput
+from .coordinate_mapping import CoordinateMapper
+
+logger = logging.getLogger(__name__)
+
+# Bump when handler output changes shape, so stale entries become misses.
+CACHE_VERSION = 1
+
+KINDS = ("extract", "ocr_words")
+
+
+class ExtractionCache:
+    """
+    On-disk cache of format handler output with background pre-extraction.
+    """
+
+    DEFAULT_LOOK_AHEAD = 3
+    DEFAULT_WORKERS = 2  # Processes for per-page OCR
+    WAIT_TIMEOUT = 600  # Seconds to wait for an extraction already running
+
+    def __init__(
+        self,
+        cache_dir: str,
+        look_ahead: int = DEFAULT_LOOK_AHEAD,
+        workers: int = DEFAULT_WORKERS
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached entries
+            look_ahead: Number of upcoming instances to pre-extract
+            workers: Processes for per-page OCR (0 OCRs pages one by one in
+                the extracting thread)
+        """
+        self.cache_dir = cache_dir
+        self.look_ahead = max(0, int(look_ahead))
+        self.workers = max(0, int(workers))
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # (path, size, mtime_ns) -> content digest, so a hit costs one stat
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        # Entry key -> event set when the extraction producing it finishes
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetch_queue: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._prefetch_lock = threading.Lock()
+        self._stop_prefetch = threading.Event()
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def extract(
+        self,
+        file_path: str,
+        options: Optional[Dict[str, Any]] = None,
+        format_name: Optional[str] = None
+    ) -> FormatOutput:
+        """
+        format_handler_registry.extract(), served from the cache when possible.
+
+        Raises whatever the handler raises on a miss (ValueError for an
+        unsupported file, ImportError for a missing dependency, ...).
+        """
+        entry = self._get("extract", file_path, options or {}, format_name)
+        return self._decode_output(entry, file_path)
+
+    def words_by_page(
+        self,
+        file_path: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """PDFHandler.extract_words_by_page(), served from the cache when possible."""
+        entry = self._get("ocr_words", file_path, options or {}, "pdf")
+        return {int(page): words for page, words in entry.items()}
+
+    def queue_prefetch(self, jobs: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """
+        Add extractions to the background queue.
+
+        Args:
+            jobs: ``(kind, file_path, options)`` tuples, kind being one of
+                KINDS. Jobs already queued are skipped; cached ones are
+                skipped by the worker.
+        """
+        with self._prefetch_lock:
+            for job in jobs:
+                if job[0] in KINDS and job not in self._prefetch_queue:
+                    self._prefetch_queue.append(job)
+            if not self._prefetch_queue:
+                return
+
+        if self._prefetch_thread is None or not self._prefetch_thread.is_alive():
+            self._start_background_prefetch()
+
+    def stop_background_prefetch(self) -> None:
+        """Stop the background worker and the OCR process pool."""
+        self._stop_prefetch.set()
+        with self._prefetch_lock:
+            self._prefetch_queue.clear()
+        if self._prefetch_thread and self._prefetch_thread.is_alive():
+            self._prefetch_thread.join(timeout=5)
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def clear(self) -> int:
+        """Delete every cached entry. Returns the number removed."""
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    # ------------------------------------------------------------------
+    # Keys and storage
+    # ------------------------------------------------------------------
+
+    def _file_digest(self, file_path: str) -> str:
+        """SHA-256 of the file, recomputed only when its size or mtime changes."""
+        real = os.path.realpath(file_path)
+        st = os.stat(real)
+        stamp = (real, st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(real, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            self._digests[stamp] = digest
+        return digest
+
+    def _entry_key(self, kind: str, file_path: str, options: Dict[str, Any],
+                   format_name: Optional[str]) -> str:
+        """Content-addressed key; raises OSError for anything not a local file."""
+        if format_name is None:
+            from .registry import format_handler_registry
+            format_name = format_handler_registry.detect_format(file_path)
+        payload = json.dumps({
+            "version": CACHE_VERSION,
+            "kind": kind,
+            "format": format_name,
+            "file": self._file_digest(file_path),
+            "options": options,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key: str) -> Optional[Any]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable extraction cache entry {path}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _store(self, key: str, entry: Any) -> None:
+        """Write an entry atomically; output that is not JSON is just not cached."""
+        try:
+            data = json.dumps(entry)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Extraction output not cacheable: {e}")
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self._entry_path(key))
+        except OSError as e:
+            logger.warning(f"Could not write extraction cache entry: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Extraction
+    # ------------------------------------------------------------------
+
+    def _get(self, kind: str, file_path: str, options: Dict[str, Any],
+             format_name: Optional[str]) -> Any:
+        """The cached entry for a job, extracting (once) on a miss."""
+        try:
+            key = self._entry_key(kind, file_path, options, format_name)
+        except OSError:
+            # Not a readable local file: let the handler report it.
+            return self._run(kind, file_path, options, format_name)
+
+        entry = self._load(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            event = self._in_flight.get(key)
+            owner = event is None
+            if owner:
+                event = self._in_flight[key] = threading.Event()
+        if not owner:
+            event.wait(self.WAIT_TIMEOUT)
+            entry = self._load(key)
+            if entry is not None:
+                return entry
+            # The other extraction failed or was not cacheable: do it here.
+            return self._run(kind, file_path, options, format_name)
+
+        try:
+            entry = self._run(kind, file_path, options, format_name)
+            self._store(key, entry)
+            return entry
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            event.set()
+
+    def _run(self, kind: str, file_path: str, options: Dict[str, Any],
+             format_name: Optional[str]) -> Any:
+        """Run the handler and return its output in cacheable form."""
+        if kind == "ocr_words":
+            from .pdf_handler import PDFHandler
+            return PDFHandler().extract_words_by_page(
+                file_path, options, executor=self._get_executor()
+            )
+        from .registry import format_handler_registry
+        handler = (format_handler_registry.get_handler(format_name) if format_name
+                   else format_handler_registry.get_handler_for_file(file_path))
+        executor = self._get_executor() if handler and handler.parallel_pages else None
+        output = format_handler_registry.extract(
+            file_path, format_name=format_name, options=options, executor=executor
+        )
+        return self._encode_output(output)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """The per-page process pool, created on first use (None with 0 workers)."""
+        if self.workers <= 0:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    @staticmethod
+    def _encode_output(output: FormatOutput) -> Dict[str, Any]:
+        coordinate_map = {k: v for k, v in (output.coordinate_map or {}).items()
+                          if not callable(v)}
+        return {
+            "text": output.text,
+            "rendered_html": output.rendered_html,
+            "coordinate_map": coordinate_map,
+            "coords_lookup": callable((output.coordinate_map or {}).get("get_coords_for_range")),
+            "metadata": output.metadata,
+            "format_name": output.format_name,
+            "source_path": output.source_path,
+        }
+
+    @staticmethod
+    def _decode_output(entry: Dict[str, Any], file_path: str) -> FormatOutput:
+        coordinate_map = dict(entry["coordinate_map"])
+        if entry.get("coords_lookup"):
+            mapper = CoordinateMapper.from_dict(coordinate_map)
+            coordinate_map["get_coords_for_range"] = mapper.get_coords_for_range
+        # The entry may come from another copy of the same file.
+        metadata = dict(entry["metadata"])
+        if metadata.get("source_file") == entry["source_path"]:
+            metadata["source_file"] = str(file_path)
+        return FormatOutput(
+            text=entry["text"],
+            rendered_html=entry["rendered_html"],
+            coordinate_map=coordinate_map,
+            metadata=metadata,
+            format_name=entry["format_name"],
+            source_path=str(file_path),
+        )
+
+    # ------------------------------------------------------------------
+    # Background pre-extraction
+    # ------------------------------------------------------------------
+
+    def _start_background_prefetch(self) -> None:
+        """Start the background pre-extraction thread."""
+        self._stop_prefetch.clear()
+        self._prefetch_thread = threading.Thread(
+            target=self._background_prefetch_worker,
+            name="extraction-prefetch",
+            daemon=True
+        )
+        self._prefetch_thread.start()
+        logger.debug("Started background pre-extraction thread")
+
+    def _background_prefetch_worker(self) -> None:
+        """Background worker: extract queued jobs until the queue is empty."""
+        while not self._stop_prefetch.is_set():
+            with self._prefetch_lock:
+                if not self._prefetch_queue:
+                    break
+                kind, file_path, options = self._prefetch_queue.pop(0)
+
+            format_name = "pdf" if kind == "ocr_words" else None
+            try:
+                self._get(kind, file_path, options, format_name)
+            except Exception as e:
+                # The page view will surface the error when it is opened.
+                logger.debug(f"Pre-extraction of {file_path} failed: {e}")
+
+        logger.debug("Background pre-extraction thread finished")
+
+
+# Global instance (initialized when the server starts)
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Get the global ExtractionCache instance, or None if not initialized."""
+    return _extraction_cache
+
+
+def init_extraction_cache(
+    cache_dir: str,
+    look_ahead: int = ExtractionCache.DEFAULT_LOOK_AHEAD,
+    workers: int = ExtractionCache.DEFAULT_WORKERS
+) -> ExtractionCache:
+    """
+    Initialize the global ExtractionCache, stopping any previous one.
+
+    Args:
+        cache_dir: Directory holding the cached entries
+        look_ahead: Number of upcoming instances to pre-extract
+        workers: Processes for per-page OCR
+
+    Returns:
+        The initialized ExtractionCache instance
+    """
+    global _extraction_cache
+    if _extraction_cache is not None:
+        _extraction_cache.stop_background_prefetch()
+    _extraction_cache = ExtractionCache(cache_dir, look_ahead=look_ahead, workers=workers)
+    return _extraction_cache
+
+
+def clear_extraction_cache() -> None:
+    """Stop and forget the global instance (does not delete cached files)."""
+    global _extraction_cache
+    if _extraction_cache is not None:
+        _extraction_cache.stop_background_prefetch()
+    _extraction_cache = None
@@ -19,6 +19,7 @@ Usage:
     coords = output.coordinate_map
 """
 
+from concurrent.futures import Executor
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import html
@@ -48,6 +49,17 @@ except ImportError:
     pytesseract = None
 
 
+def _ocr_page_words(file_path: str, page_num: int, opts: Dict[str, Any]) -> List[Dict]:
+    """
+    OCR one page of a PDF in a worker process.
+
+    Module-level so a process pool can pickle it; opens the file itself
+    because pdfplumber pages cannot cross process boundaries.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        return PDFHandler()._ocr_words(pdf.pages[page_num - 1], opts)
+
+
 class PDFHandler(BaseFormatHandler):
     """
     Handler for PDF documents.
@@ -60,6 +72,7 @@ class PDFHandler(BaseFormatHandler):
     supported_extensions = [".pdf"]
     description = "PDF document text extraction with page/position mapping"
     requires_dependencies = ["pdfplumber"]
+    parallel_pages = True
 
     def get_default_options(self) -> Dict[str, Any]:
         """Get default extraction options."""
@@ -83,7 +96,8 @@ class PDFHandler(BaseFormatHandler):
     def extract(
         self,
         file_path: str,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        executor: Optional[Executor] = None
     ) -> FormatOutput:
         """
         Extract text and layout from a PDF file.
@@ -96,6 +110,8 @@ class PDFHandler(BaseFormatHandler):
                 - include_page_breaks: Include page separators in text
                 - page_separator: Format string for page breaks ({page} replaced)
                 - extract_tables: Also extract table structures
+            executor: Optional pool that OCRs pages in parallel (see
+                ``_ocr_in_pool``); the output is the same as without it
 
         Returns:
             FormatOutput with extracted text, HTML, and coordinate mappings
@@ -125,6 +141,10 @@ class PDFHandler(BaseFormatHandler):
         with pdfplumber.open(file_path) as pdf:
             metadata["total_pages"] = len(pdf.pages)
             max_pages = opts.get("max_pages") or len(pdf.pages)
+            if executor is not None and opts.get("extraction_mode") != "layout":
+                opts["_ocr_results"] = self._ocr_in_pool(
+                    file_path, pdf.pages[:max_pages], opts, executor
+                )
 
             for page_num, page in enumerate(pdf.pages[:max_pages], start=1):
                 page_text, page_html, page_coords = self._extract_page(
@@ -264,8 +284,12 @@ class PDFHandler(BaseFormatHandler):
         Each record is ``{"text": str, "bbox": [x0, top, x1, bottom] (PDF
         points), "line": (block, par, line)}``. Shared by ``_extract_page_ocr``
         (server-side HTML/coords) and ``extract_words_by_page`` (client text
-        layer for scanned PDFs).
+        layer for scanned PDFs). Pages already OCR'd by ``_ocr_in_pool`` are
+        returned from ``opts["_ocr_results"]``.
         """
+        prefetched = opts.get("_ocr_results")
+        if prefetched and page.page_number in prefetched:
+            return prefetched[page.page_number]
         if not PYTESSERACT_AVAILABLE:
             raise ImportError(
                 "OCR requested but pytesseract is not installed. "
@@ -299,10 +323,40 @@ class PDFHandler(BaseFormatHandler):
             })
         return words
 
+    def _ocr_in_pool(self, file_path: str, pages, opts: Dict[str, Any],
+                     executor: Executor) -> Dict[int, List[Dict]]:
+        """
+        OCR the pages that will need it, one pool job per page.
+
+        ``ocr: True`` OCRs every page; ``"auto"`` only pages with no
+        non-blank characters, the ones whose text extraction comes back
+        empty. Returns ``{page_number: words}`` for ``_ocr_words`` to pick
+        up; pages it misses are OCR'd inline as before. Nothing is
+        submitted without OCR, without pytesseract (``_ocr_words`` raises
+        the usual error), or for a single page, which gains nothing from
+        the pool.
+        """
+        ocr = opts.get("ocr", False)
+        if not ocr or not PYTESSERACT_AVAILABLE:
+            return {}
+        wanted = [
+            page.page_number for page in pages
+            if ocr is True or not any((c.get("text") or "").strip() for c in page.chars)
+        ]
+        if len(wanted) < 2:
+            return {}
+        page_opts = {"ocr_dpi": opts.get("ocr_dpi", 200), "ocr_lang": opts.get("ocr_lang", "eng")}
+        futures = {
+            page_num: executor.submit(_ocr_page_words, str(file_path), page_num, page_opts)
+            for page_num in wanted
+        }
+        return {page_num: future.result() for page_num, future in futures.items()}
+
     def extract_words_by_page(
         self,
         file_path: str,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        executor: Optional[Executor] = None
     ) -> Dict[int, List[Dict[str, Any]]]:
         """
         Return per-page words with PER-PAGE char offsets and PDF-point boxes.
@@ -311,7 +365,8 @@ class PDFHandler(BaseFormatHandler):
         Used to build a selectable text layer client-side for scanned/image-only
         PDFs (where PDF.js ``getTextContent`` is empty). Honors the ``ocr`` option:
         ``False`` uses the embedded text layer, ``True`` always OCRs, ``"auto"``
-        OCRs only pages whose embedded text extraction is empty.
+        OCRs only pages whose embedded text extraction is empty. With an
+        ``executor`` those pages are OCR'd in parallel, one job per page.
         """
         if not PDFPLUMBER_AVAILABLE:
             raise ImportError("pdfplumber is required for PDF word extraction")
@@ -338,6 +393,10 @@ class PDFHandler(BaseFormatHandler):
         result: Dict[int, List[Dict[str, Any]]] = {}
         with pdfplumber.open(file_path) as pdf:
             max_pages = opts.get("max_pages") or len(pdf.pages)
+            if executor is not None:
+                opts["_ocr_results"] = self._ocr_in_pool(
+                    file_path, pdf.pages[:max_pages], opts, executor
+                )
             for page_num, page in enumerate(pdf.pages[:max_pages], start=1):
                 offset = 0
                 page_words = []
@@ -24,6 +24,7 @@ Usage:
         output = format_handler_registry.extract("document.pdf")
 """
 
+from concurrent.futures import Executor
 from typing import Dict, List, Any, Optional, Type
 from pathlib import Path
 import logging
@@ -161,7 +162,8 @@ class FormatHandlerRegistry:
         self,
         file_path: str,
         format_name: Optional[str] = None,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        executor: Optional[Executor] = None
     ) -> FormatOutput:
         """
         Extract content from a file.
@@ -170,6 +172,8 @@ class FormatHandlerRegistry:
             file_path: Path to the file
             format_name: Optional format override (auto-detect if not specified)
             options: Optional extraction options
+            executor: Optional pool for per-page work; passed on only to
+                handlers that declare ``parallel_pages``
 
         Returns:
             FormatOutput with extracted content
@@ -202,6 +206,8 @@ class FormatHandlerRegistry:
 
         # Extract content
         logger.info(f"Extracting content from '{file_path}' using {handler.format_name} handler")
+        if executor is not None and handler.parallel_pages:
+            return handler.extract(file_path, options, executor=executor)
         return handler.extract(file_path, options)
 
     def get_supported_formats(self) -> List[str]:
@@ -0,0 +1,36 @@
+"""
+Request instrumentation: where does request time go?
+
+Per-route latency histograms fed by Flask request hooks, named spans around
+the known hot paths (page render, HTML sanitizing, user-state saves,
+assignment, exports), and an opt-in sampling profiler that writes collapsed
+stacks for flamegraphs. Exposed to admins at ``/admin/metrics`` as JSON and
+Prometheus text. Off unless ``instrumentation.enabled`` is set.
+
+Only ``metrics`` is imported here: the hot paths import ``timed`` from it,
+so it stays stdlib-only. The Flask hooks, routes and profiler are imported
+by the server when the feature is switched on.
+"""
+
+from potato.instrumentation.config import DEFAULT_BUCKETS_MS, InstrumentationConfig
+from potato.instrumentation.metrics import (
+    LatencyHistogram,
+    MetricsRegistry,
+    clear_metrics_registry,
+    get_metrics_registry,
+    init_metrics_registry,
+    span,
+    timed,
+)
+
+__all__ = [
+    "DEFAULT_BUCKETS_MS",
+    "InstrumentationConfig",
+    "LatencyHistogram",
+    "MetricsRegistry",
+    "clear_metrics_registry",
+    "get_metrics_registry",
+    "init_metrics_registry",
+    "span",
+    "timed",
+]
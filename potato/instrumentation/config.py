@@ -0,0 +1,38 @@
+"""Config parsing for request instrumentation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+#: Histogram bucket upper bounds, in milliseconds. Fixed so that snapshots from
+#: different processes (or before and after a restart) can be added together.
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+
+@dataclass
+class InstrumentationConfig:
+    enabled: bool = False
+    buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS
+    profiler_enabled: bool = False
+    profiler_interval_ms: float = 10.0
+    profiler_max_stacks: int = 20000
+    profiler_output: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "InstrumentationConfig":
+        block = (config or {}).get("instrumentation", {}) or {}
+        profiler = block.get("profiler", {}) or {}
+        if profiler is True:
+            profiler = {"enabled": True}
+        buckets = block.get("buckets_ms") or DEFAULT_BUCKETS_MS
+        return cls(
+            enabled=bool(block.get("enabled", False)),
+            buckets_ms=tuple(sorted(float(b) for b in buckets)),
+            profiler_enabled=bool(profiler.get("enabled", False)),
+            profiler_interval_ms=float(profiler.get("interval_ms", 10.0)),
+            profiler_max_stacks=int(profiler.get("max_stacks", 20000)),
+            profiler_output=profiler.get("output"),
+        )
@@ -0,0 +1,42 @@
+"""Flask request hooks feeding the route histograms."""
+
+from __future__ import annotations
+
+import time
+
+from flask import g, request
+
+from potato.instrumentation.metrics import get_metrics_registry
+
+#: Key under ``app.extensions`` marking an app whose hooks are installed.
+EXTENSION_KEY = "potato_instrumentation"
+
+
+def install_request_hooks(flask_app) -> None:
+    """
+    Time every request on ``flask_app``. Idempotent.
+
+    The start hook goes FIRST in the before-request chain: the session check
+    that runs before it may answer the request itself (a redirect to login),
+    and that time belongs in the histogram too.
+    """
+    if flask_app.extensions.get(EXTENSION_KEY):
+        return
+    flask_app.extensions[EXTENSION_KEY] = True
+    flask_app.before_request_funcs.setdefault(None, []).insert(0, _start_timer)
+    flask_app.after_request(_observe_request)
+
+
+def _start_timer():
+    g._potato_request_start = time.perf_counter()
+
+
+def _observe_request(response):
+    start = g.pop("_potato_request_start", None)
+    registry = get_metrics_registry()
+    if start is None or registry is None:
+        return response
+    rule = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    registry.observe_request(request.method, rule, response.status_code,
+                             time.perf_counter() - start)
+    return response
@@ -0,0 +1,292 @@
+"""
+Latency histograms for requests and named hot-path spans.
+
+Every Flask request is observed into a histogram keyed by method and route
+rule (``/annotate``, not ``/annotate?id=...``, so the number of series stays
+bounded). Functions on known hot paths -- page render, HTML sanitizing,
+user-state saves, assignment, exports -- are wrapped in ``timed(name)`` and
+observed into a histogram per span name.
+
+Buckets are fixed (see ``config.DEFAULT_BUCKETS_MS``) rather than adaptive,
+so recording is a binary search and an increment, and two snapshots can be
+compared bucket by bucket.
+
+When instrumentation is disabled no registry exists: ``timed`` wrappers cost
+one global read and a call, and no request hooks are installed at all.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from potato.instrumentation.config import InstrumentationConfig
+
+_registry: Optional["MetricsRegistry"] = None
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram. Thread-safe."""
+
+    __slots__ = ("bounds", "counts", "total", "count", "_lock")
+
+    def __init__(self, bounds_s: Sequence[float]):
+        self.bounds = tuple(bounds_s)
+        # One slot per bound plus the +Inf overflow bucket; not cumulative.
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        slot = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[slot] += 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.total, self.count
+
+    def quantile(self, q: float, counts: Optional[List[int]] = None) -> Optional[float]:
+        """
+        Estimated ``q`` quantile in seconds, interpolated within its bucket
+        the way Prometheus' ``histogram_quantile`` does. Observations in the
+        overflow bucket report the largest bound.
+        """
+        if counts is None:
+            counts = self.snapshot()[0]
+        count = sum(counts)
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for slot, in_slot in enumerate(counts):
+            if seen + in_slot >= rank and in_slot:
+                if slot == len(self.bounds):
+                    return self.bounds[-1] if self.bounds else None
+                lower = self.bounds[slot - 1] if slot else 0.0
+                upper = self.bounds[slot]
+                return lower + (upper - lower) * (rank - seen) / in_slot
+            seen += in_slot
+        return self.bounds[-1] if self.bounds else None
+
+
+class MetricsRegistry:
+    """Request and span histograms for one server process."""
+
+    def __init__(self, settings: Optional[InstrumentationConfig] = None):
+        self.settings = settings or InstrumentationConfig(enabled=True)
+        self.bounds_s = tuple(b / 1000.0 for b in self.settings.buckets_ms)
+        self.started_at = time.time()
+        self.routes: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.statuses: Dict[Tuple[str, str, int], int] = {}
+        self.spans: Dict[str, LatencyHistogram] = {}
+        self.profiler = None
+        self._lock = threading.Lock()
+
+    def _histogram(self, table: Dict, key) -> LatencyHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(key, LatencyHistogram(self.bounds_s))
+        return histogram
+
+    def observe_request(self, method: str, route: str, status: int,
+                        seconds: float) -> None:
+        self._histogram(self.routes, (method, route)).observe(seconds)
+        key = (method, route, int(status))
+        with self._lock:
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def observe_span(self, name: str, seconds: float) -> None:
+        self._histogram(self.spans, name).observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.routes = {}
+            self.statuses = {}
+            self.spans = {}
+            self.started_at = time.time()
+        if self.profiler is not None:
+            self.profiler.reset()
+
+    # -- export ---------------------------------------------------------------
+
+    def _series(self, histogram: LatencyHistogram) -> Dict[str, Any]:
+        counts, total, count = histogram.snapshot()
+        cumulative = 0
+        buckets = {}
+        labels = [f"{bound:g}" for bound in self.settings.buckets_ms] + ["+Inf"]
+        for label, in_slot in zip(labels, counts):
+            cumulative += in_slot
+            buckets[label] = cumulative
+
+        def ms(q):
+            value = histogram.quantile(q, counts)
+            return None if value is None else round(value * 1000.0, 3)
+
+        return {
+            "count": count,
+            "sum_ms": round(total * 1000.0, 3),
+            "mean_ms": round(total * 1000.0 / count, 3) if count else None,
+            "p50_ms": ms(0.5),
+            "p95_ms": ms(0.95),
+            "p99_ms": ms(0.99),
+            "buckets": buckets,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = sorted(self.routes.items())
+            statuses = dict(self.statuses)
+            spans = sorted(self.spans.items())
+
+        route_rows = []
+        for (method, route), histogram in routes:
+            row = {"method": method, "route": route}
+            row.update(self._series(histogram))
+            row["status"] = {str(s): n for (m, r, s), n in sorted(statuses.items())
+                             if m == method and r == route}
+            route_rows.append(row)
+        span_rows = []
+        for name, histogram in spans:
+            row = {"span": name}
+            row.update(self._series(histogram))
+            span_rows.append(row)
+        return {
+            "enabled": True,
+            "since": self.started_at,
+            "buckets_ms": list(self.settings.buckets_ms),
+            "routes": route_rows,
+            "spans": span_rows,
+            "profiler": self.profiler.status() if self.profiler else {"enabled": False},
+        }
+
+    def to_prometheus(self) -> str:
+        """The histograms in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            routes = sorted(self.routes.items())
+            statuses = sorted(self.statuses.items())
+            spans = sorted(self.spans.items())
+
+        lines = [
+            "# HELP potato_request_duration_seconds Request latency by route.",
+            "# TYPE potato_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in routes:
+            labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+            lines.extend(self._prometheus_series(
+                "potato_request_duration_seconds", labels, histogram))
+        lines += [
+            "# HELP potato_requests_total Requests by route and status code.",
+            "# TYPE potato_requests_total counter",
+        ]
+        for (method, route, status), count in statuses:
+            lines.append(f'potato_requests_total{{method="{_escape(method)}",'
+                         f'route="{_escape(route)}",status="{status}"}} {count}')
+        lines += [
+            "# HELP potato_span_duration_seconds Latency of instrumented hot paths.",
+            "# TYPE potato_span_duration_seconds histogram",
+        ]
+        for name, histogram in spans:
+            lines.extend(self._prometheus_series(
+                "potato_span_duration_seconds", f'span="{_escape(name)}"', histogram))
+        return "\n".join(lines) + "\n"
+
+    def _prometheus_series(self, metric: str, labels: str,
+                           histogram: LatencyHistogram) -> List[str]:
+        counts, total, count = histogram.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, in_slot in zip(self.bounds_s, counts):
+            cumulative += in_slot
+            lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"{metric}_sum{{{labels}}} {total:.6f}")
+        lines.append(f"{metric}_count{{{labels}}} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+def timed(name: str):
+    """
+    Decorator observing each call of the wrapped function into span ``name``.
+
+    Calls that raise are observed too: a save that fails slowly is exactly
+    the kind of time an operator is looking for.
+    """
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            registry = _registry
+            if registry is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                registry.observe_span(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def span(name: str):
+    """Context-manager form of :func:`timed`, for a block inside a function."""
+    registry = _registry
+    if registry is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe_span(name, time.perf_counter() - start)
+
+
+# ---------------------------------------------------------------------------
+# Singleton
+# ---------------------------------------------------------------------------
+
+def init_metrics_registry(config: Dict[str, Any]) -> MetricsRegistry:
+    global _registry
+    settings = InstrumentationConfig.from_config(config)
+    settings.enabled = True
+    registry = MetricsRegistry(settings)
+    if settings.profiler_enabled:
+        from potato.instrumentation.profiler import SamplingProfiler
+
+        registry.profiler = SamplingProfiler(
+            interval_s=settings.profiler_interval_ms / 1000.0,
+            max_stacks=settings.profiler_max_stacks,
+            output_path=settings.profiler_output,
+        )
+        registry.profiler.start()
+    if _registry is not None and _registry.profiler is not None:
+        _registry.profiler.stop()
+    _registry = registry
+    return registry
+
+
+def get_metrics_registry() -> Optional[MetricsRegistry]:
+    return _registry
+
+
+def clear_metrics_registry() -> None:
+    global _registry
+    if _registry is not None and _registry.profiler is not None:
+        _registry.profiler.stop()
+    _registry = None
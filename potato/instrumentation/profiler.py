@@ -0,0 +1,145 @@
+"""
+Opt-in sampling profiler producing collapsed stacks.
+
+A daemon thread wakes every ``interval_s``, reads every other thread's
+current frame with ``sys._current_frames()`` and counts the stack. Nothing
+is installed in the profiled threads (no ``sys.setprofile``), so the cost
+to request handling is the GIL time the sampler itself takes -- about one
+stack walk per thread per interval -- and it is zero when the profiler is
+off.
+
+Output is the "collapsed" format read by ``flamegraph.pl``, speedscope and
+most flamegraph tools: one line per distinct stack, frames root first and
+separated by ``;``, then a space and the sample count::
+
+    threading:_bootstrap;...;potato.routes:update_instance 42
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+logger = logging.getLogger("potato.instrumentation")
+
+#: Stacks beyond ``max_stacks`` distinct ones are counted under this line, so
+#: memory stays bounded on a long run while the total stays honest.
+TRUNCATED = "[other stacks]"
+
+
+def _frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__") or os.path.basename(frame.f_code.co_filename)
+    return f"{module}:{frame.f_code.co_name}"
+
+
+class SamplingProfiler:
+    def __init__(self, interval_s: float = 0.01, max_stacks: int = 20000,
+                 output_path: Optional[str] = None):
+        self.interval_s = max(0.001, float(interval_s))
+        self.max_stacks = int(max_stacks)
+        self.output_path = output_path
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+
+    # -- lifecycle ------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="potato-profiler",
+                                        daemon=True)
+        self._thread.start()
+        logger.info("Sampling profiler started (every %.1f ms)", self.interval_s * 1000)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.output_path:
+            self.dump(self.output_path)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks = Counter()
+            self.samples = 0
+            self.started_at = time.time()
+
+    # -- sampling -------------------------------------------------------------
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            self.sample(skip=own)
+
+    def sample(self, skip: Optional[int] = None) -> None:
+        """Record one sample of every thread but ``skip``."""
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            frames = []
+            while frame is not None:
+                # Labels are cached per code object: the walk then costs a
+                # dict lookup per frame instead of string formatting.
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = self._labels[code] = _frame_label(frame)
+                frames.append(label)
+                frame = frame.f_back
+            frames.reverse()
+            stacks.append(";".join(frames))
+
+        with self._lock:
+            self.samples += 1
+            for stack in stacks:
+                if stack in self._stacks or len(self._stacks) < self.max_stacks:
+                    self._stacks[stack] += 1
+                else:
+                    self._stacks[TRUNCATED] += 1
+
+    # -- output ---------------------------------------------------------------
+
+    def collapsed(self) -> str:
+        with self._lock:
+            items = self._stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def dump(self, path: str) -> str:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(self.collapsed())
+        os.replace(tmp, path)
+        return path
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            distinct = len(self._stacks)
+        return {
+            "enabled": True,
+            "running": self.running,
+            "interval_ms": self.interval_s * 1000,
+            "samples": self.samples,
+            "distinct_stacks": distinct,
+            "since": self.started_at,
+            "output": self.output_path,
+        }
@@ -0,0 +1,76 @@
+"""
+Admin routes for request instrumentation.
+
+    GET  /admin/metrics             histograms as JSON (routes, spans, profiler)
+    GET  /admin/metrics/prometheus  the same histograms, Prometheus text format
+    GET  /admin/metrics/profile     collapsed stacks from the sampling profiler
+    POST /admin/metrics/reset       zero the histograms and the profile
+
+``/admin/metrics/profile?download=1`` returns the stacks as an attachment,
+ready for ``flamegraph.pl`` or speedscope.
+"""
+
+from __future__ import annotations
+
+from functools import wraps
+
+from flask import Blueprint, Response, jsonify, request
+
+from potato.instrumentation.metrics import get_metrics_registry
+
+instrumentation_bp = Blueprint("instrumentation", __name__, url_prefix="/admin/metrics")
+
+
+def _enabled_required(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if get_metrics_registry() is None:
+            return jsonify({"error": "Instrumentation not enabled"}), 400
+        return f(*args, **kwargs)
+    return wrapper
+
+
+# Admin authorization routes through RBAC, as for the other admin blueprints:
+# the shared admin key (or debug) passes, as does a logged-in user holding the
+# ``view_admin_dashboard`` permission.
+from potato.server_utils.rbac import require_permission, Permission
+
+admin_required = require_permission(Permission.VIEW_ADMIN_DASHBOARD)
+
+
+@instrumentation_bp.route("", methods=["GET"])
+@admin_required
+@_enabled_required
+def metrics_json():
+    return jsonify(get_metrics_registry().to_dict())
+
+
+@instrumentation_bp.route("/prometheus", methods=["GET"])
+@admin_required
+@_enabled_required
+def metrics_prometheus():
+    return Response(get_metrics_registry().to_prometheus(),
+                    mimetype="text/plain; version=0.0.4")
+
+
+@instrumentation_bp.route("/profile", methods=["GET"])
+@admin_required
+@_enabled_required
+def profile():
+    profiler = get_metrics_registry().profiler
+    if profiler is None:
+        return jsonify({"error": "Sampling profiler not enabled "
+                                 "(instrumentation.profiler.enabled)"}), 400
+    response = Response(profiler.collapsed(), mimetype="text/plain")
+    if request.args.get("download"):
+        response.headers["Content-Disposition"] = (
+            'attachment; filename="potato-profile.collapsed"')
+    return response
+
+
+@instrumentation_bp.route("/reset", methods=["POST"])
+@admin_required
+@_enabled_required
+def reset():
+    get_metrics_registry().reset()
+    return jsonify({"status": "reset"})
@@ -31,7 +31,9 @@ import threading
 import json
 import os
 
+from potato.instrumentation.metrics import timed
 from potato.item_store import build_store as build_item_store
+from potato.server_utils.progress_stats import ItemProgressCounters
 
 # Singleton instance of the ItemStateManager with thread-safe lock
 ITEM_STATE_MANAGER = None
@@ -927,8 +929,12 @@ class ItemStateManager:
         elif config.get('min_annotators_per_instance') is not None:
             self.min_annotations_per_item = int(config['min_annotators_per_instance'])
 
-        # Track which annotators have worked on each item
+        # Track which annotators have worked on each item. Add and remove
+        # through register_annotator()/_release_annotator() so the running
+        # progress counters stay in step.
         self.instance_annotators = defaultdict(set)
+        self.progress_counters = ItemProgressCounters()
+        self._annotator_listeners = []
 
         # Track assignment timestamps for stale reclamation: {instance_id: {username: timestamp}}
         self.assignment_timestamps = defaultdict(dict)
@@ -1432,6 +1438,8 @@ class ItemStateManager:
         except Exception as e:
             self.logger.warning(f"Curation embed-on-ingest failed for {instance_id}: {e}")
 
+        self._index_for_search(instance_id, instance_data)
+
     def update_item(self, instance_id: str, instance_data: dict) -> bool:
         """
         Update an existing instance's data (thread-safe).
@@ -1453,7 +1461,16 @@ class ItemStateManager:
                 return False
             # Update item_data while preserving labels, span_annotations, and metadata
             item.item_data = instance_data
-            return True
+        self._index_for_search(instance_id, instance_data)
+        return True
+
+    def _index_for_search(self, instance_id: str, instance_data: dict) -> None:
+        """Keep the full-text search index current (no-op until it's built)."""
+        try:
+            from potato.search.service import index_item
+            index_item(instance_id, instance_data)
+        except Exception as e:
+            self.logger.warning(f"Search indexing failed for {instance_id}: {e}")
 
     def add_items(self, instances: dict[str, dict]):
         """
@@ -1705,6 +1722,7 @@ class ItemStateManager:
     def is_assignment_paused(self) -> bool:
         return self._assignment_paused
 
+    @timed("assign")
     def assign_instances_to_user(self, user_state: UserState) -> int:
         """
         Assigns a set of instances to a user based on the current state of the system
@@ -2385,7 +2403,7 @@ class ItemStateManager:
                 else:
                     if iid not in self.completed_instance_ids and iid not in self.remaining_instance_ids:
                         self.remaining_instance_ids.append(iid)
-                    self.instance_annotators[iid].discard(username)
+                    self._release_annotator(iid, username)
                     if iid in self.assignment_timestamps:
                         self.assignment_timestamps[iid].pop(username, None)
                     reclaimed = True
@@ -2419,7 +2437,7 @@ class ItemStateManager:
         if instance_id not in self.completed_instance_ids and instance_id not in self.remaining_instance_ids:
             self.remaining_instance_ids.append(instance_id)
 
-        self.instance_annotators[instance_id].discard(user_id)
+        self._release_annotator(instance_id, user_id)
         if instance_id in self.assignment_timestamps:
             self.assignment_timestamps[instance_id].pop(user_id, None)
             if not self.assignment_timestamps[instance_id]:
@@ -2451,8 +2469,7 @@ class ItemStateManager:
         if not unassigned:
             return False
 
-        had_annotator_credit = user_id in self.instance_annotators[instance_id]
-        self.instance_annotators[instance_id].discard(user_id)
+        had_annotator_credit = self._release_annotator(instance_id, user_id)
         if had_annotator_credit and self.item_annotation_counts[instance_id] > 0:
             self.item_annotation_counts[instance_id] -= 1
 
@@ -2730,6 +2747,24 @@ class ItemStateManager:
         """Get the set of annotators who have worked on this item"""
         return self.instance_annotators[instance_id]
 
+    def _release_annotator(self, instance_id: str, user_id: str) -> bool:
+        """Remove ``user_id`` from an item's annotators; True if it was there."""
+        annotators = self.instance_annotators[instance_id]
+        if user_id not in annotators:
+            return False
+        annotators.discard(user_id)
+        self.progress_counters.annotator_removed(last_for_item=not annotators)
+        self._notify_annotator_listeners(instance_id)
+        return True
+
+    def add_annotator_listener(self, listener) -> None:
+        """Call ``listener(instance_id)`` whenever an item gains or loses an annotator."""
+        self._annotator_listeners.append(listener)
+
+    def _notify_annotator_listeners(self, instance_id: str) -> None:
+        for listener in self._annotator_listeners:
+            listener(instance_id)
+
     def get_total_assignable_items_for_user(self, user_state: UserState) -> int:
         """
         Get the total number of items that can be assigned to a user.
@@ -2777,7 +2812,11 @@ class ItemStateManager:
             - Updates item_annotation_counts
         """
         # Add user to the set of annotators for this item
-        self.instance_annotators[instance_id].add(user_id)
+        annotators = self.instance_annotators[instance_id]
+        if user_id not in annotators:
+            annotators.add(user_id)
+            self.progress_counters.annotator_added(first_for_item=len(annotators) == 1)
+            self._notify_annotator_listeners(instance_id)
 
         # Update annotation count
         self.item_annotation_counts[instance_id] += 1
@@ -2811,17 +2850,17 @@ class ItemStateManager:
                 self.remaining_instance_ids.remove(instance_id)
             # Mark as completed
             self.completed_instance_ids.add(instance_id)
-            # If this was an overlap-sample item (cap >= 2), check whether
-            # annotators disagreed enough to route the item to adjudication.
-            cap = self._get_annotator_cap_for_item(instance_id)
-            if cap >= 2:
-                try:
-                    from potato.adjudication import get_adjudication_manager
-                    adj_mgr = get_adjudication_manager()
-                    if adj_mgr is not None:
-                        adj_mgr.try_enqueue_item(instance_id)
-                except Exception as exc:
-                    self.logger.debug("Adjudication auto-route skipped: %s", exc)
+
+        # Let adjudication re-evaluate just this item, so items whose
+        # annotators disagree enter the queue (and queued items pick up the
+        # new annotation) without a full rescan.
+        try:
+            from potato.adjudication import get_adjudication_manager
+            adj_mgr = get_adjudication_manager()
+            if adj_mgr is not None:
+                adj_mgr.try_enqueue_item(instance_id)
+        except Exception as exc:
+            self.logger.debug("Adjudication auto-route skipped: %s", exc)
 
     def update_annotation_count(self, instance_id: str, delta=1):
         """
@@ -2871,4 +2910,5 @@ class ItemStateManager:
         self.remaining_instance_ids.clear()
         self.completed_instance_ids.clear()
         self.instance_annotators.clear()
+        self.progress_counters.reset()
         self.item_annotation_counts.clear()
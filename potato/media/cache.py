@@ -14,16 +14,40 @@ its mtime **and** the transcode parameters, so:
 Entries live under ``<output_dir>/.media_cache/``. The directory is disposable:
 deleting it costs a re-render and nothing else, which is the property that makes
 it safe to tell people to delete it.
+
+## The index
+
+Size accounting and eviction order come from a small SQLite index beside the
+entries (``.index.sqlite3``), not from the directory: with a few hundred
+thousand transcodes, stat-ing every file to total the cache or to find the
+oldest one takes seconds, and it used to happen on a request thread after
+every write. The index keeps one row per entry (name, size, last access) and a
+running total maintained by triggers, so ``total_bytes`` is one row read and
+eviction walks an index on last access. Accesses are queued in memory and
+written in batches rather than as an ``os.utime`` per hit, and eviction runs on
+a background thread woken when a write takes the cache over its limit.
+
+The index is built from one directory scan the first time a cache directory is
+opened without one, and can be rebuilt with :meth:`MediaCache.rescan`. Like
+everything else here, it is disposable.
+
+Deep-zoom tiles (potato/media/tiles.py) are written one directory per pyramid
+level, under ``<key>_files/<level>/``. A level is built as a unit, so it is
+indexed and evicted as one entry whose size is the sum of its tiles.
 """
 
 from __future__ import annotations
 
+import atexit
 import hashlib
 import logging
 import os
+import shutil
+import sqlite3
 import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +58,50 @@ CACHE_DIRNAME = ".media_cache"
 #: machine eventually fills the disk for everyone on it.
 DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB
 
+#: The index file, inside the cache directory. Dot-prefixed names are never
+#: entries, which also covers SQLite's ``-wal``/``-shm`` companions.
+INDEX_FILENAME = ".index.sqlite3"
+
+#: Suffix of the per-source directory holding a tile pyramid's level
+#: directories. Each level directory is one entry.
+TILE_DIR_SUFFIX = "_files"
+
+#: Queued access times are written at least this often (seconds)...
+ACCESS_FLUSH_SECONDS = 5.0
+#: ...or as soon as this many are waiting.
+ACCESS_FLUSH_BATCH = 512
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL,
+    entries INTEGER NOT NULL,
+    scanned INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (0, 0, 0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_added AFTER INSERT ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size, entries = entries + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_removed AFTER DELETE ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size, entries = entries - 1;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_resized AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size - OLD.size;
+END;
+"""
+
+# An upsert, not INSERT OR REPLACE: REPLACE deletes without firing the delete
+# trigger, and the running total would drift by the old size.
+_UPSERT = ("INSERT INTO entries (name, size, accessed) VALUES (?, ?, ?) "
+           "ON CONFLICT(name) DO UPDATE SET size = excluded.size, "
+           "accessed = excluded.accessed")
+
 
 def cache_key(source: Path, suffix: str, **params: Any) -> str:
     """
@@ -76,6 +144,16 @@ class MediaCache:
         self._locks: Dict[str, threading.Lock] = {}
         self._locks_guard = threading.Lock()
 
+        # The index is opened on first use: constructing a cache must not
+        # create files, and the directory may not exist yet.
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.RLock()
+        self._pending: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pruner: Optional[threading.Thread] = None
+
     def ensure_dir(self) -> Path:
         self.root.mkdir(parents=True, exist_ok=True)
         return self.root
@@ -94,66 +172,273 @@ class MediaCache:
     def get(self, source: Path, suffix: str, **params: Any) -> Optional[Path]:
         path = self.path_for(source, suffix, **params)
         if path.exists() and path.stat().st_size > 0:
-            # Touch so the LRU prune keeps what is actually being used.
-            try:
-                os.utime(path, None)
-            except OSError:
-                pass
+            # Recorded so the LRU prune keeps what is actually being used.
+            self.touch(path)
             return path
         return None
 
+    # -- index ---------------------------------------------------------------
+
+    def _index(self) -> Optional[sqlite3.Connection]:
+        """The index connection, opened (and built if new) on first use."""
+        if self._db is not None:
+            return self._db
+        with self._db_lock:
+            if self._db is None:
+                if not self.root.exists():
+                    return None
+                db = sqlite3.connect(str(self.root / INDEX_FILENAME),
+                                     timeout=30, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                # A cache; a lost write costs a rescan, not data.
+                db.execute("PRAGMA synchronous=OFF")
+                db.executescript(_SCHEMA)
+                self._db = db
+                if not db.execute("SELECT scanned FROM totals").fetchone()[0]:
+                    self.rescan()
+        return self._db
+
+    def _entry_files(self) -> List[Path]:
+        """Every entry: the transcoded files, and each tile level directory."""
+        entries: List[Path] = []
+        for path in self.root.iterdir():
+            if path.name.startswith("."):
+                continue
+            if path.is_file():
+                entries.append(path)
+            elif path.is_dir() and path.name.endswith(TILE_DIR_SUFFIX):
+                entries.extend(level for level in path.iterdir()
+                               if level.is_dir() and not level.name.startswith("."))
+        return entries
+
+    def _name(self, path: Path) -> str:
+        """An entry's key in the index: its path under the cache root."""
+        try:
+            return Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return Path(path).name
+
+    @staticmethod
+    def _entry_stat(path: Path) -> Tuple[int, float]:
+        """``(size, atime)`` of an entry; a tile level sums its tiles."""
+        if not path.is_dir():
+            stat = path.stat()
+            return stat.st_size, stat.st_atime
+        size, atime = 0, 0.0
+        for tile in path.iterdir():
+            stat = tile.stat()
+            size += stat.st_size
+            atime = max(atime, stat.st_atime)
+        return size, atime
+
+    def _remove(self, path: Path) -> None:
+        """Delete an entry. Raises FileNotFoundError if it is already gone."""
+        if not path.is_dir():
+            path.unlink()
+            return
+        # Out of sight first: a level is served only while its completion
+        # marker exists, and rmtree may take the tiles before the marker.
+        doomed = path.with_name(f".{path.name}.evicted-{threading.get_ident()}")
+        os.rename(path, doomed)
+        shutil.rmtree(doomed, ignore_errors=True)
+        try:
+            path.parent.rmdir()  # the source's last level
+        except OSError:
+            pass
+
+    def rescan(self) -> int:
+        """
+        Rebuild the index from the directory. Returns the number of entries.
+
+        Runs by itself the first time a directory is opened without an index;
+        call it after changing the directory by hand. Last access is taken
+        from each file's atime, which is what LRU order meant before there
+        was an index.
+        """
+        db = self._index()
+        if db is None:
+            return 0
+        rows: List[Tuple[str, int, float]] = []
+        for path in self._entry_files():
+            try:
+                size, atime = self._entry_stat(path)
+            except OSError:
+                continue
+            rows.append((self._name(path), size, atime))
+        with self._db_lock, db:
+            db.execute("DELETE FROM entries")
+            db.executemany(_UPSERT, rows)
+            db.execute("UPDATE totals SET scanned = 1")
+        return len(rows)
+
+    def add(self, path: Path) -> None:
+        """
+        Index an entry that has just been written, and schedule a prune if
+        it took the cache over its limit. ``path`` is a transcoded file or a
+        completed tile level directory.
+
+        Call it where a transcode lands, instead of pruning inline: eviction
+        happens on the background pruner, off the request thread.
+        """
+        db = self._index()
+        if db is None:
+            return
+        try:
+            size, _atime = self._entry_stat(Path(path))
+        except OSError:
+            return
+        with self._db_lock, db:
+            db.execute(_UPSERT, (self._name(path), size, time.time()))
+        if self.total_bytes() > self.max_bytes:
+            self._ensure_pruner()
+            self._wake.set()
+
+    def touch(self, path: Path) -> None:
+        """
+        Record a use of ``path`` for the LRU order.
+
+        Queued, not written: a busy page serves dozens of cached entries per
+        second, and an index write (or an ``os.utime``) per hit would cost
+        more than the hit. The queue is written every
+        :data:`ACCESS_FLUSH_SECONDS`, when it reaches :data:`ACCESS_FLUSH_BATCH`,
+        and before every prune.
+        """
+        with self._pending_lock:
+            self._pending[self._name(path)] = time.time()
+            full = len(self._pending) >= ACCESS_FLUSH_BATCH
+        self._ensure_pruner()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write queued access times to the index. Returns how many."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        db = self._index()
+        if db is None:
+            return 0
+        with self._db_lock, db:
+            db.executemany(
+                "UPDATE entries SET accessed = ? WHERE name = ? AND accessed < ?",
+                [(when, name, when) for name, when in pending.items()])
+        return len(pending)
+
     def total_bytes(self) -> int:
-        if not self.root.exists():
+        db = self._index()
+        if db is None:
             return 0
-        return sum(p.stat().st_size for p in self.root.iterdir() if p.is_file())
+        with self._db_lock:
+            return db.execute("SELECT bytes FROM totals").fetchone()[0]
 
     def prune(self) -> int:
         """
         Drop least-recently-used entries until under the size limit.
 
         Returns the number of files removed. An entry can always be
-        regenerated, so eviction is never data loss.
+        regenerated, so eviction is never data loss. Reads only the index:
+        the running total says whether anything has to go, and the access
+        index says what goes first.
         """
-        if not self.root.exists():
-            return 0
-        files = [p for p in self.root.iterdir() if p.is_file()]
-        total = sum(p.stat().st_size for p in files)
-        if total <= self.max_bytes:
+        db = self._index()
+        if db is None:
             return 0
-
-        files.sort(key=lambda p: p.stat().st_atime)
-        removed = 0
-        for path in files:
+        self.flush()
+        with self._db_lock:
+            total = self.total_bytes()
             if total <= self.max_bytes:
-                break
-            try:
-                size = path.stat().st_size
-                path.unlink()
-                total -= size
-                removed += 1
-            except OSError:
-                continue
-        if removed:
+                return 0
+
+            evicted: List[Tuple[str]] = []
+            cursor = db.execute(
+                "SELECT name, size FROM entries ORDER BY accessed, name")
+            for rows in iter(lambda: cursor.fetchmany(256), []):
+                for name, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    try:
+                        self._remove(self.root / name)
+                    except FileNotFoundError:
+                        pass  # already gone; only the row is left to drop
+                    except OSError:
+                        continue
+                    evicted.append((name,))
+                    total -= size
+                if total <= self.max_bytes:
+                    break
+            cursor.close()
+            with db:
+                db.executemany("DELETE FROM entries WHERE name = ?", evicted)
+
+        if evicted:
             logger.info("Media cache pruned %d file(s) to stay under %d bytes",
-                        removed, self.max_bytes)
-        return removed
+                        len(evicted), self.max_bytes)
+        return len(evicted)
 
     def clear(self) -> int:
         if not self.root.exists():
             return 0
         removed = 0
-        for path in self.root.iterdir():
-            if path.is_file():
-                try:
-                    path.unlink()
-                    removed += 1
-                except OSError:
-                    continue
+        for path in self._entry_files():
+            try:
+                self._remove(path)
+                removed += 1
+            except OSError:
+                continue
+        with self._pending_lock:
+            self._pending.clear()
+        db = self._index()
+        if db is not None:
+            with self._db_lock, db:
+                db.execute("DELETE FROM entries")
         return removed
 
+    # -- background pruner ---------------------------------------------------
+
+    def _ensure_pruner(self) -> None:
+        if self._pruner is not None and self._pruner.is_alive():
+            return
+        with self._db_lock:
+            if self._pruner is None or not self._pruner.is_alive():
+                self._stop.clear()
+                self._pruner = threading.Thread(
+                    target=self._prune_loop, name="media-cache-pruner",
+                    daemon=True)
+                self._pruner.start()
+
+    def _prune_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(ACCESS_FLUSH_SECONDS)
+            self._wake.clear()
+            try:
+                self.flush()
+                if self.total_bytes() > self.max_bytes:
+                    self.prune()
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("Media cache maintenance failed: %s", exc)
+
+    def close(self) -> None:
+        """Stop the pruner, write queued accesses, and close the index."""
+        self._stop.set()
+        self._wake.set()
+        pruner = self._pruner
+        if pruner is not None and pruner is not threading.current_thread():
+            pruner.join(timeout=10)
+        self._pruner = None
+        try:
+            self.flush()
+        except sqlite3.Error as exc:
+            logger.warning("Could not write media cache accesses: %s", exc)
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
 
 _cache: Optional[MediaCache] = None
 _cache_guard = threading.Lock()
+_exit_hook_registered = False
 
 
 def get_media_cache(output_dir: Optional[str] = None,
@@ -164,15 +449,25 @@ def get_media_cache(output_dir: Optional[str] = None,
     Follows the singleton pattern the state managers use, so the cache location
     is decided once from config rather than being re-derived per request.
     """
-    global _cache
+    global _cache, _exit_hook_registered
     with _cache_guard:
-        if _cache is None or (output_dir and str(_cache.root.parent) != output_dir):
+        # Compared resolved: a relative output_dir never equals the resolved
+        # root, and each request would otherwise open a fresh index and pruner.
+        wanted = str(Path(output_dir).resolve()) if output_dir else None
+        if _cache is None or (wanted and str(_cache.root.parent) != wanted):
+            if _cache is not None:
+                _cache.close()
+            if not _exit_hook_registered:
+                atexit.register(clear_media_cache)
+                _exit_hook_registered = True
             _cache = MediaCache(output_dir or ".", max_bytes=max_bytes)
         return _cache
 
 
 def clear_media_cache() -> None:
-    """Drop the singleton. For tests."""
+    """Drop the singleton, writing its queued accesses first. For tests and exit."""
     global _cache
     with _cache_guard:
+        if _cache is not None:
+            _cache.close()
         _cache = None
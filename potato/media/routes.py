@@ -113,7 +113,9 @@ def media_proxy(filepath: str):
                     # 415: the file is fine, we cannot render it. A 500 would
                     # suggest a bug and hide the actionable message.
                     return jsonify({"error": str(exc)}), 415
-                cache.prune()
+                cache.add(target)
+            else:
+                cache.touch(target)
         return send_file(str(target), mimetype="image/webp")
 
     if suffix in TRANSCODE_VIDEO_EXTENSIONS:
@@ -124,7 +126,9 @@ def media_proxy(filepath: str):
                     transcode_video(str(source), str(target))
                 except VideoTranscodeError as exc:
                     return jsonify({"error": str(exc)}), 415
-                cache.prune()
+                cache.add(target)
+            else:
+                cache.touch(target)
         return send_file(str(target), mimetype="video/webm")
 
     return jsonify({
@@ -229,19 +233,27 @@ def tile_image(filepath: str, level: int, column: int, row: int):
     from flask import jsonify, request, send_file
 
     from potato.media.cache import get_media_cache
-    from potato.media.tiles import TileError, tile_file
+    from potato.media.tiles import TileError, level_built, tile_dir, tile_file
 
     resolved, spec, settings, page, error = _tile_spec(filepath, request.args)
     if error is not None:
         return error
 
     cache = get_media_cache(_config().get("output_annotation_dir"))
+    cache_dir = cache.ensure_dir()
+    level_dir = tile_dir(cache_dir, Path(resolved), spec, int(level), page=page)
+    built = level_built(level_dir)
     try:
-        path = tile_file(cache.ensure_dir(), Path(resolved), spec, int(level),
+        path = tile_file(cache_dir, Path(resolved), spec, int(level),
                          int(column), int(row), page=page,
                          max_pixels=settings["max_pixels"])
     except TileError as exc:
         return jsonify({"error": str(exc)}), 415
+    # The whole level is one cache entry, counted once when it is built.
+    if built:
+        cache.touch(level_dir)
+    else:
+        cache.add(level_dir)
 
     response = send_file(str(path))
     # A tile is derived from an immutable (path, size, mtime) key, so it can be
@@ -381,7 +393,9 @@ def point_cloud(filepath: str):
                 # message names the conversion command to run.
                 return jsonify({"error": str(exc)}), 415
             target.write_bytes(to_wire(cloud))
-            cache.prune()
+            cache.add(target)
+        else:
+            cache.touch(target)
 
     response = send_file(str(target), mimetype="application/octet-stream")
     return response
@@ -402,10 +416,14 @@ def depth_map(filepath: str):
       8 bits and the cursor readout cannot be recovered from the picture;
     - ``?pointcloud=1&fx=..``: the same data **unprojected**, so a depth item
       is annotatable in the 3D viewer rather than only lookable-at.
+
+    The PNG and the unprojected cloud are cached like any transcode, keyed by
+    everything that changes their bytes (scale, window, colormap, inversion;
+    intrinsics, stride, limit, frame). The cache is checked before the file is
+    decoded, so dragging back to a window already seen costs a file send.
     """
     from flask import Response, jsonify, request, send_file
 
-    from potato.media.cache import get_media_cache
     from potato.media.depth import (COLORMAPS, DEFAULT_COLORMAP, DepthError,
                                     describe, read_depth, to_png, to_wire)
 
@@ -417,22 +435,22 @@ def depth_map(filepath: str):
 
     source = Path(resolved)
     scale = _float_arg(request.args, "scale")
-    try:
-        depth = read_depth(str(source), scale=scale)
-    except DepthError as exc:
-        # 415, not 500: the file is fine and we cannot read it. The message
-        # names the dependency or the conversion command.
-        return jsonify({"error": str(exc)}), 415
 
-    if request.args.get("info") in ("1", "true", "yes"):
-        return jsonify({"kind": "depth", **describe(depth)})
+    if request.args.get("pointcloud") in ("1", "true", "yes"):
+        return _depth_pointcloud(source, scale, request)
 
-    if request.args.get("raw") in ("1", "true", "yes"):
+    if (request.args.get("info") in ("1", "true", "yes")
+            or request.args.get("raw") in ("1", "true", "yes")):
+        try:
+            depth = read_depth(str(source), scale=scale)
+        except DepthError as exc:
+            # 415, not 500: the file is fine and we cannot read it. The
+            # message names the dependency or the conversion command.
+            return jsonify({"error": str(exc)}), 415
+        if request.args.get("info") in ("1", "true", "yes"):
+            return jsonify({"kind": "depth", **describe(depth)})
         return Response(to_wire(depth), mimetype="application/octet-stream")
 
-    if request.args.get("pointcloud") in ("1", "true", "yes"):
-        return _depth_pointcloud(depth, request)
-
     colormap = request.args.get("colormap") or DEFAULT_COLORMAP
     if colormap not in COLORMAPS:
         return jsonify({
@@ -445,29 +463,40 @@ def depth_map(filepath: str):
               if window_min is not None and window_max is not None else None)
     invert = request.args.get("invert") in ("1", "true", "yes")
 
-    output_dir = _config().get("output_annotation_dir") or _config().get(
-        "task_dir", ".")
-    cache = get_media_cache(str(output_dir))
-    cache.ensure_dir()
+    cache = _depth_cache()
     target = cache.path_for(source, ".depth.png", scale=scale,
                             colormap=colormap, invert=invert,
                             window_min=window_min, window_max=window_max)
     with cache.lock_for(target):
         if not target.exists():
             try:
+                depth = read_depth(str(source), scale=scale)
                 target.write_bytes(to_png(depth, window, colormap,
                                           invert=invert))
             except DepthError as exc:
                 return jsonify({"error": str(exc)}), 415
-            cache.prune()
+            cache.add(target)
+        else:
+            cache.touch(target)
     return send_file(str(target), mimetype="image/png")
 
 
-def _depth_pointcloud(depth, request):
+def _depth_cache():
+    """The media cache under the output directory, created if needed."""
+    from potato.media.cache import get_media_cache
+
+    output_dir = _config().get("output_annotation_dir") or _config().get(
+        "task_dir", ".")
+    cache = get_media_cache(str(output_dir))
+    cache.ensure_dir()
+    return cache
+
+
+def _depth_pointcloud(source: Path, scale, request):
     """Unproject a depth map with intrinsics supplied by the caller."""
-    from flask import Response, jsonify
+    from flask import jsonify, send_file
 
-    from potato.media.depth import DepthError, unproject
+    from potato.media.depth import DepthError, read_depth, unproject
     from potato.media.pointcloud import to_wire as cloud_to_wire
 
     needed = ("fx", "fy", "cx", "cy")
@@ -485,19 +514,30 @@ def _depth_pointcloud(depth, request):
                                  f"camera."}), 400
 
     stride = _float_arg(request.args, "stride")
+    stride = int(stride) if stride and stride > 0 else 1
     max_points = _float_arg(request.args, "max_points")
-    try:
-        cloud = unproject(
-            depth, values,
-            stride=int(stride) if stride and stride > 0 else 1,
-            max_points=int(max_points) if max_points and max_points > 0
-            else 500_000,
-            frame=frame)
-    except DepthError as exc:
-        return jsonify({"error": str(exc)}), 400
+    max_points = int(max_points) if max_points and max_points > 0 else 500_000
 
-    return Response(cloud_to_wire(cloud, extra={"from_depth": True}),
-                    mimetype="application/octet-stream")
+    cache = _depth_cache()
+    target = cache.path_for(source, ".depth.pnt", scale=scale,
+                            intrinsics=tuple(values), stride=stride,
+                            max_points=max_points, frame=frame)
+    with cache.lock_for(target):
+        if not target.exists():
+            try:
+                depth = read_depth(str(source), scale=scale)
+            except DepthError as exc:
+                return jsonify({"error": str(exc)}), 415
+            try:
+                cloud = unproject(depth, values, stride=stride,
+                                  max_points=max_points, frame=frame)
+            except DepthError as exc:
+                return jsonify({"error": str(exc)}), 400
+            target.write_bytes(cloud_to_wire(cloud, extra={"from_depth": True}))
+            cache.add(target)
+        else:
+            cache.touch(target)
+    return send_file(str(target), mimetype="application/octet-stream")
 
 
 def _point_cloud_lod(source: Path, request):
@@ -553,7 +593,9 @@ def _point_cloud_lod(source: Path, request):
             except PointCloudError as exc:
                 return jsonify({"error": str(exc)}), 415
             target.write_bytes(to_octree_bytes(tree))
-            cache.prune()
+            cache.add(target)
+        else:
+            cache.touch(target)
 
     try:
         if node_key:
@@ -277,11 +277,16 @@ def _has_alpha(image) -> bool:
 def tile_dir(cache_dir: Path, source: Path, spec: PyramidSpec,
              level: int, page: int = 0) -> Path:
     """Where one level's tiles live. Keyed like every other media cache entry."""
-    from potato.media.cache import cache_key
+    from potato.media.cache import TILE_DIR_SUFFIX, cache_key
 
     key = cache_key(source, ".tiles", tile_size=spec.tile_size,
                     overlap=spec.overlap, fmt=spec.format, page=page)
-    return Path(cache_dir) / f"{key}_files" / str(int(level))
+    return Path(cache_dir) / f"{key}{TILE_DIR_SUFFIX}" / str(int(level))
+
+
+def level_built(directory: Path) -> bool:
+    """Whether the level in ``directory`` is complete (see ensure_level)."""
+    return (Path(directory) / ".complete").exists()
 
 
 def ensure_level(cache_dir: Path, source: Path, spec: PyramidSpec, level: int,
@@ -303,11 +308,11 @@ def ensure_level(cache_dir: Path, source: Path, spec: PyramidSpec, level: int,
 
     directory = tile_dir(cache_dir, source, spec, level, page=page)
     marker = directory / ".complete"
-    if marker.exists():
+    if level_built(directory):
         return directory
 
     with _level_lock(str(directory)):
-        if marker.exists():
+        if level_built(directory):
             return directory
 
         width, height = spec.level_size(level)
@@ -54,7 +54,7 @@ def cli_reset_password(args):
 
     # Update password
     if authenticator.update_password(username, new_password):
-        authenticator.save_user_config()
+        authenticator.persist_user(username)
         print(f"Password for '{username}' has been reset successfully.")
     else:
         print(f"Error: Failed to reset password for '{username}'.")
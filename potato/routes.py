@@ -55,6 +55,7 @@ from potato.flask_server import (
 
 # Import admin dashboard functionality
 from potato.admin import admin_dashboard
+from potato.instrumentation.metrics import timed
 
 # Import span color functions
 from potato.ai.ai_help_wrapper import generate_ai_help_html
@@ -233,6 +234,7 @@ def apply_debug_phase_skip(user_id: str) -> bool:
 
     if user_state:
         user_state.advance_to_phase(phase, page)
+        usm.note_user_changed(user_id)
         logger.info(f"Debug: Skipped user '{user_id}' to phase '{phase.value}', page '{page}'")
         return True
 
@@ -1128,7 +1130,7 @@ def submit_annotation():
 
         # Save the user state
         logger.debug(f"Saving user state for {user_id}")
-        get_user_state_manager().save_user_state(user_state)
+        get_user_state_manager().save_user_state(user_state, [instance_id])
         logger.debug(f"User state saved successfully")
 
         # Check if this was an ICL verification task and record the result
@@ -1188,7 +1190,7 @@ def register():
         return render_template("home.html", login_error=result)
 
     # Persist user config if explicitly configured
-    user_authenticator.save_user_config()
+    user_authenticator.persist_user(username)
 
     logger.debug("Setting session variables...")
     session['username'] = username
@@ -1227,6 +1229,7 @@ def register():
         logger.debug(f"Advancing user {username} to first phase: {first_phase}")
         # Use first_phase_name as the page since that's the key in the phase config
         user_state.advance_to_phase(first_phase, first_phase_name)
+        usm.note_user_changed(username)
         logger.debug(f"User state phase after advancement: {user_state.get_phase()}")
 
     # Assign instances if user doesn't have any
@@ -2926,7 +2929,7 @@ def admin_api_reclaim_instance():
     if not reclaimed:
         return jsonify({"error": "Instance is not assigned to this user"}), 400
 
-    get_user_state_manager().save_user_state(user_state)
+    get_user_state_manager().save_user_state(user_state, [iid])
 
     return jsonify({"success": True, "instance_id": iid, "username": username})
 
@@ -5673,7 +5676,7 @@ def update_instance():
         get_item_state_manager().register_annotator(instance_id, username)
 
         # Save state
-        get_user_state_manager().save_user_state(user_state)
+        get_user_state_manager().save_user_state(user_state, [instance_id])
         logger.debug(f"User state saved for {username}")
 
         # Emit webhook events for annotation save
@@ -6444,63 +6447,68 @@ def get_keyword_highlights(instance_id):
         logger.error(f"Error getting instance text: {e}")
         return jsonify({"error": f"Instance not found: {instance_id}"}), 404
 
-    # Find all keyword matches in the text
+    # Find all keyword matches in the text. The lexicon is compiled into one
+    # automaton and the matches are shared by every user viewing this
+    # instance; they come back in lexicon order, as a per-pattern scan
+    # would produce them, so the seeded filtering below is unchanged.
+    from potato.server_utils.keyword_matcher import get_keyword_matcher
+    matches = []
+    if keyword_patterns:
+        matcher = get_keyword_matcher(keyword_patterns)
+        matches = matcher.find_cached(instance_id, original_text)
+
     keywords = []
     seen_spans = set()  # Track (start, end) to avoid duplicate overlapping matches
 
     # Track color assignments for keyword labels (schema -> label -> color)
     keyword_color_counter = 0
 
-    for pattern_info in keyword_patterns:
-        regex = pattern_info['regex']
+    for pattern_index, start, end in matches:
+        pattern_info = keyword_patterns[pattern_index]
         label = pattern_info['label']
         schema = pattern_info['schema']
         pattern_str = pattern_info['pattern']
+        matched_text = original_text[start:end]
 
-        for match in regex.finditer(original_text):
-            start = match.start()
-            end = match.end()
-            matched_text = match.group()
-
-            # Skip if we already have a match at this exact position
-            span_key = (start, end)
-            if span_key in seen_spans:
-                continue
-
-            # Apply keyword probability filter
-            if rng.random() > keyword_prob:
-                logger.debug(f"Skipping keyword '{matched_text}' due to probability filter")
-                continue
+        # Skip if we already have a match at this exact position
+        span_key = (start, end)
+        if span_key in seen_spans:
+            continue
 
-            seen_spans.add(span_key)
-
-            # Get or assign color for this schema/label combination
-            color = get_span_color(schema, label)
-            if not color:
-                # Auto-assign a color from the palette
-                idx = keyword_color_counter % len(SPAN_COLOR_PALETTE)
-                color = SPAN_COLOR_PALETTE[idx]
-                keyword_color_counter += 1
-                # Store it for consistency
-                set_span_color(schema, label, color)
-
-            # Convert RGB tuple string to rgba format for frontend
-            # Color format is "(r, g, b)" - convert to "rgba(r, g, b, 0.8)"
-            if color.startswith("(") and color.endswith(")"):
-                rgba_color = f"rgba{color[:-1]}, 0.8)"
-            else:
-                rgba_color = color
+        # Apply keyword probability filter
+        if rng.random() > keyword_prob:
+            logger.debug(f"Skipping keyword '{matched_text}' due to probability filter")
+            continue
 
-            keywords.append({
-                "label": label,
-                "start": start,
-                "end": end,
-                "text": matched_text,
-                "reasoning": f"Keyword: {pattern_str} → {label}",
-                "schema": schema,
-                "color": rgba_color,
-                "type": "keyword"
-            })
+        seen_spans.add(span_key)
+
+        # Get or assign color for this schema/label combination
+        color = get_span_color(schema, label)
+        if not color:
+            # Auto-assign a color from the palette
+            idx = keyword_color_counter % len(SPAN_COLOR_PALETTE)
+            color = SPAN_COLOR_PALETTE[idx]
+            keyword_color_counter += 1
+            # Store it for consistency
+            set_span_color(schema, label, color)
+
+        # Convert RGB tuple string to rgba format for frontend
+        # Color format is "(r, g, b)" - convert to "rgba(r, g, b, 0.8)"
+        if color.startswith("(") and color.endswith(")"):
+            rgba_color = f"rgba{color[:-1]}, 0.8)"
+        else:
+            rgba_color = color
+
+        keywords.append({
+            "label": label,
+            "start": start,
+            "end": end,
+            "text": matched_text,
+            "reasoning": f"Keyword: {pattern_str} → {label}",
+            "schema": schema,
+            "color": rgba_color,
+            "type": "keyword"
+        })
 
     # Generate random word highlights (distractors)
     random_highlights = []
@@ -6656,8 +6664,10 @@ def track_interactions():
 
     # Record server timestamp for each event
     server_timestamp = time_module.time()
+    from potato.interaction_tracking import InteractionEvent
 
     # Add events
+    parsed = []
     for event in events:
         # Add server timestamp if not present
         if 'timestamp' not in event or event.get('timestamp') is None:
@@ -6666,17 +6676,20 @@ def track_interactions():
         # Ensure instance_id is set
         event['instance_id'] = instance_id
 
-        # Add to behavioral data
+        parsed.append(InteractionEvent(
+            event_type=event.get('event_type', 'unknown'),
+            timestamp=event.get('timestamp', server_timestamp),
+            target=event.get('target', ''),
+            instance_id=instance_id,
+            client_timestamp=event.get('client_timestamp'),
+            metadata=event.get('metadata', {}),
+        ))
+
+    # With the event store enabled the stream goes to SQLite; the bucket itself
+    # is still created above, because focus, scroll and timing stay in it.
+    if not _store_behavioral_events(username, instance_id, parsed):
         if hasattr(bd, 'interactions'):
-            from potato.interaction_tracking import InteractionEvent
-            bd.interactions.append(InteractionEvent(
-                event_type=event.get('event_type', 'unknown'),
-                timestamp=event.get('timestamp', server_timestamp),
-                target=event.get('target', ''),
-                instance_id=instance_id,
-                client_timestamp=event.get('client_timestamp'),
-                metadata=event.get('metadata', {}),
-            ))
+            bd.interactions.extend(parsed)
 
     # Update focus time if provided
     focus_time = data.get('focus_time', {})
@@ -6855,12 +6868,39 @@ def track_annotation_change():
         page=_page,
     )
 
-    if hasattr(bd, 'annotation_changes'):
-        bd.annotation_changes.append(change)
+    if not _store_behavioral_events(username, instance_id, [change]):
+        if hasattr(bd, 'annotation_changes'):
+            bd.annotation_changes.append(change)
 
     return jsonify({"status": "ok"})
 
 
+def _store_behavioral_events(username, instance_id, events):
+    """Append events to the behavioral event store when it is enabled.
+
+    Returns False when the store is off -- or the write failed -- so the caller
+    falls back to the in-memory lists persisted with the user state rather than
+    losing the events.
+    """
+    from potato import behavioral_event_store
+    from potato.server_utils.config_module import get_behavioral_event_store_config
+
+    store = behavioral_event_store.enabled_store(config)
+    if store is None:
+        return False
+    task_dir, project = store
+    try:
+        behavioral_event_store.record_events(
+            task_dir, project=project, user_id=username,
+            instance_id=str(instance_id), events=events)
+    except Exception as e:
+        logger.error("Failed to store behavioral events: %s", e, exc_info=True)
+        return False
+    behavioral_event_store.maybe_apply_retention(
+        task_dir, project, get_behavioral_event_store_config(config))
+    return True
+
+
 def _keystroke_config():
     """The project's `keystroke_logging` block, with defaults applied.
 
@@ -7047,7 +7087,8 @@ def track_typing():
     # so waiting for /updateinstance to flush would lose it.
     if recorded:
         try:
-            get_user_state_manager().save_user_state(user_state)
+            get_user_state_manager().save_user_state(
+                user_state, {key[0] for key in by_field})
         except Exception as e:
             logger.warning("Could not persist user state after typing flush: %s", e)
 
@@ -7245,7 +7286,8 @@ def track_annotation_telemetry():
     # annotation save, so waiting for /updateinstance to flush would lose it.
     if recorded:
         try:
-            get_user_state_manager().save_user_state(user_state)
+            get_user_state_manager().save_user_state(
+                user_state, {key[0] for key in by_schema})
         except Exception as e:
             logger.warning(
                 "Could not persist user state after telemetry flush: %s", e)
@@ -7317,12 +7359,24 @@ def get_behavioral_data(instance_id):
         return jsonify({"error": "No behavioral data for instance"}), 404
 
     if hasattr(bd, 'to_dict'):
-        return jsonify(bd.to_dict())
+        payload = bd.to_dict()
     elif isinstance(bd, dict):
-        return jsonify(bd)
+        payload = bd
     else:
         return jsonify({"error": "Invalid behavioral data format"}), 500
 
+    from potato import behavioral_event_store
+    store = behavioral_event_store.enabled_store(config)
+    if store is not None:
+        # The in-memory data is still a valid answer if project.sqlite is
+        # locked or damaged; only the stored events are missing from it.
+        try:
+            payload = behavioral_event_store.merge_stored_events(
+                payload, *store, username, instance_id)
+        except Exception as e:
+            logger.warning("Could not read stored behavioral events: %s", e)
+    return jsonify(payload)
+
 
 @app.route("/api/schemas")
 def get_annotation_schemas():
@@ -7949,6 +8003,10 @@ def get_waveform_data(cache_key):
     This endpoint serves .dat waveform files generated by the WaveformService.
     The cache_key is an MD5 hash of the audio file path.
 
+    Query params:
+        samples_per_pixel: Serve a coarser level of a natively generated
+            waveform pyramid (one of WaveformService.WAVEFORM_PYRAMID_LEVELS)
+
     Args:
         cache_key: The MD5 hash identifying the cached waveform file
 
@@ -7969,6 +8027,11 @@ def get_waveform_data(cache_key):
 
         # Construct the cache file path
         cache_path = os.path.join(waveform_service.cache_dir, f"{cache_key}.dat")
+        samples_per_pixel = request.args.get('samples_per_pixel', type=int)
+        if samples_per_pixel is not None:
+            if samples_per_pixel not in waveform_service.WAVEFORM_PYRAMID_LEVELS:
+                return jsonify({"error": "Unsupported samples_per_pixel"}), 400
+            cache_path = waveform_service.get_level_cache_path(cache_key, samples_per_pixel)
 
         if not os.path.exists(cache_path):
             logger.warning(f"Waveform file not found: {cache_path}")
@@ -8303,7 +8366,7 @@ def admin_reset_password():
         return jsonify({"error": f"User '{username}' does not exist"}), 404
 
     if user_authenticator.update_password(username, new_password):
-        user_authenticator.save_user_config()
+        user_authenticator.persist_user(username)
         return jsonify({"status": "success", "message": f"Password reset for '{username}'"})
     else:
         return jsonify({"error": "Failed to reset password"}), 500
@@ -8422,7 +8485,7 @@ def reset_password_with_token(token):
                              token_invalid=True)
 
     if user_authenticator.update_password(username, new_password):
-        user_authenticator.save_user_config()
+        user_authenticator.persist_user(username)
         return render_template("reset_password.html",
                              title=config.get("annotation_task_name", "Annotation Platform"),
                              success=True)
@@ -9874,6 +9937,7 @@ def admin_api_data_archive():
 
 
 @app.route('/admin/api/export', methods=['POST'])
+@timed("export")
 def admin_api_export():
     """Run an export in the requested format and return the result."""
     api_key = request.headers.get('X-API-Key')
@@ -10032,7 +10096,7 @@ def chat_send():
     import time as time_module
     from potato.chat_manager import get_chat_manager
     from potato.interaction_tracking import (
-        get_or_create_behavioral_data, ChatMessage,
+        get_or_create_behavioral_data, ChatMessage, InteractionEvent,
     )
 
     if 'username' not in session:
@@ -10110,20 +10174,24 @@ def chat_send():
     ))
 
     # Log interaction event
-    bd.add_interaction(
+    chat_event = InteractionEvent(
         event_type="chat_message_sent",
+        timestamp=time_module.time(),
         target="chat_sidebar",
+        instance_id=instance_id or "",
         metadata={
             "message_length": len(user_message),
             "response_length": len(result["content"]),
             "response_time_ms": result["response_time_ms"],
         },
     )
+    if not _store_behavioral_events(username, instance_id or "", [chat_event]):
+        bd.interactions.append(chat_event)
 
     # Persist user state
     usm = get_user_state_manager()
     if usm:
-        usm.save_user_state(user_state)
+        usm.save_user_state(user_state, [instance_id] if instance_id else None)
 
     return jsonify(result)
 
@@ -13,6 +13,7 @@ from .fts5 import FTS5Backend
 from .service import (
     clear_search,
     get_search,
+    index_item,
     init_search,
     init_search_from_item_state,
     search_settings,
@@ -26,6 +27,7 @@ __all__ = [
     "init_search",
     "init_search_from_item_state",
     "get_search",
+    "index_item",
     "clear_search",
     "search_settings",
 ]
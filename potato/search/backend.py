@@ -10,13 +10,18 @@ Contract:
     index(rows) -> int         (Re)build the index from (id, text) pairs;
                                returns the number of documents indexed.
     query(q, limit) -> [Hit]   Ranked matches for a user query string.
+
+Optional, for backends that can update in place:
+    upsert(rows) -> int        Add/refresh (id, text) pairs; text None removes.
+    stage(id, text)            Queue one live change (default: upsert now).
+    flush() -> int             Write queued changes.
 """
 
 from __future__ import annotations
 
 import abc
 from dataclasses import dataclass
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -42,6 +47,21 @@ class SearchBackend(abc.ABC):
     def query(self, q: str, limit: int = 50) -> List[Hit]:
         """Return up to *limit* ranked hits for query string *q*."""
 
+    def upsert(self, rows: Iterable[Tuple[str, Optional[str]]]) -> int:
+        """Add or refresh (instance_id, text) pairs without a rebuild."""
+        raise NotImplementedError(f"{self.name} search cannot update in place")
+
+    def stage(self, instance_id: str, text: Optional[str]) -> None:
+        """Record a live change to one instance (None removes it)."""
+        self.upsert([(instance_id, text)])
+
+    def flush(self) -> int:
+        """Write changes queued by stage(); returns how many."""
+        return 0
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
 
 class VectorBackend(SearchBackend):
     """Placeholder for a future dense/semantic backend.
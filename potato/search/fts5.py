@@ -5,13 +5,24 @@ Stores a standalone `instance_fts` virtual table in the shared
 `<task_dir>/project.sqlite` (same DB as memos; different table). The
 table is created lazily so a SQLite build without FTS5 simply reports
 ``available() == False`` instead of erroring at import/migration time.
+
+The index persists across restarts and is kept in sync incrementally:
+`instance_fts_docs` maps each instance id to its FTS rowid and a hash of
+the indexed text, so ``index()`` only rewrites instances whose text
+changed, adds new ones and drops ones that are gone. Live changes are
+staged with ``stage()`` and written in batches.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 import re
-from typing import Iterable, List, Tuple
+import sqlite3
+import threading
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from potato.persistence import get_db
 
@@ -29,6 +40,13 @@ _TOKEN_RE = re.compile(r"[^\w]+", re.UNICODE)
 SNIPPET_OPEN = "\x02"
 SNIPPET_CLOSE = "\x03"
 
+# Instances compared and written per transaction during a sync.
+SYNC_CHUNK = 2000
+
+# Staged live changes written once this many are pending (or before the
+# next query, whichever comes first).
+STAGE_FLUSH = 256
+
 
 def _to_match_query(q: str) -> str:
     """Turn arbitrary user input into a safe FTS5 MATCH expression.
@@ -49,6 +67,12 @@ class FTS5Backend(SearchBackend):
     def __init__(self, task_dir: str):
         self.task_dir = task_dir
         self._available = None  # lazy-detected, then cached
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._pending: Dict[str, Optional[str]] = {}
+        self._pending_lock = threading.Lock()
+        #: Counts from the most recent index() call.
+        self.last_sync = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
 
     # -- internals ---------------------------------------------------------
 
@@ -61,11 +85,96 @@ class FTS5Backend(SearchBackend):
                 "CREATE VIRTUAL TABLE IF NOT EXISTS instance_fts "
                 "USING fts5(instance_id UNINDEXED, body)"
             )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS instance_fts_docs ("
+                "doc INTEGER PRIMARY KEY, instance_id TEXT NOT NULL UNIQUE, "
+                "hash BLOB NOT NULL)"
+            )
             return True
         except Exception as e:
             logger.warning(f"FTS5 unavailable, search disabled: {e}")
             return False
 
+    def _write_conn(self) -> sqlite3.Connection:
+        """A connection of our own for batched writes.
+
+        The shared project connection is autocommit and used from every
+        request thread; batching the index writes into explicit
+        transactions on it would sweep other features' statements in too.
+        """
+        if self._writer is None:
+            self._ensure_table(self._conn())  # creates the file and tables
+            path = os.path.join(os.path.abspath(self.task_dir), "project.sqlite")
+            self._writer = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                           check_same_thread=False)
+            self._writer.execute("PRAGMA synchronous = NORMAL")
+        return self._writer
+
+    def _apply(self, conn, new, changed, removed) -> None:
+        """Write one batch in one transaction.
+
+        new: [(doc, instance_id, text, hash)]; changed: [(doc, text, hash)];
+        removed: [doc].
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if removed:
+                conn.executemany("DELETE FROM instance_fts WHERE rowid = ?",
+                                 [(d,) for d in removed])
+                conn.executemany("DELETE FROM instance_fts_docs WHERE doc = ?",
+                                 [(d,) for d in removed])
+            if changed:
+                conn.executemany("UPDATE instance_fts SET body = ? WHERE rowid = ?",
+                                 [(text, d) for d, text, _ in changed])
+                conn.executemany("UPDATE instance_fts_docs SET hash = ? WHERE doc = ?",
+                                 [(h, d) for d, _, h in changed])
+            if new:
+                conn.executemany(
+                    "INSERT INTO instance_fts (rowid, instance_id, body) VALUES (?, ?, ?)",
+                    [(d, iid, text) for d, iid, text, _ in new])
+                conn.executemany(
+                    "INSERT INTO instance_fts_docs (doc, instance_id, hash) VALUES (?, ?, ?)",
+                    [(d, iid, h) for d, iid, _, h in new])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _diff(self, conn, batch, next_doc):
+        """Split a batch of {instance_id: text or None} against the index.
+
+        Returns (new, changed, removed, unchanged, next_doc).
+        """
+        ids = list(batch)
+        known = {}
+        for start in range(0, len(ids), 500):
+            part = ids[start:start + 500]
+            for iid, doc, h in conn.execute(
+                    "SELECT instance_id, doc, hash FROM instance_fts_docs "
+                    f"WHERE instance_id IN ({','.join('?' * len(part))})", part).fetchall():
+                known[iid] = (doc, h)
+        new, changed, removed = [], [], []
+        unchanged = 0
+        blake2b = hashlib.blake2b
+        for iid, text in batch.items():
+            entry = known.get(iid)
+            if text is None:
+                if entry is not None:
+                    removed.append(entry[0])
+                continue
+            h = blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+            if entry is None:
+                new.append((next_doc, iid, text, h))
+                next_doc += 1
+            elif entry[1] != h:
+                changed.append((entry[0], text, h))
+            else:
+                unchanged += 1
+        return new, changed, removed, unchanged, next_doc
+
+    def _next_doc(self, conn) -> int:
+        return conn.execute("SELECT IFNULL(MAX(doc), 0) + 1 FROM instance_fts_docs").fetchone()[0]
+
     # -- SearchBackend -----------------------------------------------------
 
     def available(self) -> bool:
@@ -74,20 +183,87 @@ class FTS5Backend(SearchBackend):
         return self._available
 
     def index(self, rows: Iterable[Tuple[str, str]]) -> int:
-        conn = self._conn()
-        if not self._ensure_table(conn):
+        """Sync the index to exactly *rows*; returns how many it holds.
+
+        Instances whose text hash is unchanged are not touched, so a
+        restart over an unchanged corpus only reads.
+        """
+        if not self._ensure_table(self._conn()):
             return 0
-        conn.execute("DELETE FROM instance_fts")
-        n = 0
-        for instance_id, text in rows:
-            conn.execute(
-                "INSERT INTO instance_fts (instance_id, body) VALUES (?, ?)",
-                (str(instance_id), text or ""),
-            )
-            n += 1
-        conn.commit()
-        logger.info(f"FTS5 indexed {n} instances for {self.task_dir}")
-        return n
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+        with self._write_lock:
+            conn = self._write_conn()
+            # An index written before instance_fts_docs existed has no
+            # id -> rowid map to sync against; start it over.
+            if conn.execute("SELECT 1 FROM instance_fts_docs LIMIT 1").fetchone() is None \
+                    and conn.execute("SELECT 1 FROM instance_fts LIMIT 1").fetchone():
+                conn.execute("DELETE FROM instance_fts")
+            next_doc = self._next_doc(conn)
+            it = ((str(iid), text or "") for iid, text in rows)
+            while True:
+                batch = dict(islice(it, SYNC_CHUNK))
+                if not batch:
+                    break
+                seen.update(batch)
+                new, changed, removed, unchanged, next_doc = self._diff(conn, batch, next_doc)
+                if new or changed or removed:
+                    self._apply(conn, new, changed, removed)
+                stats["added"] += len(new)
+                stats["updated"] += len(changed)
+                stats["unchanged"] += unchanged
+
+            total = conn.execute("SELECT COUNT(*) FROM instance_fts_docs").fetchone()[0]
+            if total > len(seen):
+                stale = [doc for doc, iid in conn.execute(
+                    "SELECT doc, instance_id FROM instance_fts_docs") if iid not in seen]
+                for start in range(0, len(stale), SYNC_CHUNK):
+                    self._apply(conn, [], [], stale[start:start + SYNC_CHUNK])
+                stats["removed"] = len(stale)
+        self.last_sync = stats
+        logger.info(
+            "FTS5 index for %s: %d added, %d updated, %d removed, %d unchanged",
+            self.task_dir, stats["added"], stats["updated"], stats["removed"],
+            stats["unchanged"])
+        self.flush()
+        return len(seen)
+
+    def upsert(self, rows: Iterable[Tuple[str, Optional[str]]]) -> int:
+        """Add or refresh (instance_id, text) pairs; text None removes.
+
+        Returns the number of instances written.
+        """
+        batch = {str(iid): text for iid, text in rows}
+        if not batch or not self._ensure_table(self._conn()):
+            return 0
+        with self._write_lock:
+            conn = self._write_conn()
+            new, changed, removed, _, _ = self._diff(conn, batch, self._next_doc(conn))
+            if new or changed or removed:
+                self._apply(conn, new, changed, removed)
+        return len(new) + len(changed) + len(removed)
+
+    def stage(self, instance_id: str, text: Optional[str]) -> None:
+        """Queue a live change; written in batches or before the next query."""
+        with self._pending_lock:
+            self._pending[str(instance_id)] = text
+            full = len(self._pending) >= STAGE_FLUSH
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write any staged changes now."""
+        with self._pending_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+        return self.upsert(pending.items())
+
+    def close(self) -> None:
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
 
     def query(self, q: str, limit: int = 50) -> List[Hit]:
         match = _to_match_query(q)
@@ -96,6 +272,10 @@ class FTS5Backend(SearchBackend):
         conn = self._conn()
         if not self._ensure_table(conn):
             return []
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.warning(f"FTS5 could not apply staged changes: {e}")
         try:
             cur = conn.execute(
                 """SELECT instance_id,
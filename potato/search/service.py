@@ -2,9 +2,9 @@
 Search service (universal).
 
 Resolves the `search:` config block, builds the configured backend, and
-holds a process singleton so the index is built once on server start and
-reused per request. Mirrors the init/get/clear pattern of the other
-managers.
+holds a process singleton so the index is synced once on server start,
+kept current through the ``index_item`` hook, and reused per request.
+Mirrors the init/get/clear pattern of the other managers.
 """
 
 from __future__ import annotations
@@ -20,11 +20,13 @@ logger = logging.getLogger(__name__)
 
 _SEARCH: Optional[SearchBackend] = None
 _LOCK = threading.Lock()
+# text_key for live updates; set once the index is built from item state.
+_TEXT_KEY: Optional[str] = None
 
 _DEFAULTS = {
     "enabled": True,          # universal — on by default
     "backend": "fts5",
-    "max_instances": 100000,
+    "max_instances": None,    # no cap; set a number to bound the index
     "annotator_claim": False,  # annotator search-and-claim is opt-in
 }
 
@@ -60,10 +62,10 @@ def init_search(
     config: Dict[str, Any],
     rows: Optional[Iterable[Tuple[str, str]]] = None,
 ) -> Optional[SearchBackend]:
-    """Build the backend singleton and (optionally) index *rows*.
+    """Build the backend singleton and (optionally) sync the index to *rows*.
 
     Returns None when search is disabled/unavailable. Calling twice keeps
-    the existing singleton (but re-indexes if rows are provided)."""
+    the existing singleton (but re-syncs if rows are provided)."""
     global _SEARCH
     with _LOCK:
         if _SEARCH is None:
@@ -76,31 +78,42 @@ def init_search(
         return _SEARCH
 
 
+def _text_key(config: Dict[str, Any]) -> str:
+    return (config.get("item_properties") or {}).get("text_key", "text")
+
+
+def _item_text(data: Any, text_key: str) -> Optional[str]:
+    """The text to index for one item's data, or None if it has none."""
+    if isinstance(data, dict):
+        text = data.get(text_key)
+        if not isinstance(text, str) or not text.strip():
+            text = _searchable_text(data)
+    else:
+        text = str(data)
+    if not isinstance(text, str) or not text.strip():
+        # Better to have nothing to find than to find ids. `get_text()`
+        # returns an item's first string value, so a media corpus used to
+        # index "img_01", "img_02" — a full-text index of its own filenames.
+        return None
+    return text
+
+
 def _rows_from_item_state(config: Dict[str, Any]):
     """Yield (instance_id, text) for every loaded instance, using the
-    config's text_key. Bounded by search.max_instances."""
+    config's text_key. Bounded by search.max_instances when set."""
     from potato.item_state_management import get_item_state_manager
 
-    text_key = (config.get("item_properties") or {}).get("text_key", "text")
+    text_key = _text_key(config)
     cap = search_settings(config)["max_instances"]
     ism = get_item_state_manager()
     skipped = 0
     for i, iid in enumerate(ism.get_instance_ids()):
-        if i >= cap:
+        if cap is not None and i >= cap:
             logger.warning(
                 f"search.max_instances ({cap}) reached; not indexing the rest")
             break
-        data = ism.get_item(iid).get_data()
-        if isinstance(data, dict):
-            text = data.get(text_key)
-            if not isinstance(text, str) or not text.strip():
-                text = _searchable_text(data)
-        else:
-            text = str(data)
-        if not isinstance(text, str) or not text.strip():
-            # Better to have nothing to find than to find ids. `get_text()`
-            # returns an item's first string value, so a media corpus used to
-            # index "img_01", "img_02" — a full-text index of its own filenames.
+        text = _item_text(ism.get_item(iid).get_data(), text_key)
+        if text is None:
             skipped += 1
             continue
         yield str(iid), text
@@ -128,13 +141,31 @@ def _searchable_text(data: Dict[str, Any]) -> Optional[str]:
 def init_search_from_item_state(
     config: Dict[str, Any]
 ) -> Optional[SearchBackend]:
-    """Server-start entry point: build the backend and index all loaded
-    instances. No-op when search is disabled/unavailable."""
+    """Server-start entry point: build the backend and sync the index with
+    all loaded instances, then keep it current as items are added or
+    updated (see index_item). No-op when search is disabled/unavailable."""
+    global _TEXT_KEY
     settings = search_settings(config)
     if not settings["enabled"]:
         logger.info("Search disabled in config")
         return None
-    return init_search(config, rows=_rows_from_item_state(config))
+    backend = init_search(config, rows=_rows_from_item_state(config))
+    if backend is not None and settings["max_instances"] is None:
+        _TEXT_KEY = _text_key(config)
+    return backend
+
+
+def index_item(instance_id: str, data: Any) -> None:
+    """Live hook: reflect one added or updated item in the index.
+
+    Called by ItemStateManager after add_item/update_item. Changes are
+    staged and written in batches (and before the next query). No-op until
+    the index has been built, or when a max_instances cap is set.
+    """
+    backend = _SEARCH
+    if backend is None or _TEXT_KEY is None:
+        return
+    backend.stage(str(instance_id), _item_text(data, _TEXT_KEY))
 
 
 def get_search() -> Optional[SearchBackend]:
@@ -143,6 +174,9 @@ def get_search() -> Optional[SearchBackend]:
 
 def clear_search() -> None:
     """Reset the singleton. Tests only."""
-    global _SEARCH
+    global _SEARCH, _TEXT_KEY
     with _LOCK:
+        if _SEARCH is not None:
+            _SEARCH.close()
         _SEARCH = None
+        _TEXT_KEY = None
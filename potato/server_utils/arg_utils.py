@@ -5,9 +5,10 @@ Utility functions around parsing arguments.
 from argparse import ArgumentParser
 
 
-def arguments():
+def arguments(argv=None):
     """
-    Creates and returns the arg parser for Potato on the command line.
+    Creates the arg parser for Potato on the command line and parses ``argv``
+    (``sys.argv[1:]`` when omitted).
     """
     parser = ArgumentParser()
     parser.set_defaults(show_path=False, show_similarity=False)
@@ -202,4 +203,4 @@ def arguments():
         default=False,
     )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
@@ -13,11 +13,23 @@ Supported operators: ``equals``, ``in``, ``contains``, ``exists``,
 ``lt`` / ``lte`` / ``gt`` / ``gte``. String comparisons for equals/in are
 case-insensitive; numeric comparisons coerce both sides; ``contains`` tests
 membership in a list/string field. Field paths may be dotted (``metadata.score``).
+
+Rules that are evaluated against many items should be compiled once with
+:func:`compile_condition` / :func:`compile_conditions`, which resolve the
+operator, split the field path and normalize option lists up front and return
+a plain ``predicate(data) -> bool``. :func:`matches` and :func:`matches_all`
+look the compiled form up in a small cache keyed by the condition dict.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import logging
+from copy import deepcopy
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[Dict[str, Any]], bool]
 
 
 def lookup(data: Dict[str, Any], field: str):
@@ -47,59 +59,180 @@ def as_number(value):
     return None
 
 
-def matches(condition: Dict[str, Any], data: Dict[str, Any]) -> bool:
-    """Evaluate a single ``when`` condition against item data."""
-    field = condition.get("field")
-    if field is None:
-        return False
-    value = lookup(data, field)
+def _never(data: Dict[str, Any]) -> bool:
+    return False
+
+
+def _always(data: Dict[str, Any]) -> bool:
+    return True
+
+
+def _fold(value):
+    return value.lower() if isinstance(value, str) else value
 
-    if "exists" in condition:
-        present = value is not None
-        return present == bool(condition["exists"])
 
-    # Absent fields never match value-based operators.
-    if value is None:
-        return False
+def _getter(field: str) -> Callable[[Dict[str, Any]], Any]:
+    """A lookup() specialised to one pre-split field path."""
+    parts = str(field).split(".")
+    if len(parts) == 1:
+        key = parts[0]
 
+        def get(data):
+            return data.get(key) if isinstance(data, dict) else None
+        return get
+
+    def get_path(data):
+        cur = data
+        for part in parts:
+            if not isinstance(cur, dict) or part not in cur:
+                return None
+            cur = cur[part]
+        return cur
+    return get_path
+
+
+def _value_test(condition: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+    """The test applied to a present field value, or None if no operator."""
     if "equals" in condition:
         target = condition["equals"]
-        if isinstance(value, str) and isinstance(target, str):
-            return value.strip().lower() == target.strip().lower()
-        return value == target
+        if isinstance(target, str):
+            folded = target.strip().lower()
+            return lambda v: (v.strip().lower() == folded) if isinstance(v, str) else v == target
+        return lambda v: v == target
 
     if "in" in condition:
-        options = condition["in"] or []
-        norm = [o.lower() if isinstance(o, str) else o for o in options]
-        v = value.lower() if isinstance(value, str) else value
-        return v in norm
+        try:
+            norm = [_fold(o) for o in (condition["in"] or [])]
+        except TypeError:
+            logger.warning("Condition on %r has a non-list 'in': %r",
+                           condition.get("field"), condition["in"])
+            return lambda v: False
+        try:
+            options = frozenset(norm)
+        except TypeError:  # unhashable options; fall back to a list scan
+            return lambda v: _fold(v) in norm
+
+        def in_options(v):
+            v = _fold(v)
+            try:
+                return v in options
+            except TypeError:
+                return v in norm
+        return in_options
 
     if "contains" in condition:
         target = condition["contains"]
-        if isinstance(value, (list, tuple, set)):
-            tnorm = target.lower() if isinstance(target, str) else target
-            return any(
-                (item.lower() if isinstance(item, str) else item) == tnorm
-                for item in value
-            )
-        if isinstance(value, str) and isinstance(target, str):
-            return target.lower() in value.lower()
-        return False
+        tnorm = _fold(target)
+
+        def contains(v):
+            if isinstance(v, (list, tuple, set)):
+                return any(_fold(item) == tnorm for item in v)
+            if isinstance(v, str) and isinstance(target, str):
+                return tnorm in v.lower()
+            return False
+        return contains
 
     for op in ("lt", "lte", "gt", "gte"):
         if op in condition:
-            lhs, rhs = as_number(value), as_number(condition[op])
-            if lhs is None or rhs is None:
-                return False
-            if op == "lt":
-                return lhs < rhs
-            if op == "lte":
-                return lhs <= rhs
-            if op == "gt":
-                return lhs > rhs
-            return lhs >= rhs
+            rhs = as_number(condition[op])
+            if rhs is None:
+                return lambda v: False
+            compare = {
+                "lt": lambda lhs: lhs < rhs,
+                "lte": lambda lhs: lhs <= rhs,
+                "gt": lambda lhs: lhs > rhs,
+                "gte": lambda lhs: lhs >= rhs,
+            }[op]
+
+            def numeric(v):
+                lhs = as_number(v)
+                return lhs is not None and compare(lhs)
+            return numeric
 
-    return False
+    return None
+
+
+def compile_condition(condition: Dict[str, Any]) -> Predicate:
+    """Compile a single ``when`` condition into ``predicate(data) -> bool``.
+
+    The predicate gives the same answer as ``matches(condition, data)``.
+    """
+    field = condition.get("field")
+    if field is None:
+        return _never
+    get = _getter(field)
+
+    if "exists" in condition:
+        want = bool(condition["exists"])
+        return lambda data: (get(data) is not None) == want
+
+    test = _value_test(condition)
+    if test is None:
+        return _never
+
+    def predicate(data):
+        value = get(data)
+        # Absent fields never match value-based operators.
+        return value is not None and test(value)
+    return predicate
+
+
+def compile_conditions(conditions) -> Predicate:
+    """Compile a ``when`` list (AND), a single condition dict, or nothing.
+
+    Empty -> a predicate that is always True (an unconditional rule).
+    """
+    if not conditions:
+        return _always
+    if isinstance(conditions, dict):
+        return compile_condition(conditions)
+    predicates = [compile_condition(c) for c in conditions]
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda data: all(p(data) for p in predicates)
+
+
+def required_fields(conditions) -> Set[str]:
+    """Top-level keys an item must have for ``conditions`` to match.
+
+    A condition on ``metadata.score`` requires ``metadata``; ``exists: false``
+    requires nothing. Used to index rules so items only meet the rules whose
+    fields they carry. Empty for rules that can match any item.
+    """
+    if not conditions:
+        return set()
+    if isinstance(conditions, dict):
+        conditions = [conditions]
+    needed = set()
+    for c in conditions:
+        field = c.get("field")
+        if field is None or ("exists" in c and not c["exists"]):
+            continue
+        needed.add(str(field).split(".", 1)[0])
+    return needed
+
+
+# Compiled predicates for matches()/matches_all(), keyed by the id of the
+# condition dict. Each entry keeps a copy of the dict so a recycled id or an
+# in-place edit is noticed and the condition recompiled.
+_CACHE: Dict[int, tuple] = {}
+_CACHE_SIZE = 4096
+
+
+def _cached(condition: Dict[str, Any]) -> Predicate:
+    entry = _CACHE.get(id(condition))
+    if entry is not None and entry[0] == condition:
+        return entry[1]
+    predicate = compile_condition(condition)
+    if len(_CACHE) >= _CACHE_SIZE:
+        _CACHE.clear()
+    _CACHE[id(condition)] = (deepcopy(condition), predicate)
+    return predicate
+
+
+def matches(condition: Dict[str, Any], data: Dict[str, Any]) -> bool:
+    """Evaluate a single ``when`` condition against item data."""
+    return _cached(condition)(data)
 
 
 def matches_all(conditions, data: Dict[str, Any]) -> bool:
@@ -109,4 +242,4 @@ def matches_all(conditions, data: Dict[str, Any]) -> bool:
         return True
     if isinstance(conditions, dict):
         conditions = [conditions]
-    return all(matches(c, data) for c in conditions)
+    return all(_cached(c)(data) for c in conditions)
@@ -193,7 +193,8 @@ KNOWN_CONFIG_KEYS = {
         "show_active_annotators",
     },
     "database": {"type", "host", "database", "username", "password", "port",
-                 "pool_size", "pool_timeout", "connection_string"},
+                 "pool_size", "pool_timeout", "connection_string", "path",
+                 "cache", "cache_revalidate_seconds", "busy_timeout_ms"},
     "bws_config": {
         "tuple_size", "num_tuples", "seed", "min_item_appearances", "scoring",
     },
@@ -252,9 +253,10 @@ KNOWN_CONFIG_KEYS = {
     # === Media ===
     "audio_annotation": {
         "waveform_cache_dir", "waveform_look_ahead", "waveform_cache_max_size",
-        "client_fallback_max_duration",
+        "client_fallback_max_duration", "waveform_workers",
     },
     "spectrogram": None,
+    "format_extraction": {"cache", "cache_dir", "look_ahead", "workers"},
     "media_directory": None,
     "default_video_fps": None,
 
@@ -274,7 +276,7 @@ KNOWN_CONFIG_KEYS = {
         "source_key", "target_key", "strategy", "min_step_chars", "max_steps",
         "markers", "sentences_per_step", "llm_max_chars",
     },
-    "judge_alignment": {"enabled", "ai_support", "schemas", "few_shot", "inline"},
+    "judge_alignment": {"enabled", "ai_support", "schemas", "few_shot", "inline", "batch_size"},
     # Boundary Lab: counterfactual boundary probing (decision boundaries,
     # contrast-set export, invariance-probe quality control).
     "boundary_probing": {
@@ -306,6 +308,9 @@ KNOWN_CONFIG_KEYS = {
         "store_events", "idle_ms", "flush_interval_ms",
         "disclose_to_annotators", "disclosure_text", "detection",
     },
+    # Behavioral event store: interaction and annotation-change streams in
+    # project.sqlite instead of user_state.json, with a retention policy.
+    "behavioral_event_store": {"enabled", "retention_days", "max_events_per_user"},
     # Psychometrics: live IRT (labels with error bars) + adaptive routing.
     "psychometrics": {"enabled", "schema", "refit_interval", "min_observations",
                       "min_annotators_per_item", "confidence_threshold",
@@ -342,6 +347,8 @@ KNOWN_CONFIG_KEYS = {
     "verbose": None,
     "very_verbose": None,
     "debug_log": None,
+    # Request instrumentation: latency histograms + opt-in sampling profiler.
+    "instrumentation": {"enabled", "buckets_ms", "profiler"},
 
     # === Agent ===
     "live_agent": None,
@@ -1451,6 +1458,63 @@ def get_annotation_telemetry_disclosure_text(config_data: Dict[str, Any]) -> str
     return DEFAULT_TELEMETRY_DISCLOSURE
 
 
+# --------------------------------------------------------------------------
+# Behavioral event store
+# --------------------------------------------------------------------------
+
+#: Defaults for the ``behavioral_event_store`` block. Off by default so existing
+#: projects keep their trails in user_state.json, where offline tools read them.
+BEHAVIORAL_EVENT_STORE_DEFAULTS: Dict[str, Any] = {
+    "enabled": False,
+    "retention_days": None,        # None = keep events indefinitely
+    "max_events_per_user": None,   # None = no per-user cap
+}
+
+
+def validate_behavioral_event_store_config(config_data: Dict[str, Any]) -> None:
+    """Validate the ``behavioral_event_store`` block when present.
+
+    See ``docs/advanced/behavioral_tracking.md``.
+    """
+    block = config_data.get("behavioral_event_store")
+    if block is None:
+        return
+    if not isinstance(block, dict):
+        raise ConfigValidationError("behavioral_event_store must be a mapping")
+
+    errors = []
+    if "enabled" in block and not isinstance(block["enabled"], bool):
+        errors.append("behavioral_event_store.enabled must be true or false")
+
+    days = block.get("retention_days")
+    if days is not None and (not isinstance(days, (int, float))
+                             or isinstance(days, bool) or days <= 0):
+        errors.append("behavioral_event_store.retention_days must be a positive number")
+
+    cap = block.get("max_events_per_user")
+    if cap is not None and (not isinstance(cap, int) or isinstance(cap, bool) or cap <= 0):
+        errors.append("behavioral_event_store.max_events_per_user must be a positive integer")
+
+    if errors:
+        raise ConfigValidationError(
+            "Invalid behavioral_event_store configuration:\n  - "
+            + "\n  - ".join(errors)
+        )
+
+
+def get_behavioral_event_store_config(config_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the ``behavioral_event_store`` block with defaults filled in.
+
+    Always returns a dict that is safe to index. ``enabled`` is False when the
+    block is absent, so callers need no separate presence check.
+    """
+    merged = dict(BEHAVIORAL_EVENT_STORE_DEFAULTS)
+    block = (config_data or {}).get("behavioral_event_store")
+    if isinstance(block, dict):
+        merged.update(block)
+    return merged
+
+
 def validate_corpus_map_config(config_data: Dict[str, Any]) -> None:
     """Validate the ``corpus_map`` block when enabled and warn on quota conflict.
 
@@ -1658,6 +1722,9 @@ def validate_yaml_structure(config_data: Dict[str, Any], project_dir: str = None
     # Validate annotation telemetry (drawing dynamics) block if present
     validate_annotation_telemetry_config(config_data)
 
+    # Validate the behavioral event store (retention policy) block if present
+    validate_behavioral_event_store_config(config_data)
+
     # Validate ui_language (bundled code / _base / inline overrides)
     validate_ui_language_config(config_data)
 
@@ -3822,15 +3889,24 @@ def validate_database_config(db_config: Dict[str, Any]) -> None:
     if not isinstance(db_config, dict):
         raise ConfigValidationError("database configuration must be a dictionary")
 
-    required_fields = ['type', 'host', 'database', 'username']
+    # SQLite needs only a file path, which defaults to output_annotation_dir.
+    if db_config.get('type') == 'sqlite':
+        required_fields = ['type']
+    else:
+        required_fields = ['type', 'host', 'database', 'username']
     missing_fields = [field for field in required_fields if field not in db_config]
     if missing_fields:
         raise ConfigValidationError(f"Missing required database fields: {', '.join(missing_fields)}")
 
-    valid_types = ['mysql', 'file']
+    valid_types = ['mysql', 'sqlite', 'file']
     if db_config['type'] not in valid_types:
         raise ConfigValidationError(f"Unsupported database type: {db_config['type']}. Must be one of: {', '.join(valid_types)}")
 
+    if 'cache_revalidate_seconds' in db_config:
+        interval = db_config['cache_revalidate_seconds']
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval < 0:
+            raise ConfigValidationError("database.cache_revalidate_seconds must be a non-negative number")
+
     # Validate MySQL-specific fields
     if db_config['type'] == 'mysql':
         if 'password' not in db_config:
@@ -22,7 +22,9 @@ Example Configuration:
 import re
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +75,8 @@ class DisplayLogicCondition:
     operator: str
     value: Any = None
     case_sensitive: bool = False
+    _compiled: Optional[Tuple[Tuple[Any, ...], Callable[[Any], bool]]] = field(
+        default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate the condition after initialization."""
@@ -104,6 +108,19 @@ class DisplayLogicCondition:
         elif self.value is None and self.operator not in ("empty", "not_empty"):
             raise ValueError(f"Operator '{self.operator}' requires a value")
 
+    def evaluate(self, schema_value: Any) -> bool:
+        """Evaluate this condition against the watched schema's value.
+
+        The operator, expected value and regex are compiled into a predicate
+        on first use and reused until one of them is reassigned.
+        """
+        compiled = self._compiled
+        if compiled is None or not _same_key(compiled[0], self):
+            compiled = ((self.operator, self.value, self.case_sensitive),
+                        _compile_condition(self.operator, self.value, self.case_sensitive))
+            self._compiled = compiled
+        return compiled[1](schema_value)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert condition to dictionary for serialization."""
         result = {
@@ -434,67 +451,7 @@ class DisplayLogicEvaluator:
         Returns:
             bool: Whether the condition is satisfied
         """
-        operator = condition.operator
-        expected = condition.value
-        case_sensitive = condition.case_sensitive
-
-        # Handle empty checks first
-        if operator == "empty":
-            return DisplayLogicEvaluator._is_empty(schema_value)
-
-        if operator == "not_empty":
-            return not DisplayLogicEvaluator._is_empty(schema_value)
-
-        # For all other operators, normalize the actual value
-        actual = schema_value
-
-        # Apply case normalization for text comparisons
-        if not case_sensitive and isinstance(actual, str):
-            actual = actual.lower()
-
-        # Equality operators
-        if operator == "equals":
-            return DisplayLogicEvaluator._check_equals(actual, expected, case_sensitive)
-
-        if operator == "not_equals":
-            return not DisplayLogicEvaluator._check_equals(actual, expected, case_sensitive)
-
-        # Contains operators (for lists and text)
-        if operator == "contains":
-            return DisplayLogicEvaluator._check_contains(actual, expected, case_sensitive)
-
-        if operator == "not_contains":
-            return not DisplayLogicEvaluator._check_contains(actual, expected, case_sensitive)
-
-        # Regex matching
-        if operator == "matches":
-            if not isinstance(actual, str):
-                actual = str(actual) if actual is not None else ""
-            flags = 0 if case_sensitive else re.IGNORECASE
-            try:
-                return bool(re.search(expected, actual, flags))
-            except re.error:
-                logger.warning(f"Invalid regex pattern: {expected}")
-                return False
-
-        # Numeric comparisons
-        if operator in ("gt", "gte", "lt", "lte"):
-            return DisplayLogicEvaluator._check_numeric(operator, actual, expected)
-
-        # Range operators
-        if operator in ("in_range", "not_in_range"):
-            result = DisplayLogicEvaluator._check_range(actual, expected)
-            return result if operator == "in_range" else not result
-
-        # Length operators
-        if operator in ("length_gt", "length_lt"):
-            return DisplayLogicEvaluator._check_length(operator, actual, expected)
-
-        if operator == "length_in_range":
-            return DisplayLogicEvaluator._check_length_range(actual, expected)
-
-        logger.warning(f"Unknown operator: {operator}")
-        return False
+        return condition.evaluate(schema_value)
 
     @staticmethod
     def _is_empty(value: Any) -> bool:
@@ -647,12 +604,10 @@ class DisplayLogicEvaluator:
             # No conditions = always visible
             return True
 
-        results = []
-        for condition in rule.conditions:
-            schema_value = annotations.get(condition.schema)
-            result = DisplayLogicEvaluator.evaluate_condition(condition, schema_value)
-            results.append(result)
-
+        results = (
+            condition.evaluate(annotations.get(condition.schema))
+            for condition in rule.conditions
+        )
         if rule.logic == "all":
             return all(results)
         else:  # "any"
@@ -679,7 +634,7 @@ class DisplayLogicEvaluator:
             return True, None
 
         try:
-            rule = DisplayLogicRule.from_dict(display_logic)
+            rule = _parsed_rule(display_logic)
             is_visible = DisplayLogicEvaluator.evaluate_rule(rule, annotations)
 
             if not is_visible:
@@ -699,6 +654,161 @@ class DisplayLogicEvaluator:
             return True, None
 
 
+def _same_key(key: Tuple[Any, ...], condition: DisplayLogicCondition) -> bool:
+    operator, value, case_sensitive = key
+    return (operator == condition.operator and value is condition.value
+            and case_sensitive == condition.case_sensitive)
+
+
+def _compile_condition(operator: str, expected: Any,
+                       case_sensitive: bool) -> Callable[[Any], bool]:
+    """
+    Build a predicate equivalent to the operator dispatch in
+    ``DisplayLogicEvaluator``, with the expected values case-folded, parsed
+    and (for ``matches``) the regex compiled once.
+    """
+    E = DisplayLogicEvaluator
+
+    if operator == "empty":
+        return E._is_empty
+    if operator == "not_empty":
+        return lambda value: not E._is_empty(value)
+
+    def fold(value):
+        if not case_sensitive and isinstance(value, str):
+            return value.lower()
+        return value
+
+    if operator in ("equals", "not_equals", "contains", "not_contains"):
+        targets = expected if isinstance(expected, list) else [expected]
+        # _values_equal: string targets compare against str(actual)
+        strings = {t if case_sensitive else t.lower() for t in targets if isinstance(t, str)}
+        others = [t for t in targets if t is not None and not isinstance(t, str)]
+        has_none = any(t is None for t in targets)
+
+        def equal_any(actual):
+            if actual is None:
+                return has_none
+            if strings:
+                text = str(actual)
+                if (text if case_sensitive else text.lower()) in strings:
+                    return True
+            return any(actual == t for t in others)
+
+        if operator in ("equals", "not_equals"):
+            test = equal_any
+        else:
+            needles = [str(t) if case_sensitive else str(t).lower() for t in targets]
+
+            def test(actual):
+                if isinstance(actual, list):
+                    return any(equal_any(item) for item in actual)
+                if isinstance(actual, str):
+                    haystack = actual if case_sensitive else actual.lower()
+                    return any(n in haystack for n in needles)
+                return equal_any(actual)
+
+        if operator.startswith("not_"):
+            return lambda value: not test(fold(value))
+        return lambda value: test(fold(value))
+
+    if operator == "matches":
+        try:
+            pattern = re.compile(expected, 0 if case_sensitive else re.IGNORECASE)
+        except re.error:
+            logger.warning(f"Invalid regex pattern: {expected}")
+            return lambda value: False
+
+        def regex(value):
+            value = fold(value)
+            if not isinstance(value, str):
+                value = str(value) if value is not None else ""
+            return pattern.search(value) is not None
+        return regex
+
+    if operator in ("gt", "gte", "lt", "lte"):
+        try:
+            bound = float(expected)
+        except (ValueError, TypeError):
+            return lambda value: False
+        compare = {
+            "gt": lambda n: n > bound,
+            "gte": lambda n: n >= bound,
+            "lt": lambda n: n < bound,
+            "lte": lambda n: n <= bound,
+        }[operator]
+
+        def numeric(value):
+            value = fold(value)
+            try:
+                number = float(value) if value is not None else 0
+            except (ValueError, TypeError):
+                return False
+            return compare(number)
+        return numeric
+
+    if operator in ("in_range", "not_in_range"):
+        try:
+            low, high = float(expected[0]), float(expected[1])
+        except (ValueError, TypeError, IndexError):
+            return lambda value: operator == "not_in_range"
+        inside = operator == "in_range"
+
+        def in_range(value):
+            value = fold(value)
+            try:
+                number = float(value) if value is not None else 0
+            except (ValueError, TypeError):
+                return not inside
+            return (low <= number <= high) == inside
+        return in_range
+
+    if operator in ("length_gt", "length_lt", "length_in_range"):
+        try:
+            if operator == "length_in_range":
+                low, high = int(expected[0]), int(expected[1])
+            else:
+                limit = int(expected)
+        except (ValueError, TypeError, IndexError):
+            return lambda value: False
+
+        def length(value):
+            value = fold(value)
+            n = len(str(value)) if value is not None else 0
+            if operator == "length_gt":
+                return n > limit
+            if operator == "length_lt":
+                return n < limit
+            return low <= n <= high
+        return length
+
+    def unknown(value):
+        logger.warning(f"Unknown operator: {operator}")
+        return False
+    return unknown
+
+
+# Parsed display_logic rules, keyed by the id of the config dict they came
+# from. Each entry keeps a copy of that dict so a recycled id or an in-place
+# edit is noticed and the rule re-parsed.
+_RULE_CACHE: "OrderedDict[int, Tuple[Dict[str, Any], DisplayLogicRule]]" = OrderedDict()
+_RULE_CACHE_SIZE = 1024
+
+
+def _parsed_rule(display_logic: Dict[str, Any]) -> DisplayLogicRule:
+    """``DisplayLogicRule.from_dict`` with the result cached per config dict."""
+    key = id(display_logic)
+    entry = _RULE_CACHE.get(key)
+    if entry is not None and entry[0] == display_logic:
+        _RULE_CACHE.move_to_end(key)
+        return entry[1]
+    rule = DisplayLogicRule.from_dict(display_logic)
+    _RULE_CACHE[key] = (deepcopy(display_logic), rule)
+    if len(_RULE_CACHE) > _RULE_CACHE_SIZE:
+        _RULE_CACHE.popitem(last=False)
+    return rule
+
+
 def validate_display_logic_config(
     annotation_schemes: List[Dict[str, Any]]
 ) -> Tuple[bool, List[str]]:
@@ -21,6 +21,8 @@ import logging
 from typing import Set, Dict, List, Tuple
 from markupsafe import Markup
 
+from potato.instrumentation.metrics import timed
+
 logger = logging.getLogger(__name__)
 
 # Elements allowed in sanitized HTML
@@ -204,6 +206,7 @@ def _escape_text(text: str, quote: bool = False) -> str:
 _UNESCAPED_ATTRS: Set[str] = {'href', 'src', 'srcset', 'poster', 'style'}
 
 
+@timed("sanitize")
 def sanitize_html(text: str) -> Markup:
     """
     Sanitize HTML content while preserving legitimate span annotations.
@@ -174,44 +174,82 @@ def iou_polygon(a: Sequence[Sequence[float]], b: Sequence[Sequence[float]],
         return 0.0
 
     try:
-        from shapely.geometry import Polygon  # type: ignore
-
-        pa = Polygon([(float(p[0]), float(p[1])) for p in a])
-        pb = Polygon([(float(p[0]), float(p[1])) for p in b])
-        if not pa.is_valid:
-            pa = pa.buffer(0)
-        if not pb.is_valid:
-            pb = pb.buffer(0)
-        if pa.is_empty or pb.is_empty:
-            return 0.0
-        union = pa.union(pb).area
-        return pa.intersection(pb).area / union if union > 0 else 0.0
+        pa = _shapely_polygon(a)
+        pb = _shapely_polygon(b)
     except ImportError:
         return _iou_polygon_raster(a, b, samples)
+    return _iou_shapely(pa, pb)
+
+
+def _shapely_polygon(points):
+    """A valid shapely polygon for ``points``; raises ImportError without shapely."""
+    from shapely.geometry import Polygon  # type: ignore
+
+    polygon = Polygon([(float(p[0]), float(p[1])) for p in points])
+    if not polygon.is_valid:
+        polygon = polygon.buffer(0)
+    return polygon
+
+
+def _iou_shapely(pa, pb) -> float:
+    if pa.is_empty or pb.is_empty:
+        return 0.0
+    union = pa.union(pb).area
+    return pa.intersection(pb).area / union if union > 0 else 0.0
 
 
 def _iou_polygon_raster(a, b, samples: int) -> float:
-    xs = [float(p[0]) for p in a] + [float(p[0]) for p in b]
-    ys = [float(p[1]) for p in a] + [float(p[1]) for p in b]
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
+    import numpy as np
+
+    pa = np.array([(float(p[0]), float(p[1])) for p in a])
+    pb = np.array([(float(p[0]), float(p[1])) for p in b])
+    lo_a, hi_a = pa.min(axis=0), pa.max(axis=0)
+    lo_b, hi_b = pb.min(axis=0), pb.max(axis=0)
+    if (hi_a < lo_b).any() or (hi_b < lo_a).any():
+        # Disjoint bounds: no cell can be inside both.
+        return 0.0
+    min_x = min(pa[:, 0].min(), pb[:, 0].min())
+    max_x = max(pa[:, 0].max(), pb[:, 0].max())
+    min_y = min(pa[:, 1].min(), pb[:, 1].min())
+    max_y = max(pa[:, 1].max(), pb[:, 1].max())
     if max_x <= min_x or max_y <= min_y:
         return 0.0
 
-    step_x = (max_x - min_x) / samples
-    step_y = (max_y - min_y) / samples
-    inter = union = 0
-    for row in range(samples):
-        py = min_y + (row + 0.5) * step_y
-        for col in range(samples):
-            px = min_x + (col + 0.5) * step_x
-            in_a = _point_in_polygon(px, py, a)
-            in_b = _point_in_polygon(px, py, b)
-            if in_a and in_b:
-                inter += 1
-            if in_a or in_b:
-                union += 1
-    return inter / union if union else 0.0
+    # Cell centres on the shared grid, one row per y and one column per x.
+    offsets = np.arange(samples) + 0.5
+    px = min_x + offsets * ((max_x - min_x) / samples)
+    py = min_y + offsets * ((max_y - min_y) / samples)
+    in_a = _points_in_polygon(px, py, pa)
+    in_b = _points_in_polygon(px, py, pb)
+    union = int(np.count_nonzero(in_a | in_b))
+    return int(np.count_nonzero(in_a & in_b)) / union if union else 0.0
+
+
+def _points_in_polygon(xs, ys, poly):
+    """
+    :func:`_point_in_polygon` over the grid of ``ys`` rows by ``xs`` columns.
+
+    ``xs`` must be ascending; ``poly`` is an ``(n, 2)`` array. Where an edge
+    crosses a row depends only on y, so for each (row, edge) crossing a
+    binary search over ``xs`` finds the cells left of it, and each cell's
+    crossing count -- whose parity is the answer -- is a running sum.
+    """
+    import numpy as np
+
+    x1, y1 = poly[:, 0], poly[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    column = ys[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crosses = (y1 > column) != (y2 > column)
+        x_at = (x2 - x1) * (column - y1) / (y2 - y1) + x1
+    # Cells strictly left of each crossing, i.e. those with x < x_at.
+    cut = np.searchsorted(xs, np.where(crosses, x_at, -np.inf), side="left")
+    width = len(xs) + 1
+    rows = np.arange(len(ys))[:, None] * width
+    starts = np.bincount((rows + cut).ravel(), minlength=len(ys) * width)
+    # crossings right of cell c = crossings whose cut is beyond c
+    right = np.cumsum(starts.reshape(len(ys), width)[:, ::-1], axis=1)[:, ::-1]
+    return (right[:, 1:] % 2).astype(bool)
 
 
 def _point_in_polygon(x: float, y: float, poly: Sequence[Sequence[float]]) -> bool:
@@ -765,6 +803,160 @@ def delta_geometric(obj_a: Dict[str, Any], obj_b: Dict[str, Any]) -> float:
     return 1.0 - similarity(obj_a, obj_b)
 
 
+# ---------------------------------------------------------------------------
+# All-pairs kernels
+#
+# Matching scores every object of one annotator against every object of the
+# other, and done pair by pair in Python that dominates agreement reports on
+# box and polygon datasets. These return the same numbers as the pairwise
+# functions above, a ``len(a) x len(b)`` matrix at a time.
+# ---------------------------------------------------------------------------
+
+def iou_bbox_matrix(boxes_a: Sequence[Sequence[float]],
+                    boxes_b: Sequence[Sequence[float]]):
+    """All-pairs :func:`iou_bbox` of two lists of ``[x, y, w, h]`` boxes."""
+    import numpy as np
+
+    a = _box_array(boxes_a)
+    b = _box_array(boxes_b)
+    ax, ay, aw, ah = (a[:, k, None] for k in range(4))
+    bx, by, bw, bh = (b[None, :, k] for k in range(4))
+
+    ix = np.maximum(0.0, np.minimum(ax + aw, bx + bw) - np.maximum(ax, bx))
+    iy = np.maximum(0.0, np.minimum(ay + ah, by + bh) - np.maximum(ay, by))
+    intersection = ix * iy
+    union = aw * ah + bw * bh - intersection
+    valid = (aw > 0) & (ah > 0) & (bw > 0) & (bh > 0) & (union > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid, intersection / union, 0.0)
+
+
+def _box_array(boxes):
+    import numpy as np
+
+    # Malformed boxes become zero-area ones, which iou_bbox also scores 0.
+    rows = [[float(v) for v in box[:4]] if box and len(box) >= 4 else [0.0] * 4
+            for box in boxes]
+    return np.array(rows, dtype=float).reshape(len(rows), 4)
+
+
+def iou_mask_matrix(rles_a: Sequence[dict], rles_b: Sequence[dict]):
+    """
+    All-pairs :func:`iou_mask`.
+
+    Each mask's runs are decoded once rather than once per pair, and the
+    overlap with another mask is read off a cumulative-area table by binary
+    search instead of a merge walk.
+    """
+    import numpy as np
+
+    def decode(rle):
+        spans = _rle_true_spans(rle) if rle else []
+        starts = np.array([s for s, _e in spans], dtype=np.int64)
+        ends = np.array([e for _s, e in spans], dtype=np.int64)
+        return starts, ends, np.cumsum(ends - starts)
+
+    decoded_a = [decode(rle) for rle in rles_a]
+    decoded_b = [decode(rle) for rle in rles_b]
+    out = np.zeros((len(decoded_a), len(decoded_b)))
+    for i, (starts_a, ends_a, cum_a) in enumerate(decoded_a):
+        area_a = int(cum_a[-1]) if len(cum_a) else 0
+        if not area_a:
+            continue
+        for j, (starts_b, ends_b, cum_b) in enumerate(decoded_b):
+            area_b = int(cum_b[-1]) if len(cum_b) else 0
+            if not area_b:
+                continue
+            intersection = int((_area_before(starts_a, ends_a, cum_a, ends_b)
+                                - _area_before(starts_a, ends_a, cum_a, starts_b)).sum())
+            union = area_a + area_b - intersection
+            out[i, j] = intersection / union if union > 0 else 0.0
+    return out
+
+
+def _area_before(starts, ends, cum, positions):
+    """Set pixels of a mask (as sorted spans) before each of ``positions``."""
+    import numpy as np
+
+    k = np.searchsorted(starts, positions, side="right")
+    last = np.maximum(k - 1, 0)
+    covered = cum[last] - np.maximum(ends[last] - positions, 0)
+    return np.where(k > 0, covered, 0)
+
+
+def iou_polygon_matrix(polys_a: Sequence[Sequence[Sequence[float]]],
+                       polys_b: Sequence[Sequence[Sequence[float]]],
+                       samples: int = 128):
+    """
+    All-pairs :func:`iou_polygon`.
+
+    With shapely each polygon is built (and repaired) once rather than once
+    per pair; without it every pair goes through the vectorized raster.
+    """
+    import numpy as np
+
+    out = np.zeros((len(polys_a), len(polys_b)))
+    usable_a = [i for i, p in enumerate(polys_a) if p and len(p) >= 3]
+    usable_b = [j for j, p in enumerate(polys_b) if p and len(p) >= 3]
+    if not usable_a or not usable_b:
+        return out
+
+    try:
+        shapes_a = {i: _shapely_polygon(polys_a[i]) for i in usable_a}
+        shapes_b = {j: _shapely_polygon(polys_b[j]) for j in usable_b}
+    except ImportError:
+        for i in usable_a:
+            for j in usable_b:
+                out[i, j] = _iou_polygon_raster(polys_a[i], polys_b[j], samples)
+        return out
+
+    for i in usable_a:
+        for j in usable_b:
+            out[i, j] = _iou_shapely(shapes_a[i], shapes_b[j])
+    return out
+
+
+def similarity_matrix(objects_a: List[Dict[str, Any]],
+                      objects_b: List[Dict[str, Any]]):
+    """
+    :func:`similarity` for every pair of ``objects_a`` x ``objects_b``.
+
+    Boxes, masks and polygons of the same type go through the all-pairs
+    kernels above; other types, and pairs of different types (always 0),
+    take the pairwise path.
+    """
+    import numpy as np
+
+    out = np.zeros((len(objects_a), len(objects_b)))
+    by_type_a: Dict[Any, List[int]] = {}
+    by_type_b: Dict[Any, List[int]] = {}
+    for i, obj in enumerate(objects_a):
+        by_type_a.setdefault(obj.get("type") if obj else None, []).append(i)
+    for j, obj in enumerate(objects_b):
+        by_type_b.setdefault(obj.get("type") if obj else None, []).append(j)
+
+    for obj_type, rows in by_type_a.items():
+        cols = by_type_b.get(obj_type)
+        if not cols:
+            continue
+        left = [objects_a[i] for i in rows]
+        right = [objects_b[j] for j in cols]
+        if obj_type == "bbox":
+            block = iou_bbox_matrix([o.get("bbox") or [] for o in left],
+                                    [o.get("bbox") or [] for o in right])
+        elif obj_type == "mask":
+            block = iou_mask_matrix([o.get("rle") or {} for o in left],
+                                    [o.get("rle") or {} for o in right])
+        elif obj_type in ("polygon", "ellipse", "cuboid_2d"):
+            key = "front" if obj_type == "cuboid_2d" else "points"
+            block = iou_polygon_matrix([o.get(key) or [] for o in left],
+                                       [o.get(key) or [] for o in right])
+        else:
+            block = [[similarity(a, b) for b in right] for a in left]
+        out[np.ix_(rows, cols)] = block
+    return out
+
+
 # ---------------------------------------------------------------------------
 # Instance matching
 # ---------------------------------------------------------------------------
@@ -792,15 +984,20 @@ def match_instances(objects_a: List[Dict[str, Any]], objects_b: List[Dict[str, A
     if not objects_a or not objects_b:
         return [], list(range(len(objects_a))), list(range(len(objects_b)))
 
-    score_of = sim_fn or similarity
-    scores = [[score_of(a, b) for b in objects_b] for a in objects_a]
+    if sim_fn is None or sim_fn is similarity:
+        matrix = similarity_matrix(objects_a, objects_b)
+    else:
+        import numpy as np
+
+        matrix = np.array([[sim_fn(a, b) for b in objects_b] for a in objects_a],
+                          dtype=float)
+    scores = matrix.tolist()
 
     pairs: List[Tuple[int, int]] = []
     try:
         from scipy.optimize import linear_sum_assignment  # type: ignore
 
-        cost = [[1.0 - s for s in row] for row in scores]
-        rows, cols = linear_sum_assignment(cost)
+        rows, cols = linear_sum_assignment(1.0 - matrix)
         pairs = list(zip(rows.tolist(), cols.tolist()))
     except ImportError:
         used_b = set()
@@ -218,6 +218,42 @@ def centroid_distance(obj_a: Dict[str, Any], obj_b: Dict[str, Any]) -> float:
     return min(1.0, math.hypot(ax - bx, ay - by) / math.sqrt(2))
 
 
+def _giou_distances(boxes_a, boxes_b):
+    """:func:`giou_distance` for aligned ``(n, 4)`` box arrays, row by row."""
+    import numpy as np
+
+    ax, ay, aw, ah = boxes_a.T
+    bx, by, bw, bh = boxes_b.T
+    inter_w = np.maximum(0.0, np.minimum(ax + aw, bx + bw) - np.maximum(ax, bx))
+    inter_h = np.maximum(0.0, np.minimum(ay + ah, by + bh) - np.maximum(ay, by))
+    intersection = inter_w * inter_h
+    union = aw * ah + bw * bh - intersection
+    hull = ((np.maximum(ax + aw, bx + bw) - np.minimum(ax, bx))
+            * (np.maximum(ay + ah, by + bh) - np.minimum(ay, by)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        iou = intersection / union
+        giou = np.where(hull > 0, iou - (hull - union) / hull, iou)
+    degenerate = (aw <= 0) | (ah <= 0) | (bw <= 0) | (bh <= 0) | (union <= 0)
+    return (1.0 - np.where(degenerate, -1.0, giou)) / 2.0
+
+
+def _centroid_distances(boxes_a, boxes_b):
+    """:func:`centroid_distance` for aligned ``(n, 4)`` box arrays."""
+    import numpy as np
+
+    dx = (boxes_a[:, 0] + boxes_a[:, 2] / 2) - (boxes_b[:, 0] + boxes_b[:, 2] / 2)
+    dy = (boxes_a[:, 1] + boxes_a[:, 3] / 2) - (boxes_b[:, 1] + boxes_b[:, 3] / 2)
+    return np.minimum(1.0, np.hypot(dx, dy) / math.sqrt(2))
+
+
+#: Box distances with a form that scores many pairs at once; used for the
+#: chance baseline, which scores thousands of pairs per bootstrap resample.
+_BATCHED_BOX_DISTANCES = {
+    giou_distance: _giou_distances,
+    centroid_distance: _centroid_distances,
+}
+
+
 #: Named distances the report can be asked for.
 DISTANCES: Dict[str, Callable[[dict, dict], float]] = {
     "giou": giou_distance,
@@ -237,12 +273,17 @@ def _within_item_distances(items: Dict[str, Dict[str, List[dict]]],
                            distance: Callable[[dict, dict], float],
                            threshold: float,
                            max_pairs: int = DEFAULT_MAX_PAIRS,
+                           cache: Optional[Dict[int, Any]] = None,
                            ) -> Tuple[List[float], int]:
     """
     Distances between MATCHED pairs from different annotators, same item.
 
     Returns ``(distances, items_skipped)``. Skipping is reported rather than
     silent: a truncated agreement number that reads as complete will be quoted.
+
+    ``cache`` memoizes each item's matching across calls. The bootstrap draws
+    the same item dicts over and over, and without it every resample re-ran
+    the Hungarian matching for every item it drew.
     """
     out: List[float] = []
     budget = max_pairs
@@ -260,29 +301,58 @@ def _within_item_distances(items: Dict[str, Dict[str, List[dict]]],
             skipped += 1
             continue
 
-        for i, left in enumerate(annotators):
-            for right in annotators[i + 1:]:
-                matches, _, _ = geometry.match_instances(
-                    objects_by_annotator[left], objects_by_annotator[right],
-                    threshold=threshold)
-                # (index_a, index_b, similarity) triples.
-                for a_idx, b_idx, _score in matches:
-                    out.append(distance(objects_by_annotator[left][a_idx],
-                                        objects_by_annotator[right][b_idx]))
-                budget -= max(1, len(objects_by_annotator[left])
-                              * len(objects_by_annotator[right]))
+        distances, cost = _item_distances(objects_by_annotator, annotators,
+                                          distance, threshold, cache)
+        out.extend(distances)
+        budget -= cost
     return out, skipped
 
 
+def _item_distances(objects_by_annotator: Dict[str, List[dict]],
+                    annotators: List[str],
+                    distance: Callable[[dict, dict], float],
+                    threshold: float,
+                    cache: Optional[Dict[int, Any]]) -> Tuple[List[float], int]:
+    """One item's matched-pair distances and the pair budget they cost."""
+    if cache is not None:
+        # Keyed by identity, holding the dict so the id cannot be reused.
+        hit = cache.get(id(objects_by_annotator))
+        if hit is not None and hit[0] is objects_by_annotator:
+            return hit[1]
+
+    out: List[float] = []
+    cost = 0
+    for i, left in enumerate(annotators):
+        for right in annotators[i + 1:]:
+            matches, _, _ = geometry.match_instances(
+                objects_by_annotator[left], objects_by_annotator[right],
+                threshold=threshold)
+            # (index_a, index_b, similarity) triples.
+            for a_idx, b_idx, _score in matches:
+                out.append(distance(objects_by_annotator[left][a_idx],
+                                    objects_by_annotator[right][b_idx]))
+            cost += max(1, len(objects_by_annotator[left])
+                        * len(objects_by_annotator[right]))
+
+    if cache is not None:
+        cache[id(objects_by_annotator)] = (objects_by_annotator, (out, cost))
+    return out, cost
+
+
 def _between_item_distances(items: Dict[str, Dict[str, List[dict]]],
                             distance: Callable[[dict, dict], float],
-                            samples: int, rng: random.Random) -> List[float]:
+                            samples: int, rng: random.Random,
+                            boxes: Optional[Dict[int, Any]] = None,
+                            ) -> List[float]:
     """
     The chance baseline: distances between objects on DIFFERENT items.
 
     This is what makes the measure chance-corrected. An easy corpus -- one big
     centred object per image -- produces small between-item distances too, so
     the ratio stays honest instead of rewarding the task for being easy.
+
+    The pairs are drawn first and scored together; ``boxes`` memoizes each
+    object's box across calls for the distances that batch.
     """
     pool: List[Tuple[str, dict]] = []
     for item_id, objects_by_annotator in items.items():
@@ -292,16 +362,52 @@ def _between_item_distances(items: Dict[str, Dict[str, List[dict]]],
     if len(pool) < 2:
         return []
 
-    out: List[float] = []
+    pairs: List[Tuple[dict, dict]] = []
     attempts = 0
     limit = samples * 4
-    while len(out) < samples and attempts < limit:
+    while len(pairs) < samples and attempts < limit:
         attempts += 1
         left_item, left = pool[rng.randrange(len(pool))]
         right_item, right = pool[rng.randrange(len(pool))]
         if left_item == right_item:
             continue
-        out.append(distance(left, right))
+        pairs.append((left, right))
+    return _pair_distances(distance, pairs, {} if boxes is None else boxes)
+
+
+def _pair_distances(distance: Callable[[dict, dict], float],
+                    pairs: List[Tuple[dict, dict]],
+                    boxes: Dict[int, Any]) -> List[float]:
+    """``[distance(a, b) for a, b in pairs]``, batched where the distance allows."""
+    batched = _BATCHED_BOX_DISTANCES.get(distance)
+    if batched is None:
+        return [distance(left, right) for left, right in pairs]
+
+    import numpy as np
+
+    def box_of(obj):
+        # Keyed by identity, holding the object so the id cannot be reused.
+        hit = boxes.get(id(obj))
+        if hit is None or hit[0] is not obj:
+            hit = boxes[id(obj)] = (obj, _bbox_of(obj))
+        return hit[1]
+
+    out: List[float] = [0.0] * len(pairs)
+    rows: List[int] = []
+    lefts: List[List[float]] = []
+    rights: List[List[float]] = []
+    for index, (left, right) in enumerate(pairs):
+        box_a, box_b = box_of(left), box_of(right)
+        if box_a is None or box_b is None:
+            out[index] = distance(left, right)
+            continue
+        rows.append(index)
+        lefts.append(box_a)
+        rights.append(box_b)
+    if rows:
+        scored = batched(np.array(lefts, dtype=float), np.array(rights, dtype=float))
+        for index, value in zip(rows, scored.tolist()):
+            out[index] = value
     return out
 
 
@@ -398,9 +504,16 @@ def geometry_agreement(
         if len(by_annotator) >= 2
     }
 
+    # Matchings, boxes and clusters are memoized for the whole report: the
+    # bootstrap redraws the same items and objects hundreds of times.
+    matched: Dict[int, Any] = {}
+    boxes: Dict[int, Any] = {}
     within, budget_skipped = _within_item_distances(
-        comparable, metric, threshold, max_pairs)
-    between = _between_item_distances(comparable, metric, chance_samples, rng)
+        comparable, metric, threshold, max_pairs, matched)
+    between = _between_item_distances(comparable, metric, chance_samples, rng,
+                                      boxes)
+    clusters = {item_id: _matched_clusters(by_annotator, threshold)
+                for item_id, by_annotator in comparable.items()}
 
     result: Dict[str, Any] = {
         "distance": distance,
@@ -409,8 +522,9 @@ def geometry_agreement(
         "n_items_skipped": len(items) - len(comparable),
         "n_matched_pairs": len(within),
         "n_chance_pairs": len(between),
-        "detection": _detection_agreement(comparable, threshold),
-        "classification": _classification_agreement(comparable, threshold),
+        "detection": _detection_agreement(comparable, threshold, clusters),
+        "classification": _classification_agreement(comparable, threshold,
+                                                     clusters),
         "localization": {
             "sigma": sigma_agreement(within, between),
             "ks": _ks_statistic(within, between),
@@ -438,7 +552,8 @@ def geometry_agreement(
 
     if bootstrap:
         result["confidence"] = _bootstrap_intervals(
-            comparable, metric, threshold, chance_samples, bootstrap, seed)
+            comparable, metric, threshold, chance_samples, bootstrap, seed,
+            matched, boxes)
     return result
 
 
@@ -500,8 +615,17 @@ def _matched_clusters(objects_by_annotator: Dict[str, List[dict]],
     return clusters
 
 
+def _clusters_of(item_id, by_annotator, threshold, clusters):
+    """An item's clusters, from the report's memo when it has them."""
+    if clusters is not None and item_id in clusters:
+        return clusters[item_id]
+    return _matched_clusters(by_annotator, threshold)
+
+
 def _detection_agreement(items: Dict[str, Dict[str, List[dict]]],
-                         threshold: float) -> Dict[str, Any]:
+                         threshold: float,
+                         clusters: Optional[Dict[str, List[Dict[str, dict]]]] = None,
+                         ) -> Dict[str, Any]:
     """
     Alpha over present/absent per matched cluster.
 
@@ -512,7 +636,8 @@ def _detection_agreement(items: Dict[str, Dict[str, List[dict]]],
     rows: List[Tuple[str, str, str]] = []
     for item_id, by_annotator in items.items():
         annotators = sorted(by_annotator)
-        for index, cluster in enumerate(_matched_clusters(by_annotator, threshold)):
+        for index, cluster in enumerate(
+                _clusters_of(item_id, by_annotator, threshold, clusters)):
             unit = f"{item_id}#{index}"
             for annotator in annotators:
                 rows.append((annotator, unit,
@@ -521,7 +646,9 @@ def _detection_agreement(items: Dict[str, Dict[str, List[dict]]],
 
 
 def _classification_agreement(items: Dict[str, Dict[str, List[dict]]],
-                              threshold: float) -> Dict[str, Any]:
+                              threshold: float,
+                              clusters: Optional[Dict[str, List[Dict[str, dict]]]] = None,
+                              ) -> Dict[str, Any]:
     """
     Alpha over labels, on clusters at least two annotators found.
 
@@ -531,7 +658,8 @@ def _classification_agreement(items: Dict[str, Dict[str, List[dict]]],
     """
     rows: List[Tuple[str, str, str]] = []
     for item_id, by_annotator in items.items():
-        for index, cluster in enumerate(_matched_clusters(by_annotator, threshold)):
+        for index, cluster in enumerate(
+                _clusters_of(item_id, by_annotator, threshold, clusters)):
             if len(cluster) < 2:
                 continue
             unit = f"{item_id}#{index}"
@@ -569,7 +697,7 @@ def _alpha_result(rows, unanimous_note: str) -> Dict[str, Any]:
 
 
 def _bootstrap_intervals(items, metric, threshold, chance_samples,
-                         resamples, seed) -> Dict[str, Any]:
+                         resamples, seed, cache=None, boxes=None) -> Dict[str, Any]:
     """
     Percentile bootstrap over ITEMS.
 
@@ -582,6 +710,8 @@ def _bootstrap_intervals(items, metric, threshold, chance_samples,
         return {"note": "too few items to bootstrap"}
 
     rng = random.Random(seed)
+    cache = {} if cache is None else cache
+    boxes = {} if boxes is None else boxes
     sigmas: List[float] = []
     for _ in range(resamples):
         drawn = [item_ids[rng.randrange(len(item_ids))]
@@ -589,9 +719,10 @@ def _bootstrap_intervals(items, metric, threshold, chance_samples,
         # Distinct keys, or a duplicate draw would silently collapse.
         sample = {f"{item_id}~{i}": items[item_id]
                   for i, item_id in enumerate(drawn)}
-        within, _skipped = _within_item_distances(sample, metric, threshold)
+        within, _skipped = _within_item_distances(
+            sample, metric, threshold, cache=cache)
         between = _between_item_distances(
-            sample, metric, chance_samples, rng)
+            sample, metric, chance_samples, rng, boxes)
         value = sigma_agreement(within, between)
         if not math.isnan(value):
             sigmas.append(value)
@@ -291,7 +291,10 @@ class InstanceDisplayRenderer:
         Process a file using the format handler system.
 
         If the data is a file path and a format handler is available,
-        extract the content and return FormatOutput data.
+        extract the content and return FormatOutput data. Extraction goes
+        through the shared extraction cache when the server has set one up,
+        so revisiting a document (or opening one the look-ahead already
+        extracted) does not run the handler again.
 
         Args:
             file_path: Path to the file to process
@@ -304,51 +307,41 @@ class InstanceDisplayRenderer:
         """
         try:
             from potato.format_handlers import format_handler_registry
+            from potato.format_handlers.extraction_cache import get_extraction_cache
         except ImportError:
             # Format handlers not available, return original data
             logger.debug("Format handlers not available, using raw file path")
             return file_path
 
-        # Check if the file path should be processed
-        # For PDFs, we typically use client-side rendering with PDF.js
-        # unless explicitly configured for server-side extraction
-        display_options = field.get("display_options", {})
+        job = self._format_job(file_path, display_type, field)
+        if job is None:
+            return file_path
+        kind, path, options = job
+        cache = get_extraction_cache()
 
-        if display_type == "pdf":
-            # Link mode renders the visual PDF client-side (PDF.js). For scanned /
-            # image-only PDFs the client text layer is empty, so when OCR is
-            # enabled we extract per-page words server-side and hand them to the
-            # client to build a selectable text layer. The original path/URL is
-            # kept as source_path so PDF.js still renders the page image.
-            if display_options.get("annotation_mode") == "link" and display_options.get("ocr"):
-                local_path = self._resolve_local_pdf_path(file_path)
-                try:
+        if kind == "ocr_words":
+            try:
+                if cache is not None:
+                    ocr_pages = cache.words_by_page(path, options)
+                else:
                     from potato.format_handlers.pdf_handler import PDFHandler
-                    ocr_pages = PDFHandler().extract_words_by_page(local_path, {
-                        "ocr": display_options.get("ocr"),
-                        "ocr_dpi": display_options.get("ocr_dpi", 200),
-                        "ocr_lang": display_options.get("ocr_lang", "eng"),
-                        "max_pages": display_options.get("max_pages"),
-                    })
-                    return {"source_path": file_path, "ocr_pages": ocr_pages}
-                except Exception as e:
-                    logger.warning(f"PDF OCR word extraction failed for {file_path}: {e}")
-                    return file_path
-
-            # By default, PDFs use client-side rendering (return path as-is)
-            # If server_extract is set, use the format handler
-            if not display_options.get("server_extract", False):
+                    ocr_pages = PDFHandler().extract_words_by_page(path, options)
+                return {"source_path": file_path, "ocr_pages": ocr_pages}
+            except Exception as e:
+                logger.warning(f"PDF OCR word extraction failed for {file_path}: {e}")
                 return file_path
 
         # Check if format handler can handle this file
-        if not format_handler_registry.can_handle(file_path):
+        if not format_handler_registry.can_handle(path):
             logger.debug(f"No format handler for {file_path}, using raw data")
             return file_path
 
         try:
             # Extract content using format handler
-            extraction_options = display_options.get("extraction_options", {})
-            output = format_handler_registry.extract(file_path, options=extraction_options)
+            if cache is not None:
+                output = cache.extract(path, options)
+            else:
+                output = format_handler_registry.extract(path, options=options)
 
             # Return as dict for the display renderer
             return {
@@ -363,6 +356,84 @@ class InstanceDisplayRenderer:
             logger.warning(f"Format handler extraction failed for {file_path}: {e}")
             return file_path
 
+    def _format_job(
+        self,
+        file_path: str,
+        display_type: str,
+        field: Dict[str, Any]
+    ) -> Optional[tuple]:
+        """
+        Work out which extraction a format field needs.
+
+        Returns:
+            ``("ocr_words" | "extract", path, options)`` in the form the
+            extraction cache takes, or None when the value is passed to the
+            display untouched
+        """
+        # For PDFs, we typically use client-side rendering with PDF.js
+        # unless explicitly configured for server-side extraction
+        display_options = field.get("display_options", {})
+
+        if display_type == "pdf":
+            # Link mode renders the visual PDF client-side (PDF.js). For scanned /
+            # image-only PDFs the client text layer is empty, so when OCR is
+            # enabled we extract per-page words server-side and hand them to the
+            # client to build a selectable text layer. The original path/URL is
+            # kept as source_path so PDF.js still renders the page image.
+            if display_options.get("annotation_mode") == "link" and display_options.get("ocr"):
+                return ("ocr_words", self._resolve_local_pdf_path(file_path), {
+                    "ocr": display_options.get("ocr"),
+                    "ocr_dpi": display_options.get("ocr_dpi", 200),
+                    "ocr_lang": display_options.get("ocr_lang", "eng"),
+                    "max_pages": display_options.get("max_pages"),
+                })
+
+            # By default, PDFs use client-side rendering (return path as-is)
+            # If server_extract is set, use the format handler
+            if not display_options.get("server_extract", False):
+                return None
+
+        return ("extract", file_path, display_options.get("extraction_options", {}))
+
+    def queue_prefetch(self, instances: List[Dict[str, Any]]) -> int:
+        """
+        Queue the format fields of upcoming instances for background extraction.
+
+        Only fields whose page view would run a format handler are queued;
+        a no-op when the server has no extraction cache.
+
+        Args:
+            instances: Instance data dictionaries, in the order they will be shown
+
+        Returns:
+            Number of extraction jobs queued
+        """
+        try:
+            from potato.format_handlers import format_handler_registry
+            from potato.format_handlers.extraction_cache import get_extraction_cache
+        except ImportError:
+            return 0
+        cache = get_extraction_cache()
+        if cache is None:
+            return 0
+
+        format_display_types = ["pdf", "document", "spreadsheet", "code"]
+        jobs = []
+        for instance_data in instances:
+            for field in self.fields:
+                data = instance_data.get(field.get("key"))
+                if field.get("type") not in format_display_types or not isinstance(data, str):
+                    continue
+                job = self._format_job(data, field["type"], field)
+                if job is None:
+                    continue
+                if job[0] == "extract" and not format_handler_registry.can_handle(job[1]):
+                    continue
+                jobs.append(job)
+        if jobs:
+            cache.queue_prefetch(jobs)
+        return len(jobs)
+
     def _resolve_local_pdf_path(self, value: str) -> str:
         """
         Map a PDF field value to a local filesystem path for server-side OCR.
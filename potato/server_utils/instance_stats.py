@@ -0,0 +1,429 @@
+"""
+Materialized per-instance statistics for the admin Instances tab.
+
+AdminDashboard.get_instances_data() used to build a row for every item,
+aggregate every annotator's labels, timings and AI usage, sort the whole list
+and then return one page of 25. InstanceStatsTable keeps those rows between
+requests instead:
+
+- Each row holds the per-annotator contributions it was built from, so when
+  one annotator's state changes only that annotator's instances are redone.
+- Rows sit in sorted indexes, one per supported ``sort_by`` key and
+  direction, split by the completion filter. A page is a slice of one index,
+  and re-positioning a changed row is a bisect in each index it appears in.
+
+The item manager reports annotator registrations and releases, and the user
+manager reports every user it creates, loads, saves or moves between phases.
+A save that names its instances (every annotation save does) is applied as it
+happens: that annotator's share of those instances is re-read and the rows are
+re-positioned, so a page read is only a slice of an index. Changes that can't
+be narrowed to instances -- a new or reloaded user, a phase move -- are
+recorded as dirty and redo that user's instances on the next read. Writes
+that bypass both managers are picked up by a full rebuild every
+FULL_REBUILD_INTERVAL_SECONDS.
+
+Sort order matches the list sort it replaces: ties keep item order in both
+directions, and an unknown ``sort_by`` returns items in item order.
+"""
+
+import bisect
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+FULL_REBUILD_INTERVAL_SECONDS = 300.0
+
+SORT_KEYS = ("annotation_count", "completion_percentage", "disagreement", "id", "average_time")
+
+# Key used for an unrecognised sort_by: plain item order.
+_POSITION_KEY = "_position"
+
+_PARTITIONS = ("all", "completed", "incomplete")
+
+# One annotator's contribution to one instance: label names in storage order,
+# seconds spent (None when untimed) and the number of AI-assistance uses.
+Contribution = Tuple[List[str], Optional[float], int]
+
+
+@dataclass
+class InstanceStatsRow:
+    """Aggregated statistics for one instance."""
+    instance_id: str
+    position: int
+    annotation_count: int = 0
+    completion_percentage: float = 0.0
+    most_frequent_label: Optional[str] = None
+    label_disagreement: float = 0.0
+    average_time_per_annotation: Optional[float] = None
+    num_ai_instance: int = 0
+    contributions: Dict[str, Contribution] = field(default_factory=dict)
+    index_keys: List[Tuple[Tuple[str, str, str], tuple]] = field(default_factory=list)
+
+    @property
+    def completed(self) -> bool:
+        return self.completion_percentage >= 100
+
+
+class _SortedIndex:
+    """A sorted list of key tuples; bisect to update, slice to page."""
+
+    def __init__(self):
+        self._keys: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: tuple) -> None:
+        bisect.insort(self._keys, key)
+
+    def remove(self, key: tuple) -> None:
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def slice(self, start: int, end: int, reverse: bool = False) -> List[tuple]:
+        if not reverse:
+            return self._keys[start:end]
+        n = len(self._keys)
+        return self._keys[max(0, n - end):max(0, n - start)][::-1]
+
+    def load(self, keys: List[tuple]) -> None:
+        self._keys = sorted(keys)
+
+
+class InstanceStatsTable:
+    """
+    Per-instance admin statistics kept current between requests.
+
+    Args:
+        contributions: Maps a user state to ``{instance_id: Contribution}`` for
+            every instance that user has labeled or has behavioral data for.
+        instance_contribution: Maps a user state and an instance id to that
+            user's Contribution to the instance, or None if there is none.
+        label_stats: Maps the label names on an instance, in annotator order, to
+            ``(most_frequent_label, disagreement)``.
+    """
+
+    def __init__(self,
+                 contributions: Callable[[Any], Dict[str, Contribution]],
+                 instance_contribution: Callable[[Any, str], Optional[Contribution]],
+                 label_stats: Callable[[List[str]], Tuple[Optional[str], float]]):
+        self._contributions = contributions
+        self._instance_contribution = instance_contribution
+        self._label_stats = label_stats
+
+        self._lock = threading.RLock()
+        self._syncing = False
+        # Listener callbacks queue their change under this lock and then apply
+        # the queue only if the table is free, so a save never waits behind a
+        # page read (which applies whatever is queued itself).
+        self._pending_lock = threading.Lock()
+        self._dirty_users: Set[str] = set()
+        self._dirty_pairs: Set[Tuple[str, str]] = set()
+        self._dirty_items: Set[str] = set()
+
+        self._usm = None
+        self._ism = None
+        self._max_annotations = None
+        self._built_at: Optional[float] = None
+        self._rows: Dict[str, InstanceStatsRow] = {}
+        self._user_rank: Dict[str, int] = {}
+        self._user_instances: Dict[str, Set[str]] = {}
+        self._indexes: Dict[Tuple[str, str, str], _SortedIndex] = {}
+        self._sums: Dict[str, List[float]] = {}
+
+    # ------------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------------
+
+    def user_changed(self, user_id: str, instance_ids: Optional[Tuple[str, ...]] = None) -> None:
+        """Listener for UserStateManager: ``user_id``'s state may have changed.
+
+        With ``instance_ids`` only those instances are redone, now; without,
+        every instance of the user is, on the next read.
+        """
+        with self._pending_lock:
+            if instance_ids is None:
+                self._dirty_users.add(user_id)
+                return
+            self._dirty_pairs.update((user_id, i) for i in instance_ids)
+        self._apply_if_idle()
+
+    def item_changed(self, instance_id: str) -> None:
+        """Listener for ItemStateManager: ``instance_id``'s annotators changed."""
+        with self._pending_lock:
+            self._dirty_items.add(instance_id)
+
+    def _apply_if_idle(self) -> None:
+        """Apply queued instance changes unless a read holds the table.
+
+        Never blocks: the managers call listeners while holding their own
+        locks, and a read holding the table may be waiting on those.
+        """
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._built_at is not None and not self._syncing:
+                self._apply_pending(users=False)
+        finally:
+            self._lock.release()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def page(self, usm, ism, max_annotations: int, page: int, page_size: int,
+             sort_by: str, sort_order: str,
+             filter_completion: Optional[str]) -> Tuple[List[InstanceStatsRow], int, Dict[str, Any]]:
+        """
+        Return one page of rows, the filtered row count and the summary block.
+
+        Args:
+            usm, ism: The current user and item state managers
+            max_annotations: ``max_annotations_per_item`` from the config
+            page, page_size: 1-based page number and rows per page
+            sort_by, sort_order, filter_completion: As for get_instances_data
+        """
+        with self._lock:
+            self._syncing = True
+            try:
+                self._sync(usm, ism, max_annotations)
+            finally:
+                self._syncing = False
+
+            partition = filter_completion if filter_completion in ("completed", "incomplete") else "all"
+            descending = sort_order.lower() == "desc"
+            # Numeric keys have a separate descending index, because reading
+            # the ascending one backwards would also reverse ties. Ids are
+            # unique, so the id index is simply read backwards.
+            reverse = False
+            if sort_by not in SORT_KEYS:
+                index_id = (partition, _POSITION_KEY, "asc")
+            elif sort_by == "id":
+                index_id = (partition, "id", "asc")
+                reverse = descending
+            else:
+                index_id = (partition, sort_by, "desc" if descending else "asc")
+
+            index = self._indexes[index_id]
+            start = max(0, (page - 1) * page_size)
+            keys = index.slice(start, start + page_size, reverse=reverse)
+            rows = [self._rows[k[-1]] for k in keys]
+            return rows, len(index), self._summary(partition)
+
+    def _summary(self, partition: str) -> Dict[str, Any]:
+        count, annotation_sum, disagreement_sum = self._sums[partition]
+        count = int(count)
+        if partition == "all":
+            completed = int(self._sums["completed"][0])
+        else:
+            completed = count if partition == "completed" else 0
+        return {
+            "completed_instances": completed,
+            "incomplete_instances": count - completed,
+            "average_annotations_per_instance": round(annotation_sum / count, 1) if count else 0,
+            "average_disagreement": round(disagreement_sum / count, 2) if count else 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _sync(self, usm, ism, max_annotations: int) -> None:
+        """Apply pending changes, or rebuild if incremental upkeep can't be trusted."""
+        if (usm is not self._usm or ism is not self._ism
+                or max_annotations != self._max_annotations
+                or ism.item_count() != len(self._rows)
+                or self._built_at is None
+                or time.monotonic() - self._built_at >= FULL_REBUILD_INTERVAL_SECONDS):
+            self._rebuild(usm, ism, max_annotations)
+            return
+        self._apply_pending(users=True)
+
+    def _apply_pending(self, users: bool) -> None:
+        """Apply queued changes; whole-user changes only when ``users`` is set."""
+        with self._pending_lock:
+            dirty_users: Set[str] = set()
+            if users:
+                dirty_users, self._dirty_users = self._dirty_users, set()
+            dirty_pairs, self._dirty_pairs = self._dirty_pairs, set()
+            dirty_items, self._dirty_items = self._dirty_items, set()
+
+        if any(user_id not in self._user_rank
+               for user_id in dirty_users | {u for u, _ in dirty_pairs}):
+            # Rank new users in manager order; only user creation gets here.
+            for user_id in self._usm.get_user_ids():
+                self._user_rank.setdefault(user_id, len(self._user_rank))
+        for user_id in dirty_users:
+            dirty_items |= self._apply_user(user_id)
+        for user_id, instance_id in dirty_pairs:
+            if user_id not in dirty_users and self._apply_pair(user_id, instance_id):
+                dirty_items.add(instance_id)
+        for instance_id in dirty_items:
+            row = self._rows.get(instance_id)
+            if row is not None:
+                self._unindex(row)
+                self._recompute(row)
+                self._index(row)
+
+    def _rebuild(self, usm, ism, max_annotations: int) -> None:
+        """Recompute every row from the managers and reload the indexes."""
+        if usm is not self._usm:
+            usm.add_change_listener(self.user_changed)
+        if ism is not self._ism:
+            ism.add_annotator_listener(self.item_changed)
+        with self._pending_lock:
+            self._dirty_users.clear()
+            self._dirty_pairs.clear()
+            self._dirty_items.clear()
+
+        self._usm, self._ism, self._max_annotations = usm, ism, max_annotations
+        self._rows = {
+            item.get_id(): InstanceStatsRow(item.get_id(), position)
+            for position, item in enumerate(ism.items())
+        }
+        self._user_rank = {}
+        self._user_instances = {}
+        for user_id in usm.get_user_ids():
+            self._user_rank[user_id] = len(self._user_rank)
+            user_state = usm.get_user_state(user_id)
+            if not user_state:
+                continue
+            touched = set()
+            for instance_id, contribution in self._contributions(user_state).items():
+                row = self._rows.get(instance_id)
+                if row is not None:
+                    row.contributions[user_id] = contribution
+                    touched.add(instance_id)
+            self._user_instances[user_id] = touched
+
+        index_keys: Dict[Tuple[str, str, str], List[tuple]] = {}
+        for row in self._rows.values():
+            self._recompute(row)
+            row.index_keys = self._keys_for(row)
+            for index_id, key in row.index_keys:
+                index_keys.setdefault(index_id, []).append(key)
+        self._indexes = {}
+        for partition in _PARTITIONS:
+            for key in SORT_KEYS + (_POSITION_KEY,):
+                for direction in ("asc", "desc"):
+                    index = _SortedIndex()
+                    index.load(index_keys.get((partition, key, direction), []))
+                    self._indexes[(partition, key, direction)] = index
+
+        self._sums = {}
+        for partition in _PARTITIONS:
+            rows = [r for r in self._rows.values()
+                    if partition == "all" or (r.completed == (partition == "completed"))]
+            self._sums[partition] = [
+                len(rows),
+                sum(r.annotation_count for r in rows),
+                math.fsum(r.label_disagreement for r in rows),
+            ]
+        self._built_at = time.monotonic()
+
+    def _apply_user(self, user_id: str) -> Set[str]:
+        """Replace ``user_id``'s contributions; return the instances whose share changed."""
+        user_state = self._usm.get_user_state(user_id)
+        contributions = self._contributions(user_state) if user_state else {}
+        self._user_rank.setdefault(user_id, len(self._user_rank))
+
+        before = self._user_instances.pop(user_id, set())
+        after = set()
+        changed = set()
+        for instance_id, contribution in contributions.items():
+            row = self._rows.get(instance_id)
+            if row is None:
+                continue
+            after.add(instance_id)
+            if row.contributions.get(user_id) != contribution:
+                row.contributions[user_id] = contribution
+                changed.add(instance_id)
+        for instance_id in before - after:
+            self._rows[instance_id].contributions.pop(user_id, None)
+            changed.add(instance_id)
+        self._user_instances[user_id] = after
+        return changed
+
+    def _apply_pair(self, user_id: str, instance_id: str) -> bool:
+        """Replace ``user_id``'s contribution to one instance; True if it changed."""
+        row = self._rows.get(instance_id)
+        if row is None:
+            return False
+        user_state = self._usm.get_user_state(user_id)
+        contribution = self._instance_contribution(user_state, instance_id) if user_state else None
+        self._user_rank.setdefault(user_id, len(self._user_rank))
+        instances = self._user_instances.setdefault(user_id, set())
+        if contribution is None:
+            instances.discard(instance_id)
+            return row.contributions.pop(user_id, None) is not None
+        instances.add(instance_id)
+        if row.contributions.get(user_id) == contribution:
+            return False
+        row.contributions[user_id] = contribution
+        return True
+
+    def _recompute(self, row: InstanceStatsRow) -> None:
+        annotators = self._ism.get_annotators_for_item(row.instance_id)
+        row.annotation_count = len(annotators) if annotators else 0
+        if self._max_annotations > 0:
+            row.completion_percentage = min(100, (row.annotation_count / self._max_annotations) * 100)
+        else:
+            row.completion_percentage = 100 if row.annotation_count > 0 else 0
+
+        # Labels are concatenated in user order, as the full aggregation did,
+        # so ties in the modal label resolve the same way.
+        labels: List[str] = []
+        total_seconds, timed, ai_count = 0.0, 0, 0
+        for user_id in sorted(row.contributions, key=lambda u: self._user_rank.get(u, 0)):
+            names, seconds, ai = row.contributions[user_id]
+            labels.extend(names)
+            ai_count += ai
+            if seconds is not None:
+                total_seconds += seconds
+                timed += 1
+        row.most_frequent_label, row.label_disagreement = self._label_stats(labels)
+        row.average_time_per_annotation = total_seconds / timed if timed else None
+        row.num_ai_instance = ai_count
+
+    def _keys_for(self, row: InstanceStatsRow) -> List[Tuple[Tuple[str, str, str], tuple]]:
+        values = {
+            "annotation_count": row.annotation_count,
+            "completion_percentage": row.completion_percentage,
+            "disagreement": row.label_disagreement,
+            "average_time": row.average_time_per_annotation or 0,
+        }
+        pos, iid = row.position, row.instance_id
+        keys = []
+        for partition in ("all", "completed" if row.completed else "incomplete"):
+            for name, value in values.items():
+                keys.append(((partition, name, "asc"), (value, pos, iid)))
+                keys.append(((partition, name, "desc"), (-value, pos, iid)))
+            keys.append(((partition, "id", "asc"), (iid, pos, iid)))
+            keys.append(((partition, _POSITION_KEY, "asc"), (pos, iid)))
+        return keys
+
+    def _index(self, row: InstanceStatsRow) -> None:
+        row.index_keys = self._keys_for(row)
+        for index_id, key in row.index_keys:
+            self._indexes[index_id].add(key)
+        for partition in ("all", "completed" if row.completed else "incomplete"):
+            sums = self._sums[partition]
+            sums[0] += 1
+            sums[1] += row.annotation_count
+            sums[2] += row.label_disagreement
+
+    def _unindex(self, row: InstanceStatsRow) -> None:
+        for index_id, key in row.index_keys:
+            self._indexes[index_id].remove(key)
+        for partition in ("all", "completed" if row.completed else "incomplete"):
+            sums = self._sums[partition]
+            sums[0] -= 1
+            sums[1] -= row.annotation_count
+            sums[2] -= row.label_disagreement
+        row.index_keys = []
@@ -284,14 +284,18 @@ def run_judge_batch(config: Dict[str, Any], users: List[str],
         if max_per_schema:
             ids = ids[:max_per_schema]
         examples = _few_shot_examples(schema_name, use_few_shot, few_shot_cfg)
+        texts = []
         for iid in ids:
             try:
                 item = ism.get_item(iid)
-                text = item.get_text() if item else ""
+                texts.append(item.get_text() if item else "")
             except Exception:
-                text = ""
-            shots = [e for e in examples if e.get("id") != iid] or None
-            pred = service.judge_instance(iid, schema, text, few_shot_examples=shots)
+                texts.append("")
+        # Batches of judge_alignment.batch_size per request (default 1);
+        # examples never include an item from the request being judged.
+        preds = service.judge_instances(list(zip(ids, texts)), schema,
+                                        few_shot_examples=examples)
+        for pred in preds:
             if pred is None:
                 n_failed += 1
                 continue
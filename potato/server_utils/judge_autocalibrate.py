@@ -122,14 +122,22 @@ def autocalibrate(
             ids = ids[:max_per_schema]
 
         judged = 0
-        for iid in ids:
-            text = _instance_text(ism, iid)
-            # Leakage guard: never show the judge a correction for the very
-            # instance it is grading.
-            shots = [c for c in sch_corr if c["id"] != iid] or None
-            pred = service.judge_instance(iid, schema, text,
-                                          few_shot_examples=shots,
-                                          prompt_version=new_version)
+        if getattr(service, "batch_size", 1) > 1:
+            # Batched: judge_instances() applies the same leakage guard per request.
+            preds = service.judge_instances(
+                [(iid, _instance_text(ism, iid)) for iid in ids], schema,
+                few_shot_examples=sch_corr, prompt_version=new_version)
+        else:
+            preds = []
+            for iid in ids:
+                text = _instance_text(ism, iid)
+                # Leakage guard: never show the judge a correction for the very
+                # instance it is grading.
+                shots = [c for c in sch_corr if c["id"] != iid] or None
+                preds.append(service.judge_instance(iid, schema, text,
+                                                    few_shot_examples=shots,
+                                                    prompt_version=new_version))
+        for pred in preds:
             if pred is not None:
                 ja.save_prediction(config, pred)
                 judged += 1
@@ -0,0 +1,266 @@
+"""
+Single-pass matching for keyword highlight lexicons.
+
+get_keyword_highlights() used to run every lexicon entry's regex over the
+instance text in turn, so a 5,000-term lexicon meant 5,000 scans per page
+view. KeywordMatcher compiles the whole lexicon into one Aho-Corasick
+automaton and walks the text once:
+
+- Literal terms (``word``) and prefix terms (``word*``) are keys in the
+  automaton. Each occurrence is confirmed with the term's own regex at that
+  position, which applies the word boundaries and extends prefix matches, so
+  spans are exactly what ``regex.finditer`` would have produced.
+- Other wildcard terms (``*word``, ``wo*rd``) put their longest literal piece
+  in the automaton as an anchor. A match has to contain its anchor, and
+  wildcards only cover word characters, so the term's regex is only tried at
+  the few positions before each anchor occurrence where a match could start.
+  A single alternation regex would not do here: ``re`` reports one
+  alternative per position, while each term must report its own matches,
+  overlaps included.
+
+Matching is case-insensitive the way ``re.IGNORECASE`` is: text and terms are
+lower-cased character by character, and characters ``re`` treats as equal
+under case-insensitivity (``s``/``ſ``, the Greek sigmas, ...) are folded to
+one representative.
+
+Matches depend only on the text, so ``find_cached`` keeps them per instance
+for every user; randomization and colors are applied by the caller.
+"""
+
+import bisect
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Instances whose matches are kept by find_cached().
+MATCH_CACHE_SIZE = 4096
+
+# (pattern index, start, end)
+Match = Tuple[int, int, int]
+
+_NON_WORD = re.compile(r"\W")
+
+
+def compile_keyword_pattern(term: str) -> "re.Pattern":
+    """
+    Compile a lexicon term to its case-insensitive regex.
+
+    ``*`` matches any run of word characters. A term that starts (ends) with
+    ``*`` has no word boundary at its start (end); every other term must
+    match whole words.
+    """
+    pattern = re.escape(term).replace(r"\*", r"\w*")
+    if not term.startswith("*"):
+        pattern = r"\b" + pattern
+    if not term.endswith("*"):
+        pattern = pattern + r"\b"
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _build_fold_table() -> Dict[int, str]:
+    """Map characters ``re`` matches case-insensitively to one representative."""
+    try:
+        from re._casefix import _EXTRA_CASES
+    except ImportError:  # Python < 3.11 keeps the table in sre_compile
+        try:
+            from sre_compile import _ignorecase_fixes as _EXTRA_CASES
+        except ImportError:
+            return {}
+    table = {}
+    for code, others in _EXTRA_CASES.items():
+        group = [code, *others]
+        representative = chr(min(group))
+        for member in group:
+            if chr(member) != representative:
+                table[member] = representative
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+
+
+def fold_case(text: str) -> str:
+    """Lower-case ``text`` without changing its length, as ``re.IGNORECASE`` compares."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters lower-case to two (U+0130); keep the first.
+        lowered = "".join(c.lower()[:1] for c in text)
+    return lowered.translate(_FOLD_TABLE) if _FOLD_TABLE else lowered
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a set of string keys.
+
+    ``iter(text)`` yields ``(start, key_id)`` for every occurrence of every
+    key, overlapping ones included, in order of where they end.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]  # (key id, key length)
+
+        for key_id, key in enumerate(keys):
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((key_id, len(key)))
+
+        # Breadth-first failure links; each state inherits its fallback's outputs.
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text: str):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for key_id, length in out[state]:
+                    yield end - length, key_id
+
+
+class KeywordMatcher:
+    """
+    Matches a keyword highlight lexicon against text in one pass.
+
+    Args:
+        patterns: The entries built by ``load_highlights_data``: dicts with
+            ``pattern`` (the lexicon term, ``*`` wildcards allowed) and
+            ``regex`` (its compiled, case-insensitive regex).
+    """
+
+    def __init__(self, patterns: Sequence[Dict[str, Any]]):
+        self.patterns = list(patterns)
+        keys: List[str] = []
+        key_ids: Dict[str, int] = {}
+        # key id -> [(pattern index, reach)]. A match of the pattern contains
+        # the key, with ``reach`` literal characters of the term before it;
+        # reach is None when the term starts with the key (literal and prefix
+        # terms), so matches start where the key does.
+        self._key_patterns: List[List[Tuple[int, Optional[int]]]] = []
+        # Terms with no literal piece at all ("*") are always scanned.
+        self._always: Set[int] = set()
+
+        for index, info in enumerate(self.patterns):
+            term = info.get("pattern", "")
+            pieces = term.split("*")
+            anchor = max(range(len(pieces)), key=lambda k: len(pieces[k]))
+            key = fold_case(pieces[anchor])
+            if not key:
+                self._always.add(index)
+                continue
+            if key not in key_ids:
+                key_ids[key] = len(keys)
+                keys.append(key)
+                self._key_patterns.append([])
+            reach = sum(len(piece) for piece in pieces[:anchor]) if anchor else None
+            self._key_patterns[key_ids[key]].append((index, reach))
+
+        self._automaton = AhoCorasick(keys)
+        self._cache: "OrderedDict[str, Tuple[str, List[Match]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def find(self, text: str) -> List[Match]:
+        """
+        Every match of every term, as ``(pattern index, start, end)``.
+
+        Ordered by pattern, then by position -- the order a loop running each
+        term's ``regex.finditer`` over ``text`` would produce them in.
+        """
+        # pattern index -> {(key position, reach)}
+        hits: Dict[int, Set[Tuple[int, Optional[int]]]] = {}
+        for position, key_id in self._automaton.iter(fold_case(text)):
+            for index, reach in self._key_patterns[key_id]:
+                hits.setdefault(index, set()).add((position, reach))
+
+        matches: List[Match] = []
+        nonword: Optional[List[int]] = None
+        for index in sorted(hits.keys() | self._always):
+            regex = self.patterns[index]["regex"]
+            if index in self._always:
+                matches.extend((index, m.start(), m.end()) for m in regex.finditer(text))
+                continue
+
+            candidates = set()
+            for position, reach in hits[index]:
+                if reach is None:
+                    candidates.add(position)
+                    continue
+                # Before the key, a match holds ``reach`` literal characters
+                # and runs of \w, so it starts after the (reach + 1)-th
+                # non-word character preceding the key.
+                if nonword is None:
+                    nonword = [m.start() for m in _NON_WORD.finditer(text)]
+                i = bisect.bisect_left(nonword, position) - reach - 1
+                candidates.update(range(nonword[i] + 1 if i >= 0 else 0, position + 1))
+
+            # finditer semantics: leftmost match, then resume at its end.
+            resume = 0
+            for start in sorted(candidates):
+                if start < resume:
+                    continue
+                m = regex.match(text, start)
+                if m is not None:
+                    matches.append((index, start, m.end()))
+                    resume = m.end()
+        return matches
+
+    def find_cached(self, key: str, text: str) -> List[Match]:
+        """``find(text)``, remembered under ``key`` (an instance id) for all users."""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == text:
+                self._cache.move_to_end(key)
+                return cached[1]
+        matches = self.find(text)
+        with self._cache_lock:
+            self._cache[key] = (text, matches)
+            self._cache.move_to_end(key)
+            while len(self._cache) > MATCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return matches
+
+
+_matcher: Optional[KeywordMatcher] = None
+_matcher_terms: Tuple[int, ...] = ()
+_matcher_lock = threading.Lock()
+
+
+def get_keyword_matcher(patterns: Sequence[Dict[str, Any]]) -> KeywordMatcher:
+    """
+    The compiled matcher for ``patterns``, rebuilt when the lexicon changes.
+
+    The lexicon is the shared list ``load_highlights_data`` fills in place, so
+    the matcher is keyed on the identity of its entries.
+    """
+    global _matcher, _matcher_terms
+    terms = tuple(id(p) for p in patterns)
+    with _matcher_lock:
+        if _matcher is None or terms != _matcher_terms:
+            _matcher = KeywordMatcher(patterns)
+            _matcher_terms = terms
+            logger.debug(f"Compiled keyword matcher for {len(terms)} patterns")
+        return _matcher
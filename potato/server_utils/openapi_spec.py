@@ -53,6 +53,8 @@ OPTIONAL_BLUEPRINTS: List[Tuple[str, str, str]] = [
     ("potato.automation.routes", "automation_bp", "automation.enabled: true"),
     ("potato.curation.routes", "curation_bp", "curation.enabled: true"),
     ("potato.arena.routes", "arena_bp", "arena.enabled: true"),
+    ("potato.instrumentation.routes", "instrumentation_bp",
+     "instrumentation.enabled: true"),
     ("potato.event_registry.routes", "event_registry_bp",
      "event_template.enabled: true or corpus_map.enabled: true"),
     ("potato.corpus_map.routes", "corpus_map_bp", "corpus_map.enabled: true"),
@@ -6,17 +6,152 @@ used by BOTH the admin dashboard overview and the (opt-in, read-only)
 annotator-facing progress dashboard. Keeping one implementation avoids a second
 copy of the math that could silently drift from the admin numbers.
 
+The project totals are kept as running counters rather than recomputed by
+walking every user and item on each request: ItemStateManager maintains
+ItemProgressCounters as annotators are registered and reclaimed, and
+UserStateManager maintains UserProgressCounters by recounting only the users
+whose state changed since the last read. compute_project_progress() is then
+O(1) in the number of items and users. Because the counters can only be as
+complete as the hooks that feed them, a full recompute runs every
+FULL_RECOMPUTE_INTERVAL_SECONDS; it replaces the counters and logs any drift.
+
 Imports of the state managers are done lazily inside the functions to avoid
 import-time circular dependencies with potato.flask_server.
 """
 
-from typing import Any, Dict, Optional
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How often compute_project_progress() cross-checks the running counters with a
+# full walk over users and items.
+FULL_RECOMPUTE_INTERVAL_SECONDS = 300.0
+
+_last_full_recompute: Optional[float] = None
+_recompute_lock = threading.Lock()
+
+
+class ItemProgressCounters:
+    """
+    Running totals over ItemStateManager.instance_annotators.
+
+    ``items_with_annotations`` counts items with at least one annotator and
+    ``total_assignments`` counts (item, annotator) pairs. The item manager
+    reports every add and remove; the counters never look at the items.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.items_with_annotations = 0
+        self.total_assignments = 0
+
+    def annotator_added(self, first_for_item: bool) -> None:
+        """Record a new (item, annotator) pair."""
+        with self._lock:
+            self.total_assignments += 1
+            if first_for_item:
+                self.items_with_annotations += 1
+
+    def annotator_removed(self, last_for_item: bool) -> None:
+        """Record that an (item, annotator) pair was released."""
+        with self._lock:
+            self.total_assignments -= 1
+            if last_for_item:
+                self.items_with_annotations -= 1
+
+    def reset(self, items_with_annotations: int = 0, total_assignments: int = 0) -> None:
+        """Replace the totals, e.g. after a clear or a full recompute."""
+        with self._lock:
+            self.items_with_annotations = items_with_annotations
+            self.total_assignments = total_assignments
+
+    def snapshot(self) -> Tuple[int, int]:
+        """Return ``(items_with_annotations, total_assignments)``."""
+        with self._lock:
+            return self.items_with_annotations, self.total_assignments
+
+
+class UserProgressCounters:
+    """
+    Running totals over the users known to UserStateManager.
+
+    Tracks the total annotation count and the number of users in each phase.
+    The user manager marks a user dirty whenever it creates, loads, saves or
+    moves that user between phases; ``refresh()`` recounts just those users, so
+    a read costs O(users changed since the last read) rather than O(users).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._per_user: Dict[str, Tuple[int, Optional[str]]] = {}
+        self._dirty = set()
+        self.total_annotations = 0
+        self.phase_counts: Counter = Counter()
+
+    def mark_dirty(self, user_id: str) -> None:
+        """Schedule ``user_id`` to be recounted on the next refresh."""
+        with self._lock:
+            self._dirty.add(user_id)
+
+    def known_user_count(self) -> int:
+        """Number of users the counters currently account for."""
+        with self._lock:
+            return len(self._per_user) + len(self._dirty - self._per_user.keys())
+
+    def refresh(self, get_state: Callable[[str], Any]) -> None:
+        """Recount the dirty users, looking each up with ``get_state``."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for user_id in dirty:
+                self._set_user(user_id, get_state(user_id))
+
+    def rebuild(self, states: Iterable[Tuple[str, Any]]) -> None:
+        """Recount every user from scratch."""
+        with self._lock:
+            self._per_user.clear()
+            self._dirty.clear()
+            self.total_annotations = 0
+            self.phase_counts = Counter()
+            for user_id, user_state in states:
+                self._set_user(user_id, user_state)
+
+    def reset(self) -> None:
+        """Forget every user."""
+        self.rebuild(())
+
+    def snapshot(self) -> Tuple[int, Dict[str, int]]:
+        """Return ``(total_annotations, users_per_phase)``."""
+        with self._lock:
+            return self.total_annotations, dict(self.phase_counts)
+
+    def _set_user(self, user_id: str, user_state: Any) -> None:
+        old_count, old_phase = self._per_user.pop(user_id, (0, None))
+        self.total_annotations -= old_count
+        if old_phase is not None:
+            self.phase_counts[old_phase] -= 1
+            if not self.phase_counts[old_phase]:
+                del self.phase_counts[old_phase]
+        if user_state is None:
+            return
+        count = user_state.get_annotation_count()
+        phase = _phase_name(user_state)
+        self._per_user[user_id] = (count, phase)
+        self.total_annotations += count
+        if phase is not None:
+            self.phase_counts[phase] += 1
 
 
 def compute_project_progress() -> Dict[str, Any]:
     """
     Compute project-wide aggregate progress.
 
+    Reads the running counters kept by the item and user managers; see the
+    module docstring for how they stay current.
+
     Returns a dict with:
         total_items: number of items in the project
         items_with_annotations: items that have >=1 annotator
@@ -25,31 +160,19 @@ def compute_project_progress() -> Dict[str, Any]:
         active_annotators: count of users currently in the ANNOTATION phase
                            (a COUNT only — never names, for annotator-facing use)
     """
-    from potato.flask_server import get_users, get_total_annotations
     from potato.item_state_management import get_item_state_manager
     from potato.user_state_management import get_user_state_manager
 
     usm = get_user_state_manager()
     ism = get_item_state_manager()
 
-    users = get_users()
-    total_annotations = get_total_annotations()
+    _maybe_full_recompute(usm, ism)
 
-    active_annotators = 0
-    for username in users:
-        user_state = usm.get_user_state(username)
-        if user_state and _phase_name(user_state) == "annotation":
-            active_annotators += 1
-
-    items = ism.items()
-    total_items = len(items)
-    items_with_annotations = 0
-    total_assignments = 0
-    for item in items:
-        annotators = ism.get_annotators_for_item(item.get_id())
-        if annotators:
-            items_with_annotations += 1
-            total_assignments += len(annotators)
+    usm.refresh_progress_counters()
+    total_annotations, users_per_phase = usm.progress_counters.snapshot()
+    active_annotators = users_per_phase.get("annotation", 0)
+    items_with_annotations, total_assignments = ism.progress_counters.snapshot()
+    total_items = ism.item_count()
 
     completion_percentage = (
         items_with_annotations / total_items * 100 if total_items > 0 else 0
@@ -98,6 +221,65 @@ def compute_personal_progress(username: str) -> Dict[str, Any]:
     }
 
 
+def recompute_progress_counters(usm=None, ism=None) -> Dict[str, Any]:
+    """
+    Rebuild the running counters with a full walk over users and items.
+
+    Logs a warning naming every counter that had drifted from the recomputed
+    value, and returns ``{counter: (was, now)}`` for those counters.
+    """
+    if usm is None or ism is None:
+        from potato.item_state_management import get_item_state_manager
+        from potato.user_state_management import get_user_state_manager
+        usm = usm or get_user_state_manager()
+        ism = ism or get_item_state_manager()
+
+    usm.refresh_progress_counters()
+    was_annotations, was_phases = usm.progress_counters.snapshot()
+    was_items, was_assignments = ism.progress_counters.snapshot()
+
+    usm.progress_counters.rebuild(
+        (user_id, usm.user_to_annotation_state.get(user_id))
+        for user_id in usm.get_user_ids()
+    )
+    items_with_annotations = 0
+    total_assignments = 0
+    for annotators in list(ism.instance_annotators.values()):
+        if annotators:
+            items_with_annotations += 1
+            total_assignments += len(annotators)
+    ism.progress_counters.reset(items_with_annotations, total_assignments)
+
+    now_annotations, now_phases = usm.progress_counters.snapshot()
+    drift = {}
+    for name, was, now in (
+        ("total_annotations", was_annotations, now_annotations),
+        ("users_per_phase", was_phases, now_phases),
+        ("items_with_annotations", was_items, items_with_annotations),
+        ("total_assignments", was_assignments, total_assignments),
+    ):
+        if was != now:
+            drift[name] = (was, now)
+    if drift:
+        logger.warning(f"Progress counters had drifted and were recomputed: {drift}")
+    return drift
+
+
+def _maybe_full_recompute(usm, ism) -> None:
+    """Run recompute_progress_counters() once per FULL_RECOMPUTE_INTERVAL_SECONDS."""
+    global _last_full_recompute
+    now = time.monotonic()
+    with _recompute_lock:
+        due = (
+            _last_full_recompute is None
+            or now - _last_full_recompute >= FULL_RECOMPUTE_INTERVAL_SECONDS
+        )
+        if due:
+            _last_full_recompute = now
+    if due:
+        recompute_progress_counters(usm, ism)
+
+
 def _phase_name(user_state) -> Optional[str]:
     """Return the user's phase as a lowercase string, robust to enum format.
 
@@ -80,6 +80,7 @@ from potato.server_utils.conditions import (  # noqa: E402
     lookup as _lookup,
     as_number as _as_number,
     matches as _matches,
+    compile_condition as _compile_condition,
 )
 
 
@@ -99,6 +100,15 @@ class TriageScorer:
         if not rules and not self.signal_field:
             rules = DEFAULT_RULES
         self.rules = rules or []
+        self._compiled = [self._compile(rule) for rule in self.rules]
+
+    @staticmethod
+    def _compile(rule):
+        try:
+            return _compile_condition(rule.get("when") or {})
+        except Exception as e:  # a malformed rule must never break loading
+            logger.warning(f"Triage rule {rule.get('name')!r} failed: {e}")
+            return lambda item_data: False
 
     def score(self, item_data: dict) -> TriageScore:
         """Return the TriageScore for one item (highest matching rule wins)."""
@@ -106,10 +116,9 @@ class TriageScorer:
             return TriageScore(priority=self.default_priority)
 
         best: TriageScore | None = None
-        for rule in self.rules:
-            cond = rule.get("when") or {}
+        for rule, predicate in zip(self.rules, self._compiled):
             try:
-                if _matches(cond, item_data):
+                if predicate(item_data):
                     pr = float(rule.get("priority", 0) or 0)
                     if best is None or pr > best.priority:
                         badge = rule.get("badge") or rule.get("name")
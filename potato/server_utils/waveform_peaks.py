@@ -0,0 +1,266 @@
+"""
+Native waveform peak generation.
+
+WaveformService shells out to BBC's ``audiowaveform`` when it is installed.
+Without it, this module produces the same kind of output in-process: PCM is
+streamed from the file in fixed-size blocks, reduced to per-pixel min/max
+peaks with NumPy, and written as Peaks.js-compatible ``.dat`` files (the
+audiowaveform binary format, version 1). Memory use depends on the block
+size, not on the length of the recording, so multi-hour files are fine.
+
+Decoding uses the stdlib ``wave`` module for PCM WAV files and
+``soundfile`` (libsndfile: FLAC, OGG, most WAV variants, MP3 on recent
+builds) when it is installed.
+
+Besides the base resolution, coarser levels of the pyramid are derived from
+the base peaks -- each level's min/max is the min/max of the finer level's
+pixels, so the result is exactly what a direct pass at that resolution
+would give -- and written next to the base file (see ``level_path``).
+
+``generate_peaks`` is a plain module-level function so WaveformService can
+run it in a process pool.
+"""
+
+import logging
+import os
+import struct
+import wave
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Frames read per block; ~24 s of audio at 44.1 kHz.
+BLOCK_FRAMES = 1 << 20
+
+# audiowaveform .dat format, version 1 header:
+# version, flags (bit 0 set = 8-bit data), sample rate, samples per pixel, length
+DAT_VERSION = 1
+_DAT_HEADER = struct.Struct("<iIiiI")
+
+_INT16_MIN = np.iinfo(np.int16).min
+_INT16_MAX = np.iinfo(np.int16).max
+
+
+def can_decode(audio_path: str) -> bool:
+    """Whether the native generator can be expected to read ``audio_path``."""
+    if SOUNDFILE_AVAILABLE:
+        return True
+    return os.path.splitext(audio_path)[1].lower() in (".wav", ".wave")
+
+
+def level_path(output_path: str, samples_per_pixel: int) -> str:
+    """Where a coarser pyramid level of ``output_path`` is written."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.{samples_per_pixel}{ext}"
+
+
+def _wave_blocks(audio_path: str, block_frames: int) -> Tuple[int, Iterator[np.ndarray]]:
+    """Sample rate and (frames, channels) int16 blocks of a PCM WAV file."""
+    reader = wave.open(audio_path, "rb")
+    try:
+        channels = reader.getnchannels()
+        width = reader.getsampwidth()
+        rate = reader.getframerate()
+    except Exception:
+        reader.close()
+        raise
+    if width not in (1, 2, 3, 4):
+        reader.close()
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+
+    def blocks():
+        with reader:
+            while True:
+                raw = reader.readframes(block_frames)
+                if not raw:
+                    return
+                data = np.frombuffer(raw, dtype=np.uint8)
+                if width == 1:
+                    # Unsigned 8-bit, centred on 128
+                    samples = (data.astype(np.int16) - 128) << 8
+                elif width == 2:
+                    samples = data.view("<i2")
+                elif width == 3:
+                    # Keep the top two bytes of each little-endian 24-bit sample
+                    samples = data.reshape(-1, 3)[:, 1:].copy().view("<i2")
+                else:
+                    samples = (data.view("<i4") >> 16).astype(np.int16)
+                yield samples.reshape(-1, channels)
+
+    return rate, blocks()
+
+
+def _soundfile_blocks(audio_path: str, block_frames: int) -> Tuple[int, Iterator[np.ndarray]]:
+    """Sample rate and (frames, channels) int16 blocks via libsndfile."""
+    handle = soundfile.SoundFile(audio_path)
+
+    def blocks():
+        with handle:
+            yield from handle.blocks(blocksize=block_frames, dtype="int16", always_2d=True)
+
+    return handle.samplerate, blocks()
+
+
+def read_pcm_blocks(audio_path: str, block_frames: int = BLOCK_FRAMES) -> Tuple[int, Iterator[np.ndarray]]:
+    """
+    Open ``audio_path`` for streaming.
+
+    Returns:
+        The sample rate and an iterator of int16 arrays shaped
+        (frames, channels), at most ``block_frames`` frames each
+
+    Raises:
+        ValueError: If no available decoder can read the file
+    """
+    if os.path.splitext(audio_path)[1].lower() in (".wav", ".wave"):
+        try:
+            return _wave_blocks(audio_path, block_frames)
+        except (wave.Error, EOFError, ValueError) as e:
+            # Float or WAVE_FORMAT_EXTENSIBLE data; libsndfile reads those.
+            if not SOUNDFILE_AVAILABLE:
+                raise ValueError(f"Cannot decode {audio_path}: {e}") from e
+    if not SOUNDFILE_AVAILABLE:
+        raise ValueError(f"Cannot decode {audio_path}: install soundfile for non-WAV audio")
+    try:
+        return _soundfile_blocks(audio_path, block_frames)
+    except RuntimeError as e:
+        raise ValueError(f"Cannot decode {audio_path}: {e}") from e
+
+
+def _mix_down(block: np.ndarray) -> np.ndarray:
+    """Average the channels of a (frames, channels) block into one int16 signal."""
+    if block.shape[1] == 1:
+        return block[:, 0]
+    return (block.sum(axis=1, dtype=np.int32) / block.shape[1]).astype(np.int16)
+
+
+class PeakAccumulator:
+    """
+    Per-pixel min/max of a signal fed in arbitrary-sized chunks.
+
+    Pixels are ``samples_per_pixel`` samples wide; samples left over at the
+    end of a chunk are carried into the next one, and a final partial pixel
+    is kept by ``finish``.
+    """
+
+    def __init__(self, samples_per_pixel: int):
+        if samples_per_pixel < 1:
+            raise ValueError("samples_per_pixel must be positive")
+        self.samples_per_pixel = samples_per_pixel
+        self._mins: List[np.ndarray] = []
+        self._maxs: List[np.ndarray] = []
+        self._carry = np.empty(0, dtype=np.int16)
+
+    def feed(self, samples: np.ndarray) -> None:
+        spp = self.samples_per_pixel
+        if self._carry.size:
+            samples = np.concatenate((self._carry, samples))
+        whole = samples.size - samples.size % spp
+        if whole:
+            pixels = samples[:whole].reshape(-1, spp)
+            self._mins.append(pixels.min(axis=1))
+            self._maxs.append(pixels.max(axis=1))
+        self._carry = samples[whole:].copy()
+
+    def finish(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The min and max arrays (int16), one entry per pixel."""
+        if self._carry.size:
+            self._mins.append(self._carry.min(keepdims=True))
+            self._maxs.append(self._carry.max(keepdims=True))
+            self._carry = np.empty(0, dtype=np.int16)
+        if not self._mins:
+            empty = np.empty(0, dtype=np.int16)
+            return empty, empty.copy()
+        return (np.concatenate(self._mins).astype(np.int16),
+                np.concatenate(self._maxs).astype(np.int16))
+
+
+def coarsen(mins: np.ndarray, maxs: np.ndarray, factor: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge every ``factor`` neighbouring pixels into one (the last may be partial)."""
+    pad = -mins.size % factor
+    if pad:
+        mins = np.concatenate((mins, np.full(pad, _INT16_MAX, dtype=np.int16)))
+        maxs = np.concatenate((maxs, np.full(pad, _INT16_MIN, dtype=np.int16)))
+    return mins.reshape(-1, factor).min(axis=1), maxs.reshape(-1, factor).max(axis=1)
+
+
+def write_dat(path: str, mins: np.ndarray, maxs: np.ndarray, sample_rate: int,
+              samples_per_pixel: int, bits: int = 8) -> None:
+    """
+    Write peaks as an audiowaveform/Peaks.js ``.dat`` file (version 1).
+
+    ``mins``/``maxs`` are int16 values; 8-bit output keeps their top byte.
+    The file is written beside ``path`` and renamed into place, so readers
+    never see a partial file.
+    """
+    if bits not in (8, 16):
+        raise ValueError("bits must be 8 or 16")
+    dtype = np.int8 if bits == 8 else np.dtype("<i2")
+    data = np.empty(mins.size * 2, dtype=dtype)
+    if bits == 8:
+        data[0::2] = mins >> 8
+        data[1::2] = maxs >> 8
+    else:
+        data[0::2] = mins
+        data[1::2] = maxs
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_DAT_HEADER.pack(DAT_VERSION, 1 if bits == 8 else 0,
+                                 sample_rate, samples_per_pixel, mins.size))
+        f.write(data.tobytes())
+    os.replace(tmp_path, path)
+
+
+def compute_peaks(audio_path: str, samples_per_pixel: int,
+                  block_frames: int = BLOCK_FRAMES) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Sample rate and per-pixel (min, max) int16 peaks of a mixed-down file."""
+    sample_rate, blocks = read_pcm_blocks(audio_path, block_frames)
+    accumulator = PeakAccumulator(samples_per_pixel)
+    for block in blocks:
+        accumulator.feed(_mix_down(block))
+    mins, maxs = accumulator.finish()
+    return sample_rate, mins, maxs
+
+
+def generate_peaks(audio_path: str, output_path: str,
+                   zoom_levels: Sequence[int] = (256,), bits: int = 8,
+                   block_frames: int = BLOCK_FRAMES) -> bool:
+    """
+    Generate the waveform pyramid for ``audio_path``.
+
+    The first (finest) zoom level is written to ``output_path``, the others
+    to ``level_path(output_path, level)``. Every level must be a multiple of
+    the first.
+
+    Returns:
+        True if the files were written, False if the audio could not be read
+    """
+    levels = sorted(set(zoom_levels))
+    base = levels[0]
+    if any(level % base for level in levels):
+        raise ValueError(f"Zoom levels must be multiples of {base}: {levels}")
+
+    try:
+        sample_rate, mins, maxs = compute_peaks(audio_path, base, block_frames)
+    except (ValueError, OSError, EOFError) as e:
+        logger.warning(f"Native waveform generation failed for {audio_path}: {e}")
+        return False
+
+    write_dat(output_path, mins, maxs, sample_rate, base, bits)
+    for level in levels[1:]:
+        level_mins, level_maxs = coarsen(mins, maxs, level // base)
+        write_dat(level_path(output_path, level), level_mins, level_maxs,
+                  sample_rate, level, bits)
+    logger.info(f"Generated waveform natively: {output_path} "
+                f"({mins.size} pixels, {len(levels)} levels)")
+    return True
+
@@ -2,13 +2,16 @@
 Waveform Service
 
 Handles generation and caching of audio waveform data for the audio annotation feature.
-Uses BBC's audiowaveform tool to generate pre-computed waveform data files.
+Uses BBC's audiowaveform tool to generate pre-computed waveform data files,
+or the native NumPy generator in waveform_peaks when the tool is not installed.
 
 Features:
 - LRU cache for waveform files
-- Background look-ahead pre-computation for upcoming instances
+- Background look-ahead pre-computation for upcoming instances, run in a
+  process pool when the native generator is used
 - Support for both local files and URLs
-- Graceful fallback if audiowaveform not installed
+- Graceful fallback to client-side decoding when neither generator can
+  read the audio
 """
 
 import os
@@ -19,11 +22,15 @@ import shutil
 import tempfile
 import threading
 import time
-from typing import Optional, List, Dict
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, List, Dict, Tuple
 from collections import OrderedDict
 from urllib.parse import urlparse
 from pathlib import Path
 
+from potato.server_utils import waveform_peaks
+
 try:
     import requests
     REQUESTS_AVAILABLE = True
@@ -38,24 +45,33 @@ class WaveformService:
     Service for generating and caching audio waveform data.
 
     Uses BBC's audiowaveform tool to generate pre-computed waveform data
-    that can be efficiently rendered by Peaks.js on the frontend.
+    that can be efficiently rendered by Peaks.js on the frontend. Without
+    the tool, waveform_peaks.generate_peaks writes the same format from
+    WAV (or, with soundfile installed, most other) audio, along with
+    coarser pyramid levels.
     """
 
     # Default configuration
     DEFAULT_LOOK_AHEAD = 5
     DEFAULT_CACHE_MAX_SIZE = 100
     DEFAULT_CLIENT_FALLBACK_MAX_DURATION = 1800  # 30 minutes in seconds
+    DEFAULT_WORKERS = 2  # Processes for native background pre-computation
 
     # Waveform generation settings
     WAVEFORM_ZOOM_LEVEL = 256  # Samples per pixel
     WAVEFORM_BITS = 8  # 8-bit resolution
+    # Native pyramid levels; the first is served by default, matching the
+    # zoomLevels the audio annotation frontend gives Peaks.js
+    WAVEFORM_PYRAMID_LEVELS = (256, 512, 1024, 2048, 4096)
+    NATIVE_TIMEOUT = 300  # Seconds to wait for an in-flight pool job
 
     def __init__(
         self,
         cache_dir: str,
         look_ahead: int = DEFAULT_LOOK_AHEAD,
         cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
-        client_fallback_max_duration: int = DEFAULT_CLIENT_FALLBACK_MAX_DURATION
+        client_fallback_max_duration: int = DEFAULT_CLIENT_FALLBACK_MAX_DURATION,
+        workers: int = DEFAULT_WORKERS
     ):
         """
         Initialize the WaveformService.
@@ -65,11 +81,14 @@ class WaveformService:
             look_ahead: Number of instances to pre-compute ahead
             cache_max_size: Maximum number of cached waveform files
             client_fallback_max_duration: Max duration (seconds) for client-side fallback
+            workers: Processes for native background pre-computation
+                (0 generates in the background thread instead)
         """
         self.cache_dir = cache_dir
         self.look_ahead = look_ahead
         self.cache_max_size = cache_max_size
         self.client_fallback_max_duration = client_fallback_max_duration
+        self.workers = max(0, int(workers))
 
         # LRU cache tracking
         self._cache_order: OrderedDict = OrderedDict()
@@ -81,6 +100,12 @@ class WaveformService:
         self._precompute_lock = threading.Lock()
         self._stop_precompute = threading.Event()
 
+        # Native generation: process pool (created on first use) and the
+        # jobs in flight, keyed by cache path, so a request for a waveform
+        # that is being pre-computed waits for it instead of redoing it
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+
         # Check if audiowaveform is installed
         self._audiowaveform_available = self._check_audiowaveform_installed()
 
@@ -121,7 +146,17 @@ class WaveformService:
 
     @property
     def is_available(self) -> bool:
-        """Check if waveform generation is available."""
+        """
+        Check if server-side waveform generation is available.
+
+        Always true: without audiowaveform, the native generator handles
+        audio it can decode, and get_waveform_path returns None for the rest.
+        """
+        return True
+
+    @property
+    def audiowaveform_available(self) -> bool:
+        """Check if the audiowaveform tool is used for generation."""
         return self._audiowaveform_available
 
     def _get_cache_key(self, audio_path: str) -> str:
@@ -149,6 +184,22 @@ class WaveformService:
         cache_key = self._get_cache_key(audio_path)
         return os.path.join(self.cache_dir, f"{cache_key}.dat")
 
+    def get_level_cache_path(self, cache_key: str, samples_per_pixel: int) -> str:
+        """
+        Get the cache file path of one pyramid level.
+
+        Args:
+            cache_key: The cache key of the audio file
+            samples_per_pixel: The zoom level
+
+        Returns:
+            Full path to the level's waveform file (which may not exist)
+        """
+        base_path = os.path.join(self.cache_dir, f"{cache_key}.dat")
+        if samples_per_pixel == self.WAVEFORM_PYRAMID_LEVELS[0]:
+            return base_path
+        return waveform_peaks.level_path(base_path, samples_per_pixel)
+
     def _is_url(self, path: str) -> bool:
         """
         Check if a path is a URL.
@@ -203,7 +254,8 @@ class WaveformService:
 
     def _generate_waveform(self, audio_path: str, output_path: str) -> bool:
         """
-        Generate waveform data using audiowaveform tool.
+        Generate waveform data using audiowaveform tool, or natively if the
+        tool is not installed.
 
         Args:
             audio_path: Path to the audio file (local)
@@ -213,8 +265,9 @@ class WaveformService:
             True if generation succeeded, False otherwise
         """
         if not self._audiowaveform_available:
-            logger.warning("audiowaveform not available, cannot generate waveform")
-            return False
+            return waveform_peaks.generate_peaks(
+                audio_path, output_path, self.WAVEFORM_PYRAMID_LEVELS, self.WAVEFORM_BITS
+            )
 
         try:
             # Build command
@@ -249,6 +302,32 @@ class WaveformService:
             logger.error(f"Error generating waveform for {audio_path}: {e}")
             return False
 
+    def _remove_cache_files(self, cache_path: str) -> bool:
+        """
+        Remove a cached waveform and its pyramid levels.
+
+        Args:
+            cache_path: Path to the base waveform file
+
+        Returns:
+            True if the base file was removed
+        """
+        removed = False
+        for level in self.WAVEFORM_PYRAMID_LEVELS[1:]:
+            level_file = waveform_peaks.level_path(cache_path, level)
+            if os.path.exists(level_file):
+                try:
+                    os.remove(level_file)
+                except OSError as e:
+                    logger.warning(f"Failed to remove cache file {level_file}: {e}")
+        if os.path.exists(cache_path):
+            try:
+                os.remove(cache_path)
+                removed = True
+            except OSError as e:
+                logger.warning(f"Failed to remove cache file {cache_path}: {e}")
+        return removed
+
     def _update_cache_order(self, cache_path: str) -> None:
         """
         Update LRU cache order and evict if necessary.
@@ -266,12 +345,8 @@ class WaveformService:
             # Evict oldest if over limit
             while len(self._cache_order) > self.cache_max_size:
                 oldest_path, _ = self._cache_order.popitem(last=False)
-                if os.path.exists(oldest_path):
-                    try:
-                        os.remove(oldest_path)
-                        logger.debug(f"Evicted from cache: {oldest_path}")
-                    except OSError as e:
-                        logger.warning(f"Failed to remove cache file {oldest_path}: {e}")
+                if self._remove_cache_files(oldest_path):
+                    logger.debug(f"Evicted from cache: {oldest_path}")
 
     def get_waveform_path(self, audio_path: str, generate: bool = True) -> Optional[str]:
         """
@@ -297,22 +372,27 @@ class WaveformService:
         if not generate:
             return None
 
+        if not self._audiowaveform_available and not self._native_can_decode(audio_path):
+            logger.debug(f"No server-side decoder for {audio_path}")
+            return None
+
+        # Wait for a background job already generating this waveform
+        with self._precompute_lock:
+            pending = self._in_flight.get(cache_path)
+        if pending is not None:
+            try:
+                pending.result(timeout=self.NATIVE_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Background waveform generation failed for {audio_path}: {e}")
+            if os.path.exists(cache_path):
+                self._update_cache_order(cache_path)
+                return cache_path
+
         # Generate waveform
-        temp_audio = None
+        local_path, temp_audio = self._resolve_local_audio(audio_path)
+        if not local_path:
+            return None
         try:
-            # Handle URL vs local path
-            if self._is_url(audio_path):
-                temp_audio = self._download_audio(audio_path)
-                if not temp_audio:
-                    return None
-                local_path = temp_audio
-            else:
-                local_path = audio_path
-                if not os.path.exists(local_path):
-                    logger.warning(f"Audio file not found: {local_path}")
-                    return None
-
-            # Generate waveform
             if self._generate_waveform(local_path, cache_path):
                 self._update_cache_order(cache_path)
                 return cache_path
@@ -327,6 +407,30 @@ class WaveformService:
                 except OSError:
                     pass
 
+    def _native_can_decode(self, audio_path: str) -> bool:
+        """Check if the native generator can read an audio path or URL."""
+        if self._is_url(audio_path):
+            audio_path = urlparse(audio_path).path
+        return waveform_peaks.can_decode(audio_path)
+
+    def _resolve_local_audio(self, audio_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get a local file for an audio path, downloading URLs.
+
+        Args:
+            audio_path: Path or URL to the audio file
+
+        Returns:
+            Tuple of (local path or None, temporary file to remove afterwards or None)
+        """
+        if self._is_url(audio_path):
+            temp_audio = self._download_audio(audio_path)
+            return temp_audio, temp_audio
+        if not os.path.exists(audio_path):
+            logger.warning(f"Audio file not found: {audio_path}")
+            return None, None
+        return audio_path, None
+
     def get_waveform_url(self, audio_path: str, base_url: str = '/api/waveform/') -> Optional[str]:
         """
         Get the URL to fetch waveform data for an audio file.
@@ -393,23 +497,98 @@ class WaveformService:
                 if self._precompute_queue:
                     audio_path = self._precompute_queue.pop(0)
 
-            if audio_path:
-                logger.debug(f"Background pre-computing waveform for: {audio_path}")
-                self.get_waveform_path(audio_path, generate=True)
-            else:
+            if not audio_path:
                 # No more items, exit thread
                 break
 
+            logger.debug(f"Background pre-computing waveform for: {audio_path}")
+            if not self._audiowaveform_available and self.workers > 0:
+                if self._submit_native(audio_path):
+                    continue
+
+            self.get_waveform_path(audio_path, generate=True)
+
             # Small delay between items to avoid overloading
             time.sleep(0.1)
 
         logger.debug("Background waveform pre-computation thread finished")
 
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the process pool for native generation, creating it on first use."""
+        if self._executor is None:
+            # spawn: forking a threaded server process is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _submit_native(self, audio_path: str) -> bool:
+        """
+        Generate a waveform natively in the process pool.
+
+        Args:
+            audio_path: Path or URL to the audio file
+
+        Returns:
+            True if the job was submitted (or is unnecessary), False if the
+            caller should generate in-thread instead
+        """
+        if not self._native_can_decode(audio_path):
+            return True
+
+        cache_path = self._get_waveform_cache_path(audio_path)
+        with self._precompute_lock:
+            if cache_path in self._in_flight or os.path.exists(cache_path):
+                return True
+
+        local_path, temp_audio = self._resolve_local_audio(audio_path)
+        if not local_path:
+            return True
+
+        try:
+            future = self._get_executor().submit(
+                waveform_peaks.generate_peaks, local_path, cache_path,
+                self.WAVEFORM_PYRAMID_LEVELS, self.WAVEFORM_BITS
+            )
+        except Exception as e:
+            logger.warning(f"Waveform process pool unavailable, generating in-thread: {e}")
+            if temp_audio and os.path.exists(temp_audio):
+                os.remove(temp_audio)
+            return False
+
+        with self._precompute_lock:
+            self._in_flight[cache_path] = future
+        future.add_done_callback(
+            lambda done: self._native_done(cache_path, temp_audio, done)
+        )
+        return True
+
+    def _native_done(self, cache_path: str, temp_audio: Optional[str], future: Future) -> None:
+        """Record a finished pool job in the cache and clean up its download."""
+        with self._precompute_lock:
+            self._in_flight.pop(cache_path, None)
+        if temp_audio and os.path.exists(temp_audio):
+            try:
+                os.remove(temp_audio)
+            except OSError:
+                pass
+        try:
+            generated = future.result()
+        except Exception as e:
+            logger.error(f"Native waveform generation failed for {cache_path}: {e}")
+            return
+        if generated and os.path.exists(cache_path):
+            self._update_cache_order(cache_path)
+
     def stop_background_precompute(self) -> None:
-        """Stop the background pre-computation thread."""
+        """Stop the background pre-computation thread and process pool."""
         self._stop_precompute.set()
         if self._precompute_thread and self._precompute_thread.is_alive():
             self._precompute_thread.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
     def get_audio_duration(self, audio_path: str) -> Optional[float]:
         """
@@ -447,7 +626,8 @@ class WaveformService:
         """
         Determine if client-side waveform generation should be used.
 
-        Client-side is preferred for short files when server-side is not available.
+        Client-side is preferred for short files when neither audiowaveform
+        nor the native generator can read them.
 
         Args:
             audio_path: Path to the audio file
@@ -455,7 +635,7 @@ class WaveformService:
         Returns:
             True if client-side fallback should be used
         """
-        if self._audiowaveform_available:
+        if self._audiowaveform_available or self._native_can_decode(audio_path):
             return False
 
         duration = self.get_audio_duration(audio_path)
@@ -474,12 +654,8 @@ class WaveformService:
         count = 0
         with self._cache_lock:
             for cache_path in list(self._cache_order.keys()):
-                if os.path.exists(cache_path):
-                    try:
-                        os.remove(cache_path)
-                        count += 1
-                    except OSError as e:
-                        logger.warning(f"Failed to remove {cache_path}: {e}")
+                if self._remove_cache_files(cache_path):
+                    count += 1
             self._cache_order.clear()
 
         logger.info(f"Cleared {count} cached waveform files")
@@ -496,8 +672,10 @@ class WaveformService:
             cached_files = len(self._cache_order)
             total_size = 0
             for cache_path in self._cache_order.keys():
-                if os.path.exists(cache_path):
-                    total_size += os.path.getsize(cache_path)
+                for path in [cache_path] + [waveform_peaks.level_path(cache_path, level)
+                                            for level in self.WAVEFORM_PYRAMID_LEVELS[1:]]:
+                    if os.path.exists(path):
+                        total_size += os.path.getsize(path)
 
         return {
             'cached_files': cached_files,
@@ -506,6 +684,9 @@ class WaveformService:
             'total_size_mb': round(total_size / (1024 * 1024), 2),
             'cache_dir': self.cache_dir,
             'audiowaveform_available': self._audiowaveform_available,
+            'native_decoders': ['wave', 'soundfile'] if waveform_peaks.SOUNDFILE_AVAILABLE else ['wave'],
+            'workers': self.workers,
+            'in_flight': len(self._in_flight),
         }
 
 
@@ -522,7 +703,8 @@ def init_waveform_service(
     cache_dir: str,
     look_ahead: int = WaveformService.DEFAULT_LOOK_AHEAD,
     cache_max_size: int = WaveformService.DEFAULT_CACHE_MAX_SIZE,
-    client_fallback_max_duration: int = WaveformService.DEFAULT_CLIENT_FALLBACK_MAX_DURATION
+    client_fallback_max_duration: int = WaveformService.DEFAULT_CLIENT_FALLBACK_MAX_DURATION,
+    workers: int = WaveformService.DEFAULT_WORKERS
 ) -> WaveformService:
     """
     Initialize the global WaveformService instance.
@@ -532,6 +714,7 @@ def init_waveform_service(
         look_ahead: Number of instances to pre-compute ahead
         cache_max_size: Maximum number of cached waveform files
         client_fallback_max_duration: Max duration for client-side fallback
+        workers: Processes for native background pre-computation
 
     Returns:
         The initialized WaveformService instance
@@ -541,6 +724,7 @@ def init_waveform_service(
         cache_dir=cache_dir,
         look_ahead=look_ahead,
         cache_max_size=cache_max_size,
-        client_fallback_max_duration=client_fallback_max_duration
+        client_fallback_max_duration=client_fallback_max_duration,
+        workers=workers
     )
     return _waveform_service
@@ -49,6 +49,14 @@ from .timing_models import TimingModel
 from .user_simulator import SimulatedUser, UserSimulationResult, AnnotationRecord
 from .simulator_manager import SimulatorManager
 from .reporting import SimulationReporter
+from .load_test import (
+    LoadTestConfig,
+    LoadTestRunner,
+    InProcessServer,
+    SCENARIOS,
+    compare_reports,
+    run_load_test,
+)
 
 __all__ = [
     # Config
@@ -85,4 +93,11 @@ __all__ = [
     "SimulatorManager",
     # Reporting
     "SimulationReporter",
+    # Load testing
+    "LoadTestConfig",
+    "LoadTestRunner",
+    "InProcessServer",
+    "SCENARIOS",
+    "compare_reports",
+    "run_load_test",
 ]
@@ -0,0 +1,719 @@
+"""
+Load testing on top of the user simulator.
+
+The simulator's ``SimulatedUser`` already walks a realistic annotator session
+over HTTP -- register, log in, fetch the schemas, then fetch / annotate /
+save / advance until the queue runs dry. This module runs many of those
+sessions as a capacity test instead of a behaviour test:
+
+- annotators *arrive* as a Poisson process at ``arrival_rate`` per second
+  (``0`` starts them all at once), and at most ``concurrency`` sessions are
+  active at a time;
+- every HTTP request goes through a :class:`TimedSession`, which records its
+  latency and outcome under a per-endpoint key (``POST /updateinstance``);
+- the run produces a JSON-serialisable report with p50/p95/p99 latency,
+  throughput and error rate per endpoint, plus -- when the server has
+  ``instrumentation`` enabled -- the server's own span timings for
+  assignment, save and render.
+
+The target is either a running server (``--server http://localhost:8000``)
+or an :class:`InProcessServer` built from a generated project of
+``corpus_size`` items. Canned :data:`SCENARIOS` cover 10/100/1000
+annotators against a small and a large corpus, and :func:`compare_reports`
+flags endpoints whose tail latency regressed against a saved baseline.
+
+Usage:
+    python -m potato.simulator.load_test --list-scenarios
+    python -m potato.simulator.load_test --scenario 100-small -o report.json
+    python -m potato.simulator.load_test --scenario 100-small --baseline old.json
+    python -m potato.simulator.load_test --server http://localhost:8000 \\
+        --users 50 --concurrency 20 --arrival-rate 10
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from .config import AnnotationStrategyType, CompetenceLevel, TimingConfig, UserConfig
+from .user_simulator import SimulatedUser
+
+logger = logging.getLogger(__name__)
+
+#: Request paths that embed an ID, mapped to one endpoint name so the number
+#: of report rows stays bounded.
+_PATH_TEMPLATES: Tuple[Tuple["re.Pattern", str], ...] = (
+    (re.compile(r"^/api/spans/[^/]+$"), "/api/spans/<instance_id>"),
+)
+
+
+@dataclass
+class LoadTestConfig:
+    """Shape of one load test.
+
+    Attributes:
+        name: Scenario name, copied into the report
+        users: Number of annotator sessions to run
+        concurrency: Maximum sessions active at the same time
+        arrival_rate: New sessions started per second (Poisson arrivals);
+            0 starts every session immediately
+        annotations_per_user: Items each session annotates before stopping
+        corpus_size: Items in the generated project (in-process server only)
+        request_timeout: Per-request timeout in seconds
+        seed: Seed for arrival times and annotation choices
+    """
+
+    name: str = "custom"
+    users: int = 10
+    concurrency: int = 10
+    arrival_rate: float = 0.0
+    annotations_per_user: int = 5
+    corpus_size: int = 100
+    request_timeout: float = 30.0
+    seed: int = 1234
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LoadTestConfig":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _scenario(users: int, corpus: str, concurrency: int, arrival_rate: float) -> LoadTestConfig:
+    return LoadTestConfig(
+        name=f"{users}-{corpus}",
+        users=users,
+        concurrency=concurrency,
+        arrival_rate=arrival_rate,
+        annotations_per_user=5,
+        corpus_size={"small": 100, "large": 10000}[corpus],
+    )
+
+
+#: Canned scenarios: 10/100/1000 annotators x a 100-item and a 10,000-item
+#: corpus. Small corpora stress assignment contention (everyone wants the same
+#: few items); large ones stress per-item bookkeeping and load time.
+SCENARIOS: Dict[str, LoadTestConfig] = {
+    s.name: s
+    for s in (
+        _scenario(10, "small", concurrency=10, arrival_rate=0.0),
+        _scenario(10, "large", concurrency=10, arrival_rate=0.0),
+        _scenario(100, "small", concurrency=50, arrival_rate=50.0),
+        _scenario(100, "large", concurrency=50, arrival_rate=50.0),
+        _scenario(1000, "small", concurrency=100, arrival_rate=100.0),
+        _scenario(1000, "large", concurrency=100, arrival_rate=100.0),
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+def endpoint_name(method: str, url: str) -> str:
+    """``"POST http://host/updateinstance?x=1"`` -> ``"POST /updateinstance"``."""
+    path = urlsplit(url).path or "/"
+    for pattern, template in _PATH_TEMPLATES:
+        if pattern.match(path):
+            path = template
+            break
+    return f"{method.upper()} {path}"
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank ``q`` percentile (0-100) of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(-(-q * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LatencyRecorder:
+    """Per-endpoint request latencies and outcomes. Thread-safe.
+
+    Raw samples are kept (a 1000-annotator scenario is ~30k requests), so the
+    percentiles are exact rather than bucket estimates.
+    """
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+        self._statuses: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float, status: Optional[int]) -> None:
+        """Record one request; ``status`` is None when no response arrived."""
+        key = str(status) if status is not None else "exception"
+        with self._lock:
+            self._samples.setdefault(endpoint, []).append(seconds)
+            counts = self._statuses.setdefault(endpoint, {})
+            counts[key] = counts.get(key, 0) + 1
+
+    def summary(self, duration_s: float) -> List[Dict[str, Any]]:
+        """One row per endpoint, sorted by endpoint name."""
+        with self._lock:
+            samples = {k: sorted(v) for k, v in self._samples.items()}
+            statuses = {k: dict(v) for k, v in self._statuses.items()}
+
+        def ms(value):
+            return None if value is None else round(value * 1000.0, 3)
+
+        rows = []
+        for endpoint in sorted(samples):
+            values = samples[endpoint]
+            counts = statuses[endpoint]
+            codes = {int(s): n for s, n in counts.items() if s != "exception"}
+            errors = counts.get("exception", 0) + sum(
+                n for code, n in codes.items() if code >= 500
+            )
+            client_errors = sum(n for code, n in codes.items() if 400 <= code < 500)
+            rows.append({
+                "endpoint": endpoint,
+                "count": len(values),
+                "errors": errors,
+                "client_errors": client_errors,
+                "error_rate": round(errors / len(values), 6),
+                "throughput_rps": round(len(values) / duration_s, 3) if duration_s else None,
+                "mean_ms": ms(sum(values) / len(values)),
+                "p50_ms": ms(percentile(values, 50)),
+                "p95_ms": ms(percentile(values, 95)),
+                "p99_ms": ms(percentile(values, 99)),
+                "max_ms": ms(values[-1]),
+                "status": dict(sorted(counts.items())),
+            })
+        return rows
+
+
+class TimedSession(requests.Session):
+    """A ``requests.Session`` that records every request into a recorder.
+
+    Redirects followed inside one call are timed as part of that call, which
+    is what the annotator waits for.
+    """
+
+    def __init__(self, recorder: LatencyRecorder, timeout: Optional[float] = None):
+        super().__init__()
+        self.recorder = recorder
+        self.timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        endpoint = endpoint_name(method, url)
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.exceptions.RequestException:
+            self.recorder.record(endpoint, time.perf_counter() - start, None)
+            raise
+        self.recorder.record(endpoint, time.perf_counter() - start, response.status_code)
+        return response
+
+
+# ---------------------------------------------------------------------------
+# In-process target
+# ---------------------------------------------------------------------------
+
+_WORDS = (
+    "the annotators reviewed each passage carefully before choosing a label "
+    "while the queue moved on to new items from a large and varied corpus"
+).split()
+
+
+class InProcessServer:
+    """A Potato server for a generated project, served from a thread.
+
+    Builds a project with ``corpus_size`` items and one radio scheme, creates
+    the app with ``create_app`` (the WSGI factory path) and serves it on an
+    ephemeral localhost port with werkzeug's threaded server. Instrumentation
+    is switched on so the report can include server-side span timings.
+
+    The server's managers are process-wide singletons, so only one of these
+    may be running at a time; ``stop`` clears them for the next one.
+    """
+
+    def __init__(self, corpus_size: int = 100, seed: int = 1234):
+        self.corpus_size = corpus_size
+        self.seed = seed
+        self.url: Optional[str] = None
+        self._project_dir: Optional[str] = None
+        self._cwd: Optional[str] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _write_project(self) -> str:
+        import yaml
+
+        project_dir = tempfile.mkdtemp(prefix="potato_load_test_")
+        rng = random.Random(self.seed)
+        with open(os.path.join(project_dir, "data.jsonl"), "w") as f:
+            for i in range(self.corpus_size):
+                text = " ".join(rng.choice(_WORDS) for _ in range(40))
+                f.write(json.dumps({"id": f"item_{i:06d}", "text": text}) + "\n")
+
+        config = {
+            "annotation_task_name": "Load test",
+            "task_dir": project_dir,
+            "data_files": ["data.jsonl"],
+            "item_properties": {"id_key": "id", "text_key": "text"},
+            "annotation_schemes": [{
+                "annotation_type": "radio",
+                "name": "sentiment",
+                "description": "Sentiment of the passage",
+                "labels": ["positive", "negative", "neutral"],
+            }],
+            "output_annotation_dir": os.path.join(project_dir, "annotation_output"),
+            "site_dir": "default",
+            "alert_time_each_instance": 0,
+            "require_password": False,
+            "authentication": {"method": "in_memory"},
+            "user_config": {"allow_all_users": True, "users": []},
+            "secret_key": "load-test-secret-key",
+            "random_seed": self.seed,
+            "instrumentation": {"enabled": True},
+        }
+        config_path = os.path.join(project_dir, "config.yaml")
+        with open(config_path, "w") as f:
+            yaml.safe_dump(config, f)
+        return config_path
+
+    def start(self) -> str:
+        from werkzeug.serving import make_server
+        from potato.flask_server import create_app
+
+        self._cwd = os.getcwd()
+        config_path = self._write_project()
+        self._project_dir = os.path.dirname(config_path)
+        # Config paths must resolve inside the working directory.
+        os.chdir(self._project_dir)
+        app = create_app(config_path)
+        self._server = make_server("127.0.0.1", 0, app, threaded=True)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="load-test-server", daemon=True
+        )
+        self._thread.start()
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        logger.info(f"In-process server with {self.corpus_size} items at {self.url}")
+        return self.url
+
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        from potato.instrumentation import get_metrics_registry
+
+        registry = get_metrics_registry()
+        return registry.to_dict() if registry is not None else None
+
+    def reset_metrics(self) -> None:
+        from potato.instrumentation import get_metrics_registry
+
+        registry = get_metrics_registry()
+        if registry is not None:
+            registry.reset()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join(timeout=10)
+            self._server = None
+
+        from potato.instrumentation import clear_metrics_registry
+        from potato.item_state_management import clear_item_state_manager
+        from potato.user_state_management import clear_user_state_manager
+        from potato.server_utils.config_module import clear_config
+        import potato.authentication as auth_module
+
+        clear_metrics_registry()
+        clear_item_state_manager()
+        clear_user_state_manager()
+        clear_config()
+        auth_module.USER_AUTHENTICATOR_SINGLETON = None
+
+        if self._cwd is not None:
+            os.chdir(self._cwd)
+        if self._project_dir is not None:
+            shutil.rmtree(self._project_dir, ignore_errors=True)
+            self._project_dir = None
+
+    def __enter__(self) -> "InProcessServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class LoadTestRunner:
+    """Runs one load test against a server URL and builds its report."""
+
+    def __init__(
+        self,
+        config: LoadTestConfig,
+        server_url: str,
+        admin_api_key: Optional[str] = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            config: Shape of the test
+            server_url: Base URL of the Potato server
+            admin_api_key: Optional admin key; when given, the server's
+                ``/admin/metrics`` snapshot is attached to the report
+        """
+        self.config = config
+        self.server_url = server_url.rstrip("/")
+        self.admin_api_key = admin_api_key
+        self.recorder = LatencyRecorder()
+        # Unique per run so repeated runs against one server don't collide.
+        self.run_id = datetime.now().strftime("%H%M%S%f")
+
+    def arrival_offsets(self) -> List[float]:
+        """Start time of each session, in seconds from the start of the run."""
+        if self.config.arrival_rate <= 0:
+            return [0.0] * self.config.users
+        rng = random.Random(self.config.seed)
+        offsets, t = [], 0.0
+        for _ in range(self.config.users):
+            offsets.append(t)
+            t += rng.expovariate(self.config.arrival_rate)
+        return offsets
+
+    def _run_user(self, index: int):
+        user_config = UserConfig(
+            user_id=f"load_{self.run_id}_{index:04d}",
+            competence=CompetenceLevel.AVERAGE,
+            strategy=AnnotationStrategyType.RANDOM,
+            timing=TimingConfig(),
+        )
+        user = SimulatedUser(
+            user_config=user_config,
+            server_url=self.server_url,
+            simulate_wait=False,
+            session=TimedSession(self.recorder, timeout=self.config.request_timeout),
+        )
+        return user.run_simulation(self.config.annotations_per_user)
+
+    def run(self, server_metrics=None) -> Dict[str, Any]:
+        """Run the test and return its report.
+
+        Args:
+            server_metrics: Optional callable returning the server's
+                instrumentation snapshot; defaults to fetching
+                ``/admin/metrics`` when an admin key was given
+
+        Returns:
+            Report dictionary (see module docstring)
+        """
+        config = self.config
+        logger.info(
+            f"Load test '{config.name}': {config.users} users, "
+            f"concurrency {config.concurrency}, arrival rate {config.arrival_rate}/s"
+        )
+        started_at = datetime.now().isoformat()
+        results = []
+        failed_users = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=config.concurrency) as executor:
+            futures = []
+            for index, offset in enumerate(self.arrival_offsets()):
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(self._run_user, index))
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    failed_users += 1
+                    logger.error(f"Load test session failed: {e}")
+        duration = time.perf_counter() - start
+
+        endpoints = self.recorder.summary(duration)
+        total = sum(row["count"] for row in endpoints)
+        errors = sum(row["errors"] for row in endpoints)
+        annotations = sum(len(r.annotations) for r in results)
+        failed_users += sum(1 for r in results if r.errors)
+
+        snapshot = server_metrics() if server_metrics else self._fetch_server_metrics()
+        return {
+            "scenario": config.name,
+            "config": config.to_dict(),
+            "server_url": self.server_url,
+            "started_at": started_at,
+            "duration_s": round(duration, 3),
+            "users": {
+                "started": config.users,
+                "completed": config.users - failed_users,
+                "with_errors": failed_users,
+            },
+            "annotations": annotations,
+            "annotations_per_s": round(annotations / duration, 3) if duration else None,
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 6) if total else 0.0,
+            "throughput_rps": round(total / duration, 3) if duration else None,
+            "endpoints": endpoints,
+            "server_spans": snapshot.get("spans") if snapshot else None,
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+        }
+
+    def _fetch_server_metrics(self) -> Optional[Dict[str, Any]]:
+        if not self.admin_api_key:
+            return None
+        try:
+            response = requests.get(
+                f"{self.server_url}/admin/metrics",
+                headers={"X-API-Key": self.admin_api_key},
+                timeout=self.config.request_timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not fetch server metrics: {e}")
+            return None
+        if response.status_code != 200:
+            logger.warning(
+                f"Server metrics unavailable ({response.status_code}); "
+                "is instrumentation.enabled set?"
+            )
+            return None
+        return response.json()
+
+
+def run_load_test(
+    config: LoadTestConfig,
+    server_url: Optional[str] = None,
+    admin_api_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run one load test against ``server_url``, or in-process when omitted."""
+    if server_url:
+        return LoadTestRunner(config, server_url, admin_api_key).run()
+
+    with InProcessServer(config.corpus_size, seed=config.seed) as server:
+        server.reset_metrics()  # drop the startup requests
+        report = LoadTestRunner(config, server.url).run(server_metrics=server.metrics)
+    report["server_url"] = "in-process"
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = 0.25,
+    min_delta_ms: float = 5.0,
+) -> List[Dict[str, Any]]:
+    """Endpoints whose p95 latency or error rate got worse than the baseline.
+
+    A p95 regression must exceed both ``tolerance`` (relative) and
+    ``min_delta_ms`` (absolute), so millisecond jitter on fast endpoints is
+    not reported. Endpoints missing from either report are ignored.
+
+    Returns:
+        One dict per regression, with the endpoint, metric and both values
+    """
+    before = {row["endpoint"]: row for row in baseline.get("endpoints", [])}
+    regressions = []
+    for row in current.get("endpoints", []):
+        old = before.get(row["endpoint"])
+        if old is None:
+            continue
+        old_p95, new_p95 = old.get("p95_ms"), row.get("p95_ms")
+        if old_p95 is not None and new_p95 is not None:
+            if new_p95 > old_p95 * (1 + tolerance) and new_p95 - old_p95 > min_delta_ms:
+                regressions.append({
+                    "endpoint": row["endpoint"], "metric": "p95_ms",
+                    "baseline": old_p95, "current": new_p95,
+                })
+        if row.get("error_rate", 0) > old.get("error_rate", 0):
+            regressions.append({
+                "endpoint": row["endpoint"], "metric": "error_rate",
+                "baseline": old.get("error_rate", 0), "current": row["error_rate"],
+            })
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a report as a table to stdout."""
+    print("\n" + "=" * 78)
+    print(
+        f"LOAD TEST {report['scenario']}: {report['users']['started']} users, "
+        f"{report['requests']} requests in {report['duration_s']:.1f}s "
+        f"({report['throughput_rps']} req/s, error rate {report['error_rate']:.2%})"
+    )
+    print("=" * 78)
+    print(f"{'endpoint':<34}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for row in report["endpoints"]:
+        print(
+            f"{row['endpoint']:<34}{row['count']:>7}{row['p50_ms']:>9.1f}"
+            f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['errors']:>8}"
+        )
+    if report.get("server_spans"):
+        print(f"\n{'server span':<34}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for row in report["server_spans"]:
+            print(
+                f"{row['span']:<34}{row['count']:>7}{row['p50_ms'] or 0:>9.1f}"
+                f"{row['p95_ms'] or 0:>9.1f}{row['p99_ms'] or 0:>9.1f}"
+            )
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        Parsed arguments namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Load-test a Potato server with simulated annotators",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:", 1)[1],
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        help="Canned scenario to run (repeatable; 'all' runs every scenario)",
+    )
+    parser.add_argument(
+        "--list-scenarios", action="store_true", help="List canned scenarios and exit"
+    )
+    parser.add_argument(
+        "--server", "-s",
+        help="Server URL; omit to run each test against an in-process server",
+    )
+    parser.add_argument("--admin-api-key", help="Attach the server's /admin/metrics spans")
+    parser.add_argument("--users", "-u", type=int, help="Annotator sessions")
+    parser.add_argument("--concurrency", "-p", type=int, help="Maximum concurrent sessions")
+    parser.add_argument(
+        "--arrival-rate", type=float, help="New sessions per second (0 = all at once)"
+    )
+    parser.add_argument(
+        "--annotations-per-user", "-m", type=int, help="Annotations per session"
+    )
+    parser.add_argument(
+        "--corpus-size", type=int, help="Items in the in-process project"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Write the JSON report here (a list when several scenarios run)",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Compare against a saved report; exit 1 on regressions",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed relative p95 increase against the baseline (default: 0.25)",
+    )
+    parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
+    return parser.parse_args(argv)
+
+
+def build_configs(args: argparse.Namespace) -> List[LoadTestConfig]:
+    """Scenarios named on the command line, with any CLI overrides applied."""
+    names = args.scenario or []
+    if "all" in names:
+        names = list(SCENARIOS)
+    configs = [LoadTestConfig.from_dict(SCENARIOS[n].to_dict()) for n in names] or [
+        LoadTestConfig()
+    ]
+    overrides = {
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "arrival_rate": args.arrival_rate,
+        "annotations_per_user": args.annotations_per_user,
+        "corpus_size": args.corpus_size,
+    }
+    for config in configs:
+        for key, value in overrides.items():
+            if value is not None:
+                setattr(config, key, value)
+    return configs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the load-test CLI.
+
+    Returns:
+        Exit code (0 for success, 1 for regressions or errors)
+    """
+    args = parse_args(argv)
+    from .cli import setup_logging
+
+    setup_logging(args.verbose)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    if args.list_scenarios:
+        for name, config in SCENARIOS.items():
+            print(
+                f"{name:<12} users={config.users:<5} concurrency={config.concurrency:<4} "
+                f"arrival_rate={config.arrival_rate:<6g} corpus={config.corpus_size}"
+            )
+        return 0
+
+    unknown = [n for n in args.scenario or [] if n != "all" and n not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(unknown)}; see --list-scenarios")
+        return 1
+
+    reports = []
+    for config in build_configs(args):
+        report = run_load_test(config, args.server, args.admin_api_key)
+        print_report(report)
+        reports.append(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports[0] if len(reports) == 1 else reports, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        baselines = {b["scenario"]: b for b in (baseline if isinstance(baseline, list) else [baseline])}
+        regressions = []
+        for report in reports:
+            if report["scenario"] in baselines:
+                for r in compare_reports(baselines[report["scenario"]], report, args.tolerance):
+                    regressions.append(dict(r, scenario=report["scenario"]))
+        for r in regressions:
+            print(
+                f"REGRESSION {r['scenario']} {r['endpoint']} {r['metric']}: "
+                f"{r['baseline']} -> {r['current']}"
+            )
+        if regressions:
+            return 1
+        print("\nNo regressions against the baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -107,6 +107,7 @@ class SimulatedUser:
         attention_check_fail_rate: float = 0.0,
         respond_fast_rate: float = 0.0,
         interactive_config: Optional[InteractiveConfig] = None,
+        session: Optional[requests.Session] = None,
     ):
         """Initialize simulated user.
 
@@ -117,6 +118,8 @@ class SimulatedUser:
             simulate_wait: Whether to actually wait between annotations
             attention_check_fail_rate: Rate at which to fail attention checks
             respond_fast_rate: Rate of suspiciously fast responses
+            session: HTTP session to use; a fresh ``requests.Session`` by
+                default (the load tester passes one that times each request)
         """
         self.config = user_config
         self.server_url = server_url.rstrip("/")
@@ -135,7 +138,7 @@ class SimulatedUser:
             self.timing = NoWaitTimingModel(user_config.timing)
 
         # Session and state
-        self.session = requests.Session()
+        self.session = session if session is not None else requests.Session()
         self.logged_in = False
         self.current_instance_id: Optional[str] = None
         self.schemas: List[Dict[str, Any]] = []
@@ -121,9 +121,12 @@ class InstanceSelectionConfig:
 
 @dataclass
 class BatchConfig:
-    """Configuration for batch sizes."""
+    """Configuration for batch sizes and labeling throughput."""
     llm_labeling_batch: int = 50
     max_parallel_labels: int = 200
+    labeling_concurrency: int = 1  # LLM requests in flight at once
+    requests_per_second: float = 0.0  # Per-endpoint rate limit (0 = unlimited)
+    prompt_batch_size: int = 1  # Instances packed into one labeling request
 
 
 @dataclass
@@ -314,6 +317,15 @@ class SoloModeConfig:
         if self.thresholds.confidence_low >= self.thresholds.confidence_high:
             errors.append("confidence_low must be less than confidence_high")
 
+        if self.batches.labeling_concurrency < 1:
+            errors.append("batches.labeling_concurrency must be at least 1")
+
+        if self.batches.requests_per_second < 0:
+            errors.append("batches.requests_per_second must be 0 (unlimited) or positive")
+
+        if self.batches.prompt_batch_size < 1:
+            errors.append("batches.prompt_batch_size must be at least 1")
+
         # Validate uncertainty strategy
         valid_strategies = [
             'direct_confidence', 'direct_uncertainty',
@@ -418,6 +430,9 @@ def parse_solo_mode_config(config_data: Dict[str, Any]) -> SoloModeConfig:
     batches = BatchConfig(
         llm_labeling_batch=batch_data.get('llm_labeling_batch', 50),
         max_parallel_labels=batch_data.get('max_parallel_labels', 200),
+        labeling_concurrency=batch_data.get('labeling_concurrency', 1),
+        requests_per_second=batch_data.get('requests_per_second', 0.0),
+        prompt_batch_size=batch_data.get('prompt_batch_size', 1),
     )
 
     # Parse prompt optimization config
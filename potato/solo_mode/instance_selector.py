@@ -5,10 +5,11 @@ Weighted instance selection for human annotation, combining LLM confidence,
 diversity, disagreements and randomness to decide what the annotator sees next.
 """
 
+import heapq
 import logging
 import random
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 import threading
 
 logger = logging.getLogger(__name__)
@@ -48,6 +49,236 @@ class SelectionWeights:
             logger.warning(f"Normalized selection weights (original sum: {total})")
 
 
+class _IndexedSet:
+    """Set with O(1) add, discard and uniform random choice."""
+
+    __slots__ = ('_items', '_pos')
+
+    def __init__(self):
+        self._items: List[str] = []
+        self._pos: Dict[str, int] = {}
+
+    def add(self, item: str) -> None:
+        if item not in self._pos:
+            self._pos[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item: str) -> None:
+        pos = self._pos.pop(item, None)
+        if pos is None:
+            return
+        last = self._items.pop()
+        if pos < len(self._items):
+            self._items[pos] = last
+            self._pos[last] = pos
+
+    def choice(self, rng: random.Random) -> str:
+        return self._items[rng.randrange(len(self._items))]
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._pos
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+class _RankedPool:
+    """Members ranked by a key, lowest first; a heap with lazy deletion."""
+
+    __slots__ = ('_keys', '_heap')
+
+    def __init__(self):
+        self._keys: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def set(self, item: str, key: float) -> None:
+        if self._keys.get(item) == key:
+            return
+        self._keys[item] = key
+        heapq.heappush(self._heap, (key, item))
+        if len(self._heap) > 2 * len(self._keys) + 64:
+            self._heap = [(k, i) for i, k in self._keys.items()]
+            heapq.heapify(self._heap)
+
+    def discard(self, item: str) -> None:
+        self._keys.pop(item, None)
+
+    def first(self) -> str:
+        heap = self._heap
+        while heap[0][1] not in self._keys or self._keys[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class InstancePools:
+    """
+    Selection pools maintained by events rather than rebuilt per request.
+
+    ``InstanceSelector.refresh_pools`` rebuilds every pool from the whole
+    corpus. These pools hold the same membership, but the caller reports
+    changes -- instances added or human-labeled, a prediction's minimum
+    confidence, an instance's confidence variability, the disagreement and
+    edge-case-rule sets -- and only the affected instance moves. The
+    low-confidence and cartography pools are heaps so their best member is
+    found without a scan; the random-choice pools support O(1) sampling.
+    """
+
+    def __init__(self, confidence_threshold: float = 0.5):
+        self.confidence_threshold = confidence_threshold
+
+        # Per-instance signals (kept for unavailable instances too, so an
+        # instance that appears later lands in the right pools)
+        self._min_confidence: Dict[str, float] = {}
+        self._variability: Dict[str, float] = {}
+        self._disagreement_ids: Set[str] = set()
+        self._edge_case_rule_ids: Set[str] = set()
+        self._labeled: Set[str] = set()
+
+        self.available = _IndexedSet()
+        self._low_confidence = _RankedPool()
+        self._cartography = _RankedPool()  # keyed by -variability
+        self._llm_predicted = _IndexedSet()
+        self._disagreement = _IndexedSet()
+        self._edge_case_rule = _IndexedSet()
+        self._diverse: List[str] = []
+        self._diverse_next = 0
+
+    # --- events ----------------------------------------------------------
+
+    def add_instances(self, instance_ids: Iterable[str]) -> None:
+        for instance_id in instance_ids:
+            if instance_id not in self._labeled:
+                self.available.add(instance_id)
+                self._place(instance_id)
+
+    def mark_labeled(self, instance_id: str) -> None:
+        self._labeled.add(instance_id)
+        self.available.discard(instance_id)
+        self._place(instance_id)
+
+    def update_prediction(self, instance_id: str, min_confidence: Optional[float]) -> None:
+        if min_confidence is None:
+            self._min_confidence.pop(instance_id, None)
+        else:
+            self._min_confidence[instance_id] = min_confidence
+        if instance_id in self.available:
+            self._place(instance_id)
+
+    def update_variability(self, instance_id: str, variability: float) -> None:
+        self._variability[instance_id] = variability
+        if instance_id in self.available:
+            self._place(instance_id)
+
+    def set_disagreement_ids(self, instance_ids: Set[str]) -> None:
+        self._disagreement_ids = self._replace(self._disagreement_ids, instance_ids)
+
+    def set_edge_case_rule_ids(self, instance_ids: Set[str]) -> None:
+        self._edge_case_rule_ids = self._replace(self._edge_case_rule_ids, instance_ids)
+
+    def set_diverse_ordering(self, ordering: List[str]) -> None:
+        self._diverse = list(ordering)
+        self._diverse_next = 0
+
+    def _replace(self, current: Set[str], new: Set[str]) -> Set[str]:
+        if new == current:
+            return current
+        new = set(new)
+        for instance_id in current ^ new:
+            # Placement reads the sets, so swap in the new one first
+            if instance_id in new:
+                current.add(instance_id)
+            else:
+                current.discard(instance_id)
+            self._place(instance_id)
+        return current
+
+    def _place(self, instance_id: str) -> None:
+        """Put one instance into exactly the pools it belongs to.
+
+        Only available instances are ever in a pool, so a signal change for
+        an unavailable instance needs no placement.
+        """
+        available = instance_id in self.available
+        confidence = self._min_confidence.get(instance_id)
+        low = available and confidence is not None and confidence < self.confidence_threshold
+
+        if low:
+            self._low_confidence.set(instance_id, confidence)
+        else:
+            self._low_confidence.discard(instance_id)
+
+        if available and confidence is not None and not low:
+            self._llm_predicted.add(instance_id)
+        else:
+            self._llm_predicted.discard(instance_id)
+
+        variability = self._variability.get(instance_id, 0.0)
+        if available and variability > 0:
+            self._cartography.set(instance_id, -variability)
+        else:
+            self._cartography.discard(instance_id)
+
+        for pool, members in ((self._disagreement, self._disagreement_ids),
+                              (self._edge_case_rule, self._edge_case_rule_ids)):
+            if available and instance_id in members:
+                pool.add(instance_id)
+            else:
+                pool.discard(instance_id)
+
+    # --- selection -------------------------------------------------------
+
+    def _first_diverse(self) -> Optional[str]:
+        while self._diverse_next < len(self._diverse):
+            instance_id = self._diverse[self._diverse_next]
+            if instance_id in self.available:
+                return instance_id
+            self._diverse_next += 1
+        return None
+
+    def sizes(self) -> Dict[str, int]:
+        return {
+            'low_confidence': len(self._low_confidence),
+            'diverse': len(self._diverse) - self._diverse_next,
+            'random': len(self.available),
+            'disagreement': len(self._disagreement),
+            'edge_case_rule': len(self._edge_case_rule),
+            'cartography': len(self._cartography),
+            'llm_predicted': len(self._llm_predicted),
+        }
+
+    def non_empty(self) -> Dict[str, bool]:
+        sizes = self.sizes()
+        sizes['diverse'] = self._first_diverse() is not None
+        return {name: bool(size) for name, size in sizes.items()}
+
+    def pick(self, pool_name: str, rng: random.Random) -> str:
+        """Choose from a non-empty pool the way ``select_next`` does."""
+        if pool_name == 'low_confidence':
+            return self._low_confidence.first()
+        if pool_name == 'cartography':
+            return self._cartography.first()
+        if pool_name == 'diverse':
+            return self._first_diverse()
+        pool = {
+            'disagreement': self._disagreement,
+            'edge_case_rule': self._edge_case_rule,
+            'llm_predicted': self._llm_predicted,
+        }.get(pool_name, self.available)
+        return pool.choice(rng)
+
+    def __len__(self) -> int:
+        return len(self.available)
+
+
 class InstanceSelector:
     """
     Weighted instance selector for Solo Mode.
@@ -97,6 +328,9 @@ class InstanceSelector:
         # Cache predictions for use in _select_lowest_confidence
         self._predictions_cache: Dict[str, Dict[str, Any]] = {}
 
+        # Event-maintained pools last selected from (see select_from_pools)
+        self._live_pools: Optional[InstancePools] = None
+
     def configure(
         self,
         low_confidence_weight: float = 0.4,
@@ -328,6 +562,25 @@ class InstanceSelector:
             self._record_selection(instance_id, pool_name)
             return instance_id
 
+    def select_from_pools(self, pools: InstancePools) -> Optional[str]:
+        """
+        Select the next instance from event-maintained pools.
+
+        Same weighting and per-pool choice as ``select_next``, without
+        rebuilding or filtering the pools first.
+
+        Returns:
+            Selected instance ID, or None if no instances are available
+        """
+        with self._lock:
+            self._live_pools = pools
+            if not len(pools):
+                return None
+            _, pool_name = self._weighted_pool_selection(pools.non_empty())
+            instance_id = pools.pick(pool_name, self.random)
+            self._record_selection(instance_id, pool_name)
+            return instance_id
+
     def _weighted_pool_selection(
         self,
         pools: Dict[str, List[str]]
@@ -437,7 +690,7 @@ class InstanceSelector:
             return {
                 'total_selections': len(self.selection_history),
                 'by_pool': dict(pool_counts),
-                'pool_sizes': {
+                'pool_sizes': self._live_pools.sizes() if self._live_pools is not None else {
                     'low_confidence': len(self._low_confidence_pool),
                     'diverse': len(self._diverse_pool),
                     'random': len(self._random_pool),
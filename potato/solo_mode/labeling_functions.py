@@ -8,7 +8,9 @@ A labeling function encodes a pattern like:
   "When text contains 'love it' -> positive (confidence: 0.95)"
 
 These functions are extracted from LLM reasoning on high-confidence predictions,
-then applied to unlabeled instances via majority voting.
+then applied to unlabeled instances via majority voting. Batches go through
+CompiledLabelingFunctions, which indexes every function's keywords at once
+so each text is scanned a single time whatever the number of functions.
 """
 
 import logging
@@ -22,6 +24,8 @@ logger = logging.getLogger(__name__)
 
 ABSTAIN = "__ABSTAIN__"
 
+_WORD_RUN = re.compile(r'\w+')
+
 
 @dataclass
 class LabelingFunction:
@@ -415,6 +419,8 @@ class LabelingFunctionApplier:
 
     def __init__(self, vote_threshold: float = 0.5):
         self._vote_threshold = vote_threshold
+        self._compiled: Optional['CompiledLabelingFunctions'] = None
+        self._compiled_key: Optional[tuple] = None
 
     def apply(
         self,
@@ -446,6 +452,12 @@ class LabelingFunctionApplier:
                     confidence=fn.confidence,
                 ))
 
+        return self._vote(instance_id, votes)
+
+    def _vote(
+        self, instance_id: str, votes: List[LabelingFunctionVote]
+    ) -> ApplyResult:
+        """Turn the votes for one instance into an ApplyResult."""
         if not votes:
             return ApplyResult(instance_id=instance_id, abstained=True)
 
@@ -497,10 +509,23 @@ class LabelingFunctionApplier:
                 for inst in instances
             ]
 
-        return [
-            self.apply(inst['instance_id'], inst['text'], enabled)
-            for inst in instances
-        ]
+        return self.compile(enabled).apply_batch(instances)
+
+    def compile(
+        self, functions: List[LabelingFunction]
+    ) -> 'CompiledLabelingFunctions':
+        """Index the enabled functions' keywords, reusing the last index
+        while the functions' ids, labels, confidences and keywords are
+        unchanged."""
+        enabled = [f for f in functions if f.enabled]
+        key = tuple(
+            (f.id, f.label, f.confidence, f.condition, f.extracted_from_reasoning)
+            for f in enabled
+        )
+        if self._compiled is None or self._compiled_key != key:
+            self._compiled = CompiledLabelingFunctions(enabled, self)
+            self._compiled_key = key
+        return self._compiled
 
     def _matches(self, fn: LabelingFunction, text_lower: str) -> bool:
         """Check if a labeling function matches the given text.
@@ -542,6 +567,159 @@ class LabelingFunctionApplier:
         return keywords
 
 
+class CompiledLabelingFunctions:
+    """Every function's keywords compiled into one index.
+
+    ``LabelingFunctionApplier.apply`` tests each function's keywords against
+    the text in turn. Here all keywords go into one lookup: a keyword made
+    only of word characters can only occur inside a single ``\\w+`` run of
+    the text, so each distinct token is looked up once (and cached) for the
+    keywords it contains. Other keywords (phrases, punctuation) are checked
+    with ``in`` only on texts whose tokens contain their longest word run.
+    Matches are identical to the per-function path; votes come out as a
+    sparse instance x function matrix and are aggregated with NumPy. The
+    vote objects are built once per function and shared between results.
+    """
+
+    def __init__(self, functions: List[LabelingFunction],
+                 applier: 'LabelingFunctionApplier'):
+        self.functions = [f for f in functions if f.enabled]
+        self._applier = applier
+
+        keyword_functions: Dict[str, List[int]] = {}
+        for index, fn in enumerate(self.functions):
+            for kw in dict.fromkeys(applier._get_keywords(fn)):
+                keyword_functions.setdefault(kw, []).append(index)
+
+        # needle -> functions voting when it occurs (word keywords)
+        self._word_keywords: Dict[str, List[int]] = {}
+        # needle -> phrases that can only occur where it does
+        self._anchored: Dict[str, List[str]] = {}
+        self._phrases: Dict[str, List[int]] = {}
+        self._unanchored: List[str] = []
+        for kw, indices in keyword_functions.items():
+            if _WORD_RUN.fullmatch(kw):
+                self._word_keywords[kw] = indices
+                continue
+            self._phrases[kw] = indices
+            runs = _WORD_RUN.findall(kw)
+            if runs:
+                self._anchored.setdefault(max(runs, key=len), []).append(kw)
+            else:
+                self._unanchored.append(kw)
+
+        self._needles = set(self._word_keywords) | set(self._anchored)
+        self._lengths = sorted({len(n) for n in self._needles})
+        # token -> (functions its word keywords vote for, phrases to verify)
+        self._token_hits: Dict[str, Tuple[frozenset, Tuple[str, ...]]] = {}
+        self._votes = [
+            LabelingFunctionVote(function_id=fn.id, label=fn.label,
+                                 confidence=fn.confidence)
+            for fn in self.functions
+        ]
+
+    def _hits(self, token: str) -> Tuple[frozenset, Tuple[str, ...]]:
+        hits = self._token_hits.get(token)
+        if hits is None:
+            needles = set()
+            size = len(token)
+            for length in self._lengths:
+                if length > size:
+                    break
+                for start in range(size - length + 1):
+                    piece = token[start:start + length]
+                    if piece in self._needles:
+                        needles.add(piece)
+            functions = set()
+            phrases: List[str] = []
+            for needle in needles:
+                functions.update(self._word_keywords.get(needle, ()))
+                phrases.extend(self._anchored.get(needle, ()))
+            hits = self._token_hits[token] = (frozenset(functions), tuple(phrases))
+        return hits
+
+    def match(self, text: str) -> List[int]:
+        """Indices (in function order) of the functions matching ``text``."""
+        text_lower = text.lower()
+        matched = set()
+        phrases = set(self._unanchored)
+        token_hits = self._token_hits
+        for token in set(_WORD_RUN.findall(text_lower)):
+            hits = token_hits.get(token) or self._hits(token)
+            matched.update(hits[0])
+            phrases.update(hits[1])
+        for phrase in phrases:
+            if phrase in text_lower:
+                matched.update(self._phrases[phrase])
+        return sorted(matched)
+
+    def vote_matrix(self, texts: List[str]):
+        """Sparse instance x function votes as COO ``(rows, cols)`` arrays,
+        ordered by row and then function."""
+        import numpy as np
+
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, text in enumerate(texts):
+            matched = self.match(text)
+            rows.extend([row] * len(matched))
+            cols.extend(matched)
+        return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+    def apply_batch(self, instances: List[Dict[str, str]]) -> List[ApplyResult]:
+        """Apply the functions to every instance; same results as calling
+        ``LabelingFunctionApplier.apply`` on each."""
+        import numpy as np
+
+        rows, cols = self.vote_matrix([inst['text'] for inst in instances])
+        n = len(instances)
+        if not len(rows):
+            return [ApplyResult(instance_id=inst['instance_id'], abstained=True)
+                    for inst in instances]
+
+        labels = list(dict.fromkeys(fn.label for fn in self.functions))
+        label_index = {label: i for i, label in enumerate(labels)}
+        fn_label = np.array([label_index[fn.label] for fn in self.functions], dtype=np.int64)
+        fn_conf = np.array([fn.confidence for fn in self.functions], dtype=np.float64)
+
+        scores = np.zeros((n, len(labels)))
+        np.add.at(scores, (rows, fn_label[cols]), fn_conf[cols])
+        best = scores.argmax(axis=1)
+        top = scores[np.arange(n), best]
+        total = scores.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            agreement = np.where(total > 0, top / total, 0.0)
+        # apply() breaks exact ties by vote order and sums in label order, so
+        # tied rows and rows within rounding of the threshold are redone
+        # there to get the same decision.
+        threshold = self._applier._vote_threshold
+        redo = ((scores == top[:, None]).sum(axis=1) > 1) | \
+            (np.abs(agreement - threshold) <= 1e-9)
+        bounds = np.searchsorted(rows, np.arange(n + 1)).tolist()
+        col_list = cols.tolist()
+        redo, agreement, best = redo.tolist(), agreement.tolist(), best.tolist()
+
+        results = []
+        for row, inst in enumerate(instances):
+            start, end = bounds[row], bounds[row + 1]
+            if start == end:
+                results.append(ApplyResult(instance_id=inst['instance_id'], abstained=True))
+                continue
+            votes = [self._votes[c] for c in col_list[start:end]]
+            if redo[row]:
+                results.append(self._applier._vote(inst['instance_id'], votes))
+                continue
+            share = agreement[row]
+            if share < threshold:
+                results.append(ApplyResult(instance_id=inst['instance_id'], votes=votes,
+                                           abstained=True, vote_agreement=share))
+            else:
+                results.append(ApplyResult(instance_id=inst['instance_id'],
+                                           label=labels[best[row]], votes=votes,
+                                           abstained=False, vote_agreement=share))
+        return results
+
+
 class LabelingFunctionManager:
     """Manages the lifecycle of labeling functions.
 
@@ -670,10 +848,8 @@ class LabelingFunctionManager:
         labeled = []
         remaining = []
 
-        for inst in instances:
-            result = self._applier.apply(
-                inst['instance_id'], inst['text'], enabled
-            )
+        results = self._applier.apply_batch(instances, enabled)
+        for inst, result in zip(instances, results):
             if result.abstained:
                 remaining.append(inst)
                 self._instances_abstained += 1
@@ -65,7 +65,10 @@ class LLMLabelingThread(threading.Thread):
     Background thread for LLM labeling.
 
     Continuously labels instances from a queue, respecting configured
-    limits on parallel labeling and batch sizes.
+    limits on parallel labeling and batch sizes. With
+    ``batches.labeling_concurrency`` above 1, run() starts that many workers
+    draining the same queue; every request goes through the endpoint's shared
+    throttle (``batches.requests_per_second`` plus adaptive backoff).
     """
 
     def __init__(
@@ -104,7 +107,8 @@ class LLMLabelingThread(threading.Thread):
         # Instance queue
         self._queue: Queue = Queue()
 
-        # State
+        # State (updated by every worker)
+        self._stats_lock = threading.Lock()
         self._labeled_count = 0
         self._error_count = 0
         self._last_error: Optional[str] = None
@@ -228,10 +232,40 @@ class LLMLabelingThread(threading.Thread):
         """Get the current queue size."""
         return self._queue.qsize()
 
+    def get_concurrency(self) -> int:
+        """Number of labeling requests to keep in flight."""
+        try:
+            return max(1, int(self.solo_config.batches.labeling_concurrency))
+        except (AttributeError, TypeError, ValueError):
+            return 1
+
+    def _get_throttle(self, endpoint: Any):
+        """Shared throttle for the backend behind ``endpoint``."""
+        from potato.ai.request_throttle import get_endpoint_throttle
+        try:
+            rate = float(self.solo_config.batches.requests_per_second)
+        except (AttributeError, TypeError, ValueError):
+            rate = 0.0
+        return get_endpoint_throttle(endpoint, rate)
+
     def run(self) -> None:
-        """Main thread loop."""
+        """Main thread loop; starts extra workers when concurrency > 1."""
         logger.info("LLM labeling thread started")
 
+        workers = [
+            threading.Thread(target=self._work, name=f"LLMLabelingWorker-{n}", daemon=True)
+            for n in range(1, self.get_concurrency())
+        ]
+        for worker in workers:
+            worker.start()
+        self._work()
+        for worker in workers:
+            worker.join()
+
+        logger.info("LLM labeling thread stopped")
+
+    def _work(self) -> None:
+        """Label queued items until stopped."""
         while not self._stop_event.is_set():
             # Check pause
             while self._pause_event.is_set() and not self._stop_event.is_set():
@@ -242,6 +276,9 @@ class LLMLabelingThread(threading.Thread):
                 item = self._queue.get(timeout=1.0)
 
                 if item is None:  # Sentinel
+                    # Pass it on so every worker wakes up and sees the stop.
+                    if self._stop_event.is_set():
+                        self._queue.put(None)
                     continue
 
                 # Process the item
@@ -252,21 +289,22 @@ class LLMLabelingThread(threading.Thread):
                 )
 
                 if result:
-                    self._labeled_count += 1
+                    with self._stats_lock:
+                        self._labeled_count += 1
                     self.result_callback(result)
                 else:
-                    self._error_count += 1
+                    with self._stats_lock:
+                        self._error_count += 1
 
             except Empty:
                 continue
             except Exception as e:
                 logger.error(f"Error in labeling thread: {e}")
-                self._error_count += 1
-                self._last_error = str(e)
+                with self._stats_lock:
+                    self._error_count += 1
+                    self._last_error = str(e)
                 time.sleep(1)  # Back off on error
 
-        logger.info("LLM labeling thread stopped")
-
     @staticmethod
     def create_endpoint_from_model_config(model_config):
         """Create an AI endpoint from a ModelConfig."""
@@ -274,6 +312,13 @@ class LLMLabelingThread(threading.Thread):
         endpoint_config = model_config.to_endpoint_config()
         return AIEndpointFactory.create_endpoint(endpoint_config)
 
+    def get_prompt_batch_size(self) -> int:
+        """Instances packed into one labeling request (1 = unbatched)."""
+        try:
+            return max(1, int(self.solo_config.batches.prompt_batch_size))
+        except (AttributeError, TypeError, ValueError):
+            return 1
+
     def _label_instance(
         self,
         instance_id: str,
@@ -293,55 +338,210 @@ class LLMLabelingThread(threading.Thread):
             return None
 
         try:
-            # Get schema info
-            schemes = self.config.get('annotation_schemes', [])
-            schema_info = next(
-                (s for s in schemes if s.get('name') == schema_name),
-                None
-            )
-            if not schema_info:
-                logger.warning(f"Schema {schema_name} not found")
+            task = self._labeling_task(schema_name)
+            if task is None:
                 return None
+            full_prompt = self._single_prompt(prompt, task, text)
+
+            # Query endpoint
+            from pydantic import BaseModel
+
+            class LabelResponse(BaseModel):
+                label: str
+                confidence: float = 50.0
+                reasoning: str = ""
+
+            response = self._get_throttle(endpoint).call(
+                endpoint.query, full_prompt, LabelResponse
+            )
 
-            # Build labeling prompt
-            labels = self._extract_labels(schema_info)
-            is_multiselect = schema_info.get('annotation_type') == 'multiselect'
-            is_span = schema_info.get('annotation_type') == 'span'
-            if is_multiselect:
-                label_hint = "comma-separated list of ALL applicable labels"
-            elif is_span:
-                label_hint = ('JSON array of objects like '
-                              '[{"text": "<exact substring copied from the text>", '
-                              '"label": "<one of the available labels>"}] '
-                              'for every span to mark; use [] if nothing applies')
+            # Parse response
+            if isinstance(response, str):
+                response_data = self._parse_json_response(response)
+            elif hasattr(response, 'model_dump'):
+                response_data = response.model_dump()
             else:
-                label_hint = "your label"
-
-            # Check if edge case rule extraction is enabled
-            ecr_config = getattr(self.solo_config, 'edge_case_rules', None)
-            request_edge_case = (
-                ecr_config is not None
-                and ecr_config.enabled
-                and ecr_config.auto_extract_on_labeling
+                response_data = response
+
+            return self._build_result(
+                instance_id, text, schema_name, task, response_data,
+                full_prompt, endpoint,
+            )
+
+        except Exception as e:
+            logger.error(f"Error labeling {instance_id}: {e}")
+            return LabelingResult(
+                instance_id=instance_id,
+                schema_name=schema_name,
+                label=None,
+                confidence=0,
+                uncertainty=1,
+                reasoning="",
+                prompt_version=0,
+                model_name='',
+                error=str(e)
+            )
+
+    def _label_instances(
+        self,
+        items: List[Dict[str, Any]],
+        schema_name: str,
+        endpoint=None,
+    ) -> List[Optional[LabelingResult]]:
+        """
+        Label several instances, packing ``batches.prompt_batch_size`` per request.
+
+        Args:
+            items: List of {'instance_id': str, 'text': str}
+            schema_name: The schema to label for
+            endpoint: Optional endpoint override (as for _label_instance)
+
+        Returns:
+            One result per item, in input order. Items the batched response
+            leaves out or answers with an invalid label are re-labeled alone.
+        """
+        from potato.ai.prompt_batching import chunked
+
+        size = self.get_prompt_batch_size()
+        if size <= 1:
+            return [
+                self._label_instance(item['instance_id'], item['text'], schema_name, endpoint)
+                for item in items
+            ]
+        results = []
+        for chunk in chunked(items, size):
+            results.extend(self._label_chunk(chunk, schema_name, endpoint))
+        return results
+
+    def _label_chunk(
+        self,
+        chunk: List[Dict[str, Any]],
+        schema_name: str,
+        endpoint=None,
+    ) -> List[Optional[LabelingResult]]:
+        """Label one batch of instances with a single request."""
+        if len(chunk) == 1:
+            return [self._label_instance(chunk[0]['instance_id'], chunk[0]['text'],
+                                         schema_name, endpoint)]
+        if endpoint is None:
+            endpoint = self._get_endpoint()
+        if endpoint is None:
+            return [None] * len(chunk)
+
+        prompt = self.prompt_getter()
+        if not prompt:
+            logger.warning("No prompt available for labeling")
+            return [None] * len(chunk)
+
+        task = self._labeling_task(schema_name)
+        if task is None:
+            return [None] * len(chunk)
+
+        from potato.ai.prompt_batching import batch_response_model, parse_batch_response
+        from pydantic import BaseModel
+
+        class LabelResponse(BaseModel):
+            label: str
+            confidence: float = 50.0
+            reasoning: str = ""
+
+        batch_prompt = self._batch_prompt(prompt, task, [item['text'] for item in chunk])
+        try:
+            response = self._get_throttle(endpoint).call(
+                endpoint.query, batch_prompt, batch_response_model(LabelResponse)
             )
+            answers = parse_batch_response(
+                response, len(chunk), getattr(endpoint, 'parseStringToJson', None))
+        except Exception as e:
+            logger.warning(
+                f"Batched labeling request failed, labeling {len(chunk)} "
+                f"instances one at a time: {e}"
+            )
+            answers = {}
 
-            # Build ICL examples section if available
-            icl_section = ""
-            if self.examples_getter:
+        results = []
+        for number, item in enumerate(chunk, 1):
+            result = None
+            answer = answers.get(number)
+            if answer and answer.get('label') not in (None, ''):
                 try:
-                    examples = self.examples_getter()
-                    if examples:
-                        icl_lines = ["## Examples"]
-                        for ex in examples:
-                            icl_lines.append(f'Text: "{ex["text"]}"')
-                            icl_lines.append(f'Label: {ex["label"]}')
-                            icl_lines.append("")
-                        icl_section = "\n".join(icl_lines) + "\n"
-                except Exception:
-                    pass
-
-            if request_edge_case:
-                full_prompt = f"""{prompt}
+                    result = self._build_result(
+                        item['instance_id'], item['text'], schema_name, task, answer,
+                        self._single_prompt(prompt, task, item['text']), endpoint,
+                    )
+                except Exception as e:
+                    logger.debug(f"Could not use batched answer for {item['instance_id']}: {e}")
+                if result is not None and result.error:
+                    result = None
+            if result is None:
+                result = self._label_instance(item['instance_id'], item['text'],
+                                              schema_name, endpoint)
+            results.append(result)
+        return results
+
+    def _labeling_task(self, schema_name: str) -> Optional[Dict[str, Any]]:
+        """Schema-dependent prompt parts shared by every instance of a schema."""
+        schemes = self.config.get('annotation_schemes', [])
+        schema_info = next(
+            (s for s in schemes if s.get('name') == schema_name),
+            None
+        )
+        if not schema_info:
+            logger.warning(f"Schema {schema_name} not found")
+            return None
+
+        is_multiselect = schema_info.get('annotation_type') == 'multiselect'
+        is_span = schema_info.get('annotation_type') == 'span'
+        if is_multiselect:
+            label_hint = "comma-separated list of ALL applicable labels"
+        elif is_span:
+            label_hint = ('JSON array of objects like '
+                          '[{"text": "<exact substring copied from the text>", '
+                          '"label": "<one of the available labels>"}] '
+                          'for every span to mark; use [] if nothing applies')
+        else:
+            label_hint = "your label"
+
+        # Check if edge case rule extraction is enabled
+        ecr_config = getattr(self.solo_config, 'edge_case_rules', None)
+        request_edge_case = (
+            ecr_config is not None
+            and ecr_config.enabled
+            and ecr_config.auto_extract_on_labeling
+        )
+
+        # Build ICL examples section if available
+        icl_section = ""
+        if self.examples_getter:
+            try:
+                examples = self.examples_getter()
+                if examples:
+                    icl_lines = ["## Examples"]
+                    for ex in examples:
+                        icl_lines.append(f'Text: "{ex["text"]}"')
+                        icl_lines.append(f'Label: {ex["label"]}')
+                        icl_lines.append("")
+                    icl_section = "\n".join(icl_lines) + "\n"
+            except Exception:
+                pass
+
+        return {
+            'schema_info': schema_info,
+            'labels': self._extract_labels(schema_info),
+            'label_hint': label_hint,
+            'is_multiselect': is_multiselect,
+            'is_span': is_span,
+            'request_edge_case': request_edge_case,
+            'icl_section': icl_section,
+        }
+
+    def _single_prompt(self, prompt: str, task: Dict[str, Any], text: str) -> str:
+        """The labeling prompt for one instance."""
+        icl_section = task['icl_section']
+        labels = task['labels']
+        label_hint = task['label_hint']
+        if task['request_edge_case']:
+            return f"""{prompt}
 
 {icl_section}Text to label:
 {text}
@@ -357,8 +557,7 @@ Respond with JSON. If you are uncertain about the label (confidence below 75), a
     "edge_case_rule": "<When [condition] -> [action]> (only if is_edge_case is true)"
 }}
 """
-            else:
-                full_prompt = f"""{prompt}
+        return f"""{prompt}
 
 {icl_section}Text to label:
 {text}
@@ -373,175 +572,205 @@ Respond with JSON:
 }}
 """
 
-            # Query endpoint
-            from pydantic import BaseModel
-
-            class LabelResponse(BaseModel):
-                label: str
-                confidence: float = 50.0
-                reasoning: str = ""
-
-            response = endpoint.query(full_prompt, LabelResponse)
-
-            # Parse response
-            if isinstance(response, str):
-                response_data = self._parse_json_response(response)
-            elif hasattr(response, 'model_dump'):
-                response_data = response.model_dump()
-            else:
-                response_data = response
+    def _batch_prompt(self, prompt: str, task: Dict[str, Any], texts: List[str]) -> str:
+        """One labeling prompt covering several numbered instances."""
+        from potato.ai.prompt_batching import format_numbered_items
+
+        icl_section = task['icl_section']
+        labels = task['labels']
+        label_hint = task['label_hint']
+        if task['request_edge_case']:
+            instructions = (
+                "Label each text independently. If you are uncertain about a label "
+                "(confidence below 75), also identify a generalizable edge case rule "
+                "that describes when this type of ambiguity occurs. Respond with JSON "
+                "holding one entry per text, using the text's number as \"id\":"
+            )
+            entry = f"""{{
+        "id": <text number>,
+        "label": "<{label_hint}, or -1 if unclassifiable>",
+        "confidence": <0-100>,
+        "reasoning": "<brief explanation>",
+        "is_edge_case": <true if this is an ambiguous/edge case, false otherwise>,
+        "edge_case_rule": "<When [condition] -> [action]> (only if is_edge_case is true)"
+    }}"""
+        else:
+            instructions = (
+                "Label each text independently. Respond with JSON holding one entry "
+                "per text, using the text's number as \"id\":"
+            )
+            entry = f"""{{
+        "id": <text number>,
+        "label": "<{label_hint}>",
+        "confidence": <0-100>,
+        "reasoning": "<brief explanation>"
+    }}"""
+        return f"""{prompt}
 
-            label = response_data.get('label', '')
-            confidence = float(response_data.get('confidence', 50)) / 100.0
-            reasoning = response_data.get('reasoning', '')
+{icl_section}Texts to label:
+{format_numbered_items(texts)}
 
-            # Validate label
-            valid_labels = self._get_valid_labels(schema_info)
-            if is_span:
-                # The model returns [{"text","label"}]; locate each snippet's
-                # char offsets in the source text and store as a JSON array of
-                # {start, end, text, label} (the human span format).
-                try:
-                    raw = label if isinstance(label, list) else json.loads(str(label))
-                except (ValueError, TypeError):
-                    raw = []
-                spans_out = []
-                if isinstance(raw, list):
-                    for sp in raw:
-                        if not isinstance(sp, dict):
-                            continue
-                        snippet = str(sp.get('text', '')).strip()
-                        lbl = str(sp.get('label', ''))
-                        if not snippet:
-                            continue
-                        idx = text.find(snippet)
-                        if idx < 0:
-                            continue
-                        if valid_labels and lbl not in valid_labels:
-                            m = self._fuzzy_match_label(lbl, valid_labels)
-                            lbl = m if m else lbl
-                        spans_out.append({
-                            'start': idx, 'end': idx + len(snippet),
-                            'text': snippet, 'label': lbl,
-                        })
-                label = json.dumps(spans_out)
-            elif is_multiselect:
-                # The model may return one or more labels (comma/JSON). Validate
-                # each against the label set and store as a JSON array string so
-                # it matches the human multiselect format and the agreement
-                # check's set parsing.
-                if isinstance(label, list):
-                    parts = [str(p) for p in label]
-                else:
-                    parts = [p.strip() for p in re.split(r'[;,]', str(label)) if p.strip()]
-                matched = []
-                for p in parts:
-                    if valid_labels and p not in valid_labels:
-                        m = self._fuzzy_match_label(p, valid_labels)
-                        if m:
-                            matched.append(m)
-                    elif p:
-                        matched.append(p)
-                # de-duplicate, preserve order
-                seen = set()
-                matched = [x for x in matched if not (x in seen or seen.add(x))]
-                if not matched:
-                    return LabelingResult(
-                        instance_id=instance_id, schema_name=schema_name,
-                        label=None, confidence=0, uncertainty=1, reasoning="",
-                        prompt_version=0, model_name=getattr(endpoint, 'model', ''),
-                        error="No valid labels returned",
-                    )
-                label = json.dumps(matched)
-            elif valid_labels and label not in valid_labels:
-                label = self._fuzzy_match_label(label, valid_labels)
-                if label is None:
-                    return LabelingResult(
-                        instance_id=instance_id,
-                        schema_name=schema_name,
-                        label=None,
-                        confidence=0,
-                        uncertainty=1,
-                        reasoning="",
-                        prompt_version=0,
-                        model_name=getattr(endpoint, 'model', ''),
-                        error="Invalid label returned"
-                    )
+Available labels: {labels}
 
-            # Estimate uncertainty using configured strategy
-            uncertainty = 1.0 - confidence
-            estimator = self._get_uncertainty_estimator()
-            if estimator:
-                try:
-                    logger.debug(f"Running uncertainty estimation ({estimator.__class__.__name__}) for {instance_id}")
-                    estimate = estimator.estimate_uncertainty(
-                        instance_id=instance_id,
-                        text=text,
-                        prompt=full_prompt,
-                        predicted_label=label,
-                        endpoint=endpoint,
-                        schema_info=schema_info
-                    )
-                    uncertainty = estimate.uncertainty_score
-                    confidence = estimate.confidence_score
-                    logger.debug(
-                        f"Uncertainty estimate for {instance_id}: "
-                        f"conf={confidence:.3f}, unc={uncertainty:.3f}, "
-                        f"method={estimate.method}"
-                    )
-                except Exception as e:
-                    logger.warning(f"Uncertainty estimation failed for {instance_id}: {e}")
-
-            # Extract edge case rule if present
-            is_edge_case = False
-            edge_case_rule = None
-            edge_case_condition = None
-            edge_case_action = None
-
-            if request_edge_case and response_data.get('is_edge_case'):
-                raw_rule = response_data.get('edge_case_rule', '')
-                if raw_rule:
-                    is_edge_case = True
-                    edge_case_rule = raw_rule
-                    edge_case_condition, edge_case_action = (
-                        self._parse_edge_case_rule(raw_rule)
-                    )
+{instructions}
+{{"items": [
+    {entry}
+]}}
+"""
 
-            prompt_version = 0
-            if self.prompt_version_getter:
-                try:
-                    prompt_version = self.prompt_version_getter()
-                except Exception:
-                    pass
+    def _build_result(
+        self,
+        instance_id: str,
+        text: str,
+        schema_name: str,
+        task: Dict[str, Any],
+        response_data: Dict[str, Any],
+        full_prompt: str,
+        endpoint: Any,
+    ) -> LabelingResult:
+        """Validate one parsed answer and turn it into a LabelingResult."""
+        schema_info = task['schema_info']
+        is_span = task['is_span']
+        is_multiselect = task['is_multiselect']
+        request_edge_case = task['request_edge_case']
+
+        label = response_data.get('label', '')
+        confidence = float(response_data.get('confidence', 50)) / 100.0
+        reasoning = response_data.get('reasoning', '')
+
+        # Validate label
+        valid_labels = self._get_valid_labels(schema_info)
+        if is_span:
+            # The model returns [{"text","label"}]; locate each snippet's
+            # char offsets in the source text and store as a JSON array of
+            # {start, end, text, label} (the human span format).
+            try:
+                raw = label if isinstance(label, list) else json.loads(str(label))
+            except (ValueError, TypeError):
+                raw = []
+            spans_out = []
+            if isinstance(raw, list):
+                for sp in raw:
+                    if not isinstance(sp, dict):
+                        continue
+                    snippet = str(sp.get('text', '')).strip()
+                    lbl = str(sp.get('label', ''))
+                    if not snippet:
+                        continue
+                    idx = text.find(snippet)
+                    if idx < 0:
+                        continue
+                    if valid_labels and lbl not in valid_labels:
+                        m = self._fuzzy_match_label(lbl, valid_labels)
+                        lbl = m if m else lbl
+                    spans_out.append({
+                        'start': idx, 'end': idx + len(snippet),
+                        'text': snippet, 'label': lbl,
+                    })
+            label = json.dumps(spans_out)
+        elif is_multiselect:
+            # The model may return one or more labels (comma/JSON). Validate
+            # each against the label set and store as a JSON array string so
+            # it matches the human multiselect format and the agreement
+            # check's set parsing.
+            if isinstance(label, list):
+                parts = [str(p) for p in label]
+            else:
+                parts = [p.strip() for p in re.split(r'[;,]', str(label)) if p.strip()]
+            matched = []
+            for p in parts:
+                if valid_labels and p not in valid_labels:
+                    m = self._fuzzy_match_label(p, valid_labels)
+                    if m:
+                        matched.append(m)
+                elif p:
+                    matched.append(p)
+            # de-duplicate, preserve order
+            seen = set()
+            matched = [x for x in matched if not (x in seen or seen.add(x))]
+            if not matched:
+                return LabelingResult(
+                    instance_id=instance_id, schema_name=schema_name,
+                    label=None, confidence=0, uncertainty=1, reasoning="",
+                    prompt_version=0, model_name=getattr(endpoint, 'model', ''),
+                    error="No valid labels returned",
+                )
+            label = json.dumps(matched)
+        elif valid_labels and label not in valid_labels:
+            label = self._fuzzy_match_label(label, valid_labels)
+            if label is None:
+                return LabelingResult(
+                    instance_id=instance_id,
+                    schema_name=schema_name,
+                    label=None,
+                    confidence=0,
+                    uncertainty=1,
+                    reasoning="",
+                    prompt_version=0,
+                    model_name=getattr(endpoint, 'model', ''),
+                    error="Invalid label returned"
+                )
 
-            return LabelingResult(
-                instance_id=instance_id,
-                schema_name=schema_name,
-                label=label,
-                confidence=confidence,
-                uncertainty=uncertainty,
-                reasoning=reasoning,
-                prompt_version=prompt_version,
-                model_name=getattr(endpoint, 'model', ''),
-                is_edge_case=is_edge_case,
-                edge_case_rule=edge_case_rule,
-                edge_case_condition=edge_case_condition,
-                edge_case_action=edge_case_action,
-            )
+        # Estimate uncertainty using configured strategy
+        uncertainty = 1.0 - confidence
+        estimator = self._get_uncertainty_estimator()
+        if estimator:
+            try:
+                logger.debug(f"Running uncertainty estimation ({estimator.__class__.__name__}) for {instance_id}")
+                estimate = estimator.estimate_uncertainty(
+                    instance_id=instance_id,
+                    text=text,
+                    prompt=full_prompt,
+                    predicted_label=label,
+                    endpoint=endpoint,
+                    schema_info=schema_info
+                )
+                uncertainty = estimate.uncertainty_score
+                confidence = estimate.confidence_score
+                logger.debug(
+                    f"Uncertainty estimate for {instance_id}: "
+                    f"conf={confidence:.3f}, unc={uncertainty:.3f}, "
+                    f"method={estimate.method}"
+                )
+            except Exception as e:
+                logger.warning(f"Uncertainty estimation failed for {instance_id}: {e}")
+
+        # Extract edge case rule if present
+        is_edge_case = False
+        edge_case_rule = None
+        edge_case_condition = None
+        edge_case_action = None
+
+        if request_edge_case and response_data.get('is_edge_case'):
+            raw_rule = response_data.get('edge_case_rule', '')
+            if raw_rule:
+                is_edge_case = True
+                edge_case_rule = raw_rule
+                edge_case_condition, edge_case_action = (
+                    self._parse_edge_case_rule(raw_rule)
+                )
 
-        except Exception as e:
-            logger.error(f"Error labeling {instance_id}: {e}")
-            return LabelingResult(
-                instance_id=instance_id,
-                schema_name=schema_name,
-                label=None,
-                confidence=0,
-                uncertainty=1,
-                reasoning="",
-                prompt_version=0,
-                model_name='',
-                error=str(e)
-            )
+        prompt_version = 0
+        if self.prompt_version_getter:
+            try:
+                prompt_version = self.prompt_version_getter()
+            except Exception:
+                pass
+
+        return LabelingResult(
+            instance_id=instance_id,
+            schema_name=schema_name,
+            label=label,
+            confidence=confidence,
+            uncertainty=uncertainty,
+            reasoning=reasoning,
+            prompt_version=prompt_version,
+            model_name=getattr(endpoint, 'model', ''),
+            is_edge_case=is_edge_case,
+            edge_case_rule=edge_case_rule,
+            edge_case_condition=edge_case_condition,
+            edge_case_action=edge_case_action,
+        )
 
     def _extract_labels(self, schema_info: Dict[str, Any]) -> str:
         """Extract label names from schema (for the prompt)."""
@@ -633,11 +862,20 @@ Respond with JSON:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get labeling statistics."""
-        return {
-            'labeled_count': self._labeled_count,
-            'error_count': self._error_count,
+        with self._stats_lock:
+            stats = {
+                'labeled_count': self._labeled_count,
+                'error_count': self._error_count,
+                'last_error': self._last_error,
+            }
+        stats.update({
             'queue_size': self.get_queue_size(),
             'is_paused': self.is_paused(),
             'is_running': self.is_alive(),
-            'last_error': self._last_error,
-        }
+            'concurrency': self.get_concurrency(),
+            'throttle': (
+                self._get_throttle(self._endpoint).get_stats()
+                if self._endpoint is not None else None
+            ),
+        })
+        return stats
@@ -11,6 +11,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Set, Tuple
 import json
 import logging
+import math
 import os
 import threading
 
@@ -19,6 +20,19 @@ from .phase_controller import SoloPhase, SoloPhaseController
 
 logger = logging.getLogger(__name__)
 
+def _confidence_variability(history: Optional[List[Tuple[int, float]]]) -> float:
+    """Sample standard deviation of an instance's confidences.
+
+    The cartography variability, in plain floats: ``statistics.stdev`` is
+    exact but works in fractions, which dominated rebuilding the pools.
+    """
+    if not history or len(history) < 2:
+        return 0.0
+    confidences = [conf for _, conf in history]
+    mean = math.fsum(confidences) / len(confidences)
+    return math.sqrt(math.fsum((c - mean) ** 2 for c in confidences) / (len(confidences) - 1))
+
+
 # Singleton instance
 _SOLO_MODE_MANAGER: Optional['SoloModeManager'] = None
 _SOLO_MODE_LOCK = threading.Lock()
@@ -244,8 +258,24 @@ class SoloModeManager:
         # sampling variance. Lazy-init via _get_eval_endpoint().
         self._eval_endpoint = None
 
-        # State persistence
+        # State persistence: snapshot + journal (see state_store.py). Saves
+        # append the instances marked in _dirty_ids and the head when it
+        # changed; _persisted_refs notices wholesale reassignment of the
+        # per-instance collections, which forces a full snapshot.
         self._state_file = 'solo_mode_state.json'
+        self._state_store = None
+        self._dirty_ids: Set[str] = set()
+        self._persisted_head: Optional[str] = None
+        self._persisted_refs: Optional[Tuple[int, int, int]] = None
+
+        # Human-routing pools (InstancePools), built on the first request and
+        # then updated from _pool_dirty_ids and the sets they mirror; see
+        # _sync_instance_pools.
+        self._instance_pools = None
+        self._pool_key: Optional[Tuple] = None
+        self._pool_seen = 0
+        self._pool_labeled: Set[str] = set()
+        self._pool_dirty_ids: Set[str] = set()
 
         # Solo mode operates on a single annotation scheme throughout (labeling,
         # recording, agreement, prediction all key off schemes[0]). Warn loudly
@@ -785,6 +815,7 @@ class SoloModeManager:
 
                 # Remove from llm_labeled_ids so it can be re-labeled
                 self.llm_labeled_ids.discard(instance_id)
+                self._dirty_ids.add(instance_id)
                 # Track re-annotation count
                 self._reannotation_counts[instance_id] = (
                     self._reannotation_counts.get(instance_id, 0) + 1
@@ -1869,6 +1900,8 @@ class SoloModeManager:
                 self.predictions[instance_id] = {}
             self.predictions[instance_id][schema_name] = prediction
             self.llm_labeled_ids.add(instance_id)
+            self._dirty_ids.add(instance_id)
+            self._pool_dirty_ids.add(instance_id)
 
             # Track confidence history for cartography
             if instance_id not in self.confidence_history:
@@ -1955,6 +1988,7 @@ class SoloModeManager:
             already_counted = prediction.human_label is not None
 
             prediction.human_label = label
+            self._dirty_ids.add(instance_id)
             agrees = self._check_agreement(
                 prediction.predicted_label,
                 label,
@@ -2180,6 +2214,7 @@ class SoloModeManager:
                 return
 
             prediction.human_label = human_label
+            self._dirty_ids.add(instance_id)
             agrees = self._check_agreement(
                 prediction.predicted_label, human_label, schema_name
             )
@@ -2279,6 +2314,7 @@ class SoloModeManager:
 
             prediction.disagreement_resolved = True
             prediction.resolution_label = resolution_label
+            self._dirty_ids.add(instance_id)
 
             self._save_state()
             logger.info(
@@ -2315,53 +2351,82 @@ class SoloModeManager:
             except ValueError:
                 return None
 
-            # Compute available IDs: all instances minus already human-labeled
-            all_ids = set(ism.instance_id_ordering)
-            available = all_ids - self.human_labeled_ids
+            pools = self._sync_instance_pools(ism)
+            return self.instance_selector.select_from_pools(pools)
 
-            if not available:
-                return None
-
-            # Convert predictions to dict format for refresh_pools
-            pred_dicts = {}
-            for iid, schemas in self.predictions.items():
-                pred_dicts[iid] = {
-                    s: p.to_dict() for s, p in schemas.items()
-                }
+    def _sync_instance_pools(self, ism):
+        """Bring the human-routing pools up to date and return them.
 
-            # Get edge case rule IDs if available
-            edge_case_rule_ids = None
-            if self._edge_case_rule_manager is not None:
-                try:
-                    edge_case_rule_ids = self._edge_case_rule_manager.get_rule_instance_ids()
-                except Exception:
-                    pass
+        The pools are rebuilt from scratch the first time, and again when the
+        item manager, the instance ordering, ``predictions``,
+        ``confidence_history`` or ``human_labeled_ids`` has been replaced or
+        the low-confidence threshold changed. Otherwise only what changed
+        since the last request is applied: instances appended to the
+        ordering, newly human-labeled instances, instances whose predictions
+        changed (``_pool_dirty_ids``), and the disagreement and edge-case
+        rule sets (small, so compared whole). Caller holds ``self._lock``.
+        """
+        from .instance_selector import InstancePools
 
-            # Compute cartography scores if history available
-            cartography_variability = None
-            if self.confidence_history:
-                cartography = self.get_cartography_scores()
-                if cartography:
-                    cartography_variability = {
-                        iid: s['variability']
-                        for iid, s in cartography.items()
-                    }
+        ordering = ism.instance_id_ordering
+        threshold = self.config.thresholds.confidence_low
+        key = (id(ism), id(ordering), id(self.predictions),
+               id(self.confidence_history), id(self.human_labeled_ids), threshold)
+        pools = self._instance_pools
 
-            # Refresh pools with current data
-            self.instance_selector.refresh_pools(
-                available_ids=available,
-                llm_predictions=pred_dicts,
-                disagreement_ids=self.disagreement_ids,
-                confidence_threshold=self.config.thresholds.confidence_low,
-                edge_case_rule_ids=edge_case_rule_ids,
-                cartography_scores=cartography_variability,
+        if pools is None or key != self._pool_key or len(ordering) < self._pool_seen:
+            pools = InstancePools(threshold)
+            for instance_id in self.human_labeled_ids:
+                pools.mark_labeled(instance_id)
+            for instance_id in self.predictions.keys() | self.confidence_history.keys():
+                self._update_pool_signals(pools, instance_id)
+            pools.add_instances(ordering)
+            pools.set_diverse_ordering(
+                self.instance_selector._build_diverse_pool(list(pools.available))
             )
+            self._instance_pools = pools
+            self._pool_key = key
+            self._pool_seen = len(ordering)
+            self._pool_labeled = set(self.human_labeled_ids)
+            self._pool_dirty_ids.clear()
+        else:
+            if len(self.human_labeled_ids) != len(self._pool_labeled):
+                for instance_id in self.human_labeled_ids - self._pool_labeled:
+                    pools.mark_labeled(instance_id)
+                    self._pool_labeled.add(instance_id)
+            for instance_id in self._pool_dirty_ids:
+                self._update_pool_signals(pools, instance_id)
+            self._pool_dirty_ids.clear()
+            if len(ordering) > self._pool_seen:
+                added = ordering[self._pool_seen:]
+                self._pool_seen = len(ordering)
+                pools.add_instances(added)
+                pools.set_diverse_ordering(
+                    self.instance_selector._build_diverse_pool(list(pools.available))
+                )
 
-            # Select next instance
-            return self.instance_selector.select_next(
-                available_ids=available,
-                exclude_ids=self.human_labeled_ids,
-            )
+        pools.set_disagreement_ids(self.disagreement_ids)
+
+        # Get edge case rule IDs if available
+        edge_case_rule_ids = set()
+        if self._edge_case_rule_manager is not None:
+            try:
+                edge_case_rule_ids = self._edge_case_rule_manager.get_rule_instance_ids()
+            except Exception:
+                pass
+        pools.set_edge_case_rule_ids(edge_case_rule_ids or set())
+
+        return pools
+
+    def _update_pool_signals(self, pools, instance_id: str) -> None:
+        """Feed one instance's min confidence and cartography variability."""
+        schemas = self.predictions.get(instance_id)
+        pools.update_prediction(
+            instance_id,
+            min(p.confidence_score for p in schemas.values()) if schemas else None,
+        )
+        history = self.confidence_history.get(instance_id)
+        pools.update_variability(instance_id, _confidence_variability(history))
 
     def get_cartography_scores(self) -> Dict[str, Dict[str, float]]:
         """Compute cartography signals for each instance.
@@ -2693,6 +2758,47 @@ class SoloModeManager:
         except ValueError as e:
             logger.warning(f"Could not advance to final validation: {e}")
 
+    def _map_labeling(self, label_fn, instances: List[Dict[str, Any]]):
+        """Apply ``label_fn`` to each instance, ``labeling_concurrency`` at a time.
+
+        Results are yielded in this thread as requests finish, so result
+        handling (and its locking) stays exactly as in sequential labeling.
+        """
+        concurrency = min(self.config.batches.labeling_concurrency, len(instances))
+        if concurrency <= 1:
+            for inst in instances:
+                yield label_fn(inst)
+            return
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with ThreadPoolExecutor(max_workers=concurrency,
+                                thread_name_prefix="SoloLabeling") as pool:
+            futures = [pool.submit(label_fn, inst) for inst in instances]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _label_prompt_batches(self, thread, instances: List[Dict[str, Any]]):
+        """Label instances ``prompt_batch_size`` per request, grouped by schema.
+
+        Yields one result per instance; requests run concurrently as in
+        _map_labeling.
+        """
+        from potato.ai.prompt_batching import chunked
+
+        by_schema: Dict[str, List[Dict[str, Any]]] = {}
+        for inst in instances:
+            by_schema.setdefault(inst['schema_name'], []).append(inst)
+        chunks = [
+            chunk
+            for group in by_schema.values()
+            for chunk in chunked(group, self.config.batches.prompt_batch_size)
+        ]
+        for results in self._map_labeling(
+            lambda chunk: thread._label_instances(chunk, chunk[0]['schema_name']),
+            chunks,
+        ):
+            yield from results
+
     def _label_batch(self, batch_size: int) -> int:
         """Label a batch of instances. Returns number labeled.
 
@@ -2735,10 +2841,13 @@ class SoloModeManager:
         # Label remaining with LLM
         router = self.confidence_router
         if router is not None:
-            for inst in remaining:
-                result = router.route_instance(
+            routed = self._map_labeling(
+                lambda inst: router.route_instance(
                     inst['instance_id'], inst['text'], inst['schema_name']
-                )
+                ),
+                remaining,
+            )
+            for result in routed:
                 if result.accepted and result.labeling_result:
                     self._handle_labeling_result(result.labeling_result)
                     labeled += 1
@@ -2746,10 +2855,17 @@ class SoloModeManager:
                     self._labeling_error_count += 1
                     self._last_labeling_error = result.labeling_result.error
         else:
-            for inst in remaining:
-                result = self.llm_labeling_thread._label_instance(
-                    inst['instance_id'], inst['text'], inst['schema_name']
+            thread = self.llm_labeling_thread
+            if self.config.batches.prompt_batch_size > 1:
+                results = self._label_prompt_batches(thread, remaining)
+            else:
+                results = self._map_labeling(
+                    lambda inst: thread._label_instance(
+                        inst['instance_id'], inst['text'], inst['schema_name']
+                    ),
+                    remaining,
                 )
+            for result in results:
                 if result and not result.error:
                     self._handle_labeling_result(result)
                     labeled += 1
@@ -2827,9 +2943,17 @@ class SoloModeManager:
 
     # === State Persistence ===
 
-    def _save_state(self) -> None:
+    def _save_state(self, full: bool = False) -> None:
         """Save manager state to disk.
 
+        Appends the instances changed since the last save (tracked in
+        ``_dirty_ids``) and, if it changed, the project-level head to the
+        journal. A full snapshot is written when ``full`` is set, when no
+        snapshot exists yet, or when ``predictions``, ``confidence_history``
+        or ``llm_labeled_ids`` was replaced wholesale. Code that edits an
+        instance's predictions in place outside the manager's own methods
+        should add it to ``_dirty_ids`` or pass ``full=True``.
+
         Thread-safe: acquires self._lock (RLock) so callers that already
         hold the lock won't deadlock, while callers from background threads
         (e.g., labeling loop, rule clustering) are properly serialized.
@@ -2839,59 +2963,95 @@ class SoloModeManager:
 
         with self._lock:
             try:
-                os.makedirs(self.config.state_dir, exist_ok=True)
-                filepath = os.path.join(self.config.state_dir, self._state_file)
-
-                state = {
-                    'task_description': self.task_description,
-                    'current_prompt_version': self.current_prompt_version,
-                    'prompt_versions': [p.to_dict() for p in self.prompt_versions],
-                    'predictions': {
-                        iid: {s: p.to_dict() for s, p in schemas.items()}
-                        for iid, schemas in self.predictions.items()
-                    },
-                    'human_labeled_ids': list(self.human_labeled_ids),
-                    'llm_labeled_ids': list(self.llm_labeled_ids),
-                    'disagreement_ids': list(self.disagreement_ids),
-                    'validation_sample_ids': list(self.validation_sample_ids),
-                    'edge_case_ids': list(self.edge_case_ids),
-                    'edge_case_labels': self.edge_case_labels,
-                    'agreement_metrics': self.agreement_metrics.to_dict(),
-                    'confidence_history': {
-                        iid: entries
-                        for iid, entries in self.confidence_history.items()
-                    },
-                    'reannotation_counts': self._reannotation_counts,
-                    'per_version_agreement': self._per_version_agreement,
-                    'refinement_consecutive_failures': self._refinement_consecutive_failures,
-                    'pending_refinements': self._pending_refinements,
-                    'refinement_log': self._refinement_log[-50:],  # Keep last 50
-                    'icl_library': self._icl_library.to_dict() if self._icl_library else None,
-                }
+                store = self._get_state_store()
+                refs = (id(self.predictions), id(self.confidence_history),
+                        id(self.llm_labeled_ids))
+                head = self._head_state()
+                head_json = json.dumps(head)
+
+                if full or refs != self._persisted_refs or not store.has_snapshot():
+                    head.update(self._instance_state())
+                    store.write_snapshot(head)
+                else:
+                    store.append(
+                        (self._instance_record(iid) for iid in self._dirty_ids),
+                        head_json if head_json != self._persisted_head else None,
+                    )
 
-                # Include edge case rule manager state inline
-                if self._edge_case_rule_manager is not None:
-                    state['edge_case_rule_data'] = self._edge_case_rule_manager.to_dict()
+                self._dirty_ids.clear()
+                self._persisted_refs = refs
+                self._persisted_head = head_json
 
-                # Persist ValidationTracker so confusion matrix and comparison
-                # history survive restarts. Without this, /api/confusion-analysis,
-                # /api/disagreement-explorer, and the dashboard's confusion tab
-                # all reset to empty on every server restart.
-                if self._validation_tracker is not None:
-                    state['validation_tracker'] = self._validation_tracker.to_dict()
+            except Exception as e:
+                logger.error(f"Error saving Solo Mode state: {e}")
 
-                # Include confidence routing stats (informational only)
-                if self._confidence_router is not None:
-                    state['confidence_routing_stats'] = self._confidence_router.get_stats()
+    def _get_state_store(self):
+        """The state store for the configured state_dir (lazily created)."""
+        if self._state_store is None or self._state_store.state_dir != self.config.state_dir:
+            from .state_store import SoloStateStore
+            self._state_store = SoloStateStore(self.config.state_dir, self._state_file)
+        return self._state_store
+
+    def _head_state(self) -> Dict[str, Any]:
+        """Project-level state: everything except the per-instance collections."""
+        state = {
+            'task_description': self.task_description,
+            'current_prompt_version': self.current_prompt_version,
+            'prompt_versions': [p.to_dict() for p in self.prompt_versions],
+            'human_labeled_ids': list(self.human_labeled_ids),
+            'disagreement_ids': list(self.disagreement_ids),
+            'validation_sample_ids': list(self.validation_sample_ids),
+            'edge_case_ids': list(self.edge_case_ids),
+            'edge_case_labels': self.edge_case_labels,
+            'agreement_metrics': self.agreement_metrics.to_dict(),
+            'reannotation_counts': self._reannotation_counts,
+            'per_version_agreement': self._per_version_agreement,
+            'refinement_consecutive_failures': self._refinement_consecutive_failures,
+            'pending_refinements': self._pending_refinements,
+            'refinement_log': self._refinement_log[-50:],  # Keep last 50
+            'icl_library': self._icl_library.to_dict() if self._icl_library else None,
+        }
 
-                # Atomic write
-                temp_path = filepath + '.tmp'
-                with open(temp_path, 'w') as f:
-                    json.dump(state, f, indent=2)
-                os.replace(temp_path, filepath)
+        # Include edge case rule manager state inline
+        if self._edge_case_rule_manager is not None:
+            state['edge_case_rule_data'] = self._edge_case_rule_manager.to_dict()
 
-            except Exception as e:
-                logger.error(f"Error saving Solo Mode state: {e}")
+        # Persist ValidationTracker so confusion matrix and comparison
+        # history survive restarts. Without this, /api/confusion-analysis,
+        # /api/disagreement-explorer, and the dashboard's confusion tab
+        # all reset to empty on every server restart.
+        if self._validation_tracker is not None:
+            state['validation_tracker'] = self._validation_tracker.to_dict()
+
+        # Include confidence routing stats (informational only)
+        if self._confidence_router is not None:
+            state['confidence_routing_stats'] = self._confidence_router.get_stats()
+
+        return state
+
+    def _instance_state(self) -> Dict[str, Any]:
+        """The per-instance collections, in snapshot form."""
+        return {
+            'predictions': {
+                iid: {s: p.to_dict() for s, p in schemas.items()}
+                for iid, schemas in self.predictions.items()
+            },
+            'llm_labeled_ids': list(self.llm_labeled_ids),
+            'confidence_history': {
+                iid: entries
+                for iid, entries in self.confidence_history.items()
+            },
+        }
+
+    def _instance_record(self, instance_id: str) -> Dict[str, Any]:
+        """Journal record holding one instance's full per-instance state."""
+        schemas = self.predictions.get(instance_id)
+        return {
+            'i': instance_id,
+            'p': {s: p.to_dict() for s, p in schemas.items()} if schemas else None,
+            'h': self.confidence_history.get(instance_id),
+            'l': instance_id in self.llm_labeled_ids,
+        }
 
     def load_state(self) -> bool:
         """
@@ -2903,14 +3063,10 @@ class SoloModeManager:
         if not self.config.state_dir:
             return False
 
-        filepath = os.path.join(self.config.state_dir, self._state_file)
-
-        if not os.path.exists(filepath):
-            return False
-
         try:
-            with open(filepath, 'r') as f:
-                state = json.load(f)
+            state = self._get_state_store().load()
+            if state is None:
+                return False
 
             with self._lock:
                 self.task_description = state.get('task_description', '')
@@ -2984,6 +3140,13 @@ class SoloModeManager:
                 if vt_data:
                     self.validation_tracker.from_dict(vt_data)
 
+                # What was just read is what is on disk: later saves only
+                # need to journal changes from here.
+                self._dirty_ids.clear()
+                self._persisted_refs = (id(self.predictions), id(self.confidence_history),
+                                        id(self.llm_labeled_ids))
+                self._persisted_head = None
+
             # Load phase state
             self.phase_controller.load_state()
 
@@ -3315,6 +3478,8 @@ class SoloModeManager:
         """Shutdown the manager, stopping background threads."""
         self.stop_background_labeling()
         self._save_state()
+        if self._state_store is not None:
+            self._state_store.close()
         logger.info("SoloModeManager shutdown complete")
 
 
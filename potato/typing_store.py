@@ -331,6 +331,24 @@ def delete_for_user(task_dir: str, project: str, user_id: str) -> int:
     return cur.rowcount
 
 
+def drop_events_before(task_dir: str, project: str, cutoff: float) -> int:
+    """Discard the raw streams of sessions that ended before ``cutoff``.
+
+    The rows and their summaries stay, so the dashboard and the detector are
+    unaffected; only replay and recomputation from events are lost. Applied by
+    the project's behavioral retention policy
+    (``behavioral_event_store.apply_retention``).
+    """
+    conn = _db(task_dir)
+    cur = conn.execute(
+        "UPDATE typing_sessions SET events = NULL "
+        "WHERE project = ? AND ended_at < ? AND events IS NOT NULL",
+        (project, cutoff),
+    )
+    conn.commit()
+    return cur.rowcount
+
+
 # --------------------------------------------------------------------------
 # Calibration thresholds
 # --------------------------------------------------------------------------
@@ -0,0 +1,202 @@
+"""
+Append-only user registry behind ``authentication.user_config_path``.
+
+The user file is JSONL, one ``{"username": ..., "password": "salt$hash"}``
+object per line. It used to be rewritten in full after every registration
+and password change, which made each registration O(total users) and let
+two concurrent registrations race on the same file. Here a registration or
+password change appends exactly one line instead:
+
+- **Later lines win.** A password change appends a fresh record for the
+  same username; loading keeps the last record per username, in the order
+  the usernames first appeared.
+- **Compaction** rewrites the file with one line per user once superseded
+  records outnumber ``COMPACT_STALE_RATIO`` of the live ones (and at least
+  ``COMPACT_MIN_STALE``). It re-reads the file rather than trusting memory
+  and swaps the result in atomically.
+- **Appends reopen the file** each time, so after another process compacts
+  (replacing the file) the next append lands in the new file.
+- **Servers sharing the file** are serialized by an exclusive ``flock`` on a
+  sidecar ``<path>.lock``, held around every append and every compaction, so
+  a line another server appends cannot fall between compaction's read and
+  its rename. ``fcntl`` is POSIX-only: on Windows only the in-process lock
+  applies, and the file must not be shared between processes.
+
+A compacted file is exactly the old format, and :meth:`write_snapshot`
+produces it on demand (``UserAuthenticator.export_user_config``), so
+nothing downstream needs to know about the log.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+#: Compact once superseded records reach this fraction of live users...
+COMPACT_STALE_RATIO = 0.5
+#: ...and at least this many, so small projects never bother.
+COMPACT_MIN_STALE = 1000
+
+
+class UserRegistryLog:
+    """JSONL user log with last-record-wins semantics. Thread-safe."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parse_errors = 0
+        self._known: set = set()
+        self._records = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stale_records(self) -> int:
+        """Lines in the file that a later line for the same user supersedes."""
+        return self._records - len(self._known)
+
+    def _read(self) -> Tuple[List[Tuple[Optional[str], str, Any]], int]:
+        """Parse the file into ``(username, raw_line, record)`` entries.
+
+        Unparseable lines come back with a ``None`` record so compaction can
+        keep them verbatim; ``username`` is None for anything without one.
+        """
+        entries = []
+        errors = 0
+        if not os.path.isfile(self.path):
+            return entries, errors
+        with open(self.path, "rt", encoding="utf-8") as f:
+            for lineno, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                # Tolerate a malformed line instead of aborting the whole
+                # load (and crashing server boot) on one bad row.
+                try:
+                    record = json.loads(line)
+                except (ValueError, TypeError) as e:
+                    errors += 1
+                    logger.error(
+                        f"User file {self.path} line {lineno}: "
+                        f"not valid JSON ({e}); skipping. Expected JSONL — "
+                        f'one object per line, e.g. {{"username": "alice", "password": "x"}}'
+                    )
+                    entries.append((None, line, None))
+                    continue
+                username = record.get("username") if isinstance(record, dict) else None
+                entries.append((username, line, record))
+        return entries, errors
+
+    @staticmethod
+    def _latest(entries) -> Iterable[Tuple[Optional[str], str, Any]]:
+        """Entries with each username's last record at its first position."""
+        last = {}
+        for username, line, record in entries:
+            if username is not None:
+                last[username] = (line, record)
+        emitted = set()
+        for username, line, record in entries:
+            if username is None:
+                yield username, line, record
+            elif username not in emitted:
+                emitted.add(username)
+                yield (username,) + last[username]
+
+    def load(self) -> List[Any]:
+        """Current records, one per username, for populating the authenticator.
+
+        Records without a username are passed through so the caller can
+        report them; unparseable lines are counted in ``parse_errors``.
+        """
+        with self._lock:
+            entries, self.parse_errors = self._read()
+            parsed = [e for e in entries if e[2] is not None]
+            self._records = sum(1 for e in parsed if e[0] is not None)
+            self._known = {e[0] for e in parsed if e[0] is not None}
+            records = [record for _, _, record in self._latest(parsed)]
+        if self._should_compact():
+            self.compact()
+        return records
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the thread lock and, where available, the cross-process file lock."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Persist one user's current record: a single line at the end of the file."""
+        line = json.dumps(record) + "\n"
+        with self._exclusive():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path, "at", encoding="utf-8") as f:
+                f.write(line)
+            self._records += 1
+            self._known.add(record["username"])
+        if self._should_compact():
+            self.compact()
+
+    def _should_compact(self) -> bool:
+        stale = self.stale_records
+        return stale >= COMPACT_MIN_STALE and stale >= COMPACT_STALE_RATIO * len(self._known)
+
+    def compact(self) -> None:
+        """Rewrite the file with one line per user (plus any unparseable lines)."""
+        with self._exclusive():
+            entries, _ = self._read()
+            kept = list(self._latest(entries))
+            _atomic_write(self.path, [line for _, line, _ in kept])
+            self._records = sum(1 for username, _, _ in kept if username is not None)
+            self._known = {username for username, _, _ in kept if username is not None}
+        logger.info(f"Compacted user file {self.path} to {self._records} users")
+
+    def write_snapshot(self, records: Iterable[Dict[str, Any]], path: Optional[str] = None) -> None:
+        """Write ``records`` as a complete user file (the pre-log format).
+
+        To ``self.path`` by default -- replacing the log atomically -- or to
+        ``path`` for an export.
+        """
+        records = list(records)
+        lines = [json.dumps(record) for record in records]
+        if path is not None and os.path.abspath(path) != os.path.abspath(self.path):
+            _atomic_write(path, lines)
+            return
+        with self._exclusive():
+            _atomic_write(self.path, lines)
+            self._known = {record.get("username") for record in records}
+            self._records = len(self._known)
+
+
+def _atomic_write(path: str, lines: List[str]) -> None:
+    """Write ``lines`` to a sibling temp file and rename it over ``path``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".users.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wt", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -8,7 +8,8 @@ Key Components:
 - UserStateManager: Singleton manager for all user states
 - UserState: Abstract interface for user state implementations
 - InMemoryUserState: In-memory implementation of user state
-- MysqlUserState: Database-backed implementation (placeholder)
+- MysqlUserState: Database-backed implementation (MySQL or SQLite), usually
+  wrapped by CachedMysqlUserState
 
 The system supports:
 - Multi-phase annotation workflows (consent, instructions, training, annotation, post-study)
@@ -36,12 +37,14 @@ from collections import defaultdict, OrderedDict
 import logging
 import os
 import threading
-from typing import Optional, Dict, Any, List, Tuple, Set
+from typing import Optional, Dict, Any, Iterable, List, Tuple, Set
 
 from potato.authentication import UserAuthenticator
 from potato.phase import UserPhase
 from potato.item_state_management import get_item_state_manager, Item, SpanAnnotation, Label, SpanLink, EventAnnotation
 from potato.annotation_history import AnnotationAction, AnnotationHistoryManager
+from potato.instrumentation.metrics import timed
+from potato.server_utils.progress_stats import UserProgressCounters
 from dataclasses import dataclass
 
 @dataclass
@@ -388,13 +391,6 @@ class TrainingState:
         training_state.category_scores = data.get('category_scores', {})
         return training_state
 
-# Database imports
-try:
-    from potato.database import DatabaseManager, MysqlUserState
-    DATABASE_AVAILABLE = True
-except ImportError:
-    DATABASE_AVAILABLE = False
-
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 logging.basicConfig()
@@ -486,6 +482,19 @@ class UserStateManager:
         # Thread-safe lock for shared state access
         self._state_lock = threading.RLock()
 
+        # Users whose cached database state has writes queued; see
+        # flush_pending_writes(). Its own lock: states report in while holding
+        # their cache lock, which must not wait on _state_lock.
+        self._pending_write_users: Set[str] = set()
+        self._pending_write_lock = threading.Lock()
+
+        # Running annotation/phase totals for the progress summaries. Every
+        # path below that creates, loads, saves or re-phases a user calls
+        # note_user_changed(); refresh_progress_counters() recounts only those
+        # users, and change listeners (e.g. the admin instance table) hear of it.
+        self.progress_counters = UserProgressCounters()
+        self._change_listeners = []
+
         # TODO: load this from the config
         self.max_annotations_per_user = -1
 
@@ -502,14 +511,21 @@ class UserStateManager:
         self.use_database = False
 
         # Initialize database if configured
-        if DATABASE_AVAILABLE and 'database' in config:
+        if 'database' in config:
             db_config = config['database']
-            if db_config.get('type') == 'mysql':
+            db_type = db_config.get('type')
+            if db_type in ('mysql', 'sqlite'):
                 try:
-                    self.db_manager = DatabaseManager(config)
+                    # Imported here, not at module level: potato.database subclasses
+                    # UserState from this module, so a top-level import is circular.
+                    from potato.database import DatabaseManager, SqliteDatabaseManager
+                    if db_type == 'mysql':
+                        self.db_manager = DatabaseManager(config)
+                    else:
+                        self.db_manager = SqliteDatabaseManager(config)
                     self.use_database = True
                     self.db_manager.create_tables()
-                    logger.info("Initialized MySQL database backend")
+                    logger.info(f"Initialized {db_type} database backend")
                 except Exception as e:
                     logger.error(f"Failed to initialize database: {e}")
                     self.use_database = False
@@ -645,20 +661,44 @@ class UserStateManager:
 
             # Create appropriate user state based on configuration
             if self.use_database and self.db_manager:
-                logger.debug(f"Creating MysqlUserState for user: {user_id} (quota={quota})")
-                user_state = MysqlUserState(user_id, self.db_manager, quota)
+                logger.debug(f"Creating database user state for user: {user_id} (quota={quota})")
+                user_state = self._make_database_user_state(user_id, quota)
             else:
                 logger.debug(f"Creating InMemoryUserState for user: {user_id} (quota={quota})")
                 user_state = InMemoryUserState(user_id, quota)
 
             self._apply_single_select_schemas(user_state)
             self.user_to_annotation_state[user_id] = user_state
+            self.note_user_changed(user_id)
             logger.debug(f"User state created and stored: {user_state}")
             logger.debug(f"Users after adding: {list(self.user_to_annotation_state.keys())}")
             logger.debug(f"=== ADD USER END ===")
 
             return user_state
 
+    def _make_database_user_state(self, user_id: str, quota: int) -> UserState:
+        """Create a database-backed user state.
+
+        The read-through/write-back cache (CachedMysqlUserState) is on unless
+        ``database.cache`` is false; ``database.cache_revalidate_seconds`` bounds
+        how stale a cache may be when other processes write the same user.
+        """
+        from potato.database import CachedMysqlUserState, MysqlUserState
+
+        db_config = self.config.get('database', {})
+        if not db_config.get('cache', True):
+            return MysqlUserState(user_id, self.db_manager, quota)
+        user_state = CachedMysqlUserState(
+            user_id, self.db_manager, quota,
+            revalidate_interval=float(db_config.get('cache_revalidate_seconds', 1.0)),
+        )
+        user_state.on_write_queued = self._note_pending_write
+        return user_state
+
+    def _note_pending_write(self, user_id: str) -> None:
+        with self._pending_write_lock:
+            self._pending_write_users.add(user_id)
+
     def _apply_single_select_schemas(self, user_state: UserState) -> None:
         """Tell a user state which schemas may hold at most one label (GH #167).
 
@@ -750,8 +790,11 @@ class UserStateManager:
                 if self.use_database and self.db_manager:
                     # Try to load from database
                     try:
-                        user_state = MysqlUserState(user_id, self.db_manager, self.max_annotations_per_user)
+                        user_state = self._make_database_user_state(
+                            user_id, self.max_annotations_per_user
+                        )
                         self.user_to_annotation_state[user_id] = user_state
+                        self.note_user_changed(user_id)
                         return user_state
                     except Exception as e:
                         logger.warning(f"Failed to load user state from database for {user_id}: {e}")
@@ -763,6 +806,7 @@ class UserStateManager:
                         if os.path.exists(user_dir):
                             user_state = InMemoryUserState.load(user_dir)
                             self.user_to_annotation_state[user_id] = user_state
+                            self.note_user_changed(user_id)
                             return user_state
                     except Exception as e:
                         logger.warning(f"Failed to load user state for {user_id}: {e}")
@@ -788,6 +832,7 @@ class UserStateManager:
         old_phase, _ = user_state.get_current_phase_and_page()
         phase, page = self.get_next_user_phase_page(user_id)
         user_state.advance_to_phase(phase, page)
+        self.note_user_changed(user_id)
 
         # Emit webhook if phase changed
         if phase != old_phase:
@@ -827,6 +872,7 @@ class UserStateManager:
             return False
 
         user_state.advance_to_phase(prev_phase, prev_page)
+        self.note_user_changed(user_id)
         return True
 
     def _get_configured_phase_sequence(self) -> list:
@@ -1011,8 +1057,15 @@ class UserStateManager:
     def is_poststudy_required(self) -> bool:
         return UserPhase.POSTSTUDY in self.phase_type_to_name_to_page
 
-    def save_user_state(self, user_state: UserState) -> None:
-        '''Saves the user state for the given user ID'''
+    @timed("save")
+    def save_user_state(self, user_state: UserState,
+                        instance_ids: Optional[Iterable[str]] = None) -> None:
+        '''Saves the user state for the given user ID
+
+        ``instance_ids`` names the instances whose annotations or behavioral
+        data the save carries, when the caller knows them, so change listeners
+        can update those instances instead of the user's whole state.
+        '''
         # Figure out where this user's data would be stored on disk
         output_annotation_dir = self.config["output_annotation_dir"]
         username = user_state.get_user_id()
@@ -1022,10 +1075,45 @@ class UserStateManager:
 
         # Save the user state
         user_state.save(user_dir)
+        self.note_user_changed(username, instance_ids)
 
         # Trigger auto-export if configured
         self._maybe_auto_export()
 
+    def flush_pending_writes(self) -> int:
+        """Write back the cached database user states with queued changes.
+
+        CachedMysqlUserState queues writes until save(), but navigation and
+        instance assignment change state without ever reaching
+        save_user_state(). Called at the end of each request so those writes
+        are committed -- and cache_version bumped for other workers -- before
+        the response is complete. Only users that reported a queued write are
+        visited, so the cost does not grow with the number of users. A no-op
+        for the file-backed states.
+
+        Returns:
+            Number of user states flushed
+        """
+        if not self.use_database:
+            return 0
+        with self._pending_write_lock:
+            if not self._pending_write_users:
+                return 0
+            user_ids, self._pending_write_users = self._pending_write_users, set()
+        flushed = 0
+        for user_id in user_ids:
+            user_state = self.user_to_annotation_state.get(user_id)
+            if user_state is None or not user_state.has_pending_writes():
+                continue  # already saved, or the user was removed
+            try:
+                user_state.flush()
+                flushed += 1
+            except Exception as e:
+                # Left queued: the next flush retries it.
+                self._note_pending_write(user_id)
+                logger.error(f"Could not flush user state for {user_id}: {e}")
+        return flushed
+
     def _maybe_auto_export(self):
         """Run auto-export if configured and enough time has passed since last export."""
         if not self._auto_export_formats:
@@ -1043,6 +1131,10 @@ class UserStateManager:
         except Exception as e:
             self.logger.error(f"Auto-export failed: {e}")
 
+    # Timed here rather than on _maybe_auto_export: that runs on every save and
+    # usually returns at once, which would fill the export histogram with ~0 ms
+    # samples alongside the real admin exports.
+    @timed("export")
     def _run_auto_export(self):
         """Execute auto-export for all configured formats."""
         from potato.export.registry import export_registry
@@ -1124,13 +1216,47 @@ class UserStateManager:
             logger.warning(f'User "{user_state.get_user_id()}" already exists in the user state manager, but is being overwritten by load_state()')
 
         self.user_to_annotation_state[user_state.get_user_id()] = user_state
+        self.note_user_changed(user_state.get_user_id())
 
         return user_state
 
+    def note_user_changed(self, user_id: str,
+                          instance_ids: Optional[Iterable[str]] = None) -> None:
+        """Record that ``user_id``'s state may have changed.
+
+        Routes that move a user between phases directly on the state object
+        call this themselves; the manager's own methods already do.
+        ``instance_ids`` limits the change to those instances; None means
+        anything about the user may have changed.
+        """
+        self.progress_counters.mark_dirty(user_id)
+        if instance_ids is not None:
+            instance_ids = tuple(instance_ids)
+        for listener in self._change_listeners:
+            listener(user_id, instance_ids)
+
+    def add_change_listener(self, listener) -> None:
+        """Call ``listener(user_id, instance_ids)`` whenever note_user_changed() does."""
+        self._change_listeners.append(listener)
+
+    def refresh_progress_counters(self) -> None:
+        """Bring progress_counters up to date with the users changed since the last call.
+
+        Users put straight into ``user_to_annotation_state`` (tests, imports)
+        bypass the dirty marking, so a mismatch between the known and actual
+        user counts marks the unaccounted users too.
+        """
+        with self._state_lock:
+            if self.progress_counters.known_user_count() != len(self.user_to_annotation_state):
+                for user_id in self.user_to_annotation_state:
+                    self.progress_counters.mark_dirty(user_id)
+            self.progress_counters.refresh(self.user_to_annotation_state.get)
+
     def clear(self):
         """Clear all user state (for testing/debugging)."""
         self._ensure_phase_caches()
         self.user_to_annotation_state.clear()
+        self.progress_counters.reset()
         self.task_assignment.clear()
         self.prolific_study = None
         self.phase_type_to_name_to_page.clear()
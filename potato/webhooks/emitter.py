@@ -24,6 +24,9 @@ class WebhookEndpoint:
     events: List[str] = field(default_factory=list)
     active: bool = True
     timeout_seconds: int = 10
+    max_concurrency: int = 2
+    batch_size: int = 1
+    batch_window_seconds: float = 1.0
 
 
 class WebhookEmitter:
@@ -53,6 +56,9 @@ class WebhookEmitter:
                 events=ep_dict.get("events", []),
                 active=ep_dict.get("active", True),
                 timeout_seconds=ep_dict.get("timeout_seconds", 10),
+                max_concurrency=ep_dict.get("max_concurrency", 2),
+                batch_size=ep_dict.get("batch_size", 1),
+                batch_window_seconds=ep_dict.get("batch_window_seconds", 1.0),
             )
             if ep.url:
                 self.endpoints.append(ep)
@@ -71,6 +77,16 @@ class WebhookEmitter:
 
         # Start delivery queue
         self._delivery_queue = WebhookDeliveryQueue(output_dir=output_dir)
+        for ep in self.endpoints:
+            self._delivery_queue.configure_endpoint(
+                ep.url,
+                ep.secret,
+                name=ep.name,
+                concurrency=ep.max_concurrency,
+                timeout=ep.timeout_seconds,
+                batch_size=ep.batch_size,
+                batch_window=ep.batch_window_seconds,
+            )
         self._delivery_queue.start()
 
     def emit(self, event_type: str, payload: dict) -> int:
@@ -120,14 +136,19 @@ class WebhookEmitter:
     def get_stats(self) -> dict:
         """Get delivery statistics (for admin API)."""
         retry_count = 0
+        delivery = {"queue_depth": 0, "in_flight": 0, "lanes": []}
         if self._delivery_queue:
             retry_count = self._delivery_queue.get_retry_count()
+            delivery = self._delivery_queue.get_stats()
         return {
             "endpoints": len(self.endpoints),
             "active_endpoints": sum(1 for ep in self.endpoints if ep.active),
             "total_emitted": self._stats["total_emitted"],
             "total_dropped": self._stats["total_dropped"],
             "pending_retries": retry_count,
+            "queue_depth": delivery["queue_depth"],
+            "in_flight": delivery["in_flight"],
+            "lanes": delivery["lanes"],
         }
 
     def get_endpoint_info(self) -> List[dict]:
@@ -139,6 +160,8 @@ class WebhookEmitter:
                 "events": ep.events,
                 "active": ep.active,
                 "timeout_seconds": ep.timeout_seconds,
+                "max_concurrency": ep.max_concurrency,
+                "batch_size": ep.batch_size,
                 "has_secret": bool(ep.secret),
             }
             for ep in self.endpoints
@@ -1,10 +1,13 @@
 """
 Webhook Delivery Queue
 
-Daemon thread + queue for non-blocking webhook dispatch with SQLite-backed
-retry store. Annotation requests are never blocked by webhook delivery.
+Per-endpoint delivery lanes with SQLite-backed retry store. Each endpoint
+gets its own bounded queue, a small pool of worker threads, and a pool of
+keep-alive connections, so a slow or dead subscriber only backs up its own
+lane. Annotation requests are never blocked by webhook delivery.
 """
 
+import http.client
 import json
 import logging
 import os
@@ -13,7 +16,9 @@ import sqlite3
 import threading
 import time
 import uuid
-from urllib.request import Request, urlopen
+from collections import deque
+from urllib.parse import urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 from urllib.error import URLError, HTTPError
 
 from .signing import build_headers
@@ -24,15 +29,182 @@ logger = logging.getLogger(__name__)
 RETRY_SCHEDULE = [0, 5, 30, 120, 600, 3600]
 MAX_RETRIES = len(RETRY_SCHEDULE) - 1
 
-# Queue size limit — if full, events are dropped (never block annotations)
+# Per-endpoint queue size limit — if full, events are dropped (never block
+# annotations)
 MAX_QUEUE_SIZE = 10000
 
+# Lane defaults, overridable per endpoint via configure_endpoint()
+DEFAULT_CONCURRENCY = 2
+DEFAULT_TIMEOUT = 10
+DEFAULT_BATCH_WINDOW = 1.0
+
+# Latency samples kept per lane for the percentile metrics
+LATENCY_WINDOW = 512
+
+# Due retries handed to the lanes per pass of the retry thread
+RETRY_BATCH = 100
+
+# Errors that mean a pooled keep-alive connection went stale between
+# requests; the request is replayed once on a fresh connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP(S) connections to one endpoint.
+
+    Connections are checked out per request and returned afterwards unless
+    the server asked to close. Endpoints reached through an environment
+    proxy fall back to urlopen, which knows how to tunnel.
+    """
+
+    def __init__(self, url, timeout, size):
+        parts = urlsplit(url)
+        self.url = url
+        self.timeout = timeout
+        self.size = max(1, size)
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += "?" + parts.query
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname or ""
+        self._port = parts.port
+        self._use_proxy = bool(getproxies().get(parts.scheme)) and not proxy_bypass(self._host)
+        self._idle = []
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop(), True
+            self.opened += 1
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=self.timeout), False
+
+    def _release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def post(self, body, headers):
+        """POST ``body`` and return the HTTP status code."""
+        if self._use_proxy:
+            req = Request(self.url, data=body, headers=headers, method="POST")
+            try:
+                resp = urlopen(req, timeout=self.timeout)
+            except HTTPError as e:
+                return e.code
+            status = resp.getcode()
+            resp.close()
+            return status
+
+        while True:
+            conn, reused = self._acquire()
+            try:
+                conn.request("POST", self.path, body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return resp.status
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class _Lane:
+    """Queue, workers, connection pool and counters for one endpoint."""
+
+    def __init__(self, url, secret, name=None, concurrency=DEFAULT_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT, batch_size=1,
+                 batch_window=DEFAULT_BATCH_WINDOW):
+        self.url = url
+        self.secret = secret
+        self.name = name or url
+        self.concurrency = max(1, int(concurrency))
+        self.batch_size = max(1, int(batch_size))
+        self.batch_window = float(batch_window)
+        self.queue = queue.Queue(maxsize=MAX_QUEUE_SIZE)
+        self.pool = _ConnectionPool(url, timeout, self.concurrency)
+        self.threads = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds, ok, events):
+        with self.lock:
+            self.latencies.append(seconds)
+            if ok:
+                self.delivered += events
+            else:
+                self.failed += events
+
+    def stats(self):
+        with self.lock:
+            samples = sorted(self.latencies)
+            stats = {
+                "name": self.name,
+                "url": self.url,
+                "queue_depth": self.queue.qsize(),
+                "in_flight": self.in_flight,
+                "concurrency": self.concurrency,
+                "batch_size": self.batch_size,
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "connections_opened": self.pool.opened,
+                "connections_reused": self.pool.reused,
+            }
+        stats["latency_ms"] = {
+            "p50": _percentile_ms(samples, 0.50),
+            "p95": _percentile_ms(samples, 0.95),
+            "max": _percentile_ms(samples, 1.0),
+        }
+        return stats
+
+
+def _percentile_ms(samples, q):
+    """Nearest-rank percentile of sorted ``samples`` (seconds) in ms."""
+    if not samples:
+        return None
+    index = min(len(samples) - 1, max(0, int(round(q * len(samples))) - 1))
+    return round(samples[index] * 1000, 1)
+
 
 class WebhookDeliveryQueue:
-    """Background delivery queue with retry support.
+    """Background delivery lanes with retry support.
 
-    Uses a daemon thread and stdlib queue.Queue for non-blocking dispatch.
-    Failed deliveries are stored in SQLite for retry.
+    Every (url, secret) pair gets its own lane: a bounded queue drained by
+    ``concurrency`` daemon threads over pooled keep-alive connections,
+    optionally packing up to ``batch_size`` events into one POST. A separate
+    thread moves due retries from SQLite back into their lanes.
     """
 
     def __init__(self, output_dir=None):
@@ -42,9 +214,11 @@ class WebhookDeliveryQueue:
             output_dir: Directory for the retry SQLite database.
                         If None, retries are in-memory only.
         """
-        self._queue = queue.Queue(maxsize=MAX_QUEUE_SIZE)
+        self._lanes = {}
+        self._lanes_lock = threading.Lock()
         self._running = False
         self._thread = None
+        self._wake = threading.Event()
         self._db_path = None
         self._db_lock = threading.Lock()
 
@@ -75,33 +249,98 @@ class WebhookDeliveryQueue:
             finally:
                 conn.close()
 
+    def configure_endpoint(self, url, secret="", name=None,
+                           concurrency=DEFAULT_CONCURRENCY,
+                           timeout=DEFAULT_TIMEOUT, batch_size=1,
+                           batch_window=DEFAULT_BATCH_WINDOW):
+        """Set the delivery options for one endpoint's lane.
+
+        Endpoints that are never configured get a lane with the defaults
+        the first time something is enqueued for them.
+
+        Args:
+            url: Endpoint URL.
+            secret: HMAC secret; lanes are keyed by (url, secret).
+            name: Display name for stats.
+            concurrency: Worker threads (and pooled connections) for this
+                         endpoint.
+            timeout: Per-request timeout in seconds.
+            batch_size: Events packed into one POST as a JSON array.
+                        1 sends each event on its own.
+            batch_window: Seconds to wait for a batch to fill.
+        """
+        key = (url, secret or "")
+        with self._lanes_lock:
+            lane = self._lanes.get(key)
+            if lane is not None:
+                return lane
+            lane = _Lane(url, key[1], name=name, concurrency=concurrency,
+                         timeout=timeout, batch_size=batch_size,
+                         batch_window=batch_window)
+            self._lanes[key] = lane
+            if self._running:
+                self._start_lane(lane)
+        return lane
+
+    def _lane_for(self, url, secret):
+        lane = self._lanes.get((url, secret or ""))
+        if lane is None:
+            lane = self.configure_endpoint(url, secret)
+        return lane
+
+    def _start_lane(self, lane):
+        while len(lane.threads) < lane.concurrency:
+            thread = threading.Thread(
+                target=self._lane_loop,
+                args=(lane,),
+                name=f"webhook-lane-{len(lane.threads)}",
+                daemon=True,
+            )
+            lane.threads.append(thread)
+            thread.start()
+
     def start(self):
-        """Start the background delivery thread."""
+        """Start the retry thread and any configured lanes."""
         if self._running:
             return
         self._running = True
+        self._wake.clear()
         self._thread = threading.Thread(
             target=self._worker_loop,
             name="webhook-delivery",
             daemon=True,
         )
         self._thread.start()
-        logger.debug("Webhook delivery thread started")
+        with self._lanes_lock:
+            for lane in self._lanes.values():
+                self._start_lane(lane)
+        logger.debug("Webhook delivery threads started")
 
     def stop(self):
-        """Stop the delivery thread gracefully."""
+        """Stop the delivery threads gracefully."""
         self._running = False
-        # Push sentinel to unblock the queue
-        try:
-            self._queue.put_nowait(None)
-        except queue.Full:
-            pass
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5)
-        logger.debug("Webhook delivery thread stopped")
+        self._wake.set()
+        with self._lanes_lock:
+            lanes = list(self._lanes.values())
+        # Push one sentinel per worker to unblock the lane queues
+        for lane in lanes:
+            for _ in lane.threads:
+                try:
+                    lane.queue.put_nowait(None)
+                except queue.Full:
+                    break
+        deadline = time.monotonic() + 5
+        threads = [self._thread] + [t for lane in lanes for t in lane.threads]
+        for thread in threads:
+            if thread and thread.is_alive():
+                thread.join(timeout=max(0, deadline - time.monotonic()))
+        for lane in lanes:
+            lane.threads = [t for t in lane.threads if t.is_alive()]
+            lane.pool.close()
+        logger.debug("Webhook delivery threads stopped")
 
     def enqueue(self, url, secret, payload_bytes, webhook_id=None):
-        """Add a delivery to the queue (non-blocking).
+        """Add a delivery to the endpoint's lane (non-blocking).
 
         Args:
             url: Endpoint URL.
@@ -110,7 +349,7 @@ class WebhookDeliveryQueue:
             webhook_id: Optional delivery ID.
 
         Returns:
-            True if enqueued, False if queue was full (event dropped).
+            True if enqueued, False if the lane was full (event dropped).
         """
         delivery = {
             "id": webhook_id or f"msg_{uuid.uuid4().hex[:24]}",
@@ -119,29 +358,89 @@ class WebhookDeliveryQueue:
             "payload_bytes": payload_bytes,
             "attempt": 0,
         }
+        lane = self._lane_for(url, secret)
         try:
-            self._queue.put_nowait(delivery)
+            lane.queue.put_nowait(delivery)
             return True
         except queue.Full:
+            with lane.lock:
+                lane.dropped += 1
             logger.warning("Webhook queue full, dropping event for %s", url)
             return False
 
     def _worker_loop(self):
-        """Main loop for the delivery thread."""
+        """Main loop for the retry thread."""
         while self._running:
-            # Process retries first
-            self._process_retries()
+            moved = self._process_retries()
+            if moved < RETRY_BATCH:
+                self._wake.wait(1.0)
 
-            # Process new deliveries
+    def _lane_loop(self, lane):
+        """Worker loop for one endpoint lane."""
+        while self._running:
             try:
-                delivery = self._queue.get(timeout=1.0)
+                delivery = lane.queue.get(timeout=1.0)
             except queue.Empty:
                 continue
-
             if delivery is None:  # Sentinel for shutdown
+                if self._running:
+                    continue
                 break
+            # Retries carry an already-built body and are sent as they are
+            if lane.batch_size > 1 and not delivery.get("attempt"):
+                delivery = self._fill_batch(lane, delivery)
+                if delivery is None:
+                    break
+            with lane.lock:
+                lane.in_flight += 1
+            try:
+                self._deliver(delivery)
+            finally:
+                with lane.lock:
+                    lane.in_flight -= 1
+
+    def _fill_batch(self, lane, first):
+        """Collect up to ``lane.batch_size`` fresh events into one delivery.
+
+        Waits at most ``lane.batch_window`` seconds for the batch to fill.
+        Retries met along the way are delivered on their own.
+        """
+        events = [first]
+        deadline = time.monotonic() + lane.batch_window
+        while len(events) < lane.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = lane.queue.get(timeout=remaining)
+                else:
+                    item = lane.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._deliver_batch(lane, events)
+                return None
+            if item.get("attempt"):
+                self._deliver(item)
+                continue
+            events.append(item)
+        if len(events) == 1:
+            return first
+        return self._batch_delivery(lane, events)
+
+    def _batch_delivery(self, lane, events):
+        with lane.lock:
+            lane.batches += 1
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "url": lane.url,
+            "secret": lane.secret,
+            "payload_bytes": b"[" + b",".join(e["payload_bytes"] for e in events) + b"]",
+            "attempt": 0,
+            "events": len(events),
+        }
 
-            self._deliver(delivery)
+    def _deliver_batch(self, lane, events):
+        self._deliver(events[0] if len(events) == 1 else self._batch_delivery(lane, events))
 
     def _deliver(self, delivery):
         """Attempt to deliver a webhook.
@@ -154,34 +453,34 @@ class WebhookDeliveryQueue:
         payload_bytes = delivery["payload_bytes"]
         attempt = delivery.get("attempt", 0)
         webhook_id = delivery["id"]
+        lane = self._lane_for(url, secret)
 
         headers = build_headers(secret, payload_bytes, webhook_id=webhook_id)
 
+        start = time.perf_counter()
+        ok = False
         try:
-            req = Request(
-                url,
-                data=payload_bytes,
-                headers=headers,
-                method="POST",
-            )
-            resp = urlopen(req, timeout=10)
-            status = resp.getcode()
-            resp.close()
+            status = lane.pool.post(payload_bytes, headers)
 
             if status and 200 <= status < 300:
+                ok = True
                 logger.debug("Webhook delivered: %s -> %s (attempt %d)",
                              webhook_id, url, attempt)
-                # Remove from retry store if it was there
-                self._remove_retry(webhook_id)
+                # Retried deliveries may still have a row in the store
+                if attempt:
+                    self._remove_retry(webhook_id)
             else:
                 self._handle_failure(delivery, f"HTTP {status}")
 
         except HTTPError as e:
             self._handle_failure(delivery, f"HTTP {e.code}: {e.reason}")
-        except (URLError, OSError) as e:
-            self._handle_failure(delivery, str(e))
+        except (URLError, OSError, http.client.HTTPException) as e:
+            self._handle_failure(delivery, str(e) or type(e).__name__)
         except Exception as e:
             self._handle_failure(delivery, str(e))
+        finally:
+            lane.record(time.perf_counter() - start, ok,
+                        delivery.get("events", 1))
 
     def _handle_failure(self, delivery, error_msg):
         """Handle a failed delivery attempt."""
@@ -252,9 +551,13 @@ class WebhookDeliveryQueue:
                 logger.error("Failed to remove webhook retry: %s", e)
 
     def _process_retries(self):
-        """Check SQLite for deliveries due for retry."""
+        """Move deliveries due for retry from SQLite into their lanes.
+
+        Returns:
+            Number of retries taken from the store.
+        """
         if not self._db_path:
-            return
+            return 0
 
         now = time.time()
         with self._db_lock:
@@ -264,19 +567,19 @@ class WebhookDeliveryQueue:
                     """SELECT id, url, secret, payload, attempt
                        FROM webhook_retries
                        WHERE next_retry_at <= ?
-                       LIMIT 10""",
-                    (now,),
+                       ORDER BY next_retry_at
+                       LIMIT ?""",
+                    (now, RETRY_BATCH),
                 )
                 rows = cursor.fetchall()
                 # Delete fetched rows so they're not re-processed
-                for row in rows:
-                    conn.execute("DELETE FROM webhook_retries WHERE id = ?",
-                                 (row[0],))
+                conn.executemany("DELETE FROM webhook_retries WHERE id = ?",
+                                 [(row[0],) for row in rows])
                 conn.commit()
                 conn.close()
             except sqlite3.Error as e:
                 logger.error("Failed to process webhook retries: %s", e)
-                return
+                return 0
 
         for row in rows:
             delivery = {
@@ -286,7 +589,24 @@ class WebhookDeliveryQueue:
                 "payload_bytes": row[3].encode("utf-8"),
                 "attempt": row[4],
             }
-            self._deliver(delivery)
+            lane = self._lane_for(delivery["url"], delivery["secret"])
+            try:
+                lane.queue.put_nowait(delivery)
+            except queue.Full:
+                # Put it back rather than lose it behind a backed-up lane
+                self._store_retry(delivery, delivery["attempt"],
+                                  now + RETRY_SCHEDULE[1], "lane queue full")
+        return len(rows)
+
+    def get_stats(self):
+        """Get queue depth, throughput and latency per lane (for admin API)."""
+        with self._lanes_lock:
+            lanes = [lane.stats() for lane in self._lanes.values()]
+        return {
+            "queue_depth": sum(lane["queue_depth"] for lane in lanes),
+            "in_flight": sum(lane["in_flight"] for lane in lanes),
+            "lanes": lanes,
+        }
 
     def get_retry_count(self):
         """Get the number of pending retries (for admin API)."""
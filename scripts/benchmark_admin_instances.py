@@ -0,0 +1,100 @@
+"""
+Measure an Instances-tab page request against the project size.
+
+Builds a synthetic project, then times the admin ``get_instances_data`` call
+the tab makes, one annotator save before each request so the table has real
+upkeep to do. The first request builds the table; later ones only apply the
+save. For comparison it also times the full rebuild-and-sort the endpoint
+used to do on every request.
+
+    python scripts/benchmark_admin_instances.py [--items 2000 20000] [--annotators 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import potato.item_state_management as ism_mod  # noqa: E402
+import potato.user_state_management as usm_mod  # noqa: E402
+from potato.item_state_management import Label  # noqa: E402
+from potato.server_utils.config_module import config  # noqa: E402
+
+
+def build_project(items, annotators, workdir):
+    config.update({
+        "task_dir": workdir,
+        "output_annotation_dir": workdir,
+        "max_annotations_per_item": 3,
+        "item_properties": {"id_key": "id", "text_key": "text"},
+        "annotation_task_name": "benchmark",
+        "annotation_schemes": [],
+    })
+    ism_mod.ITEM_STATE_MANAGER = None
+    usm_mod.USER_STATE_MANAGER = None
+    ism = ism_mod.init_item_state_manager(config)
+    ism.add_items({str(i): {"id": str(i), "text": f"item {i}"} for i in range(items)})
+    usm = usm_mod.init_user_state_manager(config)
+    for a in range(annotators):
+        state = usm.add_user(f"ann_{a}")
+        for i in range(a, items, 2):
+            state.add_label_annotation(str(i), Label("topic", "xyz"[(i + a) % 3]), True)
+            state.instance_id_to_behavioral_data[str(i)] = {"total_time_ms": 1000 + i}
+            ism.register_annotator(str(i), state.get_user_id())
+    return ism, usm
+
+
+def full_rebuild(dashboard, ism):
+    aggregates = dashboard._build_instance_aggregates()
+    rows = []
+    for item in ism.items():
+        stats = aggregates.get(item.get_id())
+        label_stats = dashboard._label_stats_from_names(stats["labels"]) if stats else (None, 0.0)
+        rows.append((len(ism.get_annotators_for_item(item.get_id())), label_stats, item.get_text()))
+    rows.sort(key=lambda r: r[1][1], reverse=True)
+    return rows[:25]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--annotators", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+    from potato.admin import AdminDashboard
+
+    print(f"{'items':>8}{'full rebuild ms':>18}{'first page ms':>16}{'page after save ms':>21}")
+    for items in args.items:
+        with tempfile.TemporaryDirectory() as workdir:
+            ism, usm = build_project(items, args.annotators, workdir)
+            dashboard = AdminDashboard()
+            dashboard.check_admin_access = lambda: True
+
+            start = time.perf_counter()
+            full_rebuild(dashboard, ism)
+            rebuild_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            dashboard.get_instances_data(sort_by="disagreement", sort_order="desc")
+            first_ms = (time.perf_counter() - start) * 1000
+
+            state = usm.get_user_state("ann_0")
+            elapsed = 0.0
+            for n in range(args.requests):
+                state.add_label_annotation(str(n), Label("topic", "z"), True)
+                usm.save_user_state(state, [str(n)])
+                start = time.perf_counter()
+                dashboard.get_instances_data(sort_by="disagreement", sort_order="desc")
+                elapsed += time.perf_counter() - start
+            print(f"{items:>8,}{rebuild_ms:>18.1f}{first_ms:>16.1f}"
+                  f"{elapsed / args.requests * 1000:>21.2f}")
+
+
+if __name__ == "__main__":
+    main()
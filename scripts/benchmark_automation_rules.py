@@ -0,0 +1,96 @@
+"""
+Measure automation-rule and display-logic evaluation throughput.
+
+Builds ``--rules`` automation rules, each testing its own item field (so any
+one item is relevant to only a few of them), and pushes ``--items`` synthetic
+items through ``AutomationManager.process_item`` -- once with the field index
+and compiled predicates, and once running every rule through
+``matches_all`` the way ingestion used to. Then times
+``compute_hidden_schemas`` over a survey whose schemas use every display-logic
+operator, as a page render does.
+
+    python scripts/benchmark_automation_rules.py [--items 100000] [--rules 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.automation.manager import AutomationManager  # noqa: E402
+from potato.server_utils.conditions import matches_all  # noqa: E402
+from potato.server_utils.display_logic import compute_hidden_schemas  # noqa: E402
+
+
+def make_rules(n):
+    ops = [
+        lambda f: {"field": f, "in": ["error", "failed", "timeout", "crash"]},
+        lambda f: {"field": f"{f}.score", "lt": 0.2},
+        lambda f: {"field": f, "contains": "urgent"},
+        lambda f: {"field": f, "equals": "Escalate"},
+    ]
+    # Rules without actions keep the timing on rule evaluation.
+    return [{"name": f"r{i}", "when": ops[i % len(ops)](f"f{i}"), "actions": []}
+            for i in range(n)]
+
+
+def make_items(n, rules, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        item = {"id": i, "text": "lorem ipsum"}
+        for _ in range(3):
+            f = f"f{rng.randrange(rules)}"
+            item[f] = rng.choice(["error", "ok", {"score": rng.random()}, ["urgent", "x"]])
+        items.append(item)
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--rules", type=int, default=50)
+    parser.add_argument("--renders", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rules = make_rules(args.rules)
+    items = make_items(args.items, args.rules)
+    mgr = AutomationManager({"automation": {"enabled": True, "rules": rules}})
+    try:
+        start = time.perf_counter()
+        fired = sum(mgr.process_item(str(item["id"]), item) for item in items)
+        indexed = time.perf_counter() - start
+    finally:
+        mgr.shutdown()
+
+    start = time.perf_counter()
+    fired_ref = sum(1 for item in items for r in rules if matches_all(r["when"], item))
+    every_rule = time.perf_counter() - start
+
+    print(f"{'automation':<14}{'items':>9}{'rules':>7}{'fired':>8}{'every rule s':>15}"
+          f"{'indexed s':>11}{'items/s':>10}")
+    print(f"{'':<14}{args.items:>9}{args.rules:>7}{fired:>8}{every_rule:>15.2f}"
+          f"{indexed:>11.2f}{args.items / indexed:>10.0f}"
+          + ("" if fired == fired_ref else "  MISMATCH"))
+
+    ops = [("equals", "Yes"), ("not_equals", ["No", "Maybe"]), ("contains", "pii"),
+           ("matches", r"^\d{3}-\d{4}$"), ("gt", 3), ("in_range", [1, 5]),
+           ("length_gt", 10), ("not_empty", None)]
+    schemes = [{"name": f"q{i}", "display_logic": {"show_when": [
+        {"schema": f"a{i}", "operator": op, **({"value": v} if v is not None else {})}]}}
+        for i, (op, v) in enumerate(ops * 5)]
+    answers = {f"a{i}": v for i, v in enumerate(["yes", "No", "has pii", "555-1234", 4, 2,
+                                                 "short", "x"] * 5)}
+    start = time.perf_counter()
+    for _ in range(args.renders):
+        compute_hidden_schemas(schemes, answers)
+    render = time.perf_counter() - start
+    print(f"\n{'display logic':<14}{'schemas':>9}{'renders':>9}{'us/render':>11}")
+    print(f"{'':<14}{len(schemes):>9}{args.renders:>9}{render / args.renders * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
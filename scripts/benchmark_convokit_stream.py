@@ -0,0 +1,130 @@
+"""
+Measure peak memory and time for ConvoKit conversion, in memory vs streamed.
+
+Generates a synthetic corpus per size -- conversations of 1-8 threaded turns
+whose utterances are shuffled through ``utterances.jsonl``, as in a crawled
+dump, with per-utterance metadata and a ``speakers.json`` entry per speaker --
+then converts it to JSON Lines twice, each in a fresh process so the peak RSS
+is that run's alone: ``read_corpus`` + ``build_items`` (the default), and
+``open_corpus_stream`` + ``iter_items`` (``--stream``). The outputs are
+compared byte for byte.
+
+    python scripts/benchmark_convokit_stream.py [--utterances 20000 200000]
+        [--unit conversation] [--dir /tmp]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.convokit.cli import _write_items  # noqa: E402
+from potato.convokit.items import ItemOptions, build_items, iter_items  # noqa: E402
+from potato.convokit.reader import read_corpus  # noqa: E402
+from potato.convokit.stream import open_corpus_stream  # noqa: E402
+
+
+def write_corpus(root, utterances, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    convo = 0
+    while len(rows) < utterances:
+        turns = rng.randint(1, 8)
+        for turn in range(turns):
+            rows.append({
+                "id": f"{convo}.{turn}",
+                "conversation_id": f"{convo}.0",
+                "speaker": f"user{rng.randrange(utterances // 4 + 1)}",
+                "text": " ".join(rng.choice(("lorem", "ipsum", "dolor", "amet")) for _ in range(40)),
+                "reply_to": f"{convo}.{rng.randrange(turn)}" if turn else None,
+                "timestamp": convo * 100 + turn,
+                "meta": {"score": rng.random(), "toxic": rng.random() < 0.1},
+            })
+        convo += 1
+    rng.shuffle(rows)
+    os.makedirs(root)
+    speakers = set()
+    with open(os.path.join(root, "utterances.jsonl"), "w") as f:
+        for row in rows:
+            speakers.add(row["speaker"])
+            f.write(json.dumps(row) + "\n")
+    with open(os.path.join(root, "speakers.json"), "w") as f:
+        json.dump({s: {"meta": {"karma": len(s)}} for s in speakers}, f)
+    with open(os.path.join(root, "conversations.json"), "w") as f:
+        json.dump({f"{c}.0": {"meta": {"split": "train"}} for c in range(convo)}, f)
+    return convo
+
+
+def run(mode, corpus_dir, output, unit):
+    opts = ItemOptions(unit=unit)
+    start = time.perf_counter()
+    if mode == "memory":
+        _write_items(output, build_items(read_corpus(corpus_dir), opts), "jsonl")
+    else:
+        with open_corpus_stream(corpus_dir, index_dir=os.path.dirname(output)) as stream:
+            _write_items(output, iter_items(stream, opts), "jsonl")
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "peak_mb": peak_rss_kb() / 1024}))
+
+
+def peak_rss_kb():
+    # ru_maxrss survives fork+exec on Linux, so a child would report the
+    # parent's peak; VmHWM belongs to this process image alone.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(mode, corpus_dir, output, unit):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run", mode, corpus_dir, output, unit],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--utterances", type=int, nargs="+", default=[20_000, 200_000])
+    parser.add_argument("--unit", choices=["conversation", "utterance"], default="conversation")
+    parser.add_argument("--dir", default=tempfile.gettempdir(),
+                        help="where to create the temporary corpora")
+    parser.add_argument("--run", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(*args.run)
+        return
+
+    print(f"{'utterances':>11}{'convos':>9}{'corpus MB':>11}{'memory MB':>11}{'stream MB':>11}"
+          f"{'memory s':>10}{'stream s':>10}{'same':>6}")
+    for n in args.utterances:
+        with tempfile.TemporaryDirectory(dir=args.dir) as work:
+            corpus_dir = os.path.join(work, "corpus")
+            convos = write_corpus(corpus_dir, n)
+            size_mb = sum(os.path.getsize(os.path.join(corpus_dir, f))
+                          for f in os.listdir(corpus_dir)) / 2**20
+            memory = measure("memory", corpus_dir, os.path.join(work, "a.jsonl"), args.unit)
+            stream = measure("stream", corpus_dir, os.path.join(work, "b.jsonl"), args.unit)
+            with open(os.path.join(work, "a.jsonl"), "rb") as a, \
+                    open(os.path.join(work, "b.jsonl"), "rb") as b:
+                same = a.read() == b.read()
+            print(f"{n:>11}{convos:>9}{size_mb:>11.1f}{memory['peak_mb']:>11.0f}"
+                  f"{stream['peak_mb']:>11.0f}{memory['seconds']:>10.1f}"
+                  f"{stream['seconds']:>10.1f}{'yes' if same else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Measure what the database user-state cache saves per request.
+
+Drives the calls one annotate-page render makes (phase, cursor, ordering,
+current labels and spans, has_annotated for the navigation strip, hint) and
+one save (a handful of label changes), against MysqlUserState and
+CachedMysqlUserState on the SQLite backend. Reports statements issued per
+request and wall time; against a networked MySQL server every statement is
+also a round trip, so the statement count is the figure that matters.
+
+    python scripts/benchmark_database_user_state.py [--requests 500] [--items 200]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.database import (  # noqa: E402
+    CachedMysqlUserState, MysqlUserState, SqliteDatabaseManager,
+)
+from potato.item_state_management import Label  # noqa: E402
+from potato.phase import UserPhase  # noqa: E402
+
+
+class _Item:
+    def __init__(self, instance_id):
+        self._id = instance_id
+
+    def get_id(self):
+        return self._id
+
+
+def count_statements(manager):
+    """Count execute/executemany calls made through ``manager``."""
+    counter = {"statements": 0}
+    original = manager.get_connection
+
+    class Cursor:
+        def __init__(self, cursor):
+            self._cursor = cursor
+
+        def execute(self, *args):
+            counter["statements"] += 1
+            return self._cursor.execute(*args)
+
+        def executemany(self, *args):
+            counter["statements"] += 1
+            return self._cursor.executemany(*args)
+
+        def __getattr__(self, name):
+            return getattr(self._cursor, name)
+
+    class Connection:
+        def __init__(self, connection):
+            self._connection = connection
+
+        def cursor(self):
+            return Cursor(self._connection.cursor())
+
+        def __getattr__(self, name):
+            return getattr(self._connection, name)
+
+    @contextmanager
+    def counted():
+        with original() as connection:
+            yield Connection(connection)
+
+    manager.get_connection = counted
+    return counter
+
+
+def render_page(state, window):
+    state.get_current_phase_and_page()
+    index = state.get_current_instance_index()
+    ordering = state._get_instance_ordering()
+    instance_id = ordering[index]
+    state.get_label_annotations(instance_id)
+    state.get_span_annotations(instance_id)
+    for neighbour in ordering[max(0, index - window):index + window]:
+        state.has_annotated(neighbour)
+    state.hint_exists(instance_id)
+    state.get_annotation_count()
+    return instance_id
+
+
+def save_page(state, instance_id, request_number):
+    state.add_label_annotation(instance_id, Label("sentiment", "positive"), True)
+    for topic in ("sports", "politics", "science"):
+        state.add_label_annotation(instance_id, Label("topics", topic), request_number % 2 == 0)
+    state.goto_next_instance()
+    state.save("/unused")
+
+
+def run(state_cls, manager, user_id, requests, items, window):
+    state = state_cls(user_id, manager)
+    state._single_select_schemas = frozenset({"sentiment"})
+    state.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+    for index in range(items):
+        state.assign_instance(_Item(f"item_{index}"))
+    if hasattr(state, "flush"):
+        state.flush()
+
+    counter = count_statements(manager)
+    start = time.perf_counter()
+    for request_number in range(requests):
+        if state.get_current_instance_index() >= items - 1:
+            state.go_to_index(0)
+        instance_id = render_page(state, window)
+        save_page(state, instance_id, request_number)
+    elapsed = time.perf_counter() - start
+    del manager.get_connection
+    return counter["statements"] / requests, elapsed / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--window", type=int, default=5,
+                        help="navigation-strip neighbours checked with has_annotated")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="potato-userstate-")
+    try:
+        manager = SqliteDatabaseManager({"database": {"path": os.path.join(workdir, "users.sqlite")}})
+        manager.create_tables()
+        print(f"{args.requests:,} render+save requests, {args.items:,} assigned items (SQLite)\n")
+        print(f"{'backend':<24}{'statements/request':>20}{'ms/request':>14}")
+        for label, state_cls in (("MysqlUserState", MysqlUserState),
+                                 ("CachedMysqlUserState", CachedMysqlUserState)):
+            statements, ms = run(state_cls, manager, label, args.requests, args.items, args.window)
+            print(f"{label:<24}{statements:>20.1f}{ms:>14.3f}")
+        manager.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
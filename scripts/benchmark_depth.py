@@ -0,0 +1,99 @@
+"""
+Measure depth map rendering and unprojection, NumPy vs pure Python.
+
+Writes a synthetic 16-bit depth PNG per resolution (a tilted plane with noise
+and sensor holes), then times each step of the /media/depth route: reading
+and converting to metres, the default percentile window, colourising to PNG,
+and unprojecting to a PNT1 cloud. Each step runs with the NumPy fast paths
+and with them disabled; both must produce the same bytes, and the script
+checks that before printing. The pure-Python run is skipped above
+--python-limit pixels, where it takes tens of seconds per step.
+
+    python scripts/benchmark_depth.py [--sizes 640x480 1920x1080 3840x2160]
+        [--python-limit 2100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import potato.media.depth as dm  # noqa: E402
+from potato.media.pointcloud import to_wire as cloud_to_wire  # noqa: E402
+
+STEPS = ("read", "window", "png", "unproject")
+
+
+def write_depth_png(path, width, height, rng):
+    rows, cols = np.mgrid[0:height, 0:width]
+    millimetres = 800 + 3 * rows + cols + rng.normal(0, 15, size=(height, width))
+    millimetres[rng.random((height, width)) < 0.08] = 0
+    Image.fromarray(np.clip(millimetres, 0, 65535).astype(np.uint16)).save(path)
+
+
+def run_steps(path, width, height):
+    """Output bytes and seconds per step."""
+    intrinsics = (0.8 * width, 0.8 * width, width / 2, height / 2)
+    results = {}
+
+    start = time.perf_counter()
+    depth = dm.read_depth(path)
+    results["read"] = (dm.to_wire(depth), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    window = dm.percentile_window(depth)
+    results["window"] = (repr(window).encode(), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    results["png"] = (dm.to_png(depth, window), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    cloud = dm.unproject(depth, intrinsics, max_points=width * height)
+    results["unproject"] = (cloud_to_wire(cloud), time.perf_counter() - start)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["640x480", "1920x1080", "3840x2160"])
+    parser.add_argument("--python-limit", type=int, default=2_100_000,
+                        help="skip the pure-Python run above this many pixels")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    numpy_paths = dm._numpy
+    print(f"{'size':<12}{'step':<11}{'numpy s':>9}{'python s':>10}{'speedup':>9}")
+    with tempfile.TemporaryDirectory() as work:
+        for size in args.sizes:
+            width, height = (int(v) for v in size.lower().split("x"))
+            path = os.path.join(work, f"{size}.png")
+            write_depth_png(path, width, height, rng)
+
+            fast = run_steps(path, width, height)
+            slow = None
+            if width * height <= args.python_limit:
+                dm._numpy = lambda: None
+                try:
+                    slow = run_steps(path, width, height)
+                finally:
+                    dm._numpy = numpy_paths
+
+            for step in STEPS:
+                output, fast_s = fast[step]
+                python_s = speedup = "-"
+                if slow is not None:
+                    reference, slow_s = slow[step]
+                    assert output == reference, f"{size} {step}: fast path output differs"
+                    python_s = f"{slow_s:.2f}"
+                    speedup = f"{slow_s / fast_s:.1f}x"
+                print(f"{size:<12}{step:<11}{fast_s:>9.3f}{python_s:>10}{speedup:>9}")
+
+
+if __name__ == "__main__":
+    main()
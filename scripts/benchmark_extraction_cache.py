@@ -0,0 +1,103 @@
+"""
+Measure what a page view pays for server-side document extraction.
+
+Times, per input file and extraction mode, the three cases a page view can
+hit: no cache (the handler runs on every view, the old behaviour), a cold
+cache (the first view: the handler runs and the entry is written) and a warm
+cache (every later view, or one the look-ahead got to first). OCR modes are
+skipped unless pytesseract is installed; with it, the cold case is also run
+with the per-page process pool (--workers) against page-by-page OCR.
+
+    python scripts/benchmark_extraction_cache.py [--files a.pdf b.docx]
+        [--modes text ocr_words ocr] [--workers 4] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.format_handlers import pdf_handler  # noqa: E402
+from potato.format_handlers.extraction_cache import ExtractionCache  # noqa: E402
+from potato.format_handlers.registry import format_handler_registry  # noqa: E402
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "examples", "advanced", "pdf-link-paginated", "media",
+                          "sample-paper.pdf")
+
+MODES = {
+    # Server-side extraction of the embedded text layer
+    "text": ("extract", {}),
+    # Link mode with OCR: per-page words for the client text layer
+    "ocr_words": ("ocr_words", {"ocr": True}),
+    # Server-side extraction through OCR
+    "ocr": ("extract", {"ocr": True}),
+}
+
+
+def uncached(kind, path, options):
+    if kind == "ocr_words":
+        return pdf_handler.PDFHandler().extract_words_by_page(path, options)
+    return format_handler_registry.extract(path, options=options)
+
+
+def cached(cache, kind, path, options):
+    if kind == "ocr_words":
+        return cache.words_by_page(path, options)
+    return cache.extract(path, options)
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", nargs="+", default=[SAMPLE_PDF])
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=sorted(MODES))
+    parser.add_argument("--workers", type=int, default=4,
+                        help="processes for the pooled OCR run")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'file':<24}{'mode':<11}{'no cache ms':>13}{'cold ms':>10}"
+          f"{'cold pool ms':>14}{'warm ms':>10}{'speedup':>9}")
+    for path in args.files:
+        for mode in args.modes:
+            kind, options = MODES[mode]
+            is_pdf = path.lower().endswith(".pdf")
+            if kind == "ocr_words" and not is_pdf:
+                continue
+            if options.get("ocr") and not (is_pdf and pdf_handler.PYTESSERACT_AVAILABLE):
+                print(f"{os.path.basename(path):<24}{mode:<11}  skipped: needs a PDF and pytesseract")
+                continue
+            repeat = 1 if options.get("ocr") else args.repeat
+
+            no_cache_s = timed(lambda: uncached(kind, path, options), repeat)
+            with tempfile.TemporaryDirectory() as work:
+                cache = ExtractionCache(work, workers=0)
+                cold_s = timed(lambda: cached(cache, kind, path, options))
+                warm_s = timed(lambda: cached(cache, kind, path, options), args.repeat)
+                cache.stop_background_prefetch()
+
+            pool = "-"
+            if options.get("ocr") and args.workers > 0:
+                with tempfile.TemporaryDirectory() as work:
+                    cache = ExtractionCache(work, workers=args.workers)
+                    cache._get_executor().submit(int).result()  # start the pool
+                    pool = f"{timed(lambda: cached(cache, kind, path, options)) * 1e3:.1f}"
+                    cache.stop_background_prefetch()
+
+            print(f"{os.path.basename(path):<24}{mode:<11}{no_cache_s * 1e3:>13.1f}"
+                  f"{cold_s * 1e3:>10.1f}{pool:>14}{warm_s * 1e3:>10.2f}"
+                  f"{no_cache_s / warm_s:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Measure geometric agreement on a box/polygon image dataset.
+
+Builds ``--images`` synthetic images, each annotated by ``--annotators``
+annotators who drew the same few objects (boxes and polygons) with some
+jitter, a missed object now and then and a spurious one. ``match`` times
+``match_instances`` over every annotator pair of every image; ``report``
+times ``geometry_agreement`` with ``--bootstrap`` resamples.
+
+``legacy`` replays the previous behaviour: similarities computed pair by
+pair, polygon IoU through the pure-Python raster (shapely is not required),
+and every bootstrap resample re-matching the items it draws. It runs for
+sizes up to ``--legacy-max`` images. Its report time is the report without
+resamples plus ``--bootstrap`` times the cost of one resample, measured
+over two (a full legacy bootstrap takes hours); the unresampled reports are
+checked to agree.
+
+    python scripts/benchmark_geometry_agreement.py [--images 100 1000 10000]
+        [--annotators 3] [--bootstrap 200] [--legacy-max 100]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.server_utils.iaa import geometry  # noqa: E402
+from potato.server_utils.iaa import geometry_agreement as agreement  # noqa: E402
+
+
+def make_items(rng, images, annotators):
+    items = {}
+    for image in range(images):
+        truth = []
+        for _ in range(rng.randint(2, 6)):
+            x, y = rng.uniform(0, 800), rng.uniform(0, 600)
+            w, h = rng.uniform(20, 200), rng.uniform(20, 200)
+            truth.append((rng.random() < 0.3, x, y, w, h, rng.choice(["car", "person"])))
+        by_annotator = {}
+        for a in range(annotators):
+            objects = [_draw(rng, obj) for obj in truth if rng.random() > 0.1]
+            if rng.random() < 0.2:
+                objects.append(_draw(rng, (False, rng.uniform(0, 800), rng.uniform(0, 600),
+                                           50.0, 50.0, "car")))
+            by_annotator[f"ann_{a}"] = objects
+        items[f"image_{image}"] = by_annotator
+    return items
+
+
+def _draw(rng, obj):
+    is_polygon, x, y, w, h, label = obj
+    x += rng.gauss(0, 4)
+    y += rng.gauss(0, 4)
+    if not is_polygon:
+        return {"type": "bbox", "label": label,
+                "coordinates": {"x": x, "y": y, "width": w, "height": h}}
+    sides = 8
+    return {"type": "polygon", "label": label, "coordinates": [
+        {"x": x + w / 2 * (1 + math.cos(2 * math.pi * k / sides)) + rng.gauss(0, 2),
+         "y": y + h / 2 * (1 + math.sin(2 * math.pi * k / sides)) + rng.gauss(0, 2)}
+        for k in range(sides)]}
+
+
+def legacy_raster(a, b, samples):
+    xs = [float(p[0]) for p in a] + [float(p[0]) for p in b]
+    ys = [float(p[1]) for p in a] + [float(p[1]) for p in b]
+    min_x, max_x = min(xs), max(xs)
+    min_y, max_y = min(ys), max(ys)
+    if max_x <= min_x or max_y <= min_y:
+        return 0.0
+    step_x = (max_x - min_x) / samples
+    step_y = (max_y - min_y) / samples
+    inter = union = 0
+    for row in range(samples):
+        py = min_y + (row + 0.5) * step_y
+        for col in range(samples):
+            px = min_x + (col + 0.5) * step_x
+            in_a = geometry._point_in_polygon(px, py, a)
+            in_b = geometry._point_in_polygon(px, py, b)
+            if in_a and in_b:
+                inter += 1
+            if in_a or in_b:
+                union += 1
+    return inter / union if union else 0.0
+
+
+def legacy_similarity_matrix(objects_a, objects_b):
+    import numpy as np
+
+    return np.array([[geometry.similarity(a, b) for b in objects_b] for a in objects_a],
+                    dtype=float).reshape(len(objects_a), len(objects_b))
+
+
+@contextmanager
+def legacy():
+    uncached = agreement._item_distances
+
+    def item_distances(objects, annotators, distance, threshold, cache):
+        return uncached(objects, annotators, distance, threshold, None)
+
+    with mock.patch.object(geometry, "similarity_matrix", legacy_similarity_matrix), \
+            mock.patch.object(geometry, "_iou_polygon_raster", legacy_raster), \
+            mock.patch.object(agreement, "_item_distances", item_distances):
+        yield
+
+
+def match_all(items):
+    matched = 0
+    for by_annotator in items.values():
+        annotators = sorted(by_annotator)
+        for i, left in enumerate(annotators):
+            for right in annotators[i + 1:]:
+                matches, _, _ = geometry.match_instances(by_annotator[left],
+                                                         by_annotator[right])
+                matched += len(matches)
+    return matched
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--annotators", type=int, default=3)
+    parser.add_argument("--bootstrap", type=int, default=200)
+    parser.add_argument("--legacy-max", type=int, default=100,
+                        help="largest size to time the previous behaviour at")
+    args = parser.parse_args()
+
+    print(f"{'images':>8}{'match s':>9}{'legacy':>8}{'report s':>10}{'legacy':>8}"
+          f"{'sigma':>8}")
+    for n in args.images:
+        items = make_items(random.Random(n), n, args.annotators)
+        canonical = {k: agreement._canonicalize(v) for k, v in items.items()}
+
+        match_s, matched = timed(match_all, canonical)
+        report_s, report = timed(agreement.geometry_agreement, items,
+                                 bootstrap=args.bootstrap)
+        old_match = old_report = "-"
+        if n <= args.legacy_max:
+            with legacy():
+                seconds, old_matched = timed(match_all, canonical)
+                old_match = f"{seconds:.1f}"
+                base, old = timed(agreement.geometry_agreement, items)
+                two, _ = timed(agreement.geometry_agreement, items, bootstrap=2)
+                old_report = f"{base + (two - base) / 2 * args.bootstrap:.0f}"
+            assert old_matched == matched
+            for question in ("localization", "detection", "classification"):
+                assert old[question] == report[question]
+        sigma = report["localization"]["sigma"]
+        print(f"{n:>8}{match_s:>9.1f}{old_match:>8}{report_s:>10.1f}{old_report:>8}"
+              f"{sigma:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Measure keyword highlight matching against lexicon size.
+
+Builds a synthetic lexicon (mostly literal and ``word*`` terms, with a share
+of ``*word`` / ``wo*rd`` wildcards) and a set of instance texts drawn from
+the same vocabulary, then times, per text:
+
+- the per-pattern scan get_keyword_highlights() used to run (every term's
+  regex over the text), and
+- KeywordMatcher.find, the single-pass automaton, uncached.
+
+Both must return the same matches; the script checks that before printing.
+Times are per text; matches/s is the automaton's match throughput.
+
+    python scripts/benchmark_keyword_highlights.py [--terms 500 5000 20000]
+        [--texts 50] [--words 400] [--wildcard-share 0.05]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.server_utils.keyword_matcher import KeywordMatcher, compile_keyword_pattern  # noqa: E402
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_vocabulary(rng, size):
+    return sorted({"".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 10)))
+                   for _ in range(size)})
+
+
+def make_lexicon(rng, vocabulary, terms, wildcard_share):
+    lexicon = []
+    for word in rng.sample(vocabulary, terms):
+        shape = rng.random()
+        if shape < wildcard_share / 2:
+            term = "*" + word[1:]
+        elif shape < wildcard_share:
+            term = word[:2] + "*" + word[3:]
+        elif shape < 0.4:
+            term = word[:max(3, len(word) - 2)] + "*"
+        else:
+            term = word
+        lexicon.append({"pattern": term, "regex": compile_keyword_pattern(term),
+                        "label": "L", "schema": "S"})
+    return lexicon
+
+
+def per_pattern(patterns, text):
+    return [(i, m.start(), m.end())
+            for i, p in enumerate(patterns) for m in p["regex"].finditer(text)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[500, 5000, 20000])
+    parser.add_argument("--texts", type=int, default=50)
+    parser.add_argument("--words", type=int, default=400, help="words per instance text")
+    parser.add_argument("--wildcard-share", type=float, default=0.05,
+                        help="fraction of terms with a leading or inner wildcard")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng, max(args.terms) * 2)
+    texts = [" ".join(rng.choice(vocabulary).capitalize() if rng.random() < 0.1
+                      else rng.choice(vocabulary) for _ in range(args.words)) + "."
+             for _ in range(args.texts)]
+    chars = sum(len(t) for t in texts)
+
+    print(f"{args.texts} texts, {chars // args.texts} chars each, "
+          f"{args.wildcard_share:.0%} leading/inner wildcards")
+    print(f"{'terms':>8}{'compile s':>11}{'matches':>9}"
+          f"{'per-pattern ms':>16}{'automaton ms':>14}{'speedup':>9}{'matches/s':>11}")
+    for terms in args.terms:
+        lexicon = make_lexicon(rng, vocabulary, terms, args.wildcard_share)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(lexicon)
+        compile_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [per_pattern(lexicon, t) for t in texts]
+        old_ms = (time.perf_counter() - start) * 1000 / len(texts)
+
+        start = time.perf_counter()
+        found = [matcher.find(t) for t in texts]
+        new_s = time.perf_counter() - start
+        new_ms = new_s * 1000 / len(texts)
+
+        assert found == expected, "matcher disagrees with the per-pattern scan"
+        matches = sum(len(f) for f in found)
+        print(f"{terms:>8}{compile_s:>11.2f}{matches:>9}{old_ms:>16.2f}{new_ms:>14.2f}"
+              f"{old_ms / new_ms:>8.1f}x{matches / new_s:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure labeling-function application over a large unlabeled pool.
+
+Builds ``--functions`` keyword labeling functions (mostly single words, some
+phrases) and ``--instances`` synthetic texts of ~30 words, then applies every
+function to every instance -- what happens after each prompt revision.
+``compiled`` is ``LabelingFunctionApplier.apply_batch`` (one keyword index,
+one scan per text, NumPy voting); ``compile`` is the one-off index build.
+``per-instance`` replays the previous behaviour -- ``apply()`` on each
+instance, testing every function's keywords in turn -- on the first
+``--legacy-instances`` and extrapolates. The two are checked to agree.
+
+    python scripts/benchmark_labeling_functions.py [--functions 100 500]
+        [--instances 100000] [--legacy-instances 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.solo_mode.labeling_functions import (  # noqa: E402
+    LabelingFunction,
+    LabelingFunctionApplier,
+)
+
+LABELS = ('positive', 'negative', 'neutral')
+
+
+def make_vocabulary(rng, size=20_000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return sorted({''.join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+                   for _ in range(size)})
+
+
+def make_functions(rng, vocabulary, count):
+    common = vocabulary[:2000]
+    functions = []
+    for i in range(count):
+        words = rng.sample(common, 3)
+        if i % 5 == 0:
+            words.append(' '.join(rng.sample(common[:200], 2)))
+        functions.append(LabelingFunction(
+            id=f'lf_{i}', pattern_text=f'pattern {i}',
+            condition=f"text contains '{words[0]}'",
+            label=rng.choice(LABELS), confidence=rng.choice((0.6, 0.75, 0.9)),
+            extracted_from_reasoning=', '.join(words[1:]),
+        ))
+    return functions
+
+
+def make_instances(rng, vocabulary, count):
+    # Zipf-ish: common words dominate, as in real text.
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [{'instance_id': f'item_{i}',
+             'text': ' '.join(rng.choices(vocabulary, weights, k=30))}
+            for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--functions', type=int, nargs='+', default=[100, 500])
+    parser.add_argument('--instances', type=int, default=100_000)
+    parser.add_argument('--legacy-instances', type=int, default=5_000,
+                        help='instances to time the per-instance path on')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng)
+    instances = make_instances(rng, vocabulary, args.instances)
+    sample = instances[:args.legacy_instances]
+
+    print(f"{'functions':>10}{'instances':>11}{'compile s':>11}{'compiled s':>12}"
+          f"{'per-instance s':>16}{'labeled':>9}")
+    for count in args.functions:
+        functions = make_functions(rng, vocabulary, count)
+        applier = LabelingFunctionApplier(vote_threshold=0.5)
+
+        start = time.perf_counter()
+        applier.compile(functions)
+        compile_s = time.perf_counter() - start
+        start = time.perf_counter()
+        results = applier.apply_batch(instances, functions)
+        compiled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy = [applier.apply(inst['instance_id'], inst['text'], functions)
+                  for inst in sample]
+        per_instance = (time.perf_counter() - start) * len(instances) / len(sample)
+        assert [r.label for r in results[:len(sample)]] == [r.label for r in legacy]
+
+        labeled = sum(not r.abstained for r in results)
+        print(f'{count:>10}{len(instances):>11}{compile_s:>11.2f}{compiled:>12.1f}'
+              f'{per_instance:>16.1f}{labeled:>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Measure Solo Mode LLM labeling throughput against labeling concurrency.
+
+Starts a local OpenAI-compatible stub server that answers every chat
+completion after a fixed latency, points a Solo Mode manager at it, and times
+one background labeling batch per ``batches.labeling_concurrency`` setting.
+With ``--rps`` the per-endpoint rate limit is applied as well, which shows the
+throttle capping throughput regardless of concurrency.
+
+    python scripts/benchmark_llm_labeling.py [--items 64] [--latency 0.2]
+        [--concurrency 1 2 4 8 16] [--rps 0]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.ai import request_throttle  # noqa: E402
+from potato.solo_mode.config import parse_solo_mode_config  # noqa: E402
+from potato.solo_mode.manager import SoloModeManager  # noqa: E402
+
+SCHEMES = [{'name': 'sentiment', 'annotation_type': 'radio',
+            'labels': ['positive', 'negative', 'neutral']}]
+
+
+def start_stub_server(latency):
+    """Serve /v1/chat/completions with a canned label after ``latency`` seconds."""
+    content = json.dumps({'label': 'positive', 'confidence': 90, 'reasoning': 'stub'})
+    body = json.dumps({
+        'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': 'stub',
+        'choices': [{'index': 0, 'finish_reason': 'stop',
+                     'message': {'role': 'assistant', 'content': content}}],
+        'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+    }).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_batch(base_url, items, concurrency, rps):
+    request_throttle.reset_throttles()
+    solo_config = parse_solo_mode_config({
+        'solo_mode': {
+            'enabled': True,
+            'labeling_models': [{'endpoint_type': 'openai', 'model': 'stub',
+                                 'api_key': 'stub', 'base_url': base_url}],
+            'batches': {'labeling_concurrency': concurrency, 'requests_per_second': rps},
+        },
+        'annotation_schemes': SCHEMES,
+    })
+    manager = SoloModeManager(solo_config, {'annotation_schemes': SCHEMES})
+    manager.get_current_prompt_text = lambda: "Classify the sentiment."
+    manager._save_state = lambda: None
+
+    ism = MagicMock()
+    ism.instance_id_ordering = [f'i{k}' for k in range(items)]
+    ism.get_item_by_id.return_value = {'text': 'A short review to label.'}
+    with patch('potato.item_state_management.get_item_state_manager', return_value=ism):
+        manager.llm_labeling_thread._get_endpoint()  # connect outside the timing
+        start = time.perf_counter()
+        labeled = manager._label_batch(items)
+        elapsed = time.perf_counter() - start
+    return labeled, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="seconds the stub server takes per request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--rps", type=float, default=0.0,
+                        help="requests_per_second limit (0 = unlimited)")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    server = start_stub_server(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    print(f"{args.items} items, {args.latency * 1000:.0f} ms per request, "
+          f"rate limit {args.rps or 'none'}")
+    print(f"{'concurrency':>12}{'labeled':>10}{'seconds':>10}{'items/s':>10}")
+    for concurrency in args.concurrency:
+        labeled, elapsed = run_batch(base_url, args.items, concurrency, args.rps)
+        print(f"{concurrency:>12}{labeled:>10}{elapsed:>10.2f}{labeled / elapsed:>10.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Measure MediaCache accounting and eviction against the number of entries.
+
+Fills a cache directory with N small entries, then times the operations the
+media routes run on every request -- total size, a prune that has nothing to
+do, a cache hit -- and one prune that evicts 1% of the cache. The "scan"
+columns are the directory-walking implementation the index replaced (stat
+every file, sort by atime), kept here as the baseline.
+
+    python scripts/benchmark_media_cache.py [--entries 10000 50000 200000]
+        [--entry-bytes 2048] [--dir /tmp]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.media.cache import MediaCache  # noqa: E402
+
+
+def scan_total(root):
+    return sum(p.stat().st_size for p in root.iterdir()
+               if p.is_file() and not p.name.startswith("."))
+
+
+def scan_prune(root, max_bytes):
+    files = [p for p in root.iterdir() if p.is_file() and not p.name.startswith(".")]
+    total = sum(p.stat().st_size for p in files)
+    if total <= max_bytes:
+        return 0
+    files.sort(key=lambda p: p.stat().st_atime)
+    removed = 0
+    for path in files:
+        if total <= max_bytes:
+            break
+        total -= path.stat().st_size
+        path.unlink()
+        removed += 1
+    return removed
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--entry-bytes", type=int, default=2048)
+    parser.add_argument("--dir", default=tempfile.gettempdir(),
+                        help="where to create the temporary cache directories")
+    args = parser.parse_args()
+
+    print(f"{'entries':>9}{'scan total ms':>15}{'index total ms':>16}"
+          f"{'scan prune s':>14}{'index prune s':>15}{'touch us':>10}{'evicted':>9}")
+    payload = b"x" * args.entry_bytes
+    for n in args.entries:
+        with tempfile.TemporaryDirectory(dir=args.dir) as work:
+            cache = MediaCache(work, max_bytes=n * args.entry_bytes)
+            root = cache.ensure_dir()
+            for i in range(n):
+                path = root / f"{i:08d}.webp"
+                path.write_bytes(payload)
+                os.utime(path, (1_000_000 + i, 1_000_000 + i))
+            cache.rescan()
+
+            _, scan_total_s = timed(lambda: scan_total(root), repeat=3)
+            _, index_total_s = timed(cache.total_bytes, repeat=1000)
+
+            hit = root / f"{n // 2:08d}.webp"
+            _, touch_s = timed(lambda: cache.touch(hit), repeat=10_000)
+
+            # Over the limit by 1%: both implementations evict the same count.
+            limit = int(n * args.entry_bytes * 0.99)
+            cache.max_bytes = limit
+            evicted, index_prune_s = timed(cache.prune)
+            cache.close()
+
+            # The scan baseline on a fresh copy of the same state.
+            for i in range(evicted):
+                path = root / f"{i:08d}.webp"
+                path.write_bytes(payload)
+                os.utime(path, (1_000_000 + i, 1_000_000 + i))
+            _, scan_prune_s = timed(lambda: scan_prune(root, limit))
+
+            print(f"{n:>9}{scan_total_s * 1e3:>15.1f}{index_total_s * 1e3:>16.3f}"
+                  f"{scan_prune_s:>14.2f}{index_prune_s:>15.3f}{touch_s * 1e6:>10.1f}"
+                  f"{evicted:>9}")
+
+
+if __name__ == "__main__":
+    main()
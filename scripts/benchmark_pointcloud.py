@@ -0,0 +1,137 @@
+"""
+Measure point cloud conversion to PNT1, per format, NumPy vs pure Python.
+
+Writes a synthetic scan (xyz, rgb, intensity where the format has them) in
+each binary format and as ASCII PCD, then times read_point_cloud() plus
+to_wire() -- the whole conversion the media route runs, including the
+decimation to DEFAULT_MAX_POINTS -- with the NumPy fast paths and with them
+disabled. Both must produce the same bytes; the script checks that before
+printing. The pure-Python run is skipped above --python-limit points, where
+it takes minutes.
+
+    python scripts/benchmark_pointcloud.py [--points 200000 2000000]
+        [--formats pcd_ascii pcd_binary ply_binary kitti las]
+        [--python-limit 500000]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import potato.media.pointcloud as pc  # noqa: E402
+
+FORMATS = ("pcd_ascii", "pcd_binary", "ply_binary", "kitti", "las")
+
+
+def make_scan(rng, n):
+    xyz = rng.uniform(-80, 80, size=(n, 3)).astype(np.float32)
+    rgb = rng.integers(0, 256, size=(n, 3), dtype=np.uint8)
+    intensity = rng.uniform(0, 1, size=n).astype(np.float32)
+    return xyz, rgb, intensity
+
+
+def write_scan(fmt, path, xyz, rgb, intensity):
+    n = len(xyz)
+    if fmt == "pcd_ascii":
+        header = ("VERSION 0.7\nFIELDS x y z intensity\nSIZE 4 4 4 4\nTYPE F F F F\n"
+                  f"COUNT 1 1 1 1\nPOINTS {n}\nDATA ascii\n")
+        with open(path, "w") as fh:
+            fh.write(header)
+            np.savetxt(fh, np.column_stack([xyz, intensity]), fmt="%.6g")
+        return
+    if fmt == "kitti":
+        np.column_stack([xyz, intensity]).astype("<f4").tofile(path)
+        return
+    if fmt == "las":
+        record = np.dtype({"names": ["x", "y", "z", "i", "r", "g", "b"],
+                           "formats": ["<i4"] * 3 + ["<u2"] * 4,
+                           "offsets": [0, 4, 8, 12, 20, 22, 24], "itemsize": 26})
+        header = bytearray(227)
+        header[0:4] = b"LASF"
+        struct.pack_into("<HI", header, 94, 227, 227)      # header size, data offset
+        struct.pack_into("<BHI", header, 104, 2, 26, n)    # format, record length, count
+        struct.pack_into("<3d", header, 131, 0.001, 0.001, 0.001)
+        points = np.zeros(n, dtype=record)
+        for axis, name in enumerate("xyz"):
+            points[name] = np.round(xyz[:, axis] / 0.001)
+        points["i"] = (intensity * 65535).astype(np.uint16)
+        for channel, name in enumerate("rgb"):
+            points[name] = rgb[:, channel].astype(np.uint16) * 257
+        with open(path, "wb") as fh:
+            fh.write(bytes(header))
+            fh.write(points.tobytes())
+        return
+    record = np.dtype([("x", "<f4"), ("y", "<f4"), ("z", "<f4"),
+                       ("red", "u1"), ("green", "u1"), ("blue", "u1"), ("intensity", "<f4")])
+    points = np.zeros(n, dtype=record)
+    for axis, name in enumerate("xyz"):
+        points[name] = xyz[:, axis]
+    for channel, name in enumerate(("red", "green", "blue")):
+        points[name] = rgb[:, channel]
+    points["intensity"] = intensity
+    if fmt == "pcd_binary":
+        header = ("VERSION 0.7\nFIELDS x y z red green blue intensity\n"
+                  "SIZE 4 4 4 1 1 1 4\nTYPE F F F U U U F\nCOUNT 1 1 1 1 1 1 1\n"
+                  f"POINTS {n}\nDATA binary\n")
+    else:
+        header = ("ply\nformat binary_little_endian 1.0\n"
+                  f"element vertex {n}\nproperty float x\nproperty float y\n"
+                  "property float z\nproperty uchar red\nproperty uchar green\n"
+                  "property uchar blue\nproperty float intensity\nend_header\n")
+    with open(path, "wb") as fh:
+        fh.write(header.encode("ascii"))
+        fh.write(points.tobytes())
+
+
+def convert(path):
+    start = time.perf_counter()
+    wire = pc.to_wire(pc.read_point_cloud(path))
+    return wire, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, nargs="+", default=[200_000, 2_000_000])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--python-limit", type=int, default=500_000,
+                        help="skip the pure-Python run above this many points")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    numpy_paths = pc._numpy
+    print(f"{'format':<12}{'points':>10}{'file MB':>9}{'numpy s':>9}{'python s':>10}"
+          f"{'speedup':>9}{'Mpts/s':>8}")
+    with tempfile.TemporaryDirectory() as work:
+        for n in args.points:
+            xyz, rgb, intensity = make_scan(rng, n)
+            for fmt in args.formats:
+                suffix = {"kitti": ".bin", "las": ".las", "ply_binary": ".ply"}.get(fmt, ".pcd")
+                path = os.path.join(work, fmt + suffix)
+                write_scan(fmt, path, xyz, rgb, intensity)
+                size_mb = os.path.getsize(path) / 2**20
+
+                wire, fast_s = convert(path)
+                slow = "-"
+                speedup = "-"
+                if n <= args.python_limit:
+                    pc._numpy = lambda: None
+                    try:
+                        reference, slow_s = convert(path)
+                    finally:
+                        pc._numpy = numpy_paths
+                    assert wire == reference, f"{fmt}: fast path output differs"
+                    slow = f"{slow_s:.2f}"
+                    speedup = f"{slow_s / fast_s:.1f}x"
+                print(f"{fmt:<12}{n:>10}{size_mb:>9.1f}{fast_s:>9.2f}{slow:>10}"
+                      f"{speedup:>9}{n / fast_s / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measure FTS5 search-index build and restart times.
+
+For each corpus size, builds the index from synthetic instance text in a
+fresh ``project.sqlite``, then times what a server restart costs: a sync
+over the same rows (nothing changed) and a sync with 1% of the instances
+edited. The ``rebuild`` column replays the previous behaviour -- delete
+everything and insert row by row on the shared autocommit connection --
+for sizes up to ``--rebuild-max``, since it runs at every start.
+
+    python scripts/benchmark_search_index.py [--sizes 100000 1000000]
+        [--rebuild-max 100000] [--dir /tmp]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.persistence import clear_db_cache, get_db  # noqa: E402
+from potato.search.fts5 import FTS5Backend  # noqa: E402
+
+WORDS = ("annotation corpus label review quick brown fox river swan deadline "
+         "project instance search index token rare signal noise claim queue").split()
+
+
+def make_rows(n, seed=0):
+    rng = random.Random(seed)
+    return [(f"item_{i}", " ".join(rng.choice(WORDS) for _ in range(30)))
+            for i in range(n)]
+
+
+def rebuild(task_dir, rows):
+    conn = get_db(task_dir)
+    conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS instance_fts "
+                 "USING fts5(instance_id UNINDEXED, body)")
+    conn.execute("DELETE FROM instance_fts")
+    for instance_id, text in rows:
+        conn.execute("INSERT INTO instance_fts (instance_id, body) VALUES (?, ?)",
+                     (instance_id, text))
+    conn.commit()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--rebuild-max", type=int, default=100_000,
+                        help="largest size to time the old full rebuild at")
+    parser.add_argument("--dir", default=tempfile.gettempdir(),
+                        help="where to create the temporary project databases")
+    args = parser.parse_args()
+
+    print(f"{'instances':>10}{'first build s':>15}{'restart s':>11}"
+          f"{'1% edited s':>13}{'rebuild s':>11}")
+    for n in args.sizes:
+        rows = make_rows(n)
+        edited = list(rows)
+        for i in range(0, n, 100):
+            edited[i] = (rows[i][0], rows[i][1] + " edited")
+        with tempfile.TemporaryDirectory(dir=args.dir) as work:
+            first = timed(FTS5Backend(work).index, rows)
+            clear_db_cache()
+            restart = timed(FTS5Backend(work).index, rows)
+            clear_db_cache()
+            changed = timed(FTS5Backend(work).index, edited)
+            clear_db_cache()
+        old = "-"
+        if n <= args.rebuild_max:
+            with tempfile.TemporaryDirectory(dir=args.dir) as work:
+                rebuild(work, rows)
+                clear_db_cache()
+                old = f"{timed(rebuild, work, rows):.1f}"
+                clear_db_cache()
+        print(f"{n:>10}{first:>15.1f}{restart:>11.1f}{changed:>13.1f}{old:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Measure Solo Mode next-item latency for the human annotator.
+
+Builds a project of ``--instances`` items, gives the LLM predictions (two or
+three confidence-history entries each) on ``--predicted`` of them and marks
+1% as disagreements, then runs the annotator loop: request the next item,
+label it, and let the LLM label one more instance before the next request.
+``first`` is the request that builds the pools; ``next`` is the steady-state
+request latency. ``rebuild`` replays the previous behaviour -- rebuild the
+available set, prediction dicts and cartography scores, then
+``refresh_pools`` -- on every request.
+
+    python scripts/benchmark_solo_next_item.py [--instances 10000 100000]
+        [--predicted 0.6] [--requests 200]
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import potato.item_state_management as ism_mod  # noqa: E402
+from potato.server_utils.config_module import config  # noqa: E402
+from potato.solo_mode.config import parse_solo_mode_config  # noqa: E402
+from potato.solo_mode.manager import LLMPrediction, SoloModeManager  # noqa: E402
+
+SCHEMES = [{'name': 'sentiment', 'annotation_type': 'radio',
+            'labels': ['positive', 'negative', 'neutral']}]
+
+
+def build(n, predicted, workdir, rng):
+    config.update({
+        'task_dir': workdir,
+        'output_annotation_dir': workdir,
+        'item_properties': {'id_key': 'id', 'text_key': 'text'},
+        'annotation_task_name': 'benchmark',
+        'annotation_schemes': SCHEMES,
+    })
+    ism_mod.ITEM_STATE_MANAGER = None
+    ism = ism_mod.init_item_state_manager(config)
+    ism.add_items({f'item_{i}': {'id': f'item_{i}', 'text': f'text {i}'} for i in range(n)})
+
+    solo = parse_solo_mode_config({
+        'solo_mode': {'enabled': True, 'labeling_models': [],
+                      'instance_selection': {'cartography_weight': 0.1,
+                                             'random_weight': 0.1}},
+        'annotation_schemes': SCHEMES,
+    })
+    mgr = SoloModeManager(solo, {'annotation_schemes': SCHEMES})
+    for i in range(int(n * predicted)):
+        for version in range(1, rng.choice((3, 4))):
+            predict(mgr, rng, f'item_{i}', version)
+    mgr.disagreement_ids.update(f'item_{i}' for i in range(0, n, 100))
+    return ism, mgr
+
+
+def predict(mgr, rng, instance_id, version=1):
+    confidence = rng.random()
+    mgr.set_llm_prediction(instance_id, 'sentiment', LLMPrediction(
+        instance_id=instance_id, schema_name='sentiment',
+        predicted_label='positive', confidence_score=confidence,
+        uncertainty_score=1 - confidence, prompt_version=version,
+    ))
+
+
+def rebuild_next(mgr, ism):
+    available = set(ism.instance_id_ordering) - mgr.human_labeled_ids
+    pred_dicts = {iid: {s: p.to_dict() for s, p in schemas.items()}
+                  for iid, schemas in mgr.predictions.items()}
+    cartography = {iid: s['variability']
+                   for iid, s in mgr.get_cartography_scores().items()}
+    mgr.instance_selector.refresh_pools(
+        available_ids=available, llm_predictions=pred_dicts,
+        disagreement_ids=mgr.disagreement_ids,
+        confidence_threshold=mgr.config.thresholds.confidence_low,
+        cartography_scores=cartography,
+    )
+    return mgr.instance_selector.select_next(available, exclude_ids=mgr.human_labeled_ids)
+
+
+def run_loop(mgr, rng, n, requests, next_fn):
+    timings = []
+    for k in range(requests):
+        start = time.perf_counter()
+        instance_id = next_fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        mgr.record_human_label(instance_id, 'sentiment', 'positive', 'annotator')
+        predict(mgr, rng, f'item_{rng.randrange(n)}', 5)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instances', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--predicted', type=float, default=0.6)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--rebuild-requests', type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'instances':>10}{'first ms':>10}{'next p50 ms':>13}{'next p99 ms':>13}"
+          f"{'rebuild ms':>12}")
+    for n in args.instances:
+        rng = random.Random(n)
+        with tempfile.TemporaryDirectory() as workdir:
+            ism, mgr = build(n, args.predicted, workdir, rng)
+            start = time.perf_counter()
+            mgr.get_next_instance_for_human('annotator')
+            first = (time.perf_counter() - start) * 1000
+            timings = run_loop(mgr, rng, n, args.requests,
+                               lambda: mgr.get_next_instance_for_human('annotator'))
+            rebuild = run_loop(mgr, rng, n, args.rebuild_requests,
+                               lambda: rebuild_next(mgr, ism))
+        print(f'{n:>10}{first:>10.0f}{statistics.median(timings):>13.3f}'
+              f'{sorted(timings)[int(0.99 * (len(timings) - 1))]:>13.3f}'
+              f'{statistics.median(rebuild):>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Measure Solo Mode state save and load latency as predictions accumulate.
+
+For each size, fills a SoloModeManager with that many LLM predictions
+(three confidence-history entries each), writes the first snapshot, then
+times ``--saves`` saves that each follow one new prediction or one human
+label -- the per-label pattern of the labeling loop and annotation routes.
+``legacy`` times the previous save, which re-serialized the whole state with
+``json.dump(indent=2)`` on every call, for sizes up to ``--legacy-max``.
+``load`` is a cold ``load_state`` from the snapshot plus the journal the
+timed saves produced.
+
+    python scripts/benchmark_solo_state.py [--sizes 1000 10000 100000 500000]
+        [--saves 200] [--legacy-max 100000] [--dir /tmp]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.solo_mode.config import parse_solo_mode_config  # noqa: E402
+from potato.solo_mode.manager import LLMPrediction, SoloModeManager  # noqa: E402
+
+APP_CONFIG = {
+    'annotation_schemes': [
+        {'name': 'sentiment', 'annotation_type': 'radio',
+         'labels': ['positive', 'negative', 'neutral']},
+    ],
+}
+LABELS = ('positive', 'negative', 'neutral')
+
+
+def make_manager(state_dir):
+    config = parse_solo_mode_config({
+        'solo_mode': {'enabled': True, 'labeling_models': []}, **APP_CONFIG,
+    })
+    config.state_dir = state_dir
+    return SoloModeManager(config, APP_CONFIG)
+
+
+def predict(mgr, rng, instance_id, version=1):
+    confidence = rng.random()
+    mgr.set_llm_prediction(instance_id, 'sentiment', LLMPrediction(
+        instance_id=instance_id, schema_name='sentiment',
+        predicted_label=rng.choice(LABELS), confidence_score=confidence,
+        uncertainty_score=1 - confidence, prompt_version=version,
+        model_name='bench-model', reasoning='short rationale for the label',
+    ))
+
+
+def legacy_save(mgr):
+    state = mgr._head_state()
+    state.update(mgr._instance_state())
+    path = os.path.join(mgr.config.state_dir, 'legacy_state.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument('--saves', type=int, default=200)
+    parser.add_argument('--legacy-max', type=int, default=100_000,
+                        help='largest size to time the old full-dump save at')
+    parser.add_argument('--dir', default=tempfile.gettempdir(),
+                        help='where to create the temporary state directories')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'predictions':>12}{'save p50 ms':>13}{'save p99 ms':>13}"
+          f"{'legacy ms':>11}{'load s':>8}")
+    for n in args.sizes:
+        rng = random.Random(n)
+        with tempfile.TemporaryDirectory(dir=args.dir) as work:
+            mgr = make_manager(work)
+            for i in range(n):
+                for version in (1, 2, 3):
+                    predict(mgr, rng, f'item_{i}', version)
+            mgr._save_state()
+
+            timings = []
+            for k in range(args.saves):
+                if k % 2:
+                    predict(mgr, rng, f'new_{k}')
+                else:
+                    mgr.human_labeled_ids.add(f'item_{rng.randrange(n)}')
+                    target = mgr.predictions[f'item_{rng.randrange(n)}']['sentiment']
+                    target.human_label = rng.choice(LABELS)
+                    mgr._dirty_ids.add(target.instance_id)
+                start = time.perf_counter()
+                mgr._save_state()
+                timings.append((time.perf_counter() - start) * 1000)
+            mgr._state_store.close()
+
+            legacy = '-'
+            if n <= args.legacy_max:
+                runs = []
+                for _ in range(3):
+                    start = time.perf_counter()
+                    legacy_save(mgr)
+                    runs.append((time.perf_counter() - start) * 1000)
+                legacy = f'{statistics.median(runs):.0f}'
+
+            start = time.perf_counter()
+            make_manager(work).load_state()
+            load = time.perf_counter() - start
+
+        print(f'{n:>12}{statistics.median(timings):>13.2f}{percentile(timings, 0.99):>13.2f}'
+              f'{legacy:>11}{load:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
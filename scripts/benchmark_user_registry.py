@@ -0,0 +1,100 @@
+"""
+Measure a registration burst against the file-backed user registry.
+
+``--users`` accounts register from ``--threads`` threads, the way a
+Prolific/MTurk launch hits ``/register``. Each registration is followed by
+the persistence call the route makes. ``append`` is the current behaviour:
+``persist_user`` appends one line. ``rewrite`` replays the previous one: the
+whole user file rewritten in place after every registration.
+
+Registrations are passwordless by default, so the numbers are the storage
+cost alone; ``--passwords`` adds the PBKDF2 hash every real registration
+pays. After the burst the file is loaded into a fresh authenticator (what a
+restart does) and the users it yields are counted. Then ``--changes``
+password changes are appended and the file is compacted.
+
+    python scripts/benchmark_user_registry.py [--users 5000] [--threads 16]
+        [--passwords] [--changes 3000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.authentication import UserAuthenticator  # noqa: E402
+
+
+def legacy_save_user_config(authenticator):
+    with open(authenticator.user_config_path, "wt", encoding="utf-8") as f:
+        for k in authenticator.userlist:
+            f.write(json.dumps(authenticator._user_record(k)) + "\n")
+
+
+def make_authenticator(path, passwords):
+    authenticator = UserAuthenticator(path, require_password=passwords)
+    authenticator.user_config_path_explicit = True
+    return authenticator
+
+
+def burst(mode, path, users, threads, passwords):
+    authenticator = make_authenticator(path, passwords)
+
+    def register(i):
+        username = f"worker_{i:05d}"
+        authenticator.add_user(username, "pw" if passwords else None)
+        if mode == "append":
+            authenticator.persist_user(username)
+        else:
+            legacy_save_user_config(authenticator)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(register, range(users)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--passwords", action="store_true",
+                        help="hash a password per registration (PBKDF2)")
+    parser.add_argument("--changes", type=int, default=3000,
+                        help="password changes to append before compacting")
+    args = parser.parse_args()
+
+    print(f"{'mode':>8}{'burst s':>9}{'reg/s':>9}{'load s':>8}{'users':>7}{'file MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("append", "rewrite"):
+            path = os.path.join(tmp, f"{mode}.jsonl")
+            seconds = burst(mode, path, args.users, args.threads, args.passwords)
+            start = time.perf_counter()
+            loaded = make_authenticator(path, args.passwords)
+            load_s = time.perf_counter() - start
+            size = os.path.getsize(path) / 1e6
+            print(f"{mode:>8}{seconds:>9.2f}{args.users / seconds:>9.0f}{load_s:>8.2f}"
+                  f"{len(loaded.users):>7}{size:>9.2f}")
+
+        path = os.path.join(tmp, "append.jsonl")
+        authenticator = make_authenticator(path, True)
+        start = time.perf_counter()
+        for i in range(args.changes):
+            username = f"worker_{i % args.users:05d}"
+            authenticator.auth_backend.users[username] = f"{i:032x}${i:064x}"
+            authenticator.persist_user(username)
+        changes_s = time.perf_counter() - start
+        with open(path) as f:
+            lines = sum(1 for _ in f)
+        print(f"\n{args.changes} password changes appended in {changes_s:.2f}s; "
+              f"file holds {lines} lines for {len(authenticator.userlist)} users "
+              f"({authenticator._registry.stale_records} superseded)")
+
+
+if __name__ == "__main__":
+    main()
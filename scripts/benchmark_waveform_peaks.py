@@ -0,0 +1,81 @@
+"""
+Measure native waveform generation against recording length.
+
+Writes a synthetic 16-bit WAV per duration (a tone with noise, so peaks vary),
+then times waveform_peaks.generate_peaks -- streaming decode, per-pixel
+min/max at 256 samples per pixel and the coarser pyramid levels the
+WaveformService writes -- and reports throughput as a multiple of real time.
+Peak memory is the process's maximum RSS after each run; it should stay flat
+as the recordings get longer because audio is read in fixed-size blocks.
+
+WAV files are large (a 3-hour mono 44.1 kHz file is ~950 MB), so they are
+written to --dir and removed afterwards.
+
+    python scripts/benchmark_waveform_peaks.py [--minutes 10 60 180]
+        [--sample-rate 44100] [--channels 1] [--dir /tmp]
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.server_utils import waveform_peaks  # noqa: E402
+from potato.server_utils.waveform_service import WaveformService  # noqa: E402
+
+
+def write_wav(path, minutes, rate, channels):
+    """Write the recording a minute at a time."""
+    rng = np.random.default_rng(0)
+    t = np.arange(rate * 60) / rate
+    tone = 12000 * np.sin(2 * np.pi * 220 * t)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        for _ in range(minutes):
+            minute = tone + rng.normal(0, 3000, size=t.size)
+            frames = np.repeat(minute[:, None], channels, axis=1)
+            w.writeframes(np.clip(frames, -32768, 32767).astype("<i2").tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, nargs="+", default=[10, 60, 180])
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--dir", default=tempfile.gettempdir(),
+                        help="where to write the temporary WAV files")
+    args = parser.parse_args()
+
+    levels = WaveformService.WAVEFORM_PYRAMID_LEVELS
+    print(f"{args.sample_rate} Hz, {args.channels} channel(s), levels {list(levels)}")
+    print(f"{'minutes':>8}{'wav MB':>9}{'seconds':>9}{'x realtime':>12}"
+          f"{'MB/s':>8}{'dat KB':>9}{'max RSS MB':>12}")
+    for minutes in args.minutes:
+        with tempfile.TemporaryDirectory(dir=args.dir) as work:
+            audio = os.path.join(work, "audio.wav")
+            output = os.path.join(work, "audio.dat")
+            write_wav(audio, minutes, args.sample_rate, args.channels)
+            wav_mb = os.path.getsize(audio) / 2**20
+
+            start = time.perf_counter()
+            assert waveform_peaks.generate_peaks(audio, output, levels)
+            seconds = time.perf_counter() - start
+
+            dat_kb = sum(os.path.getsize(os.path.join(work, name))
+                         for name in os.listdir(work) if name.endswith(".dat")) / 1024
+            rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"{minutes:>8}{wav_mb:>9.0f}{seconds:>9.2f}{minutes * 60 / seconds:>12.0f}"
+                  f"{wav_mb / seconds:>8.0f}{dat_kb:>9.0f}{rss_mb:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Measure webhook delivery throughput against local HTTP receivers.
+
+Starts two keep-alive receivers on localhost -- a fast one and a slow one
+that sleeps ``--slow-ms`` per request -- and pushes ``--events`` events to
+each, then reports how long until each receiver has seen every event. The
+``serial`` row replays the old design (one thread, a fresh ``urlopen`` per
+event, both endpoints sharing the queue) for comparison; the other rows
+use ``WebhookDeliveryQueue`` lanes with the given concurrency and batch size.
+
+    python scripts/benchmark_webhook_delivery.py [--events 500] [--slow-ms 20]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from potato.webhooks.sender import WebhookDeliveryQueue  # noqa: E402
+from potato.webhooks.signing import build_headers  # noqa: E402
+
+
+class Receiver:
+    def __init__(self, delay):
+        self.delay = delay
+        self.count = 0
+        self.lock = threading.Lock()
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if receiver.delay:
+                    time.sleep(receiver.delay)
+                events = body.count(b'"n"')
+                with receiver.lock:
+                    receiver.count += events
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *a):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/hook"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def reset(self):
+        with self.lock:
+            self.count = 0
+
+
+def wait_all(receivers, events, start):
+    done = {}
+    while len(done) < len(receivers):
+        for name, r in receivers.items():
+            if name not in done and r.count >= events:
+                done[name] = time.perf_counter() - start
+        time.sleep(0.002)
+    return done
+
+
+def run_serial(receivers, payloads):
+    start = time.perf_counter()
+
+    def worker():
+        for payload in payloads:
+            for r in receivers.values():
+                headers = build_headers("s", payload)
+                urlopen(Request(r.url, data=payload, headers=headers, method="POST"),
+                        timeout=10).close()
+
+    threading.Thread(target=worker, daemon=True).start()
+    return wait_all(receivers, len(payloads), start)
+
+
+def run_lanes(receivers, payloads, concurrency, batch_size):
+    q = WebhookDeliveryQueue()
+    for r in receivers.values():
+        q.configure_endpoint(r.url, "s", concurrency=concurrency,
+                             batch_size=batch_size, batch_window=0.05)
+    q.start()
+    start = time.perf_counter()
+    for payload in payloads:
+        for r in receivers.values():
+            q.enqueue(r.url, "s", payload)
+    done = wait_all(receivers, len(payloads), start)
+    q.stop()
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--slow-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    receivers = {"fast": Receiver(0), "slow": Receiver(args.slow_ms / 1000)}
+    payloads = [b'{"event": "item.fully_annotated", "n": %d}' % i for i in range(args.events)]
+    setups = [("serial", None, None), ("lanes c=1", 1, 1), ("lanes c=4", 4, 1),
+              ("lanes c=4 batch=50", 4, 50)]
+
+    print(f"{'setup':<20}{'fast s':>9}{'slow s':>9}{'fast ev/s':>11}{'slow ev/s':>11}")
+    for label, concurrency, batch_size in setups:
+        for r in receivers.values():
+            r.reset()
+        if concurrency is None:
+            done = run_serial(receivers, payloads)
+        else:
+            done = run_lanes(receivers, payloads, concurrency, batch_size)
+        print(f"{label:<20}{done['fast']:>9.2f}{done['slow']:>9.2f}"
+              f"{args.events / done['fast']:>11.0f}{args.events / done['slow']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
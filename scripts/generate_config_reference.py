@@ -94,7 +94,7 @@ CATEGORY_ORDER = [
         "psychometrics", "boundary_probing", "event_template", "corpus_map",
         "rooms", "truth_serum", "thinkaloud", "pocket",
         "analytics", "annotator_dashboard", "keystroke_logging",
-        "annotation_telemetry",
+        "annotation_telemetry", "behavioral_event_store",
     ]),
     ("UI & Layout", [
         "ui", "ui_config", "layout", "instance_display", "format_handling",
@@ -124,6 +124,7 @@ CATEGORY_ORDER = [
     ]),
     ("Debug / Logging", [
         "debug", "debug_phase", "server_debug", "verbose", "very_verbose", "debug_log",
+        "instrumentation",
     ]),
     ("Agent", [
         "live_agent", "live_coding_agent", "agent_proxy",
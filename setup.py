@@ -156,7 +156,7 @@ setup(
     include_package_data=True,
     entry_points={
         "console_scripts": [
-            "potato=potato.flask_server:main",
+            "potato=potato.cli:main",
         ],
         # Pytest plugin for Potato evaluations (markers, the potato_eval fixture,
         # --potato-threshold gating). Inert unless eval tests run / thresholds set.
@@ -16,6 +16,7 @@ import requests
 from typing import Optional, Dict, Any
 from contextlib import contextmanager
 import signal
+import shutil
 import pytest
 from potato.item_state_management import clear_item_state_manager
 from potato.user_state_management import clear_user_state_manager
@@ -29,6 +30,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # Import port manager for reliable port allocation
 from tests.helpers.port_manager import find_free_port, release_port
 
+# Example projects live in the repo; servers started on them run a copy.
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'examples'))
+
 
 def clear_all_global_state():
     """Clear all global singleton state to ensure test isolation.
@@ -193,6 +197,7 @@ class FlaskTestServer:
         self.app_factory = app_factory
         self.config = None
         self.temp_config_file = None
+        self.example_copy_dir = None
         self.debug = debug
         self.test_data_file = test_data_file
         self.admin_api_key = 'test-admin-api-key'
@@ -204,6 +209,8 @@ class FlaskTestServer:
 
         # Handle config_file parameter (new pattern)
         if config_file is not None:
+            config_file = self._copy_if_example(config_file)
+
             # Load and modify the config file to ensure port matches
             with open(config_file, 'r') as f:
                 config_data = yaml.safe_load(f)
@@ -219,6 +226,7 @@ class FlaskTestServer:
 
             # Write updated config to a temp file in the same directory
             config_dir = os.path.dirname(os.path.abspath(config_file))
+            self._pin_output_dir(config_data, config_dir)
             temp_config_path = os.path.join(config_dir, f'test_config_port_{self.port}.yaml')
             with open(temp_config_path, 'w') as f:
                 yaml.dump(config_data, f)
@@ -261,6 +269,7 @@ class FlaskTestServer:
             elif isinstance(config, str):
                 # If config is a file path, use it directly but update with test settings
                 # This preserves the original directory structure and data file paths
+                config = self._copy_if_example(config)
                 with open(config, 'r') as f:
                     config_data = yaml.safe_load(f)
 
@@ -282,6 +291,7 @@ class FlaskTestServer:
 
                 # Write updated config back to the SAME directory to preserve data file paths
                 config_dir = os.path.dirname(os.path.abspath(config))
+                self._pin_output_dir(config_data, config_dir)
                 temp_config_path = os.path.join(config_dir, 'test_config_modified.yaml')
                 with open(temp_config_path, 'w') as f:
                     yaml.dump(config_data, f)
@@ -295,6 +305,39 @@ class FlaskTestServer:
     def __del__(self):
         if self.temp_config_file and os.path.exists(self.temp_config_file):
             os.remove(self.temp_config_file)
+        if self.example_copy_dir:
+            shutil.rmtree(self.example_copy_dir, ignore_errors=True)
+
+    def _copy_if_example(self, config_file):
+        """Return the config of a temporary copy of an example project.
+
+        A server writes its annotation output, project.sqlite and generated
+        layouts next to its config. For a config under ``examples/`` that is
+        the repo, so the example's directory is copied out first -- whatever
+        a test prepared there included -- and the copy is served instead.
+        Any other config is returned unchanged.
+        """
+        config_path = os.path.abspath(config_file)
+        if os.path.commonpath([config_path, EXAMPLES_DIR]) != EXAMPLES_DIR:
+            return config_file
+        source_dir = os.path.dirname(config_path)
+        self.example_copy_dir = tempfile.mkdtemp(prefix='potato_example_')
+        copy_dir = os.path.join(self.example_copy_dir, os.path.basename(source_dir))
+        shutil.copytree(source_dir, copy_dir, ignore=shutil.ignore_patterns(
+            'test_config_port_*.yaml', 'test_config_modified.yaml'))
+        return os.path.join(copy_dir, os.path.basename(config_path))
+
+    @staticmethod
+    def _pin_output_dir(config_data, config_dir):
+        """Make a relative ``output_annotation_dir`` absolute under ``config_dir``.
+
+        The server thread chdirs to the config's directory to load it, but the
+        cwd is process-wide and is reset to the repo root between tests, so
+        code that resolves the bare path later would write into the repo.
+        """
+        output_dir = config_data.get('output_annotation_dir')
+        if isinstance(output_dir, str) and output_dir and not os.path.isabs(output_dir):
+            config_data['output_annotation_dir'] = os.path.join(config_dir, output_dir)
 
     def _get_available_port(self, requested_port=None):
         """Get an available port, using requested_port if available, otherwise find a free one.
@@ -997,6 +1040,19 @@ class FlaskTestServer:
                     except ImportError:
                         pass
 
+                # Register request instrumentation if configured, with a fresh
+                # registry per test server.
+                if config.get("instrumentation", {}).get("enabled", False):
+                    from potato.instrumentation import (
+                        init_metrics_registry, clear_metrics_registry)
+                    from potato.instrumentation.hooks import install_request_hooks
+                    from potato.instrumentation.routes import instrumentation_bp
+                    clear_metrics_registry()
+                    init_metrics_registry(config)
+                    install_request_hooks(app)
+                    if 'instrumentation' not in app.blueprints:
+                        app.register_blueprint(instrumentation_bp)
+
                 # Register semantic-curation blueprint if configured
                 if config.get("curation", {}).get("enabled", False):
                     try:
@@ -120,7 +120,7 @@ def create_test_config(
         "max_annotations_per_user", "assignment_strategy", "output_annotation_format",
         "random_seed", "admin_api_key", "max_annotations_per_item",
         "icl_labeling", "adjudication", "mace", "list_as_text",
-        "keystroke_logging", "annotation_telemetry",
+        "keystroke_logging", "annotation_telemetry", "behavioral_event_store",
         "num_annotators_per_item", "per_annotator_quota",
         "quality_control", "gold_standards", "attention_checks",
     ]
@@ -298,6 +298,32 @@ def get_project_root() -> str:
     return str(Path(__file__).parent.parent.parent)
 
 
+def copy_example_dir(example: str, dest_root) -> str:
+    """
+    Copy an example project out of the repo so a test can run it in place.
+
+    Starting a server on ``examples/<example>/config.yaml`` writes
+    annotation_output/, project.sqlite and the like next to the config, i.e.
+    into the repo. Tests run the copy instead; output a previous run left in
+    the example is not copied.
+
+    Args:
+        example: Path of the example under ``examples/``, e.g. "advanced/mace-demo"
+        dest_root: Directory to copy into, typically from tmp_path(_factory)
+
+    Returns:
+        Path to the copied example directory
+    """
+    import shutil
+
+    source = os.path.join(get_project_root(), "examples", example)
+    dest = os.path.join(str(dest_root), os.path.basename(example.rstrip("/")))
+    shutil.copytree(source, dest, ignore=shutil.ignore_patterns(
+        "annotation_output", "project.sqlite*", "test_config_port_*.yaml",
+        "admin_api_key.txt", "__pycache__"))
+    return dest
+
+
 def get_tests_dir() -> str:
     """
     Get the tests directory.
@@ -0,0 +1,128 @@
+"""Cold-start import budget for the ``potato`` CLI and server boot.
+
+``import potato`` is cheap and every subcommand other than ``start`` imports
+only the module that implements it (see potato/cli.py). This guards that:
+each subcommand is imported in a fresh interpreter under ``-X importtime``
+and must stay within a module-count and import-time budget, and must not
+pull in the server stack at all. Server boot gets its own, larger budget so
+a regression there is caught too.
+
+Times are generous CI bounds and env-tunable; module counts are the stable
+signal:
+
+    POTATO_IMPORT_CLI_S=0.5 POTATO_IMPORT_SERVER_S=3 pytest tests/performance -q
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CLI_BUDGET_S = float(os.environ.get("POTATO_IMPORT_CLI_S", "3"))
+CLI_MAX_MODULES = int(os.environ.get("POTATO_IMPORT_CLI_MODULES", "450"))
+SERVER_BUDGET_S = float(os.environ.get("POTATO_IMPORT_SERVER_S", "20"))
+SERVER_MAX_MODULES = int(os.environ.get("POTATO_IMPORT_SERVER_MODULES", "2000"))
+
+# What each subcommand imports once potato.cli has dispatched it.
+SUBCOMMAND_MODULES = {
+    "validate": "potato.validate_cli",
+    "export": "potato.export.cli",
+    "migrate": "potato.migrate_cli",
+    "repair-annotations": "potato.repair_cli",
+    "reset-password": "potato.password_reset",
+    "codebook": "potato.codebook_cli",
+    "transcripts": "potato.transcript_cli",
+    "convokit": "potato.convokit.cli",
+    "import": "potato.importers.cli",
+    "download-models": "potato.models_cli",
+    "deploy": "potato.deploy.cli",
+    "share": "potato.deploy.share_cli",
+}
+
+# The server stack a non-server subcommand has no business loading.
+SERVER_ONLY = ("potato.flask_server", "potato.routes", "flask", "pandas", "bs4",
+               "simpledorff")
+
+
+def _importtime(*modules):
+    """``(seconds, modules)`` imported by a fresh interpreter importing ``modules``."""
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    seconds = 0.0
+    imported = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imported.append(name.strip())
+        # Top-level imports carry the cumulative time of everything beneath.
+        if not name[1:].startswith(" "):
+            seconds += int(cumulative_us) / 1e6
+    return seconds, imported
+
+
+def test_package_import_does_not_load_the_server():
+    _seconds, imported = _importtime("potato")
+    assert "potato.flask_server" not in imported
+
+
+def test_create_app_still_reachable_from_the_package():
+    proc = subprocess.run(
+        [sys.executable, "-c",
+         "import potato, sys; assert 'potato.flask_server' not in sys.modules; "
+         "from potato import create_app; assert callable(create_app)"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+
+@pytest.mark.parametrize("subcommand", sorted(SUBCOMMAND_MODULES))
+def test_subcommand_cold_start_within_budget(subcommand):
+    seconds, imported = _importtime("potato.cli", SUBCOMMAND_MODULES[subcommand])
+
+    loaded = sorted(set(imported) & set(SERVER_ONLY))
+    assert not loaded, f"`potato {subcommand}` imports the server stack: {loaded}"
+    assert len(imported) <= CLI_MAX_MODULES, (
+        f"`potato {subcommand}` imports {len(imported)} modules "
+        f"(budget {CLI_MAX_MODULES})"
+    )
+    assert seconds < CLI_BUDGET_S, (
+        f"`potato {subcommand}` spends {seconds:.2f}s importing (budget {CLI_BUDGET_S}s)"
+    )
+
+
+def test_server_boot_within_budget():
+    seconds, imported = _importtime("potato.cli", "potato.flask_server")
+    assert len(imported) <= SERVER_MAX_MODULES, (
+        f"server boot imports {len(imported)} modules (budget {SERVER_MAX_MODULES})"
+    )
+    assert seconds < SERVER_BUDGET_S, (
+        f"server boot spends {seconds:.2f}s importing (budget {SERVER_BUDGET_S}s)"
+    )
+
+
+def test_subcommands_dispatch_without_the_server(tmp_path):
+    """``potato validate`` runs end to end and never loads flask_server."""
+    config = tmp_path / "config.yaml"
+    config.write_text("annotation_task_name: t\n")
+    proc = subprocess.run(
+        [sys.executable, "-c",
+         "import sys\n"
+         "from potato.cli import main\n"
+         "try:\n"
+         f"    main(['validate', {str(config)!r}])\n"
+         "except SystemExit:\n"
+         "    pass\n"
+         "assert 'potato.flask_server' not in sys.modules\n"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
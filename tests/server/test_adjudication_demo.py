@@ -13,43 +13,33 @@ import subprocess
 import sys
 import pytest
 import requests
-import shutil
 
 from tests.helpers.flask_test_setup import FlaskTestServer
 from tests.helpers.port_manager import find_free_port
-
-
-# Locate the demo config relative to repo root
-REPO_ROOT = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "..", "..")
-)
-DEMO_DIR = os.path.join(
-    REPO_ROOT, "examples", "advanced", "adjudication"
-)
-CONFIG_FILE = os.path.join(DEMO_DIR, "config.yaml")
+from tests.helpers.test_utils import copy_example_dir
 
 
 class TestAdjudicationDemo:
     """Integration tests that start the server with the real demo config."""
 
     @pytest.fixture(scope="class", autouse=True)
-    def flask_server(self, request):
+    def flask_server(self, request, tmp_path_factory):
         """Start the server using the real adjudication demo config."""
-        # Clean up any previous adjudication decisions so the queue is fresh
-        adj_output = os.path.join(DEMO_DIR, "annotation_output", "adjudication")
-        if os.path.exists(adj_output):
-            shutil.rmtree(adj_output)
+        # Run a fresh copy of the demo so the queue starts empty and its
+        # output stays out of the repo
+        demo_dir = copy_example_dir("advanced/adjudication",
+                                    tmp_path_factory.mktemp("adjudication_demo"))
 
         # Generate synthetic annotation data (gitignored, must be regenerated)
-        setup_script = os.path.join(DEMO_DIR, "setup_demo.py")
+        setup_script = os.path.join(demo_dir, "setup_demo.py")
         subprocess.run(
             [sys.executable, setup_script, "--clean"],
-            check=True, cwd=DEMO_DIR,
+            check=True, cwd=demo_dir,
         )
 
         server = FlaskTestServer(
             port=find_free_port(),
-            config_file=CONFIG_FILE,
+            config_file=os.path.join(demo_dir, "config.yaml"),
         )
         if not server.start():
             pytest.fail("Failed to start Flask test server for demo config")
@@ -59,10 +49,6 @@ class TestAdjudicationDemo:
         yield server
         server.stop()
 
-        # Clean up decisions written during test
-        if os.path.exists(adj_output):
-            shutil.rmtree(adj_output)
-
     # -- helpers --
 
     def _login(self, session, username):
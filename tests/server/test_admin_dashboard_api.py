@@ -24,18 +24,17 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from tests.helpers.flask_test_setup import FlaskTestServer
+from tests.helpers.test_utils import copy_example_dir
 
 
 class TestAdminDashboardAPI:
     """Test all admin dashboard API endpoints."""
 
     @pytest.fixture(scope="class", autouse=True)
-    def flask_server(self, request):
+    def flask_server(self, request, tmp_path_factory):
         """Start the MACE demo server for testing."""
-        demo_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-            "examples", "advanced", "mace-demo"
-        )
+        demo_dir = copy_example_dir("advanced/mace-demo",
+                                    tmp_path_factory.mktemp("admin_dashboard_api"))
         config_path = os.path.join(demo_dir, "config.yaml")
 
         # Generate synthetic annotation data (gitignored, must be regenerated)
@@ -429,12 +428,11 @@ class TestAdminAPIAuth:
     """Test admin API authentication behavior."""
 
     @pytest.fixture(scope="class", autouse=True)
-    def flask_server(self, request):
+    def flask_server(self, request, tmp_path_factory):
         """Start server for auth testing."""
-        config_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-            "examples", "advanced", "mace-demo", "config.yaml"
-        )
+        demo_dir = copy_example_dir("advanced/mace-demo",
+                                    tmp_path_factory.mktemp("admin_api_auth"))
+        config_path = os.path.join(demo_dir, "config.yaml")
         server = FlaskTestServer(port=9021, config_file=config_path)
         if not server.start():
             pytest.fail("Failed to start server")
@@ -500,3 +500,84 @@ class TestBehavioralDataIntegration:
         if response.status_code == 404:
             pytest.skip("Behavioral analytics endpoint not available in this server version")
         assert response.status_code == 200
+
+
+class TestBehavioralEventStore:
+    """With ``behavioral_event_store`` enabled the streams go to SQLite, so the
+    saved user state stays the same size however long the session runs."""
+
+    @pytest.fixture(scope="class", autouse=True)
+    def flask_server(self, request):
+        from tests.helpers.flask_test_setup import FlaskTestServer
+        from tests.helpers.test_utils import create_test_directory, create_test_config, create_test_data_file
+
+        test_dir = create_test_directory("behavioral_event_store_test")
+        data_file = create_test_data_file(
+            test_dir, [{"id": "store_item_01", "text": "Event store test item"}],
+            "store_test_data.jsonl")
+        config_file = create_test_config(
+            test_dir,
+            annotation_schemes=[{
+                "name": "sentiment",
+                "annotation_type": "radio",
+                "labels": ["positive", "negative"],
+                "description": "Classify the sentiment of the text."
+            }],
+            data_files=[data_file],
+            annotation_task_name="Behavioral Event Store Test",
+            admin_api_key="test_admin_key",
+            behavioral_event_store={"enabled": True, "retention_days": 30},
+        )
+
+        server = FlaskTestServer(config=config_file)
+        if not server.start():
+            pytest.fail("Failed to start Flask test server")
+        request.cls.test_dir = test_dir
+        yield server
+        server.stop()
+
+    def _user_state_size(self, username):
+        import os
+        return os.path.getsize(
+            os.path.join(self.test_dir, "output", username, "user_state.json"))
+
+    def test_events_stay_out_of_user_state(self, flask_server):
+        session = requests.Session()
+        user_data = {"email": "store_user", "pass": "test_password"}
+        session.post(f"{flask_server.base_url}/register", data=user_data, timeout=5)
+        session.post(f"{flask_server.base_url}/auth", data=user_data, timeout=5)
+        annotation = {
+            "instance_id": "store_item_01",
+            "type": "label",
+            "schema": "sentiment",
+            "state": [{"name": "sentiment", "value": "positive"}]
+        }
+
+        sizes = []
+        for batch in range(3):
+            events = [{"event_type": "click", "target": f"label:{batch}:{i}",
+                       "client_timestamp": i} for i in range(200)]
+            r = session.post(f"{flask_server.base_url}/api/track_interactions",
+                             json={"instance_id": "store_item_01", "events": events},
+                             timeout=5)
+            assert r.json()["events_recorded"] == 200
+            session.post(f"{flask_server.base_url}/api/track_annotation_change",
+                         json={"instance_id": "store_item_01", "schema_name": "sentiment",
+                               "label_name": "positive", "action": "select"},
+                         timeout=5)
+            session.post(f"{flask_server.base_url}/updateinstance", json=annotation, timeout=5)
+            sizes.append(self._user_state_size("store_user"))
+
+        assert len(set(sizes)) == 1, sizes
+
+        # ... but every reader still sees them.
+        r = session.get(f"{flask_server.base_url}/api/behavioral_data/store_item_01", timeout=5)
+        assert r.status_code == 200
+        assert len(r.json()["interactions"]) == 600
+        assert len(r.json()["annotation_changes"]) == 3
+
+        r = requests.get(f"{flask_server.base_url}/admin/api/behavioral_analytics",
+                         headers={'X-API-Key': 'test_admin_key'}, timeout=5)
+        assert r.status_code == 200
+        assert r.json()["aggregate_stats"]["total_interactions"] == 600
+        assert r.json()["change_sources"] == {"user": 3}
@@ -0,0 +1,59 @@
+"""
+Server integration test for request instrumentation: with
+``instrumentation.enabled`` the live server times its own routes and hot
+paths, and exposes them to admins only.
+"""
+
+import pytest
+import requests
+
+from tests.helpers.flask_test_setup import FlaskTestServer
+from tests.helpers.test_utils import TestConfigManager
+
+
+@pytest.fixture(scope="class", autouse=True)
+def flask_server(request):
+    annotation_schemes = [{
+        "annotation_type": "radio", "name": "ok",
+        "description": "ok?", "labels": ["yes", "no"],
+    }]
+    extra = {"instrumentation": {"enabled": True}}
+    with TestConfigManager(
+        "instrumentation_api", annotation_schemes,
+        additional_config=extra, admin_api_key="test-admin-api-key",
+    ) as test_config:
+        server = FlaskTestServer(port=9089, config_file=test_config.config_path)
+        if not server.start():
+            pytest.fail("Failed to start server")
+        request.cls.server = server
+        yield server
+        server.stop()
+        # The test server runs in-process; don't leave later tests timed.
+        from potato.instrumentation import clear_metrics_registry
+        clear_metrics_registry()
+
+
+class TestInstrumentationApi:
+    def test_routes_and_spans_are_timed(self):
+        base = self.server.base_url
+        session = requests.Session()
+        session.post(f"{base}/register", data={"email": "timer", "pass": "pw"})
+        session.post(f"{base}/auth", data={"email": "timer", "pass": "pw"})
+        session.get(f"{base}/annotate")
+
+        r = requests.get(f"{base}/admin/metrics",
+                         headers={"X-API-Key": self.server.admin_api_key})
+        assert r.status_code == 200, r.text
+        data = r.json()
+        routes = {row["route"] for row in data["routes"]}
+        assert "/annotate" in routes
+        spans = {row["span"] for row in data["spans"]}
+        assert "assign" in spans
+
+        text = requests.get(f"{base}/admin/metrics/prometheus",
+                            headers={"X-API-Key": self.server.admin_api_key}).text
+        assert 'route="/annotate"' in text
+
+    def test_requires_admin(self):
+        r = requests.get(f"{self.server.base_url}/admin/metrics")
+        assert r.status_code == 403
@@ -29,19 +29,10 @@ import subprocess
 import sys
 import pytest
 import requests
-import shutil
 
 from tests.helpers.flask_test_setup import FlaskTestServer
 from tests.helpers.port_manager import find_free_port
-
-
-REPO_ROOT = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "..", "..")
-)
-DEMO_DIR = os.path.join(
-    REPO_ROOT, "examples", "advanced", "mace-demo"
-)
-CONFIG_FILE = os.path.join(DEMO_DIR, "config.yaml")
+from tests.helpers.test_utils import copy_example_dir
 
 # Admin API key from the demo config
 ADMIN_KEY = "demo-mace-key"
@@ -65,23 +56,23 @@ class TestMACEDemo:
     """Integration tests that start the server with the real MACE demo config."""
 
     @pytest.fixture(scope="class", autouse=True)
-    def flask_server(self, request):
+    def flask_server(self, request, tmp_path_factory):
         """Start the server using the real mace-demo config."""
-        # Clean any cached MACE results
-        mace_output = os.path.join(DEMO_DIR, "annotation_output", "mace")
-        if os.path.exists(mace_output):
-            shutil.rmtree(mace_output)
+        # Run a fresh copy of the demo so no cached MACE results carry over
+        # and its output stays out of the repo
+        demo_dir = copy_example_dir("advanced/mace-demo",
+                                    tmp_path_factory.mktemp("mace_demo"))
 
         # Generate synthetic annotation data (gitignored, must be regenerated)
-        setup_script = os.path.join(DEMO_DIR, "setup_demo.py")
+        setup_script = os.path.join(demo_dir, "setup_demo.py")
         subprocess.run(
             [sys.executable, setup_script, "--clean"],
-            check=True, cwd=DEMO_DIR,
+            check=True, cwd=demo_dir,
         )
 
         server = FlaskTestServer(
             port=find_free_port(),
-            config_file=CONFIG_FILE,
+            config_file=os.path.join(demo_dir, "config.yaml"),
         )
         if not server.start():
             pytest.fail("Failed to start Flask test server for MACE demo config")
@@ -91,10 +82,6 @@ class TestMACEDemo:
         yield server
         server.stop()
 
-        # Clean up MACE results written during test
-        if os.path.exists(mace_output):
-            shutil.rmtree(mace_output)
-
     # -- helpers --
 
     def _admin_get(self, path, params=None):
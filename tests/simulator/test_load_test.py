@@ -0,0 +1,126 @@
+"""
+Tests for the simulator's load-test mode: recording, scenarios, baseline
+comparison, and one small run against an in-process server.
+"""
+
+import json
+
+import pytest
+
+from potato.simulator import SCENARIOS, LoadTestConfig, compare_reports, run_load_test
+from potato.simulator.load_test import (
+    LatencyRecorder,
+    LoadTestRunner,
+    build_configs,
+    endpoint_name,
+    main,
+    parse_args,
+    percentile,
+)
+
+
+class TestRecording:
+    """Tests for endpoint naming and latency summaries."""
+
+    def test_endpoint_names_drop_host_query_and_ids(self):
+        assert endpoint_name("post", "http://h:1/updateinstance?x=1") == "POST /updateinstance"
+        assert endpoint_name("GET", "http://h/api/spans/item_7") == "GET /api/spans/<instance_id>"
+
+    def test_nearest_rank_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([3.0], 95) == 3.0
+        assert percentile([], 50) is None
+
+    def test_summary_separates_server_and_client_errors(self):
+        recorder = LatencyRecorder()
+        recorder.record("GET /a", 0.010, 200)
+        recorder.record("GET /a", 0.020, 404)
+        recorder.record("GET /a", 0.030, 500)
+        recorder.record("GET /a", 0.040, None)
+
+        (row,) = recorder.summary(duration_s=2.0)
+        assert row["count"] == 4
+        assert row["errors"] == 2
+        assert row["client_errors"] == 1
+        assert row["error_rate"] == 0.5
+        assert row["throughput_rps"] == 2.0
+        assert row["p50_ms"] == 20.0
+        assert row["max_ms"] == 40.0
+        assert row["status"] == {"200": 1, "404": 1, "500": 1, "exception": 1}
+
+
+class TestScenarios:
+    """Tests for canned scenarios and CLI overrides."""
+
+    def test_scenarios_cover_user_and_corpus_grid(self):
+        assert {(s.users, s.corpus_size) for s in SCENARIOS.values()} == {
+            (u, c) for u in (10, 100, 1000) for c in (100, 10000)
+        }
+        assert all(s.concurrency <= s.users for s in SCENARIOS.values())
+
+    def test_cli_overrides_do_not_mutate_scenarios(self):
+        configs = build_configs(parse_args(["--scenario", "1000-large", "--users", "3"]))
+        assert configs[0].users == 3
+        assert SCENARIOS["1000-large"].users == 1000
+        assert len(build_configs(parse_args(["--scenario", "all"]))) == len(SCENARIOS)
+
+    def test_poisson_arrivals_are_seeded_and_rate_scaled(self):
+        config = LoadTestConfig(users=200, arrival_rate=50.0)
+        offsets = LoadTestRunner(config, "http://unused").arrival_offsets()
+        assert offsets == LoadTestRunner(config, "http://unused").arrival_offsets()
+        assert offsets == sorted(offsets) and offsets[0] == 0.0
+        # 200 arrivals at 50/s take about four seconds.
+        assert 2.0 < offsets[-1] < 6.0
+        assert LoadTestRunner(LoadTestConfig(users=3), "x").arrival_offsets() == [0.0] * 3
+
+    def test_unknown_scenario_is_rejected(self, capsys):
+        assert main(["--scenario", "7-tiny"]) == 1
+        assert "Unknown scenario" in capsys.readouterr().out
+
+
+class TestCompareReports:
+    """Tests for baseline regression detection."""
+
+    @staticmethod
+    def _report(p95, error_rate=0.0):
+        return {"endpoints": [{"endpoint": "POST /updateinstance",
+                               "p95_ms": p95, "error_rate": error_rate}]}
+
+    def test_flags_tail_latency_and_error_regressions(self):
+        regressions = compare_reports(self._report(100.0), self._report(200.0, 0.1))
+        assert [r["metric"] for r in regressions] == ["p95_ms", "error_rate"]
+
+    def test_ignores_jitter_and_improvements(self):
+        assert compare_reports(self._report(100.0), self._report(120.0)) == []
+        # +100% but only 2ms: fast endpoints are noisy.
+        assert compare_reports(self._report(2.0), self._report(4.0)) == []
+        assert compare_reports(self._report(100.0), self._report(50.0)) == []
+
+
+class TestInProcessRun:
+    """A small end-to-end run against a generated in-process project."""
+
+    def test_report_covers_session_endpoints_and_server_spans(self, tmp_path):
+        config = LoadTestConfig(name="tiny", users=3, concurrency=3,
+                                annotations_per_user=2, corpus_size=10)
+        report = run_load_test(config)
+
+        assert report["server_url"] == "in-process"
+        assert report["errors"] == 0
+        assert report["users"]["with_errors"] == 0
+        assert report["annotations"] == 6
+
+        endpoints = {row["endpoint"]: row for row in report["endpoints"]}
+        assert endpoints["POST /updateinstance"]["count"] == 6
+        assert endpoints["POST /register"]["count"] == 3
+        assert endpoints["POST /updateinstance"]["p99_ms"] > 0
+
+        spans = {row["span"] for row in report["server_spans"]}
+        assert {"assign", "save", "render"} <= spans
+
+        # Machine-readable: the whole report round-trips through JSON.
+        path = tmp_path / "report.json"
+        path.write_text(json.dumps(report))
+        assert json.loads(path.read_text())["scenario"] == "tiny"
@@ -768,7 +768,8 @@ class TestComplexAnnotationTypes:
 
 class TestDecisionOutputFormat:
     """Tests that adjudication decisions save correctly and resolved labels
-    can be extracted from the on-disk decisions.json file."""
+    can be extracted from the on-disk decisions.json file once the decision
+    log is compacted."""
 
     def _make_multiselect_config(self):
         """Config with both radio and multiselect schemas."""
@@ -810,6 +811,7 @@ class TestDecisionOutputFormat:
         )
         mgr.submit_decision(decision)
 
+        mgr.compact_decisions()
         decisions_file = os.path.join(
             cfg["output_annotation_dir"], "adjudication", "decisions.json"
         )
@@ -841,6 +843,7 @@ class TestDecisionOutputFormat:
             time_spent_ms=3000,
         ))
 
+        mgr.compact_decisions()
         decisions_file = os.path.join(
             cfg["output_annotation_dir"], "adjudication", "decisions.json"
         )
@@ -872,6 +875,7 @@ class TestDecisionOutputFormat:
             time_spent_ms=4000,
         ))
 
+        mgr.compact_decisions()
         decisions_file = os.path.join(
             cfg["output_annotation_dir"], "adjudication", "decisions.json"
         )
@@ -917,6 +921,7 @@ class TestDecisionOutputFormat:
         ))
 
         # Read file back and extract resolved labels
+        mgr.compact_decisions()
         decisions_file = os.path.join(
             cfg["output_annotation_dir"], "adjudication", "decisions.json"
         )
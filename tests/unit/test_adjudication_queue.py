@@ -0,0 +1,259 @@
+"""
+Tests for the incrementally maintained adjudication queue and decision log.
+
+The queue is built by one full scan and then kept current by
+``try_enqueue_item``, which the item state manager calls on every saved
+annotation. ``AdjudicationQueue`` keeps a priority index so the next item is
+found without sorting, and decisions are appended to a log that is compacted
+into ``decisions.json``.
+"""
+
+import json
+import os
+import random
+
+import pytest
+
+import potato.adjudication as adjudication
+from potato.adjudication import (
+    AdjudicationDecision,
+    AdjudicationItem,
+    AdjudicationManager,
+    AdjudicationQueue,
+    clear_adjudication_manager,
+    init_adjudication_manager,
+)
+from potato.item_state_management import Label
+from potato.phase import UserPhase
+
+
+def _item(instance_id, agreement, status="pending"):
+    return AdjudicationItem(
+        instance_id=instance_id, annotations={}, span_annotations={},
+        behavioral_data={}, agreement_scores={}, overall_agreement=agreement,
+        num_annotators=2, status=status,
+    )
+
+
+def _decision(instance_id, label="positive"):
+    return AdjudicationDecision(
+        instance_id=instance_id, adjudicator_id="expert", timestamp="2026-01-01T00:00:00",
+        label_decisions={"sentiment": label}, span_decisions=[], source={},
+        confidence="high", notes="", error_taxonomy=[],
+    )
+
+
+@pytest.fixture
+def adj_config(tmp_path):
+    return {
+        "adjudication": {"enabled": True, "adjudicator_users": ["expert"],
+                         "min_annotations": 2, "agreement_threshold": 0.75},
+        "annotation_schemes": [{"name": "sentiment", "annotation_type": "radio",
+                                "labels": ["positive", "negative"]}],
+        "output_annotation_dir": str(tmp_path),
+    }
+
+
+class TestPriorityIndex:
+    def test_order_matches_full_sort(self):
+        rng = random.Random(7)
+        statuses = ["pending", "in_progress", "completed", "skipped"]
+        queue = AdjudicationQueue()
+        plain = {}
+        for k in range(300):
+            item = _item(f"i{k}", rng.choice([0.0, 0.25, 0.5, rng.random()]),
+                         rng.choice(statuses))
+            queue[item.instance_id] = item
+            plain[item.instance_id] = item
+        for k in rng.sample(range(300), 60):
+            queue.set_status(f"i{k}", rng.choice(statuses))
+        del queue["i3"]
+        plain.pop("i3")
+
+        expected = sorted(plain.values(), key=lambda x: (
+            0 if x.status == "pending" else 1 if x.status == "in_progress" else 2,
+            x.overall_agreement,
+        ))
+        assert queue.ordered() == expected
+        assert queue.ordered("skipped") == [i for i in expected if i.status == "skipped"]
+        assert queue.first("pending") is expected[0]
+
+    def test_direct_status_change_is_noticed(self):
+        queue = AdjudicationQueue({"a": _item("a", 0.1), "b": _item("b", 0.2)})
+        queue["a"].status = "completed"
+        assert queue.first("pending").instance_id == "b"
+        assert [i.instance_id for i in queue.ordered("completed")] == ["a"]
+
+    def test_next_item_follows_skips_and_decisions(self, adj_config):
+        mgr = AdjudicationManager(adj_config)
+        mgr._queue_built = True
+        for iid, agreement in (("low", 0.1), ("mid", 0.3), ("high", 0.6)):
+            mgr.queue[iid] = _item(iid, agreement)
+
+        assert mgr.get_next_item("expert").instance_id == "low"
+        mgr.skip_item("low", "expert")
+        assert mgr.get_next_item("expert").instance_id == "mid"
+        mgr.submit_decision(_decision("mid"))
+        assert mgr.get_next_item("expert").instance_id == "high"
+        assert [i.instance_id for i in mgr.get_queue()] == ["high", "low", "mid"]
+        assert mgr.get_stats()["completed"] == 1
+
+
+class TestDecisionLog:
+    def _dir(self, adj_config):
+        return os.path.join(adj_config["output_annotation_dir"], "adjudication")
+
+    def test_submit_appends_and_reload_replays(self, adj_config):
+        mgr = AdjudicationManager(adj_config)
+        mgr.submit_decision(_decision("a"))
+        mgr.submit_decision(_decision("b"))
+        mgr.submit_decision(_decision("a", label="negative"))
+
+        with open(os.path.join(self._dir(adj_config), adjudication.DECISION_LOG_FILE)) as f:
+            assert len(f.readlines()) == 3
+        assert not os.path.exists(os.path.join(self._dir(adj_config), "decisions.json"))
+
+        reloaded = AdjudicationManager(adj_config)
+        assert set(reloaded.decisions) == {"a", "b"}
+        assert reloaded.get_decision("a").label_decisions == {"sentiment": "negative"}
+
+    def test_compaction_folds_log_into_decisions_json(self, adj_config, monkeypatch):
+        monkeypatch.setattr(adjudication, "DECISION_LOG_COMPACT_EVERY", 3)
+        mgr = AdjudicationManager(adj_config)
+        for k in range(4):
+            mgr.submit_decision(_decision(f"i{k}"))
+
+        with open(os.path.join(self._dir(adj_config), "decisions.json")) as f:
+            compacted = json.load(f)
+        assert [d["instance_id"] for d in compacted["decisions"]] == ["i0", "i1", "i2"]
+        with open(os.path.join(self._dir(adj_config), adjudication.DECISION_LOG_FILE)) as f:
+            assert [json.loads(line)["instance_id"] for line in f] == ["i3"]
+
+        assert set(AdjudicationManager(adj_config).decisions) == {"i0", "i1", "i2", "i3"}
+
+    def test_torn_last_line_is_skipped(self, adj_config):
+        mgr = AdjudicationManager(adj_config)
+        mgr.submit_decision(_decision("a"))
+        with open(os.path.join(self._dir(adj_config), adjudication.DECISION_LOG_FILE), "a") as f:
+            f.write('{"instance_id": "b", "adjud')
+        assert set(AdjudicationManager(adj_config).decisions) == {"a"}
+
+    def test_append_after_torn_line_survives_reload(self, adj_config):
+        mgr = AdjudicationManager(adj_config)
+        mgr.submit_decision(_decision("a"))
+        with open(os.path.join(self._dir(adj_config), adjudication.DECISION_LOG_FILE), "a") as f:
+            f.write('{"instance_id": "b", "adjud')
+
+        restarted = AdjudicationManager(adj_config)
+        restarted.submit_decision(_decision("c"))
+        assert set(AdjudicationManager(adj_config).decisions) == {"a", "c"}
+
+    def test_exit_compaction_is_registered_once(self, adj_config, monkeypatch):
+        registered = []
+        monkeypatch.setattr(adjudication.atexit, "register", registered.append)
+        monkeypatch.setattr(adjudication, "_EXIT_HOOK_REGISTERED", False)
+        clear_adjudication_manager()
+        try:
+            init_adjudication_manager(adj_config).submit_decision(_decision("a"))
+            clear_adjudication_manager()
+            init_adjudication_manager(adj_config)
+            assert len(registered) == 1
+
+            registered[0]()
+            with open(os.path.join(self._dir(adj_config), "decisions.json")) as f:
+                assert [d["instance_id"] for d in json.load(f)["decisions"]] == ["a"]
+        finally:
+            clear_adjudication_manager()
+
+    def test_exit_compaction_writes_where_the_log_was_loaded(self, adj_config, tmp_path,
+                                                            monkeypatch):
+        monkeypatch.setattr(adjudication.atexit, "register", lambda hook: None)
+        clear_adjudication_manager()
+        try:
+            init_adjudication_manager(adj_config).submit_decision(_decision("a"))
+            # Another project repoints the shared config; nothing to fold there.
+            adj_config["output_annotation_dir"] = "annotation_output"
+            monkeypatch.chdir(tmp_path)
+            adjudication._compact_decisions_at_exit()
+            assert os.path.exists(os.path.join(str(tmp_path), "adjudication", "decisions.json"))
+            assert not os.path.exists(os.path.join(str(tmp_path), "annotation_output"))
+        finally:
+            clear_adjudication_manager()
+
+    def test_exit_compaction_skips_an_empty_log(self, adj_config, monkeypatch):
+        monkeypatch.setattr(adjudication.atexit, "register", lambda hook: None)
+        clear_adjudication_manager()
+        try:
+            init_adjudication_manager(adj_config)
+            adjudication._compact_decisions_at_exit()
+            assert not os.path.exists(os.path.join(self._dir(adj_config), "decisions.json"))
+        finally:
+            clear_adjudication_manager()
+
+
+@pytest.fixture
+def project(adj_config, tmp_path):
+    """Real item/user state managers with adjudication initialized on top."""
+    from potato.server_utils.config_module import config
+    import potato.item_state_management as ism_mod
+    import potato.user_state_management as usm_mod
+
+    saved_config = dict(config)
+    saved_ism = ism_mod.ITEM_STATE_MANAGER
+    saved_usm = usm_mod.USER_STATE_MANAGER
+
+    config.update(adj_config)
+    config.update({"task_dir": str(tmp_path), "annotation_task_name": "adjudication-queue",
+                   "item_properties": {"id_key": "id", "text_key": "text"}})
+    ism_mod.ITEM_STATE_MANAGER = None
+    usm_mod.USER_STATE_MANAGER = None
+    clear_adjudication_manager()
+
+    ism = ism_mod.init_item_state_manager(config)
+    ism.add_items({str(i): {"id": str(i), "text": f"item {i}"} for i in range(3)})
+    usm = usm_mod.init_user_state_manager(config)
+    mgr = init_adjudication_manager(config)
+
+    def annotate(user_id, instance_id, label):
+        state = usm.get_or_create_user(user_id)
+        state.current_phase_and_page = (UserPhase.ANNOTATION, 0)
+        state.add_label_annotation(instance_id, Label(schema="sentiment", name=label), True)
+        ism.register_annotator(instance_id, user_id)
+
+    yield mgr, annotate
+
+    clear_adjudication_manager()
+    ism_mod.ITEM_STATE_MANAGER = saved_ism
+    usm_mod.USER_STATE_MANAGER = saved_usm
+    config.clear()
+    config.update(saved_config)
+
+
+class TestEventDrivenQueue:
+    def test_saved_annotations_update_a_built_queue(self, project, monkeypatch):
+        mgr, annotate = project
+        annotate("u1", "0", "positive")
+        annotate("u2", "0", "negative")
+        assert [i.instance_id for i in mgr.get_queue()] == ["0"]
+
+        # After the first build, saves only re-score the touched item.
+        monkeypatch.setattr(mgr, "build_queue", lambda: pytest.fail("rescanned"))
+        annotate("u1", "1", "positive")
+        annotate("u2", "1", "positive")  # agreement, stays out
+        annotate("u1", "2", "negative")
+        annotate("u2", "2", "positive")
+        assert [i.instance_id for i in mgr.get_queue()] == ["0", "2"]
+
+        mgr.skip_item("0", "expert")
+        annotate("u3", "0", "positive")
+        assert mgr.get_item("0").num_annotators == 3
+        assert mgr.get_item("0").status == "skipped"
+
+    def test_decided_items_are_not_requeued(self, project):
+        mgr, annotate = project
+        annotate("u1", "0", "positive")
+        annotate("u2", "0", "negative")
+        mgr.submit_decision(_decision("0"))
+        annotate("u3", "0", "negative")
+        assert mgr.get_item("0").status == "completed"
+        assert mgr.get_next_item("expert") is None
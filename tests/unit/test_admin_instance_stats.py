@@ -0,0 +1,189 @@
+"""
+The Instances tab reads from a materialized table rather than rebuilding
+every row per request.
+
+InstanceStatsTable keeps one row per item and sorted indexes per sort key, and
+updates rows as annotators save. These tests drive a project through saves,
+reclaims and new users and, after each step, compare every sort/filter
+combination against the full rebuild-and-sort the endpoint used to do. They
+also check that a save re-reads only the instance it carries and that a page
+read after it re-reads nothing.
+"""
+
+import random
+
+import pytest
+
+from potato.item_state_management import Label
+from potato.phase import UserPhase
+from potato.server_utils import instance_stats
+
+SORTS = ("annotation_count", "completion_percentage", "disagreement", "id",
+         "average_time", "not_a_key")
+
+
+@pytest.fixture
+def project(monkeypatch, tmp_path):
+    from potato.server_utils.config_module import config
+    import potato.item_state_management as ism_mod
+    import potato.user_state_management as usm_mod
+
+    saved_config = dict(config)
+    saved_ism = ism_mod.ITEM_STATE_MANAGER
+    saved_usm = usm_mod.USER_STATE_MANAGER
+
+    config.update({
+        "task_dir": str(tmp_path),
+        "output_annotation_dir": str(tmp_path),
+        "max_annotations_per_item": 2,
+        "item_properties": {"id_key": "id", "text_key": "text"},
+        "annotation_task_name": "instance stats",
+        "annotation_schemes": [],
+    })
+    ism_mod.ITEM_STATE_MANAGER = None
+    usm_mod.USER_STATE_MANAGER = None
+    ism = ism_mod.init_item_state_manager(config)
+    ism.add_items({f"i{n:02d}": {"id": f"i{n:02d}", "text": f"item {n}"} for n in range(30)})
+    usm = usm_mod.init_user_state_manager(config)
+
+    from potato.admin import AdminDashboard
+    dashboard = AdminDashboard()
+    monkeypatch.setattr(dashboard, "check_admin_access", lambda *a, **k: True)
+
+    yield dashboard, ism, usm
+
+    ism_mod.ITEM_STATE_MANAGER = saved_ism
+    usm_mod.USER_STATE_MANAGER = saved_usm
+    config.clear()
+    config.update(saved_config)
+
+
+def _annotate(ism, usm, user_id, instance_id, label, seconds=None):
+    state = usm.get_or_create_user(user_id)
+    state.current_phase_and_page = (UserPhase.ANNOTATION, "annotation")
+    state.add_label_annotation(instance_id, Label(schema="topic", name=label), True)
+    if seconds is not None:
+        state.instance_id_to_behavioral_data[instance_id] = {
+            "total_time_ms": seconds * 1000, "ai_usage": [1] * (seconds % 3)}
+    ism.register_annotator(instance_id, user_id)
+    usm.save_user_state(state, [instance_id])
+
+
+def _reference(dashboard, ism, sort_by, sort_order, filter_completion):
+    """The endpoint's old algorithm: build every row, filter, sort."""
+    aggregates = dashboard._build_instance_aggregates()
+    rows = []
+    for item in ism.items():
+        iid = item.get_id()
+        count = len(ism.get_annotators_for_item(iid))
+        completion = min(100, count / 2 * 100)
+        stats = aggregates.get(iid)
+        label, dis, avg = None, 0.0, None
+        if stats:
+            label, dis = dashboard._label_stats_from_names(stats["labels"])
+            avg = stats["total_seconds"] / stats["timed_count"] if stats["timed_count"] else None
+        rows.append((iid, count, completion, label, dis, avg))
+    if filter_completion == "completed":
+        rows = [r for r in rows if r[2] >= 100]
+    elif filter_completion == "incomplete":
+        rows = [r for r in rows if r[2] < 100]
+    reverse = sort_order == "desc"
+    key = {"annotation_count": lambda r: r[1], "completion_percentage": lambda r: r[2],
+           "disagreement": lambda r: r[4], "id": lambda r: r[0],
+           "average_time": lambda r: r[5] or 0}.get(sort_by)
+    if key:
+        rows.sort(key=key, reverse=reverse)
+    return rows
+
+
+def _assert_matches_reference(dashboard, ism):
+    for sort_by in SORTS:
+        for sort_order in ("asc", "desc"):
+            for filter_completion in (None, "completed", "incomplete"):
+                expected = _reference(dashboard, ism, sort_by, sort_order, filter_completion)
+                data = dashboard.get_instances_data(page=1, page_size=100, sort_by=sort_by,
+                                                    sort_order=sort_order,
+                                                    filter_completion=filter_completion)
+                got = [(r["id"], r["annotation_count"], r["most_frequent_label"],
+                        r["label_disagreement"]) for r in data["instances"]]
+                want = [(r[0], r[1], r[3], round(r[4], 2)) for r in expected]
+                assert got == want, (sort_by, sort_order, filter_completion)
+                assert data["pagination"]["total_instances"] == len(expected)
+                if expected:
+                    assert data["summary"]["average_disagreement"] == round(
+                        sum(r[4] for r in expected) / len(expected), 2)
+
+
+class TestMatchesFullRebuild:
+    def test_after_each_change(self, project):
+        dashboard, ism, usm = project
+        rng = random.Random(7)
+        _assert_matches_reference(dashboard, ism)
+
+        for step in range(40):
+            user = f"ann_{rng.randrange(5)}"
+            item = f"i{rng.randrange(30):02d}"
+            _annotate(ism, usm, user, item, rng.choice("abc"), seconds=rng.choice([None, 1, 2, 5]))
+            if step % 8 == 7:
+                _assert_matches_reference(dashboard, ism)
+
+        state = usm.get_user_state("ann_0")
+        victim = next(iter(ism.get_annotators_for_item("i00") or {"ann_0"}))
+        ism._clear_completed_assignment(usm.get_user_state(victim), "i00")
+        usm.save_user_state(state)
+        _assert_matches_reference(dashboard, ism)
+
+    def test_pages_cover_the_sorted_list(self, project):
+        dashboard, ism, usm = project
+        for n in range(12):
+            _annotate(ism, usm, f"ann_{n % 3}", f"i{n:02d}", "ab"[n % 2])
+        ids = []
+        for page in range(1, 5):
+            data = dashboard.get_instances_data(page=page, page_size=8,
+                                                sort_by="annotation_count", sort_order="desc")
+            ids += [r["id"] for r in data["instances"]]
+        assert ids == [r[0] for r in _reference(dashboard, ism, "annotation_count", "desc", None)]
+        assert data["pagination"]["has_next"] is False
+
+
+class TestIncrementalUpkeep:
+    def test_a_save_rereads_only_the_saved_instance(self, project, monkeypatch):
+        dashboard, ism, usm = project
+        for n in range(5):
+            _annotate(ism, usm, f"ann_{n}", f"i{n:02d}", "a")
+        dashboard.get_instances_data()
+
+        table = dashboard._instance_stats
+        whole, single = [], []
+        monkeypatch.setattr(table, "_contributions",
+                            lambda state: whole.append(state.get_user_id()) or {})
+        original = table._instance_contribution
+        monkeypatch.setattr(table, "_instance_contribution",
+                            lambda state, iid: (single.append((state.get_user_id(), iid)),
+                                                original(state, iid))[1])
+
+        _annotate(ism, usm, "ann_2", "i20", "b")
+        assert single == [("ann_2", "i20")]
+
+        row = next(r for r in dashboard.get_instances_data(sort_by="id", page_size=30)["instances"]
+                   if r["id"] == "i20")
+        assert row["most_frequent_label"] == "b"
+        assert whole == []
+        assert single == [("ann_2", "i20")]
+
+    def test_writes_outside_the_managers_are_caught_by_the_rebuild(self, project, monkeypatch):
+        dashboard, ism, usm = project
+        _annotate(ism, usm, "ann_0", "i00", "a")
+        dashboard.get_instances_data()
+
+        usm.get_user_state("ann_0").add_label_annotation("i00", Label(schema="topic", name="b"), True)
+        monkeypatch.setattr(instance_stats, "FULL_REBUILD_INTERVAL_SECONDS", 0.0)
+        _assert_matches_reference(dashboard, ism)
+
+
+class TestLabelNames:
+    def test_schema_nested_labels_flatten_to_names(self):
+        from potato.admin import AdminDashboard
+        out = []
+        AdminDashboard._collect_label_names({"topic": {"a": "true"}, "tone": {"b": "true"}}, out)
+        assert out == ["a", "b"]
@@ -108,3 +108,47 @@ def test_manager_status_shape(manager):
     assert st["enabled"] is True
     assert st["rules"][0]["name"] == "queue-errors"
     assert "counters" in st
+
+
+# ---- rule indexing ----
+
+def test_manager_only_evaluates_rules_for_fields_the_item_has(monkeypatch):
+    cfg = {"automation": {"enabled": True, "rules": [
+        {"name": "errs", "when": {"field": "status", "equals": "error"}},
+        {"name": "low", "when": [{"field": "metadata.score", "lt": 0.5}]},
+        {"name": "no-label", "when": {"field": "label", "exists": False}},
+        {"name": "all"},
+    ]}}
+    mgr = AutomationManager(cfg)
+    try:
+        evaluated = []
+        for rule in mgr.rules:
+            monkeypatch.setattr(rule, "fires_for",
+                                lambda iid, data, r=rule: evaluated.append(r.name) or
+                                AutomationRule.fires_for(r, iid, data))
+        assert mgr.process_item("a", {"status": "error"}) == 3
+        assert evaluated == ["errs", "no-label", "all"]
+
+        evaluated.clear()
+        assert mgr.process_item("b", {"metadata": {"score": 0.1}, "label": "x"}) == 2
+        assert evaluated == ["low", "no-label", "all"]
+    finally:
+        mgr.shutdown()
+
+
+def test_manager_reindexes_when_rules_change():
+    mgr = AutomationManager({"automation": {"enabled": True, "rules": []}})
+    try:
+        assert mgr.process_item("a", {"status": "error"}) == 0
+        mgr.rules.append(AutomationRule.from_dict(
+            {"name": "errs", "when": {"field": "status", "equals": "error"}}))
+        assert mgr.process_item("a", {"status": "error"}) == 1
+    finally:
+        mgr.shutdown()
+
+
+def test_rule_recompiles_when_when_is_reassigned():
+    r = AutomationRule.from_dict({"name": "r", "when": {"field": "a", "equals": 1}})
+    assert r.matches({"a": 1})
+    r.when = {"field": "a", "equals": 2}
+    assert not r.matches({"a": 1}) and r.matches({"a": 2})
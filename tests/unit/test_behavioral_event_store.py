@@ -0,0 +1,213 @@
+"""
+Unit tests for potato.behavioral_event_store.
+
+Covers the round trip back to the ``to_dict()`` shapes the readers expect,
+merging with events already in the user state, the counts the admin dashboard
+reads, the retention policy (including the typing and telemetry streams it
+prunes), and config validation.
+"""
+
+import os
+import time
+
+import pytest
+
+from potato import behavioral_event_store as store
+from potato import typing_store
+from potato.interaction_tracking import AnnotationChange, BehavioralData, InteractionEvent
+from potato.persistence import clear_db_cache, clear_migrations
+from potato.server_utils.config_module import (
+    ConfigValidationError,
+    get_behavioral_event_store_config,
+    validate_behavioral_event_store_config,
+)
+from potato.typing_dynamics import summarize
+
+from tests.unit.test_typing_dynamics import natural_trace
+
+
+@pytest.fixture
+def task_dir(tmp_path):
+    """A fresh project directory with an isolated SQLite database."""
+    clear_db_cache()
+    d = str(tmp_path / "project")
+    os.makedirs(d, exist_ok=True)
+    yield d
+    clear_db_cache()
+
+
+def _click(t, target="label:positive", instance="i1"):
+    return InteractionEvent(event_type="click", timestamp=t, target=target,
+                            instance_id=instance, client_timestamp=t * 1000,
+                            metadata={"x": 3})
+
+
+def _change(t, source="user", label="positive"):
+    return AnnotationChange(timestamp=t, schema_name="sentiment", label_name=label,
+                            action="select", old_value=None, new_value=True,
+                            source=source, phase="annotation", page="i1")
+
+
+def _record(task_dir, events, user="alice", instance="i1"):
+    return store.record_events(task_dir, project="demo", user_id=user,
+                               instance_id=instance, events=events)
+
+
+class TestRoundTrip:
+    def test_events_read_back_in_their_to_dict_shape(self, task_dir):
+        click, change = _click(100.0), _change(101.0)
+        assert _record(task_dir, [change, click]) == 2
+
+        events = store.events_for_instance(task_dir, "demo", "alice", "i1")
+        assert [e.pop("stream") for e in events] == [store.INTERACTION,
+                                                    store.ANNOTATION_CHANGE]
+        assert events == [click.to_dict(), change.to_dict()]
+
+    def test_filters_by_stream_user_and_instance(self, task_dir):
+        _record(task_dir, [_click(1.0), _change(2.0)])
+        _record(task_dir, [_click(3.0)], instance="i2")
+        _record(task_dir, [_click(4.0)], user="bob")
+
+        assert len(store.events_for_instance(
+            task_dir, "demo", "alice", "i1", stream=store.ANNOTATION_CHANGE)) == 1
+        assert len(store.events_for_user(task_dir, "demo", "alice")) == 3
+        assert store.count_events(task_dir, "demo") == 4
+        assert store.count_events(task_dir, "demo", store.INTERACTION) == 3
+
+    def test_survives_a_cleared_migration_registry(self, task_dir):
+        clear_migrations()
+        clear_db_cache()
+        assert _record(task_dir, [_click(1.0)]) == 1
+
+    def test_delete_for_user(self, task_dir):
+        _record(task_dir, [_click(1.0), _click(2.0)])
+        _record(task_dir, [_click(3.0)], user="bob")
+        assert store.delete_for_user(task_dir, "demo", "alice") == 2
+        assert store.count_events(task_dir, "demo") == 1
+
+
+class TestReaders:
+    def test_merge_keeps_legacy_events_and_sorts_by_time(self, task_dir):
+        bd = BehavioralData(instance_id="i1")
+        bd.interactions.append(_click(2.0, target="legacy"))
+        _record(task_dir, [_click(1.0), _click(3.0), _change(4.0)])
+
+        merged = store.merge_stored_events(bd.to_dict(), task_dir, "demo", "alice", "i1")
+        assert [e["timestamp"] for e in merged["interactions"]] == [1.0, 2.0, 3.0]
+        assert len(merged["annotation_changes"]) == 1
+        assert "stream" not in merged["annotation_changes"][0]
+        # The caller's dict is left alone.
+        assert len(bd.to_dict()["interactions"]) == 1
+
+    def test_counts_group_by_type_and_source(self, task_dir):
+        _record(task_dir, [_click(1.0), _click(2.0), _change(3.0),
+                           _change(4.0, source="ai_accept")])
+        rows = {(r["stream"], r["event_type"], r["source"]): r["n"]
+                for r in store.instance_counts(task_dir, "demo")}
+        assert rows == {
+            (store.INTERACTION, "click", None): 2,
+            (store.ANNOTATION_CHANGE, "select", "user"): 1,
+            (store.ANNOTATION_CHANGE, "select", "ai_accept"): 1,
+        }
+
+        (row,) = store.aggregate_by_user(task_dir, "demo")
+        assert (row["user_id"], row["interactions"], row["annotation_changes"]) == (
+            "alice", 2, 2)
+
+
+class TestRetention:
+    def test_age_cutoff_keys_on_recording_time(self, task_dir):
+        _record(task_dir, [_click(1.0)])
+        now = time.time()
+        assert store.apply_retention(task_dir, "demo", retention_days=1, now=now)["events"] == 0
+        assert store.apply_retention(
+            task_dir, "demo", retention_days=1, now=now + 2 * 86400)["events"] == 1
+        assert store.count_events(task_dir, "demo") == 0
+
+    def test_per_user_cap_keeps_the_newest_events(self, task_dir):
+        _record(task_dir, [_click(float(t)) for t in range(10)])
+        _record(task_dir, [_click(1.0)], user="bob")
+
+        removed = store.apply_retention(task_dir, "demo", max_events_per_user=4)
+        assert removed["events"] == 6
+        kept = store.events_for_instance(task_dir, "demo", "alice", "i1")
+        assert [e["timestamp"] for e in kept] == [6.0, 7.0, 8.0, 9.0]
+        assert store.count_events(task_dir, "demo") == 5
+
+    def test_drops_raw_typing_streams_but_keeps_summaries(self, task_dir):
+        events = natural_trace(40)
+        session_id = typing_store.record_session(
+            task_dir, project="demo", user_id="alice", instance_id="i1",
+            schema_name="notes", label_name="body",
+            summary=summarize(events, schema_name="notes", label_name="body"),
+            events=events, started_at=0.0, ended_at=10.0)
+
+        removed = store.apply_retention(task_dir, "demo", retention_days=1)
+        assert removed["typing_streams"] == 1
+        assert typing_store.load_events(task_dir, session_id) == []
+        assert typing_store.get_session(task_dir, session_id)["keystrokes"] > 0
+
+    def test_write_path_applies_retention_once_per_interval(self, task_dir, monkeypatch):
+        calls = []
+        monkeypatch.setattr(store, "apply_retention",
+                            lambda *a, **k: calls.append(k) or {"events": 0})
+        monkeypatch.setattr(store, "_last_retention", {})
+        settings = {"retention_days": 30, "max_events_per_user": None}
+
+        store.maybe_apply_retention(task_dir, "demo", settings)
+        store.maybe_apply_retention(task_dir, "demo", settings)
+        assert len(calls) == 1
+        store.maybe_apply_retention(task_dir, "demo", {"retention_days": None})
+        assert len(calls) == 1
+
+
+class TestConfig:
+    def test_defaults_to_disabled(self):
+        assert get_behavioral_event_store_config({})["enabled"] is False
+        assert store.enabled_store({}) is None
+
+    def test_enabled_store_resolves_project(self):
+        config = {"behavioral_event_store": {"enabled": True},
+                  "task_dir": "/tmp/p", "annotation_task_name": "demo"}
+        assert store.enabled_store(config) == ("/tmp/p", "demo")
+
+    @pytest.mark.parametrize("block", [
+        {"enabled": "yes"},
+        {"retention_days": 0},
+        {"max_events_per_user": 1.5},
+        {"max_events_per_user": True},
+    ])
+    def test_rejects_invalid_values(self, block):
+        with pytest.raises(ConfigValidationError):
+            validate_behavioral_event_store_config({"behavioral_event_store": block})
+
+    def test_accepts_valid_block(self):
+        validate_behavioral_event_store_config({"behavioral_event_store": {
+            "enabled": True, "retention_days": 0.5, "max_events_per_user": 100}})
+
+
+class TestBehavioralDataRoute:
+    def test_store_failure_falls_back_to_in_memory_data(self, monkeypatch):
+        """A locked or damaged project.sqlite must not turn the read into a 500."""
+        from flask import session
+
+        import potato.routes as routes
+        from potato.flask_server import app
+
+        bd = BehavioralData(instance_id="i1")
+        bd.interactions.append(_click(1.0))
+        user_state = type("State", (), {"instance_id_to_behavioral_data": {"i1": bd}})()
+        monkeypatch.setattr(routes, "get_user_state", lambda username: user_state)
+        monkeypatch.setattr(store, "enabled_store", lambda config: ("/nowhere", "demo"))
+
+        def locked(*args, **kwargs):
+            raise RuntimeError("database is locked")
+        monkeypatch.setattr(store, "merge_stored_events", locked)
+        monkeypatch.setattr(app, "secret_key", "test")
+
+        with app.test_request_context("/api/behavioral_data/i1"):
+            session["username"] = "alice"
+            response = routes.get_behavioral_data("i1")
+
+        assert response.status_code == 200
+        assert len(response.get_json()["interactions"]) == 1
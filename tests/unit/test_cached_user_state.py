@@ -0,0 +1,342 @@
+"""
+Tests for the SQLite database backend and the cached database user state.
+
+SqliteDatabaseManager runs the MySQL user-state SQL against a real SQLite
+file, so these tests exercise MysqlUserState and CachedMysqlUserState end to
+end without a MySQL server.
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from potato.database.cached_user_state import CachedMysqlUserState
+from potato.database.mysql_user_state import MysqlUserState
+from potato.database.sqlite_connection import SqliteDatabaseManager, translate_mysql
+from potato.item_state_management import Label, SpanAnnotation
+from potato.phase import UserPhase
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    manager = SqliteDatabaseManager({'database': {'type': 'sqlite', 'path': str(tmp_path / 'users.sqlite')}})
+    manager.create_tables()
+    yield manager
+    manager.close()
+
+
+def _item(instance_id):
+    item = Mock()
+    item.get_id.return_value = instance_id
+    return item
+
+
+def _count_statements(manager):
+    """Wrap the manager so every execute/executemany call is counted."""
+    counts = {'execute': 0, 'executemany': 0, 'commit': 0}
+    original = manager.get_connection
+
+    class _Conn:
+        def __init__(self, conn):
+            self._conn = conn
+
+        def cursor(self):
+            cursor = self._conn.cursor()
+            outer = self
+
+            class _Cursor:
+                def execute(self, sql, params=()):
+                    counts['execute'] += 1
+                    return cursor.execute(sql, params)
+
+                def executemany(self, sql, rows):
+                    counts['executemany'] += 1
+                    return cursor.executemany(sql, rows)
+
+                def __getattr__(self, name):
+                    return getattr(cursor, name)
+
+            return _Cursor()
+
+        def commit(self):
+            counts['commit'] += 1
+            self._conn.commit()
+
+        def __getattr__(self, name):
+            return getattr(self._conn, name)
+
+    from contextlib import contextmanager
+
+    @contextmanager
+    def counted():
+        with original() as conn:
+            yield _Conn(conn)
+
+    manager.get_connection = counted
+    return counts
+
+
+class TestTranslateMysql:
+    def test_placeholders_and_insert_ignore(self):
+        sql = translate_mysql("INSERT IGNORE INTO user_states (user_id) VALUES (%s)")
+        assert sql == "INSERT OR IGNORE INTO user_states (user_id) VALUES (?)"
+
+    def test_on_duplicate_key_uses_unique_key_as_conflict_target(self):
+        sql = translate_mysql(
+            "INSERT INTO ai_hints (user_id, instance_id, hint_text) VALUES (%s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE hint_text = VALUES(hint_text)"
+        )
+        assert "ON CONFLICT(user_id, instance_id) DO UPDATE SET hint_text = excluded.hint_text" in sql
+
+    def test_on_duplicate_key_without_unique_key_is_plain_insert(self):
+        # span_annotations has no unique key, so MySQL never updates; neither may SQLite.
+        sql = translate_mysql(
+            "INSERT INTO span_annotations (user_id) VALUES (%s) "
+            "ON DUPLICATE KEY UPDATE span_title = VALUES(span_title)"
+        )
+        assert "CONFLICT" not in sql and "DUPLICATE" not in sql
+
+
+class TestUncachedStateOnSqlite:
+    def test_label_round_trip(self, db_manager):
+        state = MysqlUserState("alice", db_manager)
+        state.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+        state.add_label_annotation("i1", Label("sentiment", "positive"), True)
+        state.add_label_annotation("i1", Label("sentiment", "positive"), "again")
+
+        assert state.get_label_annotations("i1") == {Label("sentiment", "positive"): "again"}
+
+    def test_assignment_and_navigation(self, db_manager):
+        state = MysqlUserState("alice", db_manager)
+        for iid in ("a", "b", "c"):
+            state.assign_instance(_item(iid))
+        assert state._get_instance_ordering() == ["a", "b", "c"]
+        assert state.goto_next_instance() is True
+        assert state.get_current_instance_index() == 1
+
+
+class TestCachedStateParity:
+    """The cached state must answer exactly what the uncached state answers."""
+
+    def _drive(self, state):
+        state._single_select_schemas = frozenset({"sentiment"})
+        state.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+        for iid in ("a", "b", "c", "d"):
+            state.assign_instance(_item(iid))
+        state.goto_next_instance()
+        state.add_label_annotation("a", Label("sentiment", "positive"), True)
+        state.add_label_annotation("a", Label("sentiment", "negative"), True)
+        state.add_label_annotation("a", Label("topics", "sports"), True)
+        state.add_label_annotation("a", Label("topics", "news"), True)
+        state.add_span_annotation("b", SpanAnnotation("ner", "PER", "Person", 0, 4), True)
+        state.add_span_annotation("b", SpanAnnotation("ner", "ORG", "Org", 10, 14, kb_id="Q1"), True)
+        state.cache_hint("c", "look at the verb")
+        state.unassign_instance("d")
+        state.assign_instance_at_index(_item("qc"), 1)
+        state.clear_schema_labels("a", "topics")
+        if hasattr(state, "flush"):
+            state.flush()
+
+    def _snapshot(self, state):
+        return {
+            "phase": state.get_current_phase_and_page(),
+            "index": state.get_current_instance_index(),
+            "ordering": state._get_instance_ordering(),
+            "assigned": state.get_assigned_instance_ids(),
+            "labels_a": state.get_label_annotations("a"),
+            "spans_b": {(s.get_schema(), s.get_name(), s.get_start(), s.get_end(), s.kb_id)
+                        for s in state.get_span_annotations("b")},
+            "annotated": state.get_annotated_instance_ids(),
+            "has_a": state.has_annotated("a"),
+            "has_c": state.has_annotated("c"),
+            "hint": (state.hint_exists("c"), state.get_hint("c"), state.get_hint("a")),
+            "all": state.get_all_annotations(),
+        }
+
+    def test_same_answers_as_uncached(self, db_manager):
+        uncached = MysqlUserState("plain", db_manager)
+        cached = CachedMysqlUserState("cached", db_manager)
+        self._drive(uncached)
+        self._drive(cached)
+
+        expected = self._snapshot(uncached)
+        assert self._snapshot(cached) == expected
+        assert expected["labels_a"] == {Label("sentiment", "negative"): "True"}
+        assert expected["ordering"] == ["a", "qc", "b", "c"]
+
+        # A fresh instance reads the flushed rows back identically.
+        assert self._snapshot(CachedMysqlUserState("cached", db_manager)) == expected
+
+
+class TestReadThroughAndWriteBack:
+    def test_getters_are_served_from_memory(self, db_manager):
+        state = CachedMysqlUserState("alice", db_manager, revalidate_interval=60)
+        state.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+        for iid in ("a", "b"):
+            state.assign_instance(_item(iid))
+        state.add_label_annotation("a", Label("s", "x"), True)
+        state.get_label_annotations("a")
+        state.get_span_annotations("a")
+        state.flush()
+
+        counts = _count_statements(db_manager)
+        for _ in range(20):
+            state.get_current_phase_and_page()
+            state.get_current_instance_index()
+            state._get_instance_ordering()
+            state.get_label_annotations("a")
+            state.get_span_annotations("a")
+            state.has_annotated("b")
+        assert counts['execute'] == 0
+
+    def test_writes_are_queued_until_flush(self, db_manager):
+        # A long interval keeps a slow run from revalidating, which flushes.
+        state = CachedMysqlUserState("alice", db_manager, revalidate_interval=3600)
+        state.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+        state.save("/unused")
+
+        counts = _count_statements(db_manager)
+        for i in range(50):
+            state.add_label_annotation(f"i{i}", Label("s", "x"), i)
+        assert counts['commit'] == 0
+        assert state.has_pending_writes()
+
+        state.save("/unused")
+        assert counts['commit'] == 1
+        assert counts['executemany'] == 2  # one DELETE batch, one INSERT batch
+        assert not state.has_pending_writes()
+
+        reread = MysqlUserState("alice", db_manager)
+        assert reread.get_label_annotations("i49") == {Label("s", "x"): "49"}
+
+    def test_queue_limit_forces_flush(self, db_manager):
+        state = CachedMysqlUserState("alice", db_manager, max_pending_writes=10)
+        state.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+        for i in range(25):
+            state.add_label_annotation(f"i{i}", Label("s", "x"), True)
+        assert state._pending_count() < 10
+
+    def test_failed_flush_keeps_writes_queued(self, db_manager):
+        state = CachedMysqlUserState("alice", db_manager)
+        state.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+        state.add_label_annotation("a", Label("s", "x"), True)
+
+        original = db_manager.get_connection
+        db_manager.get_connection = Mock(side_effect=RuntimeError("db down"))
+        with pytest.raises(RuntimeError):
+            state.flush()
+        db_manager.get_connection = original
+
+        assert state.has_pending_writes()
+        state.flush()
+        assert MysqlUserState("alice", db_manager).get_label_annotations("a") == {Label("s", "x"): "True"}
+
+
+class TestVersionedInvalidation:
+    def test_other_writer_invalidates_cache(self, db_manager):
+        # Two instances over one database stand in for two server processes.
+        first = CachedMysqlUserState("alice", db_manager, revalidate_interval=0)
+        second = CachedMysqlUserState("alice", db_manager, revalidate_interval=0)
+        first.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+        first.flush()
+        assert second.get_label_annotations("a") == {}
+
+        first.add_label_annotation("a", Label("s", "x"), True)
+        first.flush()
+
+        assert second.get_label_annotations("a") == {Label("s", "x"): "True"}
+
+    def test_cache_is_trusted_within_the_interval(self, db_manager):
+        first = CachedMysqlUserState("alice", db_manager, revalidate_interval=3600)
+        second = CachedMysqlUserState("alice", db_manager, revalidate_interval=3600)
+        first.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+        first.flush()
+        assert second.get_label_annotations("a") == {}
+
+        first.add_label_annotation("a", Label("s", "x"), True)
+        first.flush()
+
+        assert second.get_label_annotations("a") == {}
+
+    def test_concurrent_writers_do_not_lose_rows(self, db_manager):
+        state = CachedMysqlUserState("alice", db_manager)
+        state.advance_to_phase(UserPhase.ANNOTATION, "annotation")
+
+        def annotate(offset):
+            for i in range(50):
+                state.add_label_annotation(f"i{offset + i}", Label("s", "x"), True)
+                if i % 10 == 0:
+                    state.flush()
+
+        threads = [threading.Thread(target=annotate, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        state.flush()
+
+        assert MysqlUserState("alice", db_manager).get_annotation_count() == 200
+
+
+class TestUserStateManagerWiring:
+    def test_sqlite_database_config_creates_cached_states(self, tmp_path):
+        from potato.user_state_management import UserStateManager
+
+        manager = UserStateManager({
+            'output_annotation_dir': str(tmp_path),
+            'database': {'type': 'sqlite'},
+        })
+        assert manager.use_database
+        user_state = manager.add_user("alice")
+        assert isinstance(user_state, CachedMysqlUserState)
+        assert (tmp_path / 'user_state.sqlite').exists()
+        manager.db_manager.close()
+
+    def test_cache_can_be_disabled(self, tmp_path):
+        from potato.user_state_management import UserStateManager
+
+        manager = UserStateManager({
+            'output_annotation_dir': str(tmp_path),
+            'database': {'type': 'sqlite', 'cache': False},
+        })
+        user_state = manager.add_user("alice")
+        assert type(user_state) is MysqlUserState
+        manager.db_manager.close()
+
+    def test_manager_flushes_writes_made_without_a_save(self, tmp_path):
+        """Navigation and assignment never reach save_user_state(); the
+        end-of-request hook must still commit them for other workers."""
+        from potato.user_state_management import UserStateManager
+
+        manager = UserStateManager({
+            'output_annotation_dir': str(tmp_path),
+            'database': {'type': 'sqlite'},
+        })
+        user_state = manager.add_user("alice")
+        manager.flush_pending_writes()
+        for instance_id in ("a", "b", "c"):
+            user_state.assign_instance(_item(instance_id))
+        user_state.go_to_index(2)
+        assert user_state.has_pending_writes()
+
+        assert manager.flush_pending_writes() == 1
+        assert not user_state.has_pending_writes()
+        other_worker = MysqlUserState("alice", manager.db_manager)
+        assert other_worker.get_assigned_instance_count() == 3
+        assert other_worker.get_current_instance_index() == 2
+        assert manager.flush_pending_writes() == 0
+        manager.db_manager.close()
+
+    def test_flush_runs_at_the_end_of_every_request(self, monkeypatch):
+        import potato.flask_server as flask_server
+
+        calls = []
+        manager = Mock(flush_pending_writes=lambda: calls.append(1) or 0)
+        monkeypatch.setattr(flask_server, "get_user_state_manager", lambda: manager)
+
+        # The served app is the one create_app() builds, not the module-level one.
+        app = flask_server.create_app()
+        app.add_url_rule("/_noop", "_noop", lambda: "ok")
+        assert app.test_client().get("/_noop").status_code == 200
+        assert calls == [1]
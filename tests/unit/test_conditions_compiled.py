@@ -0,0 +1,109 @@
+"""Compiled ``when`` conditions must agree with the interpreted matcher.
+
+``_reference_matches`` is the matcher as it was before compilation, kept here
+as the oracle: the grid below runs every operator against values of every
+shape and checks the compiled predicate gives the same answer.
+"""
+
+import itertools
+
+import pytest
+
+from potato.server_utils.conditions import (
+    as_number,
+    compile_condition,
+    compile_conditions,
+    lookup,
+    matches,
+    matches_all,
+    required_fields,
+)
+
+
+def _reference_matches(condition, data):
+    field = condition.get("field")
+    if field is None:
+        return False
+    value = lookup(data, field)
+    if "exists" in condition:
+        return (value is not None) == bool(condition["exists"])
+    if value is None:
+        return False
+    if "equals" in condition:
+        target = condition["equals"]
+        if isinstance(value, str) and isinstance(target, str):
+            return value.strip().lower() == target.strip().lower()
+        return value == target
+    if "in" in condition:
+        norm = [o.lower() if isinstance(o, str) else o for o in condition["in"] or []]
+        return (value.lower() if isinstance(value, str) else value) in norm
+    if "contains" in condition:
+        target = condition["contains"]
+        if isinstance(value, (list, tuple, set)):
+            tnorm = target.lower() if isinstance(target, str) else target
+            return any((i.lower() if isinstance(i, str) else i) == tnorm for i in value)
+        if isinstance(value, str) and isinstance(target, str):
+            return target.lower() in value.lower()
+        return False
+    for op in ("lt", "lte", "gt", "gte"):
+        if op in condition:
+            lhs, rhs = as_number(value), as_number(condition[op])
+            if lhs is None or rhs is None:
+                return False
+            return {"lt": lhs < rhs, "lte": lhs <= rhs, "gt": lhs > rhs, "gte": lhs >= rhs}[op]
+    return False
+
+
+VALUES = [None, "Error", " error ", "ok", "", 0, 1, 0.5, "0.4", True, ["urgent", "A"],
+          ("x",), {"nested": 1}, [["a"]]]
+CONDITIONS = [
+    {"equals": "ERROR"}, {"equals": 1}, {"equals": True}, {"in": ["error", "OK", 1]},
+    {"in": []}, {"in": None}, {"in": [["a"], "b"]}, {"contains": "URGENT"}, {"contains": "rr"},
+    {"contains": 1}, {"lt": 0.5}, {"lte": "0.5"}, {"gt": 0}, {"gte": "x"}, {"exists": True},
+    {"exists": False}, {},
+]
+
+
+@pytest.mark.parametrize("cond,field", list(itertools.product(CONDITIONS, ["v", "m.v"])))
+def test_compiled_matches_reference(cond, field):
+    condition = dict(cond, field=field)
+    predicate = compile_condition(condition)
+    for value in VALUES:
+        data = {"v": value, "m": {"v": value}}
+        assert predicate(data) == _reference_matches(condition, data), value
+        assert matches(condition, data) == _reference_matches(condition, data)
+    assert predicate({}) == _reference_matches(condition, {})
+    assert predicate({"m": "not a dict"}) == _reference_matches(condition, {"m": "not a dict"})
+
+
+def test_missing_field_never_matches():
+    assert compile_condition({"equals": "x"})({"field": "x"}) is False
+
+
+def test_compile_conditions_ands_and_accepts_dict_or_empty():
+    both = compile_conditions([{"field": "a", "equals": 1}, {"field": "b", "gt": 2}])
+    assert both({"a": 1, "b": 3})
+    assert not both({"a": 1, "b": 2})
+    assert compile_conditions({"field": "a", "exists": True})({"a": 0})
+    assert compile_conditions(None)({}) and compile_conditions([])({})
+    assert matches_all([], {}) and not matches_all({"field": "a", "equals": 2}, {"a": 1})
+
+
+def test_matches_notices_an_edited_condition():
+    cond = {"field": "a", "in": ["x"]}
+    assert matches(cond, {"a": "x"})
+    cond["in"].append("y")
+    assert matches(cond, {"a": "y"})
+    cond["field"] = "b"
+    assert not matches(cond, {"a": "y"})
+
+
+def test_non_list_in_is_false_rather_than_an_error():
+    assert compile_condition({"field": "a", "in": 5})({"a": 5}) is False
+
+
+def test_required_fields():
+    assert required_fields([{"field": "metadata.score", "lt": 1},
+                            {"field": "status", "equals": "x"}]) == {"metadata", "status"}
+    assert required_fields({"field": "x", "exists": False}) == set()
+    assert required_fields([]) == set()
@@ -0,0 +1,175 @@
+"""
+Unit tests for streaming ConvoKit ingestion.
+
+``open_corpus_stream`` keeps the corpus in a scratch SQLite file and hands the
+item builder whole conversations a shard at a time. The contract is that this
+changes memory, not output: every test here compares the stream against
+``read_corpus`` on the same fixture rather than against hand-written
+expectations.
+"""
+
+import json
+import os
+import random
+
+import pytest
+
+from potato.convokit import ConvoKitReadError, read_corpus
+from potato.convokit.cli import main as convokit_main
+from potato.convokit.items import ItemOptions, build_items, iter_items
+from potato.convokit.stream import iter_json_object, open_corpus_stream
+
+FIXTURES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "convokit"
+)
+NAMES = ["mini-modern", "mini-legacy", "mini-bin", "mini-broken", "mini-underscore"]
+MODERN = os.path.join(FIXTURES, "mini-modern")
+
+
+def _both(path, **kwargs):
+    return read_corpus(path, **kwargs), open_corpus_stream(path, **kwargs)
+
+
+def _write_corpus(root, conversations, seed=0):
+    """A corpus whose conversations' utterances are shuffled through the file."""
+    rows = []
+    for c in range(conversations):
+        for u in range(1 + c % 4):
+            rows.append({
+                "id": f"u{c}.{u}", "conversation_id": f"u{c}.0", "speaker": f"s{c % 7}",
+                "text": f"turn {u} of {c}", "reply_to": f"u{c}.{u - 1}" if u else None,
+                "timestamp": c * 10 + u, "meta": {"n": u},
+            })
+    random.Random(seed).shuffle(rows)
+    root.mkdir()
+    with open(root / "utterances.jsonl", "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    (root / "speakers.json").write_text(json.dumps({f"s{i}": {"meta": {"i": i}} for i in range(7)}))
+    (root / "conversations.json").write_text(
+        json.dumps({f"u{c}.0": {"meta": {"split": "train" if c % 3 else "test"}}
+                    for c in range(conversations)})
+    )
+    return str(root)
+
+
+class TestParity:
+    @pytest.mark.parametrize("name", NAMES)
+    @pytest.mark.parametrize("unit", ["conversation", "utterance"])
+    def test_items_match_the_in_memory_reader(self, name, unit):
+        corpus, stream = _both(os.path.join(FIXTURES, name))
+        with stream:
+            opts = ItemOptions(unit=unit)
+            assert build_items(stream, opts) == build_items(corpus, opts)
+            assert sorted(stream.warnings) == sorted(corpus.warnings)
+            assert stream.legacy == corpus.legacy
+            assert stream.dropped_meta_fields == corpus.dropped_meta_fields
+            assert stream.skipped_binary_fields == corpus.skipped_binary_fields
+
+    def test_views_read_like_the_dicts(self):
+        corpus, stream = _both(MODERN)
+        with stream:
+            assert list(stream.utterances) == list(corpus.utterances)
+            assert dict(stream.utterances.items()) == corpus.utterances
+            assert dict(stream.conversations.items()) == corpus.conversations
+            assert dict(stream.speakers.items()) == corpus.speakers
+            assert len(stream) == len(corpus)
+            assert "c1" in stream.utterances and "nope" not in stream.utterances
+            assert stream.utterances_of("c0") == corpus.utterances_of("c0")
+
+    def test_info_overlays_and_conversation_caps(self):
+        corpus, stream = _both(MODERN, info_fields=["extra_score"], max_conversations=1)
+        with stream:
+            assert stream.utterances["c1"].meta["extra_score"] == 0.9
+            assert list(stream.conversations) == ["c0"]
+            assert build_items(stream) == build_items(corpus)
+
+    def test_filters_drop_the_same_objects(self, tmp_path):
+        path = _write_corpus(tmp_path / "big", 40)
+        corpus, stream = _both(path)
+        with stream:
+            is_train = lambda meta: meta.get("split") == "train"  # noqa: E731
+            first_turn = lambda meta: meta.get("n") == 0  # noqa: E731
+            assert stream.filter(conversation=is_train, utterance=first_turn) == \
+                corpus.filter(conversation=is_train, utterance=first_turn)
+            opts = ItemOptions(unit="utterance")
+            assert build_items(stream, opts) == build_items(corpus, opts)
+
+    def test_shards_are_whole_conversations_in_order(self, tmp_path):
+        path = _write_corpus(tmp_path / "big", 60, seed=1)
+        corpus, stream = _both(path)
+        with stream:
+            shards = list(stream.iter_shards(max_utterances=10))
+            assert len(shards) > 5
+            assert all(len(s.utterances) < 10 + 4 for s in shards)
+            order = [cid for s in shards for cid in s.conversations]
+            assert order == list(corpus.conversations)
+            for shard in shards:
+                for convo in shard.conversations.values():
+                    assert convo.utterance_ids == corpus.conversations[convo.id].utterance_ids
+            assert list(iter_items(stream, limit=7)) == build_items(corpus, limit=7)
+
+
+class TestScratchFile:
+    def test_close_deletes_it(self, tmp_path):
+        stream = open_corpus_stream(MODERN, index_dir=str(tmp_path / "idx"))
+        assert os.path.exists(stream.index_path)
+        stream.close()
+        assert not os.path.exists(stream.index_path)
+        stream.close()  # idempotent
+
+    def test_a_failed_read_leaves_nothing_behind(self, tmp_path):
+        bad = tmp_path / "bad"
+        bad.mkdir()
+        (bad / "utterances.jsonl").write_text("{not json\n")
+        with pytest.raises(ConvoKitReadError):
+            open_corpus_stream(str(bad), index_dir=str(tmp_path / "idx"))
+        assert os.listdir(tmp_path / "idx") == []
+
+
+class TestIterJsonObject:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 16])
+    def test_matches_json_load_at_any_chunk_size(self, tmp_path, chunk_size):
+        payload = {"a": 12345, "b": {"meta": {"x": [1, 2.5e-3, None, True]}}, "c": "}{\"",
+                   "d": -0.5, "é": "ü"}
+        path = tmp_path / "o.json"
+        path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        assert dict(iter_json_object(str(path), chunk_size=chunk_size)) == payload
+        raw = dict(iter_json_object(str(path), chunk_size=chunk_size, raw=True))
+        assert {k: json.loads(v) for k, v in raw.items()} == payload
+
+    def test_empty_object_and_repeated_keys(self, tmp_path):
+        path = tmp_path / "o.json"
+        path.write_text(" { } ")
+        assert list(iter_json_object(str(path))) == []
+        path.write_text('{"a": 1, "a": 2}')
+        assert dict(iter_json_object(str(path))) == json.loads(path.read_text())
+
+    @pytest.mark.parametrize("text", ["[1, 2]", '{"a": 1', '{"a" 1}', '{"a": 1} x', '{"a": tru}'])
+    def test_malformed_input_is_a_read_error(self, tmp_path, text):
+        path = tmp_path / "o.json"
+        path.write_text(text)
+        with pytest.raises(ConvoKitReadError):
+            list(iter_json_object(str(path), chunk_size=2))
+
+
+class TestCli:
+    @pytest.mark.parametrize("fmt", ["json", "jsonl"])
+    def test_stream_output_is_byte_identical(self, tmp_path, fmt):
+        path = _write_corpus(tmp_path / "big", 30)
+        args = [path, "-q", "--format", fmt, "--split", "train", "--unit", "utterance"]
+        convokit_main(args + ["-o", str(tmp_path / f"a.{fmt}")])
+        convokit_main(args + ["--stream", "--index-dir", str(tmp_path / "idx"),
+                              "-o", str(tmp_path / f"b.{fmt}")])
+        assert (tmp_path / f"a.{fmt}").read_bytes() == (tmp_path / f"b.{fmt}").read_bytes()
+        assert os.listdir(tmp_path / "idx") == []
+
+    def test_stream_sample_is_seeded(self, tmp_path):
+        path = _write_corpus(tmp_path / "big", 30)
+        outputs = []
+        for name in ("a", "b"):
+            out = tmp_path / f"{name}.jsonl"
+            convokit_main([path, "-q", "--stream", "--sample", "5", "--seed", "3", "-o", str(out)])
+            outputs.append(out.read_text())
+        assert outputs[0] == outputs[1]
+        assert len(outputs[0].splitlines()) == 5
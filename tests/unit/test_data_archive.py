@@ -13,6 +13,7 @@ about it; the loss surfaces weeks later.
 
 import io
 import os
+import shutil
 import sqlite3
 import tarfile
 
@@ -261,9 +262,15 @@ class TestRoutes:
     """The endpoint itself, through the real app."""
 
     @pytest.fixture(scope="class")
-    def client(self):
+    def client(self, tmp_path_factory):
+        """An app over a copy of the example, so its output stays out of the repo."""
         from potato.flask_server import create_app
-        app = create_app("examples/classification/single-choice/config.yaml")
+        task_dir = tmp_path_factory.mktemp("archive_routes") / "single-choice"
+        shutil.copytree("examples/classification/single-choice", task_dir)
+        # Config paths are checked against the working directory.
+        with pytest.MonkeyPatch.context() as mp:
+            mp.chdir(task_dir)
+            app = create_app(str(task_dir / "config.yaml"))
         return app.test_client()
 
     @pytest.fixture(scope="class")
@@ -0,0 +1,138 @@
+"""
+The NumPy fast paths in ``potato.media.depth`` against the Python ones.
+
+The pure-Python loops are the reference. Each test runs the same call twice
+-- once as shipped, once with ``_numpy`` patched to return None -- and
+requires identical bytes: the DPT1 buffer, the colourised PNG, the PNT1
+cloud. The fixtures lean on the awkward corners: values exactly halfway
+between two LUT entries, signed zeros, NaN and infinities, a map large
+enough to take the stride-sampled percentiles.
+"""
+
+import json
+import math
+import random
+import struct
+from array import array
+
+import pytest
+
+import potato.media.depth as dm
+from potato.media.depth import (DepthMap, colorize, describe, percentile_window,
+                                read_depth, to_png, to_wire, unproject)
+from potato.media.pointcloud import to_wire as cloud_to_wire
+
+np = pytest.importorskip("numpy")
+
+
+def _both(monkeypatch, fn):
+    """``fn()`` with the fast paths, then with the pure-Python paths."""
+    fast = fn()
+    with monkeypatch.context() as m:
+        m.setattr(dm, "_numpy", lambda: None)
+        slow = fn()
+    return fast, slow
+
+
+def _map(rng, width, height, holes=0.1):
+    special = [0.0, -0.0, 0.5, 1.5, 2.5, float("nan"), float("inf"), -float("inf")]
+    values = [rng.choice(special) if rng.random() < holes else rng.uniform(0.2, 9.0)
+              for _ in range(width * height)]
+    return DepthMap(values=array("f", values), width=width, height=height)
+
+
+@pytest.fixture
+def rng():
+    return random.Random(7)
+
+
+class TestReading:
+    def test_npy_with_invalid_and_negative_values(self, tmp_path, monkeypatch, rng):
+        grid = np.array([[rng.choice([0, -3, 65535, rng.randrange(1, 9000)])
+                          for _ in range(37)] for _ in range(23)], dtype=np.int32)
+        path = tmp_path / "d.npy"
+        np.save(path, grid.astype(np.float64) - 5)
+        fast, slow = _both(monkeypatch, lambda: to_wire(read_depth(path, scale=0.001)))
+        assert fast == slow
+
+    @pytest.mark.parametrize("mode", ["I;16", "I", "F"])
+    def test_raster(self, tmp_path, monkeypatch, rng, mode):
+        Image = pytest.importorskip("PIL.Image")
+        dtype = {"I;16": np.uint16, "I": np.int32, "F": np.float32}[mode]
+        grid = np.array([[rng.randrange(0, 20000) for _ in range(31)]
+                         for _ in range(17)], dtype=dtype)
+        path = tmp_path / "d.tif"
+        image = Image.fromarray(grid)
+        assert image.mode == mode
+        image.save(path)
+        fast, slow = _both(monkeypatch, lambda: to_wire(read_depth(path)))
+        assert fast == slow
+
+    def test_pfm_is_flipped_the_same_way(self, tmp_path, monkeypatch, rng):
+        width, height = 9, 5
+        body = struct.pack(f"<{width * height * 3}f",
+                           *(rng.uniform(0, 4) for _ in range(width * height * 3)))
+        path = tmp_path / "d.pfm"
+        path.write_bytes(b"PF\n%d %d\n-1.0\n" % (width, height) + body)
+        fast, slow = _both(monkeypatch, lambda: to_wire(read_depth(path)))
+        assert fast == slow
+
+
+class TestWindowAndColour:
+    def test_describe_and_window(self, monkeypatch, rng):
+        depth = _map(rng, 40, 30)
+        fast, slow = _both(monkeypatch, lambda: json.dumps(describe(depth)))
+        assert fast == slow
+
+    def test_the_stride_sample_matches(self, monkeypatch, rng):
+        depth = _map(rng, 1000, dm.PERCENTILE_SAMPLE_LIMIT // 1000 + 7, holes=0.01)
+        fast, slow = _both(monkeypatch, lambda: percentile_window(depth))
+        assert fast == slow
+
+    def test_zero_statistics_keep_the_sign_the_loop_picks(self, monkeypatch):
+        depth = DepthMap(values=array("f", [-0.0, 0.0, 0.0, -0.0, float("nan")]),
+                         width=5, height=1)
+        fast, slow = _both(monkeypatch, lambda: (describe(depth), percentile_window(depth)))
+        signs = [math.copysign(1, v) for v in
+                 (fast[0]["min"], fast[0]["max"], *fast[1])]
+        assert signs == [math.copysign(1, v) for v in
+                         (slow[0]["min"], slow[0]["max"], *slow[1])]
+
+    @pytest.mark.parametrize("colormap", sorted(dm.COLORMAPS))
+    @pytest.mark.parametrize("invert", [False, True])
+    def test_colorize(self, monkeypatch, rng, colormap, invert):
+        depth = _map(rng, 64, 16)
+        # A window of 0..255 puts every integer depth on a LUT entry and every
+        # .5 exactly halfway between two, where rounding mode shows.
+        ramp = DepthMap(values=array("f", [i / 2 for i in range(-20, 540)]),
+                        width=560, height=1)
+        for d, window in ((depth, None), (depth, (1.0, 4.0)), (ramp, (0.0, 255.0))):
+            fast, slow = _both(monkeypatch,
+                               lambda: colorize(d, window, colormap, invert=invert))
+            assert fast == slow
+
+    def test_png_bytes(self, monkeypatch, rng):
+        pytest.importorskip("PIL.Image")
+        depth = _map(rng, 33, 21)
+        fast, slow = _both(monkeypatch, lambda: to_png(depth, colormap="magma"))
+        assert fast == slow
+
+
+class TestUnprojection:
+    @pytest.mark.parametrize("frame", ["z_up", "camera"])
+    @pytest.mark.parametrize("stride,max_points", [(1, 500_000), (3, 500_000), (2, 40)])
+    def test_cloud_bytes(self, monkeypatch, rng, frame, stride, max_points):
+        depth = _map(rng, 50, 40)
+        colors = bytes(rng.randrange(256) for _ in range(depth.count * 3))
+        fast, slow = _both(monkeypatch, lambda: cloud_to_wire(unproject(
+            depth, (525.0, 520.5, 24.5, 19.0), stride=stride,
+            max_points=max_points, frame=frame, colors=colors)))
+        assert fast == slow
+
+    def test_extrinsic(self, monkeypatch, rng):
+        depth = _map(rng, 20, 12)
+        pose = [[0.0, -1.0, 0.0, 1.5], [0.6, 0.0, 0.8, -2], [-0.8, 0.0, 0.6, 0.25],
+                [0, 0, 0, 1]]
+        fast, slow = _both(monkeypatch, lambda: cloud_to_wire(unproject(
+            depth, (100, 100, 10, 6), extrinsic=pose)))
+        assert fast == slow
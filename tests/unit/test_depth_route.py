@@ -129,6 +129,28 @@ class TestParameters:
         cached = list((tmp_path / "out" / ".media_cache").glob("*.depth.png"))
         assert len(cached) == 1
 
+    def test_a_cached_render_does_not_decode_the_file(self, client, monkeypatch):
+        c, media = client
+        write_depth(media)
+        first = c.get("/media/depth/d.npy?colormap=gray").data
+
+        def unreadable(*args, **kwargs):
+            raise AssertionError("a cache hit must not read the depth map")
+
+        monkeypatch.setattr("potato.media.depth.read_depth", unreadable)
+        assert c.get("/media/depth/d.npy?colormap=gray").data == first
+
+    def test_unprojections_are_cached_per_intrinsics(self, client, tmp_path):
+        c, media = client
+        write_depth(media)
+        query = "/media/depth/d.npy?pointcloud=1&fy=5&cx=0&cy=0&fx="
+        c.get(query + "5")
+        c.get(query + "5")
+        _header, cloud = cloud_from_wire(c.get(query + "10").data)
+        assert list(cloud.indices) == [0, 1, 2]
+        cached = list((tmp_path / "out" / ".media_cache").glob("*.depth.pnt"))
+        assert len(cached) == 2
+
 
 class TestFailures:
     def test_a_missing_file_is_a_404(self, client):
@@ -808,6 +808,72 @@ class TestEvaluateVisibility:
         assert reason is not None
         assert "Conditions not met" in reason
 
+    def test_rule_is_parsed_once_per_config_dict(self, monkeypatch):
+        """Repeated renders reuse the parsed rule until the config changes."""
+        display_logic = {
+            "show_when": [{"schema": "rating", "operator": "equals", "value": "Good"}]
+        }
+        parsed = []
+        original = DisplayLogicRule.from_dict.__func__
+        monkeypatch.setattr(DisplayLogicRule, "from_dict", classmethod(
+            lambda cls, data: parsed.append(1) or original(cls, data)))
+
+        for _ in range(3):
+            assert DisplayLogicEvaluator.evaluate_visibility(
+                "s", display_logic, {"rating": "Good"})[0] is True
+        assert len(parsed) == 1
+
+        display_logic["show_when"][0]["value"] = "Bad"
+        assert DisplayLogicEvaluator.evaluate_visibility(
+            "s", display_logic, {"rating": "Good"})[0] is False
+        assert len(parsed) == 2
+
+
+class TestCompiledConditions:
+    """Conditions compile their operator into a predicate on first use."""
+
+    def test_regex_is_compiled_once(self, monkeypatch):
+        import re
+        cond = DisplayLogicCondition(schema="a", operator="matches", value=r"^\d+$")
+        compiled = []
+        real = re.compile
+        monkeypatch.setattr(re, "compile", lambda *a: compiled.append(a) or real(*a))
+        assert cond.evaluate("123") and not cond.evaluate("12a") and cond.evaluate(45)
+        assert len(compiled) == 1
+
+    def test_reassigning_value_recompiles(self):
+        cond = DisplayLogicCondition(schema="a", operator="equals", value="Yes")
+        assert cond.evaluate("yes")
+        cond.value = ["No", 3]
+        assert not cond.evaluate("yes")
+        assert cond.evaluate("NO") and cond.evaluate(3)
+        cond.case_sensitive = True
+        assert not cond.evaluate("NO")
+
+    def test_compiled_answers_match_the_helpers(self):
+        """Spot-check the predicate against the evaluator's own helpers."""
+        actuals = [None, "", "Yes", "yes please", 5, "5", 7.5, ["Yes", "no"], [], "İ"]
+        for expected in ["Yes", ["no", 5], None, "5"]:
+            for actual in actuals:
+                folded = actual.lower() if isinstance(actual, str) else actual
+                eq = DisplayLogicCondition(schema="a", operator="equals", value=expected) \
+                    if expected is not None else None
+                if eq:
+                    assert eq.evaluate(actual) == DisplayLogicEvaluator._check_equals(
+                        folded, expected, False)
+                    contains = DisplayLogicCondition(schema="a", operator="contains",
+                                                     value=expected)
+                    assert contains.evaluate(actual) == DisplayLogicEvaluator._check_contains(
+                        folded, expected, False)
+        for actual in actuals:
+            folded = actual.lower() if isinstance(actual, str) else actual
+            gt = DisplayLogicCondition(schema="a", operator="gt", value=4)
+            assert gt.evaluate(actual) == DisplayLogicEvaluator._check_numeric("gt", folded, 4)
+            rng = DisplayLogicCondition(schema="a", operator="not_in_range", value=[1, 6])
+            assert rng.evaluate(actual) == (not DisplayLogicEvaluator._check_range(folded, [1, 6]))
+            ln = DisplayLogicCondition(schema="a", operator="length_in_range", value=[1, 3])
+            assert ln.evaluate(actual) == DisplayLogicEvaluator._check_length_range(folded, [1, 3])
+
 
 class TestSupportedOperators:
     """Tests for the SUPPORTED_OPERATORS constant."""
@@ -0,0 +1,218 @@
+"""
+Unit tests for the on-disk extraction cache and background pre-extraction.
+
+A counting handler registered for a made-up extension stands in for the real
+ones, so the tests can tell a cache hit (handler not called) from a miss. The
+PDF tests use the sample paper and a fake Tesseract to check that OCR spread
+over a page pool gives the same output as OCR page by page.
+"""
+
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from potato.format_handlers import pdf_handler
+from potato.format_handlers.base import BaseFormatHandler, FormatOutput
+from potato.format_handlers.coordinate_mapping import CoordinateMapper, CodeCoordinate
+from potato.format_handlers.extraction_cache import ExtractionCache
+from potato.format_handlers.registry import format_handler_registry
+from potato.server_utils.instance_display import InstanceDisplayRenderer
+
+SAMPLE_PDF = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..",
+    "examples", "advanced", "pdf-link-paginated", "media", "sample-paper.pdf",
+)
+
+
+class CountingHandler(BaseFormatHandler):
+    """Upper-cases the file; counts calls, optionally slowly."""
+
+    format_name = "counting"
+    supported_extensions = [".cnt"]
+    description = "Test handler"
+
+    def __init__(self):
+        self.calls = 0
+        self.delay = 0.0
+        self.unserializable = False
+
+    def extract(self, file_path, options=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        with open(file_path) as f:
+            text = f.read().upper()
+        mapper = CoordinateMapper()
+        mapper.add_mapping(0, len(text), CodeCoordinate(line=1, column=1))
+        coords = mapper.to_dict()
+        coords["get_coords_for_range"] = mapper.get_coords_for_range
+        metadata = {"options": options or {}, "source_file": str(file_path)}
+        if self.unserializable:
+            metadata["handle"] = object()
+        return FormatOutput(text=text, rendered_html=f"<pre>{text}</pre>",
+                            coordinate_map=coords, metadata=metadata,
+                            format_name=self.format_name, source_path=str(file_path))
+
+
+@pytest.fixture
+def handler():
+    h = CountingHandler()
+    format_handler_registry.register(h)
+    yield h
+    format_handler_registry.unregister(h.format_name)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ExtractionCache(str(tmp_path / "cache"), workers=0)
+    yield c
+    c.stop_background_prefetch()
+
+
+@pytest.fixture
+def doc(tmp_path):
+    path = tmp_path / "a.cnt"
+    path.write_text("hello world")
+    return str(path)
+
+
+class TestCaching:
+    def test_a_revisit_is_served_from_disk(self, cache, handler, doc):
+        first = cache.extract(doc)
+        second = cache.extract(doc)
+        assert handler.calls == 1
+        assert second.text == first.text == "HELLO WORLD"
+        assert second.rendered_html == first.rendered_html
+        assert second.get_format_coords(0, 5) == first.get_format_coords(0, 5)
+        assert callable(second.coordinate_map["get_coords_for_range"])
+
+    def test_the_cache_survives_a_restart(self, tmp_path, handler, doc):
+        ExtractionCache(str(tmp_path / "c"), workers=0).extract(doc)
+        ExtractionCache(str(tmp_path / "c"), workers=0).extract(doc)
+        assert handler.calls == 1
+
+    def test_edits_and_options_are_misses(self, cache, handler, doc):
+        cache.extract(doc)
+        cache.extract(doc, {"max_rows": 10})
+        assert handler.calls == 2
+        with open(doc, "w") as f:
+            f.write("changed")
+        os.utime(doc, ns=(1, 1))  # a different mtime, whatever the clock says
+        assert cache.extract(doc).text == "CHANGED"
+        assert handler.calls == 3
+
+    def test_copies_share_an_entry_but_keep_their_path(self, cache, handler, doc, tmp_path):
+        copy = str(tmp_path / "b.cnt")
+        shutil.copy(doc, copy)
+        cache.extract(doc)
+        output = cache.extract(copy)
+        assert handler.calls == 1
+        assert output.source_path == copy
+        assert output.metadata["source_file"] == copy
+
+    def test_output_that_is_not_json_is_returned_uncached(self, cache, handler, doc):
+        handler.unserializable = True
+        cache.extract(doc)
+        cache.extract(doc)
+        assert handler.calls == 2
+
+    def test_concurrent_requests_extract_once(self, cache, handler, doc):
+        handler.delay = 0.2
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.extract(doc).text))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == ["HELLO WORLD"] * 4
+        assert handler.calls == 1
+
+    def test_errors_are_the_handlers(self, cache, tmp_path):
+        with pytest.raises(ValueError):
+            cache.extract(str(tmp_path / "missing.cnt"))
+
+
+class TestPrefetch:
+    def test_queued_jobs_are_extracted_in_the_background(self, cache, handler, doc):
+        cache.queue_prefetch([("extract", doc, {}), ("extract", doc, {})])
+        cache._prefetch_thread.join(timeout=10)
+        assert handler.calls == 1
+        cache.extract(doc)
+        assert handler.calls == 1
+
+    def test_the_renderer_queues_upcoming_format_fields(self, cache, handler, doc,
+                                                        monkeypatch):
+        from potato.format_handlers import extraction_cache
+        monkeypatch.setattr(extraction_cache, "_extraction_cache", cache)
+        renderer = InstanceDisplayRenderer({"instance_display": {"fields": [
+            {"key": "doc", "type": "document"},
+            {"key": "pdf", "type": "pdf"},  # client-side PDF.js: nothing to do
+            {"key": "text", "type": "text"},
+        ]}})
+        queued = renderer.queue_prefetch([
+            {"doc": doc, "pdf": "paper.pdf", "text": "x"},
+            {"doc": "notes.unknown", "pdf": "paper.pdf", "text": "y"},
+        ])
+        assert queued == 1
+        cache._prefetch_thread.join(timeout=10)
+        assert handler.calls == 1
+
+        data = renderer._process_format_file(doc, "document", {"key": "doc"})
+        assert data["text"] == "HELLO WORLD"
+        assert handler.calls == 1
+
+
+@pytest.mark.skipif(not pdf_handler.PDFPLUMBER_AVAILABLE, reason="pdfplumber not installed")
+class TestPDF:
+    @pytest.fixture
+    def fake_tesseract(self, monkeypatch):
+        pytest.importorskip("pypdfium2")
+        calls = []
+
+        class FakeTesseract:
+            class Output:
+                DICT = "dict"
+
+            @staticmethod
+            def image_to_data(image, lang, output_type):
+                calls.append(threading.current_thread().name)
+                width, height = image.size
+                return {"text": [f"w{width}", "", f"h{height}"],
+                        "left": [10, 0, 50], "top": [20, 0, 20],
+                        "width": [30, 0, 40], "height": [12, 0, 12],
+                        "block_num": [1, 1, 1], "par_num": [1, 1, 1],
+                        "line_num": [1, 1, 2]}
+
+        monkeypatch.setattr(pdf_handler, "PYTESSERACT_AVAILABLE", True)
+        monkeypatch.setattr(pdf_handler, "pytesseract", FakeTesseract)
+        return calls
+
+    def test_words_by_page_are_cached_with_int_pages(self, cache):
+        direct = pdf_handler.PDFHandler().extract_words_by_page(SAMPLE_PDF, {"ocr": "auto"})
+        cached = cache.words_by_page(SAMPLE_PDF, {"ocr": "auto"})
+        assert cache.words_by_page(SAMPLE_PDF, {"ocr": "auto"}) == cached == direct
+
+    @pytest.mark.parametrize("method", ["extract", "extract_words_by_page"])
+    def test_ocr_in_a_page_pool_matches_page_by_page(self, fake_tesseract, method):
+        handler = pdf_handler.PDFHandler()
+        inline = getattr(handler, method)(SAMPLE_PDF, {"ocr": True})
+        assert len(fake_tesseract) == 3
+        # One thread: pdfium is not thread-safe (the server pool is processes).
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr-pool") as pool:
+            pooled = getattr(handler, method)(SAMPLE_PDF, {"ocr": True}, executor=pool)
+        assert all(name.startswith("ocr-pool") for name in fake_tesseract[3:])
+        assert len(fake_tesseract) == 6
+        if method == "extract":
+            assert pooled.text == inline.text
+            assert pooled.rendered_html == inline.rendered_html
+            inline, pooled = inline.coordinate_map["mappings"], pooled.coordinate_map["mappings"]
+        assert pooled == inline
+
+    def test_auto_only_pools_pages_without_text(self, fake_tesseract):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pdf_handler.PDFHandler().extract(SAMPLE_PDF, {"ocr": "auto"}, executor=pool)
+        assert fake_tesseract == [], "the sample paper has a text layer on every page"
@@ -0,0 +1,153 @@
+"""
+All-pairs geometry kernels.
+
+The kernels exist only to be faster, so the property that matters is that
+they return what the pairwise functions return -- every test here compares a
+matrix cell by cell against the scalar function it replaces, on random
+shapes including the awkward ones (degenerate boxes, empty masks,
+self-intersecting polygons, integer vertices).
+"""
+
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from potato.server_utils.iaa import geometry
+from potato.server_utils.iaa import geometry_agreement
+
+
+def random_box(rng):
+    return [rng.uniform(0, 100), rng.uniform(0, 100),
+            rng.choice([0.0, rng.uniform(1, 40)]), rng.uniform(1, 40)]
+
+
+def random_polygon(rng):
+    cx, cy = rng.uniform(0, 100), rng.uniform(0, 100)
+    n = rng.randint(3, 10)
+    points = [[cx + rng.uniform(5, 30) * math.cos(2 * math.pi * k / n),
+               cy + rng.uniform(5, 30) * math.sin(2 * math.pi * k / n)]
+              for k in range(n)]
+    if rng.random() < 0.3:
+        rng.shuffle(points)  # self-intersecting
+    if rng.random() < 0.3:
+        points = [[round(x), round(y)] for x, y in points]
+    return points
+
+
+def random_rle(rng):
+    return {"counts": [rng.randint(0, 30) for _ in range(rng.randint(0, 12))]}
+
+
+def pairwise(fn, left, right):
+    return [[fn(a, b) for b in right] for a in left]
+
+
+class TestKernelsMatchPairwise:
+    def test_bbox(self):
+        rng = random.Random(1)
+        left = [random_box(rng) for _ in range(30)] + [[], [1, 2]]
+        right = [random_box(rng) for _ in range(20)]
+        assert geometry.iou_bbox_matrix(left, right).tolist() == \
+            pairwise(geometry.iou_bbox, left, right)
+
+    def test_mask(self):
+        rng = random.Random(2)
+        left = [random_rle(rng) for _ in range(25)] + [{}]
+        right = [random_rle(rng) for _ in range(25)]
+        assert geometry.iou_mask_matrix(left, right).tolist() == \
+            pairwise(geometry.iou_mask, left, right)
+
+    def test_polygon(self):
+        rng = random.Random(3)
+        left = [random_polygon(rng) for _ in range(8)] + [[[0, 0], [1, 1]]]
+        right = [random_polygon(rng) for _ in range(8)]
+        right.append([[x + 1e-9, y] for x, y in left[0]])
+        assert geometry.iou_polygon_matrix(left, right).tolist() == \
+            pairwise(geometry.iou_polygon, left, right)
+
+    def test_raster_matches_scalar_point_in_polygon(self):
+        """The vectorized raster against the scalar ray cast it replaced."""
+        rng = random.Random(4)
+        for _ in range(5):
+            a, b = random_polygon(rng), random_polygon(rng)
+            samples = 24
+            xs = [float(p[0]) for p in a + b]
+            ys = [float(p[1]) for p in a + b]
+            step_x = (max(xs) - min(xs)) / samples
+            step_y = (max(ys) - min(ys)) / samples
+            inter = union = 0
+            for row in range(samples):
+                py = min(ys) + (row + 0.5) * step_y
+                for col in range(samples):
+                    px = min(xs) + (col + 0.5) * step_x
+                    in_a = geometry._point_in_polygon(px, py, a)
+                    in_b = geometry._point_in_polygon(px, py, b)
+                    inter += in_a and in_b
+                    union += in_a or in_b
+            expected = inter / union if union else 0.0
+            assert geometry._iou_polygon_raster(a, b, samples) == expected
+
+    def test_similarity_matrix_mixes_types(self):
+        rng = random.Random(5)
+
+        def objects():
+            return [rng.choice([
+                {"type": "bbox", "bbox": random_box(rng)},
+                {"type": "polygon", "points": random_polygon(rng)},
+                {"type": "mask", "rle": random_rle(rng)},
+                {"type": "landmark", "points": [[1, 2]], "bbox": random_box(rng)},
+            ]) for _ in range(6)]
+
+        for _ in range(10):
+            left, right = objects(), objects()
+            assert geometry.similarity_matrix(left, right).tolist() == \
+                pairwise(geometry.similarity, left, right)
+
+    def test_match_instances_unchanged_by_custom_sim_fn_path(self):
+        rng = random.Random(6)
+        left = [{"type": "bbox", "bbox": random_box(rng)} for _ in range(6)]
+        right = [{"type": "bbox", "bbox": random_box(rng)} for _ in range(6)]
+        assert geometry.match_instances(left, right) == geometry.match_instances(
+            left, right, sim_fn=lambda a, b: geometry.similarity(a, b))
+
+
+class TestBatchedDistances:
+    @pytest.mark.parametrize("distance", ["giou", "centroid"])
+    def test_batched_box_distances_match_pairwise(self, distance):
+        rng = random.Random(7)
+        metric = geometry_agreement.DISTANCES[distance]
+        pairs = [({"type": "bbox", "bbox": random_box(rng)},
+                  {"type": "bbox", "bbox": random_box(rng)}) for _ in range(200)]
+        pairs.append(({"type": "landmark", "points": [[1, 1]]},
+                      {"type": "bbox", "bbox": [0, 0, 2, 2]}))
+        assert geometry_agreement._pair_distances(metric, pairs, {}) == \
+            pytest.approx([metric(a, b) for a, b in pairs], abs=1e-12)
+
+
+class TestBootstrapReusesMatching:
+    def test_each_item_is_matched_once(self, monkeypatch):
+        rng = random.Random(8)
+        items = {
+            f"item_{i}": {
+                annotator: [{"type": "bbox", "label": "cat",
+                             "coordinates": {"x": x + rng.uniform(-2, 2), "y": 10,
+                                             "width": 20, "height": 20}}]
+                for annotator in ("a", "b", "c")
+            }
+            for i, x in enumerate(range(0, 200, 25))
+        }
+        calls = []
+        original = geometry.match_instances
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(geometry, "match_instances", counting)
+        report = geometry_agreement.geometry_agreement(items, bootstrap=30)
+        assert "sigma_lower" in report["confidence"]
+        # Three annotator pairs per item, matched for the estimate only.
+        assert len(calls) == 3 * len(items)
@@ -0,0 +1,266 @@
+"""
+Request instrumentation: histograms, spans, request hooks, admin endpoints and
+the sampling profiler.
+"""
+
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from potato.instrumentation import (
+    LatencyHistogram,
+    MetricsRegistry,
+    clear_metrics_registry,
+    get_metrics_registry,
+    init_metrics_registry,
+    span,
+    timed,
+)
+from potato.instrumentation.config import InstrumentationConfig
+from potato.instrumentation.profiler import TRUNCATED, SamplingProfiler
+
+
+@pytest.fixture(autouse=True)
+def _no_registry():
+    clear_metrics_registry()
+    yield
+    clear_metrics_registry()
+
+
+class TestLatencyHistogram:
+    def test_buckets_are_upper_inclusive_with_overflow(self):
+        histogram = LatencyHistogram([0.01, 0.1])
+        for seconds in (0.005, 0.01, 0.05, 0.5):
+            histogram.observe(seconds)
+        counts, total, count = histogram.snapshot()
+        assert counts == [2, 1, 1]
+        assert count == 4
+        assert total == pytest.approx(0.565)
+
+    def test_quantile_interpolates_within_bucket(self):
+        histogram = LatencyHistogram([0.01, 0.02])
+        for _ in range(10):
+            histogram.observe(0.015)
+        # All ten fall in (0.01, 0.02]; the median sits halfway through it.
+        assert histogram.quantile(0.5) == pytest.approx(0.015)
+        assert LatencyHistogram([0.01]).quantile(0.5) is None
+
+    def test_concurrent_observations_are_all_counted(self):
+        histogram = LatencyHistogram([0.001, 0.01])
+
+        def worker():
+            for _ in range(2000):
+                histogram.observe(0.005)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert histogram.snapshot()[2] == 16000
+
+
+class TestSpans:
+    def test_timed_is_a_passthrough_when_disabled(self):
+        @timed("work")
+        def work(x):
+            return x * 2
+
+        assert work(21) == 42
+        assert get_metrics_registry() is None
+
+    def test_timed_and_span_observe_when_enabled(self):
+        registry = init_metrics_registry({"instrumentation": {"enabled": True}})
+
+        @timed("work")
+        def work():
+            raise ValueError("slow failure still counts")
+
+        with pytest.raises(ValueError):
+            work()
+        with span("block"):
+            pass
+
+        spans = {row["span"]: row for row in registry.to_dict()["spans"]}
+        assert spans["work"]["count"] == 1
+        assert spans["block"]["count"] == 1
+
+    def test_hot_paths_are_instrumented(self):
+        registry = init_metrics_registry({"instrumentation": {"enabled": True}})
+        from potato.server_utils.html_sanitizer import sanitize_html
+
+        sanitize_html("<b>hi</b>")
+        assert [row["span"] for row in registry.to_dict()["spans"]] == ["sanitize"]
+
+    def test_auto_export_check_is_not_timed_as_an_export(self, tmp_path):
+        """Most saves skip auto-export; only a real export is an ``export`` sample."""
+        from potato.user_state_management import UserStateManager
+
+        registry = init_metrics_registry({"instrumentation": {"enabled": True}})
+        manager = UserStateManager({"output_annotation_dir": str(tmp_path)})
+        manager._maybe_auto_export()
+        assert registry.to_dict()["spans"] == []
+
+        manager._run_auto_export()  # nothing annotated yet, so it exports nothing
+        assert [row["span"] for row in registry.to_dict()["spans"]] == ["export"]
+
+
+class TestExport:
+    def _registry(self):
+        registry = MetricsRegistry(InstrumentationConfig(enabled=True,
+                                                         buckets_ms=(10, 100)))
+        registry.observe_request("GET", "/annotate", 200, 0.005)
+        registry.observe_request("GET", "/annotate", 200, 0.05)
+        registry.observe_request("POST", "/updateinstance", 500, 0.5)
+        registry.observe_span("save", 0.002)
+        return registry
+
+    def test_json_snapshot(self):
+        data = self._registry().to_dict()
+        annotate = next(r for r in data["routes"] if r["route"] == "/annotate")
+        assert annotate["count"] == 2
+        assert annotate["buckets"] == {"10": 1, "100": 2, "+Inf": 2}
+        assert annotate["status"] == {"200": 2}
+        assert data["spans"][0]["span"] == "save"
+        assert data["profiler"] == {"enabled": False}
+
+    def test_prometheus_text(self):
+        text = self._registry().to_prometheus()
+        assert "# TYPE potato_request_duration_seconds histogram" in text
+        assert ('potato_request_duration_seconds_bucket{method="GET",'
+                'route="/annotate",le="0.01"} 1') in text
+        assert ('potato_request_duration_seconds_bucket{method="POST",'
+                'route="/updateinstance",le="+Inf"} 1') in text
+        assert ('potato_requests_total{method="POST",route="/updateinstance",'
+                'status="500"} 1') in text
+        assert 'potato_span_duration_seconds_count{span="save"} 1' in text
+
+    def test_reset(self):
+        registry = self._registry()
+        registry.reset()
+        data = registry.to_dict()
+        assert data["routes"] == [] and data["spans"] == []
+
+
+class TestRequestHooksAndRoutes:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from potato.instrumentation.hooks import install_request_hooks
+        from potato.instrumentation.routes import instrumentation_bp
+        import potato.server_utils.rbac as rbac
+
+        allowed = {"admin": True}
+
+        class _Manager:
+            def check(self, permission, request, session):
+                return allowed["admin"]
+
+        monkeypatch.setattr(rbac, "get_rbac_manager", lambda: _Manager())
+
+        app = Flask(__name__)
+
+        @app.before_request
+        def short_circuit():
+            from flask import request
+            if request.path == "/redirected":
+                return "login first", 302
+
+        @app.route("/item/<item_id>")
+        def item(item_id):
+            return item_id
+
+        install_request_hooks(app)
+        install_request_hooks(app)  # idempotent
+        app.register_blueprint(instrumentation_bp)
+        init_metrics_registry({"instrumentation": {"enabled": True}})
+        client = app.test_client()
+        client.allowed = allowed
+        return client
+
+    def test_requests_are_observed_by_rule(self, client):
+        client.get("/item/1")
+        client.get("/item/2")
+        client.get("/redirected")
+        client.get("/missing")
+
+        routes = {(r["method"], r["route"]): r
+                  for r in get_metrics_registry().to_dict()["routes"]}
+        assert routes[("GET", "/item/<item_id>")]["count"] == 2
+        assert routes[("GET", "<unmatched>")]["status"] == {"302": 1, "404": 1}
+
+    def test_endpoints(self, client):
+        client.get("/item/1")
+        data = client.get("/admin/metrics").get_json()
+        assert any(r["route"] == "/item/<item_id>" for r in data["routes"])
+
+        text = client.get("/admin/metrics/prometheus")
+        assert text.mimetype == "text/plain"
+        assert "potato_request_duration_seconds_bucket" in text.get_data(as_text=True)
+
+        # Profiler not configured.
+        assert client.get("/admin/metrics/profile").status_code == 400
+
+        assert client.post("/admin/metrics/reset").get_json() == {"status": "reset"}
+
+    def test_endpoints_are_admin_only(self, client):
+        client.allowed["admin"] = False
+        assert client.get("/admin/metrics").status_code == 403
+        assert client.get("/admin/metrics/prometheus").status_code == 403
+
+    def test_disabled_reports_not_enabled(self, client):
+        clear_metrics_registry()
+        assert client.get("/admin/metrics").status_code == 400
+        # Hooks stay installed but record nothing without a registry.
+        assert client.get("/item/1").status_code == 200
+
+
+class TestSamplingProfiler:
+    def test_collapsed_stacks_name_the_busy_function(self):
+        stop = threading.Event()
+
+        def busy_loop_for_profiler_test():
+            while not stop.is_set():
+                sum(range(200))
+
+        thread = threading.Thread(target=busy_loop_for_profiler_test)
+        thread.start()
+        profiler = SamplingProfiler(interval_s=0.001)
+        try:
+            for _ in range(20):
+                profiler.sample()
+        finally:
+            stop.set()
+            thread.join()
+
+        lines = profiler.collapsed().splitlines()
+        assert profiler.samples == 20
+        busy = [line for line in lines if "busy_loop_for_profiler_test" in line]
+        assert busy
+        stack, count = busy[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.split(";")[0].startswith("threading:")
+
+    def test_distinct_stacks_are_capped(self):
+        profiler = SamplingProfiler(max_stacks=1)
+        profiler.sample()
+        profiler.sample()
+        text = profiler.collapsed()
+        # The main thread plus pytest's own threads exceed one stack.
+        assert len(text.splitlines()) <= 2
+        if len(text.splitlines()) == 2:
+            assert TRUNCATED in text
+
+    def test_background_thread_and_dump(self, tmp_path):
+        output = tmp_path / "profile.collapsed"
+        registry = init_metrics_registry({"instrumentation": {
+            "enabled": True,
+            "profiler": {"enabled": True, "interval_ms": 1, "output": str(output)},
+        }})
+        time.sleep(0.05)
+        assert registry.profiler.running
+        assert registry.to_dict()["profiler"]["samples"] > 0
+        clear_metrics_registry()
+        assert not registry.profiler.running
+        assert output.read_text().strip()
@@ -0,0 +1,97 @@
+"""
+Tests for the single-pass keyword highlight matcher.
+
+KeywordMatcher must return exactly what running each lexicon term's regex
+over the text in turn returned: the same spans, in the same order, because
+get_keyword_highlights() applies its seeded random filter in that order.
+"""
+
+import random
+import re
+
+import pytest
+
+from potato.server_utils.keyword_matcher import (
+    KeywordMatcher,
+    compile_keyword_pattern,
+    fold_case,
+    get_keyword_matcher,
+)
+
+
+def _lexicon(terms):
+    return [{"pattern": t, "regex": compile_keyword_pattern(t), "label": "L", "schema": "S"}
+            for t in terms]
+
+
+def _reference(patterns, text):
+    """The per-pattern loop get_keyword_highlights() used to run."""
+    return [(i, m.start(), m.end())
+            for i, p in enumerate(patterns) for m in p["regex"].finditer(text)]
+
+
+class TestCompile:
+    @pytest.mark.parametrize("term,text,expected", [
+        ("tax", "Tax taxes syntax", ["Tax"]),
+        ("tax*", "Tax taxes syntax", ["Tax", "taxes"]),
+        ("*tax", "Tax taxes syntax", ["Tax", "syntax"]),
+        ("t*x", "Tax taxes t-x", ["Tax"]),
+        ("New York", "new york, New Yorker", ["new york"]),
+    ])
+    def test_wildcards_and_boundaries(self, term, text, expected):
+        assert [m.group() for m in compile_keyword_pattern(term).finditer(text)] == expected
+
+
+class TestMatcher:
+    def test_matches_per_pattern_scan(self):
+        terms = ["tax", "tax*", "*tax", "t*x", "syn*", "a-a", "aa", "new york", "*", "x*y*",
+                 "ſtraße", "ΣΟΦΙΑ", "İstanbul", "economy", "econom*", "job", "jobs"]
+        patterns = _lexicon(terms)
+        matcher = KeywordMatcher(patterns)
+        texts = [
+            "Tax taxes syntax; TAXATION and t-x. a-a-a aaa aa",
+            "New York, new  york, NEW YORK city",
+            "Straße STRASSE ſtraße σοφια ΣΟΦΙΑς sofia",
+            "İstanbul istanbul ISTANBUL",
+            "The economy, economic jobs, jobseekers and job.",
+            "",
+        ]
+        for text in texts:
+            assert matcher.find(text) == _reference(patterns, text), text
+
+    def test_random_lexicon_and_text(self):
+        rng = random.Random(3)
+        alphabet = "abcAB -'é_1"
+        words = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).strip() or "a"
+                 for _ in range(150)]
+        terms = []
+        for word in words:
+            shape = rng.random()
+            terms.append(word + "*" if shape < 0.3 else "*" + word if shape < 0.45
+                         else word[:1] + "*" + word[1:] if shape < 0.55 else word)
+        patterns = _lexicon(terms)
+        matcher = KeywordMatcher(patterns)
+        for _ in range(30):
+            text = "".join(rng.choice(alphabet) for _ in range(300))
+            assert matcher.find(text) == _reference(patterns, text)
+
+    def test_fold_keeps_length(self):
+        text = "İstanbul ΣΟΦΙΑΣ ſ"
+        assert len(fold_case(text)) == len(text)
+        assert fold_case("ſ") == fold_case("S")
+
+    def test_cache_is_per_instance_and_checks_text(self):
+        matcher = KeywordMatcher(_lexicon(["tax"]))
+        first = matcher.find_cached("i1", "tax")
+        assert matcher.find_cached("i1", "tax") is first
+        assert matcher.find_cached("i1", "no match") == []
+
+    def test_shared_matcher_follows_the_lexicon(self):
+        patterns = _lexicon(["tax"])
+        matcher = get_keyword_matcher(patterns)
+        assert get_keyword_matcher(patterns) is matcher
+        patterns.clear()
+        patterns.extend(_lexicon(["job"]))
+        rebuilt = get_keyword_matcher(patterns)
+        assert rebuilt is not matcher
+        assert rebuilt.find("a job") == [(0, 2, 5)]
@@ -0,0 +1,170 @@
+"""
+The MediaCache index: accounting and eviction without directory scans.
+
+``total_bytes`` and ``prune`` read a SQLite index instead of stat-ing every
+entry, hits are recorded in batches rather than by ``os.utime``, and eviction
+runs on a background thread. These tests pin down that the index agrees with
+the directory, survives a restart, and that the hot paths never list it.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from potato.media import cache as cache_module
+from potato.media.cache import INDEX_FILENAME, MediaCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = MediaCache(str(tmp_path), max_bytes=1000)
+    c.ensure_dir()
+    yield c
+    c.close()
+
+
+def write_entry(cache, name, size):
+    path = cache.root / name
+    path.write_bytes(b"x" * size)
+    cache.add(path)
+    return path
+
+
+def no_scans(monkeypatch):
+    def refuse(self):
+        raise AssertionError("the cache directory must not be listed")
+    monkeypatch.setattr(Path, "iterdir", refuse)
+
+
+class TestAccounting:
+    def test_total_follows_adds_rewrites_and_clears(self, cache, monkeypatch):
+        cache.total_bytes()  # build the (empty) index
+        no_scans(monkeypatch)
+        write_entry(cache, "a.webp", 100)
+        write_entry(cache, "b.webp", 250)
+        assert cache.total_bytes() == 350
+        write_entry(cache, "a.webp", 40)
+        assert cache.total_bytes() == 290, "a rewrite replaces the old size"
+        monkeypatch.undo()
+        cache.clear()
+        assert cache.total_bytes() == 0
+
+    def test_the_index_is_never_an_entry(self, cache):
+        write_entry(cache, "a.webp", 10)
+        assert (cache.root / INDEX_FILENAME).exists()
+        assert cache.clear() == 1
+        assert (cache.root / INDEX_FILENAME).exists()
+
+    def test_an_existing_directory_is_indexed_once(self, tmp_path):
+        root = tmp_path / ".media_cache"
+        root.mkdir()
+        for i in range(3):
+            (root / f"e{i}.webp").write_bytes(b"x" * 100)
+        first = MediaCache(str(tmp_path))
+        assert first.total_bytes() == 300
+        first.close()
+
+        (root / "by-hand.webp").write_bytes(b"x" * 5)
+        second = MediaCache(str(tmp_path))
+        assert second.total_bytes() == 300, "a persisted index is not rebuilt"
+        assert second.rescan() == 4
+        assert second.total_bytes() == 305
+        second.close()
+
+
+class TestEviction:
+    def test_prune_follows_recorded_accesses(self, cache, monkeypatch):
+        cache.max_bytes = 10_000  # keep the background pruner out of it
+        for i in range(4):
+            write_entry(cache, f"e{i}.webp", 300)
+        # Older first: a hit on e0 makes it the most recently used.
+        cache.touch(cache.root / "e0.webp")
+        cache.max_bytes = 700
+        no_scans(monkeypatch)
+        assert cache.prune() == 2
+        monkeypatch.undo()
+        remaining = sorted(p.name for p in cache.root.glob("*.webp"))
+        assert remaining == ["e0.webp", "e3.webp"]
+        assert cache.total_bytes() == 600
+
+    def test_hits_are_batched_not_written_per_request(self, cache, monkeypatch):
+        entry = write_entry(cache, "a.webp", 10)
+        utimes = []
+        monkeypatch.setattr(os, "utime", lambda *a, **k: utimes.append(a))
+        for _ in range(50):
+            cache.touch(entry)
+        assert not utimes
+        assert cache.flush() == 1, "fifty hits on one entry are one write"
+
+    def test_an_entry_deleted_by_hand_still_leaves_the_index(self, cache):
+        cache.max_bytes = 10_000
+        write_entry(cache, "gone.webp", 800).unlink()
+        write_entry(cache, "kept.webp", 800)
+        cache.max_bytes = 1000
+        assert cache.prune() == 1
+        assert cache.total_bytes() == 800
+
+    def test_the_background_pruner_evicts_after_an_add(self, cache):
+        write_entry(cache, "old.webp", 600)
+        time.sleep(0.01)
+        write_entry(cache, "new.webp", 600)
+        deadline = time.time() + 10
+        while cache.total_bytes() > cache.max_bytes and time.time() < deadline:
+            time.sleep(0.02)
+        assert cache.total_bytes() == 600
+        assert not (cache.root / "old.webp").exists()
+        assert (cache.root / "new.webp").exists()
+
+
+class TestTileLevels:
+    @pytest.fixture
+    def source(self, tmp_path):
+        from PIL import Image
+
+        path = tmp_path / "big.png"
+        Image.effect_noise((600, 400), 64).convert("RGB").save(path)
+        return path
+
+    def _level(self, cache, source, level):
+        from potato.media import tiles
+
+        spec = tiles.describe(str(source))
+        directory = tiles.ensure_level(cache.root, source, spec, level)
+        cache.add(directory)
+        return directory
+
+    def test_a_level_is_one_entry_sized_by_its_tiles(self, cache, source):
+        cache.max_bytes = 10 ** 9
+        directory = self._level(cache, source, 9)
+        size = sum(p.stat().st_size for p in directory.iterdir())
+        assert cache.total_bytes() == size
+        assert cache.rescan() == 1
+        assert cache.total_bytes() == size
+
+    def test_the_byte_budget_evicts_tile_levels(self, cache, source):
+        cache.max_bytes = 10 ** 9
+        old = self._level(cache, source, 9)
+        time.sleep(0.01)
+        new = self._level(cache, source, 10)
+        new_size = sum(p.stat().st_size for p in new.iterdir())
+
+        cache.max_bytes = new_size
+        assert cache.prune() == 1
+        assert not old.exists()
+        assert new.exists()
+        assert cache.total_bytes() == new_size
+        assert cache.clear() == 1
+        assert not list(cache.root.glob("*_files"))
+
+
+class TestSingleton:
+    def test_a_relative_output_dir_reuses_the_cache(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        cache_module.clear_media_cache()
+        try:
+            first = cache_module.get_media_cache("out")
+            assert cache_module.get_media_cache("out") is first
+        finally:
+            cache_module.clear_media_cache()
@@ -194,8 +194,10 @@ class TestCliWiring:
         It takes a model name, not a config file, so the server's own parser
         would reject it. Same pattern as `import` and `transcripts`.
         """
-        source = Path("potato/flask_server.py").read_text()
-        assert "'download-models'" in source
+        from potato import cli
+
+        assert cli.SUBCOMMANDS["download-models"] is cli._download_models
+        source = Path("potato/cli.py").read_text()
         assert "from potato.models_cli import main as models_main" in source
 
     def test_importing_the_cli_pulls_in_no_ml_stack(self):
@@ -0,0 +1,151 @@
+"""
+The NumPy fast paths in ``potato.media.pointcloud`` against the Python ones.
+
+The pure-Python readers are the reference. Each test reads the same bytes
+twice -- once as shipped, once with ``_numpy`` patched to return None -- and
+requires the served ``PNT1`` buffers to be identical, byte for byte. The
+fixtures lean on the awkward corners: repeated field names, NaN and signed
+zeros in the bounds, a truncated body, 16-bit LAS colour next to 8-bit.
+"""
+
+import math
+import random
+import struct
+from array import array
+
+import pytest
+
+import potato.media.pointcloud as pc
+from potato.media.pointcloud import PointCloud, decimate, read_point_cloud, to_wire
+
+
+def _both(monkeypatch, fn):
+    """``fn()`` with the fast paths, then with the pure-Python paths."""
+    fast = fn()
+    with monkeypatch.context() as m:
+        m.setattr(pc, "_numpy", lambda: None)
+        slow = fn()
+    return fast, slow
+
+
+def _assert_same_wire(monkeypatch, path, max_points=pc.DEFAULT_MAX_POINTS):
+    fast, slow = _both(monkeypatch,
+                       lambda: to_wire(read_point_cloud(path, max_points=max_points)))
+    assert fast == slow
+
+
+def _points(rng, n):
+    special = [0.0, -0.0, 1e-30, -5.5, 2.5, 0.5, 1.5, float("nan")]
+    return [tuple(rng.choice(special) if rng.random() < 0.05 else rng.uniform(-50, 50)
+                  for _ in range(3)) for _ in range(n)]
+
+
+@pytest.fixture
+def rng():
+    return random.Random(11)
+
+
+class TestReaders:
+    def test_pcd_ascii_with_repeated_and_multi_count_fields(self, tmp_path, monkeypatch, rng):
+        header = ("VERSION 0.7\nFIELDS x y z _ _ normal intensity\nSIZE 4 4 4 4 4 4 4\n"
+                  "TYPE F F F F F F F\nCOUNT 1 1 1 1 1 3 1\nPOINTS 300\nDATA ascii\n")
+        rows = [" ".join(repr(v) for v in p + (rng.random(), rng.random(), 0.1, 0.2, 0.3,
+                                                   rng.uniform(0, 2)))
+                for p in _points(rng, 320)]
+        path = tmp_path / "a.pcd"
+        path.write_text(header + "\n".join(rows) + "\n")
+        _assert_same_wire(monkeypatch, str(path))
+        _assert_same_wire(monkeypatch, str(path), max_points=97)
+
+    def test_pcd_ascii_ragged_and_bad_tokens_fall_back(self, tmp_path, monkeypatch):
+        header = ("VERSION 0.7\nFIELDS x y z\nSIZE 4 4 4\nTYPE F F F\nCOUNT 1 1 1\n"
+                  "POINTS 5\nDATA ascii\n")
+        path = tmp_path / "a.pcd"
+        path.write_text(header + "1 2 3\n4 5\n6 x 8 9\n\r\n1e500 -0.0 nan\n")
+        _assert_same_wire(monkeypatch, str(path))
+
+    def test_pcd_binary_with_colour_fields_and_truncation(self, tmp_path, monkeypatch, rng):
+        n = 500
+        header = ("VERSION 0.7\nFIELDS x y z red green blue label\nSIZE 4 4 8 1 1 1 4\n"
+                  f"TYPE F F F U U U I\nCOUNT 1 1 1 1 1 1 1\nPOINTS {n}\nDATA binary\n")
+        body = b"".join(struct.pack("<ffdBBBi", *p, rng.randrange(256), rng.randrange(256),
+                                    rng.randrange(256), rng.randrange(-9, 9))
+                        for p in _points(rng, n))
+        path = tmp_path / "a.pcd"
+        path.write_bytes(header.encode() + body[:-30])
+        _assert_same_wire(monkeypatch, str(path))
+
+    @pytest.mark.parametrize("big_endian", [False, True])
+    def test_ply_binary_after_another_element(self, tmp_path, monkeypatch, rng, big_endian):
+        order = ">" if big_endian else "<"
+        n = 400
+        header = ("ply\nformat binary_%s_endian 1.0\nelement camera 2\nproperty double f\n"
+                  "element vertex %d\nproperty float x\nproperty float y\nproperty double z\n"
+                  "property float red\nproperty float green\nproperty float blue\n"
+                  "property ushort intensity\nend_header\n"
+                  % ("big" if big_endian else "little", n))
+        body = struct.pack(order + "2d", 1.0, 2.0) + b"".join(
+            struct.pack(order + "ffdfffH", *p, rng.random(), rng.random(), 0.5,
+                        rng.randrange(65536))
+            for p in _points(rng, n))
+        path = tmp_path / "a.ply"
+        path.write_bytes(header.encode() + body)
+        _assert_same_wire(monkeypatch, str(path))
+        _assert_same_wire(monkeypatch, str(path), max_points=33)
+
+    def test_kitti_bin(self, tmp_path, monkeypatch, rng):
+        path = tmp_path / "scan.bin"
+        path.write_bytes(b"".join(struct.pack("<4f", *p, rng.random())
+                                  for p in _points(rng, 1000)))
+        _assert_same_wire(monkeypatch, str(path))
+        _assert_same_wire(monkeypatch, str(path), max_points=300)
+
+    @pytest.mark.parametrize("point_format,record_len,color_at",
+                             [(1, 28, None), (2, 26, 20), (3, 34, 28)])
+    def test_las(self, tmp_path, monkeypatch, rng, point_format, record_len, color_at):
+        header = bytearray(227)
+        header[0:4] = b"LASF"
+        struct.pack_into("<H", header, 94, 227)
+        struct.pack_into("<I", header, 96, 227)
+        struct.pack_into("<B", header, 104, point_format)
+        struct.pack_into("<H", header, 105, record_len)
+        struct.pack_into("<I", header, 107, 600)
+        struct.pack_into("<3d", header, 131, 0.01, 0.001, 0.003)
+        struct.pack_into("<3d", header, 155, 4500.25, -12.5, 0.0)
+        body = bytearray()
+        for _ in range(600):
+            rec = bytearray(record_len)
+            struct.pack_into("<3iH", rec, 0, *(rng.randrange(-2**31, 2**31) for _ in range(3)),
+                             rng.randrange(65536))
+            if color_at is not None:
+                limit = 65536 if rng.random() < 0.5 else 256
+                struct.pack_into("<3H", rec, color_at, *(rng.randrange(limit) for _ in range(3)))
+            body += rec
+        path = tmp_path / "a.las"
+        path.write_bytes(bytes(header) + bytes(body))
+        _assert_same_wire(monkeypatch, str(path))
+
+
+class TestBoundsAndDecimation:
+    def test_bounds_follow_the_comparison_loop(self, monkeypatch):
+        nan, inf = float("nan"), float("inf")
+        cloud = PointCloud(positions=array("f", [
+            nan, 0.0, -0.0,
+            nan, -0.0, 0.0,
+            nan, 3.0, 0.0,
+        ]))
+        fast, slow = _both(monkeypatch, cloud.bounds)
+        assert [[math.copysign(1, v) if v == 0 else v for v in row] for row in fast] == \
+            [[math.copysign(1, v) if v == 0 else v for v in row] for row in slow]
+        assert fast[0][0] == inf and fast[1][0] == -inf
+        assert to_wire(cloud) == _both(monkeypatch, lambda: to_wire(cloud))[1]
+
+    def test_decimation_composes_indices(self, monkeypatch, rng):
+        n = 1001
+        cloud = PointCloud(
+            positions=array("f", [rng.uniform(-1, 1) for _ in range(3 * n)]),
+            colors=bytearray(rng.randrange(256) for _ in range(3 * n)),
+            intensity=array("f", [rng.random() for _ in range(n)]),
+            original_count=n)
+        fast, slow = _both(monkeypatch, lambda: to_wire(decimate(decimate(cloud, 400), 150)))
+        assert fast == slow
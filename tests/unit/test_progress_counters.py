@@ -0,0 +1,153 @@
+"""
+Tests for the running progress counters behind compute_project_progress().
+
+The admin overview and /progress/api/summary used to walk every user and
+every item on each request. They now read counters kept by the managers, so
+these tests check two things: the counters agree with a full walk after the
+operations that change them, and a summary only recounts users that changed.
+"""
+
+import pytest
+
+from potato.item_state_management import Label
+from potato.phase import UserPhase
+from potato.server_utils import progress_stats
+from potato.server_utils.progress_stats import (
+    ItemProgressCounters,
+    compute_project_progress,
+    recompute_progress_counters,
+)
+
+
+@pytest.fixture
+def project(monkeypatch, tmp_path):
+    """Four items and two annotators, with the managers restored afterwards."""
+    from potato.server_utils.config_module import config
+    import potato.item_state_management as ism_mod
+    import potato.user_state_management as usm_mod
+
+    saved_config = dict(config)
+    saved_ism = ism_mod.ITEM_STATE_MANAGER
+    saved_usm = usm_mod.USER_STATE_MANAGER
+
+    config.update({
+        "task_dir": str(tmp_path),
+        "output_annotation_dir": str(tmp_path),
+        "item_properties": {"id_key": "id", "text_key": "text"},
+        "annotation_task_name": "progress",
+        "annotation_schemes": [],
+    })
+    ism_mod.ITEM_STATE_MANAGER = None
+    usm_mod.USER_STATE_MANAGER = None
+
+    ism = ism_mod.init_item_state_manager(config)
+    ism.add_items({str(i): {"id": str(i), "text": f"item {i}"} for i in range(4)})
+    usm = usm_mod.init_user_state_manager(config)
+    for uid in ("ann_a", "ann_b"):
+        usm.add_user(uid).current_phase_and_page = (UserPhase.ANNOTATION, "annotation")
+
+    # Start every test with the periodic recompute just done.
+    monkeypatch.setattr(progress_stats, "_last_full_recompute", None)
+    compute_project_progress()
+
+    yield ism, usm
+
+    config.clear()
+    config.update(saved_config)
+    ism_mod.ITEM_STATE_MANAGER = saved_ism
+    usm_mod.USER_STATE_MANAGER = saved_usm
+
+
+def _annotate(usm, ism, user_id, instance_id):
+    state = usm.get_user_state(user_id)
+    state.add_label_annotation(instance_id, Label(schema="s", name="x"), True)
+    ism.register_annotator(instance_id, user_id)
+    usm.save_user_state(state)
+
+
+class TestItemCounters:
+    def test_first_and_last_annotator_move_items_with_annotations(self):
+        counters = ItemProgressCounters()
+        counters.annotator_added(first_for_item=True)
+        counters.annotator_added(first_for_item=False)
+        counters.annotator_removed(last_for_item=False)
+        assert counters.snapshot() == (1, 1)
+        counters.annotator_removed(last_for_item=True)
+        assert counters.snapshot() == (0, 0)
+
+    def test_registration_and_reclaim_keep_counters_exact(self, project):
+        ism, usm = project
+        ism.register_annotator("0", "ann_a")
+        ism.register_annotator("0", "ann_a")  # repeat registration is not a new pair
+        ism.register_annotator("0", "ann_b")
+        ism.register_annotator("1", "ann_b")
+        assert ism.progress_counters.snapshot() == (2, 3)
+
+        state = usm.get_user_state("ann_b")
+        state.assign_instance(ism.get_item("1"))
+        assert ism._reclaim_unannotated_assignment(state, "1")
+        assert ism.progress_counters.snapshot() == (1, 2)
+        assert recompute_progress_counters(usm, ism) == {}
+
+    def test_clear_resets_counters(self, project):
+        ism, _ = project
+        ism.register_annotator("0", "ann_a")
+        ism.clear()
+        assert ism.progress_counters.snapshot() == (0, 0)
+
+
+class TestProjectProgress:
+    def test_summary_matches_a_full_walk(self, project):
+        ism, usm = project
+        _annotate(usm, ism, "ann_a", "0")
+        _annotate(usm, ism, "ann_a", "1")
+        _annotate(usm, ism, "ann_b", "1")
+        usm.add_user("ann_c")  # still in LOGIN, not an active annotator
+
+        progress = compute_project_progress()
+        assert progress == {
+            "total_items": 4,
+            "items_with_annotations": 2,
+            "completion_percentage": 50.0,
+            "total_annotations": 3,
+            "active_annotators": 2,
+            "total_assignments": 3,
+        }
+        assert recompute_progress_counters(usm, ism) == {}
+
+    def test_summary_recounts_only_changed_users(self, project, monkeypatch):
+        ism, usm = project
+        for n in range(20):
+            usm.add_user(f"idle_{n}")
+        compute_project_progress()
+
+        counted = []
+        for user_id, state in usm.user_to_annotation_state.items():
+            original = state.get_annotation_count
+            monkeypatch.setattr(
+                state, "get_annotation_count",
+                lambda original=original, user_id=user_id: counted.append(user_id) or original(),
+            )
+
+        _annotate(usm, ism, "ann_a", "2")
+        assert compute_project_progress()["total_annotations"] == 1
+        assert counted == ["ann_a"]
+
+    def test_phase_change_through_the_manager_updates_active_count(self, project):
+        _, usm = project
+        state = usm.get_user_state("ann_b")
+        state.current_phase_and_page = (UserPhase.DONE, "done")
+        usm.save_user_state(state)
+        assert compute_project_progress()["active_annotators"] == 1
+
+    def test_periodic_recompute_repairs_and_reports_drift(self, project, monkeypatch, caplog):
+        ism, usm = project
+        # A write that bypasses register_annotator() is invisible to the counters...
+        ism.instance_annotators["3"].add("ann_a")
+        assert compute_project_progress()["items_with_annotations"] == 0
+
+        # ...until the next full recompute, which fixes them and says so.
+        monkeypatch.setattr(progress_stats, "FULL_RECOMPUTE_INTERVAL_SECONDS", 0.0)
+        with caplog.at_level("WARNING", logger=progress_stats.__name__):
+            assert compute_project_progress()["items_with_annotations"] == 1
+        assert "drifted" in caplog.text
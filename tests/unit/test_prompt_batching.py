@@ -0,0 +1,264 @@
+"""
+Tests for multi-item prompt batching (potato/ai/prompt_batching.py).
+
+The Solo Mode labeler, the LLM judge and the ICL labeler can pack several
+instances into one request. These tests check that each packs the right
+number of items per request, maps answers back by number, and falls back to
+single-item requests for anything the batched response misses or garbles.
+No network: endpoints are stubs that answer from the prompt.
+"""
+
+import json
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from potato.ai.prompt_batching import chunked, format_numbered_items, parse_batch_response
+
+SCHEMES = [{'name': 'sentiment', 'annotation_type': 'radio',
+            'labels': ['positive', 'negative']}]
+
+
+class BatchAwareEndpoint:
+    """Labels every numbered item in a batched prompt, or the single text otherwise.
+
+    ``drop`` lists item numbers left out of batched answers; ``garble`` makes
+    batched answers unparseable.
+    """
+
+    model = 'stub'
+
+    def __init__(self, label='positive', confidence=90, drop=(), garble=False):
+        self.label = label
+        self.confidence = confidence
+        self.drop = set(drop)
+        self.garble = garble
+        self.prompts = []
+
+    def query(self, prompt, output_format=None):
+        self.prompts.append(prompt)
+        numbers = [int(n) for n in re.findall(r'^\[(\d+)\]$', prompt, flags=re.M)]
+        if not numbers:
+            return json.dumps({'label': self.label, 'confidence': self.confidence,
+                               'reasoning': 'single'})
+        if self.garble:
+            return "I could not follow the format, sorry."
+        return json.dumps({'items': [
+            {'id': n, 'label': self.label, 'confidence': self.confidence, 'reasoning': 'batch'}
+            for n in numbers if n not in self.drop
+        ]})
+
+    @property
+    def batched_requests(self):
+        return sum(1 for p in self.prompts if re.search(r'^\[2\]$', p, flags=re.M))
+
+
+class PrefixedEndpoint(BatchAwareEndpoint):
+    """Answers behind a prefix only the endpoint's own parser strips."""
+
+    def query(self, prompt, output_format=None):
+        return "ANSWER: " + super().query(prompt, output_format)
+
+    def parseStringToJson(self, text):
+        return json.loads(text[len("ANSWER: "):])
+
+
+class TestHelpers:
+    def test_chunked(self):
+        assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+    def test_numbered_items(self):
+        assert format_numbered_items(['a', 'b']) == "[1]\na\n\n[2]\nb"
+
+    def test_parse_maps_by_id_and_drops_strays(self):
+        raw = '```json\n{"items": [{"id": 2, "label": "b"}, {"id": 1, "label": "a"}, ' \
+              '{"id": 9, "label": "x"}, {"id": 1, "label": "dup"}]}\n```'
+        assert parse_batch_response(raw, 2) == {1: {'id': 1, 'label': 'a'},
+                                                2: {'id': 2, 'label': 'b'}}
+
+    def test_parse_bare_list_uses_position(self):
+        assert parse_batch_response([{'label': 'a'}, {'label': 'b'}], 2)[2] == {'label': 'b'}
+
+    def test_parse_failure_is_empty(self):
+        assert parse_batch_response("not json", 3) == {}
+        assert parse_batch_response({'label': 'a'}, 1) == {}
+
+
+class TestSoloLabelerBatching:
+    def _thread(self, batch_size):
+        from potato.solo_mode.config import parse_solo_mode_config
+        from potato.solo_mode.llm_labeler import LLMLabelingThread
+        solo_config = parse_solo_mode_config({
+            'solo_mode': {'enabled': True, 'labeling_models': [],
+                          'batches': {'prompt_batch_size': batch_size},
+                          'uncertainty': {'strategy': 'direct_confidence'}},
+            'annotation_schemes': SCHEMES,
+        })
+        thread = LLMLabelingThread(
+            config={'annotation_schemes': SCHEMES}, solo_config=solo_config,
+            prompt_getter=lambda: "Classify the sentiment.", result_callback=lambda r: None,
+        )
+        thread._uncertainty_estimator = MagicMock(
+            estimate_uncertainty=MagicMock(side_effect=RuntimeError("no estimator")))
+        return thread
+
+    def _items(self, n):
+        return [{'instance_id': f'i{k}', 'text': f'text {k}'} for k in range(n)]
+
+    def test_packs_items_per_request(self):
+        thread = self._thread(4)
+        endpoint = BatchAwareEndpoint()
+        results = thread._label_instances(self._items(10), 'sentiment', endpoint=endpoint)
+        assert [r.instance_id for r in results] == [f'i{k}' for k in range(10)]
+        assert all(r.label == 'positive' and r.error is None for r in results)
+        assert len(endpoint.prompts) == 3  # 4 + 4 + 2
+        assert endpoint.prompts[0].count('Classify the sentiment.') == 1
+
+    def test_missing_answers_fall_back_to_single_requests(self):
+        thread = self._thread(4)
+        endpoint = BatchAwareEndpoint(drop={2})
+        results = thread._label_instances(self._items(4), 'sentiment', endpoint=endpoint)
+        assert all(r.label == 'positive' for r in results)
+        assert len(endpoint.prompts) == 2
+        assert 'text 1' in endpoint.prompts[1] and '[1]' not in endpoint.prompts[1]
+
+    def test_unparseable_batch_labels_every_item_alone(self):
+        thread = self._thread(3)
+        endpoint = BatchAwareEndpoint(garble=True)
+        results = thread._label_instances(self._items(3), 'sentiment', endpoint=endpoint)
+        assert all(r.label == 'positive' for r in results)
+        assert len(endpoint.prompts) == 4
+
+    def test_batch_uses_the_endpoint_parser(self):
+        thread = self._thread(4)
+        endpoint = PrefixedEndpoint()
+        results = thread._label_instances(self._items(4), 'sentiment', endpoint=endpoint)
+        assert all(r.label == 'positive' for r in results)
+        assert len(endpoint.prompts) == 1
+
+    def test_batch_size_one_is_unchanged(self):
+        thread = self._thread(1)
+        endpoint = BatchAwareEndpoint()
+        thread._label_instances(self._items(3), 'sentiment', endpoint=endpoint)
+        assert len(endpoint.prompts) == 3 and endpoint.batched_requests == 0
+
+    def test_manager_uses_prompt_batches(self, tmp_path):
+        from potato.solo_mode.config import parse_solo_mode_config
+        from potato.solo_mode.manager import SoloModeManager
+        solo_config = parse_solo_mode_config({
+            'solo_mode': {'enabled': True, 'labeling_models': [],
+                          'batches': {'prompt_batch_size': 5}},
+            'annotation_schemes': SCHEMES,
+            'output_annotation_dir': str(tmp_path),
+        })
+        manager = SoloModeManager(solo_config, {'annotation_schemes': SCHEMES})
+        manager.get_current_prompt_text = lambda: "Classify the sentiment."
+        endpoint = BatchAwareEndpoint()
+        manager.llm_labeling_thread._get_endpoint = lambda: endpoint
+        manager.llm_labeling_thread._uncertainty_estimator = MagicMock(
+            estimate_uncertainty=MagicMock(side_effect=RuntimeError("no estimator")))
+
+        ism = MagicMock()
+        ism.instance_id_ordering = [f'i{k}' for k in range(10)]
+        ism.get_item_by_id.return_value = {'text': 'test text'}
+        with patch('potato.item_state_management.get_item_state_manager', return_value=ism):
+            assert manager._label_batch(10) == 10
+        assert len(endpoint.prompts) == 2
+
+
+RADIO = {"annotation_type": "radio", "name": "verdict", "description": "Did it work?",
+         "labels": [{"name": "success"}, {"name": "failure"}]}
+
+
+class TestJudgeBatching:
+    def _service(self, endpoint, batch_size):
+        from potato.ai.judge import JudgeService
+        svc = JudgeService({"judge_alignment": {"batch_size": batch_size}})
+        svc._endpoint, svc._endpoint_initialized = endpoint, True
+        return svc
+
+    def test_batched_verdicts_and_leakage_guard(self):
+        endpoint = BatchAwareEndpoint(label='success', confidence=0.8)
+        svc = self._service(endpoint, 3)
+        examples = [{"id": "a", "text": "EXAMPLE-A", "label": "success"},
+                    {"id": "z", "text": "EXAMPLE-Z", "label": "failure"}]
+        preds = svc.judge_instances([("a", "one"), ("b", "two"), ("c", "three")], RADIO,
+                                    few_shot_examples=examples)
+        assert [p.instance_id for p in preds] == ["a", "b", "c"]
+        assert all(p.predicted_label == "success" and p.confidence == 0.8 for p in preds)
+        assert len(endpoint.prompts) == 1
+        # The example for an item in this request is never shown.
+        assert "EXAMPLE-A" not in endpoint.prompts[0] and "EXAMPLE-Z" in endpoint.prompts[0]
+        assert preds[0].examples_used == ["z"]
+
+    def test_invalid_batched_label_is_rejudged_alone(self):
+        endpoint = BatchAwareEndpoint(label='success', confidence=0.8)
+        svc = self._service(endpoint, 2)
+        original = endpoint.query
+
+        def query(prompt, output_format=None):
+            raw = original(prompt, output_format)
+            return raw.replace('"id": 2, "label": "success"', '"id": 2, "label": "maybe"')
+
+        endpoint.query = query
+        preds = svc.judge_instances([("a", "one"), ("b", "two")], RADIO)
+        assert [p.predicted_label for p in preds] == ["success", "success"]
+        assert len(endpoint.prompts) == 2
+
+    def test_run_judge_batch_uses_batches(self, monkeypatch):
+        from potato.server_utils import judge_alignment as ja
+        endpoint = BatchAwareEndpoint(label='failure', confidence=0.6)
+        monkeypatch.setattr("potato.ai.judge.JudgeService._get_endpoint", lambda self: endpoint)
+        monkeypatch.setattr(ja, "judge_scoped_schemas", lambda cfg: [RADIO])
+        monkeypatch.setattr(ja, "annotated_instance_ids", lambda users, name: ["a", "b", "c", "d"])
+        saved = []
+        monkeypatch.setattr(ja, "save_prediction", lambda cfg, pred: saved.append(pred))
+        ism = MagicMock()
+        ism.get_item.return_value.get_text.return_value = "text"
+        with patch("potato.item_state_management.get_item_state_manager", return_value=ism):
+            report = ja.run_judge_batch({"judge_alignment": {"batch_size": 4}}, ["u"])
+        assert report["judged"] == 4
+        assert len(endpoint.prompts) == 1
+
+
+class TestICLBatching:
+    @pytest.fixture
+    def labeler(self):
+        from potato.ai.icl_labeler import HighConfidenceExample, clear_icl_labeler, init_icl_labeler
+        clear_icl_labeler()
+        labeler = init_icl_labeler({
+            'annotation_schemes': SCHEMES,
+            'icl_labeling': {'enabled': True, 'llm_labeling': {'prompt_batch_size': 4},
+                             'verification': {'enabled': False}},
+        })
+        labeler.schema_to_examples['sentiment'] = [
+            HighConfidenceExample(f'ex{i}', f'example {i}', 'sentiment', 'positive', 0.9, 3)
+            for i in range(3)
+        ]
+        yield labeler
+        clear_icl_labeler()
+
+    def test_packs_items_and_stores_predictions(self, labeler):
+        endpoint = BatchAwareEndpoint(confidence=0.9)
+        labeler._ai_endpoint = endpoint
+        items = [(f'i{k}', f'text {k}') for k in range(6)]
+        preds = labeler.label_instances(items, 'sentiment')
+        assert [p.instance_id for p in preds] == [f'i{k}' for k in range(6)]
+        assert len(endpoint.prompts) == 2
+        assert endpoint.prompts[0].count('example 0') == 1
+        assert labeler.labeled_instance_ids == {f'i{k}' for k in range(6)}
+
+    def test_batch_uses_the_endpoint_parser(self, labeler):
+        endpoint = PrefixedEndpoint(confidence=0.9)
+        labeler._ai_endpoint = endpoint
+        preds = labeler.label_instances([('a', 'one'), ('b', 'two')], 'sentiment')
+        assert all(p is not None for p in preds)
+        assert len(endpoint.prompts) == 1
+
+    def test_missing_answer_falls_back(self, labeler):
+        endpoint = BatchAwareEndpoint(confidence=0.9, drop={1})
+        labeler._ai_endpoint = endpoint
+        preds = labeler.label_instances([('a', 'one'), ('b', 'two')], 'sentiment')
+        assert all(p is not None for p in preds)
+        assert len(endpoint.prompts) == 2
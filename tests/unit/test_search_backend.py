@@ -93,6 +93,91 @@ class TestFTS5Backend:
         assert be.index(ROWS) == 3
 
 
+class TestIncrementalSync:
+    def test_restart_over_unchanged_rows_writes_nothing(self, td):
+        FTS5Backend(td).index(ROWS)
+        be = FTS5Backend(td)  # a fresh process would build a new backend
+        assert be.index(ROWS) == 3
+        assert be.last_sync == {"added": 0, "updated": 0, "removed": 0, "unchanged": 3}
+        assert {h.instance_id for h in be.query("quick")} == {"1", "3"}
+
+    def test_only_changed_new_and_gone_instances_are_written(self, td):
+        be = FTS5Backend(td)
+        be.index(ROWS)
+        rows = [("1", ROWS[0][1]), ("2", "A white heron"), ("4", "quick new arrival")]
+        assert be.index(rows) == 3
+        assert be.last_sync == {"added": 1, "updated": 1, "removed": 1, "unchanged": 1}
+        assert {h.instance_id for h in be.query("quick")} == {"1", "4"}
+        assert {h.instance_id for h in be.query("heron")} == {"2"}
+        assert be.query("swan") == []
+
+    def test_sync_spanning_several_chunks(self, td, monkeypatch):
+        import potato.search.fts5 as fts5
+        monkeypatch.setattr(fts5, "SYNC_CHUNK", 7)
+        be = FTS5Backend(td)
+        rows = [(str(i), f"doc number{i} common") for i in range(50)]
+        assert be.index(rows) == 50
+        rows[10] = ("10", "changed text")
+        assert be.index(rows[5:]) == 45
+        assert be.last_sync == {"added": 0, "updated": 1, "removed": 5, "unchanged": 44}
+        assert len(be.query("common", limit=100)) == 44
+
+    def test_index_from_before_the_hash_table_is_rebuilt(self, td):
+        from potato.persistence import get_db
+        conn = get_db(td)
+        conn.execute("CREATE VIRTUAL TABLE instance_fts USING fts5(instance_id UNINDEXED, body)")
+        conn.execute("INSERT INTO instance_fts VALUES ('old', 'stale quick text')")
+        be = FTS5Backend(td)
+        assert be.index(ROWS) == 3
+        assert {h.instance_id for h in be.query("quick")} == {"1", "3"}
+
+    def test_upsert_and_remove(self, td):
+        be = FTS5Backend(td)
+        be.index(ROWS)
+        assert be.upsert([("5", "quick silver"), ("2", None), ("1", ROWS[0][1])]) == 2
+        assert {h.instance_id for h in be.query("quick")} == {"1", "3", "5"}
+        assert be.query("swan") == []
+
+    def test_staged_changes_are_visible_to_the_next_query(self, td):
+        be = FTS5Backend(td)
+        be.index(ROWS)
+        be.stage("7", "an okapi in the garden")
+        assert {h.instance_id for h in be.query("okapi")} == {"7"}
+        assert be.flush() == 0
+
+
+class TestLiveItemHooks:
+    @pytest.fixture
+    def ism(self, td):
+        import potato.item_state_management as ism_mod
+        saved = ism_mod.ITEM_STATE_MANAGER
+        ism_mod.ITEM_STATE_MANAGER = None
+        config = {"task_dir": td, "item_properties": {"id_key": "id", "text_key": "text"}}
+        ism = ism_mod.init_item_state_manager(config)
+        ism.add_items({str(i): {"id": str(i), "text": t} for i, t in ROWS})
+        yield ism, config
+        ism_mod.ITEM_STATE_MANAGER = saved
+
+    def test_items_added_and_updated_after_start_are_searchable(self, ism):
+        from potato.search import init_search_from_item_state
+        ism, config = ism
+        be = init_search_from_item_state(config)
+        assert {h.instance_id for h in be.query("quick")} == {"1", "3"}
+
+        ism.add_item("9", {"id": "9", "text": "a quick hedgehog"})
+        ism.update_item("1", {"id": "1", "text": "slow tortoise"})
+        assert {h.instance_id for h in be.query("quick")} == {"3", "9"}
+        assert {h.instance_id for h in be.query("tortoise")} == {"1"}
+
+    def test_the_cap_is_gone_by_default_but_still_honoured(self, ism):
+        from potato.search import init_search_from_item_state
+        ism, config = ism
+        be = init_search_from_item_state(dict(config, search={"max_instances": 2}))
+        assert len(be.query("the", limit=10)) <= 2
+        ism.add_item("9", {"id": "9", "text": "the hedgehog"})
+        assert be.query("hedgehog") == []  # a capped index isn't grown live
+
+
 class TestVectorBackendStub:
     def test_not_available(self):
         assert VectorBackend().available() is False
@@ -103,7 +188,7 @@ class TestService:
         s = search_settings({})
         assert s == {
             "enabled": True, "backend": "fts5",
-            "max_instances": 100000, "annotator_claim": False,
+            "max_instances": None, "annotator_claim": False,
         }
 
     def test_overrides(self):
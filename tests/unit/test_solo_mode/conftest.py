@@ -0,0 +1,17 @@
+"""
+Shared pytest fixtures for the Solo Mode unit tests.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def run_in_tmp_path(monkeypatch, tmp_path):
+    """Run each test from its own temporary directory.
+
+    A Solo Mode config without ``state_dir`` or ``output_annotation_dir``
+    keeps its state under the relative ``annotation_output/.solo_mode``, so
+    a manager built from a bare test config would otherwise write into
+    whatever directory pytest was started from -- usually the repo root.
+    """
+    monkeypatch.chdir(tmp_path)
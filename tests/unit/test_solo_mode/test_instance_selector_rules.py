@@ -1,12 +1,18 @@
 """
 Tests for the edge_case_rule pool, cartography pool, and predictions cache
-in InstanceSelector.
+in InstanceSelector, and for the event-maintained InstancePools.
 """
 
+import random
+
 import pytest
 from unittest.mock import patch
 
-from potato.solo_mode.instance_selector import InstanceSelector, SelectionWeights
+from potato.solo_mode.instance_selector import (
+    InstancePools,
+    InstanceSelector,
+    SelectionWeights,
+)
 
 
 class TestEdgeCaseRulePool:
@@ -433,3 +439,92 @@ class TestCartographyConfigParsing:
         }
         config = parse_solo_mode_config(config_data)
         assert config.instance_selection.cartography_weight == 0.0
+
+
+class TestInstancePools:
+    """InstancePools must hold the same members refresh_pools would build."""
+
+    @staticmethod
+    def _rebuilt(available, confidences, variability, disagreements, edge_ids):
+        selector = InstanceSelector()
+        with patch.object(selector, '_build_diverse_pool', return_value=[]):
+            selector.refresh_pools(
+                available_ids=set(available),
+                llm_predictions={
+                    iid: {'s': {'confidence_score': c}} for iid, c in confidences.items()
+                },
+                disagreement_ids=disagreements,
+                confidence_threshold=0.5,
+                edge_case_rule_ids=edge_ids,
+                cartography_scores=variability,
+            )
+        return selector
+
+    def test_matches_refresh_pools_under_random_events(self):
+        rng = random.Random(7)
+        ids = [f'i{n}' for n in range(200)]
+        pools = InstancePools(0.5)
+        pools.add_instances(ids[:150])
+        confidences, variability = {}, {}
+        labeled, disagreements, edge_ids = set(), set(), set()
+
+        for _ in range(600):
+            iid = rng.choice(ids)
+            event = rng.randrange(5)
+            if event == 0:
+                confidences[iid] = rng.random()
+                pools.update_prediction(iid, confidences[iid])
+            elif event == 1:
+                variability[iid] = rng.choice([0.0, rng.random()])
+                pools.update_variability(iid, variability[iid])
+            elif event == 2:
+                labeled.add(iid)
+                pools.mark_labeled(iid)
+            elif event == 3:
+                disagreements ^= {iid}
+                pools.set_disagreement_ids(disagreements)
+            else:
+                edge_ids ^= {iid}
+                pools.set_edge_case_rule_ids(edge_ids)
+        pools.add_instances(ids[150:])
+
+        available = set(ids) - labeled
+        selector = self._rebuilt(available, confidences, variability,
+                                 disagreements, edge_ids)
+        assert set(pools.available) == available
+        assert set(pools._low_confidence._keys) == set(selector._low_confidence_pool)
+        assert set(pools._llm_predicted) == set(selector._llm_predicted_pool)
+        assert set(pools._disagreement) == set(selector._disagreement_pool)
+        assert set(pools._edge_case_rule) == set(selector._edge_case_rule_pool)
+        assert set(pools._cartography._keys) == set(selector._cartography_pool)
+        if selector._cartography_pool:
+            assert pools.pick('cartography', rng) == selector._cartography_pool[0]
+        if selector._low_confidence_pool:
+            assert pools.pick('low_confidence', rng) == min(
+                selector._low_confidence_pool, key=confidences.get)
+
+    def test_labeling_moves_the_lowest_confidence(self):
+        pools = InstancePools(0.5)
+        pools.add_instances(['a', 'b', 'c'])
+        for iid, conf in (('a', 0.3), ('b', 0.1), ('c', 0.9)):
+            pools.update_prediction(iid, conf)
+        assert pools.pick('low_confidence', random.Random()) == 'b'
+
+        pools.mark_labeled('b')
+        assert pools.pick('low_confidence', random.Random()) == 'a'
+        pools.update_prediction('a', 0.8)
+        assert pools.non_empty()['low_confidence'] is False
+        assert set(pools._llm_predicted) == {'a', 'c'}
+
+    def test_select_from_pools_uses_weights(self):
+        selector = InstanceSelector(SelectionWeights(
+            low_confidence=1.0, diverse=0, random=0, disagreement=0))
+        pools = InstancePools(0.5)
+        pools.add_instances(['a', 'b'])
+        pools.update_prediction('b', 0.2)
+        assert selector.select_from_pools(pools) == 'b'
+        assert selector.selection_history[-1]['pool'] == 'low_confidence'
+        assert selector.get_selection_stats()['pool_sizes']['random'] == 2
+
+    def test_select_from_empty_pools(self):
+        assert InstanceSelector().select_from_pools(InstancePools()) is None
@@ -0,0 +1,185 @@
+"""
+Tests for concurrent LLM labeling and per-endpoint request throttling.
+
+Covers the token bucket and adaptive backoff in potato.ai.request_throttle,
+the batches.labeling_concurrency / requests_per_second settings, and both
+consumers: the manager's batch labeling and LLMLabelingThread's worker pool.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from potato.ai import request_throttle
+from potato.ai.request_throttle import EndpointThrottle, TokenBucket, get_endpoint_throttle
+from potato.solo_mode.config import parse_solo_mode_config
+from potato.solo_mode.llm_labeler import LLMLabelingThread
+from potato.solo_mode.manager import SoloModeManager
+
+SCHEMES = [{'name': 'sentiment', 'annotation_type': 'radio',
+            'labels': ['positive', 'negative', 'neutral']}]
+
+
+@pytest.fixture(autouse=True)
+def fresh_throttles():
+    request_throttle.reset_throttles()
+    yield
+    request_throttle.reset_throttles()
+
+
+def _solo_config(**batches):
+    return parse_solo_mode_config({
+        'solo_mode': {'enabled': True, 'labeling_models': [], 'batches': batches},
+        'annotation_schemes': SCHEMES,
+    })
+
+
+class SlowEndpoint:
+    """Answers after a fixed delay and records the peak number of calls in flight."""
+
+    def __init__(self, delay=0.05, model='stub'):
+        self.delay = delay
+        self.model = model
+        self.ai_config = {'base_url': 'http://stub'}
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    def query(self, prompt, response_model):
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return {'label': 'positive', 'confidence': 90, 'reasoning': ''}
+
+
+class TestThrottle:
+    def test_token_bucket_spaces_requests(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        # First token is free, the other five arrive at 50/s.
+        assert time.monotonic() - start >= 0.09
+
+    def test_zero_rate_never_waits(self):
+        assert TokenBucket(rate=0).acquire() == 0.0
+
+    def test_backoff_grows_on_failure_and_decays_on_success(self):
+        throttle = EndpointThrottle(backoff_initial=0.01, backoff_max=0.04)
+
+        def fail():
+            raise ConnectionError("429")
+
+        for expected in (0.01, 0.02, 0.04, 0.04):
+            with pytest.raises(ConnectionError):
+                throttle.call(fail)
+            assert throttle.current_backoff == expected
+        throttle.call(lambda: None)
+        assert throttle.current_backoff == 0.02
+        throttle.call(lambda: None)
+        throttle.call(lambda: None)
+        assert throttle.current_backoff == 0.0
+        assert throttle.get_stats()['failures'] == 4
+
+    def test_throttle_is_shared_per_backend(self):
+        a, b = SlowEndpoint(model='m'), SlowEndpoint(model='m')
+        other = SlowEndpoint(model='other')
+        assert get_endpoint_throttle(a) is get_endpoint_throttle(b)
+        assert get_endpoint_throttle(a) is not get_endpoint_throttle(other)
+
+
+class TestConfig:
+    def test_defaults_keep_sequential_unlimited_labeling(self):
+        batches = _solo_config().batches
+        assert batches.labeling_concurrency == 1
+        assert batches.requests_per_second == 0.0
+
+    def test_parse_and_validate(self):
+        config = _solo_config(labeling_concurrency=8, requests_per_second=2.5)
+        assert config.batches.labeling_concurrency == 8
+        assert config.batches.requests_per_second == 2.5
+
+        errors = _solo_config(labeling_concurrency=0, requests_per_second=-1).validate()
+        assert any('labeling_concurrency' in e for e in errors)
+        assert any('requests_per_second' in e for e in errors)
+
+
+class TestManagerBatchLabeling:
+    def _manager(self, **batches):
+        manager = SoloModeManager(_solo_config(**batches), {'annotation_schemes': SCHEMES})
+        manager.get_current_prompt_text = lambda: "Classify the sentiment."
+        return manager
+
+    def _label_batch(self, manager, n):
+        ism = MagicMock()
+        ism.instance_id_ordering = [f'i{k}' for k in range(n)]
+        ism.get_item_by_id.return_value = {'text': 'test text'}
+        with patch('potato.item_state_management.get_item_state_manager', return_value=ism):
+            return manager._label_batch(n)
+
+    def test_requests_overlap_and_every_result_is_handled(self):
+        manager = self._manager(labeling_concurrency=4)
+        endpoint = SlowEndpoint()
+        manager.llm_labeling_thread._get_endpoint = lambda: endpoint
+
+        handled_in = set()
+        original = manager._handle_labeling_result
+        manager._handle_labeling_result = lambda r: (
+            handled_in.add(threading.current_thread().name), original(r))
+
+        assert self._label_batch(manager, 12) == 12
+        assert 1 < endpoint.peak <= 4
+        assert manager.llm_labeled_ids == {f'i{k}' for k in range(12)}
+        # Results are still handled on the calling thread.
+        assert handled_in == {threading.current_thread().name}
+
+    def test_concurrency_one_is_sequential(self):
+        manager = self._manager()
+        endpoint = SlowEndpoint(delay=0.0)
+        manager.llm_labeling_thread._get_endpoint = lambda: endpoint
+        assert self._label_batch(manager, 5) == 5
+        assert endpoint.peak == 1
+
+
+class TestLabelingThreadWorkers:
+    def test_workers_drain_queue_and_call_back_per_item(self):
+        results = []
+        lock = threading.Lock()
+
+        def callback(result):
+            with lock:
+                results.append(result.instance_id)
+
+        thread = LLMLabelingThread(
+            config={'annotation_schemes': SCHEMES},
+            solo_config=_solo_config(labeling_concurrency=3),
+            prompt_getter=lambda: "Classify the sentiment.",
+            result_callback=callback,
+        )
+        endpoint = SlowEndpoint()
+        thread._get_endpoint = lambda: endpoint
+        thread._endpoint = endpoint
+        for k in range(9):
+            thread.enqueue(f'i{k}', 'text', 'sentiment')
+
+        thread.start()
+        deadline = time.monotonic() + 5
+        while len(results) < 9 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        thread.stop()
+        thread.join(timeout=5)
+
+        assert sorted(results) == sorted(f'i{k}' for k in range(9))
+        assert 1 < endpoint.peak <= 3
+        assert not thread.is_alive()
+        stats = thread.get_stats()
+        assert stats['labeled_count'] == 9
+        assert stats['concurrency'] == 3
+        assert stats['throttle']['requests'] == 9
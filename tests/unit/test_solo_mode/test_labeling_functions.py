@@ -6,12 +6,15 @@ LabelingFunctionApplier, LabelingFunctionManager, config parsing,
 and manager integration.
 """
 
+import random
+
 import pytest
 from unittest.mock import MagicMock, patch
 
 from potato.solo_mode.labeling_functions import (
     ABSTAIN,
     ApplyResult,
+    CompiledLabelingFunctions,
     LabelingFunction,
     LabelingFunctionApplier,
     LabelingFunctionExtractor,
@@ -245,6 +248,99 @@ class TestLabelingFunctionApplier:
         assert d['num_votes'] == 1
 
 
+class TestCompiledLabelingFunctions:
+    """The compiled batch path must match per-instance apply()."""
+
+    WORDS = ['great', 'bad', 'love it', 'not bad', "don't", 'ok!', '!!',
+             'gr', 'eat', 'awful', 'so-so', 'café', 'terrible', 'at']
+
+    def _assert_same(self, applier, instances, functions):
+        batch = applier.apply_batch(instances, functions)
+        for inst, got in zip(instances, batch):
+            want = applier.apply(inst['instance_id'], inst['text'], functions)
+            assert got.instance_id == want.instance_id
+            assert got.label == want.label
+            assert got.abstained == want.abstained
+            assert [v.function_id for v in got.votes] == \
+                [v.function_id for v in want.votes]
+            assert got.vote_agreement == pytest.approx(want.vote_agreement)
+
+    def test_matches_per_instance_apply(self):
+        rng = random.Random(7)
+        labels = ['positive', 'negative', 'neutral']
+        functions = [
+            _make_function(
+                id=f'lf_{i}', label=rng.choice(labels),
+                confidence=rng.choice([0.5, 0.7, 0.9]),
+                extracted_from_reasoning=', '.join(rng.sample(self.WORDS, 2)),
+                condition=rng.choice([
+                    '', f"text contains '{rng.choice(self.WORDS)}'",
+                    'text contains any of: ' + ', '.join(rng.sample(self.WORDS, 2)),
+                ]),
+                enabled=rng.random() > 0.1,
+            )
+            for i in range(40)
+        ]
+        vocabulary = self.WORDS + ['the', 'movie', 'was', 'Great', 'LOVE', 'It']
+        instances = [
+            {'instance_id': f'i{n}',
+             'text': ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 8)))}
+            for n in range(300)
+        ]
+        for threshold in (0.0, 0.5, 0.8):
+            self._assert_same(LabelingFunctionApplier(threshold), instances, functions)
+
+    def test_phrase_and_punctuation_keywords(self):
+        applier = LabelingFunctionApplier(vote_threshold=0.5)
+        phrase = _make_function(id='lf_phrase', condition='',
+                                extracted_from_reasoning='love it')
+        punct = _make_function(id='lf_punct', label='negative', condition='',
+                               extracted_from_reasoning='!!')
+        instances = [
+            {'instance_id': 'a', 'text': 'I love it'},
+            {'instance_id': 'b', 'text': 'I love the plot, it works'},
+            {'instance_id': 'c', 'text': 'No!!'},
+        ]
+        results = applier.apply_batch(instances, [phrase, punct])
+        assert results[0].label == 'positive'
+        assert results[1].abstained and not results[1].votes
+        assert results[2].label == 'negative'
+
+    def test_substring_inside_word_matches(self):
+        applier = LabelingFunctionApplier(vote_threshold=0.5)
+        fn = _make_function(condition='', extracted_from_reasoning='great')
+        result = applier.apply_batch(
+            [{'instance_id': 'a', 'text': 'The greatest show'}], [fn])[0]
+        assert result.label == 'positive'
+
+    def test_tie_goes_to_first_voting_label(self):
+        applier = LabelingFunctionApplier(vote_threshold=0.5)
+        neg = _make_function(id='lf_neg', label='negative', condition='',
+                             extracted_from_reasoning='fine')
+        pos = _make_function(id='lf_pos', label='positive', condition='',
+                             extracted_from_reasoning='fine')
+        result = applier.apply_batch(
+            [{'instance_id': 'a', 'text': 'fine'}], [neg, pos])[0]
+        assert result.label == 'negative'
+        assert result.vote_agreement == 0.5
+
+    def test_compiled_index_reused_until_functions_change(self):
+        applier = LabelingFunctionApplier()
+        fn = _make_function()
+        compiled = applier.compile([fn])
+        assert isinstance(compiled, CompiledLabelingFunctions)
+        assert applier.compile([fn]) is compiled
+        fn.extracted_from_reasoning = 'superb'
+        assert applier.compile([fn]) is not compiled
+
+    def test_vote_matrix(self):
+        applier = LabelingFunctionApplier()
+        fns = [_make_function(id='lf_a', condition='', extracted_from_reasoning='good'),
+               _make_function(id='lf_b', condition='', extracted_from_reasoning='bad')]
+        rows, cols = applier.compile(fns).vote_matrix(['good', 'none', 'bad good'])
+        assert list(zip(rows.tolist(), cols.tolist())) == [(0, 0), (2, 0), (2, 1)]
+
+
 # === LabelingFunctionExtractor Tests ===
 
 
@@ -1291,6 +1291,35 @@ class TestSoloModeManagerInstanceSelection:
         assert result in {'i1', 'i2', 'i3'}
         mock_ecr.get_rule_instance_ids.assert_called_once()
 
+    def test_get_next_updates_pools_incrementally(self):
+        """Labels, predictions and new instances are applied without a rebuild."""
+        mgr = _make_manager()
+        mgr.instance_selector.configure(low_confidence_weight=1.0, diversity_weight=0,
+                                        random_weight=0, disagreement_weight=0)
+
+        mock_ism = MagicMock()
+        mock_ism.instance_id_ordering = ['i1', 'i2', 'i3']
+
+        with patch('potato.item_state_management.get_item_state_manager',
+                    return_value=mock_ism):
+            mgr.get_next_instance_for_human("user1")
+            pools = mgr._instance_pools
+
+            mgr.set_llm_prediction("i2", "sentiment",
+                                   _make_prediction("i2", confidence=0.1))
+            assert mgr.get_next_instance_for_human("user1") == 'i2'
+
+            mgr.record_human_label("i2", "sentiment", "positive", "user1")
+            mock_ism.instance_id_ordering.append('i4')
+            mgr.set_llm_prediction("i4", "sentiment",
+                                   _make_prediction("i4", confidence=0.2))
+            assert mgr.get_next_instance_for_human("user1") == 'i4'
+            assert mgr._instance_pools is pools
+
+            mgr.human_labeled_ids = {'i1', 'i2', 'i3', 'i4'}
+            assert mgr.get_next_instance_for_human("user1") is None
+            assert mgr._instance_pools is not pools
+
 
 class TestLabelBatch:
     """Tests for _label_batch with and without confidence routing."""
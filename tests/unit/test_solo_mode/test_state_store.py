@@ -0,0 +1,181 @@
+"""
+Tests for the Solo Mode snapshot + journal state store.
+
+Covers journaling of changed instances, head-only-on-change, replay on
+load, loading a legacy snapshot, compaction, torn journal lines, and the
+full-snapshot fallback when a per-instance collection is replaced.
+"""
+
+import json
+import os
+
+from potato.solo_mode.manager import LLMPrediction, SoloModeManager
+from potato.solo_mode.config import parse_solo_mode_config
+from potato.solo_mode.state_store import SoloStateStore
+
+APP_CONFIG = {
+    'annotation_schemes': [
+        {'name': 'sentiment', 'annotation_type': 'radio',
+         'labels': ['positive', 'negative']},
+    ],
+}
+
+
+def _manager(state_dir):
+    config = parse_solo_mode_config({
+        'solo_mode': {'enabled': True, 'labeling_models': []},
+        **APP_CONFIG,
+    })
+    config.state_dir = str(state_dir)
+    return SoloModeManager(config, APP_CONFIG)
+
+
+def _prediction(instance_id, label='positive', confidence=0.8, version=1):
+    return LLMPrediction(
+        instance_id=instance_id, schema_name='sentiment',
+        predicted_label=label, confidence_score=confidence,
+        uncertainty_score=1 - confidence, prompt_version=version,
+    )
+
+
+def _journal_lines(state_dir):
+    path = os.path.join(str(state_dir), 'solo_mode_state.journal')
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestJournal:
+
+    def test_save_appends_only_changed_instances(self, tmp_path):
+        mgr = _manager(tmp_path)
+        for i in range(20):
+            mgr.set_llm_prediction(f'i{i}', 'sentiment', _prediction(f'i{i}'))
+        mgr._save_state()  # first save writes the snapshot
+
+        mgr.set_llm_prediction('i3', 'sentiment', _prediction('i3', 'negative'))
+        mgr._save_state()
+
+        lines = _journal_lines(tmp_path)
+        assert [line['i'] for line in lines if 'i' in line] == ['i3']
+        assert lines[0]['p']['sentiment']['predicted_label'] == 'negative'
+
+    def test_head_written_only_when_changed(self, tmp_path):
+        mgr = _manager(tmp_path)
+        mgr._save_state()
+        mgr._save_state()
+        assert _journal_lines(tmp_path) == []
+
+        mgr.set_task_description('new task')
+        mgr._save_state()
+        heads = [line for line in _journal_lines(tmp_path) if 'head' in line]
+        assert len(heads) == 1
+        assert heads[0]['head']['task_description'] == 'new task'
+
+    def test_reload_replays_journal(self, tmp_path):
+        mgr = _manager(tmp_path)
+        mgr.set_llm_prediction('a', 'sentiment', _prediction('a'))
+        mgr.set_llm_prediction('b', 'sentiment', _prediction('b', confidence=0.4))
+        mgr._save_state()
+
+        mgr.record_human_label('a', 'sentiment', 'negative', 'u1')
+        mgr.set_llm_prediction('b', 'sentiment', _prediction('b', confidence=0.9, version=2))
+        mgr.llm_labeled_ids.discard('b')
+        mgr._dirty_ids.add('b')
+        mgr._save_state()
+
+        mgr2 = _manager(tmp_path)
+        assert mgr2.load_state() is True
+        a = mgr2.predictions['a']['sentiment']
+        assert a.human_label == 'negative'
+        assert a.agrees_with_human is False
+        assert 'a' in mgr2.disagreement_ids
+        assert mgr2.predictions['b']['sentiment'].confidence_score == 0.9
+        assert mgr2.confidence_history['b'] == [(1, 0.4), (2, 0.9)]
+        assert mgr2.llm_labeled_ids == {'a'}
+        assert mgr2.agreement_metrics.total_compared == 1
+
+    def test_replaced_collection_forces_snapshot(self, tmp_path):
+        mgr = _manager(tmp_path)
+        mgr._save_state()
+        mgr.set_llm_prediction('a', 'sentiment', _prediction('a'))
+        mgr._save_state()
+        assert _journal_lines(tmp_path)
+
+        mgr.llm_labeled_ids = {'x', 'y'}
+        mgr._save_state()
+        assert _journal_lines(tmp_path) == []
+
+        mgr2 = _manager(tmp_path)
+        mgr2.load_state()
+        assert mgr2.llm_labeled_ids == {'x', 'y'}
+
+    def test_torn_last_line_is_skipped(self, tmp_path):
+        mgr = _manager(tmp_path)
+        mgr._save_state()
+        mgr.set_llm_prediction('a', 'sentiment', _prediction('a'))
+        mgr._save_state()
+        with open(os.path.join(str(tmp_path), 'solo_mode_state.journal'), 'a') as f:
+            f.write('{"i": "b", "p": {"sentim')
+
+        mgr2 = _manager(tmp_path)
+        assert mgr2.load_state() is True
+        assert set(mgr2.predictions) == {'a'}
+
+    def test_loads_legacy_snapshot(self, tmp_path):
+        legacy = {
+            'task_description': 'old',
+            'current_prompt_version': 0,
+            'prompt_versions': [],
+            'predictions': {'a': {'sentiment': _prediction('a').to_dict()}},
+            'human_labeled_ids': ['a'],
+            'llm_labeled_ids': ['a'],
+            'confidence_history': {'a': [[1, 0.8]]},
+        }
+        with open(os.path.join(str(tmp_path), 'solo_mode_state.json'), 'w') as f:
+            json.dump(legacy, f, indent=2)
+
+        mgr = _manager(tmp_path)
+        assert mgr.load_state() is True
+        assert mgr.task_description == 'old'
+        assert mgr.predictions['a']['sentiment'].predicted_label == 'positive'
+
+        mgr.set_llm_prediction('b', 'sentiment', _prediction('b'))
+        mgr._save_state()
+        assert [line['i'] for line in _journal_lines(tmp_path) if 'i' in line] == ['b']
+
+
+class TestCompaction:
+
+    def test_compaction_folds_journal_into_snapshot(self, tmp_path):
+        mgr = _manager(tmp_path)
+        mgr._save_state()
+        mgr._state_store = SoloStateStore(str(tmp_path), compact_min_bytes=2000)
+        for i in range(200):
+            mgr.set_llm_prediction(f'i{i}', 'sentiment', _prediction(f'i{i}'))
+            mgr._save_state()
+        mgr._state_store.close()
+        mgr._state_store.compact()
+
+        assert not os.path.exists(os.path.join(str(tmp_path), 'solo_mode_state.journal.1'))
+        assert _journal_lines(tmp_path) == []
+        with open(os.path.join(str(tmp_path), 'solo_mode_state.json')) as f:
+            assert len(json.load(f)['predictions']) == 200
+
+        mgr2 = _manager(tmp_path)
+        mgr2.load_state()
+        assert len(mgr2.predictions) == 200
+        assert mgr2.llm_labeled_ids == {f'i{i}' for i in range(200)}
+
+    def test_saves_during_compaction_survive(self, tmp_path):
+        store = SoloStateStore(str(tmp_path), compact_min_bytes=0)
+        store.write_snapshot({'predictions': {}, 'task_description': 't'})
+        for i in range(50):
+            store.append([{'i': f'i{i}', 'p': {'s': {'n': i}}, 'h': None, 'l': True}])
+        store.close()
+
+        state = store.load()
+        assert len(state['predictions']) == 50
+        assert state['task_description'] == 't'
+        assert sorted(state['llm_labeled_ids']) == sorted(f'i{i}' for i in range(50))
@@ -0,0 +1,169 @@
+"""
+The append-only user file: one line per registration or password change,
+last record wins on load, periodic compaction, and the full-file export.
+"""
+
+import json
+import threading
+
+import pytest
+
+import potato.user_registry as registry_module
+from potato.authentication import UserAuthenticator, _is_salted_hash
+from potato.user_registry import UserRegistryLog
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def _authenticator(path, **kwargs):
+    authenticator = UserAuthenticator(str(path), **kwargs)
+    authenticator.user_config_path_explicit = True
+    return authenticator
+
+
+class TestUserRegistryLog:
+    def test_last_record_wins_in_first_seen_order(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        path.write_text(
+            '{"username": "alice", "password": "old"}\n'
+            '{"username": "bob", "password": "b"}\n'
+            "not json\n"
+            '{"username": "alice", "password": "new"}\n'
+        )
+        log = UserRegistryLog(str(path))
+        records = log.load()
+        assert [(r["username"], r["password"]) for r in records] == [
+            ("alice", "new"), ("bob", "b")]
+        assert log.parse_errors == 1
+        assert log.stale_records == 1
+
+    def test_compaction_keeps_unparseable_lines_and_other_writers(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        log = UserRegistryLog(str(path))
+        log.append({"username": "alice", "password": "1"})
+        log.append({"username": "alice", "password": "2"})
+        # Another server sharing the file appended behind our back.
+        with open(path, "a") as f:
+            f.write('{"username": "carol", "password": "c"}\nnot json\n')
+
+        log.compact()
+        assert path.read_text().splitlines() == [
+            '{"username": "alice", "password": "2"}',
+            '{"username": "carol", "password": "c"}',
+            "not json",
+        ]
+        assert log.stale_records == 0
+
+    def test_compacts_once_superseded_records_pile_up(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(registry_module, "COMPACT_MIN_STALE", 3)
+        path = tmp_path / "users.jsonl"
+        log = UserRegistryLog(str(path))
+        for i in range(4):
+            log.append({"username": f"u{i}", "password": "x"})
+        for i in range(2):
+            log.append({"username": "u0", "password": str(i)})
+        assert len(_lines(path)) == 6
+
+        log.append({"username": "u1", "password": "y"})  # third superseded record
+        assert [r["username"] for r in _lines(path)] == ["u0", "u1", "u2", "u3"]
+        assert _lines(path)[0]["password"] == "1"
+
+
+def _churn(path, prefix, users, rounds):
+    """Child process: append every user's password ``rounds`` times."""
+    registry_module.COMPACT_MIN_STALE = 5
+    log = UserRegistryLog(path)
+    log.load()
+    for round_ in range(rounds):
+        for i in range(users):
+            log.append({"username": f"{prefix}{i}", "password": str(round_)})
+
+
+@pytest.mark.skipif(registry_module.fcntl is None, reason="needs POSIX flock")
+def test_two_processes_compacting_lose_no_lines(tmp_path):
+    """Each process compacts repeatedly while the other appends; a line
+    appended between one compaction's read and its rename must survive."""
+    import multiprocessing
+
+    path = str(tmp_path / "users.jsonl")
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_churn, args=(path, prefix, 20, 40))
+             for prefix in ("a", "b")]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    records = {r["username"]: r["password"] for r in UserRegistryLog(path).load()}
+    assert records == {f"{prefix}{i}": "39" for prefix in "ab" for i in range(20)}
+
+
+class TestAuthenticatorPersistence:
+    def test_registration_appends_one_line(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        authenticator = _authenticator(path)
+        authenticator.add_user("alice", "pw1")
+        authenticator.persist_user("alice")
+        first = path.read_text()
+        authenticator.add_user("bob", "pw2")
+        authenticator.persist_user("bob")
+
+        assert path.read_text().startswith(first)
+        assert [r["username"] for r in _lines(path)] == ["alice", "bob"]
+        assert all(_is_salted_hash(r["password"]) for r in _lines(path))
+
+    def test_password_change_survives_restart(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        authenticator = _authenticator(path)
+        authenticator.add_user("alice", "old-password")
+        authenticator.persist_user("alice")
+        authenticator.update_password("alice", "new-password")
+        authenticator.persist_user("alice")
+        assert len(_lines(path)) == 2
+
+        restarted = _authenticator(path)
+        assert restarted.userlist == ["alice"]
+        assert restarted.auth_backend.authenticate("alice", "new-password")
+        assert not restarted.auth_backend.authenticate("alice", "old-password")
+
+    def test_default_path_is_not_written(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        authenticator = UserAuthenticator(str(path))
+        authenticator.add_user("alice", "pw")
+        authenticator.persist_user("alice")
+        assert not path.exists()
+
+    def test_export_writes_one_line_per_user(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        authenticator = _authenticator(path)
+        for name in ("alice", "bob"):
+            authenticator.add_user(name, "pw")
+            authenticator.persist_user(name)
+        authenticator.update_password("alice", "changed")
+        authenticator.persist_user("alice")
+
+        export = tmp_path / "export" / "users.jsonl"
+        authenticator.export_user_config(str(export))
+        assert [r["username"] for r in _lines(export)] == ["alice", "bob"]
+        assert len(_lines(path)) == 3  # the log itself is untouched
+
+    def test_concurrent_registrations_are_all_persisted(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        authenticator = _authenticator(path, require_password=False)
+
+        def register(start):
+            for i in range(start, start + 100):
+                authenticator.add_user(f"user_{i}", None)
+                authenticator.persist_user(f"user_{i}")
+
+        threads = [threading.Thread(target=register, args=(n * 100,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({r["username"] for r in _lines(path)}) == 800
+        assert len(_authenticator(path, require_password=False).users) == 800
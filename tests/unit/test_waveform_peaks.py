@@ -0,0 +1,169 @@
+"""
+Tests for native waveform peak generation.
+
+Without audiowaveform, WaveformService streams WAV audio through
+waveform_peaks in blocks and writes Peaks.js ``.dat`` files plus coarser
+pyramid levels. Streaming must give the same peaks as reducing the whole
+signal at once, whatever the block size.
+"""
+
+import os
+import struct
+import time
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from potato.server_utils import waveform_peaks
+from potato.server_utils.waveform_service import WaveformService
+
+
+def _write_wav(path, samples, rate=8000, width=2):
+    """Write (frames, channels) int16 samples at the given sample width."""
+    samples = np.asarray(samples, dtype=np.int16)
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    if width == 1:
+        raw = ((samples >> 8) + 128).astype(np.uint8).tobytes()
+    elif width == 2:
+        raw = samples.astype("<i2").tobytes()
+    elif width == 3:
+        wide = samples.astype("<i4") << 8
+        raw = wide.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    else:
+        raw = (samples.astype("<i4") << 16).tobytes()
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(samples.shape[1])
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(raw)
+
+
+def _read_dat(path):
+    with open(path, "rb") as f:
+        version, flags, rate, spp, length = struct.unpack("<iIiiI", f.read(20))
+        data = np.frombuffer(f.read(), dtype=np.int8 if flags & 1 else "<i2")
+    return (version, flags, rate, spp, length), data[0::2], data[1::2]
+
+
+def _reference(signal, spp):
+    """Per-pixel min/max of the whole signal at once."""
+    pixels = [signal[i:i + spp] for i in range(0, len(signal), spp)]
+    return (np.array([p.min() for p in pixels], dtype=np.int16),
+            np.array([p.max() for p in pixels], dtype=np.int16))
+
+
+@pytest.fixture
+def stereo_signal():
+    rng = np.random.default_rng(0)
+    return rng.integers(-32768, 32767, size=(10_007, 2), dtype=np.int16)
+
+
+class TestPeaks:
+    @pytest.mark.parametrize("block_frames", [1, 100, 333, 1 << 20])
+    def test_streaming_matches_whole_signal(self, tmp_path, stereo_signal, block_frames):
+        path = tmp_path / "a.wav"
+        _write_wav(path, stereo_signal)
+        mixed = (stereo_signal.astype(np.int32).sum(axis=1) / 2).astype(np.int16)
+
+        rate, mins, maxs = waveform_peaks.compute_peaks(str(path), 256, block_frames)
+        expected_mins, expected_maxs = _reference(mixed, 256)
+        assert rate == 8000
+        assert np.array_equal(mins, expected_mins)
+        assert np.array_equal(maxs, expected_maxs)
+
+    @pytest.mark.parametrize("width", [1, 3, 4])
+    def test_sample_widths_scale_to_16_bit(self, tmp_path, width):
+        signal = np.array([-32768, -256, 0, 256, 32512], dtype=np.int16)
+        path = tmp_path / "w.wav"
+        _write_wav(path, signal, width=width)
+        _, mins, maxs = waveform_peaks.compute_peaks(str(path), 5)
+        assert (mins[0], maxs[0]) == (-32768, 32512)
+
+    def test_pyramid_levels_equal_direct_passes(self, tmp_path, stereo_signal):
+        path = tmp_path / "a.wav"
+        _write_wav(path, stereo_signal)
+        out = str(tmp_path / "a.dat")
+        assert waveform_peaks.generate_peaks(str(path), out, (256, 1024), bits=16)
+
+        for spp, dat in ((256, out), (1024, waveform_peaks.level_path(out, 1024))):
+            header, mins, maxs = _read_dat(dat)
+            _, direct_mins, direct_maxs = waveform_peaks.compute_peaks(str(path), spp)
+            assert header == (1, 0, 8000, spp, len(direct_mins))
+            assert np.array_equal(mins, direct_mins)
+            assert np.array_equal(maxs, direct_maxs)
+
+    def test_8_bit_output_keeps_top_byte(self, tmp_path):
+        path = tmp_path / "a.wav"
+        _write_wav(path, np.array([-32768, 32767, -1, 1], dtype=np.int16))
+        out = str(tmp_path / "a.dat")
+        assert waveform_peaks.generate_peaks(str(path), out, (2,), bits=8)
+        header, mins, maxs = _read_dat(out)
+        assert header == (1, 1, 8000, 2, 2)
+        assert list(mins) == [-128, -1] and list(maxs) == [127, 0]
+
+    def test_unreadable_audio_is_reported_not_raised(self, tmp_path):
+        path = tmp_path / "broken.wav"
+        path.write_bytes(b"not a wav file")
+        assert not waveform_peaks.generate_peaks(str(path), str(tmp_path / "x.dat"))
+        assert not os.path.exists(tmp_path / "x.dat")
+
+
+@pytest.fixture
+def native_service(tmp_path):
+    """A WaveformService that finds no audiowaveform binary."""
+    with patch("potato.server_utils.waveform_service.subprocess.run",
+               side_effect=FileNotFoundError()):
+        service = WaveformService(cache_dir=str(tmp_path / "cache"), cache_max_size=1, workers=0)
+    yield service
+    service.stop_background_precompute()
+
+
+class TestServiceFallback:
+    def test_generates_pyramid_without_audiowaveform(self, tmp_path, native_service, stereo_signal):
+        audio = tmp_path / "a.wav"
+        _write_wav(audio, stereo_signal)
+
+        path = native_service.get_waveform_path(str(audio))
+        assert path and os.path.exists(path)
+        assert not native_service.should_use_client_fallback(str(audio))
+        key = native_service._get_cache_key(str(audio))
+        for level in WaveformService.WAVEFORM_PYRAMID_LEVELS:
+            header, _, _ = _read_dat(native_service.get_level_cache_path(key, level))
+            assert header[3] == level
+
+    def test_eviction_removes_levels(self, tmp_path, native_service, stereo_signal):
+        first, second = tmp_path / "a.wav", tmp_path / "b.wav"
+        _write_wav(first, stereo_signal)
+        _write_wav(second, stereo_signal[::-1])
+
+        native_service.get_waveform_path(str(first))
+        native_service.get_waveform_path(str(second))
+        key = native_service._get_cache_key(str(first))
+        assert not any(os.path.exists(native_service.get_level_cache_path(key, level))
+                       for level in WaveformService.WAVEFORM_PYRAMID_LEVELS)
+
+    def test_undecodable_format_falls_back_to_client(self, tmp_path, native_service, monkeypatch):
+        monkeypatch.setattr(waveform_peaks, "SOUNDFILE_AVAILABLE", False)
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"\x00" * 16)
+        assert native_service.get_waveform_path(str(audio)) is None
+
+    def test_background_precompute_uses_process_pool(self, tmp_path, stereo_signal):
+        with patch("potato.server_utils.waveform_service.subprocess.run",
+                   side_effect=FileNotFoundError()):
+            service = WaveformService(cache_dir=str(tmp_path / "cache"), workers=1)
+        audio = tmp_path / "a.wav"
+        _write_wav(audio, stereo_signal)
+        try:
+            service.queue_precompute([str(audio)])
+            cache_path = service._get_waveform_cache_path(str(audio))
+            deadline = time.time() + 60
+            while cache_path not in service._cache_order and time.time() < deadline:
+                time.sleep(0.05)
+            assert service._executor is not None
+            assert service.get_waveform_path(str(audio), generate=False) == cache_path
+        finally:
+            service.stop_background_precompute()
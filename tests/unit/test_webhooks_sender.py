@@ -2,12 +2,16 @@
 
 import json
 import os
+import socket
 import sqlite3
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 from potato.webhooks.sender import WebhookDeliveryQueue, RETRY_SCHEDULE, MAX_RETRIES
+from potato.webhooks.signing import verify_signature
 
 
 @pytest.fixture
@@ -16,6 +20,66 @@ def tmp_output_dir(tmp_path):
     return str(tmp_path / "webhook_output")
 
 
+class _Stub:
+    """Local keep-alive HTTP receiver recording every POST it gets."""
+
+    def __init__(self, status=200, delay=0.0):
+        self.status = status
+        self.delay = delay
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                stub.requests.append({
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "body": body,
+                    "client_port": self.client_address[1],
+                })
+                self.send_response(stub.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *a):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/hook"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def wait_for(self, count, timeout=5.0):
+        deadline = time.time() + timeout
+        while len(self.requests) < count and time.time() < deadline:
+            time.sleep(0.01)
+        return len(self.requests) >= count
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def stub():
+    s = _Stub()
+    yield s
+    s.close()
+
+
+def _closed_port_url():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}/hook"
+
+
 class TestWebhookDeliveryQueue:
     def test_enqueue_returns_true(self):
         q = WebhookDeliveryQueue()
@@ -24,12 +88,13 @@ class TestWebhookDeliveryQueue:
 
     def test_enqueue_with_full_queue(self):
         q = WebhookDeliveryQueue()
-        q._queue.maxsize = 1
+        q._lane_for("https://example.com", "").queue.maxsize = 1
         # Fill the queue
         q.enqueue("https://example.com", "", b'{}')
         # Next should fail
         result = q.enqueue("https://example.com", "", b'{}')
         assert result is False
+        assert q.get_stats()["lanes"][0]["dropped"] == 1
 
     def test_start_stop(self):
         q = WebhookDeliveryQueue()
@@ -100,36 +165,32 @@ class TestRetryStore:
 
 
 class TestDelivery:
-    @patch("potato.webhooks.sender.urlopen")
-    def test_successful_delivery(self, mock_urlopen, tmp_output_dir):
-        mock_resp = MagicMock()
-        mock_resp.getcode.return_value = 200
-        mock_urlopen.return_value = mock_resp
-
+    def test_successful_delivery(self, stub, tmp_output_dir):
         q = WebhookDeliveryQueue(output_dir=tmp_output_dir)
         delivery = {
             "id": "msg_ok",
-            "url": "https://example.com/hook",
+            "url": stub.url,
             "secret": "test-secret",
             "payload_bytes": b'{"event": "test"}',
             "attempt": 0,
         }
         q._deliver(delivery)
 
-        mock_urlopen.assert_called_once()
-        req = mock_urlopen.call_args[0][0]
-        assert req.get_method() == "POST"
-        assert req.full_url == "https://example.com/hook"
-
-    @patch("potato.webhooks.sender.urlopen")
-    def test_failed_delivery_stores_retry(self, mock_urlopen, tmp_output_dir):
-        from urllib.error import URLError
-        mock_urlopen.side_effect = URLError("Connection refused")
+        assert len(stub.requests) == 1
+        req = stub.requests[0]
+        assert req["path"] == "/hook"
+        assert req["body"] == b'{"event": "test"}'
+        assert req["headers"]["webhook-id"] == "msg_ok"
+        assert verify_signature("test-secret", "msg_ok",
+                                req["headers"]["webhook-timestamp"], req["body"],
+                                req["headers"]["webhook-signature"])
+        assert q.get_retry_count() == 0
 
+    def test_failed_delivery_stores_retry(self, tmp_output_dir):
         q = WebhookDeliveryQueue(output_dir=tmp_output_dir)
         delivery = {
             "id": "msg_fail",
-            "url": "https://example.com/hook",
+            "url": _closed_port_url(),
             "secret": "",
             "payload_bytes": b'{}',
             "attempt": 0,
@@ -138,15 +199,22 @@ class TestDelivery:
 
         assert q.get_retry_count() == 1
 
-    @patch("potato.webhooks.sender.urlopen")
-    def test_max_retries_exhausted(self, mock_urlopen, tmp_output_dir):
-        from urllib.error import URLError
-        mock_urlopen.side_effect = URLError("timeout")
-
+    def test_error_status_stores_retry(self, tmp_output_dir):
+        stub = _Stub(status=503)
+        try:
+            q = WebhookDeliveryQueue(output_dir=tmp_output_dir)
+            q._deliver({"id": "msg_503", "url": stub.url, "secret": "",
+                        "payload_bytes": b'{}', "attempt": 0})
+            assert q.get_retry_count() == 1
+            assert q.get_stats()["lanes"][0]["failed"] == 1
+        finally:
+            stub.close()
+
+    def test_max_retries_exhausted(self, tmp_output_dir):
         q = WebhookDeliveryQueue(output_dir=tmp_output_dir)
         delivery = {
             "id": "msg_exhaust",
-            "url": "https://example.com",
+            "url": _closed_port_url(),
             "secret": "",
             "payload_bytes": b'{}',
             "attempt": MAX_RETRIES,  # Already at max
@@ -156,6 +224,107 @@ class TestDelivery:
         # Should NOT be stored for retry since max is exceeded
         assert q.get_retry_count() == 0
 
+    def test_due_retry_is_redelivered(self, stub, tmp_output_dir):
+        q = WebhookDeliveryQueue(output_dir=tmp_output_dir)
+        delivery = {"id": "msg_again", "url": stub.url, "secret": "",
+                    "payload_bytes": b'{"n": 1}', "attempt": 0}
+        q._store_retry(delivery, 1, time.time() - 1, "earlier failure")
+        q.start()
+        try:
+            assert stub.wait_for(1)
+        finally:
+            q.stop()
+        assert stub.requests[0]["headers"]["webhook-id"] == "msg_again"
+        assert q.get_retry_count() == 0
+
+
+class TestLanes:
+    def test_connections_are_reused(self, stub):
+        q = WebhookDeliveryQueue()
+        q.configure_endpoint(stub.url, concurrency=1)
+        q.start()
+        try:
+            for i in range(20):
+                assert q.enqueue(stub.url, "", json.dumps({"n": i}).encode())
+            assert stub.wait_for(20)
+        finally:
+            q.stop()
+        assert len({r["client_port"] for r in stub.requests}) == 1
+        lane = q.get_stats()["lanes"][0]
+        assert lane["delivered"] == 20
+        assert lane["connections_opened"] == 1
+        assert lane["connections_reused"] == 19
+
+    def test_slow_endpoint_does_not_delay_others(self, stub):
+        slow = _Stub(delay=0.5)
+        q = WebhookDeliveryQueue()
+        q.configure_endpoint(slow.url, concurrency=1)
+        q.start()
+        try:
+            for _ in range(4):
+                q.enqueue(slow.url, "", b'{}')
+            start = time.time()
+            for _ in range(10):
+                q.enqueue(stub.url, "", b'{}')
+            assert stub.wait_for(10)
+            assert time.time() - start < 0.5
+            assert len(slow.requests) < 4
+            stats = {lane["url"]: lane for lane in q.get_stats()["lanes"]}
+            assert stats[slow.url]["queue_depth"] + stats[slow.url]["in_flight"] > 0
+        finally:
+            q.stop()
+            slow.close()
+
+    def test_concurrency_bounds_parallel_requests(self):
+        slow = _Stub(delay=0.3)
+        q = WebhookDeliveryQueue()
+        q.configure_endpoint(slow.url, concurrency=3)
+        q.start()
+        try:
+            start = time.time()
+            for _ in range(6):
+                q.enqueue(slow.url, "", b'{}')
+            assert slow.wait_for(6)
+            elapsed = time.time() - start
+        finally:
+            q.stop()
+            slow.close()
+        # Two rounds of three, not six in a row nor six at once
+        assert 0.5 < elapsed < 1.5
+        assert len({r["client_port"] for r in slow.requests}) == 3
+
+    def test_batching_packs_events_into_one_array(self, stub):
+        q = WebhookDeliveryQueue()
+        q.configure_endpoint(stub.url, "s3cret", concurrency=1,
+                             batch_size=5, batch_window=0.5)
+        for i in range(12):
+            q.enqueue(stub.url, "s3cret", json.dumps({"n": i}).encode())
+        q.start()
+        try:
+            assert stub.wait_for(3)
+        finally:
+            q.stop()
+        bodies = [json.loads(r["body"]) for r in stub.requests]
+        assert [len(b) for b in bodies] == [5, 5, 2]
+        assert [e["n"] for b in bodies for e in b] == list(range(12))
+        for r in stub.requests:
+            h = r["headers"]
+            assert verify_signature("s3cret", h["webhook-id"], h["webhook-timestamp"],
+                                    r["body"], h["webhook-signature"])
+        lane = q.get_stats()["lanes"][0]
+        assert lane["batches"] == 3
+        assert lane["delivered"] == 12
+
+    def test_stats_report_latency(self, stub):
+        q = WebhookDeliveryQueue()
+        for _ in range(5):
+            q._deliver({"id": f"msg_{_}", "url": stub.url, "secret": "",
+                        "payload_bytes": b'{}', "attempt": 0})
+        stats = q.get_stats()
+        assert stats["queue_depth"] == 0
+        latency = stats["lanes"][0]["latency_ms"]
+        assert 0 <= latency["p50"] <= latency["p95"] <= latency["max"]
+
 
 class TestRetrySchedule:
     def test_schedule_has_entries(self):